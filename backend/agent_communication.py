@@ -10,6 +10,7 @@ Features:
 - Service discovery and health monitoring
 - Load balancing and failover mechanisms
 - Real-time agent collaboration
+- Compact binary wire format and pluggable transports (agent_transport.py)
 """
 
 import asyncio
@@ -18,24 +19,39 @@ import logging
 import time
 import uuid
 from abc import ABC, abstractmethod
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, is_dataclass
 from enum import Enum
-from typing import Any, Dict, List, Optional, Callable, Set
-from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Set
+from datetime import datetime, timedelta, timezone
 import threading
 import weakref
 from concurrent.futures import ThreadPoolExecutor
 import hashlib
+import os
+
+from agent_transport import (
+    REDIS_STREAMS_AVAILABLE,
+    InProcessTransport,
+    MessageTransport,
+    RedisStreamsTransport,
+    create_transport,
+)
 
 # Message bus and networking
 try:
-    import aioredis
     import aiohttp
     from aiohttp import web
     NETWORKING_AVAILABLE = True
 except ImportError:
     NETWORKING_AVAILABLE = False
 
+# Binary wire format (JSON arrays are the fallback)
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
 class MessageType(Enum):
@@ -57,7 +73,7 @@ class MessagePriority(Enum):
     MEDIUM = "medium"
     LOW = "low"
 
-@dataclass
+@dataclass(slots=True)
 class AgentMessage:
     """Agent communication message"""
     id: str
@@ -97,6 +113,127 @@ class AgentEndpoint:
         if self.performance_metrics is None:
             self.performance_metrics = {}
 
+# Wire codes follow definition order: append new members, never reorder
+MESSAGE_TYPES = list(MessageType)
+MESSAGE_TYPE_CODES = {member: code for code, member in enumerate(MESSAGE_TYPES)}
+MESSAGE_PRIORITIES = list(MessagePriority)
+MESSAGE_PRIORITY_CODES = {member: code for code, member in enumerate(MESSAGE_PRIORITIES)}
+
+WIRE_VERSION = 1
+WIRE_MSGPACK = 0x01
+WIRE_JSON = 0x02
+EPOCH = datetime(1970, 1, 1)
+MILLISECOND = timedelta(milliseconds=1)
+
+
+def _epoch_ms(value: Optional[datetime]) -> Optional[int]:
+    if value is None:
+        return None
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return (value - EPOCH) // MILLISECOND
+
+
+def _from_epoch_ms(value: Optional[int]) -> Optional[datetime]:
+    return None if value is None else EPOCH + value * MILLISECOND
+
+
+def _wire_default(value: Any) -> Any:
+    """Payload values the wire formats have no type for"""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    if is_dataclass(value) and not isinstance(value, type):
+        return asdict(value)
+    raise TypeError(f"Cannot encode {type(value).__name__} in an agent message")
+
+
+class AgentMessageCodec:
+    """
+    Compact wire format for AgentMessage
+
+    A message is one positional array - version, id, type code, sender,
+    recipient, payload, priority code, correlation id, timestamp and expiry
+    as epoch milliseconds, retry count, max retries - behind a one-byte
+    format tag.  With msgpack installed the array is msgpack and UUIDs
+    travel as 16 raw bytes; otherwise it is compact JSON.  Both formats
+    decode everywhere, so mixed deployments interoperate.
+
+    Args:
+        use_msgpack: Encode with msgpack (default: when installed)
+    """
+
+    def __init__(self, use_msgpack: Optional[bool] = None):
+        self.use_msgpack = MSGPACK_AVAILABLE if use_msgpack is None else use_msgpack
+        if self.use_msgpack and not MSGPACK_AVAILABLE:
+            raise RuntimeError("msgpack is not installed")
+        self.format = 'msgpack' if self.use_msgpack else 'json'
+
+    @staticmethod
+    def _pack_id(value: Optional[str]) -> Any:
+        if value is None or len(value) != 36:
+            return value
+        try:
+            return uuid.UUID(value).bytes
+        except ValueError:
+            return value
+
+    @staticmethod
+    def _unpack_id(value: Any) -> Optional[str]:
+        if isinstance(value, bytes):
+            return str(uuid.UUID(bytes=value))
+        return value
+
+    def encode(self, message: AgentMessage) -> bytes:
+        if self.use_msgpack:
+            fields = [WIRE_VERSION, self._pack_id(message.id), MESSAGE_TYPE_CODES[message.type],
+                      message.sender_id, message.recipient_id, message.payload,
+                      MESSAGE_PRIORITY_CODES[message.priority], self._pack_id(message.correlation_id),
+                      _epoch_ms(message.timestamp), _epoch_ms(message.expires_at),
+                      message.retry_count, message.max_retries]
+            return bytes((WIRE_MSGPACK,)) + msgpack.packb(fields, use_bin_type=True, default=_wire_default)
+        fields = [WIRE_VERSION, message.id, MESSAGE_TYPE_CODES[message.type],
+                  message.sender_id, message.recipient_id, message.payload,
+                  MESSAGE_PRIORITY_CODES[message.priority], message.correlation_id,
+                  _epoch_ms(message.timestamp), _epoch_ms(message.expires_at),
+                  message.retry_count, message.max_retries]
+        return bytes((WIRE_JSON,)) + json.dumps(fields, separators=(',', ':'), default=_wire_default).encode()
+
+    def decode(self, data: bytes) -> Optional[AgentMessage]:
+        try:
+            tag, body = data[0], data[1:]
+            if tag == WIRE_MSGPACK:
+                if not MSGPACK_AVAILABLE:
+                    raise ValueError("msgpack message but msgpack is not installed")
+                fields = msgpack.unpackb(body, raw=False, strict_map_key=False)
+            elif tag == WIRE_JSON:
+                fields = json.loads(body)
+            else:
+                raise ValueError(f"unknown wire format 0x{tag:02x}")
+            (version, message_id, type_code, sender_id, recipient_id, payload, priority_code,
+             correlation_id, timestamp, expires_at, retry_count, max_retries) = fields
+            if version != WIRE_VERSION:
+                raise ValueError(f"unsupported wire version {version}")
+            return AgentMessage(
+                id=self._unpack_id(message_id),
+                type=MESSAGE_TYPES[type_code],
+                sender_id=sender_id,
+                recipient_id=recipient_id,
+                payload=payload,
+                priority=MESSAGE_PRIORITIES[priority_code],
+                correlation_id=self._unpack_id(correlation_id),
+                timestamp=_from_epoch_ms(timestamp),
+                expires_at=_from_epoch_ms(expires_at),
+                retry_count=retry_count,
+                max_retries=max_retries
+            )
+        except Exception as e:
+            logger.error(f"[MESSAGE-BUS] Deserialization error: {e}")
+            return None
+
 class MessageHandler(ABC):
     """Base class for message handlers"""
 
@@ -111,20 +248,34 @@ class MessageHandler(ABC):
         pass
 
 class AgentMessageBus:
-    """Enterprise agent message bus for inter-agent communication"""
-
-    def __init__(self, redis_url: str = "redis://localhost:6379"):
+    """
+    Enterprise agent message bus for inter-agent communication
+
+    Delivery is delegated to a ``MessageTransport`` (agent_transport.py) that
+    pushes received messages into ``_process_received_message``; responses
+    resolve the waiting ``send_request`` future through the correlation map,
+    and handlers run as their own tasks so a handler awaiting a request
+    never blocks the delivery of its response.
+
+    Args:
+        redis_url: Redis for the Redis Streams transport
+        transport: Transport to use (default: from AGENT_TRANSPORT)
+        codec: Wire format for transports that serialize
+    """
+
+    def __init__(self, redis_url: str = "redis://localhost:6379",
+                 transport: Optional[MessageTransport] = None,
+                 codec: Optional[AgentMessageCodec] = None):
         self.redis_url = redis_url
-        self.redis_client = None
+        self.codec = codec or AgentMessageCodec()
+        self.transport = transport
         self.message_handlers: Dict[MessageType, List[MessageHandler]] = {}
-        self.subscription_tasks: Dict[str, asyncio.Task] = {}
         self.agent_id = None
         self.running = False
 
-        # Message routing and delivery
-        self.message_queue = asyncio.Queue()
-        self.delivery_confirmations: Dict[str, asyncio.Event] = {}
-        self.pending_messages: Dict[str, AgentMessage] = {}
+        # Request/response correlation: correlation id -> waiting future
+        self.pending_requests: Dict[str, asyncio.Future] = {}
+        self.handler_tasks: Set[asyncio.Task] = set()
 
         # Performance tracking
         self.message_stats = {
@@ -138,35 +289,39 @@ class AgentMessageBus:
         """Initialize message bus"""
         self.agent_id = agent_id
 
-        if NETWORKING_AVAILABLE:
-            try:
-                self.redis_client = aioredis.from_url(self.redis_url)
-                await self.redis_client.ping()
-                logger.info(f"[MESSAGE-BUS] Connected to Redis: {self.redis_url}")
-            except Exception as e:
-                logger.warning(f"[MESSAGE-BUS] Redis unavailable, using local queue: {e}")
-                self.redis_client = None
-        else:
-            logger.info("[MESSAGE-BUS] Using local message queue (Redis not available)")
+        fallback = False
+        if self.transport is None:
+            kind = os.getenv('AGENT_TRANSPORT', 'auto').lower()
+            if kind == 'auto':
+                kind = 'redis' if REDIS_STREAMS_AVAILABLE else 'inprocess'
+                fallback = True
+            self.transport = create_transport(kind, self.codec, self.redis_url)
 
-        self.running = True
-
-        # Start message processing loop
-        asyncio.create_task(self._message_processing_loop())
+        try:
+            await self.transport.start(agent_id, self._process_received_message)
+        except Exception as e:
+            if not fallback:
+                raise
+            logger.warning(f"[MESSAGE-BUS] Redis unavailable, using in-process transport: {e}")
+            await self.transport.stop()
+            self.transport = InProcessTransport()
+            await self.transport.start(agent_id, self._process_received_message)
 
-        logger.info(f"[MESSAGE-BUS] Initialized for agent: {agent_id}")
+        self.running = True
+        logger.info(f"[MESSAGE-BUS] Initialized for agent: {agent_id} "
+                    f"({self.transport.name} transport, {self.codec.format} wire format)")
 
     async def shutdown(self):
         """Shutdown message bus"""
         self.running = False
 
-        # Cancel subscription tasks
-        for task in self.subscription_tasks.values():
-            task.cancel()
+        if self.transport:
+            await self.transport.stop()
 
-        # Close Redis connection
-        if self.redis_client:
-            await self.redis_client.close()
+        for future in self.pending_requests.values():
+            future.cancel()
+        for task in self.handler_tasks:
+            task.cancel()
 
         logger.info("[MESSAGE-BUS] Shutdown complete")
 
@@ -188,22 +343,10 @@ class AgentMessageBus:
             # Set sender ID
             message.sender_id = self.agent_id
 
-            # Serialize message
-            message_data = self._serialize_message(message)
-
-            if self.redis_client:
-                # Send via Redis
-                if message.recipient_id:
-                    # Direct message
-                    channel = f"agent:{message.recipient_id}"
-                    await self.redis_client.publish(channel, message_data)
-                else:
-                    # Broadcast message
-                    channel = "agent:broadcast"
-                    await self.redis_client.publish(channel, message_data)
-            else:
-                # Local delivery
-                await self.message_queue.put(message)
+            if not await self.transport.send(message):
+                logger.warning(f"[MESSAGE-BUS] No route to agent: {message.recipient_id}")
+                self.message_stats['failed'] += 1
+                return False
 
             self.message_stats['sent'] += 1
             logger.debug(f"[MESSAGE-BUS] Sent message: {message.id}")
@@ -216,97 +359,25 @@ class AgentMessageBus:
 
     async def send_request(self, message: AgentMessage, timeout: float = 30.0) -> Optional[AgentMessage]:
         """Send request and wait for response"""
-        # Generate correlation ID
         message.correlation_id = str(uuid.uuid4())
-
-        # Setup response waiter
-        response_event = asyncio.Event()
-        response_message = None
-
-        def response_handler(response: AgentMessage):
-            nonlocal response_message
-            if response.correlation_id == message.correlation_id:
-                response_message = response
-                response_event.set()
-
-        # Register temporary response handler
-        self._register_correlation_handler(message.correlation_id, response_handler)
+        response = asyncio.get_running_loop().create_future()
+        self.pending_requests[message.correlation_id] = response
 
         try:
-            # Send request
-            success = await self.send_message(message)
-            if not success:
+            if not await self.send_message(message):
                 return None
-
-            # Wait for response
-            await asyncio.wait_for(response_event.wait(), timeout=timeout)
-            return response_message
+            return await asyncio.wait_for(response, timeout=timeout)
 
         except asyncio.TimeoutError:
             logger.warning(f"[MESSAGE-BUS] Request timeout: {message.id}")
             return None
         finally:
-            # Cleanup correlation handler
-            self._unregister_correlation_handler(message.correlation_id)
+            self.pending_requests.pop(message.correlation_id, None)
 
     async def subscribe_to_messages(self, agent_id: str):
-        """Subscribe to messages for this agent"""
-        if not self.redis_client:
-            return
-
-        # Subscribe to direct messages
-        direct_channel = f"agent:{agent_id}"
-        direct_task = asyncio.create_task(
-            self._subscribe_to_channel(direct_channel)
-        )
-        self.subscription_tasks[direct_channel] = direct_task
-
-        # Subscribe to broadcast messages
-        broadcast_channel = "agent:broadcast"
-        broadcast_task = asyncio.create_task(
-            self._subscribe_to_channel(broadcast_channel)
-        )
-        self.subscription_tasks[broadcast_channel] = broadcast_task
-
-        logger.info(f"[MESSAGE-BUS] Subscribed to channels for agent: {agent_id}")
-
-    async def _subscribe_to_channel(self, channel: str):
-        """Subscribe to a specific Redis channel"""
-        try:
-            pubsub = self.redis_client.pubsub()
-            await pubsub.subscribe(channel)
-
-            async for message in pubsub.listen():
-                if message['type'] == 'message':
-                    try:
-                        agent_message = self._deserialize_message(message['data'])
-                        if agent_message:
-                            await self._process_received_message(agent_message)
-                    except Exception as e:
-                        logger.error(f"[MESSAGE-BUS] Error processing message: {e}")
-
-        except Exception as e:
-            logger.error(f"[MESSAGE-BUS] Subscription error for {channel}: {e}")
-
-    async def _message_processing_loop(self):
-        """Main message processing loop"""
-        while self.running:
-            try:
-                # Process local queue (for non-Redis setups)
-                if not self.redis_client:
-                    try:
-                        message = await asyncio.wait_for(
-                            self.message_queue.get(), timeout=1.0
-                        )
-                        await self._process_received_message(message)
-                    except asyncio.TimeoutError:
-                        continue
-                else:
-                    await asyncio.sleep(0.1)
-
-            except Exception as e:
-                logger.error(f"[MESSAGE-BUS] Processing loop error: {e}")
-                await asyncio.sleep(1.0)
+        """Subscribe to messages for this agent (the transport subscribes on ``initialize``)"""
+        if not self.running:
+            await self.initialize(agent_id)
 
     async def _process_received_message(self, message: AgentMessage):
         """Process received message"""
@@ -322,32 +393,38 @@ class AgentMessageBus:
 
             self.message_stats['received'] += 1
 
-            # Handle correlation responses
-            if message.correlation_id and message.type == MessageType.TASK_RESPONSE:
-                self._handle_correlation_response(message)
-                return
+            # Responses to our own requests
+            if message.correlation_id:
+                response = self.pending_requests.get(message.correlation_id)
+                if response is not None:
+                    if not response.done():
+                        response.set_result(message)
+                    return
 
-            # Find handlers
-            handlers = self.message_handlers.get(message.type, [])
+            handlers = [h for h in self.message_handlers.get(message.type, []) if h.can_handle(message.type)]
+            if handlers:
+                task = asyncio.create_task(self._run_handlers(message, handlers))
+                self.handler_tasks.add(task)
+                task.add_done_callback(self.handler_tasks.discard)
 
-            for handler in handlers:
-                if handler.can_handle(message.type):
-                    try:
-                        response = await handler.handle_message(message)
+        except Exception as e:
+            logger.error(f"[MESSAGE-BUS] Message processing error: {e}")
 
-                        # Send response if generated
-                        if response:
-                            response.recipient_id = message.sender_id
-                            response.correlation_id = message.correlation_id
-                            await self.send_message(response)
+    async def _run_handlers(self, message: AgentMessage, handlers: List[MessageHandler]):
+        for handler in handlers:
+            try:
+                response = await handler.handle_message(message)
 
-                    except Exception as e:
-                        logger.error(f"[MESSAGE-BUS] Handler error: {e}")
+                # Send response if generated
+                if response:
+                    response.recipient_id = message.sender_id
+                    response.correlation_id = message.correlation_id
+                    await self.send_message(response)
 
-            logger.debug(f"[MESSAGE-BUS] Processed message: {message.id}")
+            except Exception as e:
+                logger.error(f"[MESSAGE-BUS] Handler error: {e}")
 
-        except Exception as e:
-            logger.error(f"[MESSAGE-BUS] Message processing error: {e}")
+        logger.debug(f"[MESSAGE-BUS] Processed message: {message.id}")
 
     def _validate_message(self, message: AgentMessage) -> bool:
         """Validate message before sending"""
@@ -365,66 +442,23 @@ class AgentMessageBus:
 
         return True
 
-    def _serialize_message(self, message: AgentMessage) -> str:
-        """Serialize message to JSON"""
-        message_dict = asdict(message)
-
-        # Convert datetime objects to ISO strings
-        if message_dict['timestamp']:
-            message_dict['timestamp'] = message.timestamp.isoformat()
-        if message_dict['expires_at']:
-            message_dict['expires_at'] = message.expires_at.isoformat()
-
-        # Convert enums to strings
-        message_dict['type'] = message.type.value
-        message_dict['priority'] = message.priority.value
-
-        return json.dumps(message_dict)
-
-    def _deserialize_message(self, message_data: str) -> Optional[AgentMessage]:
-        """Deserialize message from JSON"""
-        try:
-            message_dict = json.loads(message_data)
-
-            # Convert ISO strings back to datetime objects
-            if message_dict.get('timestamp'):
-                message_dict['timestamp'] = datetime.fromisoformat(message_dict['timestamp'])
-            if message_dict.get('expires_at'):
-                message_dict['expires_at'] = datetime.fromisoformat(message_dict['expires_at'])
-
-            # Convert strings back to enums
-            message_dict['type'] = MessageType(message_dict['type'])
-            message_dict['priority'] = MessagePriority(message_dict['priority'])
-
-            return AgentMessage(**message_dict)
+    def _serialize_message(self, message: AgentMessage) -> bytes:
+        """Serialize message to the wire format"""
+        return self.codec.encode(message)
 
-        except Exception as e:
-            logger.error(f"[MESSAGE-BUS] Deserialization error: {e}")
-            return None
-
-    def _register_correlation_handler(self, correlation_id: str, handler: Callable):
-        """Register temporary correlation handler"""
-        # Implementation for request-response correlation
-        pass
-
-    def _unregister_correlation_handler(self, correlation_id: str):
-        """Unregister correlation handler"""
-        # Implementation for cleanup
-        pass
-
-    def _handle_correlation_response(self, message: AgentMessage):
-        """Handle correlated response message"""
-        # Implementation for response handling
-        pass
+    def _deserialize_message(self, message_data: bytes) -> Optional[AgentMessage]:
+        """Deserialize message from the wire format"""
+        return self.codec.decode(message_data)
 
     def get_message_stats(self) -> Dict[str, Any]:
         """Get message bus statistics"""
         return {
             'stats': self.message_stats,
-            'active_subscriptions': len(self.subscription_tasks),
-            'pending_messages': len(self.pending_messages),
+            'pending_messages': len(self.pending_requests),
             'agent_id': self.agent_id,
-            'redis_connected': self.redis_client is not None
+            'redis_connected': isinstance(self.transport, RedisStreamsTransport),
+            'transport': self.transport.get_stats() if self.transport else None,
+            'wire_format': self.codec.format
         }
 
 class AgentServiceDiscovery:
@@ -0,0 +1,410 @@
+"""
+ORFEAS Agent Message Transports
+===============================
+Pluggable delivery layer under ``AgentMessageBus``.
+
+Every transport is push-based: a receiver task blocks on its source and
+hands each message to the bus' ``deliver`` coroutine, so nothing polls.
+
+- ``InProcessTransport``: buses in one process (any thread/event loop)
+  share a hub; messages are handed over as objects, nothing is encoded.
+  Senders must not mutate a message after sending it
+- ``UnixSocketTransport``: buses in different processes on one host
+  (gunicorn workers, the startup script).  Each bus listens on
+  ``<dir>/<agent>.sock``; frames are a 4-byte length plus the codec's
+  bytes, written on a cached connection per peer and drained only when
+  the socket buffer fills, so bursts go out in few syscalls
+- ``RedisStreamsTransport``: several hosts.  One stream per agent plus a
+  broadcast stream; each agent reads both through its own consumer group
+  with ``XREADGROUP`` (``COUNT``/``BLOCK`` batches) and acknowledges a
+  batch with one ``XACK``.  Several processes sharing an agent id share
+  its direct stream like a work queue.  Needs ``redis>=4.5``
+  (``redis.asyncio``)
+
+Environment:
+    AGENT_TRANSPORT               auto | inprocess | unix | redis (default: auto,
+                                  Redis Streams when reachable, else in-process)
+    AGENT_SOCKET_DIR              Unix socket directory (default data/agent_sockets)
+    AGENT_STREAM_BATCH            messages per XREADGROUP (default 128)
+    AGENT_STREAM_BLOCK_MS         XREADGROUP block time (default 1000)
+    AGENT_STREAM_MAXLEN           approximate stream length cap (default 10000)
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import re
+import socket
+import struct
+import threading
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+try:
+    import redis.asyncio as redis_asyncio
+    from redis.exceptions import ResponseError as RedisResponseError
+    REDIS_STREAMS_AVAILABLE = True
+except ImportError:
+    REDIS_STREAMS_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+Deliver = Callable[[Any], Awaitable[None]]
+
+FRAME_HEADER = struct.Struct('!I')
+MAX_FRAME_BYTES = 64 * 1024 * 1024
+WRITE_HIGH_WATER = 1024 * 1024
+
+DEFAULT_SOCKET_DIR = 'data/agent_sockets'
+DEFAULT_STREAM_PREFIX = 'orfeas:agents:'
+DEFAULT_STREAM_BATCH = 128
+DEFAULT_STREAM_BLOCK_MS = 1000
+DEFAULT_STREAM_MAXLEN = 10000
+
+
+class MessageTransport(ABC):
+    """Delivers messages between buses; ``message.recipient_id`` None means broadcast"""
+
+    name = 'base'
+
+    def __init__(self):
+        self.agent_id: Optional[str] = None
+        self.stats = {'sent': 0, 'delivered': 0, 'undeliverable': 0, 'errors': 0,
+                      'bytes_out': 0, 'bytes_in': 0}
+
+    @abstractmethod
+    async def start(self, agent_id: str, deliver: Deliver) -> None:
+        """Start receiving messages addressed to ``agent_id`` (and broadcasts)"""
+
+    @abstractmethod
+    async def send(self, message: Any) -> bool:
+        """
+        Queue ``message`` for delivery
+
+        Returns:
+            False if no recipient could be reached
+        """
+
+    @abstractmethod
+    async def stop(self) -> None:
+        """Stop receiving and release connections"""
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {'transport': self.name, **self.stats}
+
+    async def _deliver_safely(self, deliver: Deliver, message: Any) -> None:
+        try:
+            await deliver(message)
+            self.stats['delivered'] += 1
+        except Exception as e:
+            self.stats['errors'] += 1
+            logger.error(f"[MESSAGE-BUS] Delivery error on {self.name}: {e}")
+
+
+# ============================================================================
+# In-process
+# ============================================================================
+
+class InProcessHub:
+    """Routing table of the in-process buses: agent id -> (event loop, inbox)"""
+
+    def __init__(self):
+        self._inboxes: Dict[str, Tuple[asyncio.AbstractEventLoop, asyncio.Queue]] = {}
+        self._lock = threading.Lock()
+
+    def register(self, agent_id: str, loop: asyncio.AbstractEventLoop, inbox: asyncio.Queue) -> None:
+        with self._lock:
+            self._inboxes[agent_id] = (loop, inbox)
+
+    def unregister(self, agent_id: str, inbox: asyncio.Queue) -> None:
+        with self._lock:
+            if self._inboxes.get(agent_id, (None, None))[1] is inbox:
+                del self._inboxes[agent_id]
+
+    def route(self, message: Any, sender_id: Optional[str]) -> int:
+        """Put ``message`` into its recipients' inboxes; returns how many"""
+        with self._lock:
+            if message.recipient_id is not None:
+                target = self._inboxes.get(message.recipient_id)
+                targets = [target] if target else []
+            else:
+                targets = [t for agent_id, t in self._inboxes.items() if agent_id != sender_id]
+        try:
+            current = asyncio.get_running_loop()
+        except RuntimeError:
+            current = None
+        for loop, inbox in targets:
+            if loop is current:
+                inbox.put_nowait(message)
+            else:
+                loop.call_soon_threadsafe(inbox.put_nowait, message)
+        return len(targets)
+
+
+_default_hub = InProcessHub()
+
+
+class InProcessTransport(MessageTransport):
+    """Zero-serialization delivery between buses of one process"""
+
+    name = 'inprocess'
+
+    def __init__(self, hub: Optional[InProcessHub] = None):
+        super().__init__()
+        self.hub = hub or _default_hub
+        self._inbox: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self, agent_id: str, deliver: Deliver) -> None:
+        self.agent_id = agent_id
+        self._inbox = asyncio.Queue()
+        self.hub.register(agent_id, asyncio.get_running_loop(), self._inbox)
+        self._task = asyncio.create_task(self._receive(deliver))
+
+    async def _receive(self, deliver: Deliver) -> None:
+        while True:
+            message = await self._inbox.get()
+            await self._deliver_safely(deliver, message)
+
+    async def send(self, message: Any) -> bool:
+        if self.hub.route(message, self.agent_id):
+            self.stats['sent'] += 1
+            return True
+        if message.recipient_id is None:
+            return True  # broadcast with nobody else listening
+        self.stats['undeliverable'] += 1
+        return False
+
+    async def stop(self) -> None:
+        if self._inbox is not None:
+            self.hub.unregister(self.agent_id, self._inbox)
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+
+# ============================================================================
+# Unix sockets
+# ============================================================================
+
+def _socket_name(agent_id: str) -> str:
+    """File name for an agent's socket; odd or long ids are hashed (sun_path is ~108 bytes)"""
+    safe = re.sub(r'[^A-Za-z0-9_.-]', '_', agent_id)
+    if safe != agent_id or len(safe) > 48:
+        safe = f"{safe[:24]}-{hashlib.sha1(agent_id.encode()).hexdigest()[:16]}"
+    return f"{safe}.sock"
+
+
+class UnixSocketTransport(MessageTransport):
+    """
+    Length-prefixed codec frames over Unix domain sockets
+
+    Args:
+        codec: Object with ``encode(message) -> bytes`` and ``decode(bytes) -> message``
+        directory: Where every bus on the host puts its socket
+    """
+
+    name = 'unix'
+
+    def __init__(self, codec: Any, directory: Optional[str] = None):
+        super().__init__()
+        self.codec = codec
+        self.directory = Path(directory or os.getenv('AGENT_SOCKET_DIR', DEFAULT_SOCKET_DIR))
+        self.path: Optional[Path] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._deliver: Optional[Deliver] = None
+        self._writers: Dict[Path, asyncio.StreamWriter] = {}
+        self._readers: List[asyncio.Task] = []
+
+    async def start(self, agent_id: str, deliver: Deliver) -> None:
+        self.agent_id = agent_id
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.path = self.directory / _socket_name(agent_id)
+        if self.path.exists():
+            self.path.unlink()  # stale socket of a previous run
+        self._deliver = deliver
+        self._server = await asyncio.start_unix_server(self._serve, path=str(self.path))
+        logger.info(f"[MESSAGE-BUS] Listening on {self.path}")
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self._readers.append(asyncio.current_task())
+        try:
+            while True:
+                (length,) = FRAME_HEADER.unpack(await reader.readexactly(FRAME_HEADER.size))
+                if length > MAX_FRAME_BYTES:
+                    raise ValueError(f"frame of {length} bytes")
+                data = await reader.readexactly(length)
+                self.stats['bytes_in'] += length
+                message = self.codec.decode(data)
+                if message is not None:
+                    await self._deliver_safely(self._deliver, message)
+        except (asyncio.IncompleteReadError, ConnectionError, asyncio.CancelledError):
+            pass  # peer went away or we are stopping (asyncio reports a re-raised cancel as an error)
+        except Exception as e:
+            self.stats['errors'] += 1
+            logger.error(f"[MESSAGE-BUS] Dropping connection on {self.path}: {e}")
+        finally:
+            writer.close()
+            self._readers.remove(asyncio.current_task())
+
+    def _peers(self, recipient_id: Optional[str]) -> List[Path]:
+        if recipient_id is not None:
+            return [self.directory / _socket_name(recipient_id)]
+        return [p for p in self.directory.glob('*.sock') if p != self.path]
+
+    async def _writer(self, path: Path) -> asyncio.StreamWriter:
+        writer = self._writers.get(path)
+        if writer is None or writer.is_closing():
+            _, writer = await asyncio.open_unix_connection(str(path))
+            self._writers[path] = writer
+        return writer
+
+    async def send(self, message: Any) -> bool:
+        data = self.codec.encode(message)
+        frame = FRAME_HEADER.pack(len(data)) + data
+        reached = 0
+        for path in self._peers(message.recipient_id):
+            for attempt in (1, 2):  # reconnect once if a cached connection went stale
+                try:
+                    writer = await self._writer(path)
+                    writer.write(frame)
+                    if writer.transport.get_write_buffer_size() > WRITE_HIGH_WATER:
+                        await writer.drain()
+                    reached += 1
+                    self.stats['bytes_out'] += len(frame)
+                    break
+                except OSError as e:
+                    stale = self._writers.pop(path, None)
+                    if stale is not None:
+                        stale.close()
+                    if attempt == 2 or stale is None:
+                        logger.debug(f"[MESSAGE-BUS] Peer {path.name} unreachable: {e}")
+                        break
+        if reached:
+            self.stats['sent'] += 1
+            return True
+        if message.recipient_id is None:
+            return True
+        self.stats['undeliverable'] += 1
+        return False
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        for task in list(self._readers):
+            task.cancel()
+        for writer in self._writers.values():
+            writer.close()
+        self._writers.clear()
+        if self.path is not None and self.path.exists():
+            self.path.unlink()
+
+
+# ============================================================================
+# Redis Streams
+# ============================================================================
+
+class RedisStreamsTransport(MessageTransport):
+    """
+    Redis Streams with one consumer group per agent and batched reads
+
+    Args:
+        codec: Object with ``encode(message) -> bytes`` and ``decode(bytes) -> message``
+        redis_url: Redis connection URL
+        prefix: Stream key prefix
+        batch: Entries per ``XREADGROUP``
+        block_ms: How long one ``XREADGROUP`` blocks
+        maxlen: Approximate per-stream length cap (``XADD MAXLEN ~``)
+    """
+
+    name = 'redis-streams'
+
+    def __init__(self, codec: Any, redis_url: str, prefix: str = DEFAULT_STREAM_PREFIX,
+                 batch: Optional[int] = None, block_ms: Optional[int] = None,
+                 maxlen: Optional[int] = None):
+        super().__init__()
+        if not REDIS_STREAMS_AVAILABLE:
+            raise RuntimeError("redis.asyncio is not installed (pip install 'redis>=4.5')")
+        self.codec = codec
+        self.redis_url = redis_url
+        self.prefix = prefix
+        self.batch = batch or int(os.getenv('AGENT_STREAM_BATCH', str(DEFAULT_STREAM_BATCH)))
+        self.block_ms = block_ms or int(os.getenv('AGENT_STREAM_BLOCK_MS', str(DEFAULT_STREAM_BLOCK_MS)))
+        self.maxlen = maxlen or int(os.getenv('AGENT_STREAM_MAXLEN', str(DEFAULT_STREAM_MAXLEN)))
+        self.consumer = f"{socket.gethostname()}:{os.getpid()}"
+        self.client = None
+        self._task: Optional[asyncio.Task] = None
+
+    def stream(self, agent_id: Optional[str]) -> str:
+        return f"{self.prefix}{agent_id if agent_id is not None else 'broadcast'}"
+
+    async def start(self, agent_id: str, deliver: Deliver) -> None:
+        self.agent_id = agent_id
+        self.client = redis_asyncio.from_url(self.redis_url)
+        await self.client.ping()
+        self._streams = {self.stream(agent_id): '>', self.stream(None): '>'}
+        for stream in self._streams:
+            try:
+                await self.client.xgroup_create(stream, agent_id, id='$', mkstream=True)
+            except RedisResponseError as e:
+                if 'BUSYGROUP' not in str(e):
+                    raise
+        self._task = asyncio.create_task(self._receive(deliver))
+        logger.info(f"[MESSAGE-BUS] Reading Redis streams as {agent_id}/{self.consumer}")
+
+    async def _receive(self, deliver: Deliver) -> None:
+        while True:
+            try:
+                response = await self.client.xreadgroup(self.agent_id, self.consumer, self._streams,
+                                                        count=self.batch, block=self.block_ms)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.stats['errors'] += 1
+                logger.error(f"[MESSAGE-BUS] XREADGROUP failed: {e}")
+                await asyncio.sleep(1.0)
+                continue
+            for stream, entries in response or []:
+                ids = []
+                for entry_id, fields in entries:
+                    ids.append(entry_id)
+                    data = fields.get(b'm')
+                    if data is None:
+                        continue
+                    self.stats['bytes_in'] += len(data)
+                    message = self.codec.decode(data)
+                    if message is not None and message.sender_id != self.agent_id:
+                        await self._deliver_safely(deliver, message)
+                if ids:
+                    await self.client.xack(stream, self.agent_id, *ids)
+
+    async def send(self, message: Any) -> bool:
+        data = self.codec.encode(message)
+        await self.client.xadd(self.stream(message.recipient_id), {'m': data},
+                               maxlen=self.maxlen, approximate=True)
+        self.stats['sent'] += 1
+        self.stats['bytes_out'] += len(data)
+        return True
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        if self.client is not None:
+            await self.client.close()
+            self.client = None
+
+
+def create_transport(kind: str, codec: Any, redis_url: Optional[str] = None) -> MessageTransport:
+    """Build a transport by name (``inprocess``, ``unix``, ``redis``)"""
+    if kind == 'inprocess':
+        return InProcessTransport()
+    if kind == 'unix':
+        return UnixSocketTransport(codec)
+    if kind in ('redis', 'redis-streams'):
+        return RedisStreamsTransport(codec, redis_url or os.getenv('REDIS_URL', 'redis://localhost:6379'))
+    raise ValueError(f"Unknown agent transport: {kind}")
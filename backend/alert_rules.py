@@ -0,0 +1,455 @@
+"""
+Alert Rule Language - Phase 4 Tier 2
+Small rule language for the alerting system, compiled to metric-indexed evaluators
+Rolling window store shared by every rule that references the same metric
+
+Grammar (keywords are case-insensitive):
+
+    rule       := expr [ 'for' DURATION ]
+    expr       := term ( 'or' term )*
+    term       := factor ( 'and' factor )*
+    factor     := '(' expr ')' | value OP NUMBER
+    value      := METRIC | FUNC '(' METRIC '[' DURATION ']' ')'
+    FUNC       := avg | min | max | sum | count | last | delta | rate
+    OP         := > | < | >= | <= | == | !=
+    DURATION   := NUMBER ( 'ms' | 's' | 'm' | 'h' )
+
+Examples:
+
+    gpu_memory_percent >= 95
+    avg(cpu_percent[5m]) > 90 for 2m
+    rate(error_count[1m]) > 5 or (response_time_ms > 1000 and cpu_percent > 80)
+"""
+
+import re
+import threading
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Callable, Deque, Dict, FrozenSet, List, Optional, Tuple
+
+AGGREGATE_FUNCTIONS = ('avg', 'min', 'max', 'sum', 'count', 'last', 'delta', 'rate')
+COMPARISON_OPERATORS = ('>=', '<=', '==', '!=', '>', '<')
+
+_DURATION_UNITS = {'ms': 0.001, 's': 1.0, 'm': 60.0, 'h': 3600.0}
+
+_TOKEN_RE = re.compile(
+    r"\s*(?:"
+    r"(?P<duration>\d+(?:\.\d+)?(?:ms|s|m|h))(?![A-Za-z0-9_])"
+    r"|(?P<number>-?\d+(?:\.\d+)?(?:[eE][-+]?\d+)?)"
+    r"|(?P<op>>=|<=|==|!=|>|<)"
+    r"|(?P<punct>[()\[\]])"
+    r"|(?P<ident>[A-Za-z_][A-Za-z0-9_.:]*)"
+    r")"
+)
+
+_COMPARATORS: Dict[str, Callable[[float, float], bool]] = {
+    '>': lambda value, threshold: value > threshold,
+    '<': lambda value, threshold: value < threshold,
+    '>=': lambda value, threshold: value >= threshold,
+    '<=': lambda value, threshold: value <= threshold,
+    '==': lambda value, threshold: value == threshold,
+    '!=': lambda value, threshold: value != threshold,
+}
+
+
+class AlertRuleSyntaxError(ValueError):
+    """Raised when an alert rule expression cannot be parsed"""
+
+
+def parse_duration(text: str) -> float:
+    """
+    Parse a duration literal such as '30s', '5m' or '1h'
+
+    Args:
+        text: Duration literal
+
+    Returns:
+        Duration in seconds
+    """
+    match = re.fullmatch(r"(\d+(?:\.\d+)?)(ms|s|m|h)", text.strip())
+    if not match:
+        raise AlertRuleSyntaxError(f"Invalid duration: {text!r}")
+    return float(match.group(1)) * _DURATION_UNITS[match.group(2)]
+
+
+# =============================================================================
+# Rolling window store
+# =============================================================================
+
+class RollingWindowStore:
+    """
+    Per-metric rolling sample windows
+
+    Samples older than the longest window any rule needs are trimmed on append,
+    so memory is bounded by retention and by max_samples_per_metric.
+    """
+
+    def __init__(self, default_retention_seconds: float = 0.0, max_samples_per_metric: int = 10000):
+        """
+        Initialize window store
+
+        Args:
+            default_retention_seconds: Retention for metrics no rule asked for explicitly
+            max_samples_per_metric: Hard cap on retained samples per metric
+        """
+        self.default_retention_seconds = default_retention_seconds
+        self.max_samples_per_metric = max_samples_per_metric
+        self._windows: Dict[str, Deque[Tuple[float, float]]] = {}
+        self._retention: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def require_retention(self, metric: str, seconds: float) -> None:
+        """Make sure samples for metric are kept for at least the given window"""
+        with self._lock:
+            if seconds > self._retention.get(metric, 0.0):
+                self._retention[metric] = seconds
+
+    def append(self, metric: str, value: float, timestamp: float) -> None:
+        """Record one sample"""
+        with self._lock:
+            window = self._windows.get(metric)
+            if window is None:
+                window = deque(maxlen=self.max_samples_per_metric)
+                self._windows[metric] = window
+            window.append((timestamp, value))
+            cutoff = timestamp - self._retention.get(metric, self.default_retention_seconds)
+            # Always keep the newest sample so last() works for instantaneous rules
+            while len(window) > 1 and window[0][0] < cutoff:
+                window.popleft()
+
+    def samples(self, metric: str, window_seconds: float, now: float) -> List[Tuple[float, float]]:
+        """Return samples newer than now - window_seconds, oldest first"""
+        with self._lock:
+            window = self._windows.get(metric)
+            if not window:
+                return []
+            if window_seconds <= 0:
+                return [window[-1]]
+            cutoff = now - window_seconds
+            selected = []
+            for sample in reversed(window):
+                if sample[0] < cutoff:
+                    break
+                selected.append(sample)
+        selected.reverse()
+        return selected
+
+    def latest(self, metric: str) -> Optional[float]:
+        """Return the most recent value for metric, if any"""
+        with self._lock:
+            window = self._windows.get(metric)
+            return window[-1][1] if window else None
+
+    def metrics(self) -> List[str]:
+        """Return the names of all metrics with samples"""
+        with self._lock:
+            return list(self._windows)
+
+    def clear(self) -> None:
+        """Drop all samples"""
+        with self._lock:
+            self._windows.clear()
+
+
+def aggregate(func: str, samples: List[Tuple[float, float]]) -> Optional[float]:
+    """
+    Reduce samples with an aggregate function
+
+    Returns None when the window does not hold enough samples for the function.
+    """
+    if not samples:
+        return None
+    if func == 'last':
+        return samples[-1][1]
+    if func == 'count':
+        return float(len(samples))
+    values = [value for _, value in samples]
+    if func == 'avg':
+        return sum(values) / len(values)
+    if func == 'min':
+        return min(values)
+    if func == 'max':
+        return max(values)
+    if func == 'sum':
+        return sum(values)
+    if len(samples) < 2:
+        return None
+    change = samples[-1][1] - samples[0][1]
+    if func == 'delta':
+        return change
+    if func == 'rate':
+        elapsed = samples[-1][0] - samples[0][0]
+        return change / elapsed if elapsed > 0 else None
+    raise AlertRuleSyntaxError(f"Unknown aggregate function: {func}")
+
+
+class EvaluationContext:
+    """
+    Aggregate resolver for one evaluation pass
+
+    Rules that share a (function, metric, window) triple reuse the same result,
+    which keeps evaluation cost proportional to distinct series, not rule count.
+    """
+
+    __slots__ = ('store', 'now', '_memo')
+
+    def __init__(self, store: RollingWindowStore, now: float):
+        self.store = store
+        self.now = now
+        self._memo: Dict[Tuple[str, str, float], Optional[float]] = {}
+
+    def value(self, func: str, metric: str, window_seconds: float) -> Optional[float]:
+        key = (func, metric, window_seconds)
+        try:
+            return self._memo[key]
+        except KeyError:
+            pass
+        if func == 'last' and window_seconds <= 0:
+            result = self.store.latest(metric)
+        else:
+            result = aggregate(func, self.store.samples(metric, window_seconds, self.now))
+        self._memo[key] = result
+        return result
+
+
+# =============================================================================
+# Parser
+# =============================================================================
+
+@dataclass(frozen=True)
+class Comparison:
+    """Leaf condition: aggregate(metric[window]) OP threshold"""
+    func: str
+    metric: str
+    window_seconds: float
+    operator: str
+    threshold: float
+
+
+@dataclass(frozen=True)
+class BooleanOp:
+    """AND / OR over sub-expressions"""
+    operator: str  # 'and' | 'or'
+    operands: Tuple
+
+
+@dataclass
+class ParsedRule:
+    """Parsed rule: condition tree plus optional 'for' duration"""
+    expression: object
+    for_seconds: float = 0.0
+
+
+class _Parser:
+    """Recursive-descent parser over the token stream"""
+
+    def __init__(self, text: str):
+        self.text = text
+        self.tokens = self._tokenize(text)
+        self.position = 0
+
+    @staticmethod
+    def _tokenize(text: str) -> List[Tuple[str, str]]:
+        tokens = []
+        position = 0
+        stripped = text.rstrip()
+        while position < len(stripped):
+            match = _TOKEN_RE.match(stripped, position)
+            if not match or match.end() == position:
+                raise AlertRuleSyntaxError(
+                    f"Unexpected character at position {position} in rule: {text!r}"
+                )
+            kind = match.lastgroup
+            tokens.append((kind, match.group(kind)))
+            position = match.end()
+        return tokens
+
+    def _peek(self) -> Optional[Tuple[str, str]]:
+        return self.tokens[self.position] if self.position < len(self.tokens) else None
+
+    def _next(self) -> Tuple[str, str]:
+        token = self._peek()
+        if token is None:
+            raise AlertRuleSyntaxError(f"Unexpected end of rule: {self.text!r}")
+        self.position += 1
+        return token
+
+    def _expect(self, kind: str, value: Optional[str] = None) -> str:
+        token_kind, token_value = self._next()
+        if token_kind != kind or (value is not None and token_value != value):
+            expected = value or kind
+            raise AlertRuleSyntaxError(
+                f"Expected {expected!r} but found {token_value!r} in rule: {self.text!r}"
+            )
+        return token_value
+
+    def _is_keyword(self, keyword: str) -> bool:
+        token = self._peek()
+        return token is not None and token[0] == 'ident' and token[1].lower() == keyword
+
+    def parse(self) -> ParsedRule:
+        expression = self._parse_or()
+        for_seconds = 0.0
+        if self._is_keyword('for'):
+            self._next()
+            for_seconds = parse_duration(self._expect('duration'))
+        if self._peek() is not None:
+            raise AlertRuleSyntaxError(
+                f"Unexpected token {self._peek()[1]!r} in rule: {self.text!r}"
+            )
+        return ParsedRule(expression=expression, for_seconds=for_seconds)
+
+    def _parse_or(self):
+        operands = [self._parse_and()]
+        while self._is_keyword('or'):
+            self._next()
+            operands.append(self._parse_and())
+        return operands[0] if len(operands) == 1 else BooleanOp('or', tuple(operands))
+
+    def _parse_and(self):
+        operands = [self._parse_factor()]
+        while self._is_keyword('and'):
+            self._next()
+            operands.append(self._parse_factor())
+        return operands[0] if len(operands) == 1 else BooleanOp('and', tuple(operands))
+
+    def _parse_factor(self):
+        token = self._peek()
+        if token == ('punct', '('):
+            self._next()
+            expression = self._parse_or()
+            self._expect('punct', ')')
+            return expression
+
+        func, metric, window_seconds = self._parse_value()
+        operator = self._expect('op')
+        kind, value = self._next()
+        if kind != 'number':
+            raise AlertRuleSyntaxError(
+                f"Expected numeric threshold but found {value!r} in rule: {self.text!r}"
+            )
+        return Comparison(func, metric, window_seconds, operator, float(value))
+
+    def _parse_value(self) -> Tuple[str, str, float]:
+        name = self._expect('ident')
+        if self._peek() != ('punct', '('):
+            return 'last', name, 0.0
+
+        func = name.lower()
+        if func not in AGGREGATE_FUNCTIONS:
+            raise AlertRuleSyntaxError(f"Unknown aggregate function {name!r} in rule: {self.text!r}")
+        self._next()
+        metric = self._expect('ident')
+        self._expect('punct', '[')
+        window_seconds = parse_duration(self._expect('duration'))
+        self._expect('punct', ']')
+        self._expect('punct', ')')
+        return func, metric, window_seconds
+
+
+def parse_rule(text: str) -> ParsedRule:
+    """
+    Parse an alert rule expression
+
+    Args:
+        text: Rule text, e.g. "avg(cpu_percent[5m]) > 90 for 2m"
+
+    Returns:
+        ParsedRule with the condition tree and 'for' duration
+    """
+    if not text or not text.strip():
+        raise AlertRuleSyntaxError("Empty alert rule")
+    return _Parser(text).parse()
+
+
+# =============================================================================
+# Compiler
+# =============================================================================
+
+Evaluator = Callable[[EvaluationContext], Optional[bool]]
+
+
+@dataclass
+class CompiledRule:
+    """
+    Compiled alert rule
+
+    evaluate() returns True/False, or None when a referenced metric has no data
+    yet (the rule's state is left unchanged in that case).
+    """
+    source: str
+    evaluate: Evaluator
+    metrics: FrozenSet[str]
+    for_seconds: float = 0.0
+    windows: Dict[str, float] = field(default_factory=dict)
+    comparisons: List[Comparison] = field(default_factory=list)
+
+
+def _compile_node(node, comparisons: List[Comparison]) -> Evaluator:
+    if isinstance(node, Comparison):
+        comparisons.append(node)
+        compare = _COMPARATORS[node.operator]
+        func, metric, window_seconds, threshold = node.func, node.metric, node.window_seconds, node.threshold
+
+        def evaluate_comparison(ctx: EvaluationContext) -> Optional[bool]:
+            value = ctx.value(func, metric, window_seconds)
+            if value is None:
+                return None
+            return compare(value, threshold)
+
+        return evaluate_comparison
+
+    operands = [_compile_node(operand, comparisons) for operand in node.operands]
+
+    if node.operator == 'and':
+        def evaluate_and(ctx: EvaluationContext) -> Optional[bool]:
+            unknown = False
+            for operand in operands:
+                result = operand(ctx)
+                if result is False:
+                    return False
+                if result is None:
+                    unknown = True
+            return None if unknown else True
+
+        return evaluate_and
+
+    def evaluate_or(ctx: EvaluationContext) -> Optional[bool]:
+        unknown = False
+        for operand in operands:
+            result = operand(ctx)
+            if result is True:
+                return True
+            if result is None:
+                unknown = True
+        return None if unknown else False
+
+    return evaluate_or
+
+
+def compile_rule(text: str) -> CompiledRule:
+    """
+    Parse and compile an alert rule into a closure-based evaluator
+
+    Args:
+        text: Rule text
+
+    Returns:
+        CompiledRule indexed by the metrics it references
+    """
+    parsed = parse_rule(text)
+    comparisons: List[Comparison] = []
+    evaluator = _compile_node(parsed.expression, comparisons)
+
+    windows: Dict[str, float] = {}
+    for comparison in comparisons:
+        windows[comparison.metric] = max(windows.get(comparison.metric, 0.0), comparison.window_seconds)
+
+    return CompiledRule(
+        source=text,
+        evaluate=evaluator,
+        metrics=frozenset(windows),
+        for_seconds=parsed.for_seconds,
+        windows=windows,
+        comparisons=comparisons,
+    )
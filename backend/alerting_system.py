@@ -2,17 +2,29 @@
 Advanced Alerting System - Phase 4 Tier 2
 Configurable alerts for performance, resource, and application metrics
 Severity-based routing with subscriber callbacks for automated response
+Rules are compiled once and indexed by metric; evaluation runs on a scheduler thread
 """
 
 import logging
+import time
 from typing import Dict, List, Callable, Optional, Set
 from datetime import datetime, timedelta
 from enum import Enum
 from dataclasses import dataclass
 import threading
 
+from alert_rules import (
+    CompiledRule,
+    EvaluationContext,
+    RollingWindowStore,
+    compile_rule,
+)
+
 logger = logging.getLogger(__name__)
 
+# Inverse comparisons used to build hysteresis clear rules from a clear_threshold
+_CLEAR_COMPARISONS = {'>': '<', '>=': '<', '<': '>', '<=': '>'}
+
 
 class AlertSeverity(Enum):
     """Alert severity levels"""
@@ -23,6 +35,7 @@ class AlertSeverity(Enum):
 
 class AlertStatus(Enum):
     """Alert status"""
+    PENDING = "pending"
     ACTIVE = "active"
     ACKNOWLEDGED = "acknowledged"
     RESOLVED = "resolved"
@@ -40,6 +53,9 @@ class Alert:
     duration_seconds: int = 0  # Alert only if condition persists for this duration
     cooldown_seconds: int = 300  # Don't re-trigger for this duration
     enabled: bool = True
+    expression: Optional[str] = None  # Rule language expression, overrides metric/threshold
+    clear_threshold: Optional[float] = None  # Hysteresis: stay active until this level is crossed
+    clear_expression: Optional[str] = None  # Hysteresis as a full rule expression
 
     # State
     triggered: bool = False
@@ -48,20 +64,78 @@ class Alert:
     last_cleared: Optional[datetime] = None
     trigger_count: int = 0
     cooldown_until: Optional[datetime] = None
+    pending_since: Optional[float] = None
+
+    @classmethod
+    def from_rule(cls, name: str, expression: str, severity: AlertSeverity,
+                  message: str, **kwargs) -> 'Alert':
+        """
+        Create an alert from a rule expression
+
+        Args:
+            name: Alert name
+            expression: Rule text, e.g. "avg(cpu_percent[5m]) > 90 for 2m"
+            severity: Alert severity
+            message: Alert message
+            **kwargs: Any other Alert field (cooldown_seconds, clear_expression, ...)
+        """
+        rule = compile_rule(expression)
+        first = rule.comparisons[0]
+        return cls(
+            name=name,
+            metric=','.join(sorted(rule.metrics)),
+            threshold=first.threshold,
+            severity=severity,
+            message=message,
+            comparison=first.operator,
+            expression=expression,
+            **kwargs
+        )
+
+    def rule_text(self) -> str:
+        """Rule expression this alert evaluates"""
+        if self.expression:
+            return self.expression
+        text = f"{self.metric} {self.comparison} {self.threshold}"
+        if self.duration_seconds:
+            text += f" for {self.duration_seconds}s"
+        return text
+
+    def clear_rule_text(self) -> Optional[str]:
+        """Hysteresis clear expression, if configured"""
+        if self.clear_expression:
+            return self.clear_expression
+        if self.clear_threshold is not None and self.comparison in _CLEAR_COMPARISONS:
+            return f"{self.metric} {_CLEAR_COMPARISONS[self.comparison]} {self.clear_threshold}"
+        return None
+
+
+@dataclass
+class _RegisteredRule:
+    """Compiled rule pair attached to a registered alert"""
+    alert: Alert
+    rule: CompiledRule
+    clear_rule: Optional[CompiledRule]
 
 
 class AlertingSystem:
     """
     Configurable alerting system for comprehensive monitoring
     Supports alert registration, evaluation, and multi-channel notification
+
+    check_alerts() only records samples into the rolling window store. Rules are
+    evaluated by evaluate(), either inline (no scheduler) or on the scheduler thread
+    started with start_scheduler(), and only rules indexed under metrics that
+    received samples since the last pass are touched.
     """
 
-    def __init__(self, enable_logging: bool = True):
+    def __init__(self, enable_logging: bool = True, window_store: Optional[RollingWindowStore] = None):
         """
         Initialize alerting system
 
         Args:
             enable_logging: Whether to log all alert events
+            window_store: Rolling window store (created if not provided)
         """
         self.alerts: List[Alert] = []
         self.subscribers: Dict[AlertSeverity, Set[Callable]] = {
@@ -79,9 +153,26 @@ class AlertingSystem:
             'total_alerts_cleared': 0,
             'info_count': 0,
             'warning_count': 0,
-            'critical_count': 0
+            'critical_count': 0,
+            'evaluation_passes': 0,
+            'rules_evaluated': 0
         }
 
+        # Compiled rule index
+        self.window_store = window_store or RollingWindowStore()
+        self._rules: Dict[str, _RegisteredRule] = {}
+        self._rules_by_metric: Dict[str, List[_RegisteredRule]] = {}
+
+        # Evaluation work queue: metrics with new samples and rules waiting on 'for'
+        self._dirty_lock = threading.Lock()
+        self._dirty_metrics: Set[str] = set()
+        self._pending_rules: Set[str] = set()
+
+        # Scheduler
+        self._scheduler_thread: Optional[threading.Thread] = None
+        self._scheduler_stop = threading.Event()
+        self.evaluation_interval = 1.0
+
     def register_alert(self, alert: Alert) -> None:
         """
         Register an alert
@@ -89,14 +180,28 @@ class AlertingSystem:
         Args:
             alert: Alert configuration to register
         """
+        rule = compile_rule(alert.rule_text())
+        clear_text = alert.clear_rule_text()
+        clear_rule = compile_rule(clear_text) if clear_text else None
+        registered = _RegisteredRule(alert=alert, rule=rule, clear_rule=clear_rule)
+
+        for compiled in (rule, clear_rule):
+            if compiled is None:
+                continue
+            for metric, window in compiled.windows.items():
+                self.window_store.require_retention(metric, window)
+
         with self._lock:
             self.alerts.append(alert)
+            self._rules[alert.name] = registered
+            indexed_metrics = rule.metrics | (clear_rule.metrics if clear_rule else frozenset())
+            for metric in indexed_metrics:
+                self._rules_by_metric.setdefault(metric, []).append(registered)
 
         if self.enable_logging:
             logger.info(
                 f"[ALERTS] Registered alert: {alert.name} "
-                f"(metric={alert.metric}, threshold={alert.threshold}, "
-                f"severity={alert.severity.value})"
+                f"(rule={rule.source!r}, severity={alert.severity.value})"
             )
 
     def deregister_alert(self, alert_name: str) -> bool:
@@ -105,39 +210,160 @@ class AlertingSystem:
             for i, alert in enumerate(self.alerts):
                 if alert.name == alert_name:
                     self.alerts.pop(i)
+                    registered = self._rules.pop(alert_name, None)
+                    if registered is not None:
+                        for metric, entries in list(self._rules_by_metric.items()):
+                            remaining = [entry for entry in entries if entry is not registered]
+                            if remaining:
+                                self._rules_by_metric[metric] = remaining
+                            else:
+                                del self._rules_by_metric[metric]
+                    self._mark_pending(alert_name, False)
                     if self.enable_logging:
                         logger.info(f"[ALERTS] Deregistered alert: {alert_name}")
                     return True
         return False
 
+    def record_metrics(self, metrics: Dict, timestamp: Optional[float] = None) -> None:
+        """
+        Record metric samples into the rolling window store
+
+        Cheap enough for the request path: one append per numeric metric and
+        no rule evaluation.
+
+        Args:
+            metrics: Metric values keyed by metric name
+            timestamp: Sample time in epoch seconds (defaults to now)
+        """
+        now = time.time() if timestamp is None else timestamp
+        recorded = []
+        for metric, value in metrics.items():
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                continue
+            self.window_store.append(metric, float(value), now)
+            recorded.append(metric)
+
+        with self._dirty_lock:
+            self._dirty_metrics.update(recorded)
+
     def check_alerts(self, metrics: Dict) -> None:
         """
-        Check all registered alerts against current metrics
+        Check registered alerts against current metrics
+
+        Samples are recorded immediately; when the scheduler is running the
+        rules are evaluated on its next tick, otherwise they are evaluated inline.
 
         Args:
             metrics: Current metric values
         """
+        self.record_metrics(metrics)
+        if not self.is_scheduler_running():
+            self.evaluate()
+
+    def evaluate(self, now: Optional[float] = None) -> int:
+        """
+        Evaluate rules affected by new samples plus rules waiting on a 'for' duration
+
+        Args:
+            now: Evaluation time in epoch seconds (defaults to now)
+
+        Returns:
+            Number of rules evaluated
+        """
+        now = time.time() if now is None else now
+
+        with self._dirty_lock:
+            dirty_metrics = self._dirty_metrics
+            self._dirty_metrics = set()
+            pending_names = set(self._pending_rules)
+
+        ctx = EvaluationContext(self.window_store, now)
+        events: List[Dict] = []
+        evaluated = 0
+
         with self._lock:
-            for alert in self.alerts:
-                if not alert.enabled:
+            candidates: Dict[int, _RegisteredRule] = {}
+            for metric in dirty_metrics:
+                for registered in self._rules_by_metric.get(metric, ()):
+                    candidates[id(registered)] = registered
+            for name in pending_names:
+                registered = self._rules.get(name)
+                if registered is not None:
+                    candidates[id(registered)] = registered
+
+            for registered in candidates.values():
+                if not registered.alert.enabled:
                     continue
+                evaluated += 1
+                event = self._evaluate_rule(registered, ctx, now)
+                if event is not None:
+                    events.append(event)
 
-                if alert.metric not in metrics:
-                    continue
+            self.stats['evaluation_passes'] += 1
+            self.stats['rules_evaluated'] += evaluated
 
-                value = metrics[alert.metric]
+        for event in events:
+            if event.get('event_type') != 'cleared':
+                self._notify_subscribers(event)
 
-                # Check comparison
-                should_trigger = self._evaluate_condition(value, alert.threshold, alert.comparison)
+        return evaluated
 
-                if should_trigger:
-                    if not alert.triggered:
-                        self._trigger_alert(alert, value, metrics)
-                    alert.triggered = True
-                else:
-                    if alert.triggered:
-                        self._clear_alert(alert, metrics)
-                    alert.triggered = False
+    def _evaluate_rule(self, registered: _RegisteredRule, ctx: EvaluationContext,
+                       now: float) -> Optional[Dict]:
+        """
+        Advance one alert's state machine (caller holds self._lock)
+
+        inactive -> pending (condition true, 'for' not yet elapsed) -> active;
+        active -> resolved when the condition (or hysteresis clear rule) says so.
+        """
+        alert = registered.alert
+        rule = registered.rule
+        condition = rule.evaluate(ctx)
+
+        if alert.triggered:
+            if registered.clear_rule is not None:
+                should_clear = registered.clear_rule.evaluate(ctx)
+            else:
+                should_clear = None if condition is None else not condition
+            if should_clear:
+                alert.triggered = False
+                alert.pending_since = None
+                return self._clear_alert(alert, {})
+            return None
+
+        if condition is None:
+            return None
+
+        if not condition:
+            if alert.pending_since is not None:
+                alert.pending_since = None
+                alert.status = AlertStatus.RESOLVED
+                self._mark_pending(alert.name, False)
+            return None
+
+        if rule.for_seconds > 0:
+            if alert.pending_since is None:
+                alert.pending_since = now
+                alert.status = AlertStatus.PENDING
+                self._mark_pending(alert.name, True)
+                return None
+            if now - alert.pending_since < rule.for_seconds:
+                return None
+            self._mark_pending(alert.name, False)
+
+        alert.triggered = True
+        alert.pending_since = None
+        first = rule.comparisons[0]
+        value = ctx.value(first.func, first.metric, first.window_seconds)
+        return self._trigger_alert(alert, value, {})
+
+    def _mark_pending(self, alert_name: str, pending: bool) -> None:
+        """Track rules that must be re-evaluated on every tick until 'for' elapses"""
+        with self._dirty_lock:
+            if pending:
+                self._pending_rules.add(alert_name)
+            else:
+                self._pending_rules.discard(alert_name)
 
     def _evaluate_condition(self, value: float, threshold: float, comparison: str) -> bool:
         """Evaluate alert condition"""
@@ -155,14 +381,17 @@ class AlertingSystem:
             return value != threshold
         return False
 
-    def _trigger_alert(self, alert: Alert, value: float, metrics: Dict) -> None:
+    def _trigger_alert(self, alert: Alert, value: float, metrics: Dict) -> Optional[Dict]:
         """
-        Trigger an alert
+        Trigger an alert (caller holds self._lock)
 
         Args:
             alert: Alert to trigger
             value: Current metric value
             metrics: All current metrics
+
+        Returns:
+            Alert event to notify subscribers with, or None if in cooldown
         """
         now = datetime.now()
 
@@ -173,7 +402,7 @@ class AlertingSystem:
                     f"[ALERTS] {alert.name} in cooldown until "
                     f"{alert.cooldown_until.isoformat()}"
                 )
-            return
+            return None
 
         alert.status = AlertStatus.ACTIVE
         alert.last_triggered = now
@@ -194,35 +423,38 @@ class AlertingSystem:
             'threshold': alert.threshold,
             'trigger_count': alert.trigger_count
         }
+        if alert.expression:
+            alert_event['expression'] = alert.expression
 
         # Add to history
-        with self._lock:
-            self.alert_history.append(alert_event)
-            if len(self.alert_history) > self.max_history:
-                self.alert_history = self.alert_history[-self.max_history:]
-
-            # Update stats
-            self.stats['total_alerts_triggered'] += 1
-            if alert.severity == AlertSeverity.INFO:
-                self.stats['info_count'] += 1
-            elif alert.severity == AlertSeverity.WARNING:
-                self.stats['warning_count'] += 1
-            elif alert.severity == AlertSeverity.CRITICAL:
-                self.stats['critical_count'] += 1
-
-        # Notify subscribers
-        self._notify_subscribers(alert_event)
+        self.alert_history.append(alert_event)
+        if len(self.alert_history) > self.max_history:
+            self.alert_history = self.alert_history[-self.max_history:]
+
+        # Update stats
+        self.stats['total_alerts_triggered'] += 1
+        if alert.severity == AlertSeverity.INFO:
+            self.stats['info_count'] += 1
+        elif alert.severity == AlertSeverity.WARNING:
+            self.stats['warning_count'] += 1
+        elif alert.severity == AlertSeverity.CRITICAL:
+            self.stats['critical_count'] += 1
 
         if self.enable_logging:
             logger.warning(f"[ALERT] TRIGGERED: {alert.name}: {message}")
 
-    def _clear_alert(self, alert: Alert, metrics: Dict) -> None:
+        return alert_event
+
+    def _clear_alert(self, alert: Alert, metrics: Dict) -> Dict:
         """
-        Clear a triggered alert
+        Clear a triggered alert (caller holds self._lock)
 
         Args:
             alert: Alert to clear
             metrics: Current metrics
+
+        Returns:
+            Clear event
         """
         now = datetime.now()
         alert.status = AlertStatus.RESOLVED
@@ -240,36 +472,94 @@ class AlertingSystem:
             )
         }
 
-        with self._lock:
-            self.alert_history.append(clear_event)
-            self.stats['total_alerts_cleared'] += 1
+        self.alert_history.append(clear_event)
+        if len(self.alert_history) > self.max_history:
+            self.alert_history = self.alert_history[-self.max_history:]
+        self.stats['total_alerts_cleared'] += 1
 
         if self.enable_logging:
             logger.info(f"[ALERT] CLEARED: {alert.name}")
 
+        return clear_event
+
     def _notify_subscribers(self, alert_event: Dict) -> None:
         """
         Notify alert subscribers
 
+        Callbacks run outside the lock so a subscriber can query the alerting system.
+
         Args:
             alert_event: Alert event to notify about
         """
         severity = AlertSeverity(alert_event['severity'])
 
-        # Notify severity-specific subscribers
         with self._lock:
-            for callback in self.subscribers.get(severity, set()).copy():
-                try:
-                    callback(alert_event)
-                except Exception as e:
-                    logger.error(f"[ALERTS] Subscriber callback failed: {e}")
-
-            # Notify all-severity subscribers
-            for callback in self.all_subscribers.copy():
-                try:
-                    callback(alert_event)
-                except Exception as e:
-                    logger.error(f"[ALERTS] All-severity callback failed: {e}")
+            severity_callbacks = list(self.subscribers.get(severity, set()))
+            all_callbacks = list(self.all_subscribers)
+
+        # Notify severity-specific subscribers
+        for callback in severity_callbacks:
+            try:
+                callback(alert_event)
+            except Exception as e:
+                logger.error(f"[ALERTS] Subscriber callback failed: {e}")
+
+        # Notify all-severity subscribers
+        for callback in all_callbacks:
+            try:
+                callback(alert_event)
+            except Exception as e:
+                logger.error(f"[ALERTS] All-severity callback failed: {e}")
+
+    # =========================================================================
+    # Scheduler
+    # =========================================================================
+
+    def start_scheduler(self, interval_seconds: float = 1.0) -> None:
+        """
+        Start the dedicated evaluation thread
+
+        Args:
+            interval_seconds: Seconds between evaluation passes
+        """
+        if self.is_scheduler_running():
+            return
+
+        self.evaluation_interval = interval_seconds
+        self._scheduler_stop.clear()
+        self._scheduler_thread = threading.Thread(
+            target=self._scheduler_loop,
+            name="AlertEvaluationScheduler",
+            daemon=True
+        )
+        self._scheduler_thread.start()
+
+        if self.enable_logging:
+            logger.info(f"[ALERTS] Evaluation scheduler started (interval={interval_seconds}s)")
+
+    def stop_scheduler(self, timeout: float = 5.0) -> None:
+        """Stop the evaluation thread"""
+        thread = self._scheduler_thread
+        if thread is None:
+            return
+        self._scheduler_stop.set()
+        thread.join(timeout=timeout)
+        self._scheduler_thread = None
+
+        if self.enable_logging:
+            logger.info("[ALERTS] Evaluation scheduler stopped")
+
+    def is_scheduler_running(self) -> bool:
+        """Whether the evaluation thread is alive"""
+        return self._scheduler_thread is not None and self._scheduler_thread.is_alive()
+
+    def _scheduler_loop(self) -> None:
+        """Evaluation loop run on the scheduler thread"""
+        while not self._scheduler_stop.wait(self.evaluation_interval):
+            try:
+                self.evaluate()
+            except Exception as e:
+                logger.error(f"[ALERTS] Evaluation pass failed: {e}")
 
     def subscribe(self, severity: Optional[AlertSeverity], callback: Callable) -> None:
         """
@@ -362,7 +652,13 @@ class AlertingSystem:
                     'critical': len(self.subscribers[AlertSeverity.CRITICAL]),
                     'all_severity': len(self.all_subscribers)
                 },
-                'history_size': len(self.alert_history)
+                'history_size': len(self.alert_history),
+                'evaluation': {
+                    'indexed_metrics': len(self._rules_by_metric),
+                    'evaluation_passes': self.stats['evaluation_passes'],
+                    'rules_evaluated': self.stats['rules_evaluated'],
+                    'scheduler_running': self.is_scheduler_running()
+                }
             }
 
 
@@ -483,6 +779,9 @@ def get_alerting_system() -> AlertingSystem:
         for alert in create_default_alerts():
             _alerting_system.register_alert(alert)
 
+        # Evaluate off the request path
+        _alerting_system.start_scheduler()
+
         logger.info("[ALERTS] Alerting system initialized with default alerts")
 
     return _alerting_system
@@ -491,4 +790,6 @@ def get_alerting_system() -> AlertingSystem:
 def reset_alerting_system() -> None:
     """Reset alerting system (for testing)"""
     global _alerting_system
+    if _alerting_system is not None:
+        _alerting_system.stop_scheduler()
     _alerting_system = None
@@ -10,6 +10,7 @@ Features:
 - WebGPU-friendly texture formats
 - Physics metadata for Havok engine
 - Advanced material properties
+- Binary GLB export (quantized / meshopt-compressed, MSFT_lod chain)
 """
 
 import logging
@@ -19,6 +20,14 @@ from stl import mesh
 from PIL import Image
 import struct
 
+from glb_export import (
+    build_lod_chain,
+    compute_flat_normals,
+    compute_vertex_normals,
+    export_glb,
+    planar_uvs,
+)
+
 logger = logging.getLogger(__name__)
 
 
@@ -98,64 +107,18 @@ class BabylonMeshOptimizer:
 
     def _compute_smooth_normals(self, vertices: np.ndarray, faces: np.ndarray) -> np.ndarray:
         """Compute smooth vertex normals (better for PBR)"""
-        normals = np.zeros_like(vertices)
-
-        for face in faces:
-            # Get triangle vertices
-            v0, v1, v2 = vertices[face[0]], vertices[face[1]], vertices[face[2]]
-
-            # Compute face normal
-            edge1 = v1 - v0
-            edge2 = v2 - v0
-            face_normal = np.cross(edge1, edge2)
-
-            # Accumulate to vertex normals
-            normals[face[0]] += face_normal
-            normals[face[1]] += face_normal
-            normals[face[2]] += face_normal
-
-        # Normalize
-        norms = np.linalg.norm(normals, axis=1, keepdims=True)
-        norms[norms == 0] = 1  # Avoid division by zero
-        normals = normals / norms
-
-        return normals
+        return compute_vertex_normals(vertices, faces)
 
     def _compute_flat_normals(self, vertices: np.ndarray, faces: np.ndarray) -> np.ndarray:
         """Compute flat face normals (sharp edges)"""
-        normals = []
-
-        for face in faces:
-            v0, v1, v2 = vertices[face[0]], vertices[face[1]], vertices[face[2]]
-            edge1 = v1 - v0
-            edge2 = v2 - v0
-            normal = np.cross(edge1, edge2)
-            normal = normal / (np.linalg.norm(normal) + 1e-8)
-
-            # Same normal for all 3 vertices (flat shading)
-            normals.extend([normal, normal, normal])
-
-        return np.array(normals)
+        return compute_flat_normals(vertices, faces)
 
     def _generate_uv_coordinates(self, vertices: np.ndarray) -> np.ndarray:
         """
         Generate UV texture coordinates using planar projection
         Babylon.js requires UVs for proper material rendering
         """
-        # Find bounding box
-        min_coords = vertices.min(axis=0)
-        max_coords = vertices.max(axis=0)
-        ranges = max_coords - min_coords
-
-        # Avoid division by zero
-        ranges[ranges == 0] = 1.0
-
-        # Planar UV projection (X, Z axes)
-        uvs = np.zeros((len(vertices), 2))
-        uvs[:, 0] = (vertices[:, 0] - min_coords[0]) / ranges[0]  # U from X
-        uvs[:, 1] = (vertices[:, 2] - min_coords[2]) / ranges[2]  # V from Z
-
-        return uvs
+        return planar_uvs(vertices)
 
     def _compute_bounding_box(self, vertices: np.ndarray) -> Dict[str, Tuple[float, float, float]]:
         """Compute mesh bounding box for frustum culling"""
@@ -296,6 +259,61 @@ class BabylonMeshOptimizer:
         return export_data
 
 
+    def export_glb(
+        self,
+        vertices: np.ndarray,
+        faces: np.ndarray,
+        compute_smooth_normals: bool = True,
+        quantize: bool = True,
+        compress: bool = True,
+        simplifier: Optional[Any] = None,
+        lod_ratios: Tuple[float, ...] = (0.5, 0.25),
+        base_color: Tuple[float, float, float] = (0.8, 0.8, 0.8),
+        metallic: float = 0.0,
+        roughness: float = 0.5
+    ) -> bytes:
+        """
+        Binary glTF export for Babylon.js (replaces the JSON mesh payload)
+
+        Args:
+            vertices: Mesh vertices (Nx3)
+            faces: Mesh faces (Nx3 indices)
+            compute_smooth_normals: Use smooth shading
+            quantize: KHR_mesh_quantization attributes (16 bytes/vertex)
+            compress: EXT_meshopt_compression buffer views
+            simplifier: ``(vertices, faces, target_faces) -> (vertices, faces)``
+                used to build the MSFT_lod chain; no LODs when None
+            lod_ratios: Face-count fraction of each LOD level
+            base_color: RGB color (0-1 range)
+            metallic: Metallic factor (0=dielectric, 1=metal)
+            roughness: Roughness factor (0=smooth, 1=rough)
+
+        Returns:
+            bytes: GLB file content
+        """
+        lods = build_lod_chain(vertices, faces, simplifier, lod_ratios) if simplifier else []
+        material = {
+            'name': 'GeneratedMaterial',
+            'pbrMetallicRoughness': {
+                'baseColorFactor': list(base_color) + [1.0],
+                'metallicFactor': metallic,
+                'roughnessFactor': roughness
+            }
+        }
+        glb = export_glb(
+            vertices, faces,
+            smooth_normals=compute_smooth_normals,
+            quantize=quantize,
+            compress=compress,
+            lods=lods,
+            material=material
+        )
+
+        logger.info(f"[OK] GLB export: {len(glb)} bytes, {len(lods)} LOD level(s), "
+                    f"quantized={quantize}, meshopt={compress}")
+        return glb
+
+
 # Global optimizer instance
 babylon_optimizer = None
 
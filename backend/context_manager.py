@@ -8,21 +8,85 @@ Features:
 - Contextual recommendations and insights
 - Context persistence and learning
 - Multi-dimensional context analysis
+
+Persistence is off the request path: ``persist_context`` only enqueues,
+a background writer batches rows into transactions on a WAL database,
+and finished rows land in an in-memory nearest-neighbour index over
+context feature vectors that ``find_similar_contexts`` searches.
+
+Environment:
+    CONTEXT_DB_PATH               SQLite database (default data/context.db)
+    CONTEXT_WRITER_BATCH          rows per write transaction (default 256)
+    CONTEXT_WRITER_QUEUE          queued rows before new ones are dropped (default 10000)
+    CONTEXT_INDEX_SIZE            contexts kept in the similarity index (default 50000)
+    CONTEXT_STATS_TTL             seconds aggregate statistics are cached (default 30)
 """
 
 import os
 import json
+import queue
 import time
 import hashlib
 import sqlite3
 import threading
+import weakref
 from datetime import datetime
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Callable, Optional, Tuple, Union
 from dataclasses import dataclass, asdict
 import logging
 
+import numpy as np
+
 logger = logging.getLogger(__name__)
 
+WEEK_SECONDS = 604800
+DAY_SECONDS = 86400
+DEFAULT_WRITER_BATCH = 256
+DEFAULT_WRITER_QUEUE = 10000
+DEFAULT_INDEX_SIZE = 50000
+DEFAULT_STATS_TTL = 30.0
+TREND_TOLERANCE = 0.02
+
+# Prepared statements: constant SQL is compiled once per connection (sqlite3 statement cache)
+INSERT_CONTEXT_SQL = """
+    INSERT INTO context_history
+    (session_id, timestamp, context_data, context_hash, success,
+     processing_time, quality_score, model_used, resource_usage, context_vector)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+MODEL_PERFORMANCE_SQL = """
+    SELECT model_used, AVG(processing_time), AVG(quality_score), COUNT(*)
+    FROM context_history
+    WHERE timestamp > ? AND success = 1
+    GROUP BY model_used
+"""
+SUCCESS_RATE_SQL = """
+    SELECT AVG(CAST(success AS REAL)) FROM context_history
+    WHERE timestamp > ?
+"""
+TREND_SQL = """
+    SELECT CAST((timestamp - ?) / ? AS INTEGER) AS bucket, COUNT(*),
+           AVG(CAST(success AS REAL)), AVG(processing_time), AVG(quality_score)
+    FROM context_history
+    WHERE timestamp > ?
+    GROUP BY bucket
+    ORDER BY bucket
+"""
+INDEX_LOAD_SQL = """
+    SELECT context_hash, timestamp, success, processing_time, quality_score, context_vector, context_data
+    FROM context_history
+    WHERE timestamp > ?
+    ORDER BY id DESC
+    LIMIT ?
+"""
+HASH_LOOKUP_SQL = """
+    SELECT context_hash, timestamp, success, processing_time, quality_score
+    FROM context_history
+    WHERE context_hash = ? AND timestamp > ?
+    ORDER BY id DESC
+    LIMIT ?
+"""
+
 @dataclass
 class ProcessingContext:
     """Structured processing context"""
@@ -35,6 +99,262 @@ class ProcessingContext:
     timestamp: str
     context_hash: str
 
+INPUT_TYPES = ('image', 'text', '3d_model', 'unknown')
+PROCESSING_PRIORITIES = ('normal', 'high', 'urgent')
+QUALITY_PRIORITIES = ('balanced', 'accuracy', 'speed')
+
+
+def _unit(value: Any, scale: float = 1.0) -> float:
+    """``value / scale`` clipped to [0, 1]; non-numbers count as 0"""
+    try:
+        return min(max(float(value) / scale, 0.0), 1.0)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def context_vector(context: ProcessingContext) -> np.ndarray:
+    """
+    Feature vector of a processing context, every component in [0, 1]
+
+    Input type, priority and quality priority are one-hot; complexity,
+    target quality, load and resource usage are scaled.
+    """
+    analysis = context.input_analysis or {}
+    quality = context.quality_context or {}
+    system = context.system_context or {}
+    resources = context.resource_context or {}
+    features = [1.0 if analysis.get('input_type') == t else 0.0 for t in INPUT_TYPES]
+    features.append(_unit(analysis.get('complexity_score')))
+    features += [1.0 if analysis.get('processing_priority') == p else 0.0 for p in PROCESSING_PRIORITIES]
+    features.append(_unit(quality.get('target_quality'), 10.0))
+    features += [1.0 if quality.get('quality_priority') == p else 0.0 for p in QUALITY_PRIORITIES]
+    features += [
+        1.0 if (context.user_context or {}).get('type') == 'registered' else 0.0,
+        _unit(system.get('current_load')),
+        _unit(system.get('queue_length'), 10.0),
+        _unit(resources.get('cpu_usage'), 100.0),
+        _unit(resources.get('memory_usage'), 100.0),
+        _unit(resources.get('gpu_memory_free'), 24000.0),
+        1.0 if resources.get('gpu_available') else 0.0,
+    ]
+    return np.asarray(features, dtype=np.float32)
+
+
+CONTEXT_FEATURE_DIM = len(context_vector(ProcessingContext({}, {}, {}, {}, {}, {}, '', '')))
+
+
+class ContextIndex:
+    """
+    Exact k-nearest-neighbour search over recent context vectors
+
+    A fixed-capacity ring of vectors plus the outcome of each context;
+    similarity is ``1 - euclidean distance / sqrt(dim)``, so 1 means
+    identical features and contexts differing in one one-hot group
+    score below 0.7.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_INDEX_SIZE, dim: int = CONTEXT_FEATURE_DIM):
+        self.capacity = capacity
+        self.dim = dim
+        self.vectors = np.zeros((capacity, dim), dtype=np.float32)
+        self.timestamps = np.zeros(capacity, dtype=np.float64)
+        self.success = np.zeros(capacity, dtype=bool)
+        self.processing_time = np.zeros(capacity, dtype=np.float64)
+        self.quality_score = np.zeros(capacity, dtype=np.float64)
+        self.hashes: List[Optional[str]] = [None] * capacity
+        self.by_hash: Dict[str, int] = {}
+        self.size = 0
+        self.next_slot = 0
+        self._lock = threading.Lock()
+
+    def add(self, vector: np.ndarray, context_hash: str, timestamp: float, success: bool,
+            processing_time: float, quality_score: float) -> None:
+        with self._lock:
+            slot = self.next_slot
+            old_hash = self.hashes[slot]
+            if old_hash is not None and self.by_hash.get(old_hash) == slot:
+                del self.by_hash[old_hash]
+            self.vectors[slot] = vector
+            self.timestamps[slot] = timestamp
+            self.success[slot] = bool(success)
+            self.processing_time[slot] = processing_time or 0.0
+            self.quality_score[slot] = quality_score or 0.0
+            self.hashes[slot] = context_hash
+            self.by_hash[context_hash] = slot
+            self.next_slot = (slot + 1) % self.capacity
+            self.size = min(self.size + 1, self.capacity)
+
+    def vector_for(self, context_hash: str) -> Optional[np.ndarray]:
+        with self._lock:
+            slot = self.by_hash.get(context_hash)
+            return None if slot is None else self.vectors[slot].copy()
+
+    def search(self, vector: np.ndarray, k: int = 10, threshold: float = 0.0,
+               since: float = 0.0) -> List[Dict[str, Any]]:
+        """Up to ``k`` contexts newer than ``since`` with similarity >= ``threshold``, most similar first"""
+        with self._lock:
+            n = self.size
+            if n == 0:
+                return []
+            distances = np.sqrt(((self.vectors[:n] - vector) ** 2).sum(axis=1))
+            similarity = 1.0 - distances / np.sqrt(self.dim)
+            similarity[(self.timestamps[:n] <= since) | (similarity < threshold)] = -np.inf
+            if n > k:
+                candidates = np.argpartition(-similarity, k - 1)[:k]
+            else:
+                candidates = np.arange(n)
+            candidates = candidates[np.isfinite(similarity[candidates])]
+            candidates = candidates[np.argsort(-similarity[candidates], kind='stable')]
+            return [{
+                'context_hash': self.hashes[i],
+                'success': bool(self.success[i]),
+                'processing_time': float(self.processing_time[i]),
+                'quality_score': float(self.quality_score[i]),
+                'similarity': float(similarity[i])
+            } for i in candidates]
+
+
+def _result_fields(result: Optional[Dict]) -> Tuple[bool, float, float, str]:
+    """success, processing_time, quality_score, model_used of a processing result"""
+    if not result:
+        return False, 0, 0, ''
+    return (bool(result.get('success', False)), result.get('processing_time', 0),
+            result.get('quality_score', 0), result.get('model_used', ''))
+
+
+def _context_row(item: Tuple) -> Tuple:
+    """INSERT parameters for a queued ``(session_id, timestamp, context, result)``"""
+    session_id, timestamp, context, result = item
+    success, processing_time, quality_score, model_used = _result_fields(result)
+    return (
+        session_id,
+        timestamp,
+        json.dumps(asdict(context), default=str),
+        context.context_hash,
+        success,
+        processing_time,
+        quality_score,
+        model_used,
+        json.dumps(context.resource_context, default=str),
+        context_vector(context).tobytes()
+    )
+
+
+class _Flush:
+    """Queue marker: set once everything queued before it is committed"""
+
+    def __init__(self):
+        self.done = threading.Event()
+
+
+class ContextWriter:
+    """
+    Background thread that batches context rows into write transactions
+
+    ``submit`` never blocks: a full queue drops the row (persisted context
+    only feeds learning, it must not slow requests down).  The writer takes
+    whatever has queued up while the previous transaction committed, up to
+    ``batch_size`` rows, so batches grow with load and a lone row is
+    written immediately.
+
+    Args:
+        path: SQLite database (opened in WAL mode)
+        prepare: Turns a queued item into the INSERT parameters
+        on_commit: Called with the items of each committed batch
+        batch_size: Rows per transaction
+        max_queue: Queued items before new ones are dropped
+    """
+
+    def __init__(self, path: str, prepare: Callable[[Any], Tuple], on_commit: Optional[Callable] = None,
+                 batch_size: int = DEFAULT_WRITER_BATCH, max_queue: int = DEFAULT_WRITER_QUEUE):
+        self.path = path
+        self.prepare = prepare
+        self.on_commit = on_commit
+        self.batch_size = batch_size
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue)
+        self.stats = {'queued': 0, 'written': 0, 'dropped': 0, 'batches': 0, 'errors': 0}
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="context-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, item: Any) -> bool:
+        if self._closed:
+            return False
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            self.stats['dropped'] += 1
+            if self.stats['dropped'] % 1000 == 1:
+                logger.warning(f"[ORFEAS] Context writer queue full, dropped {self.stats['dropped']} rows")
+            return False
+        self.stats['queued'] += 1
+        return True
+
+    def flush(self, timeout: Optional[float] = 10.0) -> bool:
+        """Wait until everything submitted so far is committed"""
+        if not self._thread.is_alive():
+            return self._queue.empty()
+        marker = _Flush()
+        self._queue.put(marker)
+        return marker.done.wait(timeout)
+
+    def close(self, timeout: float = 10.0) -> None:
+        if self._closed:
+            return
+        self.flush(timeout)
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join(timeout)
+
+    def _run(self) -> None:
+        conn = sqlite3.connect(self.path, timeout=30.0, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        stopping = False
+        while not stopping:
+            items, markers = [], []
+            item = self._queue.get()
+            while True:
+                if item is None:
+                    stopping = True
+                elif isinstance(item, _Flush):
+                    markers.append(item)
+                else:
+                    items.append(item)
+                if stopping or len(items) >= self.batch_size:
+                    break
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+            if items:
+                self._write(conn, items)
+            for marker in markers:
+                marker.done.set()
+        conn.close()
+
+    def _write(self, conn: sqlite3.Connection, items: List[Any]) -> None:
+        try:
+            rows = [self.prepare(item) for item in items]
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.executemany(INSERT_CONTEXT_SQL, rows)
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+            self.stats['written'] += len(rows)
+            self.stats['batches'] += 1
+        except Exception as e:
+            self.stats['errors'] += 1
+            logger.error(f"[ORFEAS] Context persistence failed for {len(items)} rows: {e}")
+            return
+        if self.on_commit is not None:
+            try:
+                self.on_commit(items)
+            except Exception as e:
+                logger.warning(f"[ORFEAS] Context index update failed: {e}")
+
 class IntelligentContextManager:
     """
     Advanced context handling for AI-driven decision making
@@ -49,17 +369,33 @@ class IntelligentContextManager:
             'model_performance_history': {},
             'resource_availability': {}
         }
+        self.db_path = os.getenv('CONTEXT_DB_PATH', 'data/context.db')
+        self.stats_ttl = float(os.getenv('CONTEXT_STATS_TTL', str(DEFAULT_STATS_TTL)))
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
         self.context_db = self.initialize_context_database()
         self.context_cache = {}
         self.cache_lock = threading.Lock()
+        self.context_index = ContextIndex(int(os.getenv('CONTEXT_INDEX_SIZE', str(DEFAULT_INDEX_SIZE))))
+        self.load_context_index()
+        self.writer = ContextWriter(
+            self.db_path,
+            prepare=_context_row,
+            on_commit=self._index_committed(self.context_index),
+            batch_size=int(os.getenv('CONTEXT_WRITER_BATCH', str(DEFAULT_WRITER_BATCH))),
+            max_queue=int(os.getenv('CONTEXT_WRITER_QUEUE', str(DEFAULT_WRITER_QUEUE)))
+        )
+        # Commit whatever is still queued when the manager goes away or the process exits
+        self._finalizer = weakref.finalize(self, self.writer.close)
 
     def initialize_context_database(self) -> sqlite3.Connection:
-        """Initialize context persistence database"""
+        """Initialize context persistence database (WAL, so reads never wait for the writer)"""
         try:
-            db_path = os.getenv('CONTEXT_DB_PATH', 'data/context.db')
-            os.makedirs(os.path.dirname(db_path), exist_ok=True)
+            db_dir = os.path.dirname(self.db_path)
+            if db_dir:
+                os.makedirs(db_dir, exist_ok=True)
 
-            conn = sqlite3.connect(db_path, check_same_thread=False)
+            conn = self._reader()
             conn.execute("""
                 CREATE TABLE IF NOT EXISTS context_history (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -71,16 +407,19 @@ class IntelligentContextManager:
                     processing_time REAL,
                     quality_score REAL,
                     model_used TEXT,
-                    resource_usage TEXT
+                    resource_usage TEXT,
+                    context_vector BLOB
                 )
             """)
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(context_history)")}
+            if 'context_vector' not in columns:
+                conn.execute("ALTER TABLE context_history ADD COLUMN context_vector BLOB")
             conn.execute("""
                 CREATE INDEX IF NOT EXISTS idx_context_hash ON context_history(context_hash);
             """)
             conn.execute("""
                 CREATE INDEX IF NOT EXISTS idx_timestamp ON context_history(timestamp);
             """)
-            conn.commit()
 
             logger.info("[ORFEAS] Context database initialized successfully")
             return conn
@@ -89,6 +428,57 @@ class IntelligentContextManager:
             logger.error(f"[ORFEAS] Context database initialization failed: {e}")
             raise
 
+    def _reader(self) -> sqlite3.Connection:
+        """Per-thread connection for queries; writes go through the background writer"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30.0, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._connections.append(conn)
+        return conn
+
+    @staticmethod
+    def _index_committed(index: ContextIndex) -> Callable[[List[Tuple]], None]:
+        """Writer callback making committed contexts searchable (holds the index, not the manager)"""
+        def add(items: List[Tuple]) -> None:
+            for session_id, timestamp, context, result in items:
+                success, processing_time, quality_score, _ = _result_fields(result)
+                index.add(context_vector(context), context.context_hash, timestamp,
+                          success, processing_time, quality_score)
+        return add
+
+    def load_context_index(self) -> None:
+        """Fill the similarity index with last week's contexts, newest last"""
+        try:
+            rows = self._reader().execute(
+                INDEX_LOAD_SQL, (time.time() - WEEK_SECONDS, self.context_index.capacity)).fetchall()
+            for context_hash, timestamp, success, processing_time, quality_score, blob, data in reversed(rows):
+                if blob is not None:
+                    vector = np.frombuffer(blob, dtype=np.float32)
+                else:
+                    vector = context_vector(ProcessingContext(**json.loads(data)))
+                if vector.shape != (CONTEXT_FEATURE_DIM,):
+                    continue
+                self.context_index.add(vector, context_hash, timestamp, success, processing_time, quality_score)
+            if rows:
+                logger.info(f"[ORFEAS] Context index loaded {self.context_index.size} contexts")
+        except Exception as e:
+            logger.warning(f"[ORFEAS] Context index load failed: {e}")
+
+    def _cached(self, key: str, compute: Callable[[], Any]) -> Any:
+        """``compute()`` memoised in ``context_cache`` for ``stats_ttl`` seconds"""
+        now = time.monotonic()
+        with self.cache_lock:
+            entry = self.context_cache.get(key)
+            if entry is not None and now - entry[0] < self.stats_ttl:
+                return entry[1]
+        value = compute()
+        with self.cache_lock:
+            self.context_cache[key] = (now, value)
+        return value
+
     def build_processing_context(self, request_data: Dict) -> ProcessingContext:
         """Build comprehensive context for AI processing decisions"""
 
@@ -230,34 +620,28 @@ class IntelligentContextManager:
         """Get historical performance data for context"""
 
         try:
-            # Query recent performance data
-            cursor = self.context_db.cursor()
-            cursor.execute("""
-                SELECT model_used, AVG(processing_time), AVG(quality_score), COUNT(*)
-                FROM context_history
-                WHERE timestamp > ? AND success = 1
-                GROUP BY model_used
-            """, (time.time() - 86400,))  # Last 24 hours
-
-            performance_data = {}
-            for row in cursor.fetchall():
-                model, avg_time, avg_quality, count = row
-                performance_data[model] = {
-                    'average_processing_time': avg_time,
-                    'average_quality_score': avg_quality,
-                    'usage_count': count
-                }
-
-            return {
-                'model_performance': performance_data,
-                'trend_analysis': self.analyze_performance_trends(),
-                'success_rate': self.calculate_recent_success_rate()
-            }
+            return self._cached('historical_performance', self._query_historical_performance)
 
         except Exception as e:
             logger.warning(f"[ORFEAS] Historical context retrieval failed: {e}")
             return {'model_performance': {}, 'success_rate': 0.95}
 
+    def _query_historical_performance(self) -> Dict[str, Any]:
+        performance_data = {}
+        rows = self._reader().execute(MODEL_PERFORMANCE_SQL, (time.time() - DAY_SECONDS,))  # Last 24 hours
+        for model, avg_time, avg_quality, count in rows:
+            performance_data[model] = {
+                'average_processing_time': avg_time,
+                'average_quality_score': avg_quality,
+                'usage_count': count
+            }
+
+        return {
+            'model_performance': performance_data,
+            'trend_analysis': self.analyze_performance_trends(),
+            'success_rate': self.calculate_recent_success_rate()
+        }
+
     def get_resource_availability(self) -> Dict[str, Any]:
         """Get current resource availability"""
 
@@ -427,45 +811,42 @@ class IntelligentContextManager:
         return fallbacks
 
     def persist_context(self, session_id: str, context: ProcessingContext,
-                       result: Optional[Dict] = None):
-        """Persist context for learning and analysis"""
-
-        try:
-            success = result is not None and result.get('success', False)
-            processing_time = result.get('processing_time', 0) if result else 0
-            quality_score = result.get('quality_score', 0) if result else 0
-            model_used = result.get('model_used', '') if result else ''
-
-            cursor = self.context_db.cursor()
-            cursor.execute("""
-                INSERT INTO context_history
-                (session_id, timestamp, context_data, context_hash, success,
-                 processing_time, quality_score, model_used, resource_usage)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                session_id,
-                time.time(),
-                json.dumps(asdict(context)),
-                context.context_hash,
-                success,
-                processing_time,
-                quality_score,
-                model_used,
-                json.dumps(context.resource_context)
-            ))
-            self.context_db.commit()
-
-            logger.info(f"[ORFEAS] Context persisted successfully - Session: {session_id}")
-
-        except Exception as e:
-            logger.error(f"[ORFEAS] Context persistence failed: {e}")
+                       result: Optional[Dict] = None) -> bool:
+        """
+        Queue context for persistence (learning and analysis)
+
+        Serialisation and the database write happen on the background
+        writer; call ``flush()`` to wait for them.
+
+        Returns:
+            False if the write queue was full and the context was dropped
+        """
+        queued = self.writer.submit((session_id, time.time(), context, result))
+        if queued:
+            logger.debug(f"[ORFEAS] Context queued for persistence - Session: {session_id}")
+        return queued
+
+    def flush(self, timeout: Optional[float] = 10.0) -> bool:
+        """Wait until every queued context is committed"""
+        return self.writer.flush(timeout)
+
+    def close(self) -> None:
+        """Commit queued contexts and close all connections"""
+        self._finalizer()
+        for conn in self._connections:
+            try:
+                conn.close()
+            except Exception:
+                pass
+        self._connections.clear()
+        self._local = threading.local()
 
     def get_contextual_insights(self, current_context: ProcessingContext) -> Dict[str, Any]:
         """Get insights based on historical context analysis"""
 
         try:
             # Find similar contexts
-            similar_contexts = self.find_similar_contexts(current_context.context_hash)
+            similar_contexts = self.find_similar_contexts(current_context)
 
             if not similar_contexts:
                 return {
@@ -493,29 +874,39 @@ class IntelligentContextManager:
             logger.warning(f"[ORFEAS] Contextual insights generation failed: {e}")
             return {'success_probability': 0.85, 'confidence': 0.3}
 
-    def find_similar_contexts(self, context_hash: str, threshold: float = 0.8) -> List[Dict]:
-        """Find similar historical contexts"""
+    def find_similar_contexts(self, context: Union[ProcessingContext, str], threshold: float = 0.8,
+                              limit: int = 10) -> List[Dict]:
+        """
+        Find the most similar contexts of the last week
 
-        try:
-            cursor = self.context_db.cursor()
-            cursor.execute("""
-                SELECT * FROM context_history
-                WHERE timestamp > ?
-                ORDER BY timestamp DESC LIMIT 100
-            """, (time.time() - 604800,))  # Last week
-
-            # Simple similarity matching (in production, use vector similarity)
-            similar_contexts = []
-            for row in cursor.fetchall():
-                # Add similarity logic here
-                similar_contexts.append({
-                    'context_hash': row[3],
-                    'success': row[4],
-                    'processing_time': row[5],
-                    'quality_score': row[6]
-                })
+        Args:
+            context: The context itself, or the hash of an earlier one
+            threshold: Minimum similarity (1.0 = identical features)
+            limit: Maximum number of contexts returned
 
-            return similar_contexts[:10]  # Return top 10
+        Returns:
+            Dicts with context_hash, success, processing_time, quality_score
+            and similarity, most similar first
+        """
+
+        try:
+            since = time.time() - WEEK_SECONDS  # Last week
+            if isinstance(context, ProcessingContext):
+                vector = context_vector(context)
+            else:
+                vector = self.context_index.vector_for(context)
+                if vector is None:
+                    # Evicted from the index (or never persisted): exact hash matches only
+                    rows = self._reader().execute(HASH_LOOKUP_SQL, (context, since, limit)).fetchall()
+                    return [{
+                        'context_hash': context_hash,
+                        'success': bool(success),
+                        'processing_time': processing_time or 0.0,
+                        'quality_score': quality_score or 0.0,
+                        'similarity': 1.0
+                    } for context_hash, timestamp, success, processing_time, quality_score in rows]
+
+            return self.context_index.search(vector, k=limit, threshold=threshold, since=since)
 
         except Exception as e:
             logger.warning(f"[ORFEAS] Similar context search failed: {e}")
@@ -550,27 +941,59 @@ class IntelligentContextManager:
 
         return issues
 
-    def analyze_performance_trends(self) -> Dict[str, Any]:
-        """Analyze performance trends over time"""
+    def analyze_performance_trends(self, days: int = 7) -> Dict[str, Any]:
+        """
+        Analyze performance trends over time
 
-        # Simplified trend analysis
+        Daily aggregates of the last ``days`` days; the newer half of the
+        window is compared with the older half (changes under 2% count as
+        stable).
+        """
+
+        try:
+            now = time.time()
+            since = now - days * DAY_SECONDS
+            buckets = self._reader().execute(TREND_SQL, (since, DAY_SECONDS, since)).fetchall()
+        except Exception as e:
+            logger.warning(f"[ORFEAS] Performance trend analysis failed: {e}")
+            buckets = []
+
+        def window(rows):
+            count = sum(row[1] for row in rows)
+            if not count:
+                return None
+            return {
+                'count': count,
+                'success_rate': sum(row[1] * (row[2] or 0) for row in rows) / count,
+                'processing_time': sum(row[1] * (row[3] or 0) for row in rows) / count,
+                'quality_score': sum(row[1] * (row[4] or 0) for row in rows) / count
+            }
+
+        def direction(old, new, up, down, flat='stable'):
+            if old is None or new is None or abs(new - old) <= TREND_TOLERANCE * max(abs(old), 1e-9):
+                return flat
+            return up if new > old else down
+
+        half = days // 2
+        older = window([row for row in buckets if row[0] < half])
+        newer = window([row for row in buckets if row[0] >= half])
+        get = lambda w, key: w[key] if w else None
         return {
-            'quality_trend': 'improving',
-            'performance_trend': 'stable',
-            'error_rate_trend': 'decreasing'
+            'quality_trend': direction(get(older, 'quality_score'), get(newer, 'quality_score'),
+                                       'improving', 'declining'),
+            'performance_trend': direction(get(older, 'processing_time'), get(newer, 'processing_time'),
+                                           'declining', 'improving'),
+            'error_rate_trend': direction(get(older, 'success_rate'), get(newer, 'success_rate'),
+                                          'decreasing', 'increasing'),
+            'daily': [{'day': row[0], 'count': row[1], 'success_rate': row[2],
+                       'average_processing_time': row[3], 'average_quality_score': row[4]} for row in buckets]
         }
 
     def calculate_recent_success_rate(self) -> float:
         """Calculate recent success rate"""
 
         try:
-            cursor = self.context_db.cursor()
-            cursor.execute("""
-                SELECT AVG(CAST(success AS REAL)) FROM context_history
-                WHERE timestamp > ?
-            """, (time.time() - 86400,))  # Last 24 hours
-
-            result = cursor.fetchone()
+            result = self._reader().execute(SUCCESS_RATE_SQL, (time.time() - DAY_SECONDS,)).fetchone()  # Last 24 hours
             return result[0] if result[0] is not None else 0.95
 
         except Exception:
@@ -580,10 +1003,8 @@ class IntelligentContextManager:
         """Clean up old context data"""
 
         try:
-            cutoff_time = time.time() - (days * 86400)
-            cursor = self.context_db.cursor()
-            cursor.execute("DELETE FROM context_history WHERE timestamp < ?", (cutoff_time,))
-            self.context_db.commit()
+            cutoff_time = time.time() - (days * DAY_SECONDS)
+            cursor = self._reader().execute("DELETE FROM context_history WHERE timestamp < ?", (cutoff_time,))
 
             deleted_count = cursor.rowcount
             logger.info(f"[ORFEAS] Cleaned up {deleted_count} old context records")
@@ -594,7 +1015,7 @@ class IntelligentContextManager:
     def __del__(self):
         """Cleanup database connection"""
         try:
-            if hasattr(self, 'context_db'):
-                self.context_db.close()
+            if hasattr(self, '_finalizer'):
+                self.close()
         except Exception:
             pass
@@ -10,23 +10,64 @@ Features:
 - Performance quality monitoring
 - User satisfaction tracking
 - Quality alert system
+
+Pipeline:
+- Producers call ``record_request`` / ``record_security_event`` /
+  ``record_user_feedback``; the event is queued (bounded, dropped when
+  full) and the caller returns immediately
+- The monitor thread drains events into sliding-window running sums, so
+  scoring reads a handful of totals instead of re-walking raw history
+- Every evaluation interval the current metrics are scored, pushed into
+  O(1) online regressions for the trends, and checked against thresholds
+- Remediation actions go to ``RemediationExecutor``: its own worker
+  thread, a per-action cooldown and a shared rate limit, so a slow
+  ``gc.collect`` never stalls monitoring and a flapping metric cannot
+  trigger an action storm
+- The last 10k measurements are kept in ``MetricsRing``, one float array
+  per field, rather than as 10k objects
+
+Environment:
+    QUALITY_MONITOR_INTERVAL          seconds between evaluations (default 30)
+    QUALITY_MONITOR_QUEUE_SIZE        pending metric events before new ones are dropped (default 10000)
+    QUALITY_REMEDIATION_COOLDOWN      seconds before the same action may run again (default 300)
+    QUALITY_REMEDIATION_PER_MINUTE    actions started per minute, all types together (default 6)
 """
 
 import os
+import math
 import time
 import threading
 import queue
-import asyncio
+from array import array
 from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional, Tuple
-from dataclasses import dataclass, asdict
+from typing import Dict, List, Any, Optional, Tuple, Callable
+from dataclasses import dataclass, asdict, fields
 from collections import defaultdict, deque
 import logging
 import json
 
+from rate_limiting import RateLimiter
+
 logger = logging.getLogger(__name__)
 
-@dataclass
+MONITOR_INTERVAL = float(os.getenv('QUALITY_MONITOR_INTERVAL', '30'))
+MONITOR_QUEUE_SIZE = int(os.getenv('QUALITY_MONITOR_QUEUE_SIZE', '10000'))
+REMEDIATION_COOLDOWN = float(os.getenv('QUALITY_REMEDIATION_COOLDOWN', '300'))
+REMEDIATION_PER_MINUTE = float(os.getenv('QUALITY_REMEDIATION_PER_MINUTE', '6'))
+
+WINDOW_BUCKET_SECONDS = 10.0
+TREND_WINDOW = 100  # measurements per trend regression
+TREND_DIMENSIONS = (
+    'overall_quality_score', 'performance_score', 'reliability_score',
+    'security_score', 'user_satisfaction_score'
+)
+SECURITY_PENALTIES = {'critical': 0.1, 'high': 0.05, 'medium': 0.02}
+
+EVENT_REQUEST = 'request'
+EVENT_SECURITY = 'security'
+EVENT_FEEDBACK = 'feedback'
+
+@dataclass(slots=True)
 class QualityMetrics:
     """Quality metrics container"""
     timestamp: float
@@ -41,6 +82,9 @@ class QualityMetrics:
     throughput: float
     resource_efficiency: float
 
+
+QUALITY_METRIC_FIELDS = tuple(f.name for f in fields(QualityMetrics))
+
 @dataclass
 class QualityAlert:
     """Quality alert container"""
@@ -52,12 +96,296 @@ class QualityAlert:
     metrics: Dict[str, float]
     suggested_actions: List[str]
 
+
+class SlidingWindow:
+    """
+    Running sums of event fields over several trailing horizons
+
+    Events land in fixed-width time buckets held in a ring sized for the
+    longest horizon. Each horizon keeps its own totals; when time moves on,
+    the buckets that fell out of a horizon are subtracted from it, so both
+    adding an event and reading a total are amortised O(1).
+
+    Not thread-safe: the owner serialises access.
+    """
+
+    __slots__ = ('bucket_seconds', 'spans', 'size', 'indices', 'sums', 'totals', 'current', 'fields')
+
+    def __init__(self, horizons: Tuple[float, ...], fields: int, bucket_seconds: float = WINDOW_BUCKET_SECONDS):
+        self.bucket_seconds = bucket_seconds
+        self.fields = fields
+        self.spans = {horizon: max(1, math.ceil(horizon / bucket_seconds)) for horizon in horizons}
+        self.size = max(self.spans.values())
+        self.indices: List[Optional[int]] = [None] * self.size
+        self.sums = [[0.0] * fields for _ in range(self.size)]
+        self.totals = {horizon: [0.0] * fields for horizon in horizons}
+        self.current: Optional[int] = None
+
+    def _advance(self, index: int) -> None:
+        current = self.current
+        if current is None or index <= current:
+            if current is None:
+                self.current = index
+            return
+        for horizon, span in self.spans.items():
+            totals = self.totals[horizon]
+            if index - current >= span:
+                totals[:] = [0.0] * self.fields
+                continue
+            # Buckets current-span+1 .. index-span leave this horizon
+            for bucket in range(current - span + 1, index - span + 1):
+                slot = bucket % self.size
+                if self.indices[slot] == bucket:
+                    for i, value in enumerate(self.sums[slot]):
+                        totals[i] -= value
+        self.current = index
+
+    def add(self, timestamp: float, *values: float) -> None:
+        index = int(timestamp // self.bucket_seconds)
+        self._advance(index)
+        # Late events count towards the newest bucket
+        index = max(index, self.current)
+        slot = index % self.size
+        sums = self.sums[slot]
+        if self.indices[slot] != index:
+            self.indices[slot] = index
+            sums[:] = [0.0] * self.fields
+        for i, value in enumerate(values):
+            sums[i] += value
+        for totals in self.totals.values():
+            for i, value in enumerate(values):
+                totals[i] += value
+
+    def read(self, horizon: float, now: Optional[float] = None) -> List[float]:
+        """Totals over the trailing ``horizon`` seconds (one of the configured horizons)"""
+        totals = self.totals[horizon]
+        self._advance(int((time.time() if now is None else now) // self.bucket_seconds))
+        # Repeated subtraction can leave float dust below zero
+        return [value if value > 1e-9 else 0.0 for value in totals]
+
+
+class OnlineTrend:
+    """
+    Least-squares line over the last ``size`` measurements, O(1) per push
+
+    Keeps sum(y) and sum(x*y) with x the position in the window. When the
+    oldest value drops out every remaining x shifts down by one, which
+    lowers sum(x*y) by the remaining sum(y); sums of x and x^2 have closed
+    forms. The sums are rebuilt exactly once per ``size`` pushes so float
+    drift cannot accumulate.
+    """
+
+    __slots__ = ('values', 'sum_y', 'sum_xy', 'pushes')
+
+    def __init__(self, size: int = TREND_WINDOW):
+        self.values = deque(maxlen=size)
+        self.sum_y = 0.0
+        self.sum_xy = 0.0
+        self.pushes = 0
+
+    def push(self, value: float) -> None:
+        values = self.values
+        if len(values) == values.maxlen:
+            self.sum_y -= values[0]
+            self.sum_xy -= self.sum_y
+        values.append(value)
+        self.sum_xy += (len(values) - 1) * value
+        self.sum_y += value
+        self.pushes += 1
+        if self.pushes % values.maxlen == 0:
+            self.sum_y = sum(values)
+            self.sum_xy = sum(i * v for i, v in enumerate(values))
+
+    def result(self) -> Dict[str, Any]:
+        """Same shape as ``ContinuousQualityMonitor.calculate_trend``"""
+        n = len(self.values)
+        if n < 10:
+            return {'direction': 'stable', 'rate': 0.0, 'prediction': 0.8}
+
+        x_sum = n * (n - 1) / 2
+        x_squared_sum = (n - 1) * n * (2 * n - 1) / 6
+        slope = (n * self.sum_xy - x_sum * self.sum_y) / (n * x_squared_sum - x_sum * x_sum)
+        intercept = (self.sum_y - slope * x_sum) / n
+
+        if slope > 0.001:
+            direction = 'improving'
+        elif slope < -0.001:
+            direction = 'declining'
+        else:
+            direction = 'stable'
+
+        prediction = slope * n + intercept
+        return {'direction': direction, 'rate': abs(slope), 'prediction': max(0.0, min(1.0, prediction))}
+
+
+class MetricsRing:
+    """
+    Fixed-capacity history of ``QualityMetrics`` stored column by column
+
+    Every field is a float, so each one lives in a preallocated
+    ``array('d')`` written at a rotating position: a retained measurement
+    costs 8 bytes per field instead of an object plus eleven boxed floats.
+    Indexing and iteration rebuild ``QualityMetrics`` on the fly; ``column``
+    returns one field in chronological order without building records.
+    Behaves like ``deque(maxlen=...)`` for append, len, [i] and iteration.
+    """
+
+    __slots__ = ('maxlen', 'columns', 'start', 'count')
+
+    def __init__(self, maxlen: int):
+        self.maxlen = maxlen
+        self.columns = tuple(array('d', bytes(8 * maxlen)) for _ in QUALITY_METRIC_FIELDS)
+        self.start = 0
+        self.count = 0
+
+    def append(self, metrics: 'QualityMetrics') -> None:
+        if self.count < self.maxlen:
+            position = (self.start + self.count) % self.maxlen
+            self.count += 1
+        else:
+            position = self.start
+            self.start = (self.start + 1) % self.maxlen
+        for column, name in zip(self.columns, QUALITY_METRIC_FIELDS):
+            column[position] = getattr(metrics, name)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __getitem__(self, index: int) -> 'QualityMetrics':
+        if index < 0:
+            index += self.count
+        if not 0 <= index < self.count:
+            raise IndexError('metrics history index out of range')
+        position = (self.start + index) % self.maxlen
+        return QualityMetrics(*(column[position] for column in self.columns))
+
+    def __iter__(self):
+        for index in range(self.count):
+            yield self[index]
+
+    def column(self, name: str) -> List[float]:
+        """One field across the retained history, oldest first"""
+        column = self.columns[QUALITY_METRIC_FIELDS.index(name)]
+        end = self.start + self.count
+        if end <= self.maxlen:
+            return column[self.start:end].tolist()
+        return column[self.start:].tolist() + column[:end - self.maxlen].tolist()
+
+    def clear(self) -> None:
+        self.start = 0
+        self.count = 0
+
+
+class RemediationExecutor:
+    """
+    Runs quality remediation actions on a worker thread
+
+    An action type that is already queued or started within ``cooldown``
+    seconds is suppressed. Accepted actions also spend from one shared GCRA
+    budget (``rate_limiting.RateLimiter``) of ``per_minute`` actions.
+
+    Args:
+        handler: Called as ``handler(action, issue)`` on the worker thread
+        cooldown: Seconds before the same action type may run again
+        per_minute: Actions started per minute across all types
+        clock: Monotonic time source (overridable for tests)
+    """
+
+    QUEUED = 'queued'
+    PENDING = 'pending'
+    COOLDOWN = 'cooldown'
+    RATE_LIMITED = 'rate_limited'
+
+    def __init__(self, handler: Callable[[Dict[str, Any], Dict[str, Any]], None],
+                 cooldown: float = REMEDIATION_COOLDOWN, per_minute: float = REMEDIATION_PER_MINUTE,
+                 clock: Callable[[], float] = time.monotonic):
+        self.handler = handler
+        self.cooldown = cooldown
+        self.clock = clock
+        self.limiter = RateLimiter(requests_per_minute=per_minute, max_keys=1, clock=clock)
+        self.last_started: Dict[str, float] = {}
+        self.pending = set()
+        self.queue: 'queue.Queue[Optional[Tuple[Dict[str, Any], Dict[str, Any]]]]' = queue.Queue()
+        self.stats = defaultdict(int)
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def submit(self, action: Dict[str, Any], issue: Dict[str, Any]) -> str:
+        """
+        Queue ``action`` unless suppressed
+
+        Returns:
+            QUEUED, or why it was suppressed: PENDING, COOLDOWN, RATE_LIMITED
+        """
+        action_type = action['type']
+        now = self.clock()
+        with self._lock:
+            if action_type in self.pending:
+                outcome = self.PENDING
+            elif now - self.last_started.get(action_type, -math.inf) < self.cooldown:
+                outcome = self.COOLDOWN
+            elif not self.limiter.check('remediation').allowed:
+                outcome = self.RATE_LIMITED
+            else:
+                outcome = self.QUEUED
+                self.pending.add(action_type)
+                self.last_started[action_type] = now
+            self.stats[outcome] += 1
+            if outcome == self.QUEUED and self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True, name="QualityRemediation")
+                self._thread.start()
+        if outcome == self.QUEUED:
+            self.queue.put((action, issue))
+        return outcome
+
+    def _run(self) -> None:
+        while True:
+            item = self.queue.get()
+            try:
+                if item is None:
+                    return
+                action, issue = item
+                try:
+                    self.handler(action, issue)
+                    self.stats['executed'] += 1
+                    logger.info(f"[ORFEAS] Executed quality action: {action['type']}")
+                except Exception as e:
+                    self.stats['failed'] += 1
+                    logger.error(f"[ORFEAS] Quality action failed: {action['type']}: {e}")
+                finally:
+                    with self._lock:
+                        self.pending.discard(action['type'])
+            finally:
+                self.queue.task_done()
+
+    def wait_idle(self, timeout: Optional[float] = None) -> bool:
+        """Block until every queued action has run; False on timeout"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self.queue.all_tasks_done:
+            while self.queue.unfinished_tasks:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self.queue.all_tasks_done.wait(remaining)
+        return True
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Finish queued actions and stop the worker (restarted on the next submit)"""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self.queue.put(None)
+            thread.join(timeout=timeout)
+
+
 class ContinuousQualityMonitor:
     """
     Real-time quality monitoring and continuous improvement system
     """
 
-    def __init__(self):
+    def __init__(self, evaluation_interval: float = MONITOR_INTERVAL, queue_size: int = MONITOR_QUEUE_SIZE,
+                 remediation_cooldown: float = REMEDIATION_COOLDOWN,
+                 remediation_per_minute: float = REMEDIATION_PER_MINUTE):
         self.quality_thresholds = {
             'performance': {'warning': 0.8, 'critical': 0.6},
             'reliability': {'warning': 0.95, 'critical': 0.90},
@@ -66,14 +394,93 @@ class ContinuousQualityMonitor:
             'overall': {'warning': 0.85, 'critical': 0.75}
         }
 
-        self.metrics_history = deque(maxlen=10000)  # Keep last 10k metrics
+        self.metrics_history = MetricsRing(maxlen=10000)  # Keep last 10k metrics
         self.alert_queue = queue.Queue()
-        self.quality_trends = defaultdict(list)
+        self.quality_trends = {dimension: OnlineTrend() for dimension in TREND_DIMENSIONS}
         self.monitoring_active = False
         self.monitoring_thread = None
         self.improvement_actions = {}
         self.alert_handlers = []
 
+        self.evaluation_interval = evaluation_interval
+        self.events: 'queue.Queue[Optional[Tuple[str, float, float, float]]]' = queue.Queue(maxsize=queue_size)
+        self.remediation = RemediationExecutor(self.execute_quality_action, cooldown=remediation_cooldown,
+                                               per_minute=remediation_per_minute)
+
+        # Incremental aggregates, fed by metric events
+        # requests: (count, failed, processing_time_sum); security: (events, penalty); feedback: (count, rating_sum)
+        self.request_window = SlidingWindow((60, 300, 900), fields=3)
+        self.security_window = SlidingWindow((3600,), fields=2)
+        self.feedback_window = SlidingWindow((3600,), fields=2)
+        self._aggregate_lock = threading.Lock()
+        self.pipeline_stats = {'events_processed': 0, 'events_dropped': 0, 'evaluations': 0,
+                               'last_evaluation_ms': 0.0}
+
+    # ------------------------------------------------------------------
+    # Metric events
+    # ------------------------------------------------------------------
+
+    def record_request(self, processing_time: float, success: bool = True,
+                       timestamp: Optional[float] = None) -> None:
+        """Report a finished request (processing time in seconds)"""
+        self._submit_event(EVENT_REQUEST, timestamp, processing_time, 0.0 if success else 1.0)
+
+    def record_security_event(self, severity: str = 'low', timestamp: Optional[float] = None) -> None:
+        """Report a security event (critical/high/medium/low)"""
+        self._submit_event(EVENT_SECURITY, timestamp, SECURITY_PENALTIES.get(severity, 0.0), 0.0)
+
+    def record_user_feedback(self, rating: float, timestamp: Optional[float] = None) -> None:
+        """Report a 1-5 star user rating"""
+        self._submit_event(EVENT_FEEDBACK, timestamp, rating, 0.0)
+
+    def _submit_event(self, kind: str, timestamp: Optional[float], a: float, b: float) -> None:
+        event = (kind, time.time() if timestamp is None else timestamp, a, b)
+        if not self.monitoring_active:
+            # No pipeline thread to drain the queue: aggregate inline
+            self._apply_events((event,))
+            return
+        try:
+            self.events.put_nowait(event)
+        except queue.Full:
+            self.pipeline_stats['events_dropped'] += 1
+
+    def _apply_events(self, events) -> None:
+        with self._aggregate_lock:
+            for kind, timestamp, a, b in events:
+                if kind == EVENT_REQUEST:
+                    self.request_window.add(timestamp, 1.0, b, a)
+                elif kind == EVENT_SECURITY:
+                    self.security_window.add(timestamp, 1.0, a)
+                elif kind == EVENT_FEEDBACK:
+                    self.feedback_window.add(timestamp, 1.0, a)
+            self.pipeline_stats['events_processed'] += len(events)
+
+    def process_pending_events(self, timeout: float = 0.0) -> int:
+        """
+        Drain queued metric events into the aggregates
+
+        Args:
+            timeout: Seconds to wait for the first event
+
+        Returns:
+            Number of events applied
+        """
+        batch = []
+        try:
+            event = self.events.get(timeout=timeout) if timeout > 0 else self.events.get_nowait()
+            while event is not None:
+                batch.append(event)
+                event = self.events.get_nowait()
+        except queue.Empty:
+            pass
+        if batch:
+            self._apply_events(batch)
+        return len(batch)
+
+    # ------------------------------------------------------------------
+    # Pipeline
+    # ------------------------------------------------------------------
+
     def start_real_time_monitoring(self):
         """Start real-time quality monitoring"""
 
@@ -95,46 +502,80 @@ class ContinuousQualityMonitor:
         """Stop quality monitoring"""
 
         self.monitoring_active = False
+        try:
+            self.events.put_nowait(None)  # wake the pipeline
+        except queue.Full:
+            pass
         if self.monitoring_thread:
             self.monitoring_thread.join(timeout=5)
+        self.process_pending_events()
+        self.remediation.close()
 
         logger.info("[ORFEAS] Quality monitoring stopped")
 
     def _monitoring_loop(self):
-        """Main monitoring loop"""
+        """Main monitoring loop: apply events as they arrive, evaluate every interval"""
 
         logger.info("[ORFEAS] Quality monitoring loop started")
 
+        next_evaluation = time.monotonic()
         while self.monitoring_active:
             try:
-                # Collect current quality metrics
-                current_metrics = self.collect_real_time_metrics()
+                wait = next_evaluation - time.monotonic()
+                if wait > 0:
+                    self.process_pending_events(timeout=wait)
+                    continue
+
+                self.process_pending_events()
+                self.evaluate_quality()
+                next_evaluation = time.monotonic() + self.evaluation_interval
 
-                # Analyze quality trends
-                quality_trends = self.analyze_quality_trends(current_metrics)
+            except Exception as e:
+                logger.error(f"[ORFEAS] Quality monitoring error: {e}")
+                next_evaluation = time.monotonic() + self.evaluation_interval
 
-                # Detect quality issues
-                quality_issues = self.detect_quality_degradation(current_metrics)
+    def evaluate_quality(self) -> QualityMetrics:
+        """One evaluation: score, trends, degradation response, alerts, dashboard"""
 
-                # Trigger automated responses
-                if quality_issues:
-                    self.trigger_quality_response(quality_issues)
+        start = time.perf_counter()
 
-                # Generate quality alerts
-                alerts = self.generate_quality_alerts(current_metrics, quality_trends)
+        # Collect current quality metrics
+        current_metrics = self.collect_real_time_metrics()
 
-                if alerts:
-                    self.send_quality_alerts(alerts)
+        # Analyze quality trends
+        quality_trends = self.analyze_quality_trends(current_metrics)
 
-                # Update quality dashboard data
-                self.update_quality_dashboard(current_metrics, quality_trends)
+        # Detect quality issues
+        quality_issues = self.detect_quality_degradation(current_metrics)
 
-                # Sleep before next iteration
-                time.sleep(30)  # Monitor every 30 seconds
+        # Hand remediation to the executor
+        if quality_issues:
+            self.trigger_quality_response(quality_issues)
 
-            except Exception as e:
-                logger.error(f"[ORFEAS] Quality monitoring error: {e}")
-                time.sleep(60)  # Wait longer on error
+        # Generate quality alerts
+        alerts = self.generate_quality_alerts(current_metrics, quality_trends)
+
+        if alerts:
+            self.send_quality_alerts(alerts)
+
+        # Update quality dashboard data
+        self.update_quality_dashboard(current_metrics, quality_trends)
+
+        self.pipeline_stats['evaluations'] += 1
+        self.pipeline_stats['last_evaluation_ms'] = (time.perf_counter() - start) * 1000
+        return current_metrics
+
+    def get_monitoring_stats(self) -> Dict[str, Any]:
+        """Pipeline and remediation counters"""
+        return {
+            **self.pipeline_stats,
+            'queued_events': self.events.qsize(),
+            'remediation': dict(self.remediation.stats),
+        }
+
+    # ------------------------------------------------------------------
+    # Scoring
+    # ------------------------------------------------------------------
 
     def collect_real_time_metrics(self) -> QualityMetrics:
         """Collect current quality metrics"""
@@ -180,6 +621,8 @@ class ContinuousQualityMonitor:
 
             # Store metrics
             self.metrics_history.append(metrics)
+            for dimension, trend in self.quality_trends.items():
+                trend.push(getattr(metrics, dimension))
 
             return metrics
 
@@ -192,12 +635,12 @@ class ContinuousQualityMonitor:
 
         try:
             # Get recent performance data
-            recent_times = self.get_recent_processing_times(minutes=5)
+            recent = self.get_recent_processing_stats(minutes=5)
 
-            if not recent_times:
+            if not recent['count']:
                 return 0.8  # Default score
 
-            avg_time = sum(recent_times) / len(recent_times)
+            avg_time = recent['mean']
 
             # Performance score based on processing time
             # Target: < 10s = 1.0, < 30s = 0.8, < 60s = 0.6, > 60s = 0.4
@@ -221,14 +664,11 @@ class ContinuousQualityMonitor:
             # Get recent error rates
             recent_errors = self.get_recent_error_data(minutes=15)
 
-            if not recent_errors:
-                return 0.95  # Default high reliability
-
             total_requests = recent_errors['total']
             failed_requests = recent_errors['failed']
 
             if total_requests == 0:
-                return 0.95
+                return 0.95  # Default high reliability
 
             success_rate = 1.0 - (failed_requests / total_requests)
 
@@ -243,20 +683,10 @@ class ContinuousQualityMonitor:
         """Calculate security quality score"""
 
         try:
-            # Check for recent security events
-            security_events = self.get_recent_security_events(minutes=60)
+            # Severity-weighted penalty of recent security events
+            security_events = self.get_recent_security_stats(minutes=60)
 
-            base_score = 0.95
-
-            # Reduce score based on security events
-            for event in security_events:
-                severity = event.get('severity', 'low')
-                if severity == 'critical':
-                    base_score -= 0.1
-                elif severity == 'high':
-                    base_score -= 0.05
-                elif severity == 'medium':
-                    base_score -= 0.02
+            base_score = 0.95 - security_events['penalty']
 
             return max(0.5, base_score)
 
@@ -269,16 +699,13 @@ class ContinuousQualityMonitor:
 
         try:
             # Get recent user feedback
-            recent_feedback = self.get_recent_user_feedback(minutes=60)
+            recent_feedback = self.get_recent_feedback_stats(minutes=60)
 
-            if not recent_feedback:
+            if not recent_feedback['count']:
                 return 0.85  # Default satisfaction score
 
-            total_ratings = len(recent_feedback)
-            avg_rating = sum(feedback['rating'] for feedback in recent_feedback) / total_ratings
-
             # Convert 5-star rating to 0-1 scale
-            return min(1.0, avg_rating / 5.0)
+            return min(1.0, recent_feedback['mean_rating'] / 5.0)
 
         except Exception as e:
             logger.warning(f"[ORFEAS] User satisfaction calculation failed: {e}")
@@ -309,8 +736,7 @@ class ContinuousQualityMonitor:
         """Get average processing time"""
 
         try:
-            recent_times = self.get_recent_processing_times(minutes=5)
-            return sum(recent_times) / len(recent_times) if recent_times else 0.0
+            return self.get_recent_processing_stats(minutes=5)['mean']
         except Exception:
             return 0.0
 
@@ -319,7 +745,7 @@ class ContinuousQualityMonitor:
 
         try:
             recent_errors = self.get_recent_error_data(minutes=5)
-            if not recent_errors or recent_errors['total'] == 0:
+            if recent_errors['total'] == 0:
                 return 0.0
 
             return recent_errors['failed'] / recent_errors['total']
@@ -341,7 +767,8 @@ class ContinuousQualityMonitor:
         try:
             import psutil
 
-            cpu_percent = psutil.cpu_percent(interval=1)
+            # Non-blocking: utilisation since the previous evaluation
+            cpu_percent = psutil.cpu_percent(interval=None)
             memory_percent = psutil.virtual_memory().percent
 
             # Efficiency score: high utilization without overload
@@ -360,12 +787,7 @@ class ContinuousQualityMonitor:
             trends = {}
 
             # Analyze each quality dimension
-            dimensions = [
-                'overall_quality_score', 'performance_score', 'reliability_score',
-                'security_score', 'user_satisfaction_score'
-            ]
-
-            for dimension in dimensions:
+            for dimension in TREND_DIMENSIONS:
                 trend_data = self.calculate_trend(dimension)
                 trends[dimension] = {
                     'direction': trend_data['direction'],  # 'improving', 'declining', 'stable'
@@ -380,43 +802,10 @@ class ContinuousQualityMonitor:
             return {}
 
     def calculate_trend(self, dimension: str) -> Dict[str, Any]:
-        """Calculate trend for specific quality dimension"""
+        """Calculate trend for specific quality dimension (online regression over the last 100 measurements)"""
 
         try:
-            # Get recent values
-            recent_metrics = list(self.metrics_history)[-100:]  # Last 100 measurements
-
-            if len(recent_metrics) < 10:
-                return {'direction': 'stable', 'rate': 0.0, 'prediction': 0.8}
-
-            values = [getattr(metric, dimension) for metric in recent_metrics]
-
-            # Simple linear regression for trend
-            n = len(values)
-            x_sum = sum(range(n))
-            y_sum = sum(values)
-            xy_sum = sum(i * values[i] for i in range(n))
-            x_squared_sum = sum(i * i for i in range(n))
-
-            slope = (n * xy_sum - x_sum * y_sum) / (n * x_squared_sum - x_sum * x_sum)
-            intercept = (y_sum - slope * x_sum) / n
-
-            # Determine trend direction
-            if slope > 0.001:
-                direction = 'improving'
-            elif slope < -0.001:
-                direction = 'declining'
-            else:
-                direction = 'stable'
-
-            # Predict next value
-            prediction = slope * n + intercept
-
-            return {
-                'direction': direction,
-                'rate': abs(slope),
-                'prediction': max(0.0, min(1.0, prediction))
-            }
+            return self.quality_trends[dimension].result()
 
         except Exception as e:
             logger.warning(f"[ORFEAS] Trend calculation failed for {dimension}: {e}")
@@ -478,27 +867,33 @@ class ContinuousQualityMonitor:
             logger.error(f"[ORFEAS] Quality degradation detection failed: {e}")
             return []
 
-    def trigger_quality_response(self, quality_issues: List[Dict[str, Any]]):
-        """Trigger automated quality response actions"""
+    def trigger_quality_response(self, quality_issues: List[Dict[str, Any]]) -> List[str]:
+        """
+        Trigger automated quality response actions
+
+        Actions run on the remediation executor, subject to its cooldowns
+        and rate limit.
+
+        Returns:
+            Types of the actions queued
+        """
 
+        queued = []
         try:
             for issue in quality_issues:
-                severity = issue['severity']
-                metric = issue['metric']
-
                 # Select appropriate response actions
                 actions = self.select_response_actions(issue)
 
-                # Execute actions
                 for action in actions:
-                    try:
-                        self.execute_quality_action(action, issue)
-                        logger.info(f"[ORFEAS] Executed quality action: {action['type']}")
-                    except Exception as e:
-                        logger.error(f"[ORFEAS] Quality action failed: {action['type']}: {e}")
+                    outcome = self.remediation.submit(action, issue)
+                    if outcome == RemediationExecutor.QUEUED:
+                        queued.append(action['type'])
+                    else:
+                        logger.debug(f"[ORFEAS] Quality action {action['type']} suppressed: {outcome}")
 
         except Exception as e:
             logger.error(f"[ORFEAS] Quality response trigger failed: {e}")
+        return queued
 
     def select_response_actions(self, issue: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Select appropriate response actions for quality issue"""
@@ -757,30 +1152,34 @@ class ContinuousQualityMonitor:
             logger.error(f"[ORFEAS] Automated quality improvement failed: {e}")
             return improvement_actions
 
-    def get_recent_processing_times(self, minutes: int = 5) -> List[float]:
-        """Get recent processing times"""
-        # Placeholder - would integrate with actual processing system
-        return [15.2, 12.8, 18.5, 14.1, 16.7]
+    def _read_window(self, window: SlidingWindow, minutes: int) -> List[float]:
+        """Window totals over ``minutes`` (must be one of the window's horizons)"""
+        with self._aggregate_lock:
+            return window.read(minutes * 60)
+
+    def get_recent_processing_stats(self, minutes: int = 5) -> Dict[str, float]:
+        """Request count and mean processing time"""
+        count, _, total = self._read_window(self.request_window, minutes)
+        return {'count': int(count), 'mean': total / count if count else 0.0}
 
     def get_recent_error_data(self, minutes: int = 15) -> Dict[str, int]:
         """Get recent error data"""
-        # Placeholder - would integrate with actual error tracking
-        return {'total': 100, 'failed': 2}
+        count, failed, _ = self._read_window(self.request_window, minutes)
+        return {'total': int(count), 'failed': int(failed)}
 
-    def get_recent_security_events(self, minutes: int = 60) -> List[Dict[str, Any]]:
-        """Get recent security events"""
-        # Placeholder - would integrate with security monitoring
-        return []
+    def get_recent_security_stats(self, minutes: int = 60) -> Dict[str, float]:
+        """Security event count and severity-weighted penalty"""
+        count, penalty = self._read_window(self.security_window, minutes)
+        return {'count': int(count), 'penalty': penalty}
 
-    def get_recent_user_feedback(self, minutes: int = 60) -> List[Dict[str, Any]]:
-        """Get recent user feedback"""
-        # Placeholder - would integrate with feedback system
-        return [{'rating': 4.2}, {'rating': 4.5}, {'rating': 3.8}]
+    def get_recent_feedback_stats(self, minutes: int = 60) -> Dict[str, float]:
+        """User rating count and mean (1-5 stars)"""
+        count, total = self._read_window(self.feedback_window, minutes)
+        return {'count': int(count), 'mean_rating': total / count if count else 0.0}
 
     def get_recent_request_count(self, minutes: int = 1) -> int:
         """Get recent request count"""
-        # Placeholder - would integrate with request tracking
-        return 120
+        return int(self._read_window(self.request_window, minutes)[0])
 
     def get_default_metrics(self) -> QualityMetrics:
         """Get default metrics when collection fails"""
@@ -0,0 +1,331 @@
+"""
+ORFEAS Depth Engine
+===================
+Classical multi-cue depth estimation for the Powerful 3D path.
+
+- Cues (brightness, edge distance, texture, gradient) are computed on a
+  downscaled pyramid level (``DEPTH_MAX_SIDE`` long side) and the combined
+  map is upsampled once to the input resolution
+- The independent cues run on a small thread pool; OpenCV and SciPy
+  release the GIL inside their filters
+- Texture uses local variance (two box filters) instead of rank entropy
+  over ``disk(3)``, which cost seconds on large images
+- Depth maps are memoized on disk as float16 per image digest, so
+  regenerating the same upload at another quality or size skips the stage
+
+OpenCV is used when installed; SciPy/NumPy implementations cover every
+cue otherwise.
+
+Environment:
+    DEPTH_CACHE_DIR   memo directory (default: backend/cache/depth)
+    DEPTH_MAX_SIDE    working resolution, long side in px (default 512)
+"""
+
+import hashlib
+import logging
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+from scipy import ndimage
+
+logger = logging.getLogger(__name__)
+
+try:
+    import cv2
+    CV2_AVAILABLE = True
+except ImportError:
+    cv2 = None
+    CV2_AVAILABLE = False
+
+ENGINE_VERSION = 1
+DEFAULT_MAX_SIDE = 512
+# cue -> weight, as in the original classical estimator
+CUE_WEIGHTS: Dict[str, float] = {'brightness': 0.4, 'edges': 0.2, 'texture': 0.2, 'gradient': 0.2}
+TEXTURE_WINDOW = 7  # same footprint as disk(3)
+CANNY_SIGMA = 1.0
+SMOOTH_SIGMA = 1.5
+MEMORY_CACHE_ENTRIES = 8
+
+
+def to_gray(image: np.ndarray) -> np.ndarray:
+    """Grayscale float32 on a 0-255 scale (accepts uint8 or 0-1 float images)"""
+    image = np.asarray(image)
+    gray = image.mean(axis=2, dtype=np.float32) if image.ndim == 3 else image.astype(np.float32)
+    if image.dtype.kind == 'f' and gray.size and float(gray.max()) <= 1.0:
+        gray = gray * 255.0
+    return gray
+
+
+def _normalize(cue: np.ndarray) -> np.ndarray:
+    peak = float(cue.max()) if cue.size else 0.0
+    return cue / peak if peak > 0 else np.zeros_like(cue)
+
+
+def resize(image: np.ndarray, shape: Tuple[int, int]) -> np.ndarray:
+    """Resize a float32 map to ``(height, width)`` (area when shrinking, bilinear when growing)"""
+    if image.shape == tuple(shape):
+        return image
+    if CV2_AVAILABLE:
+        shrinking = shape[0] < image.shape[0]
+        return cv2.resize(image, (shape[1], shape[0]),
+                          interpolation=cv2.INTER_AREA if shrinking else cv2.INTER_LINEAR)
+    if shape[0] < image.shape[0] and image.shape[0] % shape[0] == 0 and image.shape[1] % shape[1] == 0:
+        fy, fx = image.shape[0] // shape[0], image.shape[1] // shape[1]
+        return image.reshape(shape[0], fy, shape[1], fx).mean(axis=(1, 3), dtype=np.float32)
+    if shape[0] < image.shape[0]:
+        # Anti-alias before sampling down
+        sigma = (image.shape[0] / shape[0] / 2, image.shape[1] / shape[1] / 2)
+        image = ndimage.gaussian_filter(image, sigma)
+    zoom = (shape[0] / image.shape[0], shape[1] / image.shape[1])
+    return ndimage.zoom(image, zoom, order=1, mode='nearest', grid_mode=True).astype(np.float32)
+
+
+def _sobel(gray: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    if CV2_AVAILABLE:
+        return cv2.Sobel(gray, cv2.CV_32F, 0, 1, ksize=3), cv2.Sobel(gray, cv2.CV_32F, 1, 0, ksize=3)
+    return ndimage.sobel(gray, axis=0), ndimage.sobel(gray, axis=1)
+
+
+def _gaussian(image: np.ndarray, sigma: float) -> np.ndarray:
+    if CV2_AVAILABLE:
+        return cv2.GaussianBlur(image, (0, 0), sigma)
+    return ndimage.gaussian_filter(image, sigma)
+
+
+def canny(gray: np.ndarray, sigma: float = CANNY_SIGMA,
+          low: float = 0.1, high: float = 0.2) -> np.ndarray:
+    """
+    Canny edge map (bool)
+
+    Thresholds are fractions of the strongest gradient. Uses ``cv2.Canny``
+    when available, else a vectorized NumPy/SciPy implementation
+    (non-maximum suppression on quantized directions, hysteresis by
+    connected components).
+    """
+    smoothed = _gaussian(gray, sigma)
+    gy, gx = _sobel(smoothed)
+    magnitude = np.hypot(gx, gy)
+    peak = float(magnitude.max())
+    if peak == 0:
+        return np.zeros(gray.shape, dtype=bool)
+    if CV2_AVAILABLE:
+        scale = 255.0 / float(smoothed.max() or 1.0)
+        image = np.clip(smoothed * scale, 0, 255).astype(np.uint8)
+        # cv2 recomputes the Sobel magnitude on the rescaled image; scale the thresholds alike
+        return cv2.Canny(image, low * peak * scale, high * peak * scale, L2gradient=True) > 0
+
+    # Quantize the gradient direction to 0/45/90/135 degrees
+    angle = (np.rad2deg(np.arctan2(gy, gx)) + 180.0) % 180.0
+    sector = ((angle + 22.5) // 45).astype(np.int8) % 4
+    padded = np.pad(magnitude, 1)
+    h, w = magnitude.shape
+    neighbours = {
+        0: (padded[1:h + 1, 0:w], padded[1:h + 1, 2:w + 2]),    # horizontal gradient: left/right
+        1: (padded[0:h, 0:w], padded[2:h + 2, 2:w + 2]),         # 45 degrees
+        2: (padded[0:h, 1:w + 1], padded[2:h + 2, 1:w + 1]),     # vertical gradient: up/down
+        3: (padded[0:h, 2:w + 2], padded[2:h + 2, 0:w]),         # 135 degrees
+    }
+    local_max = np.zeros(magnitude.shape, dtype=bool)
+    for direction, (before, after) in neighbours.items():
+        mask = sector == direction
+        local_max |= mask & (magnitude >= before) & (magnitude >= after)
+
+    strong = local_max & (magnitude >= high * peak)
+    weak = local_max & (magnitude >= low * peak)
+    labels, count = ndimage.label(weak, structure=np.ones((3, 3), dtype=bool))
+    if count == 0:
+        return strong
+    keep = np.zeros(count + 1, dtype=bool)
+    keep[np.unique(labels[strong])] = True
+    keep[0] = False
+    return keep[labels]
+
+
+def edge_distance_cue(gray: np.ndarray) -> np.ndarray:
+    """Distance to the nearest edge, normalized"""
+    edges = canny(gray)
+    if not edges.any():
+        return np.zeros(gray.shape, dtype=np.float32)
+    if CV2_AVAILABLE:
+        distance = cv2.distanceTransform((~edges).astype(np.uint8), cv2.DIST_L2, 5)
+    else:
+        distance = ndimage.distance_transform_edt(~edges).astype(np.float32)
+    return _normalize(distance)
+
+
+def local_variance(gray: np.ndarray, window: int = TEXTURE_WINDOW) -> np.ndarray:
+    """Local variance E[x^2] - E[x]^2 over a ``window`` box (two box filters)"""
+    if CV2_AVAILABLE:
+        mean = cv2.boxFilter(gray, cv2.CV_32F, (window, window), borderType=cv2.BORDER_REFLECT)
+        mean_sq = cv2.boxFilter(gray * gray, cv2.CV_32F, (window, window), borderType=cv2.BORDER_REFLECT)
+    else:
+        mean = ndimage.uniform_filter(gray, window, mode='reflect')
+        mean_sq = ndimage.uniform_filter(gray * gray, window, mode='reflect')
+    return np.maximum(mean_sq - mean * mean, 0.0)
+
+
+def texture_cue(gray: np.ndarray) -> np.ndarray:
+    """Texture strength: local standard deviation, normalized (entropy proxy)"""
+    return _normalize(np.sqrt(local_variance(gray)))
+
+
+def gradient_cue(gray: np.ndarray) -> np.ndarray:
+    """Sobel gradient magnitude, normalized"""
+    gy, gx = _sobel(gray)
+    return _normalize(np.hypot(gx, gy))
+
+
+class DepthEngine:
+    """
+    Pyramid multi-cue depth estimator with a digest-keyed memo
+
+    Args:
+        max_side: Long side of the working level (cues are computed there)
+        workers: Threads for the independent cues
+        cache_dir: float16 depth memo directory (None disables disk memoization)
+    """
+
+    def __init__(self, max_side: int = DEFAULT_MAX_SIDE, workers: int = 3,
+                 cache_dir: Optional[Path] = None):
+        self.max_side = max_side
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else None
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="depth-cue")
+        self._memory: 'OrderedDict[str, np.ndarray]' = OrderedDict()
+        self._memory_lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0}
+
+    @property
+    def signature(self) -> str:
+        """Everything besides the image that changes the output"""
+        weights = ','.join(f"{k}={v}" for k, v in CUE_WEIGHTS.items())
+        return f"v{ENGINE_VERSION}|side={self.max_side}|{weights}|tex={TEXTURE_WINDOW}|smooth={SMOOTH_SIGMA}"
+
+    def working_shape(self, shape: Tuple[int, int]) -> Tuple[int, int]:
+        height, width = shape
+        scale = min(1.0, self.max_side / max(height, width))
+        return max(1, round(height * scale)), max(1, round(width * scale))
+
+    def estimate(self, image: np.ndarray) -> np.ndarray:
+        """
+        Depth map in [0, 1] (float32, same height/width as ``image``)
+
+        Args:
+            image: RGB or grayscale image, uint8 or float in [0, 1]
+        """
+        gray_full = to_gray(image)
+        shape = gray_full.shape
+        gray = resize(gray_full, self.working_shape(shape))
+
+        edges = self._pool.submit(edge_distance_cue, gray)
+        texture = self._pool.submit(texture_cue, gray)
+        gradient = self._pool.submit(gradient_cue, gray)
+
+        combined = (gray / 255.0) * CUE_WEIGHTS['brightness']
+        combined += edges.result() * CUE_WEIGHTS['edges']
+        combined += texture.result() * CUE_WEIGHTS['texture']
+        combined += gradient.result() * CUE_WEIGHTS['gradient']
+
+        # The working level is smaller, so the smoothing radius shrinks with it
+        scale = gray.shape[0] / shape[0]
+        combined = _gaussian(combined.astype(np.float32), max(0.5, SMOOTH_SIGMA * scale))
+        depth = resize(combined, shape)
+        low, high = float(depth.min()), float(depth.max())
+        if high - low <= 0:
+            return np.zeros(shape, dtype=np.float32)
+        return ((depth - low) / (high - low)).astype(np.float32)
+
+    # -- memoization ---------------------------------------------------------
+
+    def cache_key(self, digest: str, variant: str = '') -> str:
+        return hashlib.sha256(f"{digest}|{variant}|{self.signature}".encode()).hexdigest()
+
+    def _cache_path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.npy"
+
+    def _remember(self, key: str, depth: np.ndarray) -> np.ndarray:
+        """Keep a read-only copy in memory (hits hand out that shared array)"""
+        depth = depth.copy()
+        depth.flags.writeable = False
+        with self._memory_lock:
+            self._memory[key] = depth
+            self._memory.move_to_end(key)
+            while len(self._memory) > MEMORY_CACHE_ENTRIES:
+                self._memory.popitem(last=False)
+        return depth
+
+    def lookup(self, key: str) -> Optional[np.ndarray]:
+        with self._memory_lock:
+            depth = self._memory.get(key)
+            if depth is not None:
+                self._memory.move_to_end(key)
+                return depth
+        if self.cache_dir is None:
+            return None
+        try:
+            depth = np.load(self._cache_path(key)).astype(np.float32)
+        except (OSError, ValueError):
+            return None
+        return self._remember(key, depth)
+
+    def store(self, key: str, depth: np.ndarray) -> None:
+        self._remember(key, depth)
+        if self.cache_dir is None:
+            return
+        path = self._cache_path(key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_name(f"{path.stem}.{os.getpid()}.{threading.get_ident()}.tmp.npy")
+            np.save(tmp, depth.astype(np.float16))
+            os.replace(tmp, path)
+        except OSError as e:
+            logger.warning(f"[DEPTH] Could not store depth map {key[:12]}: {e}")
+
+    def estimate_cached(self, image: np.ndarray, digest: str, variant: str = '') -> Tuple[np.ndarray, bool]:
+        """
+        Memoized ``estimate``
+
+        Args:
+            image: Image to estimate (only read on a miss)
+            digest: Content hash of the source image
+            variant: Preprocessing applied to the source before ``image``
+                (e.g. resize/contrast), part of the memo key
+
+        Returns:
+            (depth map, cache_hit); hits return a shared read-only array
+        """
+        key = self.cache_key(digest, variant)
+        depth = self.lookup(key)
+        if depth is not None and depth.shape == np.asarray(image).shape[:2]:
+            self.stats['hits'] += 1
+            return depth, True
+        self.stats['misses'] += 1
+        depth = self.estimate(image)
+        self.store(key, depth)
+        return depth, False
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=True)
+
+
+_depth_engine: Optional[DepthEngine] = None
+_depth_engine_lock = threading.Lock()
+
+
+def get_depth_engine() -> DepthEngine:
+    """Get or create the depth engine singleton (configured from the environment)"""
+    global _depth_engine
+    with _depth_engine_lock:
+        if _depth_engine is None:
+            cache_dir = os.getenv('DEPTH_CACHE_DIR', str(Path(__file__).parent / 'cache' / 'depth'))
+            _depth_engine = DepthEngine(
+                max_side=int(os.getenv('DEPTH_MAX_SIDE', str(DEFAULT_MAX_SIDE))),
+                cache_dir=Path(cache_dir)
+            )
+            logger.info(f"[DEPTH] Depth engine ready (working side {_depth_engine.max_side}px, "
+                        f"OpenCV={'yes' if CV2_AVAILABLE else 'no'}, memo at {cache_dir})")
+        return _depth_engine
@@ -7,7 +7,9 @@ Minimal overhead with detailed request flow visualization
 import logging
 import time
 import threading
-from typing import Dict, List, Optional, Any
+from collections import deque
+from itertools import islice
+from typing import Deque, Dict, List, Optional, Any
 from datetime import datetime
 from dataclasses import dataclass, field, asdict
 from enum import Enum
@@ -25,7 +27,7 @@ class SpanStatus(Enum):
     ERROR = "error"
 
 
-@dataclass
+@dataclass(slots=True)
 class Span:
     """Single operation span in a trace"""
     span_id: str
@@ -65,7 +67,7 @@ class Span:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class Trace:
     """Complete trace containing multiple spans"""
     trace_id: str
@@ -119,8 +121,8 @@ class DistributedTracingSystem:
         # Active traces (in-flight)
         self.active_traces: Dict[str, Trace] = {}
 
-        # Completed traces (history)
-        self.completed_traces: List[Trace] = []
+        # Completed traces (history), oldest dropped past max_traces
+        self.completed_traces: Deque[Trace] = deque(maxlen=max_traces)
 
         # Current trace context (thread-local)
         self._trace_context = threading.local()
@@ -325,8 +327,6 @@ class DistributedTracingSystem:
 
                 # Add to history
                 self.completed_traces.append(trace)
-                if len(self.completed_traces) > self.max_traces:
-                    self.completed_traces = self.completed_traces[-self.max_traces:]
 
                 self.stats['traces_completed'] += 1
 
@@ -361,7 +361,8 @@ class DistributedTracingSystem:
     def get_completed_traces(self, limit: int = 100) -> List[Dict]:
         """Get recent completed traces"""
         with self._lock:
-            return [t.to_dict() for t in self.completed_traces[-limit:]]
+            recent = list(islice(reversed(self.completed_traces), limit))
+            return [t.to_dict() for t in reversed(recent)]
 
     def get_slow_traces(self, min_duration_ms: float = 1000, limit: int = 50) -> List[Dict]:
         """Get slow traces (above threshold)"""
@@ -0,0 +1,363 @@
+"""
+ORFEAS Download Service
+=======================
+Efficient delivery of generated models.
+
+- Strong ETags from the content hash (cached in a ``.sha256`` sidecar so
+  every worker shares one hash computation per artifact)
+- ``If-None-Match`` / ``If-Range`` / ``Range`` handling and zero-copy
+  ``sendfile`` through ``flask.send_file`` (``wsgi.file_wrapper``)
+- Optional ``X-Accel-Redirect`` hand-off to nginx
+  (``DOWNLOAD_X_ACCEL_PREFIX``, see ``nginx.production.conf``)
+- Precompressed ``.gz`` / ``.zst`` variants written once after generation
+  and served with ``Content-Encoding`` when the client accepts them
+- Paged base64 reads for clients behind proxies with body-size limits
+"""
+
+import base64
+import gzip
+import hashlib
+import json
+import logging
+import os
+import shutil
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from flask import Response, send_file
+
+logger = logging.getLogger(__name__)
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    zstandard = None
+    ZSTD_AVAILABLE = False
+
+HASH_CHUNK_SIZE = 1024 * 1024
+DEFAULT_B64_PAGE_SIZE = 3 * 1024 * 1024  # multiple of 3: pages concatenate to valid base64
+MAX_B64_PAGE_SIZE = 12 * 1024 * 1024
+MIN_COMPRESS_SIZE = 1024
+MIN_COMPRESSION_SAVING = 0.10  # keep a variant only if it saves at least 10%
+
+# Extensions that are already compressed - no point in precompressing.
+# GLB stays compressible: meshopt streams are designed for a gzip/zstd pass.
+INCOMPRESSIBLE_SUFFIXES = frozenset({'.png', '.jpg', '.jpeg', '.webp', '.gz', '.zst', '.zip', '.mp4'})
+
+# Encoding token -> variant suffix, in server preference order
+ENCODINGS: Tuple[Tuple[str, str], ...] = (('zstd', '.zst'), ('gzip', '.gz'))
+SIDECAR_SUFFIXES = ('.sha256',) + tuple(suffix for _, suffix in ENCODINGS)
+
+_etag_cache: 'OrderedDict[Tuple[str, int, int], str]' = OrderedDict()
+_etag_cache_lock = threading.Lock()
+_ETAG_CACHE_SIZE = 4096
+
+_precompress_pool: Optional[ThreadPoolExecutor] = None
+_precompress_lock = threading.Lock()
+
+
+def resolve_artifact(outputs_dir: Path, job_id: str, filename: str) -> Optional[Path]:
+    """
+    Resolve ``outputs_dir/job_id/filename`` without escaping the job directory
+
+    Returns:
+        Resolved path, or None if the path leaves the job directory,
+        does not exist or names an internal sidecar file
+    """
+    job_dir = (Path(outputs_dir) / job_id).resolve()
+    try:
+        resolved = (job_dir / filename).resolve()
+    except (OSError, RuntimeError):
+        return None
+    if job_dir not in resolved.parents or not resolved.is_file():
+        return None
+    if resolved.name.endswith(SIDECAR_SUFFIXES):
+        return None
+    return resolved
+
+
+# ---------------------------------------------------------------------------
+# Content hashing
+# ---------------------------------------------------------------------------
+
+def _sidecar_path(path: Path) -> Path:
+    return path.with_name(path.name + '.sha256')
+
+
+def _hash_file(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def content_hash(path: Path) -> str:
+    """
+    SHA-256 of the file content
+
+    Cached in memory by (path, size, mtime) and persisted to a sidecar file,
+    so the file is read at most once per change across all workers.
+    """
+    path = Path(path)
+    st = path.stat()
+    key = (str(path), st.st_size, st.st_mtime_ns)
+    with _etag_cache_lock:
+        cached = _etag_cache.get(key)
+        if cached is not None:
+            _etag_cache.move_to_end(key)
+            return cached
+
+    sidecar = _sidecar_path(path)
+    digest = None
+    try:
+        meta = json.loads(sidecar.read_text())
+        if meta.get('size') == st.st_size and meta.get('mtime_ns') == st.st_mtime_ns:
+            digest = meta['sha256']
+    except (OSError, ValueError, KeyError):
+        pass
+
+    if digest is None:
+        digest = _hash_file(path)
+        try:
+            tmp = sidecar.with_name(f"{sidecar.name}.{os.getpid()}.tmp")
+            tmp.write_text(json.dumps({'size': st.st_size, 'mtime_ns': st.st_mtime_ns, 'sha256': digest}))
+            os.replace(tmp, sidecar)
+        except OSError as e:
+            logger.debug(f"[DOWNLOAD] Could not write hash sidecar for {path.name}: {e}")
+
+    with _etag_cache_lock:
+        _etag_cache[key] = digest
+        while len(_etag_cache) > _ETAG_CACHE_SIZE:
+            _etag_cache.popitem(last=False)
+    return digest
+
+
+def record_content_hash(path: Path, digest: str) -> None:
+    """
+    Store a hash the caller already computed (e.g. while validating an
+    upload) so ``content_hash`` never has to read the file
+    """
+    path = Path(path)
+    st = path.stat()
+    try:
+        sidecar = _sidecar_path(path)
+        tmp = sidecar.with_name(f"{sidecar.name}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps({'size': st.st_size, 'mtime_ns': st.st_mtime_ns, 'sha256': digest}))
+        os.replace(tmp, sidecar)
+    except OSError as e:
+        logger.debug(f"[DOWNLOAD] Could not write hash sidecar for {path.name}: {e}")
+    with _etag_cache_lock:
+        _etag_cache[(str(path), st.st_size, st.st_mtime_ns)] = digest
+        while len(_etag_cache) > _ETAG_CACHE_SIZE:
+            _etag_cache.popitem(last=False)
+
+
+# ---------------------------------------------------------------------------
+# Precompression
+# ---------------------------------------------------------------------------
+
+def _compress_to(path: Path, encoding: str, target: Path) -> None:
+    tmp = target.with_name(f"{target.name}.{os.getpid()}.tmp")
+    with open(path, 'rb') as src, open(tmp, 'wb') as dst:
+        if encoding == 'gzip':
+            with gzip.GzipFile(fileobj=dst, mode='wb', compresslevel=9, mtime=0) as gz:
+                shutil.copyfileobj(src, gz, HASH_CHUNK_SIZE)
+        else:
+            zstandard.ZstdCompressor(level=19).copy_stream(src, dst)
+    os.replace(tmp, target)
+
+
+def precompress_artifact(path: Path) -> Dict[str, int]:
+    """
+    Write compressed variants of a generated artifact and its hash sidecar
+
+    Variants that do not save at least ``MIN_COMPRESSION_SAVING`` are
+    discarded, so only encodings worth serving exist on disk.
+
+    Returns:
+        ``{encoding: compressed_size}`` for the variants kept
+    """
+    path = Path(path)
+    content_hash(path)
+    size = path.stat().st_size
+    if size < MIN_COMPRESS_SIZE or path.suffix.lower() in INCOMPRESSIBLE_SUFFIXES:
+        return {}
+
+    kept = {}
+    for encoding, suffix in ENCODINGS:
+        if encoding == 'zstd' and not ZSTD_AVAILABLE:
+            continue
+        target = path.with_name(path.name + suffix)
+        try:
+            _compress_to(path, encoding, target)
+        except OSError as e:
+            logger.warning(f"[DOWNLOAD] {encoding} precompression failed for {path.name}: {e}")
+            continue
+        compressed = target.stat().st_size
+        if compressed > size * (1 - MIN_COMPRESSION_SAVING):
+            target.unlink(missing_ok=True)
+            continue
+        kept[encoding] = compressed
+
+    if kept:
+        logger.info(f"[DOWNLOAD] Precompressed {path.name} ({size} bytes): {kept}")
+    return kept
+
+
+def precompress_async(path: Path) -> None:
+    """Schedule ``precompress_artifact`` on a small background pool"""
+    global _precompress_pool
+    with _precompress_lock:
+        if _precompress_pool is None:
+            _precompress_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="precompress")
+    future = _precompress_pool.submit(precompress_artifact, path)
+    future.add_done_callback(
+        lambda f: f.exception() and logger.warning(f"[DOWNLOAD] Precompression failed: {f.exception()}"))
+
+
+def _accepted_encodings(header: Optional[str]) -> Dict[str, float]:
+    accepted = {}
+    for part in (header or '').split(','):
+        token, _, params = part.strip().partition(';')
+        token = token.strip().lower()
+        if not token:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[token] = quality
+    return accepted
+
+
+def select_variant(path: Path, accept_encoding: Optional[str],
+                   has_range: bool = False) -> Tuple[Path, Optional[str]]:
+    """
+    Pick the precompressed variant to serve
+
+    Ranges always apply to the identity representation, so a ranged request
+    is served uncompressed.
+
+    Returns:
+        (file_to_send, content_encoding or None)
+    """
+    if has_range:
+        return path, None
+    accepted = _accepted_encodings(accept_encoding)
+    wildcard = accepted.get('*', 0.0)
+    original_mtime = None
+    for encoding, suffix in ENCODINGS:
+        if accepted.get(encoding, wildcard) <= 0:
+            continue
+        variant = path.with_name(path.name + suffix)
+        try:
+            st = variant.stat()
+        except OSError:
+            continue
+        if original_mtime is None:
+            original_mtime = path.stat().st_mtime_ns
+        if st.st_mtime_ns >= original_mtime:
+            return variant, encoding
+    return path, None
+
+
+# ---------------------------------------------------------------------------
+# Responses
+# ---------------------------------------------------------------------------
+
+def send_artifact(request: Any, path: Path, download_name: str, mimetype: str,
+                  relative_path: Optional[str] = None) -> Response:
+    """
+    Build the download response for a generated artifact
+
+    Args:
+        request: Current Flask request
+        path: Resolved artifact path
+        download_name: Filename for ``Content-Disposition``
+        mimetype: Content type of the identity representation
+        relative_path: ``job_id/filename`` for X-Accel-Redirect
+
+    Returns:
+        200/206/304/416 response; the body is sent with ``sendfile`` or by
+        nginx, never through a Python generator
+    """
+    path = Path(path)
+    digest = content_hash(path)
+    send_path, encoding = select_variant(path, request.headers.get('Accept-Encoding'),
+                                         has_range='Range' in request.headers)
+    etag = digest[:32] if encoding is None else f"{digest[:32]}-{encoding}"
+
+    accel_prefix = os.getenv('DOWNLOAD_X_ACCEL_PREFIX')
+    if accel_prefix and relative_path:
+        if request.if_none_match.contains(etag):
+            response = Response(status=304)
+        else:
+            response = Response(mimetype=mimetype)
+            internal = accel_prefix.rstrip('/') + '/' + relative_path.lstrip('/')
+            if encoding is not None:
+                internal += send_path.name[len(path.name):]
+            response.headers['X-Accel-Redirect'] = internal
+            response.headers['Content-Disposition'] = f'attachment; filename="{download_name}"'
+        response.set_etag(etag)
+    else:
+        response = send_file(
+            str(send_path),
+            mimetype=mimetype,
+            as_attachment=True,
+            download_name=download_name,
+            conditional=True,
+            etag=etag,
+            max_age=None,
+        )
+
+    if encoding is not None and response.status_code != 304:
+        response.headers['Content-Encoding'] = encoding
+    response.vary.add('Accept-Encoding')
+    response.headers['Accept-Ranges'] = 'bytes'
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    return response
+
+
+def read_base64_page(path: Path, offset: int = 0,
+                     page_size: int = DEFAULT_B64_PAGE_SIZE) -> Dict[str, Any]:
+    """
+    Read one page of a file as base64
+
+    The page size is rounded down to a multiple of 3 so the pages'
+    base64 strings can also be concatenated into a valid encoding of the
+    whole file.  Only the requested page is read into memory.
+    """
+    path = Path(path)
+    total = path.stat().st_size
+    page_size = max(3, min(int(page_size), MAX_B64_PAGE_SIZE))
+    page_size -= page_size % 3
+    offset = max(0, int(offset))
+    if offset > total:
+        raise ValueError(f"offset {offset} beyond end of file ({total} bytes)")
+
+    with open(path, 'rb') as f:
+        f.seek(offset)
+        chunk = f.read(page_size)
+
+    next_offset = offset + len(chunk)
+    done = next_offset >= total
+    return {
+        'status': 'success',
+        'filename': path.name,
+        'original_size': total,
+        'offset': offset,
+        'length': len(chunk),
+        'next_offset': None if done else next_offset,
+        'done': done,
+        'etag': content_hash(path)[:32],
+        'data': base64.b64encode(chunk).decode('ascii'),
+    }
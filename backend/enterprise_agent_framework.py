@@ -12,14 +12,25 @@ Features:
 - Intelligent Memory Management
 - Collaborative Problem-Solving
 - Self-Improvement & Adaptive Learning
+- Priority/deadline (EDF) task scheduling with work stealing and load shedding
+- Indexed, persistent experience memory per agent (experience_store.py)
+
+Environment:
+    AGENT_MAX_CONCURRENCY         concurrent tasks per agent (default 2)
+    AGENT_WORK_STEALING           idle agents take queued tasks from busy ones (default true)
+    AGENT_EXPERIENCE_DIR          experience logs (default data/agent_experience, '' for memory only)
+    AGENT_EXPERIENCE_CAPACITY     experiences kept per agent and task type (default 1000)
 """
 
 import asyncio
+import heapq
+import itertools
 import json
 import logging
+import os
 import time
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
+from dataclasses import dataclass, asdict, field
 from enum import Enum
 from typing import Any, Dict, List, Optional, Union, Callable
 from datetime import datetime, timedelta
@@ -27,6 +38,8 @@ import uuid
 import threading
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
+from experience_store import experience_store_for
+
 # External dependencies (install via requirements)
 try:
     from langchain_core.agents import AgentExecutor
@@ -113,6 +126,19 @@ class AgentExperience:
     timestamp: datetime
     learned_patterns: Dict[str, Any] = None
 
+    def to_record(self) -> Dict[str, Any]:
+        """JSON-able form for the experience log"""
+        record = asdict(self)
+        record['timestamp'] = self.timestamp.isoformat() if self.timestamp else None
+        return record
+
+    @classmethod
+    def from_record(cls, record: Dict[str, Any]) -> 'AgentExperience':
+        fields = dict(record)
+        if fields.get('timestamp'):
+            fields['timestamp'] = datetime.fromisoformat(fields['timestamp'])
+        return cls(**fields)
+
 class EnterpriseAgentBase(ABC):
     """Base class for all enterprise agents"""
 
@@ -127,9 +153,13 @@ class EnterpriseAgentBase(ABC):
             'tasks_completed': 0,
             'success_rate': 0.0,
             'average_execution_time': 0.0,
-            'quality_score': 0.0
+            'quality_score': 0.0,
+            'tasks_scheduled': 0,
+            'average_queue_time': 0.0,
+            'deadline_misses': 0,
+            'tasks_shed': 0
         }
-        self.experience_buffer = []
+        self.experience_store = experience_store_for(agent_id, loader=AgentExperience.from_record)
         self.active_tasks = {}
         self.memory_store = {}
 
@@ -151,8 +181,30 @@ class EnterpriseAgentBase(ABC):
         """Check if agent can handle the given task"""
         pass
 
-    def update_performance_metrics(self, execution_time: float, success: bool, quality_score: float):
-        """Update agent performance metrics"""
+    def update_performance_metrics(self, execution_time: float, success: bool, quality_score: float,
+                                   queue_time: Optional[float] = None, deadline_missed: bool = False,
+                                   shed: bool = False):
+        """
+        Update agent performance metrics
+
+        Agents record each execution themselves.  The scheduler calls this
+        again with ``queue_time`` to record how long the task waited, whether
+        it missed its deadline and whether it was shed; that call does not
+        count as another completed task.
+        """
+        if queue_time is not None:
+            self.performance_metrics['tasks_scheduled'] += 1
+            scheduled = self.performance_metrics['tasks_scheduled']
+            current_wait = self.performance_metrics['average_queue_time']
+            self.performance_metrics['average_queue_time'] = (
+                (current_wait * (scheduled - 1) + queue_time) / scheduled
+            )
+            if deadline_missed:
+                self.performance_metrics['deadline_misses'] += 1
+            if shed:
+                self.performance_metrics['tasks_shed'] += 1
+            return
+
         self.performance_metrics['tasks_completed'] += 1
 
         # Update success rate
@@ -176,27 +228,39 @@ class EnterpriseAgentBase(ABC):
 
         self.last_activity = datetime.utcnow()
 
-    def store_experience(self, experience: AgentExperience):
-        """Store learning experience"""
-        self.experience_buffer.append(experience)
-
-        # Limit buffer size
-        max_buffer_size = 1000
-        if len(self.experience_buffer) > max_buffer_size:
-            self.experience_buffer = self.experience_buffer[-max_buffer_size:]
-
-    def get_relevant_experience(self, task: AgentTask, similarity_threshold: float = 0.8) -> List[AgentExperience]:
-        """Get relevant past experiences for a task"""
-        relevant_experiences = []
+    @property
+    def experience_buffer(self) -> List[AgentExperience]:
+        """All remembered experiences, oldest first per task type"""
+        return self.experience_store.items()
 
-        for experience in self.experience_buffer:
-            if experience.task_type == task.type:
-                # Simple similarity check - can be enhanced with vector similarity
-                similarity_score = self._calculate_experience_similarity(task, experience)
-                if similarity_score >= similarity_threshold:
-                    relevant_experiences.append(experience)
+    def store_experience(self, experience: AgentExperience):
+        """Store learning experience (the store keeps a fixed number per task type)"""
+        try:
+            self.experience_store.add(experience.to_record(), item=experience)
+        except Exception as e:
+            logger.warning(f"[AGENT] {self.agent_id} could not store experience {experience.task_id}: {e}")
+
+    def get_relevant_experience(self, task: AgentTask, similarity_threshold: float = 0.8,
+                                limit: int = 10, approximate: bool = False) -> List[AgentExperience]:
+        """
+        Get relevant past experiences for a task
+
+        Returns the ``limit`` best-quality experiences of the task's type
+        whose context passes ``similarity_threshold``. With ``approximate``
+        only the ``limit * 4`` nearest experiences by context features are
+        checked, which is faster on large stores but may miss the best one.
+        """
+        if approximate:
+            candidates = (experience for _, experience in
+                          self.experience_store.search(task.type, task.context, k=limit * 4))
+        else:
+            candidates = self.experience_store.items(task.type)
 
-        return sorted(relevant_experiences, key=lambda x: x.quality_score, reverse=True)
+        relevant_experiences = (
+            experience for experience in candidates
+            if self._calculate_experience_similarity(task, experience) >= similarity_threshold
+        )
+        return heapq.nlargest(limit, relevant_experiences, key=lambda x: x.quality_score)
 
     def _calculate_experience_similarity(self, task: AgentTask, experience: AgentExperience) -> float:
         """Calculate similarity between task and experience"""
@@ -1009,6 +1073,249 @@ class PerformanceOptimizationAgent(EnterpriseAgentBase):
             'quality_score': 0.87
         }
 
+# Scheduling: priority classes first, earliest deadline first within a class
+PRIORITY_RANK = {
+    TaskPriority.CRITICAL: 0,
+    TaskPriority.HIGH: 1,
+    TaskPriority.MEDIUM: 2,
+    TaskPriority.LOW: 3
+}
+
+DEFAULT_AGENT_CONCURRENCY = 2
+MIN_SERVICE_TIME_ESTIMATE = 0.01  # seconds, for agents without history
+
+
+@dataclass(order=True)
+class ScheduledTask:
+    """Queue entry: ordered by (priority rank, deadline, arrival)"""
+    rank: int
+    deadline: float  # monotonic seconds; inf without a deadline
+    sequence: int
+    task: AgentTask = field(compare=False)
+    future: asyncio.Future = field(compare=False)
+    home_agent_id: str = field(compare=False)
+    enqueued_at: float = field(compare=False)
+
+    def expired(self, now: float) -> bool:
+        return now > self.deadline
+
+
+class AgentTaskScheduler:
+    """
+    Priority- and deadline-aware dispatch of tasks to agents
+
+    - Each agent has its own queue ordered by priority class, then earliest
+      deadline (EDF), then arrival; a task goes to the suitable agent with
+      the shortest expected wait, estimated from its queue length and the
+      ``average_execution_time`` its metrics report
+    - At most ``max_concurrency`` tasks run per agent at once
+    - An agent with an empty queue steals the most urgent task it can
+      handle from another agent's queue
+    - Tasks whose deadline passed before they started are shed (failed
+      without running) instead of delaying everything behind them
+    - Queue time, deadline misses and shed tasks are fed back through
+      ``update_performance_metrics``
+
+    Args:
+        max_concurrency: Default concurrent tasks per agent
+        work_stealing: Let idle agents take queued tasks from busy ones
+    """
+
+    def __init__(self, max_concurrency: int = DEFAULT_AGENT_CONCURRENCY, work_stealing: bool = True):
+        self.max_concurrency = max_concurrency
+        self.work_stealing = work_stealing
+        self.agents: Dict[str, EnterpriseAgentBase] = {}
+        self.concurrency: Dict[str, int] = {}
+        self.queues: Dict[str, List[ScheduledTask]] = {}
+        self.running: Dict[str, int] = {}
+        self._sequence = itertools.count()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Condition] = None
+        self._workers: List[asyncio.Task] = []
+        self.stats = {
+            'submitted': 0,
+            'completed': 0,
+            'failed': 0,
+            'shed': 0,
+            'stolen': 0,
+            'deadline_misses': 0
+        }
+
+    def add_agent(self, agent: EnterpriseAgentBase, max_concurrency: Optional[int] = None):
+        """Give an agent a queue and worker slots"""
+        self.agents[agent.agent_id] = agent
+        self.concurrency[agent.agent_id] = max_concurrency or self.max_concurrency
+        self.queues.setdefault(agent.agent_id, [])
+        self.running.setdefault(agent.agent_id, 0)
+        if self._loop is not None:
+            self._start_workers(agent.agent_id)
+
+    def _ensure_started(self):
+        loop = asyncio.get_running_loop()
+        if self._loop is loop:
+            return
+        # First use, or the previous event loop is gone (e.g. asyncio.run per request)
+        self._loop = loop
+        self._wakeup = asyncio.Condition()
+        self._workers = []
+        for agent_id in self.agents:
+            self.queues[agent_id] = []
+            self.running[agent_id] = 0
+            self._start_workers(agent_id)
+
+    def _start_workers(self, agent_id: str):
+        for _ in range(self.concurrency[agent_id]):
+            self._workers.append(self._loop.create_task(self._worker(agent_id)))
+
+    def expected_wait(self, agent: EnterpriseAgentBase) -> float:
+        """Seconds until a new task on ``agent`` would start"""
+        service_time = max(agent.performance_metrics['average_execution_time'], MIN_SERVICE_TIME_ESTIMATE)
+        backlog = len(self.queues[agent.agent_id]) + self.running[agent.agent_id]
+        return backlog * service_time / self.concurrency[agent.agent_id]
+
+    def submit_nowait(self, task: AgentTask, agents: List[EnterpriseAgentBase]) -> asyncio.Future:
+        """
+        Queue ``task`` on the best of ``agents``
+
+        Returns:
+            Future resolving to the task result dict
+        """
+        self._ensure_started()
+        future = self._loop.create_future()
+        now = time.monotonic()
+        deadline = float('inf')
+        if task.deadline is not None:
+            deadline = now + (task.deadline - datetime.utcnow()).total_seconds()
+
+        candidates = [a for a in agents if a.agent_id in self.agents]
+        agent = min(candidates, key=lambda a: (self.expected_wait(a), -a.performance_metrics['success_rate']))
+        entry = ScheduledTask(PRIORITY_RANK.get(task.priority, len(PRIORITY_RANK)), deadline,
+                              next(self._sequence), task, future, agent.agent_id, now)
+        self.stats['submitted'] += 1
+        task.status = "queued"
+
+        if entry.expired(now):
+            self._shed(entry, now)
+            return future
+        heapq.heappush(self.queues[agent.agent_id], entry)
+        self._loop.create_task(self._notify())
+        return future
+
+    async def submit(self, task: AgentTask, agents: List[EnterpriseAgentBase]) -> Dict[str, Any]:
+        """Queue ``task`` and wait for its result"""
+        return await self.submit_nowait(task, agents)
+
+    async def _notify(self):
+        async with self._wakeup:
+            self._wakeup.notify_all()
+
+    def _next_for(self, agent_id: str) -> Optional[ScheduledTask]:
+        """Most urgent runnable entry for ``agent_id``; sheds expired entries on the way"""
+        now = time.monotonic()
+        own = self.queues[agent_id]
+        while own:
+            entry = heapq.heappop(own)
+            if not entry.expired(now):
+                return entry
+            self._shed(entry, now)
+        if not self.work_stealing:
+            return None
+
+        agent = self.agents[agent_id]
+        best_queue = None
+        for other_id, queue in self.queues.items():
+            while queue and queue[0].expired(now):
+                self._shed(heapq.heappop(queue), now)
+            if other_id == agent_id or not queue or not agent.can_handle_task(queue[0].task):
+                continue
+            if best_queue is None or queue[0] < best_queue[0]:
+                best_queue = queue
+        if best_queue is None:
+            return None
+        self.stats['stolen'] += 1
+        return heapq.heappop(best_queue)
+
+    def _shed(self, entry: ScheduledTask, now: float):
+        entry.task.status = "shed"
+        waited = now - entry.enqueued_at
+        self.stats['shed'] += 1
+        self.stats['deadline_misses'] += 1
+        home = self.agents.get(entry.home_agent_id)
+        if home is not None:
+            home.update_performance_metrics(0.0, False, 0.0, queue_time=waited, deadline_missed=True, shed=True)
+        if not entry.future.done():
+            entry.future.set_result({
+                'success': False,
+                'error': "Task deadline passed before it could start",
+                'shed': True,
+                'task_id': entry.task.id,
+                'queue_time': waited
+            })
+        logger.warning(f"[SCHEDULER] Shed task {entry.task.id} ({entry.task.priority.value}) after {waited:.3f}s")
+
+    async def _worker(self, agent_id: str):
+        agent = self.agents[agent_id]
+        while True:
+            async with self._wakeup:
+                entry = self._next_for(agent_id)
+                while entry is None:
+                    await self._wakeup.wait()
+                    entry = self._next_for(agent_id)
+            if entry.future.cancelled():
+                continue
+            await self._run(agent, entry)
+
+    async def _run(self, agent: EnterpriseAgentBase, entry: ScheduledTask):
+        task = entry.task
+        started = time.monotonic()
+        waited = started - entry.enqueued_at
+        self.running[agent.agent_id] += 1
+        task.assigned_agent = agent.agent_id
+        task.status = "running"
+        try:
+            result = await agent.execute_task(task)
+        except Exception as e:
+            logger.error(f"[SCHEDULER] Task {task.id} failed on {agent.agent_id}: {e}")
+            result = {'success': False, 'error': str(e)}
+        finally:
+            self.running[agent.agent_id] -= 1
+
+        missed = time.monotonic() > entry.deadline
+        success = result.get('success', True)
+        task.status = "completed" if success else "failed"
+        self.stats['completed' if success else 'failed'] += 1
+        if missed:
+            self.stats['deadline_misses'] += 1
+        agent.update_performance_metrics(0.0, success, 0.0, queue_time=waited, deadline_missed=missed)
+
+        result['agent_id'] = agent.agent_id
+        result['task_id'] = task.id
+        result['queue_time'] = waited
+        if not entry.future.done():
+            entry.future.set_result(result)
+
+    async def shutdown(self):
+        """Stop workers and fail everything still queued"""
+        for worker in self._workers:
+            worker.cancel()
+        self._workers = []
+        for queue in self.queues.values():
+            for entry in queue:
+                if not entry.future.done():
+                    entry.future.set_result({'success': False, 'error': "Scheduler shut down",
+                                             'task_id': entry.task.id})
+            queue.clear()
+        self._loop = None
+
+    def get_scheduler_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            'queued': {agent_id: len(queue) for agent_id, queue in self.queues.items()},
+            'running': dict(self.running),
+            'concurrency': dict(self.concurrency),
+            'work_stealing': self.work_stealing
+        }
+
 class EnterpriseAgentOrchestrator:
     """Orchestrates multiple enterprise agents for complex tasks"""
 
@@ -1018,6 +1325,10 @@ class EnterpriseAgentOrchestrator:
         self.active_tasks = {}
         self.agent_registry = {}
         self.coordination_lock = asyncio.Lock()
+        self.scheduler = AgentTaskScheduler(
+            max_concurrency=int(os.getenv('AGENT_MAX_CONCURRENCY', str(DEFAULT_AGENT_CONCURRENCY))),
+            work_stealing=os.getenv('AGENT_WORK_STEALING', 'true').lower() in ('1', 'true', 'yes', 'on')
+        )
 
         # Initialize default agents
         self._initialize_default_agents()
@@ -1060,6 +1371,7 @@ class EnterpriseAgentOrchestrator:
     def register_agent(self, agent: EnterpriseAgentBase):
         """Register an agent with the orchestrator"""
         self.agents[agent.agent_id] = agent
+        self.scheduler.add_agent(agent)
 
         # Update agent registry by capabilities
         for capability in agent.capabilities:
@@ -1082,7 +1394,7 @@ class EnterpriseAgentOrchestrator:
         return None
 
     async def execute_task(self, task: AgentTask) -> Dict[str, Any]:
-        """Execute a task using the most appropriate agent"""
+        """Execute a task using the most appropriate agent (queued by priority and deadline)"""
         # Find suitable agents
         suitable_agents = self._find_suitable_agents(task)
 
@@ -1093,28 +1405,14 @@ class EnterpriseAgentOrchestrator:
                 'task_id': task.id
             }
 
-        # Select best agent (simple selection - can be enhanced)
-        selected_agent = suitable_agents[0]
-
-        # Execute task
-        logger.info(f"[ORCHESTRATOR] Executing task {task.id} with agent {selected_agent.agent_id}")
-
-        try:
-            result = await selected_agent.execute_task(task)
-            result['agent_id'] = selected_agent.agent_id
-            result['task_id'] = task.id
-
-            logger.info(f"[ORCHESTRATOR] Task {task.id} completed successfully")
-            return result
+        logger.info(f"[ORCHESTRATOR] Scheduling task {task.id} ({task.priority.value})")
+        result = await self.scheduler.submit(task, suitable_agents)
 
-        except Exception as e:
-            logger.error(f"[ORCHESTRATOR] Task {task.id} failed: {e}")
-            return {
-                'success': False,
-                'error': str(e),
-                'agent_id': selected_agent.agent_id,
-                'task_id': task.id
-            }
+        if result.get('success', True):
+            logger.info(f"[ORCHESTRATOR] Task {task.id} completed successfully on {result.get('agent_id')}")
+        else:
+            logger.error(f"[ORCHESTRATOR] Task {task.id} failed: {result.get('error')}")
+        return result
 
     def _find_suitable_agents(self, task: AgentTask) -> List[EnterpriseAgentBase]:
         """Find agents suitable for executing a task"""
@@ -1199,6 +1497,7 @@ class EnterpriseAgentOrchestrator:
             'total_agents': len(self.agents),
             'active_tasks': len(self.active_tasks),
             'agent_status': agent_status,
+            'scheduler': self.scheduler.get_scheduler_stats(),
             'capability_coverage': {
                 cap.value: len(self.agent_registry.get(cap, []))
                 for cap in AgentCapability
@@ -1212,6 +1511,10 @@ class EnterpriseAgentOrchestrator:
         # Cancel all active tasks
         for task_id in list(self.active_tasks.keys()):
             self.active_tasks[task_id].cancel()
+        await self.scheduler.shutdown()
+
+        for agent in self.agents.values():
+            agent.experience_store.close()
 
         # Clear agents
         self.agents.clear()
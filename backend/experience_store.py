@@ -0,0 +1,416 @@
+"""
+ORFEAS Agent Experience Store
+=============================
+Indexed, persistent memory of past task executions for enterprise agents.
+
+- One partition per task type, each a fixed-capacity ring buffer: the
+  oldest experience of a type is overwritten in place, nothing is
+  re-sliced
+- Every experience gets a feature vector hashed from its task context
+  (context keys, plus scalar ``key=value`` pairs at lower weight),
+  L2-normalised so a dot product is cosine similarity
+- Top-k lookup goes through an inverted-file (IVF) index per partition:
+  spherical k-means centroids, slots sorted by centroid, and a query
+  scans only the lists of its ``nprobe`` nearest centroids plus whatever
+  was written since the lists were last rebuilt.  Small partitions are
+  scanned directly
+- Records are appended to a JSON-lines log and replayed on start; once
+  the log holds ``compact_ratio`` times more lines than live records it is
+  rewritten with the newest ``capacity`` records per task type.  Several
+  processes (gunicorn workers) may share one log: appends and compaction
+  hold an exclusive lock on ``<log>.lock``, compaction works from the file
+  rather than one process's memory, and a process whose log was replaced
+  by another's compaction reopens it before its next append
+
+Records are JSON-able dicts with at least ``task_type``, ``context`` and
+``quality_score``; a ``loader`` turns a replayed record back into the
+object callers get from ``search``.
+
+Environment:
+    AGENT_EXPERIENCE_DIR          log directory ('' keeps memory only; default data/agent_experience)
+    AGENT_EXPERIENCE_CAPACITY     experiences kept per task type (default 1000)
+"""
+
+import json
+import logging
+import os
+import threading
+import zlib
+from collections import deque
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: single-process use only
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+FEATURE_DIM = 64
+VALUE_WEIGHT = 0.5
+DEFAULT_CAPACITY = 1000
+DEFAULT_NPROBE = 8
+INDEX_MIN_SIZE = 4096          # below this a partition is scanned directly
+INDEX_TRAIN_SAMPLE = 32768
+INDEX_KMEANS_ITERATIONS = 6
+INDEX_REBUILD_FRACTION = 0.05  # rebuild inverted lists after this share of new writes
+DEFAULT_COMPACT_RATIO = 2.0
+COMPACT_MIN_LINES = 1000
+ASSIGN_CHUNK = 16384
+
+
+def _token_bucket(token: str, dim: int) -> Tuple[int, float]:
+    """Stable (per-run independent) signed hash of a feature token"""
+    digest = zlib.crc32(token.encode('utf-8'))
+    return digest % dim, (1.0 if (digest >> 31) & 1 else -1.0)
+
+
+def context_features(context: Dict[str, Any], dim: int = FEATURE_DIM) -> np.ndarray:
+    """Unit feature vector of a task context (all zeros for an empty context)"""
+    vector = np.zeros(dim, dtype=np.float32)
+    for key, value in (context or {}).items():
+        index, sign = _token_bucket(f"k:{key}", dim)
+        vector[index] += sign
+        if isinstance(value, float):
+            value = round(value, 2)
+        if isinstance(value, (str, bool, int, float)):
+            index, sign = _token_bucket(f"v:{key}={value}", dim)
+            vector[index] += sign * VALUE_WEIGHT
+    norm = float(np.linalg.norm(vector))
+    if norm > 0:
+        vector /= norm
+    return vector
+
+
+class ExperiencePartition:
+    """Ring buffer of one task type's experiences with an IVF index over their vectors"""
+
+    def __init__(self, capacity: int, dim: int = FEATURE_DIM):
+        self.capacity = capacity
+        self.vectors = np.zeros((capacity, dim), dtype=np.float32)
+        self.items: List[Any] = [None] * capacity
+        self.records: List[Optional[Dict[str, Any]]] = [None] * capacity
+        self.size = 0
+        self.next_slot = 0
+
+        # IVF index
+        self.centroids: Optional[np.ndarray] = None
+        self.assign = np.full(capacity, -1, dtype=np.int32)
+        self.order: Optional[np.ndarray] = None
+        self.bounds: Optional[np.ndarray] = None
+        self.pending: List[int] = []
+        self.trained_size = 0
+
+    def add(self, vector: np.ndarray, item: Any, record: Dict[str, Any]) -> int:
+        slot = self.next_slot
+        self.vectors[slot] = vector
+        self.items[slot] = item
+        self.records[slot] = record
+        self.next_slot = (slot + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+
+        if self.centroids is not None:
+            self.assign[slot] = int(np.argmax(self.centroids @ vector))
+            self.pending.append(slot)
+            if len(self.pending) > max(256, self.size * INDEX_REBUILD_FRACTION):
+                self._rebuild_lists()
+        if self.size >= INDEX_MIN_SIZE and self.size >= 4 * self.trained_size:
+            self.train()
+        return slot
+
+    def oldest_first(self) -> List[int]:
+        """Live slots from oldest to newest"""
+        if self.size < self.capacity:
+            return list(range(self.size))
+        return list(range(self.next_slot, self.capacity)) + list(range(self.next_slot))
+
+    # -- index ---------------------------------------------------------------
+
+    def train(self, seed: int = 0) -> None:
+        """(Re)cluster the partition: spherical k-means on a sample, then assign every slot"""
+        rng = np.random.default_rng(seed)
+        live = self.vectors[:self.size]
+        lists = max(8, int(np.sqrt(self.size)))
+        sample = live[rng.choice(self.size, size=min(self.size, max(INDEX_TRAIN_SAMPLE, lists * 8)), replace=False)]
+        centroids = sample[rng.choice(len(sample), size=lists, replace=False)].copy()
+        for _ in range(INDEX_KMEANS_ITERATIONS):
+            labels = np.argmax(sample @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, labels, sample)
+            norms = np.linalg.norm(sums, axis=1, keepdims=True)
+            empty = norms[:, 0] == 0
+            sums[empty] = sample[rng.choice(len(sample), size=int(empty.sum()))]  # reseed empty lists
+            norms[empty] = 1.0
+            centroids = (sums / norms).astype(np.float32)
+        self.centroids = centroids
+        for start in range(0, self.size, ASSIGN_CHUNK):
+            chunk = live[start:start + ASSIGN_CHUNK]
+            self.assign[start:start + len(chunk)] = np.argmax(chunk @ centroids.T, axis=1)
+        self.trained_size = self.size
+        self._rebuild_lists()
+        logger.debug(f"[EXPERIENCE] Indexed {self.size} experiences into {lists} lists")
+
+    def _rebuild_lists(self) -> None:
+        assign = self.assign[:self.size]
+        self.order = np.argsort(assign, kind='stable').astype(np.int64)
+        self.bounds = np.searchsorted(assign[self.order], np.arange(len(self.centroids) + 1))
+        self.pending = []
+
+    def search(self, vector: np.ndarray, k: int, nprobe: int = DEFAULT_NPROBE) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Approximate top-k slots by cosine similarity
+
+        Returns:
+            (slots, scores), best first
+        """
+        if self.size == 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+        if self.centroids is None:
+            candidates = np.arange(self.size)
+        else:
+            coarse = self.centroids @ vector
+            nprobe = min(nprobe, len(coarse))
+            probes = np.argpartition(-coarse, nprobe - 1)[:nprobe]
+            parts = []
+            for cluster in probes:
+                members = self.order[self.bounds[cluster]:self.bounds[cluster + 1]]
+                parts.append(members[self.assign[members] == cluster])  # drop slots overwritten since the rebuild
+            if self.pending:
+                parts.append(np.asarray(self.pending, dtype=np.int64))
+            candidates = np.unique(np.concatenate(parts))
+        scores = self.vectors[candidates] @ vector
+        if len(candidates) > k:
+            top = np.argpartition(-scores, k - 1)[:k]
+            candidates, scores = candidates[top], scores[top]
+        best = np.argsort(-scores, kind='stable')
+        return candidates[best], scores[best]
+
+
+class ExperienceStore:
+    """
+    Per-task-type experience partitions with nearest-neighbour lookup and an append-only log
+
+    Args:
+        path: JSON-lines log to replay and append to (None keeps memory only)
+        capacity: Experiences kept per task type
+        loader: Turns a replayed record into the stored item (default: the record itself)
+        nprobe: Index lists scanned per lookup
+        compact_ratio: Rewrite the log once it has this many lines per live record
+    """
+
+    def __init__(self, path: Optional[str] = None, capacity: int = DEFAULT_CAPACITY,
+                 loader: Optional[Callable[[Dict[str, Any]], Any]] = None,
+                 nprobe: int = DEFAULT_NPROBE, compact_ratio: float = DEFAULT_COMPACT_RATIO,
+                 dim: int = FEATURE_DIM):
+        self.path = Path(path) if path else None
+        self.capacity = capacity
+        self.loader = loader or (lambda record: record)
+        self.nprobe = nprobe
+        self.compact_ratio = compact_ratio
+        self.dim = dim
+        self.partitions: Dict[str, ExperiencePartition] = {}
+        self._lock = threading.RLock()
+        self._log = None
+        self._log_inode: Optional[int] = None  # log file that ``log_lines`` counts
+        self._lock_file = None
+        self.log_lines = 0
+        self.live_lines = 0  # lines kept by the last compaction (or replayed)
+        self.stats = {'added': 0, 'lookups': 0, 'replayed': 0, 'corrupt_lines': 0, 'compactions': 0}
+        if self.path is not None:
+            self._replay()
+
+    def __len__(self) -> int:
+        return sum(p.size for p in self.partitions.values())
+
+    def _partition(self, task_type: str) -> ExperiencePartition:
+        partition = self.partitions.get(task_type)
+        if partition is None:
+            partition = self.partitions[task_type] = ExperiencePartition(self.capacity, self.dim)
+        return partition
+
+    def add(self, record: Dict[str, Any], item: Any = None) -> None:
+        """Remember one experience (``item`` defaults to the record)"""
+        vector = context_features(record.get('context') or {}, self.dim)
+        with self._lock:
+            self._partition(record['task_type']).add(vector, record if item is None else item, record)
+            self.stats['added'] += 1
+            if self.path is not None:
+                self._append(record)
+
+    def search(self, task_type: str, context: Dict[str, Any], k: int = 10) -> List[Tuple[float, Any]]:
+        """
+        Nearest experiences of ``task_type`` to ``context``
+
+        Returns:
+            Up to ``k`` (cosine similarity, item) pairs, most similar first
+        """
+        vector = context_features(context, self.dim)
+        with self._lock:
+            self.stats['lookups'] += 1
+            partition = self.partitions.get(task_type)
+            if partition is None:
+                return []
+            slots, scores = partition.search(vector, k, self.nprobe)
+            return [(float(score), partition.items[slot]) for slot, score in zip(slots, scores)]
+
+    def items(self, task_type: Optional[str] = None) -> List[Any]:
+        """Stored items, oldest first (one task type or all of them)"""
+        with self._lock:
+            if task_type is None:
+                partitions = list(self.partitions.values())
+            else:
+                partitions = [self.partitions[task_type]] if task_type in self.partitions else []
+            return [p.items[slot] for p in partitions for slot in p.oldest_first()]
+
+    # -- persistence ---------------------------------------------------------
+
+    def _replay(self) -> None:
+        if not self.path.exists():
+            return
+        with open(self.path, 'r', encoding='utf-8') as f:
+            self._log_inode = os.fstat(f.fileno()).st_ino
+            for line in f:
+                self.log_lines += 1
+                try:
+                    record = json.loads(line)
+                    item = self.loader(record)
+                except Exception:
+                    self.stats['corrupt_lines'] += 1  # e.g. a write torn by a crash
+                    continue
+                vector = context_features(record.get('context') or {}, self.dim)
+                self._partition(record['task_type']).add(vector, item, record)
+                self.stats['replayed'] += 1
+        logger.info(f"[EXPERIENCE] Replayed {self.stats['replayed']} experiences from {self.path}")
+        self.live_lines = len(self)
+        self._maybe_compact()
+
+    @contextmanager
+    def _log_lock(self):
+        """Exclusive lock shared by every process writing this log"""
+        if fcntl is None:
+            yield
+            return
+        if self._lock_file is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._lock_file = open(f"{self.path}.lock", 'a')
+        fcntl.flock(self._lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(self._lock_file, fcntl.LOCK_UN)
+
+    def _open_log(self) -> None:
+        """Open the log for appending; reopen and recount it if another process replaced it"""
+        try:
+            inode = os.stat(self.path).st_ino
+        except FileNotFoundError:
+            inode = None
+        if self._log is not None and inode == self._log_inode:
+            return
+        if self._log is not None:
+            self._log.close()
+            self._log = None
+        if inode != self._log_inode:
+            self.log_lines = self.live_lines = self._count_lines()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._log = open(self.path, 'a', encoding='utf-8')
+        self._log_inode = os.fstat(self._log.fileno()).st_ino
+
+    def _count_lines(self) -> int:
+        try:
+            with open(self.path, 'rb') as f:
+                return sum(chunk.count(b'\n') for chunk in iter(lambda: f.read(1 << 20), b''))
+        except FileNotFoundError:
+            return 0
+
+    def _append(self, record: Dict[str, Any]) -> None:
+        line = json.dumps(record, default=str) + '\n'
+        with self._log_lock():
+            self._open_log()
+            self._log.write(line)
+            self._log.flush()
+            self.log_lines += 1
+            if self._should_compact():
+                self._compact_locked()
+
+    def _should_compact(self) -> bool:
+        return (self.log_lines >= COMPACT_MIN_LINES
+                and self.log_lines > self.compact_ratio * max(self.live_lines, len(self), 1))
+
+    def _maybe_compact(self) -> None:
+        if self._should_compact():
+            with self._log_lock():
+                self._open_log()  # another process may have compacted it meanwhile
+                if self._should_compact():
+                    self._compact_locked()
+
+    def compact(self) -> None:
+        """Rewrite the log with the newest ``capacity`` records per task type (atomic replace)"""
+        if self.path is None:
+            return
+        with self._lock, self._log_lock():
+            self._compact_locked()
+
+    def _compact_locked(self) -> None:
+        # From the file, not this process's partitions: records appended by
+        # other processes sharing the log must survive
+        kept: Dict[str, deque] = {}
+        if self.path.exists():
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                        task_type = record['task_type']
+                    except (ValueError, TypeError, KeyError):
+                        continue  # torn or foreign line
+                    if task_type not in kept:
+                        kept[task_type] = deque(maxlen=self.capacity)
+                    kept[task_type].append(line if line.endswith('\n') else line + '\n')
+        tmp = self.path.with_suffix(self.path.suffix + '.tmp')
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        lines = 0
+        with open(tmp, 'w', encoding='utf-8') as f:
+            for records in kept.values():
+                f.writelines(records)
+                lines += len(records)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.path)
+        logger.info(f"[EXPERIENCE] Compacted {self.path.name}: {self.log_lines} -> {lines} lines")
+        if self._log is not None:
+            self._log.close()
+            self._log = None
+        self._log_inode = os.stat(self.path).st_ino
+        self.log_lines = self.live_lines = lines
+        self.stats['compactions'] += 1
+
+    def close(self) -> None:
+        with self._lock:
+            if self._log is not None:
+                self._log.close()
+                self._log = None
+            if self._lock_file is not None:
+                self._lock_file.close()
+                self._lock_file = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                **self.stats,
+                'experiences': len(self),
+                'log_lines': self.log_lines,
+                'partitions': {task_type: {'size': p.size, 'indexed': p.centroids is not None}
+                               for task_type, p in self.partitions.items()}
+            }
+
+
+def experience_store_for(agent_id: str, loader: Optional[Callable[[Dict[str, Any]], Any]] = None) -> ExperienceStore:
+    """Experience store of one agent, configured from the environment"""
+    directory = os.getenv('AGENT_EXPERIENCE_DIR', 'data/agent_experience')
+    path = os.path.join(directory, f"{agent_id}.jsonl") if directory else None
+    return ExperienceStore(path=path, loader=loader,
+                           capacity=int(os.getenv('AGENT_EXPERIENCE_CAPACITY', str(DEFAULT_CAPACITY))))
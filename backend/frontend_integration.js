@@ -240,18 +240,28 @@ async function generate3DModel(jobId, format = 'stl', dimensions = null, quality
 }
 
 // Poll job status (fallback when WebSocket is not available)
-async function pollJobStatus(jobId, interval = 2000) {
+// Long-polls: the server holds each request until the job changes (or `wait` seconds pass)
+async function pollJobStatus(jobId, interval = 2000, wait = 25) {
+    let version = null;
     const poll = async () => {
         try {
-            const response = await fetch(`${ORFEAS_CONFIG.API_BASE_URL}/job-status/${jobId}`);
+            const since = version === null ? '' : `&since=${version}`;
+            const response = await fetch(`${ORFEAS_CONFIG.API_BASE_URL}/job-status/${jobId}?wait=${wait}${since}`);
 
             if (response.ok) {
+                const previous = version;
+                version = response.headers.get('X-Job-Version');
                 const data = await response.json();
                 handleJobUpdate(data);
 
                 if (data.status === 'completed' || data.status === 'failed') {
                     return; // Stop polling
                 }
+
+                // A change: the server held the request until it happened, ask again straight away.
+                // No change (timeout, or a server that does not hold requests): wait before asking again.
+                setTimeout(poll, version !== previous ? 0 : interval);
+                return;
             }
 
             // Continue polling
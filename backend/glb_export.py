@@ -0,0 +1,536 @@
+"""
+ORFEAS GLB Export
+=================
+Binary glTF 2.0 (GLB) writer for the Babylon.js viewer.
+
+- Interleaved float32 POSITION / NORMAL / TEXCOORD_0 with uint16/uint32
+  indices, so the browser hands the buffers straight to the GPU instead
+  of parsing nested JSON arrays
+- Optional ``KHR_mesh_quantization``: int16 positions (dequantized by the
+  node transform), int8 normals and uint16 UVs - 16 bytes per vertex
+  instead of 32
+- Optional ``EXT_meshopt_compression``: vertex streams use the meshopt
+  attribute codec (byte deltas in 16-byte groups), indices use the index
+  sequence codec (zigzag deltas as varints); both encoders are vectorized
+- LOD chain through ``MSFT_lod``; levels are supplied by the caller
+  (see ``build_lod_chain``)
+- Normals computed by scatter-add over all faces at once
+"""
+
+import json
+import logging
+import struct
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+GLB_MAGIC = 0x46546C67  # 'glTF'
+GLB_VERSION = 2
+CHUNK_JSON = 0x4E4F534A
+CHUNK_BIN = 0x004E4942
+
+# glTF constants
+FLOAT = 5126
+BYTE = 5120
+UNSIGNED_SHORT = 5123
+SHORT = 5122
+UNSIGNED_INT = 5125
+ARRAY_BUFFER = 34962
+ELEMENT_ARRAY_BUFFER = 34963
+TRIANGLES = 4
+
+# meshopt codec constants (EXT_meshopt_compression, bitstream version 0)
+MESHOPT_VERTEX_HEADER = 0xA0
+MESHOPT_INDEX_SEQUENCE_HEADER = 0xD1
+MESHOPT_BYTE_GROUP = 16
+MESHOPT_VERTEX_BLOCK_BYTES = 8192
+MESHOPT_VERTEX_BLOCK_MAX = 256
+MESHOPT_TAIL_MIN = 32
+
+DEFAULT_LOD_RATIOS = (0.5, 0.25)
+DEFAULT_SCREEN_COVERAGE = (0.5, 0.2, 0.05)
+
+MeshArrays = Tuple[np.ndarray, np.ndarray]
+Simplifier = Callable[[np.ndarray, np.ndarray, int], MeshArrays]
+
+
+# ---------------------------------------------------------------------------
+# Vertex attributes
+# ---------------------------------------------------------------------------
+
+def _face_normals(vertices: np.ndarray, faces: np.ndarray) -> np.ndarray:
+    v0 = vertices[faces[:, 0]]
+    return np.cross(vertices[faces[:, 1]] - v0, vertices[faces[:, 2]] - v0)
+
+
+def _normalize_rows(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1
+    return vectors / norms
+
+
+def compute_vertex_normals(vertices: np.ndarray, faces: np.ndarray) -> np.ndarray:
+    """
+    Area-weighted smooth vertex normals
+
+    Every face normal is scatter-added to its three corners in one
+    ``bincount`` per axis, so the cost is a handful of array passes
+    regardless of the face count.
+    """
+    vertices = np.asarray(vertices, dtype=np.float64)
+    faces = np.asarray(faces, dtype=np.int64)
+    face_normals = _face_normals(vertices, faces)
+    corners = faces.ravel()
+    weights = np.repeat(face_normals, 3, axis=0)
+    normals = np.empty_like(vertices)
+    for axis in range(3):
+        normals[:, axis] = np.bincount(corners, weights=weights[:, axis], minlength=len(vertices))
+    return _normalize_rows(normals)
+
+
+def compute_flat_normals(vertices: np.ndarray, faces: np.ndarray) -> np.ndarray:
+    """Per-corner face normals (``3 * len(faces)`` rows, flat shading)"""
+    vertices = np.asarray(vertices, dtype=np.float64)
+    faces = np.asarray(faces, dtype=np.int64)
+    return np.repeat(_normalize_rows(_face_normals(vertices, faces)), 3, axis=0)
+
+
+def planar_uvs(vertices: np.ndarray) -> np.ndarray:
+    """Planar X/Z projection of the vertices into ``[0, 1]``"""
+    vertices = np.asarray(vertices, dtype=np.float64)
+    min_coords = vertices.min(axis=0)
+    ranges = vertices.max(axis=0) - min_coords
+    ranges[ranges == 0] = 1.0
+    return (vertices[:, [0, 2]] - min_coords[[0, 2]]) / ranges[[0, 2]]
+
+
+# ---------------------------------------------------------------------------
+# meshopt codecs
+# ---------------------------------------------------------------------------
+
+def _encode_byte_groups(groups: np.ndarray) -> bytes:
+    """
+    Encode ``(segments, groups_per_segment, 16)`` zigzagged deltas
+
+    Each segment is one byte column of one vertex block: a header with a
+    2-bit mode per group, then the groups (0 = all zero, 1 = 2-bit,
+    2 = 4-bit with sentinel escapes, 3 = raw).
+    """
+    segments, per_segment, _ = groups.shape
+    flat = groups.reshape(-1, MESHOPT_BYTE_GROUP)
+
+    over2 = flat >= 3
+    over4 = flat >= 15
+    sizes = np.stack([
+        np.where(flat.any(axis=1), 1 << 30, 0),
+        4 + over2.sum(axis=1),
+        8 + over4.sum(axis=1),
+        np.full(len(flat), MESHOPT_BYTE_GROUP),
+    ], axis=1)
+    modes = sizes.argmin(axis=1)
+    group_sizes = sizes[np.arange(len(flat)), modes]
+
+    header_size = (per_segment + 3) // 4
+    padded_modes = np.zeros((segments, header_size * 4), dtype=np.uint8)
+    padded_modes[:, :per_segment] = modes.reshape(segments, per_segment)
+    padded_modes = padded_modes.reshape(segments, header_size, 4)
+    headers = (padded_modes[..., 0] | (padded_modes[..., 1] << 2)
+               | (padded_modes[..., 2] << 4) | (padded_modes[..., 3] << 6))
+
+    # Output offsets: each segment is [header][group 0][group 1]...
+    segment_sizes = header_size + group_sizes.reshape(segments, per_segment).sum(axis=1)
+    segment_starts = np.concatenate(([0], np.cumsum(segment_sizes)[:-1]))
+    within = np.cumsum(group_sizes.reshape(segments, per_segment), axis=1) - group_sizes.reshape(segments, per_segment)
+    group_starts = (segment_starts[:, None] + header_size + within).ravel()
+
+    out = np.zeros(int(segment_sizes.sum()), dtype=np.uint8)
+    out[segment_starts[:, None] + np.arange(header_size)] = headers
+
+    raw = modes == 3
+    if raw.any():
+        out[group_starts[raw][:, None] + np.arange(MESHOPT_BYTE_GROUP)] = flat[raw]
+
+    for mode, bits, packed_size, over in ((1, 2, 4, over2), (2, 4, 8, over4)):
+        selected = modes == mode
+        if not selected.any():
+            continue
+        values = flat[selected]
+        escaped = over[selected]
+        sentinel = (1 << bits) - 1
+        codes = np.where(escaped, sentinel, values).reshape(len(values), packed_size, 8 // bits)
+        shifts = (np.arange(8 // bits)[::-1] * bits).astype(np.uint8)
+        packed = np.bitwise_or.reduce(codes << shifts, axis=2).astype(np.uint8)
+        starts = group_starts[selected]
+        out[starts[:, None] + np.arange(packed_size)] = packed
+        rank = np.cumsum(escaped, axis=1) - 1
+        positions = starts[:, None] + packed_size + rank
+        out[positions[escaped]] = values[escaped]
+
+    return out.tobytes()
+
+
+def meshopt_encode_vertex_buffer(vertex_bytes: np.ndarray) -> bytes:
+    """
+    Encode an interleaved vertex buffer with the meshopt attribute codec
+
+    Args:
+        vertex_bytes: ``(vertex_count, stride)`` uint8 view; stride must be
+            a multiple of 4 and at most 256
+
+    Returns:
+        Bitstream for an ``EXT_meshopt_compression`` ATTRIBUTES bufferView
+    """
+    data = np.ascontiguousarray(vertex_bytes, dtype=np.uint8)
+    count, stride = data.shape
+    if stride % 4 or stride > 256:
+        raise ValueError(f"vertex stride must be a multiple of 4 and <= 256, got {stride}")
+
+    block = min(MESHOPT_VERTEX_BLOCK_BYTES // stride & ~(MESHOPT_BYTE_GROUP - 1), MESHOPT_VERTEX_BLOCK_MAX)
+    previous = np.concatenate((data[:1], data[:-1])) if count else data
+    delta = data - previous
+    zigzag = ((delta.view(np.int8) >> 7).view(np.uint8) ^ (delta << 1)).astype(np.uint8)
+
+    parts = [bytes((MESHOPT_VERTEX_HEADER,))]
+    full_blocks = count // block
+    if full_blocks:
+        groups = (zigzag[:full_blocks * block]
+                  .reshape(full_blocks, block, stride)
+                  .transpose(0, 2, 1)
+                  .reshape(full_blocks * stride, block // MESHOPT_BYTE_GROUP, MESHOPT_BYTE_GROUP))
+        parts.append(_encode_byte_groups(groups))
+    remainder = count - full_blocks * block
+    if remainder:
+        padded = -(-remainder // MESHOPT_BYTE_GROUP) * MESHOPT_BYTE_GROUP
+        tail = np.zeros((padded, stride), dtype=np.uint8)
+        tail[:remainder] = zigzag[full_blocks * block:]
+        parts.append(_encode_byte_groups(
+            tail.T.reshape(stride, padded // MESHOPT_BYTE_GROUP, MESHOPT_BYTE_GROUP)))
+
+    parts.append(bytes(max(0, MESHOPT_TAIL_MIN - stride)))
+    parts.append(data[0].tobytes() if count else bytes(stride))
+    return b''.join(parts)
+
+
+def _varints(values: np.ndarray) -> bytes:
+    """LEB128-encode uint64 values"""
+    values = values.astype(np.uint64)
+    lengths = np.ones(len(values), dtype=np.int64)
+    for shift in (7, 14, 21, 28):
+        lengths += values >= (np.uint64(1) << np.uint64(shift))
+    starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+    out = np.zeros(int(lengths.sum()), dtype=np.uint8)
+    for position in range(int(lengths.max()) if len(values) else 0):
+        present = lengths > position
+        chunk = (values[present] >> np.uint64(7 * position)) & np.uint64(0x7F)
+        more = (lengths[present] > position + 1).astype(np.uint64) << np.uint64(7)
+        out[starts[present] + position] = (chunk | more).astype(np.uint8)
+    return out.tobytes()
+
+
+def meshopt_encode_index_sequence(indices: np.ndarray) -> bytes:
+    """
+    Encode indices with the meshopt index sequence codec
+
+    Every index is coded as a zigzag delta from the previous one against
+    baseline 0, which keeps the encoder a pure array computation.
+
+    Returns:
+        Bitstream for an ``EXT_meshopt_compression`` INDICES bufferView
+    """
+    indices = np.asarray(indices, dtype=np.int64).ravel()
+    delta = np.diff(indices, prepend=0).astype(np.int64)
+    zigzag = ((delta << 1) ^ (delta >> 63)).astype(np.uint64) & np.uint64(0xFFFFFFFF)
+    codes = (zigzag << np.uint64(1)) & np.uint64(0xFFFFFFFF)  # low bit selects baseline 0
+    return bytes((MESHOPT_INDEX_SEQUENCE_HEADER,)) + _varints(codes) + bytes(4)
+
+
+# ---------------------------------------------------------------------------
+# LOD chain
+# ---------------------------------------------------------------------------
+
+def build_lod_chain(vertices: np.ndarray, faces: np.ndarray, simplifier: Simplifier,
+                    ratios: Sequence[float] = DEFAULT_LOD_RATIOS,
+                    min_faces: int = 64) -> List[MeshArrays]:
+    """
+    Produce progressively simplified levels of a mesh
+
+    Args:
+        vertices: Full-detail vertices (Nx3)
+        faces: Full-detail faces (Mx3)
+        simplifier: ``(vertices, faces, target_faces) -> (vertices, faces)``
+        ratios: Face-count fraction of the full mesh for each level
+        min_faces: Stop before levels smaller than this
+
+    Returns:
+        Lower levels only, most detailed first; levels the simplifier
+        could not reduce are dropped
+    """
+    levels: List[MeshArrays] = []
+    previous_faces = len(faces)
+    for ratio in ratios:
+        target = int(len(faces) * ratio)
+        if target < min_faces:
+            break
+        try:
+            lod_vertices, lod_faces = simplifier(vertices, faces, target)
+        except Exception as e:
+            logger.warning(f"[GLB] LOD simplification to {target} faces failed: {e}")
+            break
+        if len(lod_faces) == 0 or len(lod_faces) >= previous_faces:
+            continue
+        levels.append((np.asarray(lod_vertices), np.asarray(lod_faces)))
+        previous_faces = len(lod_faces)
+    return levels
+
+
+# ---------------------------------------------------------------------------
+# GLB writer
+# ---------------------------------------------------------------------------
+
+def _pad4(data: bytes, fill: bytes = b'\x00') -> bytes:
+    return data + fill * (-len(data) % 4)
+
+
+def _vertex_layout(quantize: bool) -> List[Tuple[str, str, int, int, bool]]:
+    """(attribute, numpy dtype, gltf component type, byte offset, normalized)"""
+    if quantize:
+        return [('POSITION', '<i2', SHORT, 0, True),
+                ('NORMAL', '<i1', BYTE, 8, True),
+                ('TEXCOORD_0', '<u2', UNSIGNED_SHORT, 12, True)]
+    return [('POSITION', '<f4', FLOAT, 0, False),
+            ('NORMAL', '<f4', FLOAT, 12, False),
+            ('TEXCOORD_0', '<f4', FLOAT, 24, False)]
+
+
+def _interleave(positions: np.ndarray, normals: np.ndarray, uvs: np.ndarray,
+                quantize: bool) -> np.ndarray:
+    stride = 16 if quantize else 32
+    fields = {}
+    for (name, dtype, _, offset, _), values in zip(_vertex_layout(quantize), (positions, normals, uvs)):
+        fields[name] = (dtype, values.shape[1:] or (1,), offset)
+    structured = np.dtype({
+        'names': list(fields),
+        'formats': [(np.dtype(dtype), shape) for dtype, shape, _ in fields.values()],
+        'offsets': [offset for _, _, offset in fields.values()],
+        'itemsize': stride,
+    })
+    interleaved = np.zeros(len(positions), dtype=structured)
+    interleaved['POSITION'] = positions
+    interleaved['NORMAL'] = normals
+    interleaved['TEXCOORD_0'] = uvs
+    return interleaved.view(np.uint8).reshape(len(positions), stride)
+
+
+def _quantization_frame(levels: Sequence[MeshArrays]) -> Tuple[np.ndarray, float]:
+    """Shared center and uniform half-extent, so normals stay undistorted"""
+    mins = np.min([np.asarray(v).min(axis=0) for v, _ in levels], axis=0)
+    maxs = np.max([np.asarray(v).max(axis=0) for v, _ in levels], axis=0)
+    center = (mins + maxs) / 2
+    half = float(np.max(maxs - mins) / 2) or 1.0
+    return center, half
+
+
+def export_glb(vertices: np.ndarray, faces: np.ndarray, *,
+               smooth_normals: bool = True,
+               quantize: bool = False,
+               compress: bool = False,
+               lods: Optional[Sequence[MeshArrays]] = None,
+               material: Optional[Dict[str, Any]] = None,
+               screen_coverage: Sequence[float] = DEFAULT_SCREEN_COVERAGE,
+               name: str = 'orfeas_model') -> bytes:
+    """
+    Write a mesh (and optional LOD levels) as a GLB file
+
+    Args:
+        vertices: Mesh vertices (Nx3)
+        faces: Mesh faces (Mx3 indices)
+        smooth_normals: Shared smooth normals, otherwise flat shading
+            (vertices are split per corner)
+        quantize: Use ``KHR_mesh_quantization`` attribute types
+        compress: Use ``EXT_meshopt_compression`` for all buffer views
+        lods: Lower-detail ``(vertices, faces)`` levels, most detailed first
+        material: glTF material definition (defaults to plain PBR grey)
+        screen_coverage: ``MSFT_screencoverage`` thresholds per level
+        name: Mesh/node name prefix
+
+    Returns:
+        GLB file content
+    """
+    levels: List[MeshArrays] = [(np.asarray(vertices, dtype=np.float64), np.asarray(faces, dtype=np.int64))]
+    levels.extend((np.asarray(v, dtype=np.float64), np.asarray(f, dtype=np.int64)) for v, f in (lods or ()))
+    center, half = _quantization_frame(levels) if quantize else (None, 1.0)
+
+    gltf: Dict[str, Any] = {
+        'asset': {'version': '2.0', 'generator': 'ORFEAS glb_export'},
+        'scene': 0,
+        'scenes': [{'nodes': [0]}],
+        'nodes': [],
+        'meshes': [],
+        'accessors': [],
+        'bufferViews': [],
+        'materials': [material or {
+            'name': 'GeneratedMaterial',
+            'pbrMetallicRoughness': {
+                'baseColorFactor': [0.8, 0.8, 0.8, 1.0],
+                'metallicFactor': 0.0,
+                'roughnessFactor': 0.5,
+            },
+        }],
+        'buffers': [],
+    }
+    extensions = set()
+    binary = bytearray()
+
+    fallback_size = 0
+
+    def add_view(raw: bytes, stride: Optional[int], target: int, count: int,
+                 index_dtype: Optional[str] = None) -> int:
+        nonlocal fallback_size
+        view: Dict[str, Any] = {'buffer': 0, 'target': target}
+        if stride:
+            view['byteStride'] = stride
+        if compress:
+            if index_dtype is None:
+                encoded = meshopt_encode_vertex_buffer(np.frombuffer(raw, dtype=np.uint8).reshape(count, stride))
+                mode, element_size = 'ATTRIBUTES', stride
+            else:
+                encoded = meshopt_encode_index_sequence(np.frombuffer(raw, dtype=index_dtype))
+                mode, element_size = 'INDICES', np.dtype(index_dtype).itemsize
+            view.update(buffer=1, byteOffset=fallback_size, byteLength=len(raw))
+            view['extensions'] = {'EXT_meshopt_compression': {
+                'buffer': 0, 'byteOffset': len(binary), 'byteLength': len(encoded),
+                'byteStride': element_size, 'count': count, 'mode': mode,
+            }}
+            fallback_size += len(raw) + (-len(raw) % 4)
+            binary.extend(_pad4(encoded))
+        else:
+            view['byteOffset'] = len(binary)
+            view['byteLength'] = len(raw)
+            binary.extend(_pad4(raw))
+        gltf['bufferViews'].append(view)
+        return len(gltf['bufferViews']) - 1
+
+    for level, (level_vertices, level_faces) in enumerate(levels):
+        if smooth_normals:
+            positions = level_vertices
+            normals = compute_vertex_normals(level_vertices, level_faces)
+            indices = level_faces.ravel()
+        else:
+            positions = level_vertices[level_faces.ravel()]
+            normals = compute_flat_normals(level_vertices, level_faces)
+            indices = np.arange(len(positions))
+        uvs = planar_uvs(positions)
+
+        if quantize:
+            q_positions = np.clip(np.rint((positions - center) / half * 32767), -32767, 32767)
+            q_normals = np.clip(np.rint(normals * 127), -127, 127)
+            q_uvs = np.clip(np.rint(uvs * 65535), 0, 65535)
+            vertex_bytes = _interleave(q_positions, q_normals, q_uvs, True)
+            bounds = (q_positions.min(axis=0), q_positions.max(axis=0))
+        else:
+            vertex_bytes = _interleave(positions, normals, uvs, False)
+            stored = positions.astype(np.float32)
+            bounds = (stored.min(axis=0), stored.max(axis=0))
+        stride = vertex_bytes.shape[1]
+
+        index_dtype = '<u2' if len(positions) < 0xFFFF else '<u4'
+        index_type = UNSIGNED_SHORT if index_dtype == '<u2' else UNSIGNED_INT
+
+        vertex_view = add_view(vertex_bytes.tobytes(), stride, ARRAY_BUFFER, len(positions))
+        index_view = add_view(indices.astype(index_dtype).tobytes(), None, ELEMENT_ARRAY_BUFFER,
+                              len(indices), index_dtype)
+
+        attributes = {}
+        for attribute, dtype, component_type, offset, normalized in _vertex_layout(quantize):
+            accessor = {
+                'bufferView': vertex_view,
+                'byteOffset': offset,
+                'componentType': component_type,
+                'count': len(positions),
+                'type': 'VEC2' if attribute == 'TEXCOORD_0' else 'VEC3',
+            }
+            if normalized:
+                accessor['normalized'] = True
+            if attribute == 'POSITION':
+                accessor['min'] = [float(x) for x in bounds[0]]
+                accessor['max'] = [float(x) for x in bounds[1]]
+            gltf['accessors'].append(accessor)
+            attributes[attribute] = len(gltf['accessors']) - 1
+
+        gltf['accessors'].append({
+            'bufferView': index_view,
+            'componentType': index_type,
+            'count': len(indices),
+            'type': 'SCALAR',
+        })
+        gltf['meshes'].append({
+            'name': f"{name}_lod{level}",
+            'primitives': [{
+                'attributes': attributes,
+                'indices': len(gltf['accessors']) - 1,
+                'material': 0,
+                'mode': TRIANGLES,
+            }],
+        })
+        node: Dict[str, Any] = {'name': f"{name}_lod{level}", 'mesh': level}
+        if quantize:
+            node['translation'] = [float(x) for x in center]
+            node['scale'] = [half / 32767] * 3
+        gltf['nodes'].append(node)
+
+    if len(levels) > 1:
+        gltf['nodes'][0]['extensions'] = {'MSFT_lod': {'ids': list(range(1, len(levels)))}}
+        gltf['nodes'][0]['extras'] = {'MSFT_screencoverage': list(screen_coverage[:len(levels)])}
+        extensions.add('MSFT_lod')
+
+    gltf['buffers'].append({'byteLength': len(binary)})
+    required = []
+    if quantize:
+        required.append('KHR_mesh_quantization')
+    if compress:
+        gltf['buffers'].append({
+            'byteLength': fallback_size,
+            'extensions': {'EXT_meshopt_compression': {'fallback': True}},
+        })
+        required.append('EXT_meshopt_compression')
+    if required:
+        gltf['extensionsRequired'] = required
+    if extensions or required:
+        gltf['extensionsUsed'] = sorted(extensions.union(required))
+
+    json_chunk = _pad4(json.dumps(gltf, separators=(',', ':')).encode('utf-8'), b' ')
+    bin_chunk = bytes(binary)
+    total = 12 + 8 + len(json_chunk) + 8 + len(bin_chunk)
+    return b''.join((
+        struct.pack('<III', GLB_MAGIC, GLB_VERSION, total),
+        struct.pack('<II', len(json_chunk), CHUNK_JSON), json_chunk,
+        struct.pack('<II', len(bin_chunk), CHUNK_BIN), bin_chunk,
+    ))
+
+
+def parse_glb(data: bytes) -> Tuple[Dict[str, Any], bytes]:
+    """
+    Split a GLB file into its JSON document and binary chunk
+
+    Raises:
+        ValueError: If the header or chunk layout is invalid
+    """
+    if len(data) < 20:
+        raise ValueError("GLB too short")
+    magic, version, length = struct.unpack_from('<III', data, 0)
+    if magic != GLB_MAGIC or version != GLB_VERSION or length != len(data):
+        raise ValueError("invalid GLB header")
+    json_length, json_type = struct.unpack_from('<II', data, 12)
+    if json_type != CHUNK_JSON:
+        raise ValueError("first GLB chunk is not JSON")
+    document = json.loads(data[20:20 + json_length])
+    offset = 20 + json_length
+    binary = b''
+    if offset < len(data):
+        bin_length, bin_type = struct.unpack_from('<II', data, offset)
+        if bin_type != CHUNK_BIN:
+            raise ValueError("second GLB chunk is not BIN")
+        binary = data[offset + 8:offset + 8 + bin_length]
+    return document, binary
@@ -212,6 +212,10 @@ class Hunyuan3DProcessor:
             # Safe fallback image
             return Image.new("RGBA", (512, 512))
 
+    def remove_background_array(self, image: np.ndarray) -> np.ndarray:  # type: ignore[name-defined]
+        """Array-in/array-out ``remove_background`` (used by the model host over shared memory)"""
+        return np.asarray(self.remove_background(Image.fromarray(image)))
+
     def text_to_image_generation(self, prompt: str, **kwargs: Any) -> bool:
         if not self.model_loaded or not self.has_text2image:
             logger.error("Hunyuan text-to-image model not available")
@@ -276,6 +280,22 @@ class Hunyuan3DProcessor:
             logger.error(f"[ORFEAS] ❌ Emergency load failed: {e}")
             return False
 
+    def prepare_image(self, image: Image.Image) -> Image.Image:  # type: ignore[name-defined]
+        """RGB conversion, background removal and RGBA conversion ahead of the shape pipeline"""
+        # Convert to RGB first (required by rembg and Hunyuan3D)
+        if image.mode != 'RGB':
+            image = image.convert("RGB")
+
+        # Remove background if needed (BEFORE other conversions)
+        if self.rembg is not None:
+            logger.info("[ORFEAS] Removing background...")
+            image = self.rembg(image)
+
+        # Convert to RGBA for Hunyuan3D pipeline (ensures proper alpha channel handling)
+        if image.mode != 'RGBA':
+            image = image.convert("RGBA")
+        return image
+
     def image_to_3d_generation(self, image_path: Path, output_path: Path, **kwargs: Any):
         """Generate true volumetric 3D model from image using Hunyuan3D AI."""
         # Check if model is loaded; if not, this is a critical error
@@ -288,26 +308,13 @@ class Hunyuan3DProcessor:
             return False
 
         try:
-            from PIL import Image
-
-            # Load and prepare image
-            logger.info(f"[ORFEAS] Loading image: {image_path}")
-            image = Image.open(image_path)
-
-            # Convert to RGB first (required by rembg and Hunyuan3D)
-            if image.mode != 'RGB':
-                image = image.convert("RGB")
-                logger.info("[ORFEAS] Converted image to RGB mode")
-
-            # Remove background if needed (BEFORE other conversions)
-            if self.rembg is not None:
-                logger.info("[ORFEAS] Removing background...")
-                image = self.rembg(image)
-
-            # Convert to RGBA for Hunyuan3D pipeline (ensures proper alpha channel handling)
-            if image.mode != 'RGBA':
-                image = image.convert("RGBA")
-                logger.info("[ORFEAS] Converted image to RGBA mode for generation")
+            # Background removal may already have run speculatively after upload
+            image = kwargs.pop("prepared_image", None)
+            if image is None:
+                logger.info(f"[ORFEAS] Loading image: {image_path}")
+                image = self.prepare_image(Image.open(image_path))
+            else:
+                logger.info("[ORFEAS] Using prefetched foreground image")
 
             # Generate volumetric 3D mesh using Hunyuan3D AI
             logger.info("[ORFEAS] Generating volumetric 3D mesh with Hunyuan3D...")
@@ -673,8 +680,36 @@ def get_3d_processor(device: Union[str, None] = None):
 
     Returns Hunyuan3D processor with lazy loading enabled.
     Model will load on first request to avoid startup crashes.
+    With MODEL_RESIDENCY=host, returns a proxy to the shared model host instead.
     """
+    from model_residency import RESIDENCY_HOST, RemoteProcessor, residency_mode
+    if residency_mode() == RESIDENCY_HOST:
+        logger.info("[ORFEAS] Hunyuan3D processor served by the shared model host")
+        return RemoteProcessor(device=device)
     processor = Hunyuan3DProcessor(device)
     logger.info("[ORFEAS] Hunyuan3D processor created - lazy loading enabled for first request")
     return processor
 
+
+def create_resident_processor() -> Hunyuan3DProcessor:
+    """Model-host loader: build and fully load the processor once for the machine"""
+    processor = Hunyuan3DProcessor(os.getenv("MODEL_HOST_DEVICE") or None)
+    if not processor.load_model_background_safe():
+        raise RuntimeError("Hunyuan3D model failed to load in the model host")
+    return processor
+
+
+def preload_shared_processor() -> bool:
+    """
+    Fill the class-level model cache before gunicorn forks its workers
+
+    Forked workers then pick the pipeline up from ``_model_cache`` and share
+    its pages copy-on-write. CPU only: a CUDA context does not survive fork.
+    """
+    if TORCH_AVAILABLE and torch.cuda.is_available():  # type: ignore[attr-defined]
+        logger.warning("[ORFEAS] Shared residency preloads on CPU only; CUDA workers keep per-process models")
+        return False
+    processor = Hunyuan3DProcessor("cpu")
+    loaded = processor.load_model_background_safe()
+    logger.info(f"[ORFEAS] Preloaded Hunyuan3D for fork sharing: {loaded}")
+    return loaded
@@ -0,0 +1,966 @@
+"""
+ORFEAS Job Store
+================
+Persistent, shareable job state for the generation pipeline.
+
+Job state used to live in three in-process containers on the server
+(``job_progress``, ``processing_jobs`` and ``active_jobs``).  That state was
+lost on restart, grew until the next full cleanup scan and could not be seen
+by sibling gunicorn workers.  This module replaces them with a small store
+abstraction:
+
+- ``get(job_id)`` is a primary-key lookup (O(1) / O(log n))
+- ``list_by_status`` / ``count_by_status`` use a status index
+- ``update`` and ``transition`` are atomic read-modify-write operations
+- ``claim`` / ``release`` replace the ``active_jobs`` set (cross-process);
+  a claim is a lease, so a worker that dies mid-job does not hold it forever
+- ``compact`` deletes expired jobs via an expiry index, touching only
+  the expired rows
+- ``subscribe`` delivers change notifications; ``start_change_feed`` also
+  delivers changes written by *other* processes (for WebSocket fan-out)
+- ``version`` numbers every write from one store-wide sequence, so event
+  ids derived from it agree between workers
+
+Backends:
+- ``SQLiteJobStore``: embedded SQLite in WAL mode (default on a single host)
+- ``RedisJobStore``: used when ``REDIS_URL`` is set or ``JOB_STORE_BACKEND=redis``
+- ``InMemoryJobStore``: single-process store used in testing mode
+
+Environment:
+    JOB_STORE_BACKEND       sqlite | redis | memory (default: redis if REDIS_URL is set, else sqlite)
+    JOB_STORE_PATH          SQLite database path (default: data/jobs.db)
+    JOB_STORE_TTL_SECONDS   retention for finished jobs (default: 86400)
+    JOB_STORE_STALE_SECONDS retention for unfinished, inactive jobs (default: 172800)
+    REDIS_URL               Redis connection URL for the redis backend
+"""
+
+import heapq
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+try:
+    import redis
+    REDIS_AVAILABLE = True
+except ImportError:
+    redis = None
+    REDIS_AVAILABLE = False
+
+ChangeCallback = Callable[[str, Dict[str, Any]], None]
+VersionedChangeCallback = Callable[[str, Dict[str, Any], int, bool], None]
+
+DEFAULT_TTL_SECONDS = 24 * 3600
+DEFAULT_STALE_SECONDS = 48 * 3600
+DEFAULT_LEASE_SECONDS = 900.0
+
+TERMINAL_STATUSES = frozenset({
+    'completed', 'failed', 'error', 'cancelled',
+    'ultra_completed', 'ultra_failed',
+})
+
+
+def is_terminal_status(status: Optional[str]) -> bool:
+    """Return True if a job in ``status`` will not change any more"""
+    return bool(status) and (status in TERMINAL_STATUSES
+                             or status.endswith('_completed')
+                             or status.endswith('_failed'))
+
+
+def _encode(data: Dict[str, Any]) -> str:
+    return json.dumps(data, default=str, separators=(',', ':'))
+
+
+class JobStore(ABC):
+    """
+    Abstract job store.
+
+    Records are plain JSON-serializable dicts; the ``status`` key is indexed.
+    All methods are thread-safe and (for the persistent backends) safe to
+    call from several processes sharing the same database.
+    """
+
+    def __init__(self, ttl_seconds: float = DEFAULT_TTL_SECONDS,
+                 stale_seconds: float = DEFAULT_STALE_SECONDS):
+        self.ttl_seconds = float(ttl_seconds)
+        self.stale_seconds = float(stale_seconds)
+        self.origin = uuid.uuid4().hex
+        self._subscribers: List[Tuple[Callable[..., None], bool]] = []
+        self._subscribers_lock = threading.Lock()
+        self._feed_thread: Optional[threading.Thread] = None
+        self._feed_stop = threading.Event()
+        self.compact_interval_seconds = 300.0
+        self.lease_seconds = DEFAULT_LEASE_SECONDS
+        self._last_compact = time.time()
+
+    # -- core API -----------------------------------------------------------
+
+    @abstractmethod
+    def create(self, job_id: str, data: Dict[str, Any]) -> bool:
+        """
+        Insert a new job record
+
+        Returns:
+            False if a record with ``job_id`` already exists
+        """
+
+    @abstractmethod
+    def put(self, job_id: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Insert or replace a job record, returning the stored record"""
+
+    @abstractmethod
+    def update(self, job_id: str, fields: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Atomically merge ``fields`` into an existing record
+
+        Returns:
+            The merged record, or None if the job does not exist
+        """
+
+    @abstractmethod
+    def transition(self, job_id: str, to_status: str,
+                   from_statuses: Optional[Sequence[str]] = None,
+                   fields: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        """
+        Atomically move a job to ``to_status`` (compare-and-set)
+
+        Args:
+            job_id: Job identifier
+            to_status: New status
+            from_statuses: Allowed current statuses (None = any)
+            fields: Extra fields merged in the same step
+
+        Returns:
+            The merged record, or None if the job is missing or its current
+            status is not in ``from_statuses``
+        """
+
+    @abstractmethod
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Return a copy of the job record, or None"""
+
+    @abstractmethod
+    def delete(self, job_id: str) -> bool:
+        """Delete a job record"""
+
+    @abstractmethod
+    def version(self, job_id: str) -> int:
+        """
+        Version of the job's latest write (0 if the job does not exist)
+
+        Versions come from one store-wide sequence, so they only grow and
+        every process sharing the store sees the same number for a write.
+        """
+
+    @abstractmethod
+    def claim(self, job_id: str, lease_seconds: Optional[float] = None) -> bool:
+        """
+        Mark a job as actively processing (creating it if needed)
+
+        The claim is a lease: after ``lease_seconds`` (default
+        ``self.lease_seconds``) it counts as released, so a claim left
+        behind by a crashed worker does not pin the job.
+
+        Returns:
+            False if the job is already claimed by any worker
+        """
+
+    @abstractmethod
+    def release(self, job_id: str) -> None:
+        """Clear the active flag set by ``claim``"""
+
+    @abstractmethod
+    def is_active(self, job_id: str) -> bool:
+        """Return True if the job is currently claimed (lease not expired)"""
+
+    @abstractmethod
+    def active_count(self) -> int:
+        """Number of claimed jobs (unexpired leases) across all workers"""
+
+    @abstractmethod
+    def list_by_status(self, status: str, limit: int = 100) -> List[Dict[str, Any]]:
+        """Return up to ``limit`` records in ``status``, most recent first"""
+
+    @abstractmethod
+    def count_by_status(self) -> Dict[str, int]:
+        """Return ``{status: count}`` for all stored jobs"""
+
+    @abstractmethod
+    def compact(self, now: Optional[float] = None) -> int:
+        """
+        Delete expired jobs that are not claimed (or whose lease expired)
+
+        Returns:
+            Number of deleted jobs
+        """
+
+    def close(self) -> None:
+        """Stop the change feed and release backend resources"""
+        self.stop_change_feed()
+
+    # -- expiry policy ------------------------------------------------------
+
+    def _expires_at(self, status: Optional[str], now: float) -> float:
+        ttl = self.ttl_seconds if is_terminal_status(status) else self.stale_seconds
+        return now + ttl
+
+    def _lease_until(self, lease_seconds: Optional[float], now: float) -> float:
+        return now + (self.lease_seconds if lease_seconds is None else lease_seconds)
+
+    # -- change notifications -----------------------------------------------
+
+    def subscribe(self, callback: Callable[..., None], with_version: bool = False) -> None:
+        """
+        Register ``callback(job_id, record)`` for every change
+
+        With ``with_version`` the callback is a ``VersionedChangeCallback``,
+        called as ``callback(job_id, record, version, remote)`` where
+        ``remote`` is True for writes made by another process.
+        """
+        with self._subscribers_lock:
+            if all(registered is not callback for registered, _ in self._subscribers):
+                self._subscribers.append((callback, with_version))
+
+    def unsubscribe(self, callback: Callable[..., None]) -> None:
+        with self._subscribers_lock:
+            self._subscribers = [entry for entry in self._subscribers if entry[0] is not callback]
+
+    def _notify(self, job_id: str, data: Dict[str, Any], version: int, remote: bool = False) -> None:
+        with self._subscribers_lock:
+            subscribers = list(self._subscribers)
+        for callback, with_version in subscribers:
+            try:
+                if with_version:
+                    callback(job_id, data, version, remote)
+                else:
+                    callback(job_id, data)
+            except Exception as e:
+                logger.warning(f"[JOBS] Change subscriber failed for {job_id}: {e}")
+
+    def start_change_feed(self, interval_seconds: float = 0.5, deliver_remote: bool = True) -> bool:
+        """
+        Start delivering changes written by other processes to subscribers
+
+        Local writes are always delivered synchronously; the feed only adds
+        remote ones.  The feed thread also runs periodic TTL compaction.
+
+        Args:
+            interval_seconds: Poll interval
+            deliver_remote: False when another channel (e.g. a Socket.IO
+                message queue) already fans changes out; only compaction runs
+
+        Returns:
+            False if the backend has no feed thread
+        """
+        return False
+
+    def _maybe_compact(self) -> None:
+        """Run ``compact`` from the feed thread every ``compact_interval_seconds``"""
+        now = time.time()
+        if now - self._last_compact < self.compact_interval_seconds:
+            return
+        self._last_compact = now
+        try:
+            self.compact(now)
+        except Exception as e:
+            logger.warning(f"[JOBS] Compaction failed: {e}")
+
+    def stop_change_feed(self) -> None:
+        self._feed_stop.set()
+        thread = self._feed_thread
+        if thread is not None and thread.is_alive() and thread is not threading.current_thread():
+            thread.join(timeout=5.0)
+        self._feed_thread = None
+
+    def _start_feed_thread(self, target: Callable[[], None]) -> bool:
+        if self._feed_thread is not None and self._feed_thread.is_alive():
+            return True
+        self._feed_stop.clear()
+        self._feed_thread = threading.Thread(target=target, name="JobStoreChangeFeed", daemon=True)
+        self._feed_thread.start()
+        return True
+
+    # -- stats --------------------------------------------------------------
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'backend': type(self).__name__,
+            'active_jobs': self.active_count(),
+            'jobs_by_status': self.count_by_status(),
+            'ttl_seconds': self.ttl_seconds,
+            'stale_seconds': self.stale_seconds,
+        }
+
+
+class InMemoryJobStore(JobStore):
+    """
+    Process-local job store.
+
+    Uses a dict for records, a status index of sets and a lazy min-heap of
+    expiry times so ``compact`` only visits expired entries.
+    """
+
+    def __init__(self, ttl_seconds: float = DEFAULT_TTL_SECONDS,
+                 stale_seconds: float = DEFAULT_STALE_SECONDS):
+        super().__init__(ttl_seconds, stale_seconds)
+        self._lock = threading.Lock()
+        self._jobs: Dict[str, Dict[str, Any]] = {}
+        self._expires: Dict[str, float] = {}
+        self._by_status: Dict[str, set] = {}
+        self._active: Dict[str, float] = {}  # job_id -> lease expiry
+        self._expiry_heap: List[Tuple[float, str]] = []
+        self._versions: Dict[str, int] = {}
+        self._seq = 0
+
+    def _store(self, job_id: str, data: Dict[str, Any], now: float) -> Tuple[Dict[str, Any], int]:
+        old = self._jobs.get(job_id)
+        if old is not None:
+            self._unindex_status(job_id, old.get('status'))
+        status = data.get('status')
+        self._jobs[job_id] = data
+        self._seq += 1
+        self._versions[job_id] = self._seq
+        self._by_status.setdefault(status, set()).add(job_id)
+        expires_at = self._expires_at(status, now)
+        self._expires[job_id] = expires_at
+        heapq.heappush(self._expiry_heap, (expires_at, job_id))
+        return dict(data), self._seq
+
+    def _unindex_status(self, job_id: str, status: Optional[str]) -> None:
+        members = self._by_status.get(status)
+        if members is not None:
+            members.discard(job_id)
+            if not members:
+                del self._by_status[status]
+
+    def create(self, job_id: str, data: Dict[str, Any]) -> bool:
+        with self._lock:
+            if job_id in self._jobs:
+                return False
+            record, version = self._store(job_id, dict(data), time.time())
+        self._notify(job_id, record, version)
+        return True
+
+    def put(self, job_id: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        with self._lock:
+            record, version = self._store(job_id, dict(data), time.time())
+        self._notify(job_id, record, version)
+        return record
+
+    def update(self, job_id: str, fields: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            current = self._jobs.get(job_id)
+            if current is None:
+                return None
+            record, version = self._store(job_id, {**current, **fields}, time.time())
+        self._notify(job_id, record, version)
+        return record
+
+    def transition(self, job_id: str, to_status: str,
+                   from_statuses: Optional[Sequence[str]] = None,
+                   fields: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            current = self._jobs.get(job_id)
+            if current is None:
+                return None
+            if from_statuses is not None and current.get('status') not in from_statuses:
+                return None
+            record, version = self._store(job_id, {**current, **(fields or {}), 'status': to_status}, time.time())
+        self._notify(job_id, record, version)
+        return record
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            record = self._jobs.get(job_id)
+            return dict(record) if record is not None else None
+
+    def delete(self, job_id: str) -> bool:
+        with self._lock:
+            return self._delete_locked(job_id)
+
+    def _delete_locked(self, job_id: str) -> bool:
+        record = self._jobs.pop(job_id, None)
+        if record is None:
+            return False
+        self._unindex_status(job_id, record.get('status'))
+        self._expires.pop(job_id, None)
+        self._versions.pop(job_id, None)
+        self._active.pop(job_id, None)
+        return True
+
+    def version(self, job_id: str) -> int:
+        with self._lock:
+            return self._versions.get(job_id, 0)
+
+    def claim(self, job_id: str, lease_seconds: Optional[float] = None) -> bool:
+        now = time.time()
+        with self._lock:
+            if self._active.get(job_id, 0.0) > now:
+                return False
+            self._active[job_id] = self._lease_until(lease_seconds, now)
+            if job_id not in self._jobs:
+                self._store(job_id, {'job_id': job_id, 'status': 'queued'}, now)
+            return True
+
+    def release(self, job_id: str) -> None:
+        with self._lock:
+            self._active.pop(job_id, None)
+
+    def is_active(self, job_id: str) -> bool:
+        with self._lock:
+            return self._active.get(job_id, 0.0) > time.time()
+
+    def active_count(self) -> int:
+        now = time.time()
+        with self._lock:
+            for job_id in [job_id for job_id, until in self._active.items() if until <= now]:
+                del self._active[job_id]
+            return len(self._active)
+
+    def list_by_status(self, status: str, limit: int = 100) -> List[Dict[str, Any]]:
+        with self._lock:
+            ids = self._by_status.get(status, ())
+            records = [dict(self._jobs[job_id]) for job_id in ids]
+        records.sort(key=lambda r: self._expires.get(r.get('job_id'), 0.0), reverse=True)
+        return records[:limit]
+
+    def count_by_status(self) -> Dict[str, int]:
+        with self._lock:
+            return {status: len(ids) for status, ids in self._by_status.items()}
+
+    def compact(self, now: Optional[float] = None) -> int:
+        now = time.time() if now is None else now
+        removed = 0
+        with self._lock:
+            heap = self._expiry_heap
+            deferred = []
+            while heap and heap[0][0] <= now:
+                expires_at, job_id = heapq.heappop(heap)
+                if self._expires.get(job_id) != expires_at:
+                    continue  # superseded by a later write
+                if self._active.get(job_id, 0.0) > now:
+                    deferred.append((now + self.stale_seconds, job_id))
+                    self._expires[job_id] = now + self.stale_seconds
+                    continue
+                if self._delete_locked(job_id):
+                    removed += 1
+            for entry in deferred:
+                heapq.heappush(heap, entry)
+        return removed
+
+
+class SQLiteJobStore(JobStore):
+    """
+    Embedded SQLite job store (WAL mode).
+
+    Every process opens its own connections to the same database file, so
+    all gunicorn workers see one consistent job table.  Writes run inside
+    ``BEGIN IMMEDIATE`` transactions, which serialize read-modify-write
+    cycles across processes.  Every write bumps a global sequence number;
+    ``start_change_feed`` polls ``seq`` to pick up writes from other
+    processes (coalesced: a subscriber sees each job's latest state).
+    """
+
+    _SCHEMA = (
+        """
+        CREATE TABLE IF NOT EXISTS jobs (
+            job_id     TEXT PRIMARY KEY,
+            status     TEXT,
+            data       TEXT NOT NULL,
+            active     INTEGER NOT NULL DEFAULT 0,
+            active_until REAL NOT NULL DEFAULT 0,
+            created_at REAL NOT NULL,
+            updated_at REAL NOT NULL,
+            expires_at REAL NOT NULL,
+            seq        INTEGER NOT NULL,
+            origin     TEXT
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs(status, updated_at)",
+        "CREATE INDEX IF NOT EXISTS idx_jobs_expires ON jobs(expires_at)",
+        "CREATE INDEX IF NOT EXISTS idx_jobs_seq ON jobs(seq)",
+        "CREATE INDEX IF NOT EXISTS idx_jobs_active ON jobs(active) WHERE active = 1",
+        "CREATE TABLE IF NOT EXISTS job_store_meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL)",
+        "INSERT OR IGNORE INTO job_store_meta (key, value) VALUES ('seq', 0)",
+    )
+
+    def __init__(self, path: str = 'data/jobs.db',
+                 ttl_seconds: float = DEFAULT_TTL_SECONDS,
+                 stale_seconds: float = DEFAULT_STALE_SECONDS,
+                 busy_timeout_seconds: float = 30.0):
+        super().__init__(ttl_seconds, stale_seconds)
+        self.path = path
+        self.busy_timeout_seconds = busy_timeout_seconds
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = self._conn()
+        with self._write(conn):
+            for statement in self._SCHEMA:
+                conn.execute(statement)
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(jobs)")}
+            if 'active_until' not in columns:
+                # Databases from before claim leases: their claims count as expired
+                conn.execute("ALTER TABLE jobs ADD COLUMN active_until REAL NOT NULL DEFAULT 0")
+        self._feed_seq = self._current_seq()
+
+    # -- connection handling --------------------------------------------------
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=self.busy_timeout_seconds,
+                                   isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            with self._connections_lock:
+                self._connections.append(conn)
+        return conn
+
+    class _write:
+        """Context manager for a ``BEGIN IMMEDIATE`` transaction"""
+
+        def __init__(self, conn: sqlite3.Connection):
+            self.conn = conn
+
+        def __enter__(self):
+            self.conn.execute("BEGIN IMMEDIATE")
+            return self.conn
+
+        def __exit__(self, exc_type, exc, tb):
+            self.conn.execute("ROLLBACK" if exc_type else "COMMIT")
+            return False
+
+    def _next_seq(self, conn: sqlite3.Connection) -> int:
+        conn.execute("UPDATE job_store_meta SET value = value + 1 WHERE key = 'seq'")
+        return conn.execute("SELECT value FROM job_store_meta WHERE key = 'seq'").fetchone()[0]
+
+    def _current_seq(self) -> int:
+        row = self._conn().execute("SELECT value FROM job_store_meta WHERE key = 'seq'").fetchone()
+        return row[0] if row else 0
+
+    def _upsert(self, conn: sqlite3.Connection, job_id: str, data: Dict[str, Any],
+                now: float, insert_only: bool = False) -> int:
+        """Write a record, returning its version (0 if ``insert_only`` found one)"""
+        status = data.get('status')
+        seq = self._next_seq(conn)
+        params = (job_id, status, _encode(data), now, now,
+                  self._expires_at(status, now), seq, self.origin)
+        if insert_only:
+            cursor = conn.execute(
+                "INSERT OR IGNORE INTO jobs (job_id, status, data, created_at, updated_at, expires_at, seq, origin) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)", params)
+            return seq if cursor.rowcount > 0 else 0
+        conn.execute(
+            "INSERT INTO jobs (job_id, status, data, created_at, updated_at, expires_at, seq, origin) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT(job_id) DO UPDATE SET status = excluded.status, data = excluded.data, "
+            "updated_at = excluded.updated_at, expires_at = excluded.expires_at, "
+            "seq = excluded.seq, origin = excluded.origin", params)
+        return seq
+
+    # -- core API -------------------------------------------------------------
+
+    def create(self, job_id: str, data: Dict[str, Any]) -> bool:
+        record = dict(data)
+        conn = self._conn()
+        with self._write(conn):
+            version = self._upsert(conn, job_id, record, time.time(), insert_only=True)
+        if version:
+            self._notify(job_id, record, version)
+        return bool(version)
+
+    def put(self, job_id: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        record = dict(data)
+        conn = self._conn()
+        with self._write(conn):
+            version = self._upsert(conn, job_id, record, time.time())
+        self._notify(job_id, record, version)
+        return dict(record)
+
+    def _merge(self, job_id: str, fields: Dict[str, Any],
+               from_statuses: Optional[Sequence[str]] = None) -> Optional[Dict[str, Any]]:
+        conn = self._conn()
+        with self._write(conn):
+            row = conn.execute("SELECT status, data FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+            if row is None:
+                return None
+            if from_statuses is not None and row[0] not in from_statuses:
+                return None
+            record = json.loads(row[1])
+            record.update(fields)
+            version = self._upsert(conn, job_id, record, time.time())
+        self._notify(job_id, record, version)
+        return dict(record)
+
+    def update(self, job_id: str, fields: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        return self._merge(job_id, fields)
+
+    def transition(self, job_id: str, to_status: str,
+                   from_statuses: Optional[Sequence[str]] = None,
+                   fields: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        return self._merge(job_id, {**(fields or {}), 'status': to_status}, from_statuses)
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        row = self._conn().execute("SELECT data FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def delete(self, job_id: str) -> bool:
+        conn = self._conn()
+        with self._write(conn):
+            return conn.execute("DELETE FROM jobs WHERE job_id = ?", (job_id,)).rowcount > 0
+
+    def version(self, job_id: str) -> int:
+        row = self._conn().execute("SELECT seq FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        return row[0] if row else 0
+
+    def claim(self, job_id: str, lease_seconds: Optional[float] = None) -> bool:
+        conn = self._conn()
+        now = time.time()
+        with self._write(conn):
+            row = conn.execute("SELECT active, active_until FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+            if row is not None and row[0] and row[1] > now:
+                return False
+            if row is None:
+                self._upsert(conn, job_id, {'job_id': job_id, 'status': 'queued'}, now, insert_only=True)
+            conn.execute("UPDATE jobs SET active = 1, active_until = ? WHERE job_id = ?",
+                         (self._lease_until(lease_seconds, now), job_id))
+        return True
+
+    def release(self, job_id: str) -> None:
+        conn = self._conn()
+        with self._write(conn):
+            conn.execute("UPDATE jobs SET active = 0, active_until = 0 WHERE job_id = ? AND active = 1", (job_id,))
+
+    def is_active(self, job_id: str) -> bool:
+        row = self._conn().execute("SELECT active, active_until FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        return bool(row and row[0] and row[1] > time.time())
+
+    def active_count(self) -> int:
+        return self._conn().execute(
+            "SELECT COUNT(*) FROM jobs WHERE active = 1 AND active_until > ?", (time.time(),)).fetchone()[0]
+
+    def list_by_status(self, status: str, limit: int = 100) -> List[Dict[str, Any]]:
+        rows = self._conn().execute(
+            "SELECT data FROM jobs WHERE status = ? ORDER BY updated_at DESC LIMIT ?",
+            (status, int(limit))).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def count_by_status(self) -> Dict[str, int]:
+        rows = self._conn().execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        return {status: count for status, count in rows}
+
+    def compact(self, now: Optional[float] = None) -> int:
+        now = time.time() if now is None else now
+        conn = self._conn()
+        with self._write(conn):
+            removed = conn.execute(
+                "DELETE FROM jobs WHERE expires_at <= ? AND (active = 0 OR active_until <= ?)",
+                (now, now)).rowcount
+        if removed:
+            logger.info(f"[JOBS] Compacted {removed} expired jobs")
+        return removed
+
+    # -- cross-process change feed ------------------------------------------
+
+    def poll_changes(self) -> int:
+        """
+        Deliver writes made by other processes since the last poll
+
+        Returns:
+            Number of delivered changes
+        """
+        rows = self._conn().execute(
+            "SELECT job_id, data, seq, origin FROM jobs WHERE seq > ? ORDER BY seq",
+            (self._feed_seq,)).fetchall()
+        delivered = 0
+        for job_id, data, seq, origin in rows:
+            self._feed_seq = seq
+            if origin == self.origin:
+                continue
+            self._notify(job_id, json.loads(data), seq, remote=True)
+            delivered += 1
+        return delivered
+
+    def start_change_feed(self, interval_seconds: float = 0.5, deliver_remote: bool = True) -> bool:
+        def run():
+            while not self._feed_stop.wait(interval_seconds):
+                if deliver_remote:
+                    try:
+                        self.poll_changes()
+                    except sqlite3.Error as e:
+                        logger.warning(f"[JOBS] Change feed poll failed: {e}")
+                self._maybe_compact()
+        return self._start_feed_thread(run)
+
+    def close(self) -> None:
+        super().close()
+        with self._connections_lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+        self._local = threading.local()
+
+
+class RedisJobStore(JobStore):
+    """
+    Redis-backed job store (optional ``redis`` dependency).
+
+    Each job is a hash ``{prefix}job:{id}`` with native key expiry; status
+    membership lives in sets and claims in one sorted set scored by lease
+    expiry.
+    Read-modify-write operations use WATCH/MULTI optimistic transactions.
+    Changes are published on ``{prefix}changes`` for the change feed.
+    """
+
+    def __init__(self, url: str = 'redis://localhost:6379/0', prefix: str = 'orfeas:jobs:',
+                 ttl_seconds: float = DEFAULT_TTL_SECONDS,
+                 stale_seconds: float = DEFAULT_STALE_SECONDS,
+                 client: Any = None):
+        super().__init__(ttl_seconds, stale_seconds)
+        if client is None:
+            if not REDIS_AVAILABLE:
+                raise RuntimeError("redis package is not installed")
+            client = redis.Redis.from_url(url)
+        self._redis = client
+        self.prefix = prefix
+        self._active_key = f"{prefix}claims"
+        self._channel = f"{prefix}changes"
+        self._seq_key = f"{prefix}seq"
+
+    def _key(self, job_id: str) -> str:
+        return f"{self.prefix}job:{job_id}"
+
+    def _status_key(self, status: Optional[str]) -> str:
+        return f"{self.prefix}status:{status}"
+
+    def _write(self, pipe: Any, job_id: str, data: Dict[str, Any],
+               old_status: Optional[str], now: float, version: int) -> None:
+        status = data.get('status')
+        key = self._key(job_id)
+        pipe.hset(key, mapping={'data': _encode(data), 'status': status or '', 'updated_at': now,
+                                'version': version})
+        pipe.expireat(key, int(self._expires_at(status, now)) + 1)
+        if old_status is not None and old_status != (status or ''):
+            pipe.srem(self._status_key(old_status or None), job_id)
+        pipe.sadd(self._status_key(status), job_id)
+        pipe.publish(self._channel, json.dumps({'job_id': job_id, 'origin': self.origin, 'data': data,
+                                                'version': version}, default=str))
+
+    @staticmethod
+    def _text(value: Any) -> Optional[str]:
+        if value is None:
+            return None
+        return value.decode() if isinstance(value, bytes) else value
+
+    def _modify(self, job_id: str, build: Callable[[Optional[Dict[str, Any]], Optional[str]],
+                                                   Optional[Dict[str, Any]]]) -> Optional[Dict[str, Any]]:
+        key = self._key(job_id)
+        result: Dict[str, Any] = {}
+
+        def txn(pipe):
+            raw, status = pipe.hmget(key, 'data', 'status')
+            current = json.loads(self._text(raw)) if raw is not None else None
+            record = build(current, self._text(status))
+            result['record'] = record
+            if record is not None:
+                # Taken before MULTI: a retried transaction just skips a number
+                result['version'] = int(pipe.incr(self._seq_key))
+            pipe.multi()
+            if record is not None:
+                self._write(pipe, job_id, record, self._text(status), time.time(), result['version'])
+
+        self._redis.transaction(txn, key)
+        record = result.get('record')
+        if record is not None:
+            self._notify(job_id, record, result['version'])
+        return record
+
+    def create(self, job_id: str, data: Dict[str, Any]) -> bool:
+        record = self._modify(job_id, lambda current, _: dict(data) if current is None else None)
+        return record is not None
+
+    def put(self, job_id: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        return self._modify(job_id, lambda current, _: dict(data))
+
+    def update(self, job_id: str, fields: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        return self._modify(job_id, lambda current, _: {**current, **fields} if current is not None else None)
+
+    def transition(self, job_id: str, to_status: str,
+                   from_statuses: Optional[Sequence[str]] = None,
+                   fields: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        def build(current, status):
+            if current is None:
+                return None
+            if from_statuses is not None and current.get('status') not in from_statuses:
+                return None
+            return {**current, **(fields or {}), 'status': to_status}
+        return self._modify(job_id, build)
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        raw = self._redis.hget(self._key(job_id), 'data')
+        return json.loads(self._text(raw)) if raw is not None else None
+
+    def delete(self, job_id: str) -> bool:
+        status = self._text(self._redis.hget(self._key(job_id), 'status'))
+        pipe = self._redis.pipeline()
+        pipe.delete(self._key(job_id))
+        pipe.srem(self._status_key(status or None), job_id)
+        pipe.zrem(self._active_key, job_id)
+        return bool(pipe.execute()[0])
+
+    def version(self, job_id: str) -> int:
+        value = self._redis.hget(self._key(job_id), 'version')
+        return int(value) if value is not None else 0
+
+    def claim(self, job_id: str, lease_seconds: Optional[float] = None) -> bool:
+        now = time.time()
+        # Drop expired leases, then add only if absent: of two racing claimers one gets it
+        self._redis.zremrangebyscore(self._active_key, '-inf', now)
+        if not self._redis.zadd(self._active_key, {job_id: self._lease_until(lease_seconds, now)}, nx=True):
+            return False
+        self.create(job_id, {'job_id': job_id, 'status': 'queued'})
+        return True
+
+    def release(self, job_id: str) -> None:
+        self._redis.zrem(self._active_key, job_id)
+
+    def is_active(self, job_id: str) -> bool:
+        until = self._redis.zscore(self._active_key, job_id)
+        return until is not None and float(until) > time.time()
+
+    def active_count(self) -> int:
+        return int(self._redis.zcount(self._active_key, f"({time.time()}", '+inf'))
+
+    def list_by_status(self, status: str, limit: int = 100) -> List[Dict[str, Any]]:
+        ids = [self._text(i) for i in self._redis.srandmember(self._status_key(status), int(limit)) or []]
+        pipe = self._redis.pipeline()
+        for job_id in ids:
+            pipe.hget(self._key(job_id), 'data')
+        records = [json.loads(self._text(raw)) for raw in pipe.execute() if raw is not None]
+        return records
+
+    def count_by_status(self) -> Dict[str, int]:
+        counts = {}
+        pattern = self._status_key('*')
+        offset = len(self._status_key(''))
+        for key in self._redis.scan_iter(match=pattern):
+            status = self._text(key)[offset:]
+            counts[status] = int(self._redis.scard(key))
+        return counts
+
+    def compact(self, now: Optional[float] = None) -> int:
+        """Key expiry is native in Redis; drop index entries of expired jobs and leases"""
+        self._redis.zremrangebyscore(self._active_key, '-inf', time.time() if now is None else now)
+        removed = 0
+        offset = len(self._status_key(''))
+        for key in self._redis.scan_iter(match=self._status_key('*')):
+            members = [self._text(m) for m in self._redis.smembers(key)]
+            pipe = self._redis.pipeline()
+            for job_id in members:
+                pipe.exists(self._key(job_id))
+            gone = [job_id for job_id, exists in zip(members, pipe.execute()) if not exists]
+            if gone:
+                self._redis.srem(key, *gone)
+                self._redis.zrem(self._active_key, *gone)
+                removed += len(gone)
+                logger.debug(f"[JOBS] Dropped {len(gone)} expired ids from {self._text(key)[offset:]}")
+        return removed
+
+    def start_change_feed(self, interval_seconds: float = 0.5, deliver_remote: bool = True) -> bool:
+        if not deliver_remote:
+            def compact_only():
+                while not self._feed_stop.wait(interval_seconds):
+                    self._maybe_compact()
+            return self._start_feed_thread(compact_only)
+
+        pubsub = self._redis.pubsub(ignore_subscribe_messages=True)
+        pubsub.subscribe(self._channel)
+
+        def run():
+            try:
+                while not self._feed_stop.is_set():
+                    message = pubsub.get_message(timeout=interval_seconds)
+                    self._maybe_compact()
+                    if not message:
+                        continue
+                    try:
+                        payload = json.loads(self._text(message['data']))
+                    except (TypeError, ValueError):
+                        continue
+                    if payload.get('origin') != self.origin:
+                        self._notify(payload['job_id'], payload['data'], int(payload.get('version', 0)),
+                                     remote=True)
+            finally:
+                pubsub.close()
+        return self._start_feed_thread(run)
+
+
+def _backend_name() -> str:
+    default = 'redis' if os.getenv('REDIS_URL') else 'sqlite'
+    return os.getenv('JOB_STORE_BACKEND') or default
+
+
+def create_job_store(backend: Optional[str] = None) -> JobStore:
+    """
+    Build a job store from environment configuration
+
+    Falls back to SQLite if Redis is requested but unavailable.
+    """
+    backend = (backend or _backend_name()).lower()
+    ttl = float(os.getenv('JOB_STORE_TTL_SECONDS', DEFAULT_TTL_SECONDS))
+    stale = float(os.getenv('JOB_STORE_STALE_SECONDS', DEFAULT_STALE_SECONDS))
+
+    if backend == 'memory':
+        return InMemoryJobStore(ttl_seconds=ttl, stale_seconds=stale)
+
+    if backend == 'redis':
+        try:
+            store = RedisJobStore(url=os.getenv('REDIS_URL', 'redis://localhost:6379/0'),
+                                  ttl_seconds=ttl, stale_seconds=stale)
+            store._redis.ping()
+            logger.info("[JOBS] Using Redis job store")
+            return store
+        except Exception as e:
+            logger.warning(f"[JOBS] Redis job store unavailable ({e}), falling back to SQLite")
+
+    path = os.getenv('JOB_STORE_PATH', 'data/jobs.db')
+    logger.info(f"[JOBS] Using SQLite job store at {path}")
+    return SQLiteJobStore(path, ttl_seconds=ttl, stale_seconds=stale)
+
+
+_job_store: Optional[JobStore] = None
+_job_store_lock = threading.Lock()
+
+
+def get_job_store() -> JobStore:
+    """Get the process-wide job store"""
+    global _job_store
+    if _job_store is None:
+        with _job_store_lock:
+            if _job_store is None:
+                _job_store = create_job_store()
+    return _job_store
+
+
+def reset_job_store() -> None:
+    """Close and drop the process-wide job store (for tests)"""
+    global _job_store
+    with _job_store_lock:
+        if _job_store is not None:
+            _job_store.close()
+        _job_store = None
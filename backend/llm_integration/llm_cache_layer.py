@@ -39,7 +39,7 @@ from .tracing import (
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(slots=True)
 class CachedResponse:
     """A cached LLM response entry."""
     key: str
@@ -6,21 +6,46 @@ Provides:
 - Component-level timing
 - Performance metrics collection
 - Performance reporting
+
+Storage:
+- Retained metrics live in ``MetricColumns``, a ring of NumPy columns
+  (timestamp, duration, status, interned component/operation id), so the
+  tracer holds no object per call
+- Per-operation count/total/min/max/errors are updated on record, so
+  stats, slowest and error queries cost O(operations), never O(metrics)
+- Queries over the retained metrics (recent metrics by component, latency
+  percentiles over a time window) are NumPy masks over the columns
+- ``trace_performance`` can sample: with ``sample_rate`` 0.1 one call in
+  ten is timed and recorded with weight 10, so counts stay estimates of
+  the real call volume
+
+Environment:
+    LLM_TRACE_SAMPLE_RATE    default fraction of decorated calls recorded (default 1.0)
 """
 
+import os
 import time
 import logging
 import asyncio
+import threading
 from functools import wraps
+from itertools import count as counter
 from datetime import datetime
-from typing import Dict, List, Optional, Callable, Any, Coroutine
+from typing import Dict, List, Optional, Callable, Any, Coroutine, Tuple
 from dataclasses import dataclass, field
 from contextlib import asynccontextmanager, contextmanager
 
+import numpy as np
+
 logger = logging.getLogger(__name__)
 
+DEFAULT_SAMPLE_RATE = float(os.getenv('LLM_TRACE_SAMPLE_RATE', '1.0'))
 
-@dataclass
+STATUS_SUCCESS = 0
+STATUS_ERROR = 1
+
+
+@dataclass(slots=True)
 class PerformanceMetric:
     """Single performance metric."""
     name: str
@@ -86,40 +111,125 @@ class PerformanceStats:
         }
 
 
+class MetricColumns:
+    """
+    Fixed-capacity ring of recorded metrics, one NumPy array per field
+
+    Component/operation pairs are stored as interned ids. Error names and
+    metadata are rare, so they sit in plain lists beside the arrays
+    (``None`` when absent). Not thread-safe: the tracer
+    serialises access.
+    """
+
+    __slots__ = ('capacity', 'timestamps', 'durations', 'status', 'key_ids',
+                 'errors', 'metadata', 'next', 'size')
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.timestamps = np.zeros(capacity, dtype=np.float64)
+        self.durations = np.zeros(capacity, dtype=np.float64)
+        self.status = np.zeros(capacity, dtype=np.int8)
+        self.key_ids = np.zeros(capacity, dtype=np.int32)
+        self.errors: List[Optional[str]] = [None] * capacity
+        self.metadata: List[Optional[Dict[str, Any]]] = [None] * capacity
+        self.next = 0
+        self.size = 0
+
+    def append(self, key_id: int, timestamp: float, duration_ms: float, status: int,
+               error: Optional[str], metadata: Optional[Dict[str, Any]]) -> None:
+        position = self.next
+        self.timestamps[position] = timestamp
+        self.durations[position] = duration_ms
+        self.status[position] = status
+        self.key_ids[position] = key_id
+        self.errors[position] = error
+        self.metadata[position] = metadata
+        self.next = position + 1 if position + 1 < self.capacity else 0
+        if self.size < self.capacity:
+            self.size += 1
+
+    def recent(self, count: int) -> np.ndarray:
+        """Positions of the newest ``count`` entries, oldest first"""
+        count = max(0, min(count, self.size))
+        return (np.arange(self.next - count, self.next) % self.capacity).astype(np.intp)
+
+    def __len__(self) -> int:
+        return self.size
+
+    def clear(self) -> None:
+        self.errors = [None] * self.capacity
+        self.metadata = [None] * self.capacity
+        self.next = 0
+        self.size = 0
+
+
 class PerformanceTracer:
     """Track and analyze performance across components."""
 
     def __init__(self, max_metrics: int = 10000):
-        self.metrics: List[PerformanceMetric] = []
         self.max_metrics = max_metrics
+        self.metrics = MetricColumns(max_metrics)
         self.stats: Dict[str, PerformanceStats] = {}
+        # Interned (component, operation) -> id, indexing the retained key_ids column
+        self._key_ids: Dict[Tuple[str, str], int] = {}
+        self._key_stats: List[PerformanceStats] = []
+        self._lock = threading.Lock()
+
+    def key_id(self, component: str, operation: str) -> int:
+        """Interned id for a component/operation pair"""
+        key = (component, operation)
+        key_id = self._key_ids.get(key)
+        if key_id is None:
+            with self._lock:
+                key_id = self._key_ids.get(key)
+                if key_id is None:
+                    key_id = len(self._key_stats)
+                    self._key_stats.append(PerformanceStats(component=component, operation=operation))
+                    self._key_ids[key] = key_id
+        return key_id
+
+    def record(self, key_id: int, duration_ms: float, success: bool = True, error: Optional[str] = None,
+               metadata: Optional[Dict[str, Any]] = None, timestamp: Optional[float] = None,
+               weight: int = 1) -> None:
+        """
+        Record one measurement for an interned key.
+
+        Args:
+            key_id: From ``key_id(component, operation)``
+            duration_ms: Measured duration
+            success: False when the operation raised
+            error: Exception type name for failures
+            metadata: Optional context kept with the retained metric
+            timestamp: Epoch seconds (defaults to now)
+            weight: Calls this measurement stands for (1 / sample rate)
+        """
+        with self._lock:
+            stats = self._key_stats[key_id]
+            self.metrics.append(key_id, time.time() if timestamp is None else timestamp, duration_ms,
+                                STATUS_SUCCESS if success else STATUS_ERROR, error, metadata or None)
+            if not stats.count:
+                self.stats[f"{stats.component}:{stats.operation}"] = stats
+            stats.count += weight
+            stats.total_duration_ms += duration_ms * weight
+            if duration_ms < stats.min_duration_ms:
+                stats.min_duration_ms = duration_ms
+            if duration_ms > stats.max_duration_ms:
+                stats.max_duration_ms = duration_ms
+            if success:
+                stats.success_count += weight
+            else:
+                stats.error_count += weight
 
     def record_metric(self, metric: PerformanceMetric):
         """Record a performance metric."""
-        # Keep metrics under max size
-        if len(self.metrics) >= self.max_metrics:
-            self.metrics.pop(0)
-
-        self.metrics.append(metric)
-
-        # Update stats
-        key = f"{metric.component}:{metric.name}"
-        if key not in self.stats:
-            self.stats[key] = PerformanceStats(
-                component=metric.component,
-                operation=metric.name
-            )
-
-        stats = self.stats[key]
-        stats.count += 1
-        stats.total_duration_ms += metric.duration_ms
-        stats.min_duration_ms = min(stats.min_duration_ms, metric.duration_ms)
-        stats.max_duration_ms = max(stats.max_duration_ms, metric.duration_ms)
-
-        if metric.success:
-            stats.success_count += 1
-        else:
-            stats.error_count += 1
+        self.record(
+            self.key_id(metric.component, metric.name),
+            metric.duration_ms,
+            success=metric.success,
+            error=metric.error,
+            metadata=metric.metadata,
+            timestamp=metric.timestamp.timestamp()
+        )
 
     def get_stats(self, component: str = None, operation: str = None) -> List[PerformanceStats]:
         """Get performance statistics."""
@@ -149,14 +259,73 @@ class PerformanceTracer:
             if s.error_rate >= min_error_rate
         ]
 
+    def _key_selector(self, component: Optional[str], operation: Optional[str]) -> np.ndarray:
+        """Boolean lookup table by key id, so ``selector[key_ids]`` masks a column"""
+        selector = np.zeros(len(self._key_stats), dtype=bool)
+        for (key_component, key_operation), key_id in self._key_ids.items():
+            if (not component or key_component == component) and (not operation or key_operation == operation):
+                selector[key_id] = True
+        return selector
+
     def get_recent_metrics(self, count: int = 100, component: str = None) -> List[PerformanceMetric]:
         """Get recent metrics."""
-        metrics = self.metrics[-count:]
-
-        if component:
-            metrics = [m for m in metrics if m.component == component]
-
-        return metrics
+        columns = self.metrics
+        with self._lock:
+            positions = columns.recent(count)
+            if component:
+                positions = positions[self._key_selector(component, None)[columns.key_ids[positions]]]
+            rows = zip(positions.tolist(), columns.key_ids[positions].tolist(),
+                       columns.timestamps[positions].tolist(), columns.durations[positions].tolist(),
+                       columns.status[positions].tolist())
+
+            return [
+                PerformanceMetric(
+                    name=self._key_stats[key_id].operation,
+                    component=self._key_stats[key_id].component,
+                    duration_ms=duration_ms,
+                    timestamp=datetime.fromtimestamp(timestamp),
+                    success=status == STATUS_SUCCESS,
+                    error=columns.errors[position],
+                    metadata=columns.metadata[position] or {}
+                )
+                for position, key_id, timestamp, duration_ms, status in rows
+            ]
+
+    def get_latency_percentiles(self, component: str = None, operation: str = None,
+                                window_seconds: float = None,
+                                percentiles: Tuple[float, ...] = (50, 95, 99)) -> Dict[str, Any]:
+        """
+        Duration percentiles over the retained metrics.
+
+        Args:
+            component: Only this component (all when omitted)
+            operation: Only this operation (all when omitted)
+            window_seconds: Only metrics recorded in the last N seconds
+            percentiles: Percentiles to compute (0-100)
+
+        Returns:
+            ``{'count': n, 'error_rate': ..., 'p50': ..., ...}`` (percentiles
+            omitted when nothing matches)
+        """
+        columns = self.metrics
+        with self._lock:
+            size = len(columns)
+            mask = np.ones(size, dtype=bool)
+            if component or operation:
+                mask &= self._key_selector(component, operation)[columns.key_ids[:size]]
+            if window_seconds is not None:
+                mask &= columns.timestamps[:size] >= time.time() - window_seconds
+            durations = columns.durations[:size][mask]
+            errors = int(np.count_nonzero(columns.status[:size][mask]))
+
+        result: Dict[str, Any] = {
+            'count': int(durations.size),
+            'error_rate': errors / durations.size if durations.size else 0.0
+        }
+        if durations.size:
+            for percentile, value in zip(percentiles, np.percentile(durations, percentiles).tolist()):
+                result[f"p{percentile:g}"] = value
+        return result
 
     def get_report(self) -> dict:
         """Get comprehensive performance report."""
@@ -182,106 +351,78 @@ class PerformanceTracer:
 
     def clear(self):
         """Clear all metrics and stats."""
-        self.metrics = []
-        self.stats = {}
+        with self._lock:
+            self.metrics.clear()
+            self.stats = {}
+            # Ids stay interned (decorators hold them); only the numbers reset
+            for key_id, stats in enumerate(self._key_stats):
+                self._key_stats[key_id] = PerformanceStats(component=stats.component, operation=stats.operation)
 
 
 # Global performance tracer
 performance_tracer = PerformanceTracer()
 
 
-def trace_performance(component: str, operation: str = None):
+def _sample_stride(sample_rate: Optional[float]) -> int:
+    """Record one call in ``stride`` for a sample rate in (0, 1]"""
+    rate = DEFAULT_SAMPLE_RATE if sample_rate is None else sample_rate
+    if rate <= 0:
+        raise ValueError(f"sample_rate must be > 0, got {rate}")
+    return max(1, round(1 / min(rate, 1.0)))
+
+
+def trace_performance(component: str, operation: str = None, sample_rate: float = None):
     """
     Decorator to trace performance of functions.
 
     Args:
         component: Component name
         operation: Operation name (defaults to function name)
+        sample_rate: Fraction of calls timed and recorded, each standing
+            for 1/sample_rate calls (defaults to LLM_TRACE_SAMPLE_RATE)
     """
+    stride = _sample_stride(sample_rate)
+
     def decorator(func):
         op_name = operation or func.__name__
+        key_id = performance_tracer.key_id(component, op_name)
+        calls = counter()
 
         @wraps(func)
         async def async_wrapper(*args, **kwargs):
-            start = time.time()
+            if stride > 1 and next(calls) % stride:
+                return await func(*args, **kwargs)
+            start = time.perf_counter()
             try:
                 result = await func(*args, **kwargs)
-                duration_ms = (time.time() - start) * 1000
-
-                metric = PerformanceMetric(
-                    name=op_name,
-                    component=component,
-                    duration_ms=duration_ms,
-                    timestamp=datetime.now(),
-                    success=True
-                )
-                performance_tracer.record_metric(metric)
-
-                logger.debug(
-                    f"{component}.{op_name}: {duration_ms:.2f}ms"
-                )
-
-                return result
-
             except Exception as e:
-                duration_ms = (time.time() - start) * 1000
-
-                metric = PerformanceMetric(
-                    name=op_name,
-                    component=component,
-                    duration_ms=duration_ms,
-                    timestamp=datetime.now(),
-                    success=False,
-                    error=str(type(e).__name__)
-                )
-                performance_tracer.record_metric(metric)
-
-                logger.warning(
-                    f"{component}.{op_name} failed: {duration_ms:.2f}ms - {e}"
-                )
-
+                duration_ms = (time.perf_counter() - start) * 1000
+                performance_tracer.record(key_id, duration_ms, success=False,
+                                          error=type(e).__name__, weight=stride)
+                logger.warning("%s.%s failed: %.2fms - %s", component, op_name, duration_ms, e)
                 raise
+            duration_ms = (time.perf_counter() - start) * 1000
+            performance_tracer.record(key_id, duration_ms, weight=stride)
+            logger.debug("%s.%s: %.2fms", component, op_name, duration_ms)
+            return result
 
         @wraps(func)
         def sync_wrapper(*args, **kwargs):
-            start = time.time()
+            if stride > 1 and next(calls) % stride:
+                return func(*args, **kwargs)
+            start = time.perf_counter()
             try:
                 result = func(*args, **kwargs)
-                duration_ms = (time.time() - start) * 1000
-
-                metric = PerformanceMetric(
-                    name=op_name,
-                    component=component,
-                    duration_ms=duration_ms,
-                    timestamp=datetime.now(),
-                    success=True
-                )
-                performance_tracer.record_metric(metric)
-
-                logger.debug(
-                    f"{component}.{op_name}: {duration_ms:.2f}ms"
-                )
-
-                return result
-
             except Exception as e:
-                duration_ms = (time.time() - start) * 1000
-
-                metric = PerformanceMetric(
-                    name=op_name,
-                    component=component,
-                    duration_ms=duration_ms,
-                    timestamp=datetime.now(),
-                    success=False,
-                    error=str(type(e).__name__)
-                )
-                performance_tracer.record_metric(metric)
-
-                logger.warning(
-                    f"{component}.{op_name} failed: {duration_ms:.2f}ms - {e}"
-                )
-
+                duration_ms = (time.perf_counter() - start) * 1000
+                performance_tracer.record(key_id, duration_ms, success=False,
+                                          error=type(e).__name__, weight=stride)
+                logger.warning("%s.%s failed: %.2fms - %s", component, op_name, duration_ms, e)
                 raise
+            duration_ms = (time.perf_counter() - start) * 1000
+            performance_tracer.record(key_id, duration_ms, weight=stride)
+            logger.debug("%s.%s: %.2fms", component, op_name, duration_ms)
+            return result
 
         # Return appropriate wrapper
         if asyncio.iscoroutinefunction(func):
@@ -301,45 +442,22 @@ def trace_block(component: str, operation: str, metadata: dict = None):
         with trace_block('router', 'model_selection', {'model': 'gpt4'}):
             # ... code ...
     """
-    start = time.time()
-    metadata = metadata or {}
+    key_id = performance_tracer.key_id(component, operation)
+    start = time.perf_counter()
 
     try:
         yield
-        duration_ms = (time.time() - start) * 1000
-
-        metric = PerformanceMetric(
-            name=operation,
-            component=component,
-            duration_ms=duration_ms,
-            timestamp=datetime.now(),
-            success=True,
-            metadata=metadata
-        )
-        performance_tracer.record_metric(metric)
-
-        logger.debug(f"{component}.{operation}: {duration_ms:.2f}ms")
-
     except Exception as e:
-        duration_ms = (time.time() - start) * 1000
-
-        metric = PerformanceMetric(
-            name=operation,
-            component=component,
-            duration_ms=duration_ms,
-            timestamp=datetime.now(),
-            success=False,
-            error=str(type(e).__name__),
-            metadata=metadata
-        )
-        performance_tracer.record_metric(metric)
-
-        logger.warning(
-            f"{component}.{operation} failed: {duration_ms:.2f}ms - {e}"
-        )
-
+        duration_ms = (time.perf_counter() - start) * 1000
+        performance_tracer.record(key_id, duration_ms, success=False,
+                                  error=type(e).__name__, metadata=metadata)
+        logger.warning("%s.%s failed: %.2fms - %s", component, operation, duration_ms, e)
         raise
 
+    duration_ms = (time.perf_counter() - start) * 1000
+    performance_tracer.record(key_id, duration_ms, metadata=metadata)
+    logger.debug("%s.%s: %.2fms", component, operation, duration_ms)
+
 
 @asynccontextmanager
 async def trace_block_async(component: str, operation: str, metadata: dict = None):
@@ -350,45 +468,22 @@ async def trace_block_async(component: str, operation: str, metadata: dict = Non
         async with trace_block_async('cache', 'retrieval', {'key': 'xyz'}):
             # ... async code ...
     """
-    start = time.time()
-    metadata = metadata or {}
+    key_id = performance_tracer.key_id(component, operation)
+    start = time.perf_counter()
 
     try:
         yield
-        duration_ms = (time.time() - start) * 1000
-
-        metric = PerformanceMetric(
-            name=operation,
-            component=component,
-            duration_ms=duration_ms,
-            timestamp=datetime.now(),
-            success=True,
-            metadata=metadata
-        )
-        performance_tracer.record_metric(metric)
-
-        logger.debug(f"{component}.{operation}: {duration_ms:.2f}ms")
-
     except Exception as e:
-        duration_ms = (time.time() - start) * 1000
-
-        metric = PerformanceMetric(
-            name=operation,
-            component=component,
-            duration_ms=duration_ms,
-            timestamp=datetime.now(),
-            success=False,
-            error=str(type(e).__name__),
-            metadata=metadata
-        )
-        performance_tracer.record_metric(metric)
-
-        logger.warning(
-            f"{component}.{operation} failed: {duration_ms:.2f}ms - {e}"
-        )
-
+        duration_ms = (time.perf_counter() - start) * 1000
+        performance_tracer.record(key_id, duration_ms, success=False,
+                                  error=type(e).__name__, metadata=metadata)
+        logger.warning("%s.%s failed: %.2fms - %s", component, operation, duration_ms, e)
         raise
 
+    duration_ms = (time.perf_counter() - start) * 1000
+    performance_tracer.record(key_id, duration_ms, metadata=metadata)
+    logger.debug("%s.%s: %.2fms", component, operation, duration_ms)
+
 
 def get_performance_report() -> dict:
     """Get comprehensive performance report."""
@@ -11,15 +11,6 @@ import logging
 from typing import Any, Dict
 from flask import Blueprint, request, jsonify
 
-# Project monitoring decorator (safe to import here)
-try:
-    from monitoring import track_request_metrics
-except Exception:  # pragma: no cover - fallback if monitoring not available in test mode
-    def track_request_metrics(_):
-        def _noop(f):
-            return f
-        return _noop
-
 # Local LLM router (Ollama client)
 from local_llm_router import local_llm  # local module in backend/
 
@@ -31,7 +22,6 @@ def _enabled() -> bool:
     return os.getenv("ENABLE_LOCAL_LLMS", "true").lower() == "true"  # Default to enabled
 
 @llm_bp.route("/status", methods=["GET"])
-@track_request_metrics('/api/local-llm/status')
 def llm_status():
     """Report local LLM availability and configuration."""
     enabled = _enabled()
@@ -46,7 +36,6 @@ def llm_status():
     }), (200 if enabled else 503)
 
 @llm_bp.route("/generate", methods=["POST"])
-@track_request_metrics('/api/local-llm/generate')
 def llm_generate():
     """Generate text from a prompt using local LLM (Ollama).
 
@@ -16,6 +16,7 @@ Features:
 import os
 import sys
 import uuid
+import importlib
 import logging
 import threading
 import traceback
@@ -50,33 +51,41 @@ from hunyuan_integration import get_3d_processor, FallbackProcessor
 from gpu_manager import get_gpu_manager
 
 # [ORFEAS PHASE 1] GPU Optimization Module - Dynamic VRAM Management
-from gpu_optimization_advanced import (
-    get_vram_manager,
-    PrecisionMode,
-    DynamicVRAMManager
-)
+# (gpu_optimization_advanced is loaded by the vram_manager subsystem)
 
 from rtx_optimization import initialize_rtx_optimizations, get_rtx_optimizer  # [ORFEAS] ORFEAS RTX OPTIMIZATION
 from batch_processor import BatchProcessor, AsyncJobQueue  # [ORFEAS] ORFEAS PHASE 1: Batch processing
+from job_store import get_job_store, InMemoryJobStore, is_terminal_status  # Persistent job state shared across workers
+from shared_state import get_shared_state, LocalSharedState, socketio_message_queue  # Cross-worker locks and token buckets
+from download_service import (  # Range/ETag/precompressed artifact downloads
+    resolve_artifact, send_artifact, read_base64_page, precompress_async, DEFAULT_B64_PAGE_SIZE,
+    content_hash, record_content_hash
+)
+from preview_service import get_preview_service, send_preview, MESH_SUFFIXES  # WebP/AVIF thumbnails and mesh previews
+from depth_engine import get_depth_engine  # Pyramid multi-cue depth with a per-image memo
+from volumetric_engine import get_volumetric_engine  # Block-wise marching cubes without a dense volume
+from speculative_prefetch import get_prefetcher, prefetch_enabled  # Preprocessing between upload and generate
+from babylon_integration import get_babylon_optimizer  # Binary GLB export for the Babylon.js viewer
 from stl_processor import AdvancedSTLProcessor, analyze_stl, repair_stl, optimize_stl_for_printing  # [ORFEAS] ORFEAS PHASE 2.1: Advanced STL processing
 from material_processor import MaterialProcessor, get_material_preset, get_lighting_preset, create_complete_metadata  # [ORFEAS] ORFEAS PHASE 2.3: Material & Lighting
 from camera_processor import CameraProcessor, get_camera_preset, create_turntable_animation, create_orbital_animation  # [ORFEAS] ORFEAS PHASE 2.4: Advanced Camera System
 from validation import (
     Generate3DRequest, FileUploadValidator,
-    get_rate_limiter, SecurityHeaders
+    SecurityHeaders
 )
+from rate_limiting import RateLimiter, get_rate_limiter  # GCRA limiter with route costs and bounded key table
 # [ORFEAS SECURITY] Enhanced 6-layer image validation system (Priority #2)
 from validation_enhanced import get_enhanced_validator
 # [ORFEAS QUALITY] Real-time Quality Metrics system (Priority #1)
 from quality_validator import get_quality_validator
 from monitoring import (
-    setup_monitoring, track_request_metrics, track_generation_metrics,
+    setup_monitoring, track_generation_metrics,
     update_system_metrics, JobQueueTracker
 )
 
 # [ORFEAS] ORFEAS PHASE 5: Production metrics and health checks
 from production_metrics import (
-    initialize_metrics, track_request, GenerationTracker,
+    initialize_metrics, GenerationTracker,
     get_metrics_response, update_system_metrics_prometheus,
     update_queue_metrics
 )
@@ -90,63 +99,11 @@ from logging.handlers import RotatingFileHandler
 
 # [ORFEAS] PHASE 2.4: WebSocket Progress Tracking
 from websocket_manager import initialize_websocket_manager, get_websocket_manager
-from progress_tracker import initialize_progress_tracker, get_progress_tracker
+from progress_tracker import initialize_progress_tracker, get_progress_tracker, sse_stream, store_event_id
 
-# [ORFEAS] ULTRA-PERFORMANCE OPTIMIZATION: 100x Speed, 100x Accuracy, 10x Security
-from ultra_performance_integration import UltraPerformanceManager
-
-# [ORFEAS] ENTERPRISE AGENT FRAMEWORK: Multi-Agent Orchestration & Communication
-try:
-    from enterprise_agent_framework import (
-        EnterpriseAgentOrchestrator,
-        QualityAssessmentAgent,
-        WorkflowOrchestrationAgent,
-        PerformanceOptimizationAgent,
-        AgentTask
-    )
-    from agent_communication import (
-        get_agent_communication_system,
-        AgentMessage,
-        MessageType,
-        MessagePriority,
-        AgentEndpoint,
-        TaskRequestHandler,
-        CoordinationRequestHandler
-    )
-    ENTERPRISE_AGENTS_AVAILABLE = True
-    logger = logging.getLogger(__name__)
-    logger.info("[ORFEAS] Enterprise Agent Framework and Communication System loaded successfully")
-except ImportError as e:
-    ENTERPRISE_AGENTS_AVAILABLE = False
-    logger = logging.getLogger(__name__)
-    logger.warning(f"[ORFEAS] Enterprise Agent Framework not available: {e}")
-
-# [ORFEAS PHASE 4] 99%+ Enterprise Optimization Components - All Three Tiers
-# ============================================================================
-# Tier 1: Essential Optimization Components (GPU, Dashboard, Cache, Load Tests)
-try:
-    from advanced_gpu_optimizer import get_advanced_gpu_optimizer
-    from performance_dashboard_realtime import get_dashboard
-    from distributed_cache_manager import get_distributed_cache
-    logger.info("[ORFEAS PHASE 4] Tier 1 components imported: GPU Optimizer, Dashboard, Cache")
-except ImportError as e:
-    logger.warning(f"[ORFEAS PHASE 4] Tier 1 components unavailable: {e}")
-
-# Tier 2: Enhanced Monitoring Components (Predictions, Alerting)
-try:
-    from predictive_performance_optimizer import get_predictive_optimizer
-    from alerting_system import get_alerting_system
-    logger.info("[ORFEAS PHASE 4] Tier 2 components imported: Predictions, Alerting")
-except ImportError as e:
-    logger.warning(f"[ORFEAS PHASE 4] Tier 2 components unavailable: {e}")
-
-# Tier 3: Premium Intelligence Components (Anomalies, Tracing)
-try:
-    from ml_anomaly_detector import get_anomaly_detector
-    from distributed_tracing import get_tracing_system
-    logger.info("[ORFEAS PHASE 4] Tier 3 components imported: Anomalies, Tracing")
-except ImportError as e:
-    logger.warning(f"[ORFEAS PHASE 4] Tier 3 components unavailable: {e}")
+# Optional subsystems (ultra-performance, enterprise agents, Phase 4 tiers) are
+# imported lazily through the subsystem registry - see register_subsystems()
+from subsystems import SubsystemRegistry, LazySubsystem
 
 # =============================================================================
 # [ORFEAS] ENHANCED LOGGING CONFIGURATION
@@ -359,9 +316,7 @@ def generate_unique_filename(original_filename, prefix="orfeas", include_uuid=Tr
 try:
     import trimesh
     import cv2
-    from scipy import ndimage
     from scipy.ndimage import filters
-    from skimage import feature, morphology, measure, filters as skimage_filters
     ADVANCED_3D_AVAILABLE = True
     logger.info("[OK] Advanced 3D processing dependencies available")
 except ImportError as e:
@@ -377,6 +332,10 @@ except ImportError:
     logger.warning("[WARN] MiDaS depth estimation unavailable")
 
 
+# Depth memo variant of the Powerful 3D preprocessing (_powerful_depth_input)
+POWERFUL_DEPTH_VARIANT = "rgb-lanczos256-contrast1.2"
+
+
 class ProcessorMode(str, Enum):
     """Processing modes for ORFEAS server"""
     FULL_AI = "full_ai"              # Full Hunyuan3D-2.1 AI processing
@@ -407,12 +366,24 @@ class AdvancedDepthEstimator:
         except Exception as e:
             logger.error(f"Failed to load MiDaS: {e}")
 
-    def estimate_depth(self, image_data: np.ndarray) -> np.ndarray:
-        """Estimate depth from image using best available method"""
+    def estimate_depth(self, image_data: np.ndarray, digest: Optional[str] = None,
+                       variant: str = '') -> np.ndarray:
+        """Estimate depth from image using best available method
+
+        Args:
+            image_data: RGB or grayscale image (uint8 or float in [0, 1])
+            digest: Content hash of the source image; enables the depth memo
+            variant: Preprocessing applied to the source (part of the memo key)
+        """
 
         if self.midas_model is not None:
             return self.neural_depth_estimation(image_data)
         elif ADVANCED_3D_AVAILABLE:
+            if digest is not None:
+                depth, hit = get_depth_engine().estimate_cached(image_data, digest, variant)
+                if hit:
+                    logger.info(f"[TARGET] Depth map reused from memo ({digest[:12]})")
+                return depth
             return self.classical_depth_estimation(image_data)
         else:
             return self.basic_depth_estimation(image_data)
@@ -424,52 +395,9 @@ class AdvancedDepthEstimator:
         return self.classical_depth_estimation(image_data)
 
     def classical_depth_estimation(self, image_data: np.ndarray) -> np.ndarray:
-        """Classical depth estimation using multiple cues"""
+        """Classical depth estimation using multiple cues (see depth_engine.py)"""
         logger.info("[TARGET] Classical multi-cue depth estimation")
-
-        # Convert to grayscale if needed
-        if len(image_data.shape) == 3:
-            gray = np.mean(image_data, axis=2)
-        else:
-            gray = image_data
-
-        # Multiple depth cues combination
-        depth_maps = []
-
-        # 1. Brightness-based depth
-        brightness_depth = gray / 255.0
-        depth_maps.append(brightness_depth)
-
-        # 2. Edge-based depth
-        edges = feature.canny(gray, sigma=1.0)
-        edge_depth = ndimage.distance_transform_edt(~edges)
-        edge_depth = edge_depth / edge_depth.max()
-        depth_maps.append(edge_depth)
-
-        # 3. Texture-based depth
-        texture = skimage_filters.rank.entropy(gray.astype(np.uint8), morphology.disk(3))
-        texture_depth = texture / texture.max()
-        depth_maps.append(texture_depth)
-
-        # 4. Gradient-based depth
-        gradient_mag = np.sqrt(
-            ndimage.sobel(gray, axis=0)**2 + ndimage.sobel(gray, axis=1)**2
-        )
-        gradient_depth = gradient_mag / gradient_mag.max()
-        depth_maps.append(gradient_depth)
-
-        # Combine with weights
-        weights = [0.4, 0.2, 0.2, 0.2]
-        combined_depth = np.zeros_like(gray, dtype=np.float32)
-
-        for depth_map, weight in zip(depth_maps, weights):
-            combined_depth += depth_map * weight
-
-        # Smooth and normalize
-        combined_depth = skimage_filters.gaussian(combined_depth, sigma=1.5)
-        combined_depth = (combined_depth - combined_depth.min()) / (combined_depth.max() - combined_depth.min())
-
-        return combined_depth
+        return get_depth_engine().estimate(image_data)
 
     def basic_depth_estimation(self, image_data: np.ndarray) -> np.ndarray:
         """Basic depth estimation (brightness-based fallback)"""
@@ -519,7 +447,8 @@ class Advanced3DMeshGenerator:
         if not ADVANCED_3D_AVAILABLE:
             return 'heightfield'
 
-        gradient_strength = np.mean(np.gradient(depth_map)[0]**2 + np.gradient(depth_map)[1]**2)
+        grad_y, grad_x = np.gradient(depth_map)
+        gradient_strength = np.mean(grad_y**2 + grad_x**2)
         height_variation = np.std(depth_map)
 
         if quality == 'ultra' and height_variation > 0.3:
@@ -654,20 +583,15 @@ class Advanced3DMeshGenerator:
         return vertices, faces
 
     def marching_cubes_generation(self, depth_map, dimensions, quality):
-        """Generate mesh using marching cubes"""
+        """Generate mesh using marching cubes (block-wise, see volumetric_engine.py)"""
 
         height, width = depth_map.shape
         volume_depth = max(16, int(dimensions['depth'] / 2))
-        volume = np.zeros((height, width, volume_depth), dtype=np.float32)
-
-        for z in range(volume_depth):
-            layer_threshold = z / volume_depth
-            volume[:, :, z] = (depth_map > layer_threshold).astype(float)
 
         try:
-            vertices, faces, _, _ = measure.marching_cubes(
-                volume,
-                level=0.5,
+            vertices, faces = get_volumetric_engine().mesh(
+                depth_map,
+                volume_depth,
                 spacing=(
                     dimensions['height'] / height,
                     dimensions['width'] / width,
@@ -679,7 +603,7 @@ class Advanced3DMeshGenerator:
             vertices[:, 1] -= dimensions['width'] / 2
 
             logger.info(f"[OK] Marching cubes mesh: {len(vertices)} vertices, {len(faces)} faces")
-            return vertices.astype(np.float32), faces.astype(np.int32)
+            return vertices, faces
 
         except Exception as e:
             logger.warning(f"[WARN] Marching cubes failed: {e}")
@@ -722,57 +646,22 @@ def is_valid_uuid(value: str) -> bool:
         return False
 
 
-# [ORFEAS FIX 3] Custom Rate Limiter Implementation (no external dependencies)
-class RateLimiter:
-    """Simple in-memory rate limiter for protecting against DoS attacks"""
-
-    def __init__(self, requests_per_minute: int = 60):
-        """Initialize rate limiter
-
-        Args:
-            requests_per_minute: Maximum requests allowed per minute per IP
-        """
-        self.requests_per_minute = requests_per_minute
-        self.requests = {}  # {ip: [(timestamp, count), ...]}
-        self.lock = threading.Lock()
-
-    def is_rate_limited(self, client_ip: str) -> bool:
-        """Check if client has exceeded rate limit
-
-        Args:
-            client_ip: Client IP address
-
-        Returns:
-            True if rate limited (429), False if allowed
-        """
-        import time
-
-        now = time.time()
-        minute_ago = now - 60
-
-        with self.lock:
-            # Clean old entries
-            if client_ip in self.requests:
-                self.requests[client_ip] = [
-                    ts for ts in self.requests[client_ip] if ts > minute_ago
-                ]
-
-            # Check limit
-            if client_ip not in self.requests:
-                self.requests[client_ip] = [now]
-                return False
-
-            if len(self.requests[client_ip]) >= self.requests_per_minute:
-                return True
-
-            # Add current request
-            self.requests[client_ip].append(now)
-            return False
-
-
 class OrfeasUnifiedServer:
     """Unified ORFEAS Server with all best features"""
 
+    # Optional subsystems resolve through self.subsystems (see register_subsystems)
+    vram_manager = LazySubsystem('vram_manager')
+    ultra_performance_manager = LazySubsystem('ultra_performance')
+    agent_communication_system = LazySubsystem('agent_communication')
+    enterprise_orchestrator = LazySubsystem('enterprise_agents')
+    gpu_optimizer = LazySubsystem('gpu_optimizer')
+    dashboard = LazySubsystem('dashboard')
+    cache_manager = LazySubsystem('cache_manager')
+    predictive_optimizer = LazySubsystem('predictive_optimizer')
+    alerting_system = LazySubsystem('alerting_system')
+    anomaly_detector = LazySubsystem('anomaly_detector')
+    tracing_system = LazySubsystem('tracing_system')
+
     def __init__(self, mode: ProcessorMode = ProcessorMode.FULL_AI):
         """Initialize server with specified processing mode"""
 
@@ -801,15 +690,20 @@ class OrfeasUnifiedServer:
              allow_credentials=True if cors_origins != '*' else False,
              expose_headers=["Content-Disposition"])
 
+        # Cross-worker shared state (locks, token buckets) - see shared_state.py
+        self.shared_state = LocalSharedState() if self.is_testing else get_shared_state()
+        self.socketio_message_queue = None if self.is_testing else socketio_message_queue()
+
         # [ORFEAS FIX 3] Initialize Basic Rate Limiter for DoS protection
-        self.rate_limiter = RateLimiter()
-        logger.info("[RATE-LIMITING] Rate limiter initialized (60 requests/minute per IP)")
+        self.rate_limiter = RateLimiter(shared_state=self.shared_state)
+        logger.info("[RATE-LIMITING] Rate limiter initialized (60 requests/minute per IP, shared across workers)")
 
         # Initialize SocketIO (disable in test mode to prevent request handling issues)
         if not self.is_testing:
             socketio_cors = cors_origins_list if cors_origins != '*' else "*"
-            self.socketio = SocketIO(self.app, cors_allowed_origins=socketio_cors, async_mode='threading')
-            logger.info("[OK] SocketIO initialized (async_mode=threading)")
+            self.socketio = SocketIO(self.app, cors_allowed_origins=socketio_cors, async_mode='threading',
+                                     message_queue=self.socketio_message_queue)
+            logger.info(f"[OK] SocketIO initialized (async_mode=threading, message_queue={'enabled' if self.socketio_message_queue else 'disabled'})")
 
             # [ORFEAS] PHASE 2.4: Initialize WebSocket Manager and Progress Tracker
             self.ws_manager = initialize_websocket_manager(self.socketio)
@@ -818,7 +712,8 @@ class OrfeasUnifiedServer:
         else:
             self.socketio = None
             self.ws_manager = None
-            self.progress_tracker = None
+            # Still needed for the SSE / long-poll job status endpoints
+            self.progress_tracker = initialize_progress_tracker(None)
             logger.info("[TEST MODE] SocketIO disabled - using standard Flask request handling")
 
         # Setup directories
@@ -833,28 +728,11 @@ class OrfeasUnifiedServer:
             self.device = torch.device("cpu")
             logger.info("[TEST MODE] Using CPU device, GPU manager disabled")
 
-        # [ORFEAS PHASE 1] Initialize Dynamic VRAM Manager for GPU optimization
-        if not self.is_testing:
-            try:
-                self.vram_manager = get_vram_manager()
-                logger.info(f"[ORFEAS] GPU Manager initialized: {self.vram_manager}")
-
-                # Log initial memory state
-                stats = self.vram_manager.get_memory_stats()
-                logger.info(f"[ORFEAS] Initial GPU stats: Total={stats.get('total_vram_gb', 'N/A'):.1f}GB, "
-                           f"Available={stats.get('available_gb', 'N/A'):.1f}GB, "
-                           f"Usage={stats.get('usage_percent', 'N/A'):.1f}%")
-
-                # Start monitoring thread
-                self.vram_manager.monitor_vram_usage(interval_seconds=5.0)
-                logger.info("[ORFEAS] GPU VRAM monitoring started (5s interval)")
-            except Exception as e:
-                logger.error(f"[ORFEAS] Failed to initialize GPU optimization: {e}")
-                traceback.print_exc()
-                self.vram_manager = None
-        else:
-            self.vram_manager = None
-            logger.info("[TEST MODE] VRAM Manager disabled")
+        # Optional subsystems: registered now, built on first use or warmed up
+        # in the background once the server is answering requests
+        self.subsystems = SubsystemRegistry()
+        self.agent_communication_init_pending = False
+        self.register_subsystems()
 
         # Initialize processors based on mode (skip model loading in test mode)
         if not self.is_testing:
@@ -870,56 +748,6 @@ class OrfeasUnifiedServer:
         self.job_queue = None  # Async job queue
         self.batch_processing_active = False
 
-        # [ORFEAS] ULTRA-PERFORMANCE OPTIMIZATION: Initialize quantum-level optimization
-        if not self.is_testing:
-            logger.info("[ORFEAS] Initializing Ultra-Performance Manager (100x Speed, 100x Accuracy, 10x Security)...")
-            try:
-                self.ultra_performance_manager = UltraPerformanceManager()
-                logger.info("[ORFEAS]  Ultra-Performance Manager initialized successfully")
-            except Exception as e:
-                logger.warning(f"[ORFEAS] Ultra-Performance Manager initialization failed: {e}")
-                self.ultra_performance_manager = None
-        else:
-            self.ultra_performance_manager = None
-            logger.info("[TEST MODE] Ultra-Performance Manager disabled")
-
-        # [ORFEAS] ENTERPRISE AGENT FRAMEWORK: Initialize multi-agent orchestration system
-        if not self.is_testing and ENTERPRISE_AGENTS_AVAILABLE:
-            logger.info("[ORFEAS] Initializing Enterprise Agent Framework with Communication System...")
-            try:
-                # Initialize communication system
-                self.agent_communication_system = get_agent_communication_system()
-
-                # Initialize enterprise agent orchestrator
-                self.enterprise_orchestrator = EnterpriseAgentOrchestrator()
-
-                # Initialize specialized agents
-                self.quality_agent = QualityAssessmentAgent()
-                self.workflow_agent = WorkflowOrchestrationAgent()
-                self.performance_agent = PerformanceOptimizationAgent()
-
-                # Register agents with orchestrator
-                self.enterprise_orchestrator.register_agent(self.quality_agent)
-                self.enterprise_orchestrator.register_agent(self.workflow_agent)
-                self.enterprise_orchestrator.register_agent(self.performance_agent)
-
-                # Store agent initialization for later async setup
-                self.agent_communication_init_pending = True
-
-                logger.info("[ORFEAS]  Enterprise Agent Framework initialized successfully")
-            except Exception as e:
-                logger.warning(f"[ORFEAS] Enterprise Agent Framework initialization failed: {e}")
-                self.enterprise_orchestrator = None
-                self.agent_communication_system = None
-                self.agent_communication_init_pending = False
-        else:
-            self.enterprise_orchestrator = None
-            self.agent_communication_system = None
-            self.agent_communication_init_pending = False
-            if self.is_testing:
-                logger.info("[TEST MODE] Enterprise Agent Framework disabled")
-            else:
-                logger.info("[ORFEAS] Enterprise Agent Framework not available")
         if not self.is_testing:
             logger.info("[ORFEAS] Batch processor will initialize after models load")
 
@@ -945,80 +773,6 @@ class OrfeasUnifiedServer:
             self.result_cache = {}  # Fallback to simple dict
             self.cache_enabled = os.getenv('DISABLE_RESULT_CACHE', '0') != '1'
 
-        # [ORFEAS PHASE 4] Initialize 99%+ Enterprise Optimization Components
-        # ====================================================================
-        # Tier 1: Essential Optimization (GPU, Dashboard, Cache, Load Tests)
-        if not self.is_testing:
-            logger.info("[ORFEAS PHASE 4] Initializing enterprise optimization tiers...")
-
-            # Initialize Advanced GPU Optimizer (Tier 1)
-            try:
-                self.gpu_optimizer = get_advanced_gpu_optimizer()
-                logger.info("[ORFEAS PHASE 4 Tier 1] Advanced GPU Optimizer initialized")
-            except Exception as e:
-                logger.warning(f"[ORFEAS PHASE 4 Tier 1] GPU Optimizer failed: {e}")
-                self.gpu_optimizer = None
-
-            # Initialize Real-Time Performance Dashboard (Tier 1)
-            try:
-                self.dashboard = get_dashboard()
-                logger.info("[ORFEAS PHASE 4 Tier 1] Real-Time Dashboard initialized")
-            except Exception as e:
-                logger.warning(f"[ORFEAS PHASE 4 Tier 1] Dashboard failed: {e}")
-                self.dashboard = None
-
-            # Initialize Distributed Cache Manager (Tier 1)
-            try:
-                redis_nodes = os.getenv('REDIS_NODES', '').split(',') if os.getenv('REDIS_NODES') else ['localhost:6379']
-                self.cache_manager = get_distributed_cache(redis_nodes)
-                logger.info("[ORFEAS PHASE 4 Tier 1] Distributed Cache Manager initialized")
-            except Exception as e:
-                logger.warning(f"[ORFEAS PHASE 4 Tier 1] Cache Manager failed: {e}")
-                self.cache_manager = None
-
-            # Initialize Predictive Performance Optimizer (Tier 2)
-            try:
-                self.predictive_optimizer = get_predictive_optimizer()
-                logger.info("[ORFEAS PHASE 4 Tier 2] Predictive Performance Optimizer initialized")
-            except Exception as e:
-                logger.warning(f"[ORFEAS PHASE 4 Tier 2] Predictive Optimizer failed: {e}")
-                self.predictive_optimizer = None
-
-            # Initialize Advanced Alerting System (Tier 2)
-            try:
-                self.alerting_system = get_alerting_system()
-                logger.info("[ORFEAS PHASE 4 Tier 2] Advanced Alerting System initialized with 10 pre-configured alerts")
-            except Exception as e:
-                logger.warning(f"[ORFEAS PHASE 4 Tier 2] Alerting System failed: {e}")
-                self.alerting_system = None
-
-            # Initialize ML Anomaly Detector (Tier 3)
-            try:
-                self.anomaly_detector = get_anomaly_detector()
-                logger.info("[ORFEAS PHASE 4 Tier 3] ML Anomaly Detector initialized (5 algorithms, 95%+ accuracy)")
-            except Exception as e:
-                logger.warning(f"[ORFEAS PHASE 4 Tier 3] Anomaly Detector failed: {e}")
-                self.anomaly_detector = None
-
-            # Initialize Distributed Tracing System (Tier 3)
-            try:
-                self.tracing_system = get_tracing_system()
-                logger.info("[ORFEAS PHASE 4 Tier 3] Distributed Tracing System initialized (<5% overhead)")
-            except Exception as e:
-                logger.warning(f"[ORFEAS PHASE 4 Tier 3] Tracing System failed: {e}")
-                self.tracing_system = None
-
-            logger.info("[ORFEAS PHASE 4] ✅ All enterprise optimization tiers initialized")
-        else:
-            logger.info("[TEST MODE] Phase 4 enterprise components disabled")
-            self.gpu_optimizer = None
-            self.dashboard = None
-            self.cache_manager = None
-            self.predictive_optimizer = None
-            self.alerting_system = None
-            self.anomaly_detector = None
-            self.tracing_system = None
-
         # [ORFEAS] ORFEAS PHASE 2.1: Advanced STL Processor for professional 3D printing optimization
 
         if not self.is_testing:
@@ -1064,17 +818,33 @@ class OrfeasUnifiedServer:
             self.quality_stats = None
             logger.info("[TEST MODE] Quality validator disabled")
 
-        # Job tracking
-        self.job_progress = {}
-        self.processing_jobs = {}  # [FIX] Added missing processing_jobs dictionary for text-to-image tracking
-        self.active_jobs = set()
+        # Job tracking - persistent store shared by all workers (job_store.py)
+        # Every write is pushed to WebSocket, SSE and long-poll clients via the
+        # change subscription; the change feed also forwards writes made by
+        # sibling workers (to WebSocket only without a Socket.IO message queue).
+        self.job_store = InMemoryJobStore() if self.is_testing else get_job_store()
+        # Content-addressed thumbnails / mesh previews for the gallery pages
+        self.preview_service = get_preview_service()
+        # Speculative preprocessing of uploads while the user picks options (opt-in)
+        self.prefetcher = get_prefetcher() if prefetch_enabled() and not self.is_testing else None
+        if self.prefetcher:
+            self.register_prefetch_stages()
+        self.job_store.subscribe(self.publish_job_update, with_version=True)
+        if not self.is_testing:
+            self.job_store.start_change_feed()
+        self.job_lock_ttl = float(os.getenv('JOB_LOCK_TTL_SECONDS', '900'))
+        # Upper bound on /api/job-status?wait= long-polls (0 = plain polling)
+        self.job_status_max_wait = float(os.getenv('JOB_STATUS_MAX_WAIT', '30'))
+        # /api/job-events holds a worker per stream; gunicorn.conf.py turns it off for sync workers
+        self.job_events_enabled = os.getenv('JOB_EVENTS_STREAMING', 'true').lower() == 'true'
+        self._job_lock_tokens = {}
 
         # Initialize rate limiter if enabled (skip in test mode)
         self.rate_limiting_enabled = os.getenv('ENABLE_RATE_LIMITING', 'false').lower() == 'true' and not self.is_testing
         if self.rate_limiting_enabled:
             self.rate_limiter = get_rate_limiter(
-                max_requests=int(os.getenv('RATE_LIMIT_PER_MINUTE', '60')),
-                window_seconds=60
+                requests_per_minute=float(os.getenv('RATE_LIMIT_PER_MINUTE', '60')),
+                shared_state=self.shared_state
             )
             logger.info("[OK] Rate limiting enabled")
         else:
@@ -1109,8 +879,119 @@ class OrfeasUnifiedServer:
         if self.socketio:
             self.setup_socketio_handlers()
 
+        if not self.is_testing and os.getenv('SUBSYSTEM_WARMUP', 'true').lower() != 'false':
+            self.subsystems.warmup()
+
         logger.info("[OK] ORFEAS Unified Server initialization complete")
 
+    def claim_job(self, job_id):
+        """Claim a job for this worker (leased lock + active flag)
+
+        The lease expires after JOB_LOCK_TTL_SECONDS, so a crashed worker
+        cannot block a job forever.
+
+        Returns:
+            False if any worker already holds the job
+        """
+        token = self.shared_state.acquire_lock(f"job:{job_id}", self.job_lock_ttl)
+        if token is None:
+            return False
+        self._job_lock_tokens[job_id] = token
+        self.job_store.release(job_id)  # the previous holder's lock expired: its claim is stale too
+        self.job_store.claim(job_id, lease_seconds=self.job_lock_ttl)
+        return True
+
+    def release_job(self, job_id):
+        """Release a job claimed by this worker with claim_job (no-op otherwise)"""
+        token = self._job_lock_tokens.pop(job_id, None)
+        if token is None:
+            return
+        self.job_store.release(job_id)
+        self.shared_state.release_lock(f"job:{job_id}", token)
+
+    def _precompress_job_output(self, job_id):
+        """Write gzip/zstd variants of a completed job's model in the background"""
+        job_data = self.job_store.get(job_id) or {}
+        output_file = job_data.get('output_file')
+        if output_file and job_data.get('status') in ('completed', 'ultra_completed'):
+            output_path = resolve_artifact(self.outputs_dir, job_id, output_file)
+            if output_path is not None:
+                precompress_async(output_path)
+                if output_path.suffix.lower() in MESH_SUFFIXES:
+                    self.preview_service.schedule_mesh_preview(output_path)
+
+    def _build_babylon_glb(self, source_path, glb_path, quantize, compress, lod_levels):
+        """Convert a generated model to a Babylon.js GLB (atomic write, LODs via the STL simplifier)"""
+        import trimesh
+        model = trimesh.load(str(source_path), force='mesh')
+        vertices = np.asarray(model.vertices)
+        faces = np.asarray(model.faces)
+
+        def simplify(lod_vertices, lod_faces, target_faces):
+            simplified, _ = self.stl_processor.simplify_mesh(
+                trimesh.Trimesh(lod_vertices, lod_faces, process=False),
+                target_faces=target_faces
+            )
+            return simplified.vertices, simplified.faces
+
+        glb = get_babylon_optimizer().export_glb(
+            vertices, faces,
+            quantize=quantize,
+            compress=compress,
+            simplifier=simplify if lod_levels and self.stl_processor is not None else None,
+            lod_ratios=tuple(0.5 ** (level + 1) for level in range(lod_levels))
+        )
+        tmp_path = glb_path.with_name(f"{glb_path.name}.{os.getpid()}.tmp")
+        tmp_path.write_bytes(glb)
+        os.replace(tmp_path, glb_path)
+        precompress_async(glb_path)
+
+    def register_prefetch_stages(self):
+        """Preprocessing stages the prefetcher runs after each upload
+
+        Each stage mirrors the first step of a generation path and returns
+        None when that path is not in use (models still loading, other mode).
+        Stages get the stored upload's path and decode it the way the inline
+        path does; the validator's decoded image is flattened onto white
+        and would give different results under the same digest.
+        """
+        def foreground(path, digest):
+            processor = self.processor_3d if getattr(self, 'models_ready', False) else None
+            if getattr(processor, 'rembg', None) is None or not hasattr(processor, 'prepare_image'):
+                return None
+            with Image.open(path) as img:
+                img.load()
+                return processor.prepare_image(img)
+
+        def depth(path, digest):
+            estimator = getattr(self, 'depth_estimator', None)
+            if self.mode != ProcessorMode.POWERFUL_3D or not ADVANCED_3D_AVAILABLE or estimator is None:
+                return None
+            with Image.open(path) as img:
+                image_array = self._powerful_depth_input(img)
+            return estimator.estimate_depth(image_array, digest=digest, variant=POWERFUL_DEPTH_VARIANT)
+
+        self.prefetcher.register_stage('foreground', foreground)
+        self.prefetcher.register_stage('depth', depth)
+
+    def take_prefetched(self, job_id, input_path, stage):
+        """Prefetched ``stage`` result for a job's upload (None: compute inline)"""
+        if not self.prefetcher:
+            return None
+        value = self.prefetcher.take(self._get_image_hash(Path(input_path)), stage)
+        self.job_store.update(job_id, {"prefetch": "hit" if value is not None else "miss"})
+        return value
+
+    def publish_job_update(self, job_id, job_data, version, remote):
+        """Job store change subscriber - forwards job state to WebSocket and SSE / long-poll clients"""
+        if not (remote and self.socketio_message_queue):
+            # The message queue already fans out the writing worker's emit
+            self.emit_event('job_update', {'job_id': job_id, **job_data})
+        if self.progress_tracker:
+            self.progress_tracker.publish_job_state(job_id, {'job_id': job_id, **job_data},
+                                                    terminal=is_terminal_status(job_data.get('status')),
+                                                    version=version)
+
     def emit_event(self, event_name, data):
         """
         [TEST MODE FIX] Safe event emission that only runs when SocketIO is enabled
@@ -1119,6 +1000,85 @@ class OrfeasUnifiedServer:
         if self.socketio:
             self.socketio.emit(event_name, data)
 
+    def register_subsystems(self):
+        """Register the optional subsystems with their lazy factories
+
+        Nothing here imports or builds a subsystem. Warmup subsystems load in
+        the background after __init__; the rest load on first access through
+        their LazySubsystem attribute. SUBSYSTEMS_DISABLED turns any of them
+        off (they are then never imported).
+        """
+        register = self.subsystems.register
+        enabled = not self.is_testing
+
+        def vram_manager():
+            from gpu_optimization_advanced import get_vram_manager
+            manager = get_vram_manager()
+            stats = manager.get_memory_stats()
+            logger.info(f"[ORFEAS] Initial GPU stats: Total={stats.get('total_vram_gb', 'N/A'):.1f}GB, "
+                       f"Available={stats.get('available_gb', 'N/A'):.1f}GB, "
+                       f"Usage={stats.get('usage_percent', 'N/A'):.1f}%")
+            manager.monitor_vram_usage(interval_seconds=5.0)
+            logger.info("[ORFEAS] GPU VRAM monitoring started (5s interval)")
+            return manager
+
+        def ultra_performance():
+            from ultra_performance_integration import UltraPerformanceManager
+            return UltraPerformanceManager()
+
+        def agent_communication():
+            from agent_communication import get_agent_communication_system
+            return get_agent_communication_system()
+
+        def enterprise_agents():
+            from enterprise_agent_framework import (
+                EnterpriseAgentOrchestrator,
+                QualityAssessmentAgent,
+                WorkflowOrchestrationAgent,
+                PerformanceOptimizationAgent
+            )
+            orchestrator = EnterpriseAgentOrchestrator()
+            orchestrator.register_agent(QualityAssessmentAgent())
+            orchestrator.register_agent(WorkflowOrchestrationAgent())
+            orchestrator.register_agent(PerformanceOptimizationAgent())
+            # Endpoint/handler registration runs async from run()
+            self.agent_communication_init_pending = True
+            return orchestrator
+
+        def distributed_cache():
+            from distributed_cache_manager import get_distributed_cache
+            redis_nodes = os.getenv('REDIS_NODES', '').split(',') if os.getenv('REDIS_NODES') else ['localhost:6379']
+            return get_distributed_cache(redis_nodes)
+
+        def getter(module, name):
+            return lambda: getattr(importlib.import_module(module), name)()
+
+        register('vram_manager', vram_manager, modules=('gpu_optimization_advanced',),
+                 warmup=True, enabled=enabled, description="Dynamic VRAM manager")
+        register('ultra_performance', ultra_performance, modules=('ultra_performance_integration',),
+                 warmup=True, enabled=enabled, description="Ultra-performance manager")
+        register('agent_communication', agent_communication, modules=('agent_communication',),
+                 warmup=True, enabled=enabled, description="Agent message bus and discovery")
+        register('enterprise_agents', enterprise_agents, modules=('enterprise_agent_framework',),
+                 depends=('agent_communication',), warmup=True, enabled=enabled,
+                 description="Enterprise agent orchestrator")
+
+        # Phase 4 tiers: only built when their endpoints are used
+        register('gpu_optimizer', getter('advanced_gpu_optimizer', 'get_advanced_gpu_optimizer'),
+                 modules=('advanced_gpu_optimizer',), enabled=enabled, description="Tier 1 GPU optimizer")
+        register('dashboard', getter('performance_dashboard_realtime', 'get_dashboard'),
+                 modules=('performance_dashboard_realtime',), enabled=enabled, description="Tier 1 dashboard")
+        register('cache_manager', distributed_cache, modules=('distributed_cache_manager',),
+                 enabled=enabled, description="Tier 1 distributed cache")
+        register('predictive_optimizer', getter('predictive_performance_optimizer', 'get_predictive_optimizer'),
+                 modules=('predictive_performance_optimizer',), enabled=enabled, description="Tier 2 predictions")
+        register('alerting_system', getter('alerting_system', 'get_alerting_system'),
+                 modules=('alerting_system',), enabled=enabled, description="Tier 2 alerting")
+        register('anomaly_detector', getter('ml_anomaly_detector', 'get_anomaly_detector'),
+                 modules=('ml_anomaly_detector',), enabled=enabled, description="Tier 3 anomaly detection")
+        register('tracing_system', getter('distributed_tracing', 'get_tracing_system'),
+                 modules=('distributed_tracing',), enabled=enabled, description="Tier 3 tracing")
+
     def setup_directories(self):
         """Setup required directories"""
         self.base_dir = Path(__file__).parent
@@ -1237,10 +1197,15 @@ class OrfeasUnifiedServer:
                 logger.error(f"[FAIL] Processor initialization failed: {e}")
                 self.models_loading = False
                 self.models_ready = False
+                raise
 
-        # Start background loading
+            return self.processor_3d
+
+        # Loaded by the subsystem warmup pool, in parallel with the other
+        # warmup subsystems (started at the end of __init__)
         logger.info("[FAST] ORFEAS SPEED MODE: Starting server immediately, loading models in background...")
-        threading.Thread(target=load_models_background, daemon=True, name="ModelLoader").start()
+        self.subsystems.register('models', load_models_background, warmup=True,
+                                 description=f"3D processor ({self.mode.value})")
         logger.info("[OK] Processors will load in background (~20 seconds)")
 
     def initialize_llm_system(self):
@@ -1313,6 +1278,12 @@ class OrfeasUnifiedServer:
             return
 
         try:
+            from agent_communication import (
+                AgentEndpoint,
+                MessageType,
+                TaskRequestHandler,
+                CoordinationRequestHandler
+            )
             logger.info("[ORFEAS] Setting up Agent Communication System...")
 
             # Initialize communication for main orchestrator
@@ -1411,7 +1382,6 @@ class OrfeasUnifiedServer:
             logger.warning(f"[LLM] Failed to register Local LLM routes: {e}")
 
         @self.app.route('/')
-        @track_request_metrics('/')
         def home():
             """Serve main ORFEAS portal"""
             # [ORFEAS FIX] Serve orfeas-studio.html as homepage (portal doesn't exist)
@@ -1421,13 +1391,11 @@ class OrfeasUnifiedServer:
             return send_file(self.workspace_dir / 'orfeas-studio.html')
 
         @self.app.route('/studio')
-        @track_request_metrics('/studio')
         def studio():
             """Serve ORFEAS studio"""
             return send_file(self.workspace_dir / 'orfeas-studio.html')
 
         @self.app.route('/<path:filename>')
-        @track_request_metrics('/static')
         def serve_static(filename):
             """Serve static files"""
             return send_from_directory(self.workspace_dir, filename)
@@ -1445,14 +1413,13 @@ class OrfeasUnifiedServer:
             return jsonify({"test": "works"})
 
         @self.app.route('/api/health', methods=['GET'])
-        @track_request_metrics('/api/health')
         def health_check():
             """Health check endpoint"""
             # [ORFEAS FIX 3] Check rate limiting (safe check)
             try:
                 if hasattr(self, 'rate_limiter') and self.rate_limiter:
                     client_ip = request.remote_addr
-                    if self.rate_limiter.is_rate_limited(client_ip):
+                    if self.rate_limiter.is_rate_limited(client_ip, endpoint=request.endpoint):
                         logger.warning(f"[RATE-LIMIT] Blocking request from {client_ip} - exceeded 60 req/min")
                         return jsonify({"error": "Rate limit exceeded"}), 429
             except Exception as e:
@@ -1474,10 +1441,13 @@ class OrfeasUnifiedServer:
                 "timestamp": datetime.now().isoformat(),
                 "mode": self.mode.value,
                 "gpu_info": gpu_info,
-                "active_jobs": len(self.active_jobs),
+                "active_jobs": self.job_store.active_count(),
                 "models_status": model_status,  # [FAST] NEW: loading/ready/not_ready
                 "processor": self.processor_3d.get_model_info() if (hasattr(self, 'processor_3d') and self.processor_3d) else {},
-                "capabilities": self.get_capabilities()
+                "capabilities": self.get_capabilities(),
+                "subsystems": self.subsystems.status(),  # per-subsystem readiness, never triggers a load
+                "warmup_complete": self.subsystems.warmup_complete(),
+                "prefetch": self.prefetcher.stats() if self.prefetcher else {"enabled": False}
             })
 
         # NOTE: /health-detailed endpoint already exists in monitoring.py
@@ -1485,7 +1455,6 @@ class OrfeasUnifiedServer:
 
         # [ORFEAS PHASE 6C] Cache Management Endpoints
         @self.app.route('/api/cache/stats', methods=['GET'])
-        @track_request_metrics('/api/cache/stats')
         def get_cache_stats():
             """Get cache statistics and performance metrics"""
             try:
@@ -1501,7 +1470,6 @@ class OrfeasUnifiedServer:
                 return jsonify({"error": str(e)}), 500
 
         @self.app.route('/api/cache/config', methods=['GET', 'POST'])
-        @track_request_metrics('/api/cache/config')
         def cache_config():
             """Get or update cache configuration"""
             try:
@@ -1535,7 +1503,6 @@ class OrfeasUnifiedServer:
                 return jsonify({"error": str(e)}), 500
 
         @self.app.route('/api/cache/clear', methods=['POST'])
-        @track_request_metrics('/api/cache/clear')
         def clear_cache():
             """Clear all cache entries"""
             try:
@@ -1551,7 +1518,6 @@ class OrfeasUnifiedServer:
                 return jsonify({"error": str(e)}), 500
 
         @self.app.route('/api/cache/entries', methods=['GET'])
-        @track_request_metrics('/api/cache/entries')
         def get_cache_entries():
             """Get list of cached entries"""
             try:
@@ -1570,7 +1536,6 @@ class OrfeasUnifiedServer:
 
         # [ORFEAS PHASE 1] GPU Stats Endpoint - Real-time GPU memory monitoring
         @self.app.route('/api/v1/gpu/stats', methods=['GET'])
-        @track_request_metrics('/api/v1/gpu/stats')
         def get_gpu_stats():
             """Get real-time GPU memory statistics (ORFEAS Phase 1)"""
             try:
@@ -1588,8 +1553,8 @@ class OrfeasUnifiedServer:
                 queue_depth = 0
                 if hasattr(self, 'job_queue') and self.job_queue and hasattr(self.job_queue, 'jobs'):
                     queue_depth = len(self.job_queue.jobs)
-                elif hasattr(self, 'active_jobs'):
-                    queue_depth = len(self.active_jobs)
+                elif hasattr(self, 'job_store'):
+                    queue_depth = self.job_store.active_count()
 
                 # Get recommendations
                 recommended_precision = vram_mgr.recommend_precision_mode().value
@@ -1649,23 +1614,30 @@ class OrfeasUnifiedServer:
 
         # Phase 4 Status Endpoint
         @self.app.route('/api/phase4/status', methods=['GET'])
-        @track_request_metrics('/api/phase4/status')
         def phase4_status():
             """Get status of all Phase 4 components (Tier 1, 2, 3)"""
             try:
+                def component(name):
+                    # Reported from the registry: a status probe never loads a tier
+                    return {
+                        'ready': "operational",
+                        'loading': "loading",
+                        'registered': "idle",
+                    }.get(self.subsystems.state(name), "unavailable")
+
                 status = {
                     "tier1": {
-                        "gpu_optimizer": "operational" if hasattr(self, 'gpu_optimizer') and self.gpu_optimizer else "unavailable",
-                        "dashboard": "operational" if hasattr(self, 'dashboard') and self.dashboard else "unavailable",
-                        "cache_manager": "operational" if hasattr(self, 'cache_manager') and self.cache_manager else "unavailable"
+                        "gpu_optimizer": component('gpu_optimizer'),
+                        "dashboard": component('dashboard'),
+                        "cache_manager": component('cache_manager')
                     },
                     "tier2": {
-                        "predictive_optimizer": "operational" if hasattr(self, 'predictive_optimizer') and self.predictive_optimizer else "unavailable",
-                        "alerting_system": "operational" if hasattr(self, 'alerting_system') and self.alerting_system else "unavailable"
+                        "predictive_optimizer": component('predictive_optimizer'),
+                        "alerting_system": component('alerting_system')
                     },
                     "tier3": {
-                        "anomaly_detector": "operational" if hasattr(self, 'anomaly_detector') and self.anomaly_detector else "unavailable",
-                        "tracing_system": "operational" if hasattr(self, 'tracing_system') and self.tracing_system else "unavailable"
+                        "anomaly_detector": component('anomaly_detector'),
+                        "tracing_system": component('tracing_system')
                     }
                 }
 
@@ -1682,7 +1654,6 @@ class OrfeasUnifiedServer:
 
         # GPU Optimization Endpoints (Tier 1)
         @self.app.route('/api/phase4/gpu/profile', methods=['GET'])
-        @track_request_metrics('/api/phase4/gpu/profile')
         def gpu_profile():
             """Get detailed GPU memory profile"""
             try:
@@ -1703,7 +1674,6 @@ class OrfeasUnifiedServer:
                 return jsonify({"error": str(e)}), 500
 
         @self.app.route('/api/phase4/gpu/cleanup', methods=['POST'])
-        @track_request_metrics('/api/phase4/gpu/cleanup')
         def gpu_cleanup():
             """Trigger aggressive GPU memory cleanup"""
             try:
@@ -1725,7 +1695,6 @@ class OrfeasUnifiedServer:
 
         # Dashboard Endpoints (Tier 1)
         @self.app.route('/api/phase4/dashboard/summary', methods=['GET'])
-        @track_request_metrics('/api/phase4/dashboard/summary')
         def dashboard_summary():
             """Get dashboard summary with real-time metrics"""
             try:
@@ -1737,7 +1706,7 @@ class OrfeasUnifiedServer:
                 return jsonify({
                     "status": "success",
                     "metrics": summary.get('metrics', {}),
-                    "active_requests": len(self.active_jobs) if hasattr(self, 'active_jobs') else 0,
+                    "active_requests": self.job_store.active_count() if hasattr(self, 'job_store') else 0,
                     "timestamp": datetime.now().isoformat()
                 })
             except Exception as e:
@@ -1746,7 +1715,6 @@ class OrfeasUnifiedServer:
 
         # Cache Management Endpoints (Tier 1)
         @self.app.route('/api/phase4/cache/stats', methods=['GET'])
-        @track_request_metrics('/api/phase4/cache/stats')
         def cache_stats():
             """Get cache statistics and performance metrics"""
             try:
@@ -1765,7 +1733,6 @@ class OrfeasUnifiedServer:
                 return jsonify({"error": str(e)}), 500
 
         @self.app.route('/api/phase4/cache/clear', methods=['POST'])
-        @track_request_metrics('/api/phase4/cache/clear')
         def cache_clear():
             """Clear all cache entries"""
             try:
@@ -1786,7 +1753,6 @@ class OrfeasUnifiedServer:
 
         # Predictive Optimization Endpoints (Tier 2)
         @self.app.route('/api/phase4/predictions', methods=['GET'])
-        @track_request_metrics('/api/phase4/predictions')
         def predictions():
             """Get performance predictions with trend analysis"""
             try:
@@ -1806,7 +1772,6 @@ class OrfeasUnifiedServer:
 
         # Alerting System Endpoints (Tier 2)
         @self.app.route('/api/phase4/alerts/active', methods=['GET'])
-        @track_request_metrics('/api/phase4/alerts/active')
         def alerts_active():
             """Get all active alerts"""
             try:
@@ -1826,7 +1791,6 @@ class OrfeasUnifiedServer:
                 return jsonify({"error": str(e)}), 500
 
         @self.app.route('/api/phase4/alerts/history', methods=['GET'])
-        @track_request_metrics('/api/phase4/alerts/history')
         def alerts_history():
             """Get alert history (last 100 alerts)"""
             try:
@@ -1846,7 +1810,6 @@ class OrfeasUnifiedServer:
                 return jsonify({"error": str(e)}), 500
 
         @self.app.route('/api/phase4/alerts/<alert_id>/acknowledge', methods=['POST'])
-        @track_request_metrics('/api/phase4/alerts/acknowledge')
         def alert_acknowledge(alert_id):
             """Acknowledge an active alert"""
             try:
@@ -1870,7 +1833,6 @@ class OrfeasUnifiedServer:
 
         # Anomaly Detection Endpoints (Tier 3)
         @self.app.route('/api/phase4/anomalies', methods=['GET'])
-        @track_request_metrics('/api/phase4/anomalies')
         def anomalies():
             """Get current anomalies detected (5 algorithms)"""
             try:
@@ -1892,7 +1854,6 @@ class OrfeasUnifiedServer:
 
         # Distributed Tracing Endpoints (Tier 3)
         @self.app.route('/api/phase4/traces', methods=['GET'])
-        @track_request_metrics('/api/phase4/traces')
         def traces():
             """Get list of recent traces"""
             try:
@@ -1912,7 +1873,6 @@ class OrfeasUnifiedServer:
                 return jsonify({"error": str(e)}), 500
 
         @self.app.route('/api/phase4/traces/<trace_id>', methods=['GET'])
-        @track_request_metrics('/api/phase4/traces/detail')
         def trace_detail(trace_id):
             """Get detailed trace information with all spans"""
             try:
@@ -1945,7 +1905,6 @@ class OrfeasUnifiedServer:
 
         # [ORFEAS] PHASE 2: Performance monitoring endpoints
         @self.app.route('/api/performance/summary', methods=['GET'])
-        @track_request_metrics('/api/performance/summary')
         def performance_summary():
             """Get performance profiling summary"""
             try:
@@ -1958,7 +1917,6 @@ class OrfeasUnifiedServer:
                 return jsonify({"error": str(e)}), 500
 
         @self.app.route('/api/performance/recommendations', methods=['GET'])
-        @track_request_metrics('/api/performance/recommendations')
         def performance_recommendations():
             """Get performance optimization recommendations"""
             try:
@@ -1971,7 +1929,6 @@ class OrfeasUnifiedServer:
                 return jsonify({"error": str(e)}), 500
 
         @self.app.route('/api/gpu/status', methods=['GET'])
-        @track_request_metrics('/api/gpu/status')
         def gpu_status():
             """Get GPU optimizer status and recommendations"""
             try:
@@ -1998,7 +1955,6 @@ class OrfeasUnifiedServer:
                 return jsonify({"error": str(e)}), 500
 
         @self.app.route('/api/ultra-performance/status', methods=['GET'])
-        @track_request_metrics('/api/ultra-performance/status')
         def ultra_performance_status():
             """Get ultra-performance optimization status and metrics"""
             try:
@@ -2037,7 +1993,6 @@ class OrfeasUnifiedServer:
                 return jsonify({"error": str(e)}), 500
 
         @self.app.route('/api/ultra-performance/config', methods=['GET', 'POST'])
-        @track_request_metrics('/api/ultra-performance/config')
         def ultra_performance_config():
             """Get or update ultra-performance configuration"""
             try:
@@ -2091,7 +2046,6 @@ class OrfeasUnifiedServer:
                 return jsonify({"error": str(e)}), 500
 
         @self.app.route('/api/ultra-performance/enable', methods=['POST'])
-        @track_request_metrics('/api/ultra-performance/enable')
         def enable_ultra_performance():
             """Enable ultra-performance optimization"""
             try:
@@ -2119,7 +2073,6 @@ class OrfeasUnifiedServer:
                 return jsonify({"error": str(e)}), 500
 
         @self.app.route('/api/ultra-performance/disable', methods=['POST'])
-        @track_request_metrics('/api/ultra-performance/disable')
         def disable_ultra_performance():
             """Disable ultra-performance optimization"""
             try:
@@ -2147,7 +2100,6 @@ class OrfeasUnifiedServer:
         # =====================================================================
 
         @self.app.route('/api/agents/status', methods=['GET'])
-        @track_request_metrics('/api/agents/status')
         def agents_status():
             """Get enterprise agent framework status"""
             try:
@@ -2177,7 +2129,6 @@ class OrfeasUnifiedServer:
                 return jsonify({"error": str(e)}), 500
 
         @self.app.route('/api/agents/submit-task', methods=['POST'])
-        @track_request_metrics('/api/agents/submit-task')
         def submit_agent_task():
             """Submit task to enterprise agent framework"""
             try:
@@ -2192,6 +2143,7 @@ class OrfeasUnifiedServer:
                     return jsonify({"error": "No JSON data provided"}), 400
 
                 # Create agent task
+                from enterprise_agent_framework import AgentTask
                 task = AgentTask(
                     task_id=str(uuid.uuid4()),
                     task_type=data.get('task_type', 'general'),
@@ -2215,7 +2167,6 @@ class OrfeasUnifiedServer:
                 return jsonify({"error": str(e)}), 500
 
         @self.app.route('/api/agents/intelligent-generation', methods=['POST'])
-        @track_request_metrics('/api/agents/intelligent-generation')
         def intelligent_agent_generation():
             """Intelligent 3D generation using enterprise agent coordination"""
             try:
@@ -2243,6 +2194,7 @@ class OrfeasUnifiedServer:
                 accuracy_priority = request.form.get('accuracy_priority', 'false').lower() == 'true'
 
                 # Create intelligent generation task
+                from enterprise_agent_framework import AgentTask
                 task = AgentTask(
                     task_id=str(uuid.uuid4()),
                     task_type='intelligent_3d_generation',
@@ -2284,7 +2236,6 @@ class OrfeasUnifiedServer:
                 return jsonify({"error": str(e)}), 500
 
         @self.app.route('/api/agents/coordination/status', methods=['GET'])
-        @track_request_metrics('/api/agents/coordination/status')
         def get_coordination_status():
             """Get agent coordination status"""
             try:
@@ -2315,7 +2266,6 @@ class OrfeasUnifiedServer:
                 return jsonify({"error": str(e)}), 500
 
         @self.app.route('/api/agents/communication/message-stats', methods=['GET'])
-        @track_request_metrics('/api/agents/communication/message-stats')
         def get_message_stats():
             """Get agent communication message statistics"""
             try:
@@ -2340,7 +2290,6 @@ class OrfeasUnifiedServer:
         # =====================================================================
 
         @self.app.route('/api/models-info', methods=['GET'])
-        @track_request_metrics('/api/models-info')
         def models_info():
             """Get model information"""
             try:
@@ -2355,7 +2304,6 @@ class OrfeasUnifiedServer:
                 return jsonify({"error": str(e)}), 500
 
         @self.app.route('/api/upload-image', methods=['POST'])
-        @track_request_metrics('/api/upload-image')
         def upload_image():
             """Upload image for 3D conversion"""
             import time
@@ -2432,7 +2380,7 @@ class OrfeasUnifiedServer:
                 log_timing("PRODUCTION_MODE_START")
                 if self.rate_limiting_enabled and self.rate_limiter:
                     client_ip = request.remote_addr
-                    is_allowed, error_msg = self.rate_limiter.is_allowed(client_ip)
+                    is_allowed, error_msg = self.rate_limiter.is_allowed(client_ip, endpoint=request.endpoint)
                     if not is_allowed:
                         return jsonify({"error": error_msg}), 429
 
@@ -2444,9 +2392,9 @@ class OrfeasUnifiedServer:
                     return jsonify({"error": "No file selected"}), 400
 
                 # [ORFEAS SECURITY] Enhanced 6-layer validation (Priority #2 Feature)
-                # Replaces basic FileUploadValidator with comprehensive security checks
+                # Single read + single decode; the result is reused for saving, hashing and analysis
                 enhanced_validator = get_enhanced_validator()
-                is_valid, error_msg, sanitized_image = enhanced_validator.validate_image(file)
+                is_valid, error_msg, validated = enhanced_validator.validate_image_upload(file)
 
                 if not is_valid:
                     # [SECURITY] Log blocked attempt with client IP
@@ -2461,10 +2409,7 @@ class OrfeasUnifiedServer:
                 # Validation passed - log success
                 logger.info(f"[SECURITY] ÃƒÂ¢Ã…â€œÃ¢â‚¬Â¦ Image validation passed (all 6 layers) | Filename: {file.filename}")
 
-                # Reset file stream and get file size for logging
-                file.seek(0, 2)  # Seek to end
-                file_size = file.tell()
-                file.seek(0)  # Seek back to start
+                file_size = len(validated.data)
 
                 # Generate unique filename using industry best practices
                 job_id = str(uuid.uuid4())
@@ -2475,13 +2420,20 @@ class OrfeasUnifiedServer:
                     include_uuid=False    # job_id already provides uniqueness
                 )
                 file_path = self.uploads_dir / unique_filename
-                file.save(str(file_path))
-
-                # Analyze image
-                image_info = self.analyze_image(file_path)
-
-                # Generate preview URL
+                # Metadata-stripped bytes; the validator's hash seeds the result-cache key
+                file_path.write_bytes(validated.data)
+                record_content_hash(file_path, validated.sha256)
+                # Thumbnails from the already-decoded image, off the request path
+                self.preview_service.schedule_thumbnails(validated.image, validated.sha256)
+                # Start generation preprocessing before the user asks for it (prefetch=0 opts out)
+                prefetching = (self.prefetcher is not None and request.form.get('prefetch', '1') != '0'
+                               and self.prefetcher.schedule(job_id, validated.sha256, file_path))
+
+                image_info = validated.info
+
+                # Generate preview URLs (the thumbnail URL is pinned to the content hash)
                 preview_url = f"/api/preview/{unique_filename}"
+                thumbnail_url = f"{preview_url}?size=256&v={validated.sha256[:16]}"
 
                 # [SECURITY FIX] ORFEAS: Sanitize original filename for response
                 sanitized_original = secure_filename(file.filename)
@@ -2493,7 +2445,9 @@ class OrfeasUnifiedServer:
                     "filename": unique_filename,
                     "original_filename": sanitized_original,
                     "preview_url": preview_url,
+                    "thumbnail_url": thumbnail_url,
                     "status": "uploaded",
+                    "prefetching": bool(prefetching),
                     "image_info": image_info
                 })
 
@@ -2504,7 +2458,6 @@ class OrfeasUnifiedServer:
                 return jsonify({"error": "Upload failed"}), 500
 
         @self.app.route('/api/text-to-image', methods=['POST'])
-        @track_request_metrics('/api/text-to-image')
         def text_to_image():
             """Generate image from text prompt"""
             try:
@@ -2539,7 +2492,7 @@ class OrfeasUnifiedServer:
                 # Rate limiting check
                 if self.rate_limiting_enabled and self.rate_limiter:
                     client_ip = request.remote_addr
-                    is_allowed, error_msg = self.rate_limiter.is_allowed(client_ip)
+                    is_allowed, error_msg = self.rate_limiter.is_allowed(client_ip, endpoint=request.endpoint)
                     if not is_allowed:
                         return jsonify({"error": error_msg}), 429
 
@@ -2573,64 +2526,33 @@ class OrfeasUnifiedServer:
                     "prompt": prompt,
                     "style": style
                 }
-                self.processing_jobs[job_id] = initial_job_data
-                self.job_progress[job_id] = initial_job_data
+                self.job_store.put(job_id, initial_job_data)
 
                 # Start async generation
                 @track_generation_metrics('text-to-image', 'ultimate-engine')
                 def process_text_to_image():
                     try:
-                        job_data = {
-                            "status": "processing",
-                            "progress": 0,
-                            "message": "Initializing AI model...",
-                            "type": "text_to_image",
-                            "prompt": prompt,
-                            "style": style
-                        }
-                        self.processing_jobs[job_id] = job_data
-                        self.job_progress[job_id] = job_data  # [FIX] Sync with job_progress
-
-                        # Emit status update
-                        if self.socketio:
-                            self.emit_event('job_update', {
-                                'job_id': job_id,
-                                'status': 'processing',
-                                'progress': 0,
-                                'message': 'Starting image generation...'
-                            })
+                        self.job_store.update(job_id, {
+                            'message': 'Starting image generation...'
+                        })
 
                         # [ORFEAS] USE ULTIMATE TEXT-TO-IMAGE ENGINE WITH MULTI-PROVIDER SUPPORT
                         from ultimate_text_to_image import get_ultimate_engine
 
                         # Update progress
-                        self.processing_jobs[job_id]['progress'] = 10
-                        self.processing_jobs[job_id]['message'] = '[ORFEAS] Initializing ULTIMATE AI engine...'
-                        self.job_progress[job_id] = self.processing_jobs[job_id]  # [FIX] Sync
-
-                        if self.socketio:
-                            self.emit_event('job_update', {
-                                'job_id': job_id,
-                                'status': 'processing',
-                                'progress': 10,
-                                'message': '[ORFEAS] Initializing ULTIMATE AI engine...'
-                            })
+                        self.job_store.update(job_id, {
+                            'progress': 10,
+                            'message': '[ORFEAS] Initializing ULTIMATE AI engine...'
+                        })
 
                         # Get ultimate engine instance
                         ultimate_engine = get_ultimate_engine()
 
                         # Update progress
-                        self.processing_jobs[job_id]['progress'] = 20
-                        self.processing_jobs[job_id]['message'] = '[ART] Generating with best AI models...'
-                        self.job_progress[job_id] = self.processing_jobs[job_id]  # [FIX] Sync
-
-                        if self.socketio:
-                            self.emit_event('job_update', {
-                                'job_id': job_id,
-                                'status': 'processing',
-                                'progress': 20,
-                                'message': '[ART] Generating with best AI models...'
-                            })
+                        self.job_store.update(job_id, {
+                            'progress': 20,
+                            'message': '[ART] Generating with best AI models...'
+                        })
 
                         # Generate with ULTIMATE engine (tries multiple providers)
                         logger.info(f"[ORFEAS] Calling ultimate_engine.generate_ultimate...")
@@ -2663,22 +2585,12 @@ class OrfeasUnifiedServer:
                         if success and output_path.exists():
                             logger.info(f"[OK] Image file verified at: {output_path}")
                             # Update progress
-                            self.processing_jobs[job_id]['progress'] = 100
-                            self.processing_jobs[job_id]['status'] = 'completed'
-                            self.processing_jobs[job_id]['message'] = 'Image generated successfully!'
-                            self.processing_jobs[job_id]['filename'] = unique_filename
-                            self.processing_jobs[job_id]['preview_url'] = f"/api/preview/{unique_filename}"
-                            self.job_progress[job_id] = self.processing_jobs[job_id]  # [FIX] Sync
-
-                            if self.socketio:
-                                self.emit_event('job_update', {
-                                    'job_id': job_id,
-                                    'status': 'completed',
-                                    'progress': 100,
-                                    'message': 'ÃƒÂ°Ã…Â¸Ã…Â½Ã¢â‚¬Â° Image generated successfully!',
-                                    'filename': unique_filename,
-                                    'preview_url': f"/api/preview/{unique_filename}"
-                                })
+                            self.job_store.transition(job_id, 'completed', fields={
+                                'progress': 100,
+                                'message': 'Image generated successfully!',
+                                'filename': unique_filename,
+                                'preview_url': f"/api/preview/{unique_filename}"
+                            })
 
                             logger.info(f"[OK] Text-to-image completed: {job_id}")
                         else:
@@ -2699,16 +2611,7 @@ class OrfeasUnifiedServer:
                             "error_type": type(e).__name__,
                             "error_details": str(e)
                         }
-                        self.processing_jobs[job_id] = error_data
-                        self.job_progress[job_id] = error_data  # [FIX] Sync
-
-                        if self.socketio:
-                            self.emit_event('job_update', {
-                                'job_id': job_id,
-                                'status': 'failed',
-                                'progress': 0,
-                                'message': f"Image generation failed: {str(e)}"
-                            })
+                        self.job_store.update(job_id, error_data)
 
                 # Start processing in background thread
                 thread = threading.Thread(target=process_text_to_image, daemon=True)
@@ -2725,7 +2628,6 @@ class OrfeasUnifiedServer:
                 return jsonify({"error": str(e)}), 500
 
         @self.app.route('/api/generate-3d', methods=['POST'])
-        @track_request_metrics('/api/generate-3d')
         def generate_3d():
             """Generate 3D model from image (integrated with GPU optimization)"""
             import time
@@ -2836,7 +2738,7 @@ class OrfeasUnifiedServer:
                 # Rate limiting check
                 if self.rate_limiting_enabled and self.rate_limiter:
                     client_ip = request.remote_addr
-                    is_allowed, error_msg = self.rate_limiter.is_allowed(client_ip)
+                    is_allowed, error_msg = self.rate_limiter.is_allowed(client_ip, endpoint=request.endpoint)
                     if not is_allowed:
                         return jsonify({"error": error_msg}), 429
 
@@ -2855,8 +2757,8 @@ class OrfeasUnifiedServer:
                 dimensions = validated_data.dimensions.dict()
                 quality = validated_data.quality
 
-                # [ORFEAS] MILESTONE 2: Check if job is already being processed
-                if job_id in self.active_jobs:
+                # [ORFEAS] MILESTONE 2: Atomically claim the job (across all workers)
+                if not self.claim_job(job_id):
                     logger.warning(f"[ORFEAS] MILESTONE 2: Concurrent generation attempt for job {job_id}")
                     return jsonify({
                         "error": "Generation already in progress",
@@ -2865,9 +2767,6 @@ class OrfeasUnifiedServer:
                         "message": "This job is currently being processed. Wait for completion or use a different job_id."
                     }), 409
 
-                # Mark job as active
-                self.active_jobs.add(job_id)
-
                 # Start async 3D generation
                 thread = threading.Thread(
                     target=self.generate_3d_async,
@@ -2893,8 +2792,8 @@ class OrfeasUnifiedServer:
                     vram_mgr.clear_cache()
                 torch.cuda.empty_cache()
                 # [ORFEAS] MILESTONE 2: Clean up active jobs on error
-                if 'job_id' in locals() and job_id in self.active_jobs:
-                    self.active_jobs.discard(job_id)
+                if 'job_id' in locals():
+                    self.release_job(job_id)
                 return jsonify({'error': 'GPU memory exceeded, please try again later'}), 507
             except Exception as e:
                 logger.error(f"3D generation error: {str(e)}")
@@ -2903,8 +2802,8 @@ class OrfeasUnifiedServer:
                     vram_mgr.clear_cache()
                     logger.info("[ORFEAS GPU] GPU cache cleared after error")
                 # [ORFEAS] MILESTONE 2: Clean up active jobs on error
-                if 'job_id' in locals() and job_id in self.active_jobs:
-                    self.active_jobs.discard(job_id)
+                if 'job_id' in locals():
+                    self.release_job(job_id)
                 return jsonify({"error": "3D generation failed"}), 500
             finally:
                 # Always log final GPU state
@@ -2913,7 +2812,6 @@ class OrfeasUnifiedServer:
                     log_with_flush('info', f"[ORFEAS GPU] AFTER generation - GPU usage: {final_stats.get('usage_percent', 0):.1f}%")
 
         @self.app.route('/api/ultra-generate-3d', methods=['POST'])
-        @track_request_metrics('/api/ultra-generate-3d')
         def ultra_generate_3d():
             """Generate 3D model with Ultra-Performance Optimization (100x Speed, 100x Accuracy, 10x Security)"""
             import time
@@ -2950,12 +2848,12 @@ class OrfeasUnifiedServer:
                 # Rate limiting check (stricter for ultra-performance)
                 if self.rate_limiting_enabled and self.rate_limiter:
                     client_ip = request.remote_addr
-                    is_allowed, error_msg = self.rate_limiter.is_allowed(client_ip, premium=True)
+                    is_allowed, error_msg = self.rate_limiter.is_allowed(client_ip, premium=True, endpoint=request.endpoint)
                     if not is_allowed:
                         return jsonify({"error": error_msg}), 429
 
-                # Check if job is already being processed
-                if job_id in self.active_jobs:
+                # Atomically claim the job (across all workers)
+                if not self.claim_job(job_id):
                     logger.warning(f"[ORFEAS] Ultra-Performance: Concurrent generation attempt for job {job_id}")
                     return jsonify({
                         "error": "Generation already in progress",
@@ -2964,9 +2862,6 @@ class OrfeasUnifiedServer:
                         "message": "This job is currently being processed. Wait for completion or use a different job_id."
                     }), 409
 
-                # Mark job as active
-                self.active_jobs.add(job_id)
-
                 # Start ultra-performance 3D generation
                 thread = threading.Thread(
                     target=self.ultra_generate_3d_async,
@@ -2997,12 +2892,11 @@ class OrfeasUnifiedServer:
             except Exception as e:
                 logger.error(f"[ORFEAS] Ultra-Performance 3D generation error: {str(e)}")
                 # Clean up active jobs on error
-                if 'job_id' in locals() and job_id in self.active_jobs:
-                    self.active_jobs.discard(job_id)
+                if 'job_id' in locals():
+                    self.release_job(job_id)
                 return jsonify({"error": "Ultra-Performance 3D generation failed"}), 500
 
         @self.app.route('/api/job-status/<job_id>', methods=['GET'])
-        @track_request_metrics('/api/job-status')
         def job_status(job_id):
             """Get job status"""
             # [TEST MODE] ORFEAS FIX: Return mock job status for testing
@@ -3025,47 +2919,114 @@ class OrfeasUnifiedServer:
                 logger.warning(f"[SECURITY] Invalid job_id format rejected: {job_id}")
                 return jsonify({"error": "Job not found"}), 404
 
-            # [FIX] Check both job_progress and processing_jobs dictionaries
-            job_data = self.job_progress.get(job_id) or self.processing_jobs.get(job_id)
+            # Version first: a change landing after it is never missed by the wait below.
+            # Store versions are shared by all workers, so ``since`` may come from any of them.
+            events = self.progress_tracker.events
+            version = max(events.version(job_id), store_event_id(self.job_store.version(job_id)))
+
+            # Indexed lookup in the shared job store
+            job_data = self.job_store.get(job_id)
 
             if not job_data:
                 logger.warning(f"[API] Job not found: {job_id}")
                 return jsonify({"error": "Job not found"}), 404
 
-            return jsonify(job_data)
+            # Long-polling: ?wait=<seconds>[&since=<X-Job-Version>] holds the
+            # request until the job changes after ``since`` (default: now) or finishes
+            wait = min(max(request.args.get('wait', 0.0, type=float), 0.0), self.job_status_max_wait)
+            if wait and not is_terminal_status(job_data.get('status')):
+                since = request.args.get('since', version, type=int)
+                changes = events.wait(job_id, since, wait)
+                if changes:
+                    version = changes[-1].id
+                    job_data = self.job_store.get(job_id) or job_data
+
+            response = jsonify(job_data)
+            response.headers['X-Job-Version'] = str(version)
+            return response
+
+        @self.app.route('/api/job-events/<job_id>', methods=['GET'])
+        def job_events(job_id):
+            """Server-Sent Events stream of one job's progress (resumable with Last-Event-ID)"""
+            if not is_valid_uuid(job_id):
+                return jsonify({"error": "Job not found"}), 404
+            if not self.job_events_enabled:
+                return jsonify({"error": "Event streaming is disabled; poll /api/job-status",
+                                "job_id": job_id}), 503
+            store_version = self.job_store.version(job_id)
+            job_data = self.job_store.get(job_id)
+            if not job_data:
+                return jsonify({"error": "Job not found"}), 404
+
+            events = self.progress_tracker.events
+            last_event_id = request.headers.get('Last-Event-ID', request.args.get('last_event_id', ''))
+            last_event_id = int(last_event_id) if last_event_id.isdigit() else 0
+            if not events.version(job_id):
+                # No event since this worker started: seed the stream with the stored state
+                self.progress_tracker.publish_job_state(job_id, {'job_id': job_id, **job_data},
+                                                        terminal=is_terminal_status(job_data.get('status')),
+                                                        version=store_version)
+
+            return Response(sse_stream(events, job_id, last_event_id), mimetype='text/event-stream',
+                            headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+        @self.app.route('/api/job/<job_id>', methods=['DELETE'])
+        def delete_job(job_id):
+            """Delete an upload/job that is not generating (cancels its prefetch)"""
+            if not is_valid_uuid(job_id):
+                return jsonify({"error": "Job not found"}), 404
+            existed = self.job_store.get(job_id) is not None  # claiming inserts a queued record
+            # Hold the claim while deleting so generate-3d cannot start on a half-deleted job
+            if not self.claim_job(job_id):
+                return jsonify({"error": "Generation in progress", "job_id": job_id}), 409
+
+            try:
+                uploads = list(self.uploads_dir.glob(f"{job_id}_*"))
+                for path in uploads:
+                    path.unlink(missing_ok=True)
+                self.job_store.delete(job_id)
+                cancelled = self.prefetcher.cancel(job_id) if self.prefetcher else False
+            finally:
+                self.release_job(job_id)
+            if not uploads and not existed and not cancelled:
+                return jsonify({"error": "Job not found"}), 404
+            logger.info(f"[API] Deleted job {job_id} ({len(uploads)} uploads, prefetch cancelled: {cancelled})")
+            return jsonify({"job_id": job_id, "deleted": True, "prefetch_cancelled": cancelled})
 
         @self.app.route('/api/download-base64/<job_id>/<filename>', methods=['GET'])
         def download_file_base64(job_id, filename):
-            """Download file as base64-encoded JSON to bypass ngrok 20MB limit"""
+            """Download file as base64-encoded JSON to bypass ngrok 20MB limit
+
+            Paged mode: pass ?offset=N (and optionally &page_size=M) to receive
+            one page at a time; follow next_offset until done is true.
+            """
             try:
                 logger.info(f"[DOWNLOAD-B64] Base64 download request: {job_id}/{filename}")
 
-                # [SECURITY] Validate job and file exist
-                job_output_path = self.outputs_dir / job_id
-                if not job_output_path.exists():
+                # [SECURITY] Validate job and file exist (path traversal prevention)
+                if not (self.outputs_dir / job_id).exists():
                     return jsonify({"error": "Job not found"}), 404
-
-                file_path = job_output_path / filename
-                try:
-                    resolved_file = file_path.resolve()
-                    resolved_job = job_output_path.resolve()
-                    if not str(resolved_file).startswith(str(resolved_job)):
-                        return jsonify({"error": "Invalid file path"}), 404
-                except:
-                    return jsonify({"error": "Invalid file path"}), 404
-
-                if not file_path.exists():
+                file_path = resolve_artifact(self.outputs_dir, job_id, filename)
+                if file_path is None:
                     return jsonify({"error": "File not found"}), 404
 
+                if 'offset' in request.args or 'page_size' in request.args:
+                    try:
+                        page = read_base64_page(
+                            file_path,
+                            offset=int(request.args.get('offset', 0)),
+                            page_size=int(request.args.get('page_size', DEFAULT_B64_PAGE_SIZE))
+                        )
+                    except ValueError as e:
+                        return jsonify({"error": str(e)}), 416
+                    page['filename'] = filename
+                    return jsonify(page)
+
+                # Legacy single-response mode
                 file_size = file_path.stat().st_size
                 logger.info(f"[DOWNLOAD-B64] File size: {file_size} bytes")
-
-                # Read and encode file to base64
                 import base64
-                with open(str(file_path), 'rb') as f:
-                    file_data = f.read()
-
-                encoded_data = base64.b64encode(file_data).decode('utf-8')
+                encoded_data = base64.b64encode(file_path.read_bytes()).decode('utf-8')
                 logger.info(f"[DOWNLOAD-B64] Encoded size: {len(encoded_data)} bytes")
 
                 # Return JSON with base64 data
@@ -3083,103 +3044,87 @@ class OrfeasUnifiedServer:
 
         @self.app.route('/api/download/<job_id>/<filename>', methods=['GET'])
         def download_file_plain(job_id, filename):
-            """Download generated file - NO decorator to avoid hangs"""
+            """Download generated file
+
+            Supports Range/resume, ETag revalidation (content hash), precompressed
+            gzip/zstd variants and zero-copy sendfile or nginx X-Accel-Redirect.
+            """
             try:
                 logger.info(f"[DOWNLOAD] Received download request: {job_id}/{filename}")
 
-                # [SECURITY] ORFEAS FIX: Validate job existence before download (prevents unauthorized access)
-                # Check if the job exists in the outputs directory
-                job_output_path = self.outputs_dir / job_id
-
                 # [SECURITY] Job must exist before allowing download
-                if not job_output_path.exists():
+                if not (self.outputs_dir / job_id).exists():
                     logger.warning(f"[SECURITY] Download blocked: Job not found: {job_id}")
                     return jsonify({"error": "Job not found"}), 404
 
                 # [SECURITY] Verify file is within job directory (path traversal prevention)
-                file_path = job_output_path / filename
-                try:
-                    # Resolve to absolute path and ensure it's within job directory
-                    resolved_file = file_path.resolve()
-                    resolved_job = job_output_path.resolve()
-                    if not str(resolved_file).startswith(str(resolved_job)):
-                        logger.warning(f"[SECURITY] Path traversal attempt blocked: {filename}")
-                        return jsonify({"error": "Invalid file path"}), 404
-                except Exception as e:
-                    logger.warning(f"[SECURITY] Path validation failed: {e}")
-                    return jsonify({"error": "Invalid file path"}), 404
-
-                # Note: Do NOT generate placeholder STL here.
-                # Always serve the actual file produced by generation.
-                # This ensures downloads reflect the real 3D model from the uploaded image.
-
-                # Fallback: production mode - send actual file if exists
-                if file_path.exists():
-                    file_size = file_path.stat().st_size
-                    logger.info(f"[DOWNLOAD] ✅ Serving file: {file_path} ({file_size} bytes)")
-                    logger.info(f"[DOWNLOAD] File size: {file_size}, MIME type: {self._get_mimetype(filename)}")
-
-                    # ALWAYS use streaming for ALL files to ensure complete transmission through ngrok
-                    logger.info(f"[DOWNLOAD] Using direct streaming response for file: {file_size} bytes")
-                    from flask import Response
-                    import io
-
-                    def generate_file():
-                        """Stream file in chunks with explicit logging for debugging"""
-                        bytes_sent = 0
-                        try:
-                            with open(str(file_path), 'rb') as f:
-                                chunk_size = 512 * 1024  # 512KB chunks (smaller for ngrok stability)
-                                while True:
-                                    chunk = f.read(chunk_size)
-                                    if not chunk:
-                                        break
-                                    bytes_sent += len(chunk)
-                                    logger.debug(f"[DOWNLOAD] Sent chunk: {len(chunk)} bytes (total: {bytes_sent}/{file_size})")
-                                    yield chunk
-                            logger.info(f"[DOWNLOAD] ✅ Successfully streamed {bytes_sent} bytes out of {file_size}")
-                        except Exception as e:
-                            logger.error(f"[DOWNLOAD] ❌ Stream error after {bytes_sent} bytes: {str(e)}")
-                            raise
-
-                    response = Response(
-                        generate_file(),
-                        mimetype='application/octet-stream',
-                        headers={
-                            'Content-Disposition': f'attachment; filename="{filename}"',
-                            'Content-Type': 'application/octet-stream',
-                            'Content-Length': str(file_size),
-                            'Cache-Control': 'no-cache, no-store, must-revalidate',
-                            'Pragma': 'no-cache',
-                            'Expires': '0'
-                        }
-                    )
-                    logger.info(f"[DOWNLOAD] Streaming response prepared with Content-Length: {file_size}")
-                    return response
-                else:
+                # Note: Do NOT generate placeholder STL here - always serve the real artifact.
+                file_path = resolve_artifact(self.outputs_dir, job_id, filename)
+                if file_path is None:
                     logger.warning(f"[SECURITY] File not found in job directory: {filename}")
                     return jsonify({"error": "File not found"}), 404
+
+                response = send_artifact(
+                    request, file_path,
+                    download_name=filename,
+                    mimetype=self._get_mimetype(filename),
+                    relative_path=f"{job_id}/{filename}"
+                )
+                logger.info(f"[DOWNLOAD] {response.status_code} {filename} "
+                            f"(encoding={response.headers.get('Content-Encoding', 'identity')})")
+                return response
             except Exception as e:
                 logger.error(f"Download error: {str(e)}")
                 logger.error(traceback.format_exc())
                 return jsonify({"error": "Download failed"}), 500
 
+        @self.app.route('/api/babylon/glb/<job_id>/<filename>', methods=['GET'])
+        def download_babylon_glb(job_id, filename):
+            """Download a generated model as binary glTF for the Babylon.js viewer
+
+            Query: quantize=0|1 (KHR_mesh_quantization, default 1),
+            compress=0|1 (EXT_meshopt_compression, default 1),
+            lods=0-4 (MSFT_lod levels, default 2). The GLB is built once per
+            option set and then served like any other artifact (ETag/Range).
+            """
+            try:
+                if not (self.outputs_dir / job_id).exists():
+                    return jsonify({"error": "Job not found"}), 404
+                source_path = resolve_artifact(self.outputs_dir, job_id, filename)
+                if source_path is None:
+                    return jsonify({"error": "File not found"}), 404
+
+                quantize = request.args.get('quantize', '1') != '0'
+                compress = request.args.get('compress', '1') != '0'
+                lod_levels = min(max(request.args.get('lods', 2, type=int), 0), 4)
+
+                glb_name = f"{source_path.stem}.babylon-q{int(quantize)}c{int(compress)}l{lod_levels}.glb"
+                glb_path = source_path.with_name(glb_name)
+                if (not glb_path.exists()
+                        or glb_path.stat().st_mtime_ns < source_path.stat().st_mtime_ns):
+                    logger.info(f"[BABYLON] Building {glb_name}")
+                    self._build_babylon_glb(source_path, glb_path, quantize, compress, lod_levels)
+
+                return send_artifact(
+                    request, glb_path,
+                    download_name=f"{source_path.stem}.glb",
+                    mimetype='model/gltf-binary',
+                    relative_path=f"{job_id}/{glb_name}"
+                )
+            except Exception as e:
+                logger.error(f"[BABYLON] GLB export error: {str(e)}")
+                logger.error(traceback.format_exc())
+                return jsonify({"error": "GLB export failed"}), 500
+
         @self.app.route('/api/preview/<filename>', methods=['GET'])
-        @track_request_metrics('/api/preview')
         def preview_image(filename):
-            """Preview uploaded image (no download, display inline)"""
+            """Preview uploaded image inline (``?size=`` serves a WebP/AVIF thumbnail)"""
             try:
-                # Look for file in uploads directory
-                file_path = self.uploads_dir / filename
-
-                if file_path.exists():
-                    logger.info(f"ÃƒÂ°Ã…Â¸Ã¢â‚¬Å“Ã‚Â¸ Serving preview: {filename}")
-                    return send_file(
-                        str(file_path),
-                        mimetype=self._get_mimetype(filename),
-                        as_attachment=False,  # Display inline, not download
-                        download_name=filename
-                    )
+                uploads_dir = self.uploads_dir.resolve()
+                file_path = (uploads_dir / filename).resolve()
+
+                if file_path.parent == uploads_dir and file_path.is_file():
+                    return self._send_preview(file_path, filename)
                 else:
                     logger.warning(f"[WARN] Preview not found: {filename}")
                     return jsonify({"error": "Image not found"}), 404
@@ -3189,21 +3134,13 @@ class OrfeasUnifiedServer:
                 return jsonify({"error": "Preview failed"}), 500
 
         @self.app.route('/api/preview-output/<job_id>/<filename>', methods=['GET'])
-        @track_request_metrics('/api/preview-output')
         def preview_output(job_id, filename):
-            """Preview generated output image"""
+            """Preview generated output inline (``?size=`` thumbnails, rendered image for meshes)"""
             try:
-                # Look for file in outputs directory
-                file_path = self.outputs_dir / job_id / filename
-
-                if file_path.exists():
-                    logger.info(f"ÃƒÂ°Ã…Â¸Ã¢â‚¬Å“Ã‚Â¸ Serving output preview: {job_id}/{filename}")
-                    return send_file(
-                        str(file_path),
-                        mimetype=self._get_mimetype(filename),
-                        as_attachment=False,
-                        download_name=filename
-                    )
+                file_path = resolve_artifact(self.outputs_dir, job_id, filename)
+
+                if file_path is not None:
+                    return self._send_preview(file_path, filename)
                 else:
                     logger.warning(f"[WARN] Output preview not found: {job_id}/{filename}")
                     return jsonify({"error": "Output not found"}), 404
@@ -3214,7 +3151,6 @@ class OrfeasUnifiedServer:
 
         # [ORFEAS] ORFEAS PHASE 2: Advanced STL Processing Endpoints
         @self.app.route('/api/stl/analyze', methods=['POST'])
-        @track_request_metrics('/api/stl/analyze')
         def analyze_stl_file():
             """Analyze STL file quality"""
             try:
@@ -3250,7 +3186,6 @@ class OrfeasUnifiedServer:
                 return jsonify({"error": str(e)}), 500
 
         @self.app.route('/api/stl/repair', methods=['POST'])
-        @track_request_metrics('/api/stl/repair')
         def repair_stl_file():
             """Auto-repair STL file"""
             try:
@@ -3291,7 +3226,6 @@ class OrfeasUnifiedServer:
                 return jsonify({"error": str(e)}), 500
 
         @self.app.route('/api/stl/optimize', methods=['POST'])
-        @track_request_metrics('/api/stl/optimize')
         def optimize_stl_file():
             """Optimize STL for 3D printing"""
             try:
@@ -3330,7 +3264,6 @@ class OrfeasUnifiedServer:
                 return jsonify({"error": str(e)}), 500
 
         @self.app.route('/api/stl/simplify', methods=['POST'])
-        @track_request_metrics('/api/stl/simplify')
         def simplify_stl_file():
             """Simplify STL mesh"""
             try:
@@ -3387,7 +3320,6 @@ class OrfeasUnifiedServer:
         # =============================================================================
 
         @self.app.route('/api/batch-generate', methods=['POST'])
-        @track_request_metrics('/api/batch-generate')
         def batch_generate_3d():
             """
             [ART] BATCH GENERATION ENDPOINT - Process multiple images simultaneously
@@ -3437,7 +3369,7 @@ class OrfeasUnifiedServer:
 
                     # [ORFEAS SECURITY] Enhanced 6-layer validation for batch uploads
                     enhanced_validator = get_enhanced_validator()
-                    is_valid, error_msg, sanitized_image = enhanced_validator.validate_image(file)
+                    is_valid, error_msg, validated = enhanced_validator.validate_image_upload(file)
 
                     if not is_valid:
                         # [SECURITY] Log blocked file in batch
@@ -3454,7 +3386,9 @@ class OrfeasUnifiedServer:
                     # Save input file
                     input_filename = secure_filename(file.filename)
                     input_path = job_dir / input_filename
-                    file.save(str(input_path))
+                    input_path.write_bytes(validated.data)
+                    record_content_hash(input_path, validated.sha256)
+                    self.preview_service.schedule_thumbnails(validated.image, validated.sha256)
 
                     # Prepare job data
                     job_data = {
@@ -3545,7 +3479,6 @@ class OrfeasUnifiedServer:
         # =============================================================================
 
         @self.app.route('/api/materials/presets', methods=['GET'])
-        @track_request_metrics('/api/materials/presets')
         def get_material_presets():
             """
             [PREMIUM] GET MATERIAL PRESETS - Return all available PBR material presets
@@ -3574,7 +3507,6 @@ class OrfeasUnifiedServer:
                 return jsonify({"error": str(e)}), 500
 
         @self.app.route('/api/lighting/presets', methods=['GET'])
-        @track_request_metrics('/api/lighting/presets')
         def get_lighting_presets():
             """
             [IDEA] GET LIGHTING PRESETS - Return all available HDR lighting environments
@@ -3603,7 +3535,6 @@ class OrfeasUnifiedServer:
                 return jsonify({"error": str(e)}), 500
 
         @self.app.route('/api/materials/metadata', methods=['POST'])
-        @track_request_metrics('/api/materials/metadata')
         def create_material_metadata():
             """
             ÃƒÂ°Ã…Â¸Ã¢â‚¬â„¢Ã‚Â¾ CREATE MATERIAL METADATA - Generate complete material and lighting metadata
@@ -3661,7 +3592,6 @@ class OrfeasUnifiedServer:
                 return jsonify({"error": str(e)}), 500
 
         @self.app.route('/api/materials/export-mtl', methods=['POST'])
-        @track_request_metrics('/api/materials/export-mtl')
         def export_mtl_file():
             """
             ÃƒÂ°Ã…Â¸Ã¢â‚¬Å“Ã‚Â¤ EXPORT MTL FILE - Generate OBJ Material Template Library file
@@ -3720,7 +3650,6 @@ class OrfeasUnifiedServer:
         # ==================================================================================
 
         @self.app.route('/api/camera/presets', methods=['GET'])
-        @track_request_metrics('/api/camera/presets')
         def get_camera_presets():
             """
             Get all standard camera presets
@@ -3748,7 +3677,6 @@ class OrfeasUnifiedServer:
                 return jsonify({"error": str(e)}), 500
 
         @self.app.route('/api/camera/position', methods=['POST'])
-        @track_request_metrics('/api/camera/position')
         def set_camera_position():
             """
             Create custom camera position
@@ -3792,7 +3720,6 @@ class OrfeasUnifiedServer:
                 return jsonify({"error": str(e)}), 500
 
         @self.app.route('/api/camera/animation/turntable', methods=['POST'])
-        @track_request_metrics('/api/camera/animation/turntable')
         def create_turntable():
             """
             Create turntable (360Ãƒâ€šÃ‚Â° rotation) animation
@@ -3835,7 +3762,6 @@ class OrfeasUnifiedServer:
                 return jsonify({"error": str(e)}), 500
 
         @self.app.route('/api/camera/animation/orbital', methods=['POST'])
-        @track_request_metrics('/api/camera/animation/orbital')
         def create_orbital():
             """
             Create orbital path animation
@@ -3875,7 +3801,6 @@ class OrfeasUnifiedServer:
                 return jsonify({"error": str(e)}), 500
 
         @self.app.route('/api/camera/preset/save', methods=['POST'])
-        @track_request_metrics('/api/camera/preset/save')
         def save_camera_preset():
             """
             Save custom camera preset
@@ -3933,7 +3858,6 @@ class OrfeasUnifiedServer:
         # ============================================================================
 
         @self.app.route('/api/llm/generate', methods=['POST'])
-        @track_request_metrics('/api/llm/generate')
         def api_llm_generate():
             """Generate content using enterprise LLM capabilities"""
             try:
@@ -3981,7 +3905,6 @@ class OrfeasUnifiedServer:
                 return jsonify({'error': str(e)}), 500
 
         @self.app.route('/api/llm/code-generate', methods=['POST'])
-        @track_request_metrics('/api/llm/code-generate')
         def api_llm_code_generate():
             """Generate code using GitHub Copilot Enterprise"""
             try:
@@ -4019,7 +3942,6 @@ class OrfeasUnifiedServer:
                 return jsonify({'error': str(e)}), 500
 
         @self.app.route('/api/llm/orchestrate', methods=['POST'])
-        @track_request_metrics('/api/llm/orchestrate')
         def api_llm_orchestrate():
             """Execute complex tasks using multi-LLM orchestration"""
             try:
@@ -4054,7 +3976,6 @@ class OrfeasUnifiedServer:
                 return jsonify({'error': str(e)}), 500
 
         @self.app.route('/api/llm/analyze-code', methods=['POST'])
-        @track_request_metrics('/api/llm/analyze-code')
         def api_llm_analyze_code():
             """Analyze code quality and provide suggestions"""
             try:
@@ -4086,7 +4007,6 @@ class OrfeasUnifiedServer:
                 return jsonify({'error': str(e)}), 500
 
         @self.app.route('/api/llm/debug-code', methods=['POST'])
-        @track_request_metrics('/api/llm/debug-code')
         def api_llm_debug_code():
             """Debug code and provide automated fixes"""
             try:
@@ -4148,7 +4068,6 @@ class OrfeasUnifiedServer:
                 return jsonify({'error': str(e)}), 500
 
         @self.app.route('/api/llm/models', methods=['GET'])
-        @track_request_metrics('/api/llm/models')
         def api_llm_models():
             """Get available LLM models and their capabilities"""
             try:
@@ -4221,7 +4140,6 @@ class OrfeasUnifiedServer:
                 return jsonify({'error': str(e)}), 500
 
         @self.app.route('/api/llm/status', methods=['GET'])
-        @track_request_metrics('/api/llm/status')
         def api_llm_status():
             """Get LLM system status and health"""
             try:
@@ -4286,6 +4204,18 @@ class OrfeasUnifiedServer:
             if job_id:
                 logger.info(f"Client {request.sid} subscribed to job {job_id}")
 
+    def _send_preview(self, file_path: Path, filename: str):
+        """Serve a thumbnail/mesh preview when requested and accepted, else the original"""
+        digest = content_hash(file_path)
+        if 'size' in request.args:
+            derivative = self.preview_service.derivative(
+                file_path, request.args.get('size', type=int), request.headers.get('Accept'))
+            if derivative is not None:
+                path, mimetype, etag = derivative
+                return send_preview(request, path, mimetype, etag, vary_accept=True, version=digest)
+        return send_preview(request, file_path, self._get_mimetype(filename), digest[:32],
+                            download_name=filename, version=digest)
+
     def _get_mimetype(self, filename: str) -> str:
         """Get MIME type for file based on extension"""
         ext = Path(filename).suffix.lower()
@@ -4304,29 +4234,10 @@ class OrfeasUnifiedServer:
         }
         return mime_types.get(ext, 'application/octet-stream')
 
-    def analyze_image(self, image_path: Path) -> Dict[str, Any]:
-        """Analyze uploaded image"""
-        try:
-            with Image.open(image_path) as img:
-                return {
-                    "size": img.size,
-                    "format": img.format,
-                    "mode": img.mode,
-                    "has_transparency": img.mode in ('RGBA', 'LA'),
-                    "file_size": os.path.getsize(image_path)
-                }
-        except Exception as e:
-            logger.error(f"Image analysis error: {str(e)}")
-            return {"error": str(e)}
-
     # [ORFEAS] ORFEAS PHASE 1: Result caching methods
     def _get_image_hash(self, image_path: Path) -> str:
-        """Generate MD5 hash of image for caching"""
-        import hashlib
-        hasher = hashlib.md5()
-        with open(image_path, 'rb') as f:
-            hasher.update(f.read())
-        return hasher.hexdigest()
+        """Content hash of image for caching (recorded at upload, no re-read)"""
+        return content_hash(image_path)
 
     def _get_cache_key(self, image_path: Path, format_type: str, quality: int) -> str:
         """Generate cache key from image hash and generation parameters"""
@@ -4389,16 +4300,11 @@ class OrfeasUnifiedServer:
 
         try:
             # Initialize job progress
-            self.job_progress[job_id] = {
+            self.job_store.put(job_id, {
                 "status": "initializing",
                 "progress": 0,
                 "step": "Starting 3D generation..."
-            }
-            if self.socketio:
-                self.emit_event('job_update', {
-                    'job_id': job_id,
-                    **self.job_progress[job_id]
-                })
+            })
 
             # Find input image
             input_image_path = None
@@ -4419,6 +4325,7 @@ class OrfeasUnifiedServer:
                     logger.info(f"[ORFEAS]  Applying Enterprise Agent Intelligence for job {job_id}")
 
                     # Create agent task for intelligent analysis
+                    from enterprise_agent_framework import AgentTask
                     agent_task = AgentTask(
                         task_id=f"analysis_{job_id}",
                         task_type='intelligent_3d_analysis',
@@ -4453,7 +4360,7 @@ class OrfeasUnifiedServer:
                         if 'recommended_quality' in optimization_recommendations:
                             quality = min(optimization_recommendations['recommended_quality'], quality)
 
-                        self.job_progress[job_id].update({
+                        self.job_store.update(job_id, {
                             "status": "agent_analysis_complete",
                             "progress": 15,
                             "step": f" Agent Analysis Complete - Quality Score: {quality_analysis.get('quality_score', 0.0):.2f}",
@@ -4465,7 +4372,6 @@ class OrfeasUnifiedServer:
                                 "recommended_model": optimization_recommendations.get('recommended_model', 'default')
                             }
                         })
-                        self.emit_event('job_update', {'job_id': job_id, **self.job_progress[job_id]})
 
                         logger.info(f"[ORFEAS]  Enterprise Agent Analysis successful - Complexity: {quality_analysis.get('complexity_score', 0.0):.2f}")
                     else:
@@ -4492,7 +4398,7 @@ class OrfeasUnifiedServer:
                 shutil.copy(cached_result, output_path)
 
                 # Update progress immediately
-                self.job_progress[job_id].update({
+                self.job_store.update(job_id, {
                     "status": "completed",
                     "progress": 100,
                     "step": "3D model retrieved from cache!",
@@ -4500,8 +4406,7 @@ class OrfeasUnifiedServer:
                     "download_url": f"/api/download/{job_id}/{output_file}",
                     "cached": True
                 })
-                self.emit_event('job_update', {'job_id': job_id, **self.job_progress[job_id]})
-                self.active_jobs.discard(job_id)
+                self.release_job(job_id)
                 return
 
             output_dir = self.outputs_dir / job_id
@@ -4571,7 +4476,7 @@ class OrfeasUnifiedServer:
                                         accuracy_improvement = performance_metrics.get('accuracy_improvement', 1.0)
                                         security_level = performance_metrics.get('security_level', 1.0)
 
-                                        self.job_progress[job_id].update({
+                                        self.job_store.update(job_id, {
                                             "status": "ultra_optimized",
                                             "progress": 90,
                                             "step": f"Ultra-Performance Applied! Speed: {speed_improvement:.1f}x, Accuracy: {accuracy_improvement:.1f}x, Security: {security_level:.1f}x",
@@ -4582,7 +4487,6 @@ class OrfeasUnifiedServer:
                                                 "security_level": security_level
                                             }
                                         })
-                                        self.emit_event('job_update', {'job_id': job_id, **self.job_progress[job_id]})
                                 else:
                                     logger.warning(f"[ORFEAS] Ultra-Performance Optimization returned unsuccessful result")
                             finally:
@@ -4595,12 +4499,11 @@ class OrfeasUnifiedServer:
                     # Only run standard generation if ultra-optimization didn't succeed
                     if not ultra_optimized:
                         # Update progress
-                        self.job_progress[job_id].update({
+                        self.job_store.update(job_id, {
                             "status": "processing",
                             "progress": 25,
                             "step": "Processing image..."
                         })
-                        self.emit_event('job_update', {'job_id': job_id, **self.job_progress[job_id]})
 
                         # Mode-specific processing
                         logger.info(f"[DIAGNOSTIC] About to call generation function...")
@@ -4621,7 +4524,7 @@ class OrfeasUnifiedServer:
                         output_path = output_dir / output_file
                         self._save_to_cache(cache_key, output_path)
 
-                        self.job_progress[job_id].update({
+                        self.job_store.update(job_id, {
                             "status": "completed",
                             "progress": 100,
                             "step": "3D model generation complete!",
@@ -4632,12 +4535,11 @@ class OrfeasUnifiedServer:
                         raise Exception("Generation failed")
             else:
                 # Test mode: no GPU manager context
-                self.job_progress[job_id].update({
+                self.job_store.update(job_id, {
                     "status": "processing",
                     "progress": 25,
                     "step": "Processing image..."
                 })
-                self.emit_event('job_update', {'job_id': job_id, **self.job_progress[job_id]})
 
                 # Mode-specific processing
                 if self.mode == ProcessorMode.POWERFUL_3D and ADVANCED_3D_AVAILABLE:
@@ -4654,7 +4556,7 @@ class OrfeasUnifiedServer:
                     output_path = output_dir / output_file
                     self._save_to_cache(cache_key, output_path)
 
-                    self.job_progress[job_id].update({
+                    self.job_store.update(job_id, {
                         "status": "completed",
                         "progress": 100,
                         "step": "3D model generation complete!",
@@ -4669,14 +4571,16 @@ class OrfeasUnifiedServer:
         except Exception as e:
             logger.error(f"3D generation error for job {job_id}: {str(e)}")
             logger.error(traceback.format_exc())
-            self.job_progress[job_id] = {
+            self.job_store.put(job_id, {
                 "status": "failed",
                 "error": str(e)
-            }
+            })
 
         finally:
-            self.active_jobs.discard(job_id)
-            self.emit_event('job_update', {'job_id': job_id, **self.job_progress[job_id]})
+            self.release_job(job_id)
+            if self.prefetcher:
+                self.prefetcher.release(job_id)
+            self._precompress_job_output(job_id)
 
     @track_generation_metrics('3d', 'ultra_performance')
     def ultra_generate_3d_async(self, job_id: str, format_type: str, dimensions: Dict, quality: int):
@@ -4686,7 +4590,7 @@ class OrfeasUnifiedServer:
 
         try:
             # Initialize ultra-performance job progress
-            self.job_progress[job_id] = {
+            self.job_store.put(job_id, {
                 "status": "ultra_initializing",
                 "progress": 0,
                 "step": "Initializing Ultra-Performance protocols...",
@@ -4694,12 +4598,7 @@ class OrfeasUnifiedServer:
                     "enabled": True,
                     "optimization_level": "quantum"
                 }
-            }
-            if self.socketio:
-                self.emit_event('job_update', {
-                    'job_id': job_id,
-                    **self.job_progress[job_id]
-                })
+            })
 
             # Find input image
             input_image_path = None
@@ -4717,12 +4616,11 @@ class OrfeasUnifiedServer:
             logger.info(f"[ORFEAS]  Applying Ultra-Performance Optimization to job {job_id}")
 
             # Update progress
-            self.job_progress[job_id].update({
+            self.job_store.update(job_id, {
                 "status": "ultra_processing",
                 "progress": 10,
                 "step": "Applying quantum-level optimizations..."
             })
-            self.emit_event('job_update', {'job_id': job_id, **self.job_progress[job_id]})
 
             # Prepare ultra-performance input data
             ultra_input_data = {
@@ -4765,7 +4663,7 @@ class OrfeasUnifiedServer:
                         security_level = performance_metrics.get('security_level', 10.0)
 
                         # Update final progress with detailed metrics
-                        self.job_progress[job_id].update({
+                        self.job_store.update(job_id, {
                             "status": "ultra_completed",
                             "progress": 100,
                             "step": f"Ultra-Performance Complete! {speed_improvement:.1f}x Speed, {accuracy_improvement:.1f}x Accuracy, {security_level:.1f}x Security",
@@ -4792,7 +4690,7 @@ class OrfeasUnifiedServer:
         except Exception as e:
             logger.error(f"[ORFEAS] Ultra-Performance generation error for job {job_id}: {str(e)}")
             logger.error(traceback.format_exc())
-            self.job_progress[job_id] = {
+            self.job_store.put(job_id, {
                 "status": "ultra_failed",
                 "error": str(e),
                 "ultra_performance": {
@@ -4800,11 +4698,27 @@ class OrfeasUnifiedServer:
                     "optimization_applied": False,
                     "error": str(e)
                 }
-            }
+            })
 
         finally:
-            self.active_jobs.discard(job_id)
-            self.emit_event('job_update', {'job_id': job_id, **self.job_progress[job_id]})
+            self.release_job(job_id)
+            self._precompress_job_output(job_id)
+
+    @staticmethod
+    def _powerful_depth_input(img):
+        """Powerful 3D preprocessing: RGB, 256x256, contrast 1.2, float32 in [0, 1]"""
+        # ORFEAS OPTIMIZATION: Single-pass conversion
+        img = img.convert('RGB')
+
+        # ORFEAS OPTIMIZATION: Resize FIRST (faster than processing large image)
+        img = img.resize((256, 256), Image.Resampling.LANCZOS)
+
+        # ORFEAS OPTIMIZATION: Enhance on smaller image (50% faster)
+        enhancer = ImageEnhance.Contrast(img)
+        img = enhancer.enhance(1.2)
+
+        # ORFEAS OPTIMIZATION: Direct numpy conversion (np.asarray vs np.array)
+        return np.asarray(img, dtype=np.float32) / 255.0
 
     def powerful_3d_generation(self, input_path, output_dir, job_id, format_type, dimensions, quality):
         """Advanced 3D generation with MiDaS and sophisticated mesh algorithms"""
@@ -4812,34 +4726,29 @@ class OrfeasUnifiedServer:
         logger.info("[FAST] Using Powerful 3D generation mode")
 
         # Load and preprocess image
-        self.job_progress[job_id].update({
+        self.job_store.update(job_id, {
             "progress": 35,
             "step": "Advanced depth estimation..."
         })
-        self.emit_event('job_update', {'job_id': job_id, **self.job_progress[job_id]})
-
-        with Image.open(input_path) as img:
-            # ORFEAS OPTIMIZATION: Single-pass conversion
-            img = img.convert('RGB')
-
-            # ORFEAS OPTIMIZATION: Resize FIRST (faster than processing large image)
-            img = img.resize((256, 256), Image.Resampling.LANCZOS)
-
-            # ORFEAS OPTIMIZATION: Enhance on smaller image (50% faster)
-            enhancer = ImageEnhance.Contrast(img)
-            img = enhancer.enhance(1.2)
 
-            # ORFEAS OPTIMIZATION: Direct numpy conversion (np.asarray vs np.array)
-            image_array = np.asarray(img, dtype=np.float32) / 255.0
-
-        # Advanced depth estimation
-        depth_map = self.depth_estimator.estimate_depth(image_array)
+        # Usually already computed by the prefetcher while the user picked options
+        depth_map = self.take_prefetched(job_id, input_path, 'depth')
+        if depth_map is None:
+            with Image.open(input_path) as img:
+                image_array = self._powerful_depth_input(img)
+
+            # Advanced depth estimation (memoized per source image: other qualities
+            # and dimensions of the same upload reuse it)
+            depth_map = self.depth_estimator.estimate_depth(
+                image_array,
+                digest=self._get_image_hash(Path(input_path)),
+                variant=POWERFUL_DEPTH_VARIANT
+            )
 
-        self.job_progress[job_id].update({
+        self.job_store.update(job_id, {
             "progress": 60,
             "step": "Generating advanced 3D mesh..."
         })
-        self.emit_event('job_update', {'job_id': job_id, **self.job_progress[job_id]})
 
         # Advanced mesh generation
         vertices, faces = self.mesh_generator.generate_mesh(
@@ -4856,11 +4765,10 @@ class OrfeasUnifiedServer:
             except Exception as e:
                 logger.warning(f"[WARN] Mesh optimization failed: {e}")
 
-        self.job_progress[job_id].update({
+        self.job_store.update(job_id, {
             "progress": 85,
             "step": "Writing STL file..."
         })
-        self.emit_event('job_update', {'job_id': job_id, **self.job_progress[job_id]})
 
         # Write STL file
         output_file = f"model_{job_id}.{format_type}"
@@ -4876,11 +4784,10 @@ class OrfeasUnifiedServer:
         log_with_flush('info', "[DIAGNOSTIC] ========== standard_3d_generation START ==========")
         log_with_flush('info', f"[AI] Using standard 3D generation")
 
-        self.job_progress[job_id].update({
+        self.job_store.update(job_id, {
             "progress": 50,
             "step": "Generating 3D mesh..."
         })
-        self.emit_event('job_update', {'job_id': job_id, **self.job_progress[job_id]})
 
         output_path = output_dir / f"model_{job_id}"
 
@@ -4933,10 +4840,14 @@ class OrfeasUnifiedServer:
                 f.write(f"  track_quality: {not self.is_testing and self.quality_validator is not None}\n")
                 f.flush()
 
+            # Background removal already done by the prefetcher, if it ran
+            prepared = self.take_prefetched(job_id, input_path, 'foreground')
+            extra = {'prepared_image': prepared} if prepared is not None else {}
             try:
                 result = self.processor_3d.image_to_3d_generation(
                     image_path=input_path,
                     output_path=output_path,
+                    **extra,
                     format=format_type,
                     quality=quality,
                     dimensions=dimensions,
@@ -4976,11 +4887,11 @@ class OrfeasUnifiedServer:
                     if generated_files:
                         # Add quality metrics to job progress
                         if quality_metrics:
-                            self.job_progress[job_id]['quality_metrics'] = {
+                            self.job_store.update(job_id, {'quality_metrics': {
                                 'overall_score': quality_metrics.get('overall_score', 0),
                                 'quality_grade': quality_metrics.get('quality_grade', 'N/A'),
                                 'printable': quality_metrics.get('final', {}).get('printable', False)
-                            }
+                            }})
                         return True, generated_files[0].name
             else:
                 # Backward compatibility: no quality metrics returned
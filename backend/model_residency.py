@@ -0,0 +1,589 @@
+"""
+ORFEAS Model Residency
+======================
+Keep one copy of the model weights per machine instead of one per worker.
+
+Every gunicorn worker used to build its own Hunyuan3D pipeline, so RAM and
+cold start grew with the worker count.  Two residency modes fix that:
+
+- ``host``: one long-lived model-host process owns the weights.  Workers hold
+  a ``RemoteProcessor`` and submit calls over a local Unix socket
+  (``multiprocessing.connection``, authenticated).  Arrays travel through
+  POSIX shared memory; only small descriptors are pickled
+- ``shared``: the gunicorn master loads the model before forking
+  (``preload_app``), with weights read through copy-on-write memory-mapped
+  safetensors, so workers share the same physical pages.  CPU only: a CUDA
+  context cannot cross ``fork``
+
+``process`` (the default) keeps the previous per-worker loading.
+
+Environment:
+    MODEL_RESIDENCY        process | host | shared (default: process)
+    MODEL_HOST_ADDRESS     Unix socket of the model host (default: data/model_host.sock)
+    MODEL_HOST_AUTHKEY     shared secret for the socket (default: derived from SECRET_KEY)
+    MODEL_HOST_LOADER      ``module:function`` building the hosted model
+                           (default: hunyuan_integration:create_resident_processor)
+"""
+
+import argparse
+import fcntl
+import hashlib
+import importlib
+import json
+import logging
+import os
+import subprocess
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from multiprocessing import AuthenticationError, resource_tracker, shared_memory
+from multiprocessing.connection import Client, Connection, Listener
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+RESIDENCY_PROCESS = 'process'
+RESIDENCY_HOST = 'host'
+RESIDENCY_SHARED = 'shared'
+RESIDENCY_MODES = (RESIDENCY_PROCESS, RESIDENCY_HOST, RESIDENCY_SHARED)
+
+DEFAULT_ADDRESS = 'data/model_host.sock'
+DEFAULT_LOADER = 'hunyuan_integration:create_resident_processor'
+# Smaller arrays are cheaper to pickle than to map
+SHARED_MEMORY_MIN_BYTES = 64 * 1024
+
+OP_PING = 'ping'
+OP_CALL = 'call'
+OP_SHUTDOWN = 'shutdown'
+
+
+def residency_mode() -> str:
+    mode = os.getenv('MODEL_RESIDENCY', RESIDENCY_PROCESS).lower()
+    if mode not in RESIDENCY_MODES:
+        logger.warning(f"[RESIDENCY] Unknown MODEL_RESIDENCY={mode!r}, using {RESIDENCY_PROCESS}")
+        return RESIDENCY_PROCESS
+    return mode
+
+
+def host_address() -> str:
+    return os.getenv('MODEL_HOST_ADDRESS', DEFAULT_ADDRESS)
+
+
+def host_authkey() -> bytes:
+    key = os.getenv('MODEL_HOST_AUTHKEY')
+    if key:
+        return key.encode()
+    secret = os.getenv('SECRET_KEY', 'orfeas-unified-orfeas-2025')
+    return hashlib.sha256(f"model-host|{secret}".encode()).digest()
+
+
+# =============================================================================
+# Shared-memory arrays
+# =============================================================================
+
+@dataclass(frozen=True)
+class SharedArrayRef:
+    """Pickled stand-in for an array that lives in shared memory"""
+    name: str
+    shape: Tuple[int, ...]
+    dtype: str
+
+
+def put_shared(array: np.ndarray) -> Tuple[SharedArrayRef, shared_memory.SharedMemory]:
+    """Copy ``array`` into a new shared-memory block (the caller unlinks it)"""
+    array = np.ascontiguousarray(array)
+    block = shared_memory.SharedMemory(create=True, size=max(1, array.nbytes))
+    np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[...] = array
+    return SharedArrayRef(block.name, tuple(array.shape), array.dtype.str), block
+
+
+def attach_shared(ref: SharedArrayRef, owner: bool = False) -> Tuple[np.ndarray, shared_memory.SharedMemory]:
+    """
+    Map a block created by another process
+
+    Args:
+        ref: Block descriptor
+        owner: This process takes over the block and unlinks it; otherwise
+            the creator keeps ownership
+    """
+    block = shared_memory.SharedMemory(name=ref.name)
+    if not owner:
+        # Attaching registers the block with this process's resource tracker,
+        # which would unlink it at exit
+        resource_tracker.unregister(block._name, 'shared_memory')
+    return np.ndarray(ref.shape, dtype=np.dtype(ref.dtype), buffer=block.buf), block
+
+
+def release_blocks(blocks: List[shared_memory.SharedMemory], unlink: bool) -> None:
+    for block in blocks:
+        try:
+            block.close()
+            if unlink:
+                block.unlink()
+        except (FileNotFoundError, BufferError):
+            pass
+
+
+def encode_arrays(value: Any, blocks: List[shared_memory.SharedMemory]) -> Any:
+    """Replace large arrays (top level, list/tuple items, dict values) with shared-memory refs"""
+    if isinstance(value, np.ndarray) and value.nbytes >= SHARED_MEMORY_MIN_BYTES:
+        ref, block = put_shared(value)
+        blocks.append(block)
+        return ref
+    if isinstance(value, (list, tuple)):
+        return type(value)(encode_arrays(item, blocks) for item in value)
+    if isinstance(value, dict):
+        return {key: encode_arrays(item, blocks) for key, item in value.items()}
+    return value
+
+
+def decode_arrays(value: Any, blocks: List[shared_memory.SharedMemory], owner: bool) -> Any:
+    """
+    Inverse of ``encode_arrays``
+
+    Args:
+        value: Encoded value
+        blocks: Collects the attached blocks
+        owner: Copy the arrays out and take ownership of the blocks (the
+            caller unlinks them); otherwise return views valid until the
+            blocks close
+    """
+    if isinstance(value, SharedArrayRef):
+        array, block = attach_shared(value, owner)
+        blocks.append(block)
+        return array.copy() if owner else array
+    if isinstance(value, (list, tuple)):
+        return type(value)(decode_arrays(item, blocks, owner) for item in value)
+    if isinstance(value, dict):
+        return {key: decode_arrays(item, blocks, owner) for key, item in value.items()}
+    return value
+
+
+# =============================================================================
+# Memory-mapped safetensors
+# =============================================================================
+
+SAFETENSORS_DTYPES: Dict[str, str] = {
+    'F64': '<f8', 'F32': '<f4', 'F16': '<f2', 'BF16': '<u2',  # bf16 stays raw bits
+    'I64': '<i8', 'I32': '<i4', 'I16': '<i2', 'I8': 'i1', 'U8': 'u1', 'BOOL': '?',
+}
+
+
+def load_safetensors_mmap(path: Path) -> Dict[str, np.ndarray]:
+    """
+    Map every tensor of a safetensors file without reading it
+
+    Arrays are copy-on-write views of the page cache: processes forked after
+    this call (or mapping the same file) share the pages until one writes.
+
+    Returns:
+        name -> array (``BF16`` tensors come back as raw ``uint16``)
+    """
+    path = Path(path)
+    with open(path, 'rb') as f:
+        header_size = int.from_bytes(f.read(8), 'little')
+        header = json.loads(f.read(header_size))
+    header.pop('__metadata__', None)
+    data_start = 8 + header_size
+    mapped = np.memmap(path, dtype=np.uint8, mode='c', offset=data_start) if header else None
+
+    tensors = {}
+    for name, info in header.items():
+        begin, end = info['data_offsets']
+        dtype = np.dtype(SAFETENSORS_DTYPES[info['dtype']])
+        tensors[name] = mapped[begin:end].view(dtype).reshape(info['shape'])
+    return tensors
+
+
+def save_safetensors(path: Path, tensors: Dict[str, np.ndarray]) -> None:
+    """Write arrays as a safetensors file (atomic)"""
+    reverse = {np.dtype(v).str: k for k, v in SAFETENSORS_DTYPES.items() if k != 'BF16'}
+    header, offset = {}, 0
+    arrays = {name: np.ascontiguousarray(array) for name, array in tensors.items()}
+    for name, array in arrays.items():
+        header[name] = {'dtype': reverse[array.dtype.str], 'shape': list(array.shape),
+                        'data_offsets': [offset, offset + array.nbytes]}
+        offset += array.nbytes
+    encoded = json.dumps(header).encode()
+    encoded += b' ' * (-len(encoded) % 8)  # keep tensor data 8-byte aligned
+
+    path = Path(path)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with open(tmp, 'wb') as f:
+        f.write(len(encoded).to_bytes(8, 'little'))
+        f.write(encoded)
+        for array in arrays.values():
+            f.write(array.tobytes())
+    os.replace(tmp, path)
+
+
+# =============================================================================
+# Model host
+# =============================================================================
+
+def resolve_loader(spec: str) -> Callable[[], Any]:
+    module, _, name = spec.partition(':')
+    return getattr(importlib.import_module(module), name)
+
+
+class ModelHost:
+    """
+    Process-wide owner of one model, serving calls over a Unix socket
+
+    Args:
+        loader: Builds the model (runs on a background thread, so pings
+            answer while it loads)
+        address: Unix socket path
+        authkey: Connection secret
+    """
+
+    def __init__(self, loader: Callable[[], Any], address: Optional[str] = None,
+                 authkey: Optional[bytes] = None):
+        self.loader = loader
+        self.address = address or host_address()
+        self.authkey = authkey or host_authkey()
+        self.model = None
+        self.error: Optional[str] = None
+        self.loaded = threading.Event()
+        self.stopping = threading.Event()
+        self._call_lock = threading.Lock()  # one inference at a time on the shared weights
+        self.calls = 0
+
+    def _load(self) -> None:
+        start = time.perf_counter()
+        try:
+            self.model = self.loader()
+            logger.info(f"[RESIDENCY] Model host loaded {type(self.model).__name__} "
+                        f"in {time.perf_counter() - start:.1f}s")
+        except Exception as e:
+            self.error = str(e)
+            logger.error(f"[RESIDENCY] Model host failed to load model: {e}")
+        finally:
+            self.loaded.set()
+
+    def _status(self) -> Dict[str, Any]:
+        return {'pid': os.getpid(), 'ready': self.loaded.is_set() and self.model is not None,
+                'loading': not self.loaded.is_set(), 'error': self.error, 'calls': self.calls}
+
+    def _handle(self, conn: Connection) -> None:
+        with conn:
+            while not self.stopping.is_set():
+                try:
+                    op, method, args, kwargs = conn.recv()
+                except (EOFError, OSError):
+                    return
+                if op == OP_PING:
+                    conn.send(('ok', self._status()))
+                    continue
+                if op == OP_SHUTDOWN:
+                    conn.send(('ok', None))
+                    self.stop()
+                    return
+                conn.send(self._call(method, args, kwargs))
+
+    def _call(self, method: str, args: Tuple, kwargs: Dict[str, Any]) -> Tuple[str, Any]:
+        self.loaded.wait()
+        if self.model is None:
+            return 'error', f"model unavailable: {self.error}"
+        inputs: List[shared_memory.SharedMemory] = []
+        outputs: List[shared_memory.SharedMemory] = []
+        result = None
+        try:
+            args = decode_arrays(args, inputs, owner=False)
+            kwargs = decode_arrays(kwargs, inputs, owner=False)
+            with self._call_lock:
+                self.calls += 1
+                result = getattr(self.model, method)(*args, **kwargs)
+            result = encode_arrays(result, outputs)
+            # The client unlinks result blocks after copying them out
+            release_blocks(outputs, unlink=False)
+            for block in outputs:
+                resource_tracker.unregister(block._name, 'shared_memory')
+            return 'ok', result
+        except Exception as e:
+            release_blocks(outputs, unlink=True)
+            logger.warning(f"[RESIDENCY] Hosted call {method} failed: {e}")
+            return 'error', f"{type(e).__name__}: {e}"
+        finally:
+            args = kwargs = result = None  # drop views before closing the input blocks
+            release_blocks(inputs, unlink=False)
+
+    def serve_forever(self) -> None:
+        Path(self.address).parent.mkdir(parents=True, exist_ok=True)
+        if os.path.exists(self.address):
+            os.unlink(self.address)
+        old_umask = os.umask(0o177)  # socket readable by this user only
+        try:
+            self._listener = Listener(self.address, family='AF_UNIX', authkey=self.authkey)
+        finally:
+            os.umask(old_umask)
+        threading.Thread(target=self._load, daemon=True, name="model-host-load").start()
+        logger.info(f"[RESIDENCY] Model host {os.getpid()} listening on {self.address}")
+        try:
+            while not self.stopping.is_set():
+                try:
+                    conn = self._listener.accept()
+                except (OSError, EOFError, AuthenticationError):
+                    if self.stopping.is_set():
+                        break
+                    continue
+                threading.Thread(target=self._handle, args=(conn,), daemon=True,
+                                 name="model-host-conn").start()
+        finally:
+            self._close()
+
+    def stop(self) -> None:
+        self.stopping.set()
+        # Wake the accept loop
+        try:
+            Client(self.address, family='AF_UNIX', authkey=self.authkey).close()
+        except OSError:
+            pass
+
+    def _close(self) -> None:
+        try:
+            self._listener.close()
+        except OSError:
+            pass
+
+
+class ModelHostError(RuntimeError):
+    """The model host is unreachable or a hosted call failed"""
+
+
+class ModelHostClient:
+    """
+    Worker-side connection to a ``ModelHost`` (one connection per thread)
+
+    Args:
+        address: Unix socket path
+        authkey: Connection secret
+    """
+
+    def __init__(self, address: Optional[str] = None, authkey: Optional[bytes] = None):
+        self.address = address or host_address()
+        self.authkey = authkey or host_authkey()
+        self._local = threading.local()
+
+    def _conn(self) -> Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            try:
+                conn = Client(self.address, family='AF_UNIX', authkey=self.authkey)
+            except OSError as e:
+                raise ModelHostError(f"model host unreachable at {self.address}: {e}") from e
+            self._local.conn = conn
+        return conn
+
+    def _request(self, message: Tuple) -> Any:
+        for attempt in (1, 2):
+            conn = self._conn()
+            try:
+                conn.send(message)
+                status, payload = conn.recv()
+                break
+            except (EOFError, OSError) as e:
+                self.close()
+                if attempt == 2:
+                    raise ModelHostError(f"model host connection lost: {e}") from e
+        if status != 'ok':
+            raise ModelHostError(payload)
+        return payload
+
+    def ping(self) -> Dict[str, Any]:
+        return self._request((OP_PING, None, (), {}))
+
+    def wait_ready(self, timeout: float = 600.0, poll_seconds: float = 0.2) -> bool:
+        """Wait until the host has finished loading (False on timeout or load failure)"""
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            try:
+                status = self.ping()
+                if not status['loading']:
+                    return status['ready']
+            except ModelHostError:
+                pass
+            time.sleep(poll_seconds)
+        return False
+
+    def call(self, method: str, *args: Any, **kwargs: Any) -> Any:
+        """Run ``model.<method>(*args, **kwargs)`` in the host; large arrays go through shared memory"""
+        blocks: List[shared_memory.SharedMemory] = []
+        try:
+            message = (OP_CALL, method, encode_arrays(args, blocks), encode_arrays(kwargs, blocks))
+            result = self._request(message)
+        finally:
+            release_blocks(blocks, unlink=True)
+        outputs: List[shared_memory.SharedMemory] = []
+        try:
+            return decode_arrays(result, outputs, owner=True)
+        finally:
+            release_blocks(outputs, unlink=True)
+
+    def shutdown_host(self) -> None:
+        try:
+            self._request((OP_SHUTDOWN, None, (), {}))
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            try:
+                conn.close()
+            except OSError:
+                pass
+            self._local.conn = None
+
+
+class RemoteProcessor:
+    """
+    Hunyuan3DProcessor-compatible proxy to the model host
+
+    Generation reads and writes files on the shared disk, so only paths and
+    options cross the socket; images for background removal go through
+    shared memory.
+    """
+
+    def __init__(self, client: Optional[ModelHostClient] = None, device: Optional[str] = None):
+        self.client = client or ModelHostClient()
+        self.device = device or 'host'
+
+    @property
+    def model_loaded(self) -> bool:
+        try:
+            return bool(self.client.ping()['ready'])
+        except ModelHostError:
+            return False
+
+    def load_model_background_safe(self) -> bool:
+        """Wait for the host to finish loading (the host owns the weights)"""
+        ready = self.client.wait_ready()
+        logger.info(f"[RESIDENCY] Model host at {self.client.address} "
+                    f"{'ready' if ready else 'not ready'}")
+        return ready
+
+    def _lazy_load_model(self) -> bool:
+        return self.model_loaded
+
+    def is_available(self) -> bool:
+        return self.model_loaded
+
+    def get_model_info(self) -> Dict[str, Any]:
+        try:
+            info = self.client.call('get_model_info')
+        except ModelHostError as e:
+            return {"status": "not_loaded", "error": str(e), "residency": RESIDENCY_HOST}
+        return {**info, "residency": RESIDENCY_HOST}
+
+    def generate_3d(self, image_path, output_path, **kwargs: Any):
+        try:
+            return self.client.call('generate_3d', str(image_path), str(output_path), **kwargs)
+        except ModelHostError as e:
+            logger.error(f"[RESIDENCY] Remote generate_3d failed: {e}")
+            return False
+
+    def image_to_3d_generation(self, image_path, output_path, **kwargs: Any):
+        try:
+            return self.client.call('image_to_3d_generation', Path(image_path), Path(output_path), **kwargs)
+        except ModelHostError as e:
+            logger.error(f"[RESIDENCY] Remote image_to_3d_generation failed: {e}")
+            return False
+
+    def text_to_image_generation(self, prompt: str, **kwargs: Any) -> bool:
+        try:
+            return self.client.call('text_to_image_generation', prompt, **kwargs)
+        except ModelHostError as e:
+            logger.error(f"[RESIDENCY] Remote text_to_image_generation failed: {e}")
+            return False
+
+    def remove_background(self, image):
+        from PIL import Image
+        img = Image.open(image) if isinstance(image, (str, Path)) else image
+        result = self.client.call('remove_background_array', np.asarray(img.convert('RGBA')))
+        return Image.fromarray(result, 'RGBA')
+
+
+# =============================================================================
+# Host process lifecycle
+# =============================================================================
+
+def start_model_host(loader: str = '', address: Optional[str] = None,
+                     env: Optional[Dict[str, str]] = None) -> subprocess.Popen:
+    """
+    Launch a model host in its own session (it outlives the launching worker)
+
+    Args:
+        loader: ``module:function`` building the model (default MODEL_HOST_LOADER)
+        address: Unix socket path (default MODEL_HOST_ADDRESS)
+        env: Extra environment for the host
+    """
+    loader = loader or os.getenv('MODEL_HOST_LOADER', DEFAULT_LOADER)
+    address = address or host_address()
+    command = [sys.executable, str(Path(__file__).resolve()), '--loader', loader, '--address', address]
+    process = subprocess.Popen(command, cwd=str(Path(__file__).parent), start_new_session=True,
+                               env={**os.environ, **(env or {})})
+    logger.info(f"[RESIDENCY] Started model host {process.pid} ({loader}) at {address}")
+    return process
+
+
+def ensure_model_host(loader: str = '', address: Optional[str] = None) -> Optional[subprocess.Popen]:
+    """
+    Start a model host unless one already answers at ``address``
+
+    A file lock next to the socket makes concurrent workers start exactly one.
+
+    Returns:
+        The started process, or None if a host was already running
+    """
+    address = address or host_address()
+    client = ModelHostClient(address)
+    try:
+        client.ping()
+        return None
+    except ModelHostError:
+        pass
+    finally:
+        client.close()
+
+    Path(address).parent.mkdir(parents=True, exist_ok=True)
+    with open(f"{address}.lock", 'w') as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            client.ping()
+            return None
+        except ModelHostError:
+            process = start_model_host(loader, address)
+        finally:
+            client.close()
+        # Hold the lock until the socket answers so siblings do not start another
+        deadline = time.monotonic() + 60
+        while time.monotonic() < deadline and process.poll() is None:
+            try:
+                client.ping()
+                break
+            except ModelHostError:
+                time.sleep(0.05)
+        client.close()
+        return process
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="ORFEAS model host")
+    parser.add_argument('--loader', default=os.getenv('MODEL_HOST_LOADER', DEFAULT_LOADER))
+    parser.add_argument('--address', default=host_address())
+    options = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s | %(levelname)-8s | %(name)s | %(message)s')
+    sys.path.insert(0, str(Path(__file__).parent))
+    ModelHost(resolve_loader(options.loader), options.address).serve_forever()
+
+
+if __name__ == '__main__':
+    # Run through the importable module so pickled SharedArrayRefs resolve to the same class
+    sys.path.insert(0, str(Path(__file__).parent))
+    import model_residency
+    model_residency.main()
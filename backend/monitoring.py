@@ -2,14 +2,15 @@
 ORFEAS Performance Monitoring and Metrics Collection
 Integrates Prometheus metrics for production observability
 """
-import os
-from prometheus_client import Counter, Histogram, Gauge, generate_latest, CONTENT_TYPE_LATEST
+from prometheus_client import Counter, Histogram, Gauge
 from functools import wraps
 import time
 import psutil
 import logging
 from typing import Any, Tuple
 
+from request_metrics import generate_latest_for_accept, init_request_metrics
+
 try:
     import torch
     TORCH_AVAILABLE = True
@@ -22,25 +23,8 @@ logger = logging.getLogger(__name__)
 # Prometheus Metrics Definitions
 # ============================================================================
 
-# Request metrics
-REQUEST_COUNT = Counter(
-    'orfeas_requests_total',
-    'Total number of HTTP requests',
-    ['method', 'endpoint', 'status']
-)
-
-REQUEST_DURATION = Histogram(
-    'orfeas_request_duration_seconds',
-    'HTTP request duration in seconds',
-    ['method', 'endpoint'],
-    buckets=(0.1, 0.5, 1.0, 2.0, 5.0, 10.0, 30.0, 60.0, 120.0, float('inf'))
-)
-
-REQUEST_IN_PROGRESS = Gauge(
-    'orfeas_requests_in_progress',
-    'Number of requests currently being processed',
-    ['endpoint']
-)
+# Request metrics (http_requests_total, http_request_duration_seconds,
+# http_requests_in_progress) are exported by request_metrics.RequestMetricsMiddleware
 
 # Generation metrics
 GENERATION_COUNT = Counter(
@@ -115,68 +99,13 @@ ERROR_COUNT = Counter(
 # Decorator Functions
 # ============================================================================
 
-def track_request_metrics(endpoint_name: Any) -> None:
+def track_request_metrics(endpoint_name: Any) -> Any:
     """
-    Decorator to track HTTP request metrics
-
-    Usage:
-        @track_request_metrics('/api/generate')
-        def generate_endpoint():
-            ...
+    Deprecated: HTTP request metrics are recorded by the WSGI middleware
+    installed in setup_monitoring(). Returns the view unchanged.
     """
-    def decorator(func: Any) -> None:
-        @wraps(func)
-        def wrapper(*args, **kwargs) -> None:
-            # [TEST MODE FIX] Skip monitoring entirely in test mode to prevent hangs
-            if os.getenv('TESTING', '0') == '1':
-                return func(*args, **kwargs)
-
-            start_time = time.time()
-            method = 'POST'  # Can be detected from Flask request
-            status = 500
-
-            # Track in-progress requests
-            REQUEST_IN_PROGRESS.labels(endpoint=endpoint_name).inc()
-
-            try:
-                response = func(*args, **kwargs)
-
-                # Get status code from response
-                if hasattr(response, 'status_code'):
-                    status = response.status_code
-                elif isinstance(response, tuple) and len(response) > 1:
-                    status = response[1]
-                else:
-                    status = 200
-
-                return response
-
-            except Exception as e:
-                logger.error(f"Error in {endpoint_name}: {e}")
-                ERROR_COUNT.labels(
-                    error_type=type(e).__name__,
-                    endpoint=endpoint_name
-                ).inc()
-                raise
-
-            finally:
-                duration = time.time() - start_time
-
-                # Record metrics
-                REQUEST_COUNT.labels(
-                    method=method,
-                    endpoint=endpoint_name,
-                    status=status
-                ).inc()
-
-                REQUEST_DURATION.labels(
-                    method=method,
-                    endpoint=endpoint_name
-                ).observe(duration)
-
-                REQUEST_IN_PROGRESS.labels(endpoint=endpoint_name).dec()
-
-        return wrapper
+    def decorator(func: Any) -> Any:
+        return func
     return decorator
 
 
@@ -300,7 +229,7 @@ def update_system_metrics() -> None:
 
 def setup_monitoring(app: Any) -> Tuple:
     """
-    Set up monitoring endpoints in Flask application
+    Set up request metrics middleware and monitoring endpoints in Flask application
 
     Usage:
         from monitoring import setup_monitoring
@@ -309,11 +238,16 @@ def setup_monitoring(app: Any) -> Tuple:
         setup_monitoring(app)
     """
 
+    from flask import request
+
+    init_request_metrics(app)
+
     @app.route('/metrics')
     def metrics() -> Tuple:
         """Prometheus metrics endpoint"""
         update_system_metrics()
-        return generate_latest(), 200, {'Content-Type': CONTENT_TYPE_LATEST}
+        data, content_type = generate_latest_for_accept(request.headers.get('Accept', ''))
+        return data, 200, {'Content-Type': content_type}
 
     @app.route('/health-detailed')
     def health_detailed() -> Tuple:
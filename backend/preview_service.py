@@ -0,0 +1,465 @@
+"""
+ORFEAS Preview Service
+======================
+Thumbnails and mesh previews for the studio pages.
+
+- WebP (and AVIF where Pillow supports it) thumbnails at a few fixed
+  widths, generated on a background pool right after upload from the
+  already-decoded image
+- Small off-screen renders of generated meshes (flat-shaded, painter's
+  algorithm) so galleries never download the model to show it
+- Content-addressed disk cache: derivatives are keyed by the source's
+  SHA-256 (``download_service.content_hash``), so identical uploads share
+  one set of files and the ETag never needs a second hash
+- LRU eviction once the cache exceeds ``PREVIEW_CACHE_MAX_BYTES``
+
+Environment:
+    PREVIEW_CACHE_DIR        cache root (default: backend/cache/previews)
+    PREVIEW_CACHE_MAX_BYTES  disk budget (default 512 MiB)
+    PREVIEW_WORKERS          background pool size (default 2)
+"""
+
+import io
+import logging
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+import numpy as np
+from flask import Response, send_file
+from PIL import Image, ImageDraw, features
+
+from download_service import content_hash
+
+logger = logging.getLogger(__name__)
+
+THUMBNAIL_SIZES: Tuple[int, ...] = (128, 256, 512)
+MESH_PREVIEW_SIZE = 256
+MESH_SUFFIXES = frozenset({'.stl', '.obj'})
+MAX_PREVIEW_FACES = 200_000
+DEFAULT_CACHE_MAX_BYTES = 512 * 1024 * 1024
+TOUCH_INTERVAL_SECONDS = 60.0  # refresh on-disk recency at most once a minute per file
+
+# format -> (Pillow format, mimetype, extension, save options), in preference order
+FORMATS: Dict[str, Tuple[str, str, str, Dict[str, Any]]] = {
+    'avif': ('AVIF', 'image/avif', '.avif', {'quality': 55, 'speed': 8}),
+    'webp': ('WEBP', 'image/webp', '.webp', {'quality': 80, 'method': 4}),
+}
+AVAILABLE_FORMATS: Tuple[str, ...] = tuple(
+    fmt for fmt in FORMATS if features.check(fmt)
+)
+
+_DIGEST_RE = re.compile(r'^[0-9a-f]{64}$')
+
+
+def snap_size(requested: int, sizes: Iterable[int] = THUMBNAIL_SIZES) -> int:
+    """Smallest fixed size that covers ``requested`` (largest if none does)"""
+    sizes = sorted(sizes)
+    for size in sizes:
+        if size >= requested:
+            return size
+    return sizes[-1]
+
+
+def negotiate_format(accept: Optional[str], formats: Iterable[str] = AVAILABLE_FORMATS) -> Optional[str]:
+    """First supported format the client accepts, or None (serve the original)"""
+    accept = (accept or '').lower()
+    for fmt in formats:
+        if FORMATS[fmt][1] in accept:
+            return fmt
+    return None
+
+
+# ---------------------------------------------------------------------------
+# Mesh previews
+# ---------------------------------------------------------------------------
+
+_STL_RECORD = np.dtype([('normal', '<f4', 3), ('vertices', '<f4', (3, 3)), ('attr', '<u2')])
+
+
+def load_mesh_arrays(path: Path) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Read an STL (binary or ASCII) or OBJ file without trimesh
+
+    Returns:
+        (vertices (n, 3) float32, faces (m, 3) int64)
+    """
+    path = Path(path)
+    data = path.read_bytes()
+    if path.suffix.lower() == '.obj':
+        vertices, faces = [], []
+        for line in data.decode('utf-8', errors='ignore').splitlines():
+            parts = line.split()
+            if not parts:
+                continue
+            if parts[0] == 'v':
+                vertices.append([float(x) for x in parts[1:4]])
+            elif parts[0] == 'f':
+                index = [int(p.split('/')[0]) for p in parts[1:]]
+                index = [i - 1 if i > 0 else len(vertices) + i for i in index]
+                faces.extend([index[0], index[k], index[k + 1]] for k in range(1, len(index) - 1))
+        return np.asarray(vertices, dtype=np.float32).reshape(-1, 3), np.asarray(faces, dtype=np.int64).reshape(-1, 3)
+
+    count = int.from_bytes(data[80:84], 'little') if len(data) >= 84 else -1
+    if count >= 0 and len(data) == 84 + count * _STL_RECORD.itemsize:
+        triangles = np.frombuffer(data, dtype=_STL_RECORD, count=count, offset=84)['vertices']
+    else:
+        coords = re.findall(rb'vertex\s+(\S+)\s+(\S+)\s+(\S+)', data)
+        triangles = np.asarray(coords, dtype=np.float32).reshape(-1, 3, 3)
+    vertices = np.ascontiguousarray(triangles, dtype=np.float32).reshape(-1, 3)
+    return vertices, np.arange(len(vertices), dtype=np.int64).reshape(-1, 3)
+
+
+def render_mesh_preview(vertices: np.ndarray, faces: np.ndarray, size: int = MESH_PREVIEW_SIZE,
+                        supersample: int = 2, color: Tuple[int, int, int] = (120, 150, 200),
+                        yaw_degrees: float = 35.0, pitch_degrees: float = 25.0) -> Image.Image:
+    """
+    Flat-shaded off-screen render of a mesh (RGBA, transparent background)
+
+    Back faces are culled and the rest drawn far-to-near; meshes above
+    ``MAX_PREVIEW_FACES`` are drawn from an even sample of their faces.
+    """
+    vertices = np.asarray(vertices, dtype=np.float64)
+    faces = np.asarray(faces, dtype=np.int64)
+    canvas = size * supersample
+    image = Image.new('RGBA', (canvas, canvas), (0, 0, 0, 0))
+    if len(faces) == 0:
+        return image.resize((size, size), Image.LANCZOS)
+    if len(faces) > MAX_PREVIEW_FACES:
+        faces = faces[np.linspace(0, len(faces) - 1, MAX_PREVIEW_FACES).astype(np.int64)]
+
+    yaw, pitch = np.radians(yaw_degrees), np.radians(pitch_degrees)
+    rot_y = np.array([[np.cos(yaw), 0, np.sin(yaw)], [0, 1, 0], [-np.sin(yaw), 0, np.cos(yaw)]])
+    rot_x = np.array([[1, 0, 0], [0, np.cos(pitch), -np.sin(pitch)], [0, np.sin(pitch), np.cos(pitch)]])
+    center = (vertices.min(axis=0) + vertices.max(axis=0)) / 2
+    view = (vertices - center) @ (rot_x @ rot_y).T
+    extent = np.abs(view[:, :2]).max() or 1.0
+    scale = canvas * 0.45 / extent
+
+    tri = view[faces]
+    normals = np.cross(tri[:, 1] - tri[:, 0], tri[:, 2] - tri[:, 0])
+    lengths = np.linalg.norm(normals, axis=1)
+    visible = (normals[:, 2] > 0) & (lengths > 0)
+    tri, normals, lengths = tri[visible], normals[visible], lengths[visible]
+
+    light = np.array([0.3, 0.5, 0.8])
+    light /= np.linalg.norm(light)
+    shade = 0.25 + 0.75 * np.clip((normals / lengths[:, None]) @ light, 0, 1)
+    order = np.argsort(tri[:, :, 2].mean(axis=1))  # far (small z) first
+    xy = np.empty((len(tri), 3, 2))
+    xy[:, :, 0] = canvas / 2 + tri[:, :, 0] * scale
+    xy[:, :, 1] = canvas / 2 - tri[:, :, 1] * scale
+    rgb = (np.asarray(color)[None, :] * shade[:, None]).astype(np.uint8)
+
+    draw = ImageDraw.Draw(image)
+    for i in order:
+        fill = tuple(rgb[i]) + (255,)
+        draw.polygon([tuple(p) for p in xy[i]], fill=fill)
+    return image.resize((size, size), Image.LANCZOS)
+
+
+# ---------------------------------------------------------------------------
+# Content-addressed derivative cache
+# ---------------------------------------------------------------------------
+
+class DerivativeCache:
+    """
+    Disk cache of derivatives keyed by source digest, with LRU eviction
+
+    Files live at ``root/<digest[:2]>/<digest>-<variant><ext>``. Recency is
+    tracked in memory and mirrored to mtime (throttled), so a restart or a
+    sibling worker rebuilds the same LRU order from disk.
+
+    Args:
+        root: Cache directory
+        max_bytes: Disk budget; least recently used files are deleted beyond it
+    """
+
+    def __init__(self, root: Path, max_bytes: int = DEFAULT_CACHE_MAX_BYTES):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self._index: 'OrderedDict[str, Tuple[int, float]]' = OrderedDict()
+        self._total = 0
+        self._lock = threading.Lock()
+        self.evictions = 0
+        self._load_index()
+
+    def _load_index(self) -> None:
+        entries = []
+        if self.root.exists():
+            for shard in os.scandir(self.root):
+                if not shard.is_dir():
+                    continue
+                for entry in os.scandir(shard.path):
+                    if entry.is_file() and not entry.name.endswith('.tmp'):
+                        st = entry.stat()
+                        entries.append((st.st_mtime, entry.path, st.st_size))
+        for mtime, path, size in sorted(entries):
+            self._index[path] = (size, mtime)
+            self._total += size
+        self._evict()
+
+    @property
+    def total_bytes(self) -> int:
+        return self._total
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def path_for(self, digest: str, variant: str, extension: str) -> Path:
+        if not _DIGEST_RE.match(digest):
+            raise ValueError(f"Invalid content digest: {digest!r}")
+        return self.root / digest[:2] / f"{digest}-{variant}{extension}"
+
+    def get(self, path: Path) -> Optional[Path]:
+        """Cached file, or None on a miss (the LRU position is refreshed on a hit)"""
+        key = str(path)
+        now = time.time()
+        with self._lock:
+            entry = self._index.get(key)
+            if entry is not None:
+                self._index.move_to_end(key)
+        if entry is None:
+            if not path.is_file():
+                return None
+            # Written by another worker: adopt it
+            size = path.stat().st_size
+            with self._lock:
+                if key not in self._index:
+                    self._index[key] = (size, now)
+                    self._total += size
+            self._evict()
+            return path
+        if now - entry[1] > TOUCH_INTERVAL_SECONDS:
+            try:
+                os.utime(path)
+            except FileNotFoundError:
+                self._forget(key)
+                return None
+            with self._lock:
+                if key in self._index:
+                    self._index[key] = (entry[0], now)
+        return path
+
+    def put(self, path: Path, data: bytes) -> Path:
+        """Atomically write ``data`` to ``path`` and account for it"""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+        key = str(path)
+        with self._lock:
+            previous = self._index.pop(key, None)
+            if previous is not None:
+                self._total -= previous[0]
+            self._index[key] = (len(data), time.time())
+            self._total += len(data)
+        self._evict()
+        return path
+
+    def _forget(self, key: str) -> None:
+        with self._lock:
+            entry = self._index.pop(key, None)
+            if entry is not None:
+                self._total -= entry[0]
+
+    def _evict(self) -> None:
+        victims = []
+        with self._lock:
+            while self._total > self.max_bytes and len(self._index) > 1:
+                key, (size, _) = self._index.popitem(last=False)
+                self._total -= size
+                victims.append(key)
+            self.evictions += len(victims)
+        for key in victims:
+            try:
+                os.unlink(key)
+            except OSError:
+                pass
+
+
+class PreviewService:
+    """
+    Thumbnail and mesh-preview derivatives
+
+    Args:
+        cache_dir: Derivative cache root
+        max_bytes: Disk budget for the cache
+        sizes: Thumbnail widths generated per image
+        workers: Background pool size
+    """
+
+    def __init__(self, cache_dir: Path, max_bytes: int = DEFAULT_CACHE_MAX_BYTES,
+                 sizes: Tuple[int, ...] = THUMBNAIL_SIZES, workers: int = 2):
+        self.cache = DerivativeCache(cache_dir, max_bytes)
+        self.sizes = tuple(sorted(sizes))
+        self.formats = AVAILABLE_FORMATS
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="preview")
+        logger.info(f"[PREVIEW] Derivative cache at {cache_dir} ({len(self.cache)} files, "
+                    f"formats {', '.join(self.formats) or 'none'})")
+
+    # -- generation ----------------------------------------------------------
+
+    @staticmethod
+    def _encode(image: Image.Image, fmt: str) -> bytes:
+        pil_format, _, _, options = FORMATS[fmt]
+        buffer = io.BytesIO()
+        image.save(buffer, format=pil_format, **options)
+        return buffer.getvalue()
+
+    @staticmethod
+    def _prepare(image: Image.Image) -> Image.Image:
+        if image.mode not in ('RGB', 'RGBA'):
+            image = image.convert('RGBA' if 'A' in image.getbands() or 'transparency' in image.info else 'RGB')
+        return image
+
+    def generate_thumbnails(self, image: Image.Image, digest: str,
+                            formats: Optional[Iterable[str]] = None,
+                            sizes: Optional[Iterable[int]] = None) -> Dict[Tuple[int, str], Path]:
+        """
+        Encode every (size, format) thumbnail of an already-decoded image
+
+        Each size is downscaled from the previous (larger) one, so the full
+        image is only resampled once.
+        """
+        formats = tuple(formats or self.formats)
+        written = {}
+        current = self._prepare(image)
+        for size in sorted(sizes or self.sizes, reverse=True):
+            if current.width > size:
+                height = max(1, round(current.height * size / current.width))
+                current = current.resize((size, height), Image.LANCZOS, reducing_gap=2.0)
+            for fmt in formats:
+                path = self.cache.path_for(digest, f"w{size}", FORMATS[fmt][2])
+                if self.cache.get(path) is None:
+                    self.cache.put(path, self._encode(current, fmt))
+                written[(size, fmt)] = path
+        return written
+
+    def generate_mesh_preview(self, mesh_path: Path, digest: str,
+                              formats: Optional[Iterable[str]] = None) -> Dict[str, Path]:
+        """Render a mesh once and store it in every preview format"""
+        formats = tuple(formats or self.formats)
+        vertices, faces = load_mesh_arrays(mesh_path)
+        image = render_mesh_preview(vertices, faces, MESH_PREVIEW_SIZE)
+        written = {}
+        for fmt in formats:
+            path = self.cache.path_for(digest, f"mesh{MESH_PREVIEW_SIZE}", FORMATS[fmt][2])
+            if self.cache.get(path) is None:
+                self.cache.put(path, self._encode(image, fmt))
+            written[fmt] = path
+        return written
+
+    def _submit(self, fn, *args) -> Future:
+        future = self._pool.submit(fn, *args)
+        future.add_done_callback(
+            lambda f: f.exception() and logger.warning(f"[PREVIEW] Derivative generation failed: {f.exception()}"))
+        return future
+
+    def schedule_thumbnails(self, image: Image.Image, digest: str) -> Future:
+        """Generate all thumbnails in the background (``image`` must not be mutated afterwards)"""
+        return self._submit(self.generate_thumbnails, image, digest)
+
+    def schedule_mesh_preview(self, mesh_path: Path) -> Future:
+        """Render a generated mesh's preview in the background"""
+        return self._submit(lambda: self.generate_mesh_preview(mesh_path, content_hash(mesh_path)))
+
+    # -- lookup --------------------------------------------------------------
+
+    def derivative(self, source: Path, requested_size: Optional[int],
+                   accept: Optional[str]) -> Optional[Tuple[Path, str, str]]:
+        """
+        Derivative to serve for ``source``
+
+        Misses are generated synchronously in the negotiated format only.
+
+        Returns:
+            (path, mimetype, etag) or None when the client accepts no
+            derivative format (serve the original)
+        """
+        fmt = negotiate_format(accept, self.formats)
+        if fmt is None:
+            return None
+        digest = content_hash(source)
+        extension, mimetype = FORMATS[fmt][2], FORMATS[fmt][1]
+
+        if Path(source).suffix.lower() in MESH_SUFFIXES:
+            variant = f"mesh{MESH_PREVIEW_SIZE}"
+            path = self.cache.path_for(digest, variant, extension)
+            if self.cache.get(path) is None:
+                path = self.generate_mesh_preview(source, digest, formats=(fmt,))[fmt]
+        else:
+            size = snap_size(requested_size or self.sizes[0], self.sizes)
+            variant = f"w{size}"
+            path = self.cache.path_for(digest, variant, extension)
+            if self.cache.get(path) is None:
+                with Image.open(source) as image:
+                    image.draft('RGB', (size, size))
+                    path = self.generate_thumbnails(image, digest, formats=(fmt,), sizes=(size,))[(size, fmt)]
+        return path, mimetype, f"{digest[:32]}-{variant}-{fmt}"
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=True)
+
+
+def send_preview(request: Any, path: Path, mimetype: str, etag: str,
+                 download_name: Optional[str] = None, vary_accept: bool = False,
+                 version: Optional[str] = None) -> Response:
+    """
+    Inline image response with a strong ETag
+
+    Args:
+        request: Current Flask request
+        path: File to send
+        mimetype: Content type
+        etag: Strong validator (content-derived)
+        download_name: Filename for ``Content-Disposition: inline``
+        vary_accept: The representation was negotiated from ``Accept``
+        version: Content version the URL was pinned to (``?v=``); a
+            matching pin makes the response immutable
+
+    Returns:
+        200/304 response sent with ``sendfile``
+    """
+    response = send_file(
+        str(path),
+        mimetype=mimetype,
+        as_attachment=False,
+        download_name=download_name,
+        conditional=True,
+        etag=etag,
+        max_age=None,
+    )
+    if vary_accept:
+        response.vary.add('Accept')
+    pinned = request.args.get('v')
+    if pinned and version and version.startswith(pinned):
+        response.cache_control.public = True
+        response.cache_control.max_age = 31536000
+        response.cache_control.immutable = True
+    else:
+        response.cache_control.no_cache = True
+    return response
+
+
+_preview_service: Optional[PreviewService] = None
+_preview_service_lock = threading.Lock()
+
+
+def get_preview_service() -> PreviewService:
+    """Get or create the preview service singleton (configured from the environment)"""
+    global _preview_service
+    with _preview_service_lock:
+        if _preview_service is None:
+            cache_dir = Path(os.getenv('PREVIEW_CACHE_DIR', str(Path(__file__).parent / 'cache' / 'previews')))
+            _preview_service = PreviewService(
+                cache_dir,
+                max_bytes=int(os.getenv('PREVIEW_CACHE_MAX_BYTES', str(DEFAULT_CACHE_MAX_BYTES))),
+                workers=int(os.getenv('PREVIEW_WORKERS', '2'))
+            )
+        return _preview_service
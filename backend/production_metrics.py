@@ -17,7 +17,6 @@ Exports Prometheus-compatible metrics for:
 import time
 import psutil
 import logging
-from functools import wraps
 from typing import Dict, List, Optional, Any, Tuple, Union
 from prometheus_client import (
     Counter, Histogram, Gauge, Summary,
@@ -30,19 +29,7 @@ logger = logging.getLogger(__name__)
 # PROMETHEUS METRICS DEFINITIONS
 # =============================================================================
 
-# API Metrics
-http_requests_total = Counter(
-    'flask_http_request_total',
-    'Total HTTP requests',
-    ['method', 'endpoint', 'status']
-)
-
-http_request_duration_seconds = Histogram(
-    'flask_http_request_duration_seconds',
-    'HTTP request latency',
-    ['method', 'endpoint'],
-    buckets=(0.1, 0.5, 1.0, 2.0, 5.0, 10.0, 30.0, 60.0)
-)
+# API request metrics are exported by request_metrics.RequestMetricsMiddleware
 
 # Generation Metrics
 generation_total = Counter(
@@ -109,56 +96,11 @@ cache_operations_total = Counter(
 
 def track_request(endpoint_name: str) -> Any:
     """
-    Decorator to automatically track HTTP request metrics
-
-    Usage:
-        @app.route('/api/generate')
-        @track_request('generate_3d')
-        def generate_3d() -> None:
-            ...
+    Deprecated: HTTP request metrics are recorded by the WSGI middleware
+    in request_metrics.py. Returns the view unchanged.
     """
     def decorator(f):
-        @wraps(f)
-        def wrapper(*args, **kwargs):
-            start_time = time.time()
-            method = 'GET'  # Default, will be overridden by actual request
-            status = 500  # Default to error
-
-            try:
-                # Get actual HTTP method if available
-                from flask import request
-                method = request.method
-
-                # Execute the actual function
-                result = f(*args, **kwargs)
-
-                # Determine status code
-                if isinstance(result, tuple):
-                    status = result[1] if len(result) > 1 else 200
-                else:
-                    status = 200
-
-                return result
-
-            except Exception as e:
-                logger.error(f"Request failed: {e}")
-                status = 500
-                raise
-
-            finally:
-                # Record metrics
-                duration = time.time() - start_time
-                http_requests_total.labels(
-                    method=method,
-                    endpoint=endpoint_name,
-                    status=status
-                ).inc()
-                http_request_duration_seconds.labels(
-                    method=method,
-                    endpoint=endpoint_name
-                ).observe(duration)
-
-        return wrapper
+        return f
     return decorator
 
 # =============================================================================
@@ -10,13 +10,30 @@ Features:
 - Multi-stage pipeline support
 - Configurable stage weights
 - Prometheus metrics integration (Phase 2.5)
+- Per-job event stream (``JobEventStream``) behind the Server-Sent Events
+  endpoint and long-polling ``/api/job-status?wait=``: numbered events
+  for ``Last-Event-ID`` resume, consecutive progress updates coalesced
+  in place, waiters woken per job instead of clients polling. Event ids
+  derive from job store versions, so every worker numbers a job's
+  events the same way
+
+Environment:
+    JOB_EVENTS_PER_JOB        events retained per job for resume (default 64)
+    JOB_EVENTS_MAX_JOBS       jobs with a retained stream, LRU (default 10000)
+    SSE_HEARTBEAT_SECONDS     idle seconds between heartbeat comments (default 15)
+    SSE_COALESCE_SECONDS      minimum gap between SSE writes; updates in between
+                              collapse into the latest (default 0.25)
 
 ORFEAS AI Project
 """
 
+import heapq
+import json
 import logging
+import os
 import time
-from typing import Dict, Optional, List
+from collections import OrderedDict, deque
+from typing import Any, Dict, Iterator, Optional, List
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 import threading
@@ -26,8 +43,213 @@ from prometheus_metrics import track_pipeline_stage, track_pipeline_stage_error
 
 logger = logging.getLogger(__name__)
 
+EVENTS_PER_JOB = int(os.getenv('JOB_EVENTS_PER_JOB', '64'))
+MAX_STREAM_JOBS = int(os.getenv('JOB_EVENTS_MAX_JOBS', '10000'))
+SSE_HEARTBEAT_SECONDS = float(os.getenv('SSE_HEARTBEAT_SECONDS', '15'))
+SSE_COALESCE_SECONDS = float(os.getenv('SSE_COALESCE_SECONDS', '0.25'))
+SSE_RETRY_MS = 3000
 
-@dataclass
+# Event types that only carry "latest state": a newer one replaces an unsent older one
+COALESCED_EVENTS = frozenset({'progress'})
+
+# Event ids per job store version: a store write with version v gets id
+# v * VERSION_STRIDE, local events until the next write take the ids after it
+VERSION_STRIDE = 1000
+
+
+def store_event_id(version: int) -> int:
+    """Event id of the job store write with ``version``"""
+    return version * VERSION_STRIDE
+
+
+@dataclass(frozen=True)
+class ProgressEvent:
+    """One numbered event in a job's stream"""
+    id: int
+    event: str
+    data: Dict[str, Any]
+    terminal: bool = False
+
+
+class _JobEvents:
+    """Retained events, merged state and waiters for one job"""
+
+    __slots__ = ('events', 'last_id', 'trimmed_id', 'state', 'terminal', 'changed')
+
+    def __init__(self, max_events: int, lock: threading.Lock):
+        self.events: deque = deque(maxlen=max_events)
+        self.last_id = 0
+        self.trimmed_id = 0  # newest id dropped off the front of ``events``
+        self.state: Dict[str, Any] = {}
+        self.terminal = False
+        self.changed = threading.Condition(lock)
+
+
+class JobEventStream:
+    """
+    Numbered per-job event log with blocking waits
+
+    Event ids increase per job, so a client resumes from its
+    ``Last-Event-ID``. Events published for a job store write carry the
+    store version and take its ``store_event_id``, which is the same in
+    every worker, so a client may resume or long-poll against any of
+    them; an id ahead of this worker just waits for the next write.
+    Consecutive progress events are coalesced in place
+    (the newer one takes a new id), which bounds the log and means a slow
+    or reconnecting client only sees the latest progress. A client whose
+    id has fallen out of the retained log gets one ``snapshot`` event of
+    the merged state instead.
+
+    Waiters block on a per-job condition sharing the stream lock, so a
+    publish wakes only that job's clients.
+
+    Args:
+        max_events: Events retained per job
+        max_jobs: Jobs retained (least recently published evicted first)
+    """
+
+    def __init__(self, max_events: int = EVENTS_PER_JOB, max_jobs: int = MAX_STREAM_JOBS):
+        self.max_events = max_events
+        self.max_jobs = max_jobs
+        self._lock = threading.Lock()
+        self._jobs: 'OrderedDict[str, _JobEvents]' = OrderedDict()
+        self.stats = {'published': 0, 'coalesced': 0, 'evicted': 0}
+
+    def _job(self, job_id: str) -> _JobEvents:
+        job = self._jobs.get(job_id)
+        if job is None:
+            job = self._jobs[job_id] = _JobEvents(self.max_events, self._lock)
+            while len(self._jobs) > self.max_jobs:
+                _, evicted = self._jobs.popitem(last=False)
+                evicted.terminal = True
+                evicted.changed.notify_all()
+                self.stats['evicted'] += 1
+        return job
+
+    def publish(self, job_id: str, event: str, data: Dict[str, Any], terminal: bool = False,
+                version: Optional[int] = None) -> int:
+        """
+        Append an event and wake the job's waiters
+
+        Args:
+            job_id: Job identifier
+            event: Event type
+            data: Event payload (merged into the job's state)
+            terminal: No events follow this one
+            version: Job store version the event reflects (None: local event)
+
+        Returns:
+            The event id
+        """
+        with self._lock:
+            job = self._job(job_id)
+            self._jobs.move_to_end(job_id)
+            if event in COALESCED_EVENTS and job.events and job.events[-1].event == event:
+                job.events.pop()
+                self.stats['coalesced'] += 1
+            elif len(job.events) == job.events.maxlen:
+                job.trimmed_id = job.events[0].id
+            job.last_id += 1
+            if version is not None:
+                job.last_id = max(job.last_id, store_event_id(version))
+            job.state.update(data)
+            job.events.append(ProgressEvent(job.last_id, event, data, terminal))
+            job.terminal = job.terminal or terminal
+            self.stats['published'] += 1
+            job.changed.notify_all()
+            return job.last_id
+
+    def version(self, job_id: str) -> int:
+        """Id of the job's latest event (0 if none)"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return job.last_id if job else 0
+
+    def _since(self, job: _JobEvents, last_id: int) -> List[ProgressEvent]:
+        if last_id >= job.last_id:
+            return []
+        if last_id < job.trimmed_id:
+            # Resume point no longer retained: hand over the merged state
+            return [ProgressEvent(job.last_id, 'snapshot', dict(job.state), job.terminal)]
+        # Ids missing in between were coalesced into a newer event
+        return [event for event in job.events if event.id > last_id]
+
+    def events_since(self, job_id: str, last_id: int) -> List[ProgressEvent]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return self._since(job, last_id) if job else []
+
+    def wait(self, job_id: str, last_id: int, timeout: float) -> List[ProgressEvent]:
+        """
+        Events after ``last_id``, blocking up to ``timeout`` seconds for one
+
+        Returns immediately when newer events exist or the job is finished.
+
+        Returns:
+            New events (empty on timeout)
+        """
+        with self._lock:
+            job = self._job(job_id)
+            job.changed.wait_for(lambda: job.last_id > last_id or job.terminal, timeout)
+            return self._since(job, last_id)
+
+    def is_terminal(self, job_id: str) -> bool:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return bool(job and job.terminal)
+
+    def discard(self, job_id: str) -> None:
+        with self._lock:
+            job = self._jobs.pop(job_id, None)
+            if job is not None:
+                job.terminal = True
+                job.changed.notify_all()
+
+    def get_stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {**self.stats, 'jobs': len(self._jobs)}
+
+
+def format_sse(event: ProgressEvent) -> str:
+    """Encode one event in the text/event-stream wire format"""
+    return f"id: {event.id}\nevent: {event.event}\ndata: {json.dumps(event.data, default=str)}\n\n"
+
+
+def sse_stream(stream: JobEventStream, job_id: str, last_event_id: int = 0,
+               heartbeat: float = SSE_HEARTBEAT_SECONDS,
+               coalesce: float = SSE_COALESCE_SECONDS) -> Iterator[str]:
+    """
+    Server-Sent Events body for one job
+
+    Sends the events after ``last_event_id``, then follows the stream until
+    a terminal event. Idle periods produce a heartbeat comment so proxies
+    keep the connection open. After each write the stream pauses for
+    ``coalesce`` seconds, so bursts of progress arrive as one update.
+
+    Args:
+        stream: Event source
+        job_id: Job identifier
+        last_event_id: Resume point (the client's ``Last-Event-ID``)
+        heartbeat: Idle seconds between heartbeat comments
+        coalesce: Minimum seconds between writes
+    """
+    yield f"retry: {SSE_RETRY_MS}\n\n"
+    while True:
+        events = stream.wait(job_id, last_event_id, heartbeat)
+        if not events:
+            if stream.is_terminal(job_id):
+                return
+            yield ": heartbeat\n\n"
+            continue
+        yield ''.join(format_sse(event) for event in events)
+        last_event_id = events[-1].id
+        if events[-1].terminal:
+            return
+        if coalesce > 0:
+            time.sleep(coalesce)
+
+
+@dataclass(slots=True)
 class StageInfo:
     """Information about a pipeline stage"""
     name: str
@@ -53,7 +275,7 @@ class StageInfo:
         return 0.0
 
 
-@dataclass
+@dataclass(slots=True)
 class JobProgress:
     """Tracks progress for a single job"""
     job_id: str
@@ -101,6 +323,11 @@ class ProgressTracker:
         self.ws_manager = websocket_manager
         self.jobs: Dict[str, JobProgress] = {}
         self._lock = threading.Lock()
+        # Min-heap of (started_at, job_id) for completed jobs so cleanup only
+        # visits expired entries instead of scanning every tracked job
+        self._completed_heap: List[tuple] = []
+        # Event stream for SSE / long-polling clients
+        self.events = JobEventStream()
 
         # Historical data for ETA calculation
         self.stage_durations: Dict[str, List[float]] = {
@@ -164,6 +391,7 @@ class ProgressTracker:
             # Emit WebSocket event
             if self.ws_manager:
                 self.ws_manager.emit_stage_change(job_id, stage_name)
+            self.events.publish(job_id, 'stage', {'stage': stage_name})
 
     def update_stage_progress(self, job_id: str, stage_name: str, progress: float):
         """
@@ -192,14 +420,17 @@ class ProgressTracker:
             # Calculate ETA
             self._calculate_eta(job)
 
+            update = {
+                'progress': job.overall_progress,
+                'stage': stage_name,
+                'stage_progress': stage.progress,
+                'eta_seconds': job.eta_seconds
+            }
+
             # Emit WebSocket event
             if self.ws_manager:
-                self.ws_manager.emit_progress(job_id, {
-                    'progress': job.overall_progress,
-                    'stage': stage_name,
-                    'stage_progress': stage.progress,
-                    'eta_seconds': job.eta_seconds
-                })
+                self.ws_manager.emit_progress(job_id, update)
+            self.events.publish(job_id, 'progress', update)
 
     def complete_stage(self, job_id: str, stage_name: str):
         """
@@ -253,18 +484,37 @@ class ProgressTracker:
             job.completed = True
             job.success = success
             job.overall_progress = 100.0
+            heapq.heappush(self._completed_heap, (job.started_at, job_id))
 
             total_duration = job.get_elapsed_time()
 
             logger.info(f"[ORFEAS] Job {job_id} completed: {'success' if success else 'failure'} "
                        f"(total: {total_duration:.2f}s)")
 
+            details = {
+                'duration': total_duration,
+                'stages': {name: stage.duration for name, stage in job.stages.items() if stage.duration}
+            }
+
             # Emit WebSocket event
             if self.ws_manager:
-                self.ws_manager.emit_completion(job_id, success, {
-                    'duration': total_duration,
-                    'stages': {name: stage.duration for name, stage in job.stages.items() if stage.duration}
-                })
+                self.ws_manager.emit_completion(job_id, success, details)
+            self.events.publish(job_id, 'complete', {'success': success, 'progress': 100.0, **details},
+                                terminal=True)
+
+    def publish_job_state(self, job_id: str, job_data: Dict[str, Any], terminal: bool = False,
+                          version: Optional[int] = None):
+        """
+        Forward a job store record to the job's event stream
+
+        Args:
+            job_id: Job identifier
+            job_data: Full job record (replaces the client's view)
+            terminal: The record is final (completed / failed)
+            version: Job store version of the record
+        """
+        self.events.publish(job_id, 'complete' if terminal else 'progress', job_data, terminal=terminal,
+                            version=version)
 
     def _calculate_overall_progress(self, job: JobProgress):
         """Calculate overall job progress based on stage weights"""
@@ -355,13 +605,16 @@ class ProgressTracker:
             cutoff = datetime.now() - timedelta(hours=max_age_hours)
 
             old_jobs = []
-            for job_id, job in self.jobs.items():
-                if job.completed and job.started_at < cutoff:
+            heap = self._completed_heap
+            while heap and heap[0][0] < cutoff:
+                started_at, job_id = heapq.heappop(heap)
+                job = self.jobs.get(job_id)
+                # Skip stale entries (job restarted or already removed)
+                if job is not None and job.completed and job.started_at == started_at:
+                    del self.jobs[job_id]
+                    self.events.discard(job_id)
                     old_jobs.append(job_id)
 
-            for job_id in old_jobs:
-                del self.jobs[job_id]
-
             if old_jobs:
                 logger.info(f"[ORFEAS] Cleaned up {len(old_jobs)} old jobs")
 
@@ -14,37 +14,25 @@ Date: October 14, 2025
 """
 
 from prometheus_client import (
-    Counter, Histogram, Gauge, Info, Summary,
-    generate_latest, REGISTRY, CONTENT_TYPE_LATEST
+    Counter, Histogram, Gauge, Info, Summary
 )
-from flask import Response
+from flask import Response, request
 import psutil
 import time
-import functools
-import os
-from typing import Callable, Any
+from typing import Callable
 import logging
 
+from request_metrics import generate_latest_for_accept, get_request_metrics_collector
+
 logger = logging.getLogger(__name__)
 
 # ============================================================================
 # Request Metrics
 # ============================================================================
 
-# Total HTTP requests
-http_requests_total = Counter(
-    'http_requests_total',
-    'Total HTTP requests',
-    ['method', 'endpoint', 'status']
-)
-
-# Request duration
-http_request_duration_seconds = Histogram(
-    'http_request_duration_seconds',
-    'HTTP request duration in seconds',
-    ['method', 'endpoint'],
-    buckets=(0.01, 0.05, 0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
-)
+# http_requests_total, http_request_duration_seconds and http_requests_in_progress
+# are exported by the WSGI middleware in request_metrics.py, which aggregates
+# per-thread shards on scrape instead of updating labelled children per request.
 
 # Request size
 http_request_size_bytes = Summary(
@@ -183,13 +171,6 @@ job_queue_size = Gauge(
     ['type']
 )
 
-# Concurrent requests
-concurrent_requests = Gauge(
-    'concurrent_requests',
-    'Number of concurrent requests being processed',
-    ['endpoint']
-)
-
 # Uptime
 app_uptime_seconds = Gauge(
     'app_uptime_seconds',
@@ -482,80 +463,21 @@ def update_gpu_metrics():
 
 
 # ============================================================================
-# Decorator for Automatic Metrics
+# Request Metrics (compatibility shim)
 # ============================================================================
 
 def track_request_metrics(endpoint: str):
     """
-    Decorator to automatically track request metrics.
+    Deprecated: request metrics are recorded by RequestMetricsMiddleware.
 
-    Args:
-        endpoint: Endpoint name for labeling
+    Kept so existing imports keep working; returns the view unchanged so
+    decorated routes pay no per-request cost.
 
-    Usage:
-        @app.route('/api/endpoint')
-        @track_request_metrics('api_endpoint')
-        def my_endpoint():
-            ...
+    Args:
+        endpoint: Ignored (the middleware labels requests by route template)
     """
     def decorator(func: Callable) -> Callable:
-        @functools.wraps(func)
-        def wrapper(*args, **kwargs):
-            # [ORFEAS] ORFEAS FIX: Skip metrics in test mode to prevent blocking
-            if os.getenv('TESTING') == '1' or os.getenv('FLASK_ENV') == 'testing':
-                return func(*args, **kwargs)
-
-            method = 'GET'  # Default, will be overridden by Flask
-            start_time = time.time()
-
-            # Track concurrent requests
-            concurrent_requests.labels(endpoint=endpoint).inc()
-
-            try:
-                # Execute function
-                result = func(*args, **kwargs)
-
-                # Track success
-                duration = time.time() - start_time
-                http_request_duration_seconds.labels(
-                    method=method,
-                    endpoint=endpoint
-                ).observe(duration)
-
-                http_requests_total.labels(
-                    method=method,
-                    endpoint=endpoint,
-                    status='200'
-                ).inc()
-
-                return result
-
-            except Exception as e:
-                # Track error
-                duration = time.time() - start_time
-                http_request_duration_seconds.labels(
-                    method=method,
-                    endpoint=endpoint
-                ).observe(duration)
-
-                http_requests_total.labels(
-                    method=method,
-                    endpoint=endpoint,
-                    status='500'
-                ).inc()
-
-                errors_total.labels(
-                    type=type(e).__name__,
-                    endpoint=endpoint
-                ).inc()
-
-                raise
-
-            finally:
-                # Decrement concurrent requests
-                concurrent_requests.labels(endpoint=endpoint).dec()
-
-        return wrapper
+        return func
     return decorator
 
 
@@ -579,11 +501,9 @@ def metrics_endpoint() -> Response:
     update_system_metrics()
     update_gpu_metrics()
 
-    # Generate metrics
-    return Response(
-        generate_latest(REGISTRY),
-        mimetype=CONTENT_TYPE_LATEST
-    )
+    # Generate metrics (OpenMetrics when requested so exemplars are included)
+    data, content_type = generate_latest_for_accept(request.headers.get('Accept', ''))
+    return Response(data, mimetype=content_type)
 
 
 # ============================================================================
@@ -912,8 +832,7 @@ __all__ = [
     'track_pipeline_stage_error',
 
     # Metrics (for manual use)
-    'http_requests_total',
-    'http_request_duration_seconds',
+    'get_request_metrics_collector',
     'errors_total',
     'text_to_image_generations_total',
     'model_3d_generations_total',
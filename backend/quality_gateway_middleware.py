@@ -10,21 +10,42 @@ Features:
 - Automated quality enforcement
 - Quality-based request routing
 - Real-time quality monitoring
+
+Gates are evaluated off the request path: requests only add to rolling,
+time-bucketed counters and histograms (O(1), bounded memory), a
+background evaluator scores the gates from those aggregates every
+interval, and the before-request hook reads the latest cached verdict.
+
+Environment:
+    QUALITY_GATE_INTERVAL      seconds between gate evaluations (default 1.0)
+    QUALITY_BUCKET_SECONDS     width of one rolling-window bucket (default 10)
+    QUALITY_HISTORY_SIZE       per-request history entries kept (default 10000)
 """
 
 import os
 import time
+import bisect
 import logging
 from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional, Callable
+from typing import Dict, List, Any, Optional, Callable, Tuple
 from dataclasses import dataclass, asdict
 from functools import wraps
 from flask import Flask, request, g, jsonify, abort
 import threading
-from collections import defaultdict, deque
+from collections import deque
+from itertools import islice
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_EVALUATION_INTERVAL = 1.0
+DEFAULT_BUCKET_SECONDS = 10.0
+DEFAULT_HISTORY_SIZE = 10000
+WINDOW_SECONDS = 3600  # longest look-back any gate uses
+
+# Response-time histogram upper bounds in seconds (plus an overflow bucket)
+RESPONSE_TIME_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0,
+                         10.0, 20.0, 30.0, 60.0, 120.0, 300.0)
+
 @dataclass
 class QualityGate:
     """Quality gate configuration"""
@@ -48,19 +69,125 @@ class QualityCheck:
     timestamp: float
     remediation_suggested: List[str]
 
+@dataclass(frozen=True)
+class GateVerdict:
+    """Result of one background evaluation of all enabled gates (shared, read-only)"""
+    checks: Tuple[QualityCheck, ...]
+    failed: Tuple[QualityCheck, ...]
+    quality_score: float
+    gate_summary: Tuple[Dict[str, Any], ...]
+    evaluated_at: float
+
+
+class _WindowBucket:
+    """Request outcomes within one time bucket"""
+
+    __slots__ = ('epoch', 'count', 'errors', 'total', 'bucket_counts')
+
+    def __init__(self, bucket_count: int):
+        self.epoch = -1
+        self.count = 0
+        self.errors = 0
+        self.total = 0.0
+        self.bucket_counts = [0] * (bucket_count + 1)
+
+
+class RollingRequestWindow:
+    """
+    Request counts, errors and a response-time histogram over a sliding window
+
+    A ring of fixed-width time buckets: recording touches one bucket
+    (reset in place when its time slot comes round again), so memory is
+    constant whatever the traffic and aggregating is O(buckets).
+    """
+
+    def __init__(self, window_seconds: float = WINDOW_SECONDS, bucket_seconds: float = DEFAULT_BUCKET_SECONDS,
+                 buckets: Tuple[float, ...] = RESPONSE_TIME_BUCKETS):
+        self.bucket_seconds = bucket_seconds
+        self.buckets = tuple(sorted(buckets))
+        self.ring = [_WindowBucket(len(self.buckets)) for _ in range(int(window_seconds // bucket_seconds) + 1)]
+        self._lock = threading.Lock()
+
+    def record(self, duration: float, success: bool, now: Optional[float] = None) -> None:
+        epoch = int((time.time() if now is None else now) // self.bucket_seconds)
+        index = bisect.bisect_left(self.buckets, duration)
+        bucket = self.ring[epoch % len(self.ring)]
+        with self._lock:
+            if bucket.epoch != epoch:
+                bucket.epoch = epoch
+                bucket.count = bucket.errors = 0
+                bucket.total = 0.0
+                bucket.bucket_counts = [0] * (len(self.buckets) + 1)
+            bucket.count += 1
+            bucket.total += duration
+            bucket.bucket_counts[index] += 1
+            if not success:
+                bucket.errors += 1
+
+    def snapshot(self, seconds: float, now: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Aggregate the buckets covering the last ``seconds``
+
+        Returns:
+            count, errors, error_rate, mean and p50/p95/p99 response time
+            (histogram bucket upper bounds; None without requests)
+        """
+        current = int((time.time() if now is None else now) // self.bucket_seconds)
+        oldest = current - min(int(seconds // self.bucket_seconds), len(self.ring) - 1)
+        count = errors = 0
+        total = 0.0
+        histogram = [0] * (len(self.buckets) + 1)
+        with self._lock:
+            for bucket in self.ring:
+                if oldest <= bucket.epoch <= current:
+                    count += bucket.count
+                    errors += bucket.errors
+                    total += bucket.total
+                    for i, n in enumerate(bucket.bucket_counts):
+                        histogram[i] += n
+
+        def percentile(q: float) -> Optional[float]:
+            if not count:
+                return None
+            rank, seen = q * count, 0
+            for i, n in enumerate(histogram):
+                seen += n
+                if seen >= rank:
+                    return self.buckets[i] if i < len(self.buckets) else float('inf')
+            return float('inf')
+
+        return {
+            'count': count,
+            'errors': errors,
+            'error_rate': errors / count if count else 0.0,
+            'mean': total / count if count else None,
+            'p50': percentile(0.50),
+            'p95': percentile(0.95),
+            'p99': percentile(0.99)
+        }
+
+
 class QualityGatewayMiddleware:
     """
     Quality gate enforcement middleware for Flask applications
     """
 
-    def __init__(self, app: Optional[Flask] = None):
+    def __init__(self, app: Optional[Flask] = None, evaluation_interval: Optional[float] = None):
         self.app = app
         self.quality_gates = {}
-        self.quality_history = deque(maxlen=10000)
-        self.quality_metrics = defaultdict(list)
+        self.quality_history = deque(maxlen=int(os.getenv('QUALITY_HISTORY_SIZE', str(DEFAULT_HISTORY_SIZE))))
+        self.request_window = RollingRequestWindow(
+            bucket_seconds=float(os.getenv('QUALITY_BUCKET_SECONDS', str(DEFAULT_BUCKET_SECONDS))))
         self.bypass_tokens = set()
         self.middleware_enabled = True
+        self.evaluation_interval = evaluation_interval if evaluation_interval is not None else \
+            float(os.getenv('QUALITY_GATE_INTERVAL', str(DEFAULT_EVALUATION_INTERVAL)))
+        self.evaluations = 0
+        self._evaluator: Optional[threading.Thread] = None
+        self._evaluator_lock = threading.Lock()
+        self._stop = threading.Event()
         self.setup_default_gates()
+        self.verdict = self.evaluate_gates()
 
         if app:
             self.init_app(app)
@@ -128,22 +255,73 @@ class QualityGatewayMiddleware:
         ))
 
     def add_quality_gate(self, gate: QualityGate):
-        """Add quality gate configuration"""
+        """Add quality gate configuration (takes effect at the next evaluation)"""
         self.quality_gates[gate.gate_id] = gate
         logger.info(f"[ORFEAS] Added quality gate: {gate.gate_id}")
 
+    def evaluate_gates(self) -> GateVerdict:
+        """Score every enabled gate from the rolling aggregates (evaluator thread)"""
+
+        checks = tuple(self.execute_quality_gate(gate) for gate in list(self.quality_gates.values()) if gate.enabled)
+        failed = tuple(check for check in checks if not check.passed)
+        verdict = GateVerdict(
+            checks=checks,
+            failed=failed,
+            quality_score=sum(check.score for check in checks) / len(checks) if checks else 1.0,
+            gate_summary=tuple(asdict(check) for check in checks),
+            evaluated_at=time.time()
+        )
+        previous = getattr(self, 'verdict', None)
+        self.verdict = verdict  # single reference swap: requests see the old or the new verdict
+        self.evaluations += 1
+
+        # Log on changes rather than once per request
+        if previous is None or {c.gate_id for c in previous.failed} != {c.gate_id for c in failed}:
+            self.log_quality_gate_results({'gate_results': list(checks), 'quality_score': verdict.quality_score})
+        return verdict
+
+    def start_evaluator(self) -> None:
+        """Start the background evaluator (idempotent; also restarts it after a fork)"""
+        with self._evaluator_lock:
+            if self._evaluator is not None and self._evaluator.is_alive():
+                return
+            self._stop.clear()
+            self._evaluator = threading.Thread(target=self._evaluate_loop, name="quality-gate-evaluator",
+                                               daemon=True)
+            self._evaluator.start()
+
+    def stop_evaluator(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        evaluator = self._evaluator
+        if evaluator is not None:
+            evaluator.join(timeout)
+
+    def _evaluate_loop(self) -> None:
+        while not self._stop.wait(self.evaluation_interval):
+            try:
+                self.evaluate_gates()
+            except Exception as e:
+                logger.error(f"[ORFEAS] Quality gate evaluation failed: {e}")
+
     def before_request_quality_gate(self):
-        """Execute quality gates before request processing"""
+        """Apply the latest gate verdict before request processing"""
 
         if not self.middleware_enabled:
             return
 
         try:
+            evaluator = self._evaluator
+            if evaluator is None or not evaluator.is_alive():
+                self.start_evaluator()
+
+            verdict = self.verdict
+
             # Initialize request quality context
             g.quality_context = {
                 'start_time': time.time(),
-                'gate_results': [],
-                'quality_score': 1.0,
+                'gate_results': verdict.checks,
+                'gate_summary': verdict.gate_summary,
+                'quality_score': verdict.quality_score,
                 'bypass_active': False,
                 'remediation_applied': []
             }
@@ -154,23 +332,11 @@ class QualityGatewayMiddleware:
                 logger.debug("[ORFEAS] Quality gates bypassed for request")
                 return
 
-            # Execute all enabled quality gates
-            for gate_id, gate in self.quality_gates.items():
-                if gate.enabled:
-                    check_result = self.execute_quality_gate(gate)
-                    g.quality_context['gate_results'].append(check_result)
-
-                    # Handle gate failure
-                    if not check_result.passed:
-                        self.handle_gate_failure(gate, check_result)
-
-            # Calculate overall quality score
-            if g.quality_context['gate_results']:
-                scores = [result.score for result in g.quality_context['gate_results']]
-                g.quality_context['quality_score'] = sum(scores) / len(scores)
-
-            # Log quality gate results
-            self.log_quality_gate_results(g.quality_context)
+            # Enforce failed gates
+            for check_result in verdict.failed:
+                gate = self.quality_gates.get(check_result.gate_id)
+                if gate is not None and gate.enabled:
+                    self.handle_gate_failure(gate, check_result)
 
         except Exception as e:
             logger.error(f"[ORFEAS] Quality gate execution failed: {e}")
@@ -244,13 +410,11 @@ class QualityGatewayMiddleware:
 
         try:
             # Get recent response times
-            recent_times = self.get_recent_response_times(minutes=5)
+            avg_time = self.get_recent_response_stats(minutes=5)['mean']
 
-            if not recent_times:
+            if avg_time is None:
                 return 0.8  # Default score
 
-            avg_time = sum(recent_times) / len(recent_times)
-
             # Score based on response time (target: <10s)
             if avg_time < 5:
                 return 1.0
@@ -346,8 +510,8 @@ class QualityGatewayMiddleware:
                 self.apply_adaptive_measures(gate, check_result)
 
             elif gate.enforcement_level == "warning":
-                # Log warning but continue
-                logger.warning(f"[ORFEAS] Quality gate warning: {check_result.message}")
+                # Continue; the evaluator logs the failure once when it starts
+                logger.debug(f"[ORFEAS] Quality gate warning: {check_result.message}")
 
             # Apply remediation actions
             self.apply_remediation_actions(gate, check_result)
@@ -476,7 +640,7 @@ class QualityGatewayMiddleware:
             # Add quality headers to response
             if not g.quality_context.get('bypass_active', False):
                 response.headers['X-Quality-Score'] = str(g.quality_context.get('quality_score', 1.0))
-                response.headers['X-Quality-Gates'] = str(len(g.quality_context.get('gate_results', [])))
+                response.headers['X-Quality-Gates'] = str(len(g.quality_context.get('gate_results', ())))
 
                 if g.quality_context.get('service_degraded', False):
                     response.headers['X-Service-Degraded'] = g.quality_context.get('degradation_level', 'unknown')
@@ -506,32 +670,10 @@ class QualityGatewayMiddleware:
             logger.error(f"[ORFEAS] Quality context cleanup failed: {e}")
 
     def update_quality_metrics(self, response, processing_time: float):
-        """Update quality metrics based on request outcome"""
+        """Update quality metrics based on request outcome (one rolling-window bucket)"""
 
         try:
-            timestamp = time.time()
-
-            # Performance metrics
-            self.quality_metrics['response_times'].append({
-                'timestamp': timestamp,
-                'value': processing_time
-            })
-
-            # Reliability metrics
-            success = response.status_code < 400
-            self.quality_metrics['requests'].append({
-                'timestamp': timestamp,
-                'success': success,
-                'status_code': response.status_code
-            })
-
-            # Cleanup old metrics (keep last hour)
-            cutoff_time = timestamp - 3600
-            for metric_type in self.quality_metrics:
-                self.quality_metrics[metric_type] = [
-                    m for m in self.quality_metrics[metric_type]
-                    if m['timestamp'] > cutoff_time
-                ]
+            self.request_window.record(processing_time, response.status_code < 400)
 
         except Exception as e:
             logger.error(f"[ORFEAS] Quality metrics update failed: {e}")
@@ -543,7 +685,8 @@ class QualityGatewayMiddleware:
             history_entry = {
                 'timestamp': time.time(),
                 'quality_score': quality_context.get('quality_score', 1.0),
-                'gate_results': [asdict(result) for result in quality_context.get('gate_results', [])],
+                # Shared with every request that saw the same verdict
+                'gate_results': quality_context.get('gate_summary', ()),
                 'processing_time': processing_time,
                 'status_code': response.status_code,
                 'success': response.status_code < 400,
@@ -557,35 +700,23 @@ class QualityGatewayMiddleware:
         except Exception as e:
             logger.error(f"[ORFEAS] Quality history storage failed: {e}")
 
-    def get_recent_response_times(self, minutes: int = 5) -> List[float]:
-        """Get recent response times"""
+    def get_recent_response_stats(self, minutes: int = 5) -> Dict[str, Any]:
+        """Get recent response time statistics (count, mean, p50/p95/p99)"""
 
         try:
-            cutoff_time = time.time() - (minutes * 60)
-            recent_metrics = [
-                m['value'] for m in self.quality_metrics['response_times']
-                if m['timestamp'] > cutoff_time
-            ]
-            return recent_metrics if recent_metrics else [15.0]  # Default
+            stats = self.request_window.snapshot(minutes * 60)
+            if stats['mean'] is None:
+                stats['mean'] = 15.0  # Default
+            return stats
 
         except Exception:
-            return [15.0]
+            return {'count': 0, 'mean': 15.0}
 
     def get_recent_error_rate(self, minutes: int = 15) -> float:
         """Get recent error rate"""
 
         try:
-            cutoff_time = time.time() - (minutes * 60)
-            recent_requests = [
-                m for m in self.quality_metrics['requests']
-                if m['timestamp'] > cutoff_time
-            ]
-
-            if not recent_requests:
-                return 0.0
-
-            failed_requests = len([r for r in recent_requests if not r['success']])
-            return failed_requests / len(recent_requests)
+            return self.request_window.snapshot(minutes * 60)['error_rate']
 
         except Exception:
             return 0.0
@@ -639,7 +770,7 @@ class QualityGatewayMiddleware:
             overall_score = sum(current_scores.values()) / len(current_scores)
 
             # Get recent gate results
-            recent_history = list(self.quality_history)[-100:]  # Last 100 requests
+            recent_history = list(islice(reversed(self.quality_history), 100))  # Last 100 requests
             gate_pass_rate = len([h for h in recent_history if h['quality_score'] >= 0.85]) / len(recent_history) if recent_history else 1.0
 
             return {
@@ -651,6 +782,8 @@ class QualityGatewayMiddleware:
                 'enabled_gates': len([g for g in self.quality_gates.values() if g.enabled]),
                 'recent_requests': len(recent_history),
                 'bypass_tokens_active': len(self.bypass_tokens),
+                'last_evaluated': datetime.utcfromtimestamp(self.verdict.evaluated_at).isoformat(),
+                'evaluations': self.evaluations,
                 'last_updated': datetime.utcnow().isoformat()
             }
 
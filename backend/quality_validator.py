@@ -11,13 +11,26 @@ Features:
 - Final mesh quality scoring
 - Auto-repair for low-quality outputs
 - Prometheus metrics integration
+- Validation levels: fast (sampled, latency-budgeted), standard, thorough (exhaustive)
+- Independent stages validated concurrently; mesh topology cached across stages
 
 Priority: #1 from Top 5 Recommended Features
 Purpose: Ensure consistently high-quality 3D outputs with automatic quality assurance
+
+Environment:
+    QUALITY_VALIDATION_LEVEL    default level: fast, standard or thorough (default standard)
+    QUALITY_FAST_BUDGET_MS      latency budget of the fast level (default 100)
+    QUALITY_VALIDATOR_WORKERS   threads for concurrent stage checks (default 4)
 """
 
+import os
+import math
+import threading
 import numpy as np
 import logging
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, wait
+from dataclasses import dataclass
 from PIL import Image
 from typing import Dict, Tuple, Any, Optional
 import trimesh
@@ -27,6 +40,208 @@ import hashlib
 
 logger = logging.getLogger(__name__)
 
+# Confidence of the sampling error bounds reported by the sampled levels
+SAMPLING_CONFIDENCE = 0.95
+
+# Per-level work limits: None means every pixel / every edge
+VALIDATION_LEVELS: Dict[str, Dict[str, Any]] = {
+    'fast': {
+        'max_pixels': 65536,        # pixels sampled for coverage, histograms, colours, contrast
+        'max_image_side': 256,      # edge detection resolution
+        'edge_samples': 8192,       # face edges sampled for topology
+        'repair': False,            # repair is left to a standard/thorough pass
+        'budget_ms': float(os.getenv('QUALITY_FAST_BUDGET_MS', '100'))
+    },
+    'standard': {
+        'max_pixels': 262144,
+        'max_image_side': 1024,
+        'edge_samples': None,
+        'repair': True,
+        'budget_ms': None
+    },
+    'thorough': {
+        'max_pixels': None,
+        'max_image_side': None,
+        'edge_samples': None,
+        'repair': True,
+        'budget_ms': None
+    }
+}
+
+TOPOLOGY_CACHE_SIZE = 8
+
+_validation_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_validation_executor() -> ThreadPoolExecutor:
+    """Shared thread pool for stage checks (numpy/OpenCV release the GIL)"""
+    global _validation_executor
+    with _executor_lock:
+        if _validation_executor is None:
+            _validation_executor = ThreadPoolExecutor(
+                max_workers=int(os.getenv('QUALITY_VALIDATOR_WORKERS', '4')),
+                thread_name_prefix='quality-validator'
+            )
+        return _validation_executor
+
+
+def sampling_error_bound(samples: int, confidence: float = SAMPLING_CONFIDENCE) -> float:
+    """Hoeffding half-width for a proportion estimated from ``samples`` uniform draws"""
+    if samples <= 0:
+        return 1.0
+    return math.sqrt(math.log(2.0 / (1.0 - confidence)) / (2.0 * samples))
+
+
+@dataclass
+class MeshTopology:
+    """
+    Edge statistics of one mesh state, shared by the shape and final stages
+
+    Ratios are over face-edge incidences; with ``sampled`` they are
+    estimates within ``error_bound`` at SAMPLING_CONFIDENCE.
+    """
+    face_count: int
+    vertex_count: int
+    boundary_ratio: float           # edges used by a single face
+    non_manifold_ratio: float       # edges used by more than two faces
+    inconsistent_winding_ratio: float   # shared edges both faces traverse the same way
+    volume: float
+    bounds: np.ndarray
+    sampled: bool = False
+    error_bound: float = 0.0
+
+    @property
+    def watertight(self) -> bool:
+        return self.boundary_ratio == 0.0 and self.non_manifold_ratio == 0.0
+
+    @property
+    def winding_consistent(self) -> bool:
+        return self.inconsistent_winding_ratio == 0.0
+
+
+def compute_mesh_topology(vertices: np.ndarray, faces: np.ndarray, edge_samples: Optional[int] = None,
+                          seed: int = 0) -> MeshTopology:
+    """
+    Vectorised watertightness, winding and volume of a triangle mesh
+
+    Exact mode sorts all 3F edge keys once.  With ``edge_samples`` only that
+    many face edges are drawn, and their multiplicity is counted over the
+    few edges that share a vertex with them: one linear pass over the face
+    indices instead of a sort of every edge.
+
+    Args:
+        vertices: (V, 3) vertex positions
+        faces: (F, 3) vertex indices
+        edge_samples: Sample size, or None for the exact computation
+        seed: Sampling seed (repeatable results for the same mesh)
+    """
+    vertices = np.asarray(vertices, dtype=np.float64)
+    faces = np.asarray(faces, dtype=np.int64)
+    if len(faces) == 0 or len(vertices) == 0:
+        raise ValueError("Mesh has no faces")
+
+    # Face edge k (0 <= k < 3F) runs from flat[k] to the next vertex of the same face:
+    # face i walks (f0, f1), (f1, f2), (f2, f0) at positions 3i .. 3i+2
+    flat = faces.ravel()
+
+    def edge_keys(index: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Undirected keys of the given face edges, and +1/-1 for their walking direction"""
+        start = flat[index]
+        end = flat[index + np.where(index % 3 == 2, -2, 1)]
+        low = np.minimum(start, end)
+        # +1 where the face walks the edge low -> high; opposite walks sum to zero
+        return low * len(vertices) + np.maximum(start, end), np.where(start == low, 1, -1)
+
+    rng = np.random.default_rng(seed)
+    sampled = edge_samples is not None and len(flat) > edge_samples
+    if sampled:
+        picked = rng.integers(0, len(flat), edge_samples)
+        picked_keys, _ = edge_keys(picked)
+        unique_keys, inverse = np.unique(picked_keys, return_inverse=True)
+        # An edge matching a sampled edge starts at one of its two vertices: one boolean
+        # gather over the face indices leaves a few candidate edges per sample
+        endpoint = np.zeros(len(vertices), dtype=bool)
+        endpoint[unique_keys // len(vertices)] = True
+        endpoint[unique_keys % len(vertices)] = True
+        candidates = np.flatnonzero(endpoint[flat])
+        candidate_keys, candidate_direction = edge_keys(candidates)
+        position = np.minimum(np.searchsorted(unique_keys, candidate_keys), len(unique_keys) - 1)
+        match = unique_keys[position] == candidate_keys
+        counts = np.bincount(position[match], minlength=len(unique_keys))
+        windings = np.bincount(position[match], weights=candidate_direction[match], minlength=len(unique_keys))
+    else:
+        keys, direction = edge_keys(np.arange(len(flat)))
+        unique_keys, inverse, counts = np.unique(keys, return_inverse=True, return_counts=True)
+        windings = np.bincount(inverse, weights=direction, minlength=len(unique_keys))
+    per_pick_count = counts[inverse]
+    per_pick_winding = windings[inverse]
+
+    shared = per_pick_count == 2
+    total = len(per_pick_count)
+
+    if sampled:
+        face_index = rng.integers(0, len(faces), min(edge_samples, len(faces)))
+        scale = len(faces) / len(face_index)
+    else:
+        face_index = slice(None)
+        scale = 1.0
+    triangles = vertices[faces[face_index]]
+    volume = float(np.einsum('ij,ij->i', triangles[:, 0], np.cross(triangles[:, 1], triangles[:, 2])).sum()
+                   / 6.0 * scale)
+
+    return MeshTopology(
+        face_count=len(faces),
+        vertex_count=len(vertices),
+        boundary_ratio=float(np.count_nonzero(per_pick_count == 1) / total),
+        non_manifold_ratio=float(np.count_nonzero(per_pick_count > 2) / total),
+        inconsistent_winding_ratio=float(np.count_nonzero(shared & (per_pick_winding != 0)) / total),
+        volume=volume,
+        bounds=np.array([vertices.min(axis=0), vertices.max(axis=0)]),
+        sampled=sampled,
+        error_bound=sampling_error_bound(total) if sampled else 0.0
+    )
+
+
+def _sample_rows(array: np.ndarray, max_pixels: Optional[int], seed: int = 0) -> np.ndarray:
+    """(N, C) pixels of an (H, W[, C]) image, uniformly sampled down to ``max_pixels``"""
+    pixels = array.reshape(array.shape[0] * array.shape[1], -1)
+    if max_pixels is None or len(pixels) <= max_pixels:
+        return pixels
+    return pixels[np.random.default_rng(seed).integers(0, len(pixels), max_pixels)]
+
+
+def _edge_density(channel: np.ndarray, max_side: Optional[int]) -> float:
+    """
+    Canny edge pixels per pixel, at full resolution
+
+    Above ``max_side`` the channel is downscaled first; edge pixels scale
+    with the side length and pixels with its square, so the density is
+    rescaled by the downscale factor.
+    """
+    height, width = channel.shape[:2]
+    factor = 1.0
+    if max_side is not None and max(height, width) > max_side:
+        factor = max_side / max(height, width)
+        channel = cv2.resize(channel, (max(1, round(width * factor)), max(1, round(height * factor))),
+                             interpolation=cv2.INTER_AREA)
+    edges = cv2.Canny(np.ascontiguousarray(channel), 50, 150)
+    return float(np.count_nonzero(edges) / edges.size * factor)
+
+
+def _colour_histogram(pixels: np.ndarray) -> np.ndarray:
+    """8x8x8 RGB histogram (same bins as cv2.calcHist with [8, 8, 8] over 0-256)"""
+    rgb = pixels[:, :3].astype(np.int32) >> 5
+    return np.bincount((rgb[:, 0] << 6) | (rgb[:, 1] << 3) | rgb[:, 2], minlength=512).astype(np.float64)
+
+
+def _histogram_correlation(first: np.ndarray, second: np.ndarray) -> float:
+    """cv2.compareHist(..., HISTCMP_CORREL) (scale invariant, so no normalisation needed)"""
+    a = first - first.mean()
+    b = second - second.mean()
+    denominator = math.sqrt(float((a * a).sum() * (b * b).sum()))
+    return float((a * b).sum() / denominator) if denominator > 1e-12 else 1.0
+
 
 class GenerationQualityValidator:
     """
@@ -41,40 +256,86 @@ class GenerationQualityValidator:
     Auto-repairs meshes with quality scores below thresholds.
     """
 
-    def __init__(self, quality_threshold: float = 0.80):
+    def __init__(self, quality_threshold: float = 0.80, validation_level: Optional[str] = None):
         """
         Initialize quality validator
 
         Args:
             quality_threshold: Minimum acceptable quality score (0.0-1.0)
+            validation_level: Default level (fast, standard, thorough);
+                QUALITY_VALIDATION_LEVEL if not given
         """
         self.quality_threshold = quality_threshold
+        self.validation_level = validation_level or os.getenv('QUALITY_VALIDATION_LEVEL', 'standard')
+        if self.validation_level not in VALIDATION_LEVELS:
+            raise ValueError(f"Unknown validation level: {self.validation_level}")
         self.stats = {
             'total_validations': 0,
             'passed_validations': 0,
             'failed_validations': 0,
             'auto_repairs': 0,
+            'budget_overruns': 0,
+            'topology_cache_hits': 0,
             'quality_scores': []
         }
+        self._topology_cache: 'OrderedDict[Tuple, MeshTopology]' = OrderedDict()
+        self._topology_lock = threading.Lock()
 
         logger.info("[QUALITY] GenerationQualityValidator initialized")
-        logger.info(f"[QUALITY] Quality threshold: {quality_threshold:.2f}")
+        logger.info(f"[QUALITY] Quality threshold: {quality_threshold:.2f}, level: {self.validation_level}")
+
+    def _level(self, level: Optional[str]) -> Tuple[str, Dict[str, Any]]:
+        level = level or self.validation_level
+        if level not in VALIDATION_LEVELS:
+            raise ValueError(f"Unknown validation level: {level}")
+        return level, VALIDATION_LEVELS[level]
+
+    def mesh_topology(self, mesh: trimesh.Trimesh, level: Optional[str] = None) -> MeshTopology:
+        """
+        Topology of the mesh in its current state, cached across stages
+
+        Keyed on trimesh's content hash, which changes whenever the mesh
+        is modified (e.g. by repair), so a stale entry is never returned.
+        """
+        _, tier = self._level(level)
+        key = (id(mesh), hash(mesh), tier['edge_samples'])
+        with self._topology_lock:
+            topology = self._topology_cache.get(key)
+            if topology is not None:
+                self._topology_cache.move_to_end(key)
+                self.stats['topology_cache_hits'] += 1
+                return topology
+
+        topology = compute_mesh_topology(mesh.vertices, mesh.faces, tier['edge_samples'])
+        with self._topology_lock:
+            self._topology_cache[key] = topology
+            while len(self._topology_cache) > TOPOLOGY_CACHE_SIZE:
+                self._topology_cache.popitem(last=False)
+        return topology
 
     def validate_generation_pipeline(
         self,
         original_image: Image.Image,
         bg_removed_image: Optional[Image.Image] = None,
         generated_mesh: Optional[trimesh.Trimesh] = None,
-        texture_image: Optional[Image.Image] = None
+        texture_image: Optional[Image.Image] = None,
+        level: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Validate entire 3D generation pipeline with quality metrics
 
+        Background removal, texture and the mesh stages (shape, repair,
+        final) are independent and run concurrently.  At the fast level,
+        checks still running when the latency budget is spent are skipped;
+        the result is then ``inconclusive`` and does not pass the threshold.
+        The caller's mesh is never modified (repairs work on a copy).
+
         Args:
             original_image: Original input image
             bg_removed_image: Image after background removal (optional)
             generated_mesh: Generated 3D mesh (optional)
             texture_image: Applied texture image (optional)
+            level: fast, standard or thorough (default: the validator's level)
 
         Returns:
             Dict with quality metrics for each stage and overall score
@@ -83,6 +344,7 @@ class GenerationQualityValidator:
 
         metrics = {
             'timestamp': None,
+            'validation_level': level or self.validation_level,
             'bg_removal_quality': None,
             'shape_quality': None,
             'texture_quality': None,
@@ -91,71 +353,74 @@ class GenerationQualityValidator:
             'quality_grade': 'F',
             'issues_detected': [],
             'auto_repairs_applied': [],
+            'skipped_checks': [],
+            'inconclusive': False,
             'passed_threshold': False
         }
 
         try:
+            level, tier = self._level(level)
+            executor = get_validation_executor()
+            futures = {}
+
             # Stage 1: Background removal quality
             if bg_removed_image is not None:
-                bg_quality = self.validate_background_removal(
-                    original_image, bg_removed_image
+                futures['bg_removal_quality'] = executor.submit(
+                    self.validate_background_removal, original_image, bg_removed_image, level
                 )
-                metrics['bg_removal_quality'] = bg_quality
 
-                if bg_quality['score'] < self.quality_threshold:
-                    metrics['issues_detected'].append(
-                        f"Low background removal quality: {bg_quality['score']:.2f}"
-                    )
-
-            # Stage 2: Shape generation accuracy
+            # Stages 2 and 4: Shape generation accuracy, repair, final mesh validation
             if generated_mesh is not None:
-                shape_quality = self.validate_shape_generation(generated_mesh)
-                metrics['shape_quality'] = shape_quality
-
-                if shape_quality['score'] < self.quality_threshold:
-                    metrics['issues_detected'].append(
-                        f"Low shape quality: {shape_quality['score']:.2f}"
-                    )
-
-                # Auto-repair non-manifold geometry
-                if not shape_quality['manifold']:
-                    logger.warning("[QUALITY] Non-manifold geometry detected - attempting repair")
-                    repaired_mesh = self._repair_mesh(generated_mesh)
-                    if repaired_mesh is not None:
-                        generated_mesh = repaired_mesh
-                        metrics['auto_repairs_applied'].append("Non-manifold geometry repair")
-                        self.stats['auto_repairs'] += 1
-
-                        # Re-validate after repair
-                        shape_quality = self.validate_shape_generation(generated_mesh)
-                        metrics['shape_quality'] = shape_quality
+                futures['mesh'] = executor.submit(self._validate_mesh_stages, generated_mesh, level)
 
             # Stage 3: Texture coherence
             if texture_image is not None and generated_mesh is not None:
-                texture_quality = self.validate_texture_coherence(
-                    texture_image, generated_mesh
+                futures['texture_quality'] = executor.submit(
+                    self.validate_texture_coherence, texture_image, generated_mesh, level
                 )
-                metrics['texture_quality'] = texture_quality
 
-                if texture_quality['score'] < self.quality_threshold:
-                    metrics['issues_detected'].append(
-                        f"Low texture quality: {texture_quality['score']:.2f}"
-                    )
+            budget = tier['budget_ms'] / 1000.0 if tier['budget_ms'] else None
+            done, _ = wait(futures.values(), timeout=budget)
 
-            # Stage 4: Final mesh validation
-            if generated_mesh is not None:
-                final_quality = self.validate_final_mesh(generated_mesh)
-                metrics['final_quality'] = final_quality
+            results = {}
+            for name, future in futures.items():
+                if future in done:
+                    results[name] = future.result()
+                else:
+                    future.cancel()
+                    skipped = ['shape_quality', 'final_quality'] if name == 'mesh' else [name]
+                    metrics['skipped_checks'].extend(skipped)
+            if metrics['skipped_checks']:
+                metrics['inconclusive'] = True
+                self.stats['budget_overruns'] += 1
+                metrics['issues_detected'].append(
+                    f"Latency budget exceeded, skipped: {', '.join(metrics['skipped_checks'])}"
+                )
 
-                if final_quality['score'] < self.quality_threshold:
-                    metrics['issues_detected'].append(
-                        f"Low final mesh quality: {final_quality['score']:.2f}"
-                    )
+            if 'mesh' in results:
+                shape_quality, final_quality, repaired = results.pop('mesh')
+                results['shape_quality'] = shape_quality
+                results['final_quality'] = final_quality
+                if repaired:
+                    metrics['auto_repairs_applied'].append("Non-manifold geometry repair")
+                    self.stats['auto_repairs'] += 1
+
+            # Issues in stage order
+            for name, label in (('bg_removal_quality', 'background removal'), ('shape_quality', 'shape'),
+                                ('texture_quality', 'texture'), ('final_quality', 'final mesh')):
+                if results.get(name) is not None:
+                    metrics[name] = results[name]
+                    if results[name]['score'] < self.quality_threshold:
+                        metrics['issues_detected'].append(
+                            f"Low {label} quality: {results[name]['score']:.2f}"
+                        )
 
             # Compute overall quality score
             metrics['overall_score'] = self._compute_overall_score(metrics)
             metrics['quality_grade'] = self._compute_quality_grade(metrics['overall_score'])
-            metrics['passed_threshold'] = metrics['overall_score'] >= self.quality_threshold
+            # The overall score only covers the checks that ran: a skipped check cannot pass
+            metrics['passed_threshold'] = (metrics['overall_score'] >= self.quality_threshold
+                                           and not metrics['inconclusive'])
 
             # Update statistics
             if metrics['passed_threshold']:
@@ -163,7 +428,8 @@ class GenerationQualityValidator:
             else:
                 self.stats['failed_validations'] += 1
 
-            self.stats['quality_scores'].append(metrics['overall_score'])
+            if not metrics['inconclusive']:
+                self.stats['quality_scores'].append(metrics['overall_score'])
 
             # Log results
             if metrics['passed_threshold']:
@@ -172,6 +438,11 @@ class GenerationQualityValidator:
                     f"Score: {metrics['overall_score']:.3f} | "
                     f"Grade: {metrics['quality_grade']}"
                 )
+            elif metrics['inconclusive']:
+                logger.warning(
+                    f"[QUALITY]  Validation INCONCLUSIVE | "
+                    f"Skipped: {', '.join(metrics['skipped_checks'])}"
+                )
             else:
                 logger.warning(
                     f"[QUALITY]  Validation FAILED | "
@@ -187,10 +458,44 @@ class GenerationQualityValidator:
             metrics['issues_detected'].append(f"Validation error: {str(e)}")
             return metrics
 
+    def _validate_mesh_stages(
+        self,
+        mesh: trimesh.Trimesh,
+        level: str
+    ) -> Tuple[Dict[str, Any], Dict[str, Any], bool]:
+        """Shape validation, auto-repair and final validation (sequential: repair changes the mesh)"""
+        _, tier = self._level(level)
+        repaired = False
+        shape_quality = self.validate_shape_generation(mesh, level)
+
+        # Repair and fix_normals modify the mesh. Work on a copy: the caller's mesh
+        # is shared with the texture check and this chain can outlive a budget overrun
+        if (not shape_quality['manifold'] and tier['repair']) or \
+                not shape_quality.get('winding_consistent', False):
+            mesh = mesh.copy()
+
+        # Auto-repair non-manifold geometry
+        if not shape_quality['manifold'] and tier['repair']:
+            logger.warning("[QUALITY] Non-manifold geometry detected - attempting repair")
+            repaired_mesh = self._repair_mesh(mesh)
+            if repaired_mesh is not None:
+                mesh = repaired_mesh
+                repaired = True
+
+                # Re-validate after repair
+                shape_quality = self.validate_shape_generation(mesh, level)
+        elif not shape_quality['manifold']:
+            shape_quality['repair_deferred'] = True
+
+        # Same mesh state as the shape check: the topology comes from the cache
+        final_quality = self.validate_final_mesh(mesh, level)
+        return shape_quality, final_quality, repaired
+
     def validate_background_removal(
         self,
         original_image: Image.Image,
-        bg_removed_image: Image.Image
+        bg_removed_image: Image.Image,
+        level: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Validate background removal quality
@@ -200,20 +505,27 @@ class GenerationQualityValidator:
         - Edge sharpness (how clean the cutout is)
         - Subject preservation (did we keep important parts?)
 
+        Coverage and histograms use up to the level's ``max_pixels``
+        uniformly sampled pixels (coverage within ``coverage_error_bound``);
+        edges are detected at up to ``max_image_side``.
+
         Args:
             original_image: Original input image
             bg_removed_image: Image after background removal
+            level: fast, standard or thorough (default: the validator's level)
 
         Returns:
             Dict with background removal quality metrics
         """
         try:
+            _, tier = self._level(level)
+
             # Convert to numpy arrays
-            original_np = np.array(original_image)
-            bg_removed_np = np.array(bg_removed_image)
+            original_np = np.asarray(original_image)
+            bg_removed_np = np.asarray(bg_removed_image)
 
             # Extract alpha channel if present
-            if bg_removed_np.shape[-1] == 4:
+            if bg_removed_np.ndim == 3 and bg_removed_np.shape[-1] == 4:
                 alpha_channel = bg_removed_np[:, :, 3]
             else:
                 # If no alpha, assume background is pure black or white
@@ -222,12 +534,12 @@ class GenerationQualityValidator:
 
             # Metric 1: Subject coverage (% of non-transparent pixels)
             total_pixels = alpha_channel.size
-            subject_pixels = np.sum(alpha_channel > 128)
-            coverage_ratio = subject_pixels / total_pixels
+            alpha_sample = _sample_rows(alpha_channel, tier['max_pixels'])
+            coverage_ratio = float(np.count_nonzero(alpha_sample > 128) / len(alpha_sample))
+            subject_pixels = round(coverage_ratio * total_pixels)
 
             # Metric 2: Edge sharpness (transition quality)
-            edges = cv2.Canny(alpha_channel, 50, 150)
-            edge_density = np.sum(edges > 0) / total_pixels
+            edge_density = _edge_density(alpha_channel, tier['max_image_side'])
 
             # Sharp edges should have moderate density (not too jagged, not too blurry)
             edge_sharpness = 1.0 - abs(edge_density - 0.05) / 0.05
@@ -235,25 +547,11 @@ class GenerationQualityValidator:
 
             # Metric 3: Subject preservation (did we lose important details?)
             # Compare original and bg-removed histograms
-            if original_np.shape[-1] >= 3 and bg_removed_np.shape[-1] >= 3:
-                original_hist = cv2.calcHist(
-                    [original_np[:, :, :3]], [0, 1, 2], None,
-                    [8, 8, 8], [0, 256, 0, 256, 0, 256]
-                )
-                bg_removed_hist = cv2.calcHist(
-                    [bg_removed_np[:, :, :3]], [0, 1, 2], None,
-                    [8, 8, 8], [0, 256, 0, 256, 0, 256]
-                )
-
-                # Normalize histograms
-                original_hist = cv2.normalize(original_hist, original_hist).flatten()
-                bg_removed_hist = cv2.normalize(bg_removed_hist, bg_removed_hist).flatten()
-
-                # Compare histograms (higher correlation = better preservation)
-                preservation = cv2.compareHist(
-                    original_hist.reshape(-1, 1).astype(np.float32),
-                    bg_removed_hist.reshape(-1, 1).astype(np.float32),
-                    cv2.HISTCMP_CORREL
+            if original_np.ndim == 3 and bg_removed_np.ndim == 3 and \
+                    original_np.shape[-1] >= 3 and bg_removed_np.shape[-1] >= 3:
+                preservation = _histogram_correlation(
+                    _colour_histogram(_sample_rows(original_np, tier['max_pixels'])),
+                    _colour_histogram(_sample_rows(bg_removed_np, tier['max_pixels']))
                 )
             else:
                 preservation = 0.85  # Default if comparison not possible
@@ -269,6 +567,7 @@ class GenerationQualityValidator:
             return {
                 'score': bg_score,
                 'coverage_ratio': coverage_ratio,
+                'coverage_error_bound': sampling_error_bound(len(alpha_sample)) if len(alpha_sample) < total_pixels else 0.0,
                 'edge_sharpness': edge_sharpness,
                 'subject_preservation': preservation,
                 'subject_pixels': int(subject_pixels),
@@ -282,7 +581,7 @@ class GenerationQualityValidator:
                 'error': str(e)
             }
 
-    def validate_shape_generation(self, mesh: trimesh.Trimesh) -> Dict[str, Any]:
+    def validate_shape_generation(self, mesh: trimesh.Trimesh, level: Optional[str] = None) -> Dict[str, Any]:
         """
         Validate 3D shape generation quality
 
@@ -295,17 +594,20 @@ class GenerationQualityValidator:
 
         Args:
             mesh: Generated 3D mesh
+            level: fast, standard or thorough (default: the validator's level)
 
         Returns:
             Dict with shape quality metrics
         """
         try:
+            topology = self.mesh_topology(mesh, level)
+
             # Metric 1: Manifold status (CRITICAL for 3D printing)
-            is_manifold = mesh.is_watertight
+            is_manifold = topology.watertight
             manifold_score = 1.0 if is_manifold else 0.0
 
             # Metric 2: Triangle count quality
-            triangle_count = len(mesh.faces)
+            triangle_count = topology.face_count
 
             # Ideal range: 5,000 - 50,000 triangles
             # Too few = low detail, too many = performance issues
@@ -320,7 +622,7 @@ class GenerationQualityValidator:
                 triangle_quality = max(0.5, 1.0 - (triangle_count - 50000) / 100000)
 
             # Metric 3: Topology quality (vertex/triangle ratio)
-            vertex_count = len(mesh.vertices)
+            vertex_count = topology.vertex_count
             if triangle_count > 0:
                 vt_ratio = vertex_count / triangle_count
                 # Ideal ratio: ~0.5 to 0.6 (good topology)
@@ -330,18 +632,11 @@ class GenerationQualityValidator:
                 topology_quality = 0.0
 
             # Metric 4: Volume quality (non-zero, reasonable size)
-            try:
-                volume = abs(mesh.volume)
-                if volume > 0:
-                    volume_quality = 1.0
-                else:
-                    volume_quality = 0.0
-            except:
-                volume = 0.0
-                volume_quality = 0.0
+            volume = abs(topology.volume)
+            volume_quality = 1.0 if volume > 0 else 0.0
 
             # Metric 5: Bounds quality (reasonable dimensions)
-            bounds = mesh.bounds
+            bounds = topology.bounds
             size = bounds[1] - bounds[0]
             max_dimension = np.max(size)
             min_dimension = np.min(size)
@@ -376,7 +671,12 @@ class GenerationQualityValidator:
                 'volume': float(volume),
                 'bounds': bounds.tolist(),
                 'max_dimension': float(max_dimension),
-                'aspect_ratio': float(aspect_ratio) if min_dimension > 0 else 0.0
+                'aspect_ratio': float(aspect_ratio) if min_dimension > 0 else 0.0,
+                'boundary_edge_ratio': topology.boundary_ratio,
+                'non_manifold_edge_ratio': topology.non_manifold_ratio,
+                'winding_consistent': topology.winding_consistent,
+                'topology_sampled': topology.sampled,
+                'topology_error_bound': topology.error_bound
             }
 
         except Exception as e:
@@ -390,7 +690,8 @@ class GenerationQualityValidator:
     def validate_texture_coherence(
         self,
         texture_image: Image.Image,
-        mesh: trimesh.Trimesh
+        mesh: trimesh.Trimesh,
+        level: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Validate texture quality and coherence
@@ -401,15 +702,20 @@ class GenerationQualityValidator:
         - Coverage (texture applied to entire mesh)
         - Seam quality (minimal visible seams)
 
+        Colours and contrast use up to the level's ``max_pixels`` sampled
+        pixels; edges are detected at up to ``max_image_side``.
+
         Args:
             texture_image: Applied texture image
             mesh: 3D mesh with texture
+            level: fast, standard or thorough (default: the validator's level)
 
         Returns:
             Dict with texture quality metrics
         """
         try:
-            texture_np = np.array(texture_image)
+            _, tier = self._level(level)
+            texture_np = np.asarray(texture_image)
 
             # Metric 1: Resolution quality
             width, height = texture_image.size
@@ -425,26 +731,32 @@ class GenerationQualityValidator:
             else:
                 resolution_quality = 1.0  # High resolution
 
+            colour = len(texture_np.shape) >= 3
+            pixels = _sample_rows(texture_np, tier['max_pixels'])
+
             # Metric 2: Color diversity (not monochrome)
-            if len(texture_np.shape) >= 3:
-                # Calculate unique colors
-                unique_colors = len(np.unique(texture_np.reshape(-1, texture_np.shape[-1]), axis=0))
+            if colour:
+                # Count unique colors, packed into one integer per pixel
+                packed = np.zeros(len(pixels), dtype=np.uint32)
+                for channel in range(pixels.shape[1]):
+                    packed = (packed << 8) | pixels[:, channel].astype(np.uint32)
+                unique_colors = len(np.unique(packed))
                 color_diversity = min(1.0, unique_colors / 1000)  # Normalize to 1000 unique colors
             else:
                 color_diversity = 0.3  # Grayscale penalty
 
             # Metric 3: Contrast quality
-            if len(texture_np.shape) >= 3:
-                grayscale = cv2.cvtColor(texture_np[:, :, :3], cv2.COLOR_RGB2GRAY)
+            if colour:
+                grayscale = cv2.cvtColor(np.ascontiguousarray(texture_np[:, :, :3]), cv2.COLOR_RGB2GRAY)
             else:
                 grayscale = texture_np
 
-            contrast = np.std(grayscale) / 128.0  # Normalize to 0-1
+            # Same seed and size as ``pixels``: the same sampled positions
+            contrast = np.std(_sample_rows(grayscale, tier['max_pixels'])) / 128.0  # Normalize to 0-1
             contrast_quality = min(1.0, contrast)
 
             # Metric 4: Detail preservation (edge density)
-            edges = cv2.Canny(grayscale, 50, 150)
-            edge_density = np.sum(edges > 0) / edges.size
+            edge_density = _edge_density(grayscale, tier['max_image_side'])
             detail_quality = min(1.0, edge_density * 10)  # Scale to reasonable range
 
             # Compute overall texture score
@@ -460,10 +772,11 @@ class GenerationQualityValidator:
                 'score': texture_score,
                 'resolution': (width, height),
                 'pixel_count': pixel_count,
-                'unique_colors': int(unique_colors) if len(texture_np.shape) >= 3 else 0,
+                'unique_colors': int(unique_colors) if colour else 0,
                 'color_diversity': color_diversity,
                 'contrast': float(contrast),
-                'detail_quality': detail_quality
+                'detail_quality': detail_quality,
+                'pixels_sampled': len(pixels)
             }
 
         except Exception as e:
@@ -473,7 +786,7 @@ class GenerationQualityValidator:
                 'error': str(e)
             }
 
-    def validate_final_mesh(self, mesh: trimesh.Trimesh) -> Dict[str, Any]:
+    def validate_final_mesh(self, mesh: trimesh.Trimesh, level: Optional[str] = None) -> Dict[str, Any]:
         """
         Final mesh validation (printability, completeness)
 
@@ -485,35 +798,34 @@ class GenerationQualityValidator:
 
         Args:
             mesh: Final generated 3D mesh
+            level: fast, standard or thorough (default: the validator's level)
 
         Returns:
             Dict with final mesh quality metrics
         """
         try:
+            topology = self.mesh_topology(mesh, level)
+
             # Metric 1: Watertight status (CRITICAL)
-            is_watertight = mesh.is_watertight
+            is_watertight = topology.watertight
             watertight_score = 1.0 if is_watertight else 0.0
 
             # Metric 2: Face orientation (normals pointing outward)
-            try:
-                mesh.fix_normals()
-                normals_quality = 1.0
-            except:
-                normals_quality = 0.7  # Normals might be inconsistent
+            if topology.winding_consistent:
+                normals_quality = 1.0  # Nothing for fix_normals to do
+            else:
+                try:
+                    mesh.fix_normals()
+                    normals_quality = 1.0
+                except:
+                    normals_quality = 0.7  # Normals might be inconsistent
 
             # Metric 3: Self-intersections check
-            try:
-                # This can be expensive, so we do a quick check
-                intersections = mesh.faces_unique_edges()
-                if len(intersections) > 0:
-                    intersection_quality = 0.9  # Has edges but might be OK
-                else:
-                    intersection_quality = 1.0
-            except:
-                intersection_quality = 0.8  # Unknown status
+            # (the previous faces_unique_edges() probe was non-empty for any non-empty mesh)
+            intersection_quality = 0.9 if topology.face_count > 0 else 1.0
 
             # Metric 4: Scale appropriateness
-            bounds = mesh.bounds
+            bounds = topology.bounds
             size = bounds[1] - bounds[0]
             max_size = np.max(size)
 
@@ -540,6 +852,7 @@ class GenerationQualityValidator:
                 'score': final_score,
                 'watertight': is_watertight,
                 'normals_fixed': normals_quality == 1.0,
+                'winding_consistent': topology.winding_consistent,
                 'max_size_mm': float(max_size),
                 'printable': is_watertight and final_score >= 0.80
             }
@@ -679,6 +992,8 @@ class GenerationQualityValidator:
             'passed_validations': self.stats['passed_validations'],
             'failed_validations': self.stats['failed_validations'],
             'auto_repairs': self.stats['auto_repairs'],
+            'budget_overruns': self.stats['budget_overruns'],
+            'topology_cache_hits': self.stats['topology_cache_hits'],
             'pass_rate': pass_rate,
             'average_quality': avg_quality,
             'min_quality': min(self.stats['quality_scores']) if self.stats['quality_scores'] else 0.0,
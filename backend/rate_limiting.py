@@ -0,0 +1,367 @@
+"""
+ORFEAS Rate Limiting
+====================
+One rate-limiting subsystem for the API server and ``SecurityHardening``.
+
+- GCRA (generic cell rate algorithm): each key stores a single
+  "theoretical arrival time", so a check is O(1) in time and memory no
+  matter how many requests the key has made. It behaves as a token bucket
+  refilling at ``requests_per_minute`` with ``burst`` capacity
+- Keys live in a bounded LRU (``max_keys``). Clients rotating addresses
+  evict the least recently seen keys instead of growing the table
+- Per-route cost weights: a generation request spends more of the budget
+  than a status poll
+- Abuse blocking: a second, looser GCRA meter per key blocks clients that
+  keep hammering far past their limit. Block expiry runs on a hashed timer
+  wheel instead of one ``threading.Timer`` per block
+- Optional ``SharedState`` backend (see ``shared_state.py``) so every
+  worker enforces the same budget
+
+Environment:
+    RATE_LIMIT_PER_MINUTE     sustained requests per minute (default 60)
+    RATE_LIMIT_BURST          burst capacity (default: RATE_LIMIT_PER_MINUTE)
+    RATE_LIMIT_MAX_KEYS       LRU size (default 100000)
+    RATE_LIMIT_ROUTE_COSTS    overrides, e.g. ``generate_3d=10,job_status=0.25``
+"""
+
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Budget spent per request, keyed by Flask endpoint; unknown endpoints cost 1
+DEFAULT_ROUTE_COSTS: Dict[str, float] = {
+    'generate_3d': 10.0,
+    'ultra_generate_3d': 20.0,
+    'batch_generate_3d': 20.0,
+    'text_to_image': 5.0,
+    'upload_image': 2.0,
+    'job_status': 0.25,
+    'health_check': 0.1,
+}
+PREMIUM_COST_MULTIPLIER = 2.0
+DEFAULT_MAX_KEYS = 100_000
+
+REASON_RATE_LIMITED = 'rate_limited'
+REASON_BLOCKED = 'blocked'
+REASON_ABUSE = 'abuse'
+
+
+@dataclass(frozen=True)
+class RateLimitDecision:
+    """Outcome of one rate-limit check"""
+    allowed: bool
+    retry_after: float = 0.0
+    reason: Optional[str] = None
+
+    @property
+    def blocked(self) -> bool:
+        return self.reason in (REASON_BLOCKED, REASON_ABUSE)
+
+
+ALLOWED = RateLimitDecision(True)
+
+
+class TimerWheel:
+    """
+    Hashed timer wheel for key expiry
+
+    ``schedule`` and amortized ``advance`` are O(1) per timer; timers more
+    than one revolution ahead stay in their slot until their round comes up.
+    The wheel only reclaims memory: callers still compare expiry times.
+
+    Args:
+        tick_seconds: Slot width
+        slots: Number of slots (one revolution = ``tick_seconds * slots``)
+    """
+
+    def __init__(self, tick_seconds: float = 1.0, slots: int = 512):
+        self.tick_seconds = tick_seconds
+        self.slots: List[Dict[str, float]] = [{} for _ in range(slots)]
+        self._current_tick: Optional[int] = None
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _tick(self, at: float) -> int:
+        return int(at // self.tick_seconds)
+
+    def schedule(self, key: str, expires_at: float) -> None:
+        """Fire ``key`` once ``expires_at`` has passed (callers skip stale firings)"""
+        slot = self.slots[self._tick(expires_at) % len(self.slots)]
+        if key not in slot:
+            self._count += 1
+        slot[key] = expires_at
+
+    def advance(self, now: float) -> List[str]:
+        """
+        Pop every key due before the current tick
+
+        Each elapsed tick is visited once, so timers fire at most one tick late.
+        """
+        tick = self._tick(now)
+        if self._current_tick is None or tick <= self._current_tick or self._count == 0:
+            self._current_tick = tick if self._current_tick is None else max(self._current_tick, tick)
+            return []
+
+        expired: List[str] = []
+        # After a long idle gap one full revolution visits every slot
+        for t in range(max(self._current_tick, tick - len(self.slots)), tick):
+            slot = self.slots[t % len(self.slots)]
+            if not slot:
+                continue
+            due = [key for key, expires_at in slot.items() if expires_at <= now]
+            for key in due:
+                del slot[key]
+            self._count -= len(due)
+            expired.extend(due)
+        self._current_tick = tick
+        return expired
+
+
+def parse_route_costs(spec: str) -> Dict[str, float]:
+    """Parse ``endpoint=cost,endpoint=cost`` overrides"""
+    costs: Dict[str, float] = {}
+    for item in spec.split(','):
+        if '=' not in item:
+            continue
+        endpoint, _, cost = item.partition('=')
+        try:
+            costs[endpoint.strip()] = float(cost)
+        except ValueError:
+            logger.warning(f"[RATE-LIMITING] Ignoring invalid route cost: {item!r}")
+    return costs
+
+
+class RateLimiter:
+    """
+    GCRA rate limiter with a bounded key table
+
+    Args:
+        requests_per_minute: Sustained rate per key
+        burst: Requests a fresh key may make at once (defaults to
+            ``requests_per_minute``)
+        max_keys: LRU bound on tracked keys
+        route_costs: Endpoint -> cost overrides merged into
+            ``DEFAULT_ROUTE_COSTS``
+        shared_state: Optional ``SharedState`` backend; budgets and blocks are
+            then enforced across workers
+        block_multiplier: Block a key once it exceeds this multiple of its
+            burst beyond the sustained rate (None disables blocking)
+        block_seconds: Block duration
+        clock: Monotonic time source (overridable for tests)
+    """
+
+    def __init__(self, requests_per_minute: float = 60, burst: Optional[float] = None,
+                 max_keys: int = DEFAULT_MAX_KEYS, route_costs: Optional[Dict[str, float]] = None,
+                 shared_state=None, block_multiplier: Optional[float] = None,
+                 block_seconds: float = 3600.0, clock: Callable[[], float] = time.monotonic):
+        self.requests_per_minute = requests_per_minute
+        self.burst = float(burst if burst is not None else requests_per_minute)
+        self.max_keys = max_keys
+        self.route_costs = dict(DEFAULT_ROUTE_COSTS)
+        self.route_costs.update(route_costs or {})
+        self.shared_state = shared_state
+        self.block_multiplier = block_multiplier
+        self.block_seconds = block_seconds
+        self.clock = clock
+
+        self.emission_interval = 60.0 / requests_per_minute
+        self.tolerance = self.burst * self.emission_interval
+        self.abuse_tolerance = self.tolerance * block_multiplier if block_multiplier else None
+
+        # key -> theoretical arrival time, or (tat, abuse_tat) when blocking is on
+        self._state: 'OrderedDict[str, object]' = OrderedDict()
+        self._blocked: Dict[str, float] = {}
+        self._wheel = TimerWheel(tick_seconds=max(1.0, block_seconds / 256))
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._state)
+
+    def cost_for(self, endpoint: Optional[str] = None, premium: bool = False) -> float:
+        """Budget spent by one request to ``endpoint``"""
+        cost = self.route_costs.get(endpoint, 1.0) if endpoint else 1.0
+        return cost * PREMIUM_COST_MULTIPLIER if premium else cost
+
+    # -- blocking ------------------------------------------------------------
+
+    def _expire_blocks(self, now: float) -> None:
+        if not self._blocked:
+            return
+        for key in self._wheel.advance(now):
+            expires_at = self._blocked.get(key)
+            if expires_at is not None and expires_at <= now:
+                del self._blocked[key]
+
+    def block(self, key: str, seconds: Optional[float] = None) -> None:
+        """Block ``key`` for ``seconds`` (default ``block_seconds``)"""
+        seconds = self.block_seconds if seconds is None else seconds
+        expires_at = self.clock() + seconds
+        with self._lock:
+            self._blocked[key] = expires_at
+            self._wheel.schedule(key, expires_at)
+        if self.shared_state is not None:
+            self.shared_state.set(f"rl-block:{key}", True, ttl_seconds=seconds)
+        logger.warning(f"[RATE-LIMITING] Blocked {key} for {seconds:.0f}s")
+
+    def unblock(self, key: str) -> None:
+        with self._lock:
+            self._blocked.pop(key, None)
+        if self.shared_state is not None:
+            self.shared_state.delete(f"rl-block:{key}")
+
+    def block_remaining(self, key: str) -> float:
+        """Seconds until ``key`` is unblocked (0 if not blocked)"""
+        now = self.clock()
+        with self._lock:
+            self._expire_blocks(now)
+            expires_at = self._blocked.get(key)
+        if expires_at is not None and expires_at > now:
+            return expires_at - now
+        if self.shared_state is not None and self.shared_state.get(f"rl-block:{key}"):
+            return self.block_seconds
+        return 0.0
+
+    def is_blocked(self, key: str) -> bool:
+        return self.block_remaining(key) > 0
+
+    # -- checks --------------------------------------------------------------
+
+    def _take_local(self, key: str, cost: float, now: float) -> RateLimitDecision:
+        increment = cost * self.emission_interval
+        abuse_tolerance = self.abuse_tolerance
+        state = self._state
+        with self._lock:
+            if self._blocked:
+                self._expire_blocks(now)
+                expires_at = self._blocked.get(key)
+                if expires_at is not None and expires_at > now:
+                    return RateLimitDecision(False, expires_at - now, REASON_BLOCKED)
+
+            entry = state.get(key)
+            if entry is None:
+                if len(state) >= self.max_keys:
+                    state.popitem(last=False)
+                    self.evictions += 1
+                tat = abuse_tat = now
+            else:
+                state.move_to_end(key)
+                if abuse_tolerance:
+                    tat, abuse_tat = entry
+                else:
+                    tat = entry
+
+            if abuse_tolerance:
+                # Every request, allowed or not, counts towards the abuse meter
+                abuse_tat = (abuse_tat if abuse_tat > now else now) + increment
+                if abuse_tat - now > abuse_tolerance:
+                    del state[key]
+                    self._blocked[key] = now + self.block_seconds
+                    self._wheel.schedule(key, now + self.block_seconds)
+                    return RateLimitDecision(False, self.block_seconds, REASON_ABUSE)
+
+            new_tat = (tat if tat > now else now) + increment
+            if new_tat - now <= self.tolerance:
+                state[key] = (new_tat, abuse_tat) if abuse_tolerance else new_tat
+                return ALLOWED
+            if abuse_tolerance:
+                state[key] = (tat, abuse_tat)
+            elif entry is None:
+                state[key] = tat
+            return RateLimitDecision(False, new_tat - now - self.tolerance, REASON_RATE_LIMITED)
+
+    def _take_shared(self, key: str, cost: float) -> RateLimitDecision:
+        remaining = self.block_remaining(key)
+        if remaining > 0:
+            return RateLimitDecision(False, remaining, REASON_BLOCKED)
+        rate = self.requests_per_minute / 60.0
+        if self.block_multiplier:
+            within, _ = self.shared_state.take_tokens(
+                f"rl-abuse:{key}", rate_per_second=rate,
+                capacity=self.burst * self.block_multiplier, cost=cost
+            )
+            if not within:
+                self.block(key)
+                return RateLimitDecision(False, self.block_seconds, REASON_ABUSE)
+        allowed, retry_after = self.shared_state.take_tokens(
+            f"rl:{key}", rate_per_second=rate, capacity=self.burst, cost=cost
+        )
+        return RateLimitDecision(allowed, retry_after, None if allowed else REASON_RATE_LIMITED)
+
+    def check(self, key: str, endpoint: Optional[str] = None, cost: Optional[float] = None,
+              premium: bool = False) -> RateLimitDecision:
+        """
+        Spend the cost of one request from ``key``'s budget
+
+        Args:
+            key: Client identifier (usually the IP address)
+            endpoint: Flask endpoint, used to look up the route cost
+            cost: Explicit cost (overrides the route cost)
+            premium: Premium-tier request (costs ``PREMIUM_COST_MULTIPLIER``x)
+
+        Returns:
+            RateLimitDecision
+        """
+        if cost is None:
+            cost = self.route_costs.get(endpoint, 1.0) if endpoint else 1.0
+            if premium:
+                cost *= PREMIUM_COST_MULTIPLIER
+        if self.shared_state is not None:
+            return self._take_shared(key, cost)
+        return self._take_local(key, cost, self.clock())
+
+    def is_rate_limited(self, client_ip: str, endpoint: Optional[str] = None) -> bool:
+        """True if the request should be rejected with 429"""
+        return not self.check(client_ip, endpoint=endpoint).allowed
+
+    def is_allowed(self, identifier: str, premium: bool = False,
+                   endpoint: Optional[str] = None) -> Tuple[bool, Optional[str]]:
+        """
+        Returns:
+            (is_allowed, error_message)
+        """
+        decision = self.check(identifier, endpoint=endpoint, premium=premium)
+        if decision.allowed:
+            return True, None
+        if decision.blocked:
+            return False, "Too many requests. Client temporarily blocked"
+        return False, (f"Rate limit exceeded. Max {self.requests_per_minute:g} requests per minute "
+                       f"(retry in {decision.retry_after:.0f}s)")
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            return {
+                'tracked_keys': len(self._state),
+                'max_keys': self.max_keys,
+                'evictions': self.evictions,
+                'blocked_keys': len(self._blocked),
+            }
+
+
+_rate_limiter: Optional[RateLimiter] = None
+
+
+def get_rate_limiter(requests_per_minute: Optional[float] = None, shared_state=None) -> RateLimiter:
+    """Get or create the API rate limiter singleton (configured from the environment)"""
+    global _rate_limiter
+    if _rate_limiter is None:
+        rpm = requests_per_minute or float(os.getenv('RATE_LIMIT_PER_MINUTE', '60'))
+        burst = os.getenv('RATE_LIMIT_BURST')
+        _rate_limiter = RateLimiter(
+            requests_per_minute=rpm,
+            burst=float(burst) if burst else None,
+            max_keys=int(os.getenv('RATE_LIMIT_MAX_KEYS', str(DEFAULT_MAX_KEYS))),
+            route_costs=parse_route_costs(os.getenv('RATE_LIMIT_ROUTE_COSTS', '')),
+            shared_state=shared_state
+        )
+        logger.info(f"[RATE-LIMITING] GCRA limiter: {rpm:g} req/min, burst {_rate_limiter.burst:g}, "
+                    f"{_rate_limiter.max_keys} keys, shared={shared_state is not None}")
+    return _rate_limiter
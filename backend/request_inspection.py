@@ -0,0 +1,257 @@
+"""
+ORFEAS Request Inspection Engine
+================================
+Single-pass input inspection for ``SecurityHardening``.
+
+- Every inspectable string (path, query args, form fields, JSON string
+  values) is extracted once per request
+- All rule families (SQL injection, XSS, path traversal, command
+  injection) are compiled once at startup and grouped per input source
+- Values of one source are joined and each rule is searched once over
+  the joined text, so a clean request costs one ``search`` per rule
+  instead of one per rule and value
+- Only rules that hit the joined text are re-checked per value, which
+  keeps matches exact (no hits spanning two values)
+- Size caps (JSON bodies, per-value length) and skip rules for binary
+  routes keep large uploads out of the text scanner
+"""
+
+import logging
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, FrozenSet, Iterable, List, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Input sources
+SOURCE_PATH = 'path'
+SOURCE_ARGS = 'args'
+SOURCE_FORM = 'form'
+SOURCE_JSON = 'json'
+ALL_SOURCES = (SOURCE_PATH, SOURCE_ARGS, SOURCE_FORM, SOURCE_JSON)
+
+# Rule families, in the order SecurityHardening reports them
+FAMILY_SQL = 'sql_injection'
+FAMILY_XSS = 'xss'
+FAMILY_PATH = 'path_traversal'
+FAMILY_COMMAND = 'command_injection'
+FAMILY_ORDER = (FAMILY_SQL, FAMILY_XSS, FAMILY_PATH, FAMILY_COMMAND)
+
+DEFAULT_MAX_JSON_BYTES = 1024 * 1024
+DEFAULT_MAX_VALUE_LENGTH = 64 * 1024
+BINARY_CONTENT_TYPES = ('application/octet-stream', 'image/', 'model/', 'video/', 'audio/')
+
+
+@dataclass(frozen=True)
+class InspectionRule:
+    """One detection pattern"""
+    rule_id: str
+    family: str
+    pattern: str
+    sources: FrozenSet[str]
+    ignore_case: bool = True
+
+
+@dataclass(frozen=True)
+class InspectionResult:
+    """Outcome of inspecting one request"""
+    rule_ids: Tuple[str, ...] = ()
+    families: Tuple[str, ...] = ()
+    oversized: bool = False
+
+    def __bool__(self) -> bool:
+        return bool(self.rule_ids) or self.oversized
+
+
+def _rules(family: str, prefix: str, sources: Iterable[str], patterns: Sequence[str],
+           ignore_case: bool = True) -> List[InspectionRule]:
+    return [InspectionRule(f"{prefix}-{i:03d}", family, pattern, frozenset(sources), ignore_case)
+            for i, pattern in enumerate(patterns, 1)]
+
+
+DEFAULT_RULES: Tuple[InspectionRule, ...] = tuple(
+    _rules(FAMILY_SQL, 'sqli', (SOURCE_ARGS, SOURCE_FORM, SOURCE_JSON), [
+        r"(\bunion\b.*\bselect\b|\bselect\b.*\bunion\b)",
+        r"(\bor\b\s+['\"]?\w+['\"]?\s*=\s*['\"]?\w+['\"]?)",
+        r"(\band\b\s+['\"]?\w+['\"]?\s*=\s*['\"]?\w+['\"]?)",
+        r"(\bdrop\b\s+\btable\b|\bdelete\b\s+\bfrom\b)",
+        r"(\binsert\b\s+\binto\b|\bupdate\b\s+\bset\b)",
+        r"(['\"];\s*(drop|delete|insert|update|create))",
+        r"(\bexec\b\s*\(|\bexecute\b\s*\()",
+        r"(\bsp_\w+|\bxp_\w+)",
+    ])
+    + _rules(FAMILY_XSS, 'xss', (SOURCE_ARGS, SOURCE_FORM, SOURCE_JSON), [
+        r"<script[^>]*>.*?</script>",
+        r"javascript:",
+        r"on\w+\s*=",
+        r"<iframe[^>]*>",
+        r"<object[^>]*>",
+        r"<embed[^>]*>",
+        r"<link[^>]*>",
+        r"<meta[^>]*>",
+        r"<style[^>]*>.*?</style>",
+        r"expression\s*\(",
+        r"url\s*\(",
+        r"@import",
+        r"vbscript:",
+        r"data:text/html",
+    ])
+    + _rules(FAMILY_PATH, 'path', (SOURCE_PATH, SOURCE_ARGS, SOURCE_FORM), [
+        r"\.\./",
+        r"\.\.\\",
+        r"~",
+        r"/etc/passwd",
+        r"/etc/shadow",
+        r"C:\\Windows",
+        r"/proc/",
+        r"/sys/",
+        r"\.\.%2f",
+        r"\.\.%5c",
+    ])
+    + _rules(FAMILY_COMMAND, 'cmd', (SOURCE_ARGS, SOURCE_FORM), [
+        r"[;&|`]",
+        r"\$\([^)]*\)",
+        r"`[^`]*`",
+        r"\|\s*(cat|ls|pwd|whoami|id|uname)",
+        r"(wget|curl)\s+",
+        r"(nc|netcat)\s+",
+        r"(sh|bash|zsh|fish)\s+",
+        r"(python|perl|ruby|php)\s+",
+        r"(rm|mv|cp|chmod)\s+",
+    ], ignore_case=False)
+)
+
+
+def _compile_rule(rule: InspectionRule) -> 're.Pattern[str]':
+    return re.compile(rule.pattern, re.IGNORECASE if rule.ignore_case else 0)
+
+
+def extract_json_strings(data: Any) -> List[str]:
+    """String values of a JSON document, depth-first, without recursion"""
+    values: List[str] = []
+    stack = [data]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, str):
+            values.append(item)
+        elif isinstance(item, dict):
+            stack.extend(reversed(list(item.values())))
+        elif isinstance(item, list):
+            stack.extend(reversed(item))
+    return values
+
+
+class RequestInspector:
+    """
+    Compiled multi-rule request scanner
+
+    Args:
+        rules: Rules to compile (defaults to ``DEFAULT_RULES``)
+        max_json_bytes: JSON bodies above this are flagged as oversized
+            instead of being parsed
+        max_value_length: Longer values are flagged as oversized
+        skip_endpoints: Endpoints whose body is never inspected (binary
+            uploads); path and query args are still checked
+        binary_content_types: Content-type prefixes treated as binary bodies
+    """
+
+    def __init__(self, rules: Sequence[InspectionRule] = DEFAULT_RULES,
+                 max_json_bytes: int = DEFAULT_MAX_JSON_BYTES,
+                 max_value_length: int = DEFAULT_MAX_VALUE_LENGTH,
+                 skip_endpoints: Iterable[str] = (),
+                 binary_content_types: Sequence[str] = BINARY_CONTENT_TYPES):
+        self.rules = tuple(rules)
+        self.max_json_bytes = max_json_bytes
+        self.max_value_length = max_value_length
+        self.skip_endpoints = frozenset(skip_endpoints)
+        self.binary_content_types = tuple(binary_content_types)
+
+        self._source_rules: Dict[str, List[Tuple[InspectionRule, 're.Pattern[str]']]] = {
+            source: [(rule, _compile_rule(rule)) for rule in self.rules if source in rule.sources]
+            for source in ALL_SOURCES
+        }
+
+        logger.info(f"[SECURITY] Request inspector compiled {len(self.rules)} rules "
+                    f"for {sum(1 for rules in self._source_rules.values() if rules)} input sources")
+
+    def match_value(self, source: str, value: str) -> List[str]:
+        """Rule IDs matching one value from ``source``"""
+        return [rule.rule_id for rule, compiled in self._source_rules.get(source, ())
+                if compiled.search(value)]
+
+    def _match_source(self, source: str, values: List[str]) -> List[str]:
+        rules = self._source_rules.get(source)
+        if not rules or not values:
+            return []
+        if len(values) == 1:
+            return self.match_value(source, values[0])
+        joined = '\n'.join(values)
+        return [rule.rule_id for rule, compiled in rules
+                if compiled.search(joined) and any(compiled.search(value) for value in values)]
+
+    def inspect_values(self, values: Iterable[Tuple[str, str]]) -> InspectionResult:
+        """
+        Inspect ``(source, value)`` pairs
+
+        Returns:
+            InspectionResult with matched rule IDs (rule order) and families
+            (``FAMILY_ORDER``)
+        """
+        by_source: Dict[str, List[str]] = {}
+        oversized = False
+        for source, value in values:
+            if len(value) > self.max_value_length:
+                oversized = True
+                continue
+            by_source.setdefault(source, []).append(value)
+
+        matched = set()
+        for source, source_values in by_source.items():
+            matched.update(self._match_source(source, source_values))
+        if not matched:
+            return InspectionResult(oversized=oversized)
+        rule_ids = tuple(rule.rule_id for rule in self.rules if rule.rule_id in matched)
+        families_hit = {rule.family for rule in self.rules if rule.rule_id in matched}
+        families = tuple(family for family in FAMILY_ORDER if family in families_hit)
+        families += tuple(sorted(families_hit.difference(FAMILY_ORDER)))
+        return InspectionResult(rule_ids, families, oversized)
+
+    def is_binary_request(self, request) -> bool:
+        """Routes and content types whose body is not text-inspected"""
+        if request.endpoint in self.skip_endpoints:
+            return True
+        content_type = (request.mimetype or '').lower()
+        return content_type.startswith(self.binary_content_types)
+
+    def extract(self, request) -> Tuple[List[Tuple[str, str]], bool]:
+        """
+        Collect every inspectable string of a Flask request once
+
+        Returns:
+            ``([(source, value), ...], oversized)``
+        """
+        values: List[Tuple[str, str]] = [(SOURCE_PATH, request.path)]
+        values.extend((SOURCE_ARGS, value) for _, value in request.args.items(multi=True))
+
+        if self.is_binary_request(request):
+            return values, False
+
+        oversized = False
+        if request.mimetype == 'multipart/form-data' or request.mimetype == 'application/x-www-form-urlencoded':
+            values.extend((SOURCE_FORM, value) for _, value in request.form.items(multi=True))
+        elif request.is_json:
+            if request.content_length is not None and request.content_length > self.max_json_bytes:
+                oversized = True
+            else:
+                data = request.get_json(silent=True)
+                if data is not None:
+                    values.extend((SOURCE_JSON, value) for value in extract_json_strings(data))
+        return values, oversized
+
+    def inspect(self, request) -> InspectionResult:
+        """Extract and inspect a Flask request in one pass"""
+        values, oversized = self.extract(request)
+        result = self.inspect_values(values)
+        if oversized and not result.oversized:
+            return InspectionResult(result.rule_ids, result.families, True)
+        return result
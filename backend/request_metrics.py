@@ -0,0 +1,440 @@
+"""
+ORFEAS Request Metrics Middleware
+=================================
+
+Single WSGI-level source of HTTP request metrics. Replaces the per-route
+decorators that used to live in prometheus_metrics.py, monitoring.py and
+production_metrics.py.
+
+- Real method, route template (not raw path) and response status
+- Per-thread shards with pre-bound label cells: recording a request is a few
+  dict lookups and integer adds, with no lock and no Prometheus client call
+- Shards are aggregated only when /metrics is scraped
+- Slow requests attach an exemplar carrying the request's trace ID
+  (visible with the OpenMetrics exposition format)
+
+Exported families (names unchanged so existing dashboards keep working):
+    http_requests_total{method, endpoint, status}
+    http_request_duration_seconds{method, endpoint}
+    http_requests_in_progress
+
+Usage:
+    from request_metrics import init_request_metrics
+    init_request_metrics(app)
+"""
+
+import bisect
+import logging
+import threading
+import time
+import weakref
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, generate_latest
+from prometheus_client.core import (
+    CounterMetricFamily, GaugeMetricFamily, HistogramMetricFamily
+)
+from prometheus_client.openmetrics.exposition import (
+    CONTENT_TYPE_LATEST as OPENMETRICS_CONTENT_TYPE,
+    generate_latest as openmetrics_generate_latest
+)
+from prometheus_client.samples import Exemplar
+
+logger = logging.getLogger(__name__)
+
+# Same bucket layout as the previous http_request_duration_seconds histogram
+DEFAULT_BUCKETS = (0.01, 0.05, 0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# Requests at least this slow record an exemplar linking to their trace
+DEFAULT_EXEMPLAR_THRESHOLD_SECONDS = 1.0
+
+# Label used when no Flask route matched (404s, scanners) - keeps cardinality bounded
+UNMATCHED_ROUTE = '<unmatched>'
+
+ROUTE_ENVIRON_KEY = 'orfeas.route_template'
+
+_KNOWN_METHODS = frozenset(('GET', 'POST', 'PUT', 'DELETE', 'PATCH', 'HEAD', 'OPTIONS'))
+
+
+class _HistogramCell:
+    """Pre-bound histogram child for one (method, endpoint) pair"""
+
+    __slots__ = ('bucket_counts', 'total', 'exemplars')
+
+    def __init__(self, bucket_count: int):
+        # One slot per finite bucket plus +Inf; counts are non-cumulative
+        self.bucket_counts = [0] * (bucket_count + 1)
+        self.total = 0.0
+        self.exemplars: Dict[int, Tuple[str, float, float]] = {}
+
+
+class _Shard:
+    """Metrics written by exactly one thread"""
+
+    __slots__ = ('requests', 'durations', 'in_progress', '__weakref__')
+
+    def __init__(self):
+        self.requests: Dict[Tuple[str, str, str], int] = {}
+        self.durations: Dict[Tuple[str, str], _HistogramCell] = {}
+        self.in_progress = 0
+
+
+class RequestMetricsCollector:
+    """
+    Prometheus collector that aggregates per-thread request shards on scrape
+
+    Each thread gets its own shard the first time it records a request.
+    When a thread exits, its shard is folded into a retired shard so
+    counters stay monotonic and the shard list does not grow with the
+    number of threads ever created.
+    """
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS,
+                 exemplar_threshold_seconds: float = DEFAULT_EXEMPLAR_THRESHOLD_SECONDS):
+        """
+        Initialize collector
+
+        Args:
+            buckets: Histogram upper bounds in seconds (ascending, without +Inf)
+            exemplar_threshold_seconds: Minimum duration for attaching an exemplar
+        """
+        self.buckets = tuple(sorted(buckets))
+        self.exemplar_threshold_seconds = exemplar_threshold_seconds
+        self._local = threading.local()
+        self._shards: List[_Shard] = []
+        self._retired = _Shard()
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # Recording (request path)
+    # ------------------------------------------------------------------
+
+    def shard(self) -> _Shard:
+        """Return the calling thread's shard, creating it on first use"""
+        try:
+            return self._local.shard
+        except AttributeError:
+            pass
+
+        shard = _Shard()
+        self._local.shard = shard
+        with self._lock:
+            self._shards.append(shard)
+        weakref.finalize(threading.current_thread(), self._retire, weakref.ref(shard))
+        return shard
+
+    def record(self, method: str, endpoint: str, status: str, duration: float,
+               trace_id: Optional[str] = None, shard: Optional[_Shard] = None) -> None:
+        """
+        Record one completed request
+
+        Args:
+            method: HTTP method
+            endpoint: Route template
+            status: Three-digit status code string
+            duration: Request duration in seconds
+            trace_id: Trace ID for exemplars (only kept for slow requests)
+            shard: Caller's shard, if already looked up
+        """
+        if shard is None:
+            shard = self.shard()
+
+        key = (method, endpoint, status)
+        requests = shard.requests
+        requests[key] = requests.get(key, 0) + 1
+
+        cell_key = (method, endpoint)
+        cell = shard.durations.get(cell_key)
+        if cell is None:
+            cell = _HistogramCell(len(self.buckets))
+            shard.durations[cell_key] = cell
+        index = bisect.bisect_left(self.buckets, duration)
+        cell.bucket_counts[index] += 1
+        cell.total += duration
+
+        if trace_id and duration >= self.exemplar_threshold_seconds:
+            cell.exemplars[index] = (trace_id, duration, time.time())
+
+    def _retire(self, shard_ref: 'weakref.ReferenceType[_Shard]') -> None:
+        """Fold a dead thread's shard into the retired shard"""
+        shard = shard_ref()
+        if shard is None:
+            return
+        with self._lock:
+            try:
+                self._shards.remove(shard)
+            except ValueError:
+                return
+            self._merge_into(self._retired, shard)
+            self._retired.in_progress += shard.in_progress
+
+    @staticmethod
+    def _merge_into(target: _Shard, source: _Shard) -> None:
+        for key, count in list(source.requests.items()):
+            target.requests[key] = target.requests.get(key, 0) + count
+        for key, cell in list(source.durations.items()):
+            merged = target.durations.get(key)
+            if merged is None:
+                merged = _HistogramCell(len(cell.bucket_counts) - 1)
+                target.durations[key] = merged
+            for i, count in enumerate(cell.bucket_counts):
+                merged.bucket_counts[i] += count
+            merged.total += cell.total
+            for index, exemplar in list(cell.exemplars.items()):
+                current = merged.exemplars.get(index)
+                if current is None or exemplar[2] > current[2]:
+                    merged.exemplars[index] = exemplar
+
+    # ------------------------------------------------------------------
+    # Aggregation (scrape path)
+    # ------------------------------------------------------------------
+
+    def snapshot(self) -> _Shard:
+        """Aggregate all shards into a fresh shard"""
+        total = _Shard()
+        with self._lock:
+            shards = [self._retired] + list(self._shards)
+            for shard in shards:
+                self._merge_into(total, shard)
+                total.in_progress += shard.in_progress
+        return total
+
+    def collect(self) -> Iterable:
+        """Prometheus collector protocol"""
+        snapshot = self.snapshot()
+
+        requests = CounterMetricFamily(
+            'http_requests_total', 'Total HTTP requests',
+            labels=['method', 'endpoint', 'status']
+        )
+        for (method, endpoint, status), count in sorted(snapshot.requests.items()):
+            requests.add_metric([method, endpoint, status], count)
+        yield requests
+
+        durations = HistogramMetricFamily(
+            'http_request_duration_seconds', 'HTTP request duration in seconds',
+            labels=['method', 'endpoint']
+        )
+        bounds = [str(bound) for bound in self.buckets] + ['+Inf']
+        for (method, endpoint), cell in sorted(snapshot.durations.items()):
+            cumulative = 0
+            buckets = []
+            for index, count in enumerate(cell.bucket_counts):
+                cumulative += count
+                exemplar = cell.exemplars.get(index)
+                if exemplar is not None:
+                    trace_id, value, timestamp = exemplar
+                    buckets.append((bounds[index], cumulative,
+                                    Exemplar({'trace_id': trace_id}, value, timestamp)))
+                else:
+                    buckets.append((bounds[index], cumulative))
+            durations.add_metric([method, endpoint], buckets, cell.total)
+        yield durations
+
+        in_progress = GaugeMetricFamily(
+            'http_requests_in_progress', 'HTTP requests currently being processed'
+        )
+        in_progress.add_metric([], snapshot.in_progress)
+        yield in_progress
+
+    def describe(self) -> Iterable:
+        """Describe families without collecting (avoids scraping at registration)"""
+        yield CounterMetricFamily('http_requests_total', 'Total HTTP requests',
+                                  labels=['method', 'endpoint', 'status'])
+        yield HistogramMetricFamily('http_request_duration_seconds',
+                                    'HTTP request duration in seconds',
+                                    labels=['method', 'endpoint'])
+        yield GaugeMetricFamily('http_requests_in_progress',
+                                'HTTP requests currently being processed')
+
+
+def trace_id_from_environ(environ: Dict[str, Any]) -> Optional[str]:
+    """
+    Extract a trace ID from request headers
+
+    Supports W3C traceparent ("00-<trace_id>-<span_id>-<flags>") and the
+    X-Trace-Id / X-Request-Id headers used by the frontends.
+    """
+    traceparent = environ.get('HTTP_TRACEPARENT')
+    if traceparent:
+        parts = traceparent.split('-')
+        if len(parts) >= 3 and parts[1]:
+            return parts[1]
+    return environ.get('HTTP_X_TRACE_ID') or environ.get('HTTP_X_REQUEST_ID')
+
+
+class _MeteredResponse:
+    """Response iterable that records metrics once the server closes it"""
+
+    __slots__ = ('_iterable', '_on_close', '_closed')
+
+    def __init__(self, iterable: Iterable[bytes], on_close: Callable[[], None]):
+        self._iterable = iterable
+        self._on_close = on_close
+        self._closed = False
+
+    def __iter__(self):
+        return iter(self._iterable)
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            close = getattr(self._iterable, 'close', None)
+            if close is not None:
+                close()
+        finally:
+            self._on_close()
+
+
+class RequestMetricsMiddleware:
+    """
+    WSGI middleware recording method, route template, status and latency
+
+    Streaming responses are timed until the server closes the iterable.
+    File-wrapper responses are passed through unwrapped so the server can
+    still use sendfile.
+    """
+
+    def __init__(self, wsgi_app: Callable, collector: 'RequestMetricsCollector',
+                 skip_paths: Iterable[str] = ('/metrics',),
+                 trace_id_getter: Callable[[Dict[str, Any]], Optional[str]] = trace_id_from_environ):
+        """
+        Args:
+            wsgi_app: Wrapped WSGI application
+            collector: Collector receiving the measurements
+            skip_paths: Exact paths that are not measured (the scrape endpoint itself)
+            trace_id_getter: Callable extracting a trace ID from the WSGI environ
+        """
+        self.wsgi_app = wsgi_app
+        self.collector = collector
+        self.skip_paths = frozenset(skip_paths)
+        self.trace_id_getter = trace_id_getter
+
+    def __call__(self, environ: Dict[str, Any], start_response: Callable):
+        if environ.get('PATH_INFO') in self.skip_paths:
+            return self.wsgi_app(environ, start_response)
+
+        collector = self.collector
+        shard = collector.shard()
+        shard.in_progress += 1
+        start = time.perf_counter()
+        status_holder = ['500']
+
+        def metered_start_response(status, headers, exc_info=None):
+            status_holder[0] = status[:3]
+            return start_response(status, headers, exc_info)
+
+        def finish() -> None:
+            duration = time.perf_counter() - start
+            # finish() may run on another thread if the server closes the
+            # response elsewhere, so always record into the current thread's shard
+            finishing_shard = collector.shard()
+            finishing_shard.in_progress -= 1
+            method = environ.get('REQUEST_METHOD', 'GET')
+            if method not in _KNOWN_METHODS:
+                method = 'OTHER'
+            endpoint = environ.get(ROUTE_ENVIRON_KEY) or UNMATCHED_ROUTE
+            trace_id = None
+            if duration >= collector.exemplar_threshold_seconds:
+                trace_id = self.trace_id_getter(environ)
+            collector.record(method, endpoint, status_holder[0], duration,
+                             trace_id=trace_id, shard=finishing_shard)
+
+        try:
+            iterable = self.wsgi_app(environ, metered_start_response)
+        except Exception:
+            status_holder[0] = '500'
+            finish()
+            raise
+
+        file_wrapper = environ.get('wsgi.file_wrapper')
+        if isinstance(file_wrapper, type) and isinstance(iterable, file_wrapper):
+            finish()
+            return iterable
+
+        return _MeteredResponse(iterable, finish)
+
+
+# ============================================================================
+# Flask integration
+# ============================================================================
+
+_collector: Optional[RequestMetricsCollector] = None
+_collector_lock = threading.Lock()
+
+
+def get_request_metrics_collector() -> RequestMetricsCollector:
+    """Get or create the process-wide collector, registered with the default registry"""
+    global _collector
+    if _collector is None:
+        with _collector_lock:
+            if _collector is None:
+                collector = RequestMetricsCollector()
+                REGISTRY.register(collector)
+                _collector = collector
+    return _collector
+
+
+def generate_latest_for_accept(accept_header: str) -> Tuple[bytes, str]:
+    """
+    Render the default registry in the format requested by the scraper
+
+    Exemplars are only part of the OpenMetrics format, so Prometheus must
+    scrape with exemplar storage enabled to see them.
+
+    Args:
+        accept_header: HTTP Accept header of the scrape request
+
+    Returns:
+        Tuple of (payload bytes, content type)
+    """
+    if 'application/openmetrics-text' in accept_header:
+        return openmetrics_generate_latest(REGISTRY), OPENMETRICS_CONTENT_TYPE
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
+
+
+def init_request_metrics(app: Any, collector: Optional[RequestMetricsCollector] = None,
+                         skip_paths: Iterable[str] = ('/metrics',)) -> RequestMetricsMiddleware:
+    """
+    Install request metrics on a Flask app
+
+    Registers a first-in-line before_request hook that stores the matched
+    route template in the WSGI environ, then wraps app.wsgi_app.
+
+    Args:
+        app: Flask application
+        collector: Collector to record into (defaults to the registered singleton)
+        skip_paths: Paths that are not measured
+
+    Returns:
+        The installed middleware
+    """
+    from flask import request
+
+    collector = collector or get_request_metrics_collector()
+
+    def store_route_template():
+        rule = request.url_rule
+        if rule is not None:
+            request.environ[ROUTE_ENVIRON_KEY] = rule.rule
+
+    # Run before rate limiting / security hooks so rejected requests keep their route label
+    app.before_request_funcs.setdefault(None, []).insert(0, store_route_template)
+
+    middleware = RequestMetricsMiddleware(app.wsgi_app, collector, skip_paths=skip_paths)
+    app.wsgi_app = middleware
+    logger.info("[OK] Request metrics middleware installed (per-thread shards, aggregated on scrape)")
+    return middleware
+
+
+__all__ = [
+    'RequestMetricsCollector',
+    'RequestMetricsMiddleware',
+    'generate_latest_for_accept',
+    'get_request_metrics_collector',
+    'init_request_metrics',
+    'trace_id_from_environ',
+    'UNMATCHED_ROUTE',
+]
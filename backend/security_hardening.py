@@ -13,7 +13,6 @@ Features:
 """
 
 import os
-import re
 import hashlib
 import hmac
 import time
@@ -23,9 +22,20 @@ import json
 from datetime import datetime, timedelta
 from typing import Dict, List, Any, Optional, Set
 from werkzeug.utils import secure_filename
+from werkzeug.exceptions import HTTPException
 from flask import request, abort, jsonify
 import logging
 
+from request_inspection import (
+    RequestInspector,
+    FAMILY_SQL,
+    FAMILY_XSS,
+    FAMILY_PATH,
+    FAMILY_COMMAND,
+    extract_json_strings,
+)
+from rate_limiting import RateLimiter, REASON_ABUSE, REASON_BLOCKED
+
 logger = logging.getLogger(__name__)
 
 class SecurityError(Exception):
@@ -41,9 +51,19 @@ class SecurityHardening:
         self.security_config = self.load_security_config()
         self.threat_detector = ThreatDetector()
         self.access_monitor = AccessMonitor()
-        self.blocked_ips = set()
-        self.rate_limiters = {}
         self.security_keys = self.load_security_keys()
+        # Per-IP budgets and temporary blocks (aggressive clients)
+        self.rate_limiter = RateLimiter(
+            requests_per_minute=self.security_config['max_requests_per_minute'],
+            max_keys=self.security_config['rate_limit_max_keys'],
+            block_multiplier=2,
+            block_seconds=self.security_config['block_duration']
+        )
+        self.request_inspector = RequestInspector(
+            max_json_bytes=self.security_config['inspection_max_json_bytes'],
+            max_value_length=self.security_config['inspection_max_value_length'],
+            skip_endpoints=self.security_config['inspection_skip_endpoints']
+        )
 
     def load_security_config(self) -> Dict[str, Any]:
         """Load security configuration"""
@@ -53,13 +73,21 @@ class SecurityHardening:
             'allowed_extensions': {'png', 'jpg', 'jpeg', 'gif', 'bmp', 'tiff', 'webp', 'stl', 'obj'},
             'max_requests_per_minute': int(os.getenv('MAX_REQUESTS_PER_MINUTE', 60)),
             'block_duration': int(os.getenv('SECURITY_BLOCK_DURATION', 3600)),  # 1 hour
+            'rate_limit_max_keys': int(os.getenv('RATE_LIMIT_MAX_KEYS', 100000)),
             'enable_malware_scan': os.getenv('ENABLE_MALWARE_SCAN', 'true').lower() == 'true',
             'signed_endpoints': {'generate-3d', 'admin', 'user-data'},
             'threat_threshold_high': 8,
             'threat_threshold_medium': 5,
             'jwt_secret': os.getenv('JWT_SECRET', 'orfeas-secure-key-2025'),
             'api_key_header': 'X-API-Key',
-            'signature_header': 'X-Request-Signature'
+            'signature_header': 'X-Request-Signature',
+            'inspection_max_json_bytes': int(os.getenv('INSPECTION_MAX_JSON_BYTES', 1024 * 1024)),
+            'inspection_max_value_length': int(os.getenv('INSPECTION_MAX_VALUE_LENGTH', 64 * 1024)),
+            # Endpoints whose request body is binary and never text-inspected
+            'inspection_skip_endpoints': {
+                endpoint.strip() for endpoint in os.getenv('INSPECTION_SKIP_ENDPOINTS', '').split(',')
+                if endpoint.strip()
+            }
         }
 
     def load_security_keys(self) -> Dict[str, str]:
@@ -99,6 +127,14 @@ class SecurityHardening:
 
         logger.info("[ORFEAS] Security hardening applied successfully")
 
+    # Inspection family -> (security event, status, message), in reporting order
+    INSPECTION_RESPONSES = (
+        (FAMILY_SQL, 'sql_injection_attempt', 400, "Invalid input detected"),
+        (FAMILY_XSS, 'xss_attempt', 400, "Malicious script detected"),
+        (FAMILY_PATH, 'path_traversal_attempt', 400, "Path traversal attempt detected"),
+        (FAMILY_COMMAND, 'command_injection_attempt', 400, "Command injection attempt detected"),
+    )
+
     def setup_input_validation(self, app):
         """Comprehensive input validation and sanitization"""
 
@@ -109,180 +145,44 @@ class SecurityHardening:
                 return
 
             try:
-                # SQL injection protection
-                if self.detect_sql_injection(request):
-                    self.log_security_event('sql_injection_attempt', request)
-                    abort(400, "Invalid input detected")
-
-                # XSS protection
-                if self.detect_xss_attempt(request):
-                    self.log_security_event('xss_attempt', request)
-                    abort(400, "Malicious script detected")
-
-                # Path traversal protection
-                if self.detect_path_traversal(request):
-                    self.log_security_event('path_traversal_attempt', request)
-                    abort(400, "Path traversal attempt detected")
-
-                # Command injection protection
-                if self.detect_command_injection(request):
-                    self.log_security_event('command_injection_attempt', request)
-                    abort(400, "Command injection attempt detected")
-
-                # Size limit validation
+                # Size limit validation (before anything parses the body)
                 if request.content_length and request.content_length > self.security_config['max_file_size']:
                     self.log_security_event('oversized_request', request)
                     abort(413, "Request too large")
 
+                # SQL injection / XSS / path traversal / command injection in one pass
+                result = self.request_inspector.inspect(request)
+                if result.families:
+                    for family, event_type, status, message in self.INSPECTION_RESPONSES:
+                        if family in result.families:
+                            self.log_security_event(event_type, request, rule_ids=result.rule_ids)
+                            abort(status, message)
+
+                if result.oversized:
+                    self.log_security_event('oversized_inspection', request)
+                    abort(413, "Request too large")
+
+            except HTTPException:
+                raise
             except Exception as e:
                 logger.error(f"[ORFEAS] Input validation error: {e}")
                 abort(500, "Validation error")
 
     def detect_sql_injection(self, request) -> bool:
         """Detect SQL injection attempts"""
-
-        sql_patterns = [
-            r"(\bunion\b.*\bselect\b|\bselect\b.*\bunion\b)",
-            r"(\bor\b\s+['\"]?\w+['\"]?\s*=\s*['\"]?\w+['\"]?)",
-            r"(\band\b\s+['\"]?\w+['\"]?\s*=\s*['\"]?\w+['\"]?)",
-            r"(\bdrop\b\s+\btable\b|\bdelete\b\s+\bfrom\b)",
-            r"(\binsert\b\s+\binto\b|\bupdate\b\s+\bset\b)",
-            r"(['\"];\s*(drop|delete|insert|update|create))",
-            r"(\bexec\b\s*\(|\bexecute\b\s*\()",
-            r"(\bsp_\w+|\bxp_\w+)"
-        ]
-
-        # Check all request data
-        check_data = []
-
-        # URL parameters
-        if request.args:
-            check_data.extend(request.args.values())
-
-        # Form data
-        if request.form:
-            check_data.extend(request.form.values())
-
-        # JSON data
-        if request.is_json:
-            json_data = request.get_json(silent=True)
-            if json_data:
-                check_data.extend(self._extract_json_values(json_data))
-
-        # Check for SQL injection patterns
-        for data in check_data:
-            if isinstance(data, str):
-                for pattern in sql_patterns:
-                    if re.search(pattern, data.lower()):
-                        return True
-
-        return False
+        return FAMILY_SQL in self.request_inspector.inspect(request).families
 
     def detect_xss_attempt(self, request) -> bool:
         """Detect XSS attempts"""
-
-        xss_patterns = [
-            r"<script[^>]*>.*?</script>",
-            r"javascript:",
-            r"on\w+\s*=",
-            r"<iframe[^>]*>",
-            r"<object[^>]*>",
-            r"<embed[^>]*>",
-            r"<link[^>]*>",
-            r"<meta[^>]*>",
-            r"<style[^>]*>.*?</style>",
-            r"expression\s*\(",
-            r"url\s*\(",
-            r"@import",
-            r"vbscript:",
-            r"data:text/html"
-        ]
-
-        # Check all text inputs
-        check_data = []
-
-        if request.args:
-            check_data.extend(request.args.values())
-
-        if request.form:
-            check_data.extend(request.form.values())
-
-        if request.is_json:
-            json_data = request.get_json(silent=True)
-            if json_data:
-                check_data.extend(self._extract_json_values(json_data))
-
-        for data in check_data:
-            if isinstance(data, str):
-                for pattern in xss_patterns:
-                    if re.search(pattern, data.lower()):
-                        return True
-
-        return False
+        return FAMILY_XSS in self.request_inspector.inspect(request).families
 
     def detect_path_traversal(self, request) -> bool:
         """Detect path traversal attempts"""
-
-        path_patterns = [
-            r"\.\./",
-            r"\.\.\\",
-            r"~",
-            r"/etc/passwd",
-            r"/etc/shadow",
-            r"C:\\Windows",
-            r"/proc/",
-            r"/sys/",
-            r"\.\.%2f",
-            r"\.\.%5c"
-        ]
-
-        # Check URL path and parameters
-        check_paths = [request.path]
-
-        if request.args:
-            check_paths.extend(request.args.values())
-
-        if request.form:
-            check_paths.extend(request.form.values())
-
-        for path in check_paths:
-            if isinstance(path, str):
-                for pattern in path_patterns:
-                    if re.search(pattern, path.lower()):
-                        return True
-
-        return False
+        return FAMILY_PATH in self.request_inspector.inspect(request).families
 
     def detect_command_injection(self, request) -> bool:
         """Detect command injection attempts"""
-
-        command_patterns = [
-            r"[;&|`]",
-            r"\$\([^)]*\)",
-            r"`[^`]*`",
-            r"\|\s*(cat|ls|pwd|whoami|id|uname)",
-            r"(wget|curl)\s+",
-            r"(nc|netcat)\s+",
-            r"(sh|bash|zsh|fish)\s+",
-            r"(python|perl|ruby|php)\s+",
-            r"(rm|mv|cp|chmod)\s+"
-        ]
-
-        check_data = []
-
-        if request.args:
-            check_data.extend(request.args.values())
-
-        if request.form:
-            check_data.extend(request.form.values())
-
-        for data in check_data:
-            if isinstance(data, str):
-                for pattern in command_patterns:
-                    if re.search(pattern, data):
-                        return True
-
-        return False
+        return FAMILY_COMMAND in self.request_inspector.inspect(request).families
 
     def setup_authentication_security(self, app):
         """Setup authentication and authorization security"""
@@ -328,11 +228,6 @@ class SecurityHardening:
                         self.log_security_event('invalid_signature', request)
                         abort(401, "Invalid request signature")
 
-                # Rate limiting check
-                if not self.check_api_rate_limits(request):
-                    self.log_security_event('rate_limit_exceeded', request)
-                    abort(429, "Rate limit exceeded")
-
     def validate_request_signature(self, request, signature: Optional[str]) -> bool:
         """Validate request signature using HMAC"""
 
@@ -355,30 +250,9 @@ class SecurityHardening:
             return False
 
     def check_api_rate_limits(self, request) -> bool:
-        """Check API rate limits"""
-
+        """Check API rate limits (spends the request's route cost)"""
         client_ip = self.get_client_ip(request)
-        current_minute = int(time.time() // 60)
-
-        # Initialize rate limiter for IP
-        if client_ip not in self.rate_limiters:
-            self.rate_limiters[client_ip] = {}
-
-        # Clean old entries
-        old_minutes = [minute for minute in self.rate_limiters[client_ip]
-                      if minute < current_minute - 1]
-        for minute in old_minutes:
-            del self.rate_limiters[client_ip][minute]
-
-        # Check current minute requests
-        if current_minute not in self.rate_limiters[client_ip]:
-            self.rate_limiters[client_ip][current_minute] = 0
-
-        # Increment request count
-        self.rate_limiters[client_ip][current_minute] += 1
-
-        # Check if limit exceeded
-        return self.rate_limiters[client_ip][current_minute] <= self.security_config['max_requests_per_minute']
+        return self.rate_limiter.check(client_ip, endpoint=request.endpoint).allowed
 
     def setup_file_upload_security(self, app):
         """Secure file upload handling"""
@@ -522,47 +396,38 @@ class SecurityHardening:
 
         @app.before_request
         def rate_limit_check():
+            if request.endpoint == 'static':
+                return
+
             client_ip = self.get_client_ip(request)
+            if not request.path.startswith('/api/'):
+                # Page and asset loads only honour blocks, they spend no budget
+                if self.rate_limiter.is_blocked(client_ip):
+                    self.log_security_event('blocked_ip_access', request)
+                    abort(403, "IP address blocked")
+                return
 
-            # Check if IP is blocked
-            if client_ip in self.blocked_ips:
+            decision = self.rate_limiter.check(client_ip, endpoint=request.endpoint)
+            if decision.allowed:
+                return
+
+            if decision.reason == REASON_BLOCKED:
                 self.log_security_event('blocked_ip_access', request)
                 abort(403, "IP address blocked")
-
-            # Aggressive request detection
-            if self.detect_aggressive_requests(client_ip):
-                self.block_ip(client_ip)
+            if decision.reason == REASON_ABUSE:
+                # Aggressive request pattern: the limiter has blocked the IP
                 self.log_security_event('aggressive_requests_blocked', request)
                 abort(429, "Too many requests")
+            self.log_security_event('rate_limit_exceeded', request)
+            abort(429, "Rate limit exceeded")
 
     def detect_aggressive_requests(self, client_ip: str) -> bool:
-        """Detect aggressive request patterns"""
-
-        # Check if too many requests in short time
-        if client_ip in self.rate_limiters:
-            current_minute = int(time.time() // 60)
-            recent_requests = sum(
-                count for minute, count in self.rate_limiters[client_ip].items()
-                if minute >= current_minute - 1
-            )
-
-            return recent_requests > self.security_config['max_requests_per_minute'] * 2
-
-        return False
+        """Aggressive clients are blocked by the rate limiter's abuse meter"""
+        return self.rate_limiter.is_blocked(client_ip)
 
     def block_ip(self, ip_address: str):
-        """Block IP address temporarily"""
-
-        self.blocked_ips.add(ip_address)
-        logger.warning(f"[ORFEAS] Blocked IP address: {ip_address}")
-
-        # Schedule unblock (in production, use Redis with TTL)
-        import threading
-        timer = threading.Timer(
-            self.security_config['block_duration'],
-            lambda: self.blocked_ips.discard(ip_address)
-        )
-        timer.start()
+        """Block IP address temporarily (expiry runs on the limiter's timer wheel)"""
+        self.rate_limiter.block(ip_address, self.security_config['block_duration'])
 
     def setup_security_monitoring(self, app):
         """Real-time security monitoring"""
@@ -664,7 +529,7 @@ class SecurityHardening:
 
         return request.remote_addr or '0.0.0.0'
 
-    def log_security_event(self, event_type: str, request, response=None):
+    def log_security_event(self, event_type: str, request, response=None, rule_ids=None):
         """Log security events for analysis"""
 
         event_data = {
@@ -676,24 +541,14 @@ class SecurityHardening:
             'request_path': request.path,
             'response_status': response.status_code if response else None
         }
+        if rule_ids:
+            event_data['rule_ids'] = list(rule_ids)
 
         logger.info(f"[ORFEAS-SECURITY] {event_type}: {json.dumps(event_data)}")
 
     def _extract_json_values(self, data) -> List[str]:
-        """Recursively extract string values from JSON data"""
-
-        values = []
-
-        if isinstance(data, dict):
-            for value in data.values():
-                values.extend(self._extract_json_values(value))
-        elif isinstance(data, list):
-            for item in data:
-                values.extend(self._extract_json_values(item))
-        elif isinstance(data, str):
-            values.append(data)
-
-        return values
+        """Extract string values from JSON data"""
+        return extract_json_strings(data)
 
 
 class ThreatDetector:
@@ -0,0 +1,546 @@
+"""
+ORFEAS Shared State
+===================
+Cross-worker coordination primitives for multi-process deployments.
+
+``gunicorn.conf.py`` runs several worker processes, and each one used to keep
+its own rate-limit counters and claimed jobs.  The same job could run twice,
+and every limit was multiplied by the worker count.  This module gives all
+workers one view of that state:
+
+- ``acquire_lock`` / ``release_lock`` / ``refresh_lock``: leased locks with a
+  fencing token.  A crashed worker's lock expires after its TTL
+- ``take_tokens``: shared token bucket (refill rate + burst capacity)
+- ``get`` / ``set`` / ``delete``: small TTL key-value store
+- ``socketio_message_queue()``: message queue URL for Flask-SocketIO, so
+  emits and room broadcasts reach clients connected to any worker
+
+Backends:
+- ``SQLiteSharedState``: one host, any number of processes (default)
+- ``RedisSharedState``: several hosts (``SHARED_STATE_BACKEND=redis``)
+- ``LocalSharedState``: single process (testing mode)
+
+Environment:
+    SHARED_STATE_BACKEND    sqlite | redis | local (default: redis if REDIS_URL
+                            is set, else sqlite)
+    SHARED_STATE_PATH       SQLite database path (default: data/shared_state.db)
+    SOCKETIO_MESSAGE_QUEUE  explicit Socket.IO message queue URL
+    REDIS_URL               Redis connection URL
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+try:
+    import redis
+    REDIS_AVAILABLE = True
+except ImportError:
+    redis = None
+    REDIS_AVAILABLE = False
+
+
+class SharedState(ABC):
+    """Abstract cross-process state backend"""
+
+    # -- leased locks --------------------------------------------------------
+
+    @abstractmethod
+    def acquire_lock(self, name: str, ttl_seconds: float) -> Optional[str]:
+        """
+        Try to acquire ``name`` for ``ttl_seconds`` without blocking
+
+        Returns:
+            Lock token to pass to ``release_lock``/``refresh_lock``, or None
+            if another holder owns an unexpired lease
+        """
+
+    @abstractmethod
+    def release_lock(self, name: str, token: str) -> bool:
+        """Release ``name`` if ``token`` still owns it"""
+
+    @abstractmethod
+    def refresh_lock(self, name: str, token: str, ttl_seconds: float) -> bool:
+        """Extend the lease if ``token`` still owns it"""
+
+    def lock(self, name: str, ttl_seconds: float = 30.0,
+             blocking_timeout: float = 0.0) -> 'DistributedLock':
+        """Return a ``DistributedLock`` context manager for ``name``"""
+        return DistributedLock(self, name, ttl_seconds, blocking_timeout)
+
+    # -- token bucket --------------------------------------------------------
+
+    @abstractmethod
+    def take_tokens(self, key: str, rate_per_second: float, capacity: float,
+                    cost: float = 1.0) -> Tuple[bool, float]:
+        """
+        Take ``cost`` tokens from the shared bucket ``key``
+
+        Args:
+            key: Bucket identifier (e.g. ``rl:<ip>``)
+            rate_per_second: Refill rate
+            capacity: Burst size (a new bucket starts full)
+            cost: Tokens consumed by this request
+
+        Returns:
+            (allowed, retry_after_seconds)
+        """
+
+    # -- key-value -----------------------------------------------------------
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[Any]:
+        """Return the JSON value stored under ``key``, or None"""
+
+    @abstractmethod
+    def set(self, key: str, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        """Store a JSON-serializable value"""
+
+    @abstractmethod
+    def delete(self, key: str) -> bool:
+        """Delete ``key``"""
+
+    def close(self) -> None:
+        """Release backend resources"""
+
+    @staticmethod
+    def _refill(tokens: Optional[float], updated_at: Optional[float], now: float,
+                rate: float, capacity: float, cost: float) -> Tuple[bool, float, float]:
+        """Token bucket step: returns (allowed, retry_after, remaining_tokens)"""
+        if tokens is None:
+            tokens = capacity
+        else:
+            tokens = min(capacity, tokens + max(0.0, now - updated_at) * rate)
+        if tokens >= cost:
+            return True, 0.0, tokens - cost
+        return False, (cost - tokens) / rate if rate > 0 else float('inf'), tokens
+
+
+class DistributedLock:
+    """
+    Context manager around a leased lock
+
+    Example:
+        with shared_state.lock(f"job:{job_id}", ttl_seconds=600) as acquired:
+            if acquired:
+                ...
+    """
+
+    def __init__(self, state: SharedState, name: str, ttl_seconds: float = 30.0,
+                 blocking_timeout: float = 0.0, poll_interval: float = 0.05):
+        self.state = state
+        self.name = name
+        self.ttl_seconds = ttl_seconds
+        self.blocking_timeout = blocking_timeout
+        self.poll_interval = poll_interval
+        self.token: Optional[str] = None
+
+    def acquire(self) -> bool:
+        deadline = time.monotonic() + self.blocking_timeout
+        while True:
+            self.token = self.state.acquire_lock(self.name, self.ttl_seconds)
+            if self.token is not None:
+                return True
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(self.poll_interval)
+
+    def refresh(self) -> bool:
+        return self.token is not None and self.state.refresh_lock(self.name, self.token, self.ttl_seconds)
+
+    def release(self) -> bool:
+        if self.token is None:
+            return False
+        released = self.state.release_lock(self.name, self.token)
+        self.token = None
+        return released
+
+    def __enter__(self) -> bool:
+        return self.acquire()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.release()
+        return False
+
+
+class LocalSharedState(SharedState):
+    """Single-process implementation (testing mode and single-worker runs)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._locks: Dict[str, Tuple[str, float]] = {}
+        self._buckets: Dict[str, Tuple[float, float]] = {}
+        self._kv: Dict[str, Tuple[Any, Optional[float]]] = {}
+
+    def acquire_lock(self, name: str, ttl_seconds: float) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            holder = self._locks.get(name)
+            if holder is not None and holder[1] > now:
+                return None
+            token = uuid.uuid4().hex
+            self._locks[name] = (token, now + ttl_seconds)
+            return token
+
+    def release_lock(self, name: str, token: str) -> bool:
+        with self._lock:
+            holder = self._locks.get(name)
+            if holder is None or holder[0] != token:
+                return False
+            del self._locks[name]
+            return True
+
+    def refresh_lock(self, name: str, token: str, ttl_seconds: float) -> bool:
+        now = time.time()
+        with self._lock:
+            holder = self._locks.get(name)
+            if holder is None or holder[0] != token or holder[1] <= now:
+                return False
+            self._locks[name] = (token, now + ttl_seconds)
+            return True
+
+    def take_tokens(self, key: str, rate_per_second: float, capacity: float,
+                    cost: float = 1.0) -> Tuple[bool, float]:
+        now = time.time()
+        with self._lock:
+            tokens, updated_at = self._buckets.get(key, (None, None))
+            allowed, retry_after, remaining = self._refill(tokens, updated_at, now,
+                                                           rate_per_second, capacity, cost)
+            self._buckets[key] = (remaining, now)
+            return allowed, retry_after
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._kv.get(key)
+            if entry is None:
+                return None
+            if entry[1] is not None and entry[1] <= time.time():
+                del self._kv[key]
+                return None
+            return json.loads(entry[0])
+
+    def set(self, key: str, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        expires_at = time.time() + ttl_seconds if ttl_seconds is not None else None
+        with self._lock:
+            self._kv[key] = (json.dumps(value, default=str), expires_at)
+
+    def delete(self, key: str) -> bool:
+        with self._lock:
+            return self._kv.pop(key, None) is not None
+
+
+class SQLiteSharedState(SharedState):
+    """
+    SQLite (WAL) shared state for all workers on one host
+
+    Each read-modify-write runs in a ``BEGIN IMMEDIATE`` transaction, which
+    serializes it against every other process using the same file.  Expired
+    locks, keys and fully-refilled buckets are purged at most once per
+    ``purge_interval_seconds``.
+    """
+
+    _SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS locks (name TEXT PRIMARY KEY, token TEXT NOT NULL, expires_at REAL NOT NULL)",
+        "CREATE TABLE IF NOT EXISTS buckets (key TEXT PRIMARY KEY, tokens REAL NOT NULL, "
+        "updated_at REAL NOT NULL, full_at REAL NOT NULL)",
+        "CREATE INDEX IF NOT EXISTS idx_buckets_full_at ON buckets(full_at)",
+        "CREATE TABLE IF NOT EXISTS kv (key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL)",
+        "CREATE INDEX IF NOT EXISTS idx_kv_expires ON kv(expires_at) WHERE expires_at IS NOT NULL",
+    )
+
+    def __init__(self, path: str = 'data/shared_state.db', busy_timeout_seconds: float = 30.0,
+                 purge_interval_seconds: float = 60.0):
+        self.path = path
+        self.busy_timeout_seconds = busy_timeout_seconds
+        self.purge_interval_seconds = purge_interval_seconds
+        self._last_purge = time.time()
+        self._local = threading.local()
+        self._connections = []
+        self._connections_lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            for statement in self._SCHEMA:
+                conn.execute(statement)
+        finally:
+            conn.execute("COMMIT")
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=self.busy_timeout_seconds,
+                                   isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            with self._connections_lock:
+                self._connections.append(conn)
+        return conn
+
+    def _transaction(self, fn):
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            result = fn(conn)
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+        self._maybe_purge()
+        return result
+
+    def _maybe_purge(self) -> None:
+        now = time.time()
+        if now - self._last_purge < self.purge_interval_seconds:
+            return
+        self._last_purge = now
+        conn = self._conn()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute("DELETE FROM locks WHERE expires_at <= ?", (now,))
+            conn.execute("DELETE FROM buckets WHERE full_at <= ?", (now,))
+            conn.execute("DELETE FROM kv WHERE expires_at IS NOT NULL AND expires_at <= ?", (now,))
+            conn.execute("COMMIT")
+        except sqlite3.Error as e:
+            conn.execute("ROLLBACK")
+            logger.warning(f"[SHARED-STATE] Purge failed: {e}")
+
+    def acquire_lock(self, name: str, ttl_seconds: float) -> Optional[str]:
+        token = uuid.uuid4().hex
+
+        def op(conn):
+            now = time.time()
+            row = conn.execute("SELECT expires_at FROM locks WHERE name = ?", (name,)).fetchone()
+            if row is not None and row[0] > now:
+                return None
+            conn.execute("INSERT OR REPLACE INTO locks (name, token, expires_at) VALUES (?, ?, ?)",
+                         (name, token, now + ttl_seconds))
+            return token
+        return self._transaction(op)
+
+    def release_lock(self, name: str, token: str) -> bool:
+        return self._transaction(lambda conn: conn.execute(
+            "DELETE FROM locks WHERE name = ? AND token = ?", (name, token)).rowcount > 0)
+
+    def refresh_lock(self, name: str, token: str, ttl_seconds: float) -> bool:
+        def op(conn):
+            now = time.time()
+            return conn.execute(
+                "UPDATE locks SET expires_at = ? WHERE name = ? AND token = ? AND expires_at > ?",
+                (now + ttl_seconds, name, token, now)).rowcount > 0
+        return self._transaction(op)
+
+    def take_tokens(self, key: str, rate_per_second: float, capacity: float,
+                    cost: float = 1.0) -> Tuple[bool, float]:
+        def op(conn):
+            now = time.time()
+            row = conn.execute("SELECT tokens, updated_at FROM buckets WHERE key = ?", (key,)).fetchone()
+            allowed, retry_after, remaining = self._refill(row[0] if row else None, row[1] if row else None,
+                                                           now, rate_per_second, capacity, cost)
+            full_at = now + (capacity - remaining) / rate_per_second if rate_per_second > 0 else float('inf')
+            conn.execute("INSERT OR REPLACE INTO buckets (key, tokens, updated_at, full_at) VALUES (?, ?, ?, ?)",
+                         (key, remaining, now, full_at))
+            return allowed, retry_after
+        return self._transaction(op)
+
+    def get(self, key: str) -> Optional[Any]:
+        row = self._conn().execute("SELECT value, expires_at FROM kv WHERE key = ?", (key,)).fetchone()
+        if row is None or (row[1] is not None and row[1] <= time.time()):
+            return None
+        return json.loads(row[0])
+
+    def set(self, key: str, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        expires_at = time.time() + ttl_seconds if ttl_seconds is not None else None
+        encoded = json.dumps(value, default=str)
+        self._transaction(lambda conn: conn.execute(
+            "INSERT OR REPLACE INTO kv (key, value, expires_at) VALUES (?, ?, ?)", (key, encoded, expires_at)))
+
+    def delete(self, key: str) -> bool:
+        return self._transaction(lambda conn: conn.execute("DELETE FROM kv WHERE key = ?", (key,)).rowcount > 0)
+
+    def close(self) -> None:
+        with self._connections_lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+        self._local = threading.local()
+
+
+class RedisSharedState(SharedState):
+    """
+    Redis shared state for workers on several hosts
+
+    Locks use ``SET NX PX`` with token-checked Lua release/refresh.  The
+    token bucket is one Lua script using the Redis clock, so hosts with
+    skewed clocks still share one consistent bucket.
+    """
+
+    _RELEASE = """
+    if redis.call('GET', KEYS[1]) == ARGV[1] then return redis.call('DEL', KEYS[1]) end
+    return 0
+    """
+
+    _REFRESH = """
+    if redis.call('GET', KEYS[1]) == ARGV[1] then return redis.call('PEXPIRE', KEYS[1], ARGV[2]) end
+    return 0
+    """
+
+    _TAKE = """
+    local rate = tonumber(ARGV[1])
+    local capacity = tonumber(ARGV[2])
+    local cost = tonumber(ARGV[3])
+    local t = redis.call('TIME')
+    local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+    local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+    local tokens = tonumber(state[1])
+    local ts = tonumber(state[2])
+    if tokens == nil then
+        tokens = capacity
+    else
+        tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+    end
+    local allowed = 0
+    local retry_after = 0
+    if tokens >= cost then
+        tokens = tokens - cost
+        allowed = 1
+    elseif rate > 0 then
+        retry_after = (cost - tokens) / rate
+    else
+        retry_after = -1
+    end
+    redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+    if rate > 0 then
+        redis.call('PEXPIRE', KEYS[1], math.ceil((capacity - tokens) / rate * 1000) + 1000)
+    end
+    return {allowed, tostring(retry_after)}
+    """
+
+    def __init__(self, url: str = 'redis://localhost:6379/0', prefix: str = 'orfeas:shared:',
+                 client: Any = None):
+        if client is None:
+            if not REDIS_AVAILABLE:
+                raise RuntimeError("redis package is not installed")
+            client = redis.Redis.from_url(url)
+        self._redis = client
+        self.prefix = prefix
+        self._release = client.register_script(self._RELEASE)
+        self._refresh = client.register_script(self._REFRESH)
+        self._take = client.register_script(self._TAKE)
+
+    def _key(self, kind: str, name: str) -> str:
+        return f"{self.prefix}{kind}:{name}"
+
+    def acquire_lock(self, name: str, ttl_seconds: float) -> Optional[str]:
+        token = uuid.uuid4().hex
+        if self._redis.set(self._key('lock', name), token, nx=True, px=max(1, int(ttl_seconds * 1000))):
+            return token
+        return None
+
+    def release_lock(self, name: str, token: str) -> bool:
+        return bool(self._release(keys=[self._key('lock', name)], args=[token]))
+
+    def refresh_lock(self, name: str, token: str, ttl_seconds: float) -> bool:
+        return bool(self._refresh(keys=[self._key('lock', name)],
+                                  args=[token, max(1, int(ttl_seconds * 1000))]))
+
+    def take_tokens(self, key: str, rate_per_second: float, capacity: float,
+                    cost: float = 1.0) -> Tuple[bool, float]:
+        allowed, retry_after = self._take(keys=[self._key('bucket', key)],
+                                          args=[rate_per_second, capacity, cost])
+        retry_after = float(retry_after)
+        return bool(allowed), float('inf') if retry_after < 0 else retry_after
+
+    def get(self, key: str) -> Optional[Any]:
+        raw = self._redis.get(self._key('kv', key))
+        return json.loads(raw) if raw is not None else None
+
+    def set(self, key: str, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        px = max(1, int(ttl_seconds * 1000)) if ttl_seconds is not None else None
+        self._redis.set(self._key('kv', key), json.dumps(value, default=str), px=px)
+
+    def delete(self, key: str) -> bool:
+        return bool(self._redis.delete(self._key('kv', key)))
+
+
+def socketio_message_queue() -> Optional[str]:
+    """
+    Message queue URL for ``SocketIO(message_queue=...)``
+
+    With a queue, an emit from any worker reaches clients connected to every
+    worker (including room broadcasts).  Without one, job updates still
+    reach all workers through the job store change feed.
+    """
+    explicit = os.getenv('SOCKETIO_MESSAGE_QUEUE')
+    if explicit:
+        return explicit
+    if _backend_name() == 'redis' and os.getenv('REDIS_URL'):
+        return os.getenv('REDIS_URL')
+    return None
+
+
+def _backend_name() -> str:
+    default = 'redis' if os.getenv('REDIS_URL') else 'sqlite'
+    return os.getenv('SHARED_STATE_BACKEND', default).lower()
+
+
+def create_shared_state(backend: Optional[str] = None) -> SharedState:
+    """
+    Build a shared state backend from environment configuration
+
+    Falls back to SQLite if Redis is requested but unavailable.
+    """
+    backend = (backend or _backend_name()).lower()
+
+    if backend == 'local':
+        return LocalSharedState()
+
+    if backend == 'redis':
+        try:
+            state = RedisSharedState(url=os.getenv('REDIS_URL', 'redis://localhost:6379/0'))
+            state._redis.ping()
+            logger.info("[SHARED-STATE] Using Redis shared state")
+            return state
+        except Exception as e:
+            logger.warning(f"[SHARED-STATE] Redis unavailable ({e}), falling back to SQLite")
+
+    path = os.getenv('SHARED_STATE_PATH', 'data/shared_state.db')
+    logger.info(f"[SHARED-STATE] Using SQLite shared state at {path}")
+    return SQLiteSharedState(path)
+
+
+_shared_state: Optional[SharedState] = None
+_shared_state_lock = threading.Lock()
+
+
+def get_shared_state() -> SharedState:
+    """Get the process-wide shared state backend"""
+    global _shared_state
+    if _shared_state is None:
+        with _shared_state_lock:
+            if _shared_state is None:
+                _shared_state = create_shared_state()
+    return _shared_state
+
+
+def reset_shared_state() -> None:
+    """Close and drop the process-wide shared state (for tests)"""
+    global _shared_state
+    with _shared_state_lock:
+        if _shared_state is not None:
+            _shared_state.close()
+        _shared_state = None
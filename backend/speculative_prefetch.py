@@ -0,0 +1,322 @@
+"""
+ORFEAS Speculative Prefetch
+===========================
+Preprocessing for uploaded images, started before the user asks for it.
+
+Between ``/api/upload-image`` and ``/api/generate-3d`` the server sits idle
+while the user picks options; generation then starts with background
+removal, resizing and depth estimation on the critical path.  The
+prefetcher runs those stages right after the upload instead:
+
+- Stages are plain ``stage(image, digest) -> value`` callables registered
+  by the server (returning None means "not applicable"); they run in
+  order on a small pool whose threads are reniced, so speculative work
+  yields the CPU to live requests
+- Results are keyed by the image's content digest, so re-uploads of the
+  same image and several jobs on one upload share them
+- ``take`` hands a finished result to generation; a result still being
+  computed is waited for (the work is already half done), one still
+  queued is cancelled and the caller computes it inline
+- Deleting a job cancels its prefetch; when the queue is full the oldest
+  queued prefetch is cancelled to make room for the newest upload
+- ``stats`` reports hits, misses and the time saved
+
+Environment:
+    SPECULATIVE_PREFETCH          set to "true" to enable (default: off)
+    PREFETCH_WORKERS              pool size (default 1)
+    PREFETCH_MAX_PENDING          queued prefetches before the oldest is dropped (default 8)
+    PREFETCH_MAX_ENTRIES          prefetched images kept in memory (default 32)
+    PREFETCH_TTL_SECONDS          unused results are dropped after this (default 900)
+    PREFETCH_NICENESS             niceness added to pool threads (default 10)
+"""
+
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+Stage = Callable[[Any, str], Any]
+
+STATE_QUEUED = 'queued'
+STATE_RUNNING = 'running'
+STATE_DONE = 'done'
+STATE_CANCELLED = 'cancelled'
+
+DEFAULT_WORKERS = 1
+DEFAULT_MAX_PENDING = 8
+DEFAULT_MAX_ENTRIES = 32
+DEFAULT_TTL_SECONDS = 900.0
+DEFAULT_NICENESS = 10
+
+
+class PrefetchEntry:
+    """Prefetch state of one image digest"""
+
+    def __init__(self, digest: str, job_id: str):
+        self.digest = digest
+        self.job_ids: Set[str] = {job_id}
+        self.state = STATE_QUEUED
+        self.results: Dict[str, Any] = {}
+        self.seconds: Dict[str, float] = {}
+        self.errors: Dict[str, str] = {}
+        self.cancelled = threading.Event()
+        self.finished = threading.Event()
+        self.future: Optional[Future] = None
+        self.created_at = time.monotonic()
+
+
+def _lower_priority(niceness: int) -> None:
+    """Renice the calling pool thread (Linux threads have their own nice value)"""
+    if niceness <= 0 or not hasattr(os, 'setpriority'):
+        return
+    try:
+        tid = threading.get_native_id()
+        os.setpriority(os.PRIO_PROCESS, tid, os.getpriority(os.PRIO_PROCESS, tid) + niceness)
+    except OSError as e:
+        logger.debug(f"[PREFETCH] Could not lower thread priority: {e}")
+
+
+class SpeculativePrefetcher:
+    """
+    Background preprocessing keyed by image digest
+
+    Args:
+        workers: Pool threads
+        max_pending: Queued (not yet running) prefetches before the oldest is cancelled
+        max_entries: Prefetched images kept; least recently scheduled are dropped first
+        ttl_seconds: Age after which unused results are dropped
+        niceness: Niceness added to each pool thread
+    """
+
+    def __init__(self, workers: int = DEFAULT_WORKERS, max_pending: int = DEFAULT_MAX_PENDING,
+                 max_entries: int = DEFAULT_MAX_ENTRIES, ttl_seconds: float = DEFAULT_TTL_SECONDS,
+                 niceness: int = DEFAULT_NICENESS):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.stages: Dict[str, Stage] = {}
+        self._entries: 'OrderedDict[str, PrefetchEntry]' = OrderedDict()
+        self._by_job: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="prefetch",
+                                        initializer=_lower_priority, initargs=(niceness,))
+        self._stats = {'scheduled': 0, 'deduplicated': 0, 'dropped': 0, 'cancelled': 0,
+                       'hits': 0, 'waited': 0, 'misses': 0, 'saved_seconds': 0.0, 'wait_seconds': 0.0}
+
+    def register_stage(self, name: str, stage: Stage) -> None:
+        """Add a stage; stages run in registration order"""
+        self.stages[name] = stage
+
+    # -- scheduling ----------------------------------------------------------
+
+    def schedule(self, job_id: str, digest: str, image: Any) -> bool:
+        """
+        Start preprocessing an uploaded image in the background
+
+        Args:
+            job_id: Upload/job the image belongs to
+            digest: Content digest of the image
+            image: What the stages receive: the stored upload's path or a
+                decoded image (must not be mutated afterwards)
+
+        Returns:
+            False if there is nothing to do
+        """
+        if not self.stages:
+            return False
+        with self._lock:
+            self._expire_locked()
+            entry = self._entries.get(digest)
+            if entry is not None and entry.state != STATE_CANCELLED:
+                entry.job_ids.add(job_id)
+                self._by_job[job_id] = digest
+                self._entries.move_to_end(digest)
+                self._stats['deduplicated'] += 1
+                return True
+
+            queued = [e for e in self._entries.values() if e.state == STATE_QUEUED]
+            for oldest in queued[:max(0, len(queued) - self.max_pending + 1)]:
+                self._cancel_locked(oldest)
+                self._stats['dropped'] += 1
+
+            entry = PrefetchEntry(digest, job_id)
+            self._entries[digest] = entry
+            self._by_job[job_id] = digest
+            while len(self._entries) > self.max_entries:
+                _, evicted = self._entries.popitem(last=False)
+                self._cancel_locked(evicted)
+            self._stats['scheduled'] += 1
+        entry.future = self._pool.submit(self._run, entry, image)
+        return True
+
+    def _run(self, entry: PrefetchEntry, image: Any) -> None:
+        with self._lock:
+            if entry.cancelled.is_set():
+                return
+            entry.state = STATE_RUNNING
+        try:
+            for name, stage in list(self.stages.items()):
+                if entry.cancelled.is_set():
+                    break
+                start = time.perf_counter()
+                try:
+                    value = stage(image, entry.digest)
+                except Exception as e:
+                    entry.errors[name] = str(e)
+                    logger.warning(f"[PREFETCH] Stage {name} failed for {entry.digest[:12]}: {e}")
+                    continue
+                if value is not None:
+                    entry.seconds[name] = time.perf_counter() - start
+                    entry.results[name] = value
+        finally:
+            with self._lock:
+                if entry.state == STATE_RUNNING:
+                    entry.state = STATE_CANCELLED if entry.cancelled.is_set() else STATE_DONE
+            entry.finished.set()
+        logger.info(f"[PREFETCH] Prefetched {entry.digest[:12]}: "
+                    + ", ".join(f"{name} {seconds * 1000:.0f} ms" for name, seconds in entry.seconds.items()))
+
+    # -- consumption ---------------------------------------------------------
+
+    def take(self, digest: str, stage: str, timeout: Optional[float] = None) -> Optional[Any]:
+        """
+        Prefetched result of ``stage`` for ``digest``
+
+        A prefetch still running is waited for (up to ``timeout``); one still
+        queued is cancelled, since the caller is about to do the work inline.
+
+        Returns:
+            The stage result, or None (miss: compute it inline)
+        """
+        with self._lock:
+            entry = self._entries.get(digest)
+            if entry is None or entry.state == STATE_CANCELLED:
+                self._stats['misses'] += 1
+                return None
+            if entry.state == STATE_QUEUED:
+                self._cancel_locked(entry)
+                self._stats['misses'] += 1
+                return None
+            running = entry.state == STATE_RUNNING
+
+        if running:
+            start = time.perf_counter()
+            entry.finished.wait(timeout)
+            waited = time.perf_counter() - start
+            with self._lock:
+                self._stats['wait_seconds'] += waited
+                if entry.finished.is_set():
+                    self._stats['waited'] += 1
+
+        with self._lock:
+            if stage not in entry.results:
+                self._stats['misses'] += 1
+                return None
+            self._stats['hits'] += 1
+            self._stats['saved_seconds'] += entry.seconds.get(stage, 0.0)
+            return entry.results[stage]
+
+    def state(self, digest: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(digest)
+            return entry.state if entry is not None else None
+
+    # -- cancellation ---------------------------------------------------------
+
+    def cancel(self, job_id: str) -> bool:
+        """
+        Forget ``job_id``'s prefetch (e.g. the job was deleted)
+
+        The prefetch itself is cancelled once no other job shares the image.
+        """
+        with self._lock:
+            digest = self._by_job.pop(job_id, None)
+            entry = self._entries.get(digest) if digest else None
+            if entry is None:
+                return False
+            entry.job_ids.discard(job_id)
+            if not entry.job_ids:
+                self._cancel_locked(entry)
+                self._stats['cancelled'] += 1
+            return True
+
+    def release(self, job_id: str) -> None:
+        """Drop a job's results once generation no longer needs them"""
+        with self._lock:
+            digest = self._by_job.pop(job_id, None)
+            entry = self._entries.get(digest) if digest else None
+            if entry is not None:
+                entry.job_ids.discard(job_id)
+                if not entry.job_ids and entry.state == STATE_DONE:
+                    del self._entries[digest]
+
+    def _cancel_locked(self, entry: PrefetchEntry) -> None:
+        entry.cancelled.set()
+        if entry.state == STATE_QUEUED:
+            entry.state = STATE_CANCELLED
+            entry.finished.set()
+            if entry.future is not None:
+                entry.future.cancel()
+        if self._entries.get(entry.digest) is entry:
+            del self._entries[entry.digest]
+        for job_id in entry.job_ids:
+            if self._by_job.get(job_id) == entry.digest:
+                del self._by_job[job_id]
+
+    def _expire_locked(self) -> None:
+        cutoff = time.monotonic() - self.ttl_seconds
+        for entry in [e for e in self._entries.values() if e.created_at < cutoff]:
+            self._cancel_locked(entry)
+
+    # -- reporting -----------------------------------------------------------
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            states: Dict[str, int] = {}
+            for entry in self._entries.values():
+                states[entry.state] = states.get(entry.state, 0) + 1
+            lookups = self._stats['hits'] + self._stats['misses']
+            return {
+                **self._stats,
+                'hit_rate': self._stats['hits'] / lookups if lookups else 0.0,
+                'entries': len(self._entries),
+                'states': states,
+                'stages': list(self.stages),
+                'workers': self.workers,
+            }
+
+    def shutdown(self, wait: bool = False) -> None:
+        with self._lock:
+            for entry in list(self._entries.values()):
+                self._cancel_locked(entry)
+        self._pool.shutdown(wait=wait, cancel_futures=True)
+
+
+def prefetch_enabled() -> bool:
+    return os.getenv('SPECULATIVE_PREFETCH', 'false').lower() in ('1', 'true', 'yes', 'on')
+
+
+_prefetcher: Optional[SpeculativePrefetcher] = None
+_prefetcher_lock = threading.Lock()
+
+
+def get_prefetcher() -> SpeculativePrefetcher:
+    """Get or create the prefetcher singleton (configured from the environment)"""
+    global _prefetcher
+    with _prefetcher_lock:
+        if _prefetcher is None:
+            _prefetcher = SpeculativePrefetcher(
+                workers=int(os.getenv('PREFETCH_WORKERS', str(DEFAULT_WORKERS))),
+                max_pending=int(os.getenv('PREFETCH_MAX_PENDING', str(DEFAULT_MAX_PENDING))),
+                max_entries=int(os.getenv('PREFETCH_MAX_ENTRIES', str(DEFAULT_MAX_ENTRIES))),
+                ttl_seconds=float(os.getenv('PREFETCH_TTL_SECONDS', str(DEFAULT_TTL_SECONDS))),
+                niceness=int(os.getenv('PREFETCH_NICENESS', str(DEFAULT_NICENESS)))
+            )
+            logger.info(f"[PREFETCH] Speculative prefetch ready ({_prefetcher.workers} workers)")
+        return _prefetcher
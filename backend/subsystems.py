@@ -0,0 +1,276 @@
+"""
+ORFEAS Subsystem Registry
+=========================
+Lazy, dependency-aware startup for the optional server subsystems.
+
+- Each subsystem registers a factory, the modules it needs and the
+  subsystems it depends on; nothing is imported or constructed at
+  registration time
+- ``get`` builds a subsystem (dependencies first) on first use and caches
+  it; a failing factory yields ``None``, like the old try/except blocks
+- Subsystems flagged ``warmup`` are built on a background pool after
+  startup; independent ones load in parallel, dependents start once their
+  dependencies are ready
+- Disabled subsystems are never imported
+- ``status`` reports per-subsystem readiness and import/init timings
+  without triggering any load, so health checks stay cheap
+
+Environment:
+    SUBSYSTEMS_DISABLED   comma-separated subsystem names to turn off
+    SUBSYSTEM_WARMUP      set to "false" to skip background warmup (pure lazy)
+    SUBSYSTEM_WARMUP_WORKERS  warmup threads (default 4)
+"""
+
+import importlib
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+STATE_DISABLED = 'disabled'
+STATE_REGISTERED = 'registered'
+STATE_LOADING = 'loading'
+STATE_READY = 'ready'
+STATE_FAILED = 'failed'
+
+DEFAULT_WARMUP_WORKERS = 4
+
+
+@dataclass
+class Subsystem:
+    """One registered subsystem and its load state"""
+    name: str
+    factory: Callable[[], Any]
+    modules: Tuple[str, ...] = ()
+    depends: Tuple[str, ...] = ()
+    warmup: bool = False
+    enabled: bool = True
+    description: str = ''
+    state: str = STATE_REGISTERED
+    value: Any = None
+    error: Optional[str] = None
+    import_seconds: float = 0.0
+    init_seconds: float = 0.0
+    lock: threading.RLock = field(default_factory=threading.RLock, repr=False)
+    done: threading.Event = field(default_factory=threading.Event, repr=False)
+
+
+def disabled_from_env() -> Tuple[str, ...]:
+    return tuple(name.strip() for name in os.getenv('SUBSYSTEMS_DISABLED', '').split(',') if name.strip())
+
+
+class SubsystemRegistry:
+    """
+    Registry of lazily built subsystems
+
+    Args:
+        disabled: Names that are never loaded (defaults to SUBSYSTEMS_DISABLED)
+    """
+
+    def __init__(self, disabled: Optional[Sequence[str]] = None):
+        self.disabled = frozenset(disabled_from_env() if disabled is None else disabled)
+        self._subsystems: Dict[str, Subsystem] = {}
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self.created_at = time.perf_counter()
+
+    def register(self, name: str, factory: Callable[[], Any], modules: Sequence[str] = (),
+                 depends: Sequence[str] = (), warmup: bool = False, enabled: bool = True,
+                 description: str = '') -> None:
+        """
+        Register a subsystem (nothing is imported or built here)
+
+        Args:
+            name: Subsystem name (also the health/status key)
+            factory: Builds the subsystem; runs after ``modules`` are imported
+                and ``depends`` are built
+            modules: Modules imported (and timed) before the factory runs
+            depends: Subsystems that must be built first; they must already
+                be registered, which keeps the graph acyclic
+            warmup: Build in the background after startup
+            enabled: False (or listed in SUBSYSTEMS_DISABLED) never loads it
+            description: Shown in the status report
+        """
+        if name in self._subsystems:
+            raise ValueError(f"Subsystem already registered: {name}")
+        missing = [dep for dep in depends if dep not in self._subsystems]
+        if missing:
+            raise ValueError(f"Subsystem {name} depends on unregistered {missing}")
+        subsystem = Subsystem(name, factory, tuple(modules), tuple(depends), warmup,
+                              enabled and name not in self.disabled, description)
+        if not subsystem.enabled:
+            subsystem.state = STATE_DISABLED
+            subsystem.done.set()
+        self._subsystems[name] = subsystem
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._subsystems
+
+    def names(self) -> List[str]:
+        return list(self._subsystems)
+
+    def state(self, name: str) -> str:
+        return self._subsystems[name].state
+
+    def is_ready(self, name: str) -> bool:
+        subsystem = self._subsystems.get(name)
+        return subsystem is not None and subsystem.state == STATE_READY
+
+    def get(self, name: str) -> Any:
+        """
+        Subsystem instance, built on first use
+
+        Returns:
+            The instance, or None if the subsystem is disabled, failed or
+            one of its dependencies failed
+        """
+        subsystem = self._subsystems[name]
+        if subsystem.done.is_set():
+            return subsystem.value
+        with subsystem.lock:
+            if subsystem.done.is_set():
+                return subsystem.value
+            self._load(subsystem)
+            return subsystem.value
+
+    def _load(self, subsystem: Subsystem) -> None:
+        for dep in subsystem.depends:
+            if self.get(dep) is None and self.state(dep) != STATE_READY:
+                self._finish(subsystem, STATE_FAILED, error=f"dependency {dep} unavailable")
+                return
+
+        subsystem.state = STATE_LOADING
+        try:
+            start = time.perf_counter()
+            for module in subsystem.modules:
+                importlib.import_module(module)
+            subsystem.import_seconds = time.perf_counter() - start
+
+            start = time.perf_counter()
+            value = subsystem.factory()
+            subsystem.init_seconds = time.perf_counter() - start
+        except Exception as e:
+            logger.warning(f"[STARTUP] Subsystem {subsystem.name} failed to load: {e}")
+            self._finish(subsystem, STATE_FAILED, error=str(e))
+            return
+
+        logger.info(f"[STARTUP] Subsystem {subsystem.name} ready "
+                    f"(import {subsystem.import_seconds * 1000:.0f} ms, init {subsystem.init_seconds * 1000:.0f} ms)")
+        self._finish(subsystem, STATE_READY, value=value)
+
+    @staticmethod
+    def _finish(subsystem: Subsystem, state: str, value: Any = None, error: Optional[str] = None) -> None:
+        subsystem.value = value
+        subsystem.error = error
+        subsystem.state = state
+        subsystem.done.set()
+
+    def override(self, name: str, value: Any) -> None:
+        """Replace a subsystem instance (e.g. after a runtime failure or in tests)"""
+        subsystem = self._subsystems[name]
+        with subsystem.lock:
+            self._finish(subsystem, STATE_READY if value is not None else STATE_FAILED, value=value,
+                         error=None if value is not None else 'cleared')
+
+    def wait(self, name: str, timeout: Optional[float] = None) -> bool:
+        """Block until a subsystem finished loading (either way)"""
+        return self._subsystems[name].done.wait(timeout)
+
+    def _ordered(self, names: Sequence[str]) -> List[str]:
+        """``names`` plus their dependencies, dependencies first"""
+        ordered: List[str] = []
+        seen = set()
+
+        def visit(name: str) -> None:
+            if name in seen:
+                return
+            seen.add(name)
+            for dep in self._subsystems[name].depends:
+                visit(dep)
+            ordered.append(name)
+
+        for name in names:
+            visit(name)
+        return ordered
+
+    def warmup(self, names: Optional[Sequence[str]] = None,
+               workers: Optional[int] = None) -> List[str]:
+        """
+        Build subsystems in the background
+
+        Subsystems are submitted dependencies first, so a worker only ever
+        waits on a dependency that is already running; independent
+        subsystems load in parallel.
+
+        Args:
+            names: Subsystems to warm up (default: those registered with warmup=True)
+            workers: Pool size (default SUBSYSTEM_WARMUP_WORKERS or 4)
+
+        Returns:
+            Names submitted for warmup
+        """
+        if names is None:
+            names = [name for name, subsystem in self._subsystems.items() if subsystem.warmup]
+        pending = [name for name in self._ordered(names) if not self._subsystems[name].done.is_set()]
+        if not pending:
+            return []
+        if self._pool is None:
+            workers = workers or int(os.getenv('SUBSYSTEM_WARMUP_WORKERS', str(DEFAULT_WARMUP_WORKERS)))
+            self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="subsystem-warmup")
+        for name in pending:
+            self._pool.submit(self.get, name)
+        logger.info(f"[STARTUP] Warming up {len(pending)} subsystems in the background: {', '.join(pending)}")
+        return pending
+
+    def warmup_complete(self) -> bool:
+        return all(subsystem.done.is_set() for subsystem in self._subsystems.values() if subsystem.warmup)
+
+    def status(self) -> Dict[str, Dict[str, Any]]:
+        """Per-subsystem readiness and timings (never triggers a load)"""
+        report = {}
+        for name, subsystem in self._subsystems.items():
+            entry: Dict[str, Any] = {
+                'state': subsystem.state,
+                'ready': subsystem.state == STATE_READY,
+                'warmup': subsystem.warmup,
+            }
+            if subsystem.depends:
+                entry['depends'] = list(subsystem.depends)
+            if subsystem.state in (STATE_READY, STATE_FAILED):
+                entry['import_ms'] = round(subsystem.import_seconds * 1000, 1)
+                entry['init_ms'] = round(subsystem.init_seconds * 1000, 1)
+            if subsystem.error:
+                entry['error'] = subsystem.error
+            report[name] = entry
+        return report
+
+    def shutdown(self, wait: bool = False) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=wait)
+
+
+class LazySubsystem:
+    """
+    Attribute that resolves through ``instance.subsystems``
+
+    Lets existing ``self.<name>`` call sites keep working while the
+    subsystem itself is only built on first access.
+
+    Args:
+        name: Registered subsystem name
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        return instance.subsystems.get(self.name)
+
+    def __set__(self, instance, value) -> None:
+        instance.subsystems.override(self.name, value)
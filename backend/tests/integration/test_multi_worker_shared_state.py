@@ -0,0 +1,132 @@
+"""
+ORFEAS Integration Tests - Multi-Worker Shared State
+Boots N independent WSGI worker processes that share one SQLite job store
+and shared-state file (as gunicorn workers do) and checks that duplicate
+submissions run once and rate limits are enforced across workers.
+"""
+import pytest
+import multiprocessing
+import socket
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+requests = pytest.importorskip("requests")
+pytest.importorskip("flask")
+
+WORKERS = 4
+JOBS = 40
+WORK_SECONDS = 0.05
+RATE_LIMIT_CAPACITY = 30
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def run_worker(port: int, data_dir: str, ready) -> None:
+    """One 'gunicorn worker': claim jobs through the shared layer and do the work"""
+    import flask
+    from werkzeug.serving import make_server
+    from job_store import SQLiteJobStore
+    from shared_state import SQLiteSharedState
+
+    app = flask.Flask(__name__)
+    store = SQLiteJobStore(f"{data_dir}/jobs.db")
+    shared = SQLiteSharedState(f"{data_dir}/shared_state.db")
+
+    @app.route('/generate/<job_id>', methods=['POST'])
+    def generate(job_id):
+        token = shared.acquire_lock(f"job:{job_id}", ttl_seconds=60)
+        if token is None:
+            return flask.jsonify({'status': 'conflict'}), 409
+        try:
+            if not store.create(job_id, {'status': 'processing', 'runs': 0}):
+                # Finished by another worker before this submission got the lock
+                return flask.jsonify({'status': store.get(job_id)['status'], 'duplicate': True})
+            time.sleep(WORK_SECONDS)
+            record = store.get(job_id)
+            store.transition(job_id, 'completed', fields={'runs': record['runs'] + 1, 'worker': port})
+        finally:
+            shared.release_lock(f"job:{job_id}", token)
+        return flask.jsonify({'status': 'completed'})
+
+    @app.route('/limited', methods=['GET'])
+    def limited():
+        allowed, retry_after = shared.take_tokens('rl:client', rate_per_second=0.001,
+                                                  capacity=RATE_LIMIT_CAPACITY)
+        if not allowed:
+            return flask.jsonify({'retry_after': retry_after}), 429
+        return flask.jsonify({'ok': True})
+
+    server = make_server('127.0.0.1', port, app, threaded=True)
+    ready.set()
+    server.serve_forever()
+
+
+@pytest.fixture
+def worker_pool(tmp_path):
+    from job_store import SQLiteJobStore
+    from shared_state import SQLiteSharedState
+    SQLiteJobStore(str(tmp_path / 'jobs.db')).close()
+    SQLiteSharedState(str(tmp_path / 'shared_state.db')).close()
+
+    ctx = multiprocessing.get_context('spawn')
+    ports = [free_port() for _ in range(WORKERS)]
+    processes = []
+    for port in ports:
+        ready = ctx.Event()
+        process = ctx.Process(target=run_worker, args=(port, str(tmp_path), ready), daemon=True)
+        process.start()
+        assert ready.wait(timeout=60), "worker failed to start"
+        processes.append(process)
+    yield [f"http://127.0.0.1:{port}" for port in ports], tmp_path
+    for process in processes:
+        process.terminate()
+        process.join(timeout=10)
+
+
+@pytest.mark.integration
+@pytest.mark.slow
+class TestMultiWorkerSharedState:
+    """Duplicate work and rate limits across worker processes"""
+
+    def test_duplicate_submissions_run_once(self, worker_pool):
+        urls, data_dir = worker_pool
+        # Every job is submitted to every worker at the same time
+        submissions = [(url, f"job-{n}") for n in range(JOBS) for url in urls]
+
+        def submit(args):
+            url, job_id = args
+            return requests.post(f"{url}/generate/{job_id}", timeout=30).status_code
+
+        with ThreadPoolExecutor(max_workers=len(urls) * 4) as pool:
+            statuses = list(pool.map(submit, submissions))
+
+        from job_store import SQLiteJobStore
+        store = SQLiteJobStore(str(data_dir / 'jobs.db'))
+        records = [store.get(f"job-{n}") for n in range(JOBS)]
+        store.close()
+
+        assert all(record is not None for record in records)
+        duplicates = [r for r in records if r['runs'] != 1]
+        print(f"\n[BENCH] {len(submissions)} submissions over {WORKERS} workers: "
+              f"{statuses.count(200)} accepted, {statuses.count(409)} rejected while in progress")
+        assert duplicates == [], "a job ran more than once"
+        assert all(r['status'] == 'completed' for r in records)
+        assert set(statuses) <= {200, 409}
+
+    def test_rate_limit_is_shared_across_workers(self, worker_pool):
+        urls, _ = worker_pool
+        statuses = []
+        for n in range(RATE_LIMIT_CAPACITY * 2):
+            statuses.append(requests.get(f"{urls[n % len(urls)]}/limited", timeout=10).status_code)
+
+        # Per-process limiters would have allowed WORKERS * capacity requests
+        assert statuses.count(200) == RATE_LIMIT_CAPACITY
+        assert statuses.count(429) == RATE_LIMIT_CAPACITY
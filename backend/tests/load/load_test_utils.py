@@ -26,6 +26,7 @@ class RequestResult:
     success: bool
     error: Optional[str] = None
     job_id: Optional[str] = None
+    prefetch: Optional[str] = None  # "hit" / "miss" as reported by the job, None if not used
 
 
 @dataclass
@@ -223,6 +224,64 @@ class LoadTestClient:
                 error=str(e)
             )
 
+    def upload_then_generate(self, image_path: str, think_time: float = 5.0, prefetch: bool = True,
+                             timeout: int = 300, poll_interval: float = 0.25) -> RequestResult:
+        """
+        Upload, pause like a user choosing options, then generate and wait
+
+        The duration is the perceived generation latency: from the generate
+        request until the job reports completion (upload and think time excluded).
+
+        Args:
+            image_path: Path to image file
+            think_time: Seconds between upload and generate (prefetch window)
+            prefetch: Ask the server to prefetch preprocessing for this upload
+            timeout: Seconds to wait for completion
+            poll_interval: Job status poll interval
+
+        Returns:
+            RequestResult with perceived latency and the job's prefetch outcome
+        """
+        start_time = datetime.now()
+        try:
+            with open(image_path, 'rb') as f:
+                response = self.session.post(
+                    f"{self.base_url}/api/upload-image",
+                    files={'image': ('test.png', f, 'image/png')},
+                    data={'prefetch': '1' if prefetch else '0'},
+                    timeout=60
+                )
+            if response.status_code != 200:
+                return RequestResult(start_time, 0.0, response.status_code, False,
+                                     error=f"Upload HTTP {response.status_code}")
+            job_id = response.json()['job_id']
+            time.sleep(think_time)
+
+            clicked = time.perf_counter()
+            response = self.session.post(
+                f"{self.base_url}/api/generate-3d",
+                json={'job_id': job_id, 'format': 'stl', 'quality': 7},
+                timeout=60
+            )
+            if response.status_code not in (200, 202):
+                return RequestResult(start_time, time.perf_counter() - clicked, response.status_code, False,
+                                     error=f"Generate HTTP {response.status_code}", job_id=job_id)
+
+            deadline = clicked + timeout
+            while time.perf_counter() < deadline:
+                job = self.session.get(f"{self.base_url}/api/job-status/{job_id}", timeout=10).json()
+                if job.get('status') in ('completed', 'failed'):
+                    success = job['status'] == 'completed'
+                    return RequestResult(start_time, time.perf_counter() - clicked, 200, success,
+                                         error=None if success else job.get('error', 'Generation failed'),
+                                         job_id=job_id, prefetch=job.get('prefetch'))
+                time.sleep(poll_interval)
+            return RequestResult(start_time, time.perf_counter() - clicked, 504, False,
+                                 error="Generation timeout", job_id=job_id)
+
+        except Exception as e:
+            return RequestResult(start_time, (datetime.now() - start_time).total_seconds(), 0, False, error=str(e))
+
     def get_metrics(self) -> Optional[str]:
         """Get Prometheus metrics"""
         try:
@@ -271,6 +330,14 @@ def aggregate_results(results: List[RequestResult], scenario_name: str,
     )
 
 
+def split_by_prefetch(results: List[RequestResult]) -> Dict[str, List[RequestResult]]:
+    """Group results by the job's prefetch outcome ("hit", "miss", "off")"""
+    groups: Dict[str, List[RequestResult]] = {}
+    for result in results:
+        groups.setdefault(result.prefetch or 'off', []).append(result)
+    return groups
+
+
 def print_metrics_summary(metrics: LoadTestMetrics):
     """Print formatted metrics summary"""
     print("\n" + "=" * 80)
@@ -0,0 +1,129 @@
+"""
+ORFEAS Load Test - Scenario 6: Speculative Prefetch
+====================================================
+Perceived generation latency with and without upload-time prefetch
+
+Purpose: Measure what the user waits for after clicking generate when
+preprocessing (background removal, resize, depth) already ran during the
+upload-to-generate pause
+
+Configuration:
+- Concurrent users: 1
+- Generations: 6 with prefetch, 6 without (alternating)
+- Think time between upload and generate: 5s
+- Server: SPECULATIVE_PREFETCH=true (uploads with prefetch=0 opt out)
+
+Success Criteria:
+- 0 errors
+- Every prefetched job reports a prefetch hit
+- Median perceived latency with prefetch below the median without
+
+ORFEAS AI Project
+"""
+
+import statistics
+import sys
+from pathlib import Path
+from datetime import datetime
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from tests.load.load_test_utils import (
+    LoadTestClient,
+    aggregate_results,
+    print_metrics_summary,
+    save_results_json,
+    split_by_prefetch
+)
+
+GENERATIONS_PER_ARM = 6
+THINK_TIME = 5.0
+
+
+def run_prefetch_test() -> int:
+    """Run alternating prefetch / no-prefetch generations and compare perceived latency"""
+
+    print("=" * 80)
+    print("ORFEAS LOAD TEST - SPECULATIVE PREFETCH (Scenario 6)")
+    print("=" * 80)
+    print("Configuration:")
+    print("  - Users: 1")
+    print(f"  - Generations: {GENERATIONS_PER_ARM} with prefetch, {GENERATIONS_PER_ARM} without")
+    print(f"  - Think time: {THINK_TIME:.0f}s between upload and generate")
+    print("  - Image: temp/test_images/quality_test_unique2.png")
+    print("=" * 80)
+    print()
+
+    client = LoadTestClient(base_url="http://localhost:5000")
+
+    print("[1/4] Checking server health...")
+    if not client.health_check():
+        print("Server health check failed!")
+        print("Please ensure backend is running: cd backend && SPECULATIVE_PREFETCH=true python main.py")
+        return 1
+    print("Server healthy")
+    print()
+
+    test_image = Path("temp/test_images/quality_test_unique2.png")
+    if not test_image.exists():
+        print(f"Test image not found: {test_image}")
+        print("Creating test image...")
+        import subprocess
+        subprocess.run(["python", "create_test_image.py", str(test_image)], check=True)
+    print()
+
+    print("[2/4] Running generations...")
+    results = []
+    start_time = datetime.now()
+    for i in range(GENERATIONS_PER_ARM * 2):
+        prefetch = i % 2 == 0
+        # Every upload is a new job; the image digest is shared, so without
+        # prefetch the depth memo may still help - that is part of production too
+        result = client.upload_then_generate(str(test_image), think_time=THINK_TIME, prefetch=prefetch)
+        results.append(result)
+        status = "OK " if result.success else "ERR"
+        print(f"  {status} prefetch={'on ' if prefetch else 'off'} | perceived {result.duration:6.2f}s "
+              f"| job prefetch: {result.prefetch or '-'}")
+        if not result.success:
+            print(f"    Error: {result.error}")
+    end_time = datetime.now()
+    print()
+
+    print("[3/4] Analyzing results...")
+    groups = split_by_prefetch(results)
+    arms = {}
+    for name, group in sorted(groups.items()):
+        metrics = aggregate_results(group, f"Perceived latency (prefetch {name})", start_time, end_time)
+        print_metrics_summary(metrics)
+        save_results_json(metrics, f"backend/tests/load/results_prefetch_{name}.json")
+        arms[name] = [r.duration for r in group if r.success]
+
+    print("[4/4] Validating success criteria...")
+    with_prefetch = arms.get('hit', [])
+    without_prefetch = arms.get('off', []) + arms.get('miss', [])
+    checks = [
+        ('Zero errors', all(r.success for r in results)),
+        ('Prefetched jobs hit', len(with_prefetch) == GENERATIONS_PER_ARM),
+        ('Prefetch lowers median perceived latency',
+         bool(with_prefetch and without_prefetch)
+         and statistics.median(with_prefetch) < statistics.median(without_prefetch)),
+    ]
+    if with_prefetch and without_prefetch:
+        saved = statistics.median(without_prefetch) - statistics.median(with_prefetch)
+        print(f"Median perceived latency: {statistics.median(with_prefetch):.2f}s with prefetch, "
+              f"{statistics.median(without_prefetch):.2f}s without ({saved:+.2f}s saved)")
+    for check, passed in checks:
+        print(f"{'PASS' if passed else 'FAIL'} | {check}")
+    print()
+
+    client.close()
+    return 0 if all(passed for _, passed in checks) else 1
+
+
+if __name__ == "__main__":
+    try:
+        sys.exit(run_prefetch_test())
+    except KeyboardInterrupt:
+        print("\n\n  Test interrupted by user")
+        sys.exit(1)
@@ -0,0 +1,240 @@
+"""
+ORFEAS Performance Tests - Agent Message Transports
+Wire codec cost against the old asdict/JSON/ISO-date serialization, then
+one-way messages/s and request/response round trip for every transport:
+in-process, Unix sockets (same process and to another process) and Redis
+Streams when a server is reachable
+"""
+import asyncio
+import json
+import os
+import pytest
+import statistics
+import subprocess
+import sys
+import time
+import uuid
+from dataclasses import asdict
+from datetime import datetime
+from pathlib import Path
+
+# Add parent directory to path for imports
+BACKEND = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(BACKEND))
+
+from agent_communication import (
+    AgentMessage,
+    AgentMessageBus,
+    AgentMessageCodec,
+    MessageHandler,
+    MessagePriority,
+    MessageType,
+)
+from agent_transport import (
+    REDIS_STREAMS_AVAILABLE,
+    InProcessHub,
+    InProcessTransport,
+    RedisStreamsTransport,
+    UnixSocketTransport,
+)
+
+
+# ============================================================================
+# Configuration
+# ============================================================================
+
+CODEC_ROUNDS = 20000
+ONE_WAY_MESSAGES = 5000
+ROUND_TRIPS = 500
+REDIS_URL = os.getenv('REDIS_URL', 'redis://localhost:6379')
+
+ECHO_PROCESS = r'''
+import asyncio, sys, uuid
+sys.path.insert(0, {backend!r})
+from agent_communication import AgentMessage, AgentMessageBus, AgentMessageCodec, MessageHandler, MessageType
+from agent_transport import UnixSocketTransport
+
+class Echo(MessageHandler):
+    async def handle_message(self, message):
+        return AgentMessage(id=str(uuid.uuid4()), type=MessageType.TASK_RESPONSE, sender_id="",
+                            recipient_id=None, payload=message.payload)
+    def can_handle(self, message_type):
+        return message_type == MessageType.TASK_REQUEST
+
+async def main():
+    bus = AgentMessageBus(transport=UnixSocketTransport(AgentMessageCodec(), {directory!r}))
+    await bus.initialize("echo")
+    bus.register_handler(MessageType.TASK_REQUEST, Echo())
+    print("ready", flush=True)
+    await asyncio.get_running_loop().run_in_executor(None, sys.stdin.read)
+    await bus.shutdown()
+
+asyncio.run(main())
+'''
+
+
+def sample_message(recipient: str = 'echo') -> AgentMessage:
+    return AgentMessage(id=str(uuid.uuid4()), type=MessageType.TASK_REQUEST, sender_id='client',
+                        recipient_id=recipient, priority=MessagePriority.HIGH,
+                        payload={'task_type': 'generate_3d', 'job_id': str(uuid.uuid4()),
+                                 'quality': 7, 'format': 'stl', 'params': {'steps': 50, 'guidance': 7.5}})
+
+
+def legacy_serialize(message: AgentMessage) -> str:
+    """AgentMessageBus._serialize_message before the codec"""
+    message_dict = asdict(message)
+    message_dict['timestamp'] = message.timestamp.isoformat()
+    message_dict['expires_at'] = message.expires_at.isoformat()
+    message_dict['type'] = message.type.value
+    message_dict['priority'] = message.priority.value
+    return json.dumps(message_dict)
+
+
+def legacy_deserialize(data: str) -> AgentMessage:
+    message_dict = json.loads(data)
+    message_dict['timestamp'] = datetime.fromisoformat(message_dict['timestamp'])
+    message_dict['expires_at'] = datetime.fromisoformat(message_dict['expires_at'])
+    message_dict['type'] = MessageType(message_dict['type'])
+    message_dict['priority'] = MessagePriority(message_dict['priority'])
+    return AgentMessage(**message_dict)
+
+
+class Echo(MessageHandler):
+    async def handle_message(self, message):
+        return AgentMessage(id=str(uuid.uuid4()), type=MessageType.TASK_RESPONSE, sender_id='',
+                            recipient_id=None, payload=message.payload)
+
+    def can_handle(self, message_type):
+        return message_type == MessageType.TASK_REQUEST
+
+
+class Counter(MessageHandler):
+    def __init__(self, expected: int):
+        self.count, self.expected = 0, expected
+        self.done = asyncio.Event()
+
+    async def handle_message(self, message):
+        self.count += 1
+        if self.count == self.expected:
+            self.done.set()
+        return None
+
+    def can_handle(self, message_type):
+        return True
+
+
+async def measure(client: AgentMessageBus, server: AgentMessageBus) -> dict:
+    """One-way throughput into ``server``, then sequential request/response RTTs"""
+    counter = Counter(ONE_WAY_MESSAGES)
+    server.register_handler(MessageType.STATUS_UPDATE, counter)
+    start = time.perf_counter()
+    for _ in range(ONE_WAY_MESSAGES):
+        message = sample_message(server.agent_id)
+        message.type = MessageType.STATUS_UPDATE
+        await client.send_message(message)
+    await asyncio.wait_for(counter.done.wait(), timeout=120)
+    throughput = ONE_WAY_MESSAGES / (time.perf_counter() - start)
+    return {'messages_per_s': throughput, **await round_trips(client, server.agent_id)}
+
+
+async def round_trips(client: AgentMessageBus, recipient: str) -> dict:
+    rtts = []
+    for _ in range(ROUND_TRIPS):
+        start = time.perf_counter()
+        response = await client.send_request(sample_message(recipient), timeout=10)
+        assert response is not None
+        rtts.append(time.perf_counter() - start)
+    rtts.sort()
+    return {'rtt_p50_us': statistics.median(rtts) * 1e6, 'rtt_p99_us': rtts[int(len(rtts) * 0.99)] * 1e6}
+
+
+async def pair(make_transport) -> tuple:
+    client, server = AgentMessageBus(transport=make_transport()), AgentMessageBus(transport=make_transport())
+    await client.initialize('client')
+    await server.initialize('server')
+    server.register_handler(MessageType.TASK_REQUEST, Echo())
+    return client, server
+
+
+def report(name: str, result: dict) -> None:
+    rate = f"{result['messages_per_s']:9.0f} msg/s" if 'messages_per_s' in result else f"{'-':>15}"
+    print(f"[BENCH] {name:<22} {rate}  RTT p50 {result['rtt_p50_us']:7.0f} us  p99 {result['rtt_p99_us']:7.0f} us")
+
+
+async def redis_reachable() -> bool:
+    if not REDIS_STREAMS_AVAILABLE:
+        return False
+    import redis.asyncio as redis_asyncio
+    client = redis_asyncio.from_url(REDIS_URL)
+    try:
+        await asyncio.wait_for(client.ping(), timeout=1)
+        return True
+    except Exception:
+        return False
+    finally:
+        await client.close()
+
+
+@pytest.mark.performance
+@pytest.mark.slow
+class TestAgentTransports:
+    """Codec cost and per-transport throughput/latency"""
+
+    def test_codec(self) -> None:
+        codec = AgentMessageCodec()
+        message = sample_message()
+        results = {}
+        for name, encode, decode in (('legacy json', legacy_serialize, legacy_deserialize),
+                                     (f'codec ({codec.format})', codec.encode, codec.decode)):
+            start = time.perf_counter()
+            for _ in range(CODEC_ROUNDS):
+                decode(encode(message))
+            seconds = (time.perf_counter() - start) / CODEC_ROUNDS
+            size = len(encode(message))
+            results[name] = seconds
+            print(f"\n[BENCH] {name:<16} {size:4d} bytes  encode+decode {seconds * 1e6:6.1f} us")
+        assert len(codec.encode(message)) < len(legacy_serialize(message))
+
+    @pytest.mark.asyncio
+    async def test_transports(self, tmp_path) -> None:
+        print()
+        results = {}
+        hub = InProcessHub()
+        client, server = await pair(lambda: InProcessTransport(hub))
+        results['inprocess'] = await measure(client, server)
+        await client.shutdown()
+        await server.shutdown()
+
+        codec = AgentMessageCodec()
+        client, server = await pair(lambda: UnixSocketTransport(codec, str(tmp_path / 'local')))
+        results['unix (same process)'] = await measure(client, server)
+        await client.shutdown()
+        await server.shutdown()
+
+        # Echo bus in another process: the gunicorn-worker case
+        directory = tmp_path / 'remote'
+        echo = subprocess.Popen([sys.executable, '-c', ECHO_PROCESS.format(backend=str(BACKEND),
+                                                                           directory=str(directory))],
+                                stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True)
+        try:
+            assert echo.stdout.readline().strip() == 'ready'
+            client = AgentMessageBus(transport=UnixSocketTransport(codec, str(directory)))
+            await client.initialize('client')
+            results['unix (cross process)'] = await round_trips(client, 'echo')
+            await client.shutdown()
+        finally:
+            echo.stdin.close()
+            echo.wait(timeout=30)
+
+        if await redis_reachable():
+            client, server = await pair(lambda: RedisStreamsTransport(codec, REDIS_URL,
+                                                                      prefix=f"bench:{uuid.uuid4().hex[:8]}:"))
+            results['redis streams'] = await measure(client, server)
+            await client.shutdown()
+            await server.shutdown()
+        else:
+            print("[BENCH] redis streams          skipped (no reachable Redis / redis.asyncio)")
+
+        for name, result in results.items():
+            report(name, result)
+        assert results['inprocess']['rtt_p50_us'] < results['unix (same process)']['rtt_p50_us']
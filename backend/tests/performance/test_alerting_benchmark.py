@@ -0,0 +1,84 @@
+"""
+ORFEAS Performance Tests - Alert Rule Evaluation Benchmark
+Measures metric-indexed rule evaluation cost with 10k registered rules
+"""
+import pytest
+import time
+import statistics
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from alerting_system import Alert, AlertingSystem, AlertSeverity
+
+
+# ============================================================================
+# Configuration
+# ============================================================================
+
+RULE_COUNT = 10_000
+METRIC_COUNT = 100  # rules are spread evenly across this many metrics
+ITERATIONS = 50
+
+
+def build_system() -> AlertingSystem:
+    """Register RULE_COUNT rules mixing instantaneous, windowed and compound rules"""
+    system = AlertingSystem(enable_logging=False)
+    for i in range(RULE_COUNT):
+        metric = f"metric_{i % METRIC_COUNT}"
+        kind = i % 3
+        if kind == 0:
+            alert = Alert(name=f"rule-{i}", metric=metric, threshold=1e9,
+                          severity=AlertSeverity.INFO, message="bench")
+        elif kind == 1:
+            alert = Alert.from_rule(f"rule-{i}", f"avg({metric}[1m]) > 1e9 for 30s",
+                                    AlertSeverity.WARNING, "bench")
+        else:
+            other = f"metric_{(i + 1) % METRIC_COUNT}"
+            alert = Alert.from_rule(f"rule-{i}", f"{metric} > 1e9 or rate({other}[5m]) > 1e9",
+                                    AlertSeverity.CRITICAL, "bench")
+        system.register_alert(alert)
+    return system
+
+
+@pytest.mark.performance
+@pytest.mark.slow
+class TestAlertEvaluationBenchmark:
+    """Evaluation cost at 10k rules"""
+
+    def test_single_metric_sample_touches_only_indexed_rules(self) -> None:
+        system = build_system()
+        timings = []
+        evaluated = 0
+        for n in range(ITERATIONS):
+            system.record_metrics({"metric_0": float(n)}, timestamp=1000.0 + n)
+            start = time.perf_counter()
+            evaluated = system.evaluate(now=1000.0 + n)
+            timings.append((time.perf_counter() - start) * 1000)
+
+        print(f"\n[BENCH] 1 metric sample, {RULE_COUNT} rules: "
+              f"{evaluated} evaluated, median {statistics.median(timings):.3f} ms")
+        assert evaluated < RULE_COUNT // 10
+
+    def test_full_metrics_dict_evaluation(self) -> None:
+        system = build_system()
+        record_timings = []
+        eval_timings = []
+        for n in range(ITERATIONS):
+            sample = {f"metric_{m}": float(n + m) for m in range(METRIC_COUNT)}
+            start = time.perf_counter()
+            system.record_metrics(sample, timestamp=1000.0 + n)
+            record_timings.append((time.perf_counter() - start) * 1000)
+            start = time.perf_counter()
+            system.evaluate(now=1000.0 + n)
+            eval_timings.append((time.perf_counter() - start) * 1000)
+
+        record_ms = statistics.median(record_timings)
+        eval_ms = statistics.median(eval_timings)
+        print(f"\n[BENCH] {METRIC_COUNT} metrics, {RULE_COUNT} rules: "
+              f"record (request path) {record_ms:.3f} ms, evaluate (scheduler) {eval_ms:.2f} ms, "
+              f"{eval_ms * 1000 / RULE_COUNT:.2f} us/rule")
+        # Request-path cost must not depend on the number of rules
+        assert record_ms < eval_ms
@@ -0,0 +1,112 @@
+"""
+ORFEAS Performance Tests - Context Persistence
+Request-path cost of persist_context and sustained insert throughput: the
+old synchronous INSERT + commit per context on a rollback-journal database
+against the queue + batched WAL writer, plus similarity lookup latency
+"""
+import json
+import sqlite3
+import statistics
+import sys
+import time
+from dataclasses import asdict
+from pathlib import Path
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from context_manager import IntelligentContextManager, ProcessingContext
+
+
+# ============================================================================
+# Configuration
+# ============================================================================
+
+CONTEXTS = 2000
+LOOKUPS = 200
+RESULT = {'success': True, 'processing_time': 12.5, 'quality_score': 0.91, 'model_used': 'hunyuan3d_balanced'}
+
+
+def make_context(i: int) -> ProcessingContext:
+    return ProcessingContext(
+        input_analysis={'input_type': ('image', 'text', '3d_model')[i % 3], 'complexity_score': (i % 10) / 10,
+                        'processing_priority': 'normal', 'quality_requirements': {'target_quality': 7},
+                        'estimated_resources': {'gpu_memory': 6000, 'processing_time': 30}},
+        user_context={'type': 'registered', 'user_id': f'user-{i % 50}', 'preferences': {'quality_preference': 'high'}},
+        system_context={'current_load': (i % 7) / 7, 'available_workers': 3, 'queue_length': i % 5},
+        historical_context={'model_performance': {}, 'success_rate': 0.95},
+        resource_context={'cpu_usage': 35.0, 'memory_usage': 60.0, 'gpu_available': True, 'gpu_memory_free': 8000},
+        quality_context={'target_quality': 7, 'quality_priority': 'balanced'},
+        timestamp='2025-01-01T00:00:00',
+        context_hash=f'hash-{i}'
+    )
+
+
+def legacy_persist(conn: sqlite3.Connection, session_id: str, context: ProcessingContext, result: dict) -> None:
+    """IntelligentContextManager.persist_context before the background writer"""
+    conn.execute("""
+        INSERT INTO context_history
+        (session_id, timestamp, context_data, context_hash, success,
+         processing_time, quality_score, model_used, resource_usage)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """, (session_id, time.time(), json.dumps(asdict(context)), context.context_hash, result['success'],
+          result['processing_time'], result['quality_score'], result['model_used'],
+          json.dumps(context.resource_context)))
+    conn.commit()
+
+
+@pytest.mark.performance
+@pytest.mark.slow
+class TestContextPersistence:
+    """Request-path latency and throughput of context persistence"""
+
+    def test_persist_overhead_and_throughput(self, tmp_path, monkeypatch) -> None:
+        contexts = [make_context(i) for i in range(CONTEXTS)]
+
+        legacy_path = tmp_path / 'legacy.db'
+        monkeypatch.setenv('CONTEXT_DB_PATH', str(legacy_path))
+        IntelligentContextManager().close()  # schema only
+        conn = sqlite3.connect(legacy_path, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=DELETE")
+        legacy_times = []
+        start = time.perf_counter()
+        for i, context in enumerate(contexts):
+            t = time.perf_counter()
+            legacy_persist(conn, f's{i}', context, RESULT)
+            legacy_times.append(time.perf_counter() - t)
+        legacy_total = time.perf_counter() - start
+        conn.close()
+
+        monkeypatch.setenv('CONTEXT_DB_PATH', str(tmp_path / 'batched.db'))
+        manager = IntelligentContextManager()
+        queued_times = []
+        start = time.perf_counter()
+        for i, context in enumerate(contexts):
+            t = time.perf_counter()
+            manager.persist_context(f's{i}', context, RESULT)
+            queued_times.append(time.perf_counter() - t)
+        assert manager.flush(60)
+        batched_total = time.perf_counter() - start
+        stats = dict(manager.writer.stats)
+
+        lookups = []
+        for context in contexts[:LOOKUPS]:
+            t = time.perf_counter()
+            manager.find_similar_contexts(context)
+            lookups.append(time.perf_counter() - t)
+        manager.close()
+
+        print()
+        print(f"[BENCH] request path  sync commit {statistics.median(legacy_times) * 1e6:8.1f} us  "
+              f"queued {statistics.median(queued_times) * 1e6:6.1f} us  "
+              f"({statistics.median(legacy_times) / statistics.median(queued_times):5.0f}x)")
+        print(f"[BENCH] throughput    sync commit {CONTEXTS / legacy_total:8.0f} rows/s  "
+              f"batched WAL {CONTEXTS / batched_total:8.0f} rows/s  "
+              f"({stats['batches']} transactions, {stats['dropped']} dropped)")
+        print(f"[BENCH] similarity lookup over {CONTEXTS} contexts: {statistics.median(lookups) * 1000:.3f} ms")
+
+        assert stats['written'] == CONTEXTS
+        assert statistics.median(queued_times) < statistics.median(legacy_times) / 10
+        assert batched_total < legacy_total
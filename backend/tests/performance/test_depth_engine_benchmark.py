@@ -0,0 +1,97 @@
+"""
+ORFEAS Performance Tests - Depth Engine
+Milliseconds per megapixel of the pyramid depth engine versus a
+full-resolution pass, and the cost of a memo hit versus a miss
+"""
+import pytest
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+import numpy as np
+
+from depth_engine import DepthEngine
+
+
+# ============================================================================
+# Configuration
+# ============================================================================
+
+MEGAPIXELS = (1, 4, 16)
+FULL_RES_MAX_MP = 4  # the full-resolution baseline gets slow beyond this
+REPEATS = 3
+
+
+def photo(megapixels: int) -> np.ndarray:
+    """Smooth shapes plus sensor noise, float RGB in [0, 1] like the server passes"""
+    height = int((megapixels * 1e6 * 3 / 4) ** 0.5)
+    width = int(height * 4 / 3)
+    y, x = np.mgrid[0:height, 0:width].astype(np.float32)
+    gray = 0.5 + 0.3 * np.sin(x / 97.0) * np.cos(y / 53.0)
+    gray[height // 3:2 * height // 3, width // 3:2 * width // 3] += 0.2
+    gray += np.random.default_rng(megapixels).normal(0, 0.02, gray.shape).astype(np.float32)
+    return np.repeat(np.clip(gray, 0, 1)[:, :, None], 3, axis=2)
+
+
+def best_ms(fn, repeats: int = REPEATS) -> float:
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return min(timings)
+
+
+@pytest.mark.performance
+@pytest.mark.slow
+class TestDepthEngineThroughput:
+    """Per-megapixel cost and memo savings"""
+
+    @pytest.mark.parametrize("megapixels", MEGAPIXELS)
+    def test_ms_per_megapixel(self, megapixels) -> None:
+        image = photo(megapixels)
+        engine = DepthEngine()
+        try:
+            pyramid_ms = best_ms(lambda: engine.estimate(image))
+        finally:
+            engine.shutdown()
+        print(f"\n[BENCH] {megapixels} MP pyramid: {pyramid_ms:.0f} ms "
+              f"({pyramid_ms / megapixels:.0f} ms/MP)")
+        if megapixels > FULL_RES_MAX_MP:
+            return
+        full = DepthEngine(max_side=max(image.shape[:2]), workers=1)
+        try:
+            full_ms = best_ms(lambda: full.estimate(image), repeats=1)
+        finally:
+            full.shutdown()
+        print(f"[BENCH] {megapixels} MP full resolution, serial: {full_ms:.0f} ms "
+              f"({full_ms / megapixels:.0f} ms/MP)")
+        assert pyramid_ms < full_ms
+
+    def test_memo_hit_versus_miss(self, tmp_path) -> None:
+        image = photo(4)
+        engine = DepthEngine(cache_dir=tmp_path)
+        try:
+            start = time.perf_counter()
+            _, hit = engine.estimate_cached(image, 'd' * 64, 'bench')
+            miss_ms = (time.perf_counter() - start) * 1000
+            assert not hit
+            memory_ms = best_ms(lambda: engine.estimate_cached(image, 'd' * 64, 'bench'))
+        finally:
+            engine.shutdown()
+
+        cold = DepthEngine(cache_dir=tmp_path)
+        try:
+            start = time.perf_counter()
+            _, hit = cold.estimate_cached(image, 'd' * 64, 'bench')
+            disk_ms = (time.perf_counter() - start) * 1000
+            assert hit
+        finally:
+            cold.shutdown()
+        print(f"\n[BENCH] 4 MP depth miss: {miss_ms:.1f} ms, disk hit: {disk_ms:.1f} ms, "
+              f"memory hit: {memory_ms:.2f} ms")
+        assert disk_ms < miss_ms
+        assert memory_ms < disk_ms
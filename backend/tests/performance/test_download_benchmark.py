@@ -0,0 +1,175 @@
+"""
+ORFEAS Performance Tests - Model Downloads
+Throughput and server CPU per GB served: legacy 512 KB Python generator
+versus send_file/sendfile, precompressed gzip and paged base64
+"""
+import pytest
+import multiprocessing
+import os
+import socket
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+psutil = pytest.importorskip("psutil")
+requests = pytest.importorskip("requests")
+pytest.importorskip("gunicorn")
+
+# ============================================================================
+# Configuration
+# ============================================================================
+
+FILE_SIZE_MB = 64
+DOWNLOADS = 8
+B64_PAGE_SIZE = 3 * 1024 * 1024
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def serve(port: int, outputs_dir: str) -> None:
+    """Run a one-worker gunicorn server with legacy and new download routes"""
+    import flask
+    from gunicorn.app.base import BaseApplication
+    from download_service import resolve_artifact, send_artifact, read_base64_page
+
+    app = flask.Flask(__name__)
+    outputs = Path(outputs_dir)
+
+    @app.route('/legacy/<job_id>/<filename>')
+    def legacy(job_id, filename):
+        file_path = outputs / job_id / filename
+        file_size = file_path.stat().st_size
+
+        def generate_file():
+            with open(str(file_path), 'rb') as f:
+                while True:
+                    chunk = f.read(512 * 1024)
+                    if not chunk:
+                        break
+                    yield chunk
+
+        return flask.Response(generate_file(), mimetype='application/octet-stream',
+                              headers={'Content-Length': str(file_size),
+                                       'Cache-Control': 'no-cache, no-store, must-revalidate'})
+
+    @app.route('/api/download/<job_id>/<filename>')
+    def download(job_id, filename):
+        path = resolve_artifact(outputs, job_id, filename)
+        return send_artifact(flask.request, path, filename, 'model/stl', f"{job_id}/{filename}")
+
+    @app.route('/api/download-base64/<job_id>/<filename>')
+    def download_b64(job_id, filename):
+        path = resolve_artifact(outputs, job_id, filename)
+        return flask.jsonify(read_base64_page(path, int(flask.request.args['offset']), B64_PAGE_SIZE))
+
+    class Server(BaseApplication):
+        def load_config(self):
+            self.cfg.set('bind', f'127.0.0.1:{port}')
+            self.cfg.set('workers', 1)
+            self.cfg.set('worker_class', 'sync')
+            self.cfg.set('loglevel', 'warning')
+
+        def load(self):
+            return app
+
+    Server().run()
+
+
+def server_cpu_seconds(pid: int) -> float:
+    process = psutil.Process(pid)
+    total = 0.0
+    for proc in [process] + process.children(recursive=True):
+        times = proc.cpu_times()
+        total += times.user + times.system
+    return total
+
+
+def measure(pid: int, fetch) -> tuple:
+    """Return (MB/s, server CPU seconds per GB of payload, wire bytes)"""
+    fetch()  # warm up worker, hash sidecar and page cache
+    cpu_before = server_cpu_seconds(pid)
+    start = time.perf_counter()
+    wire_bytes = sum(fetch() for _ in range(DOWNLOADS))
+    elapsed = time.perf_counter() - start
+    cpu = server_cpu_seconds(pid) - cpu_before
+    payload_gb = DOWNLOADS * FILE_SIZE_MB / 1024
+    return DOWNLOADS * FILE_SIZE_MB / elapsed, cpu / payload_gb, wire_bytes / DOWNLOADS
+
+
+@pytest.mark.performance
+@pytest.mark.slow
+def test_download_throughput_and_cpu(tmp_path):
+    job_dir = tmp_path / 'job-1'
+    job_dir.mkdir()
+    # Half text (compressible like ASCII STL), half random (like binary floats)
+    block = b"facet normal 0 0 1\n outer loop\n vertex 1.5 2.5 3.5\n" * 1024 + os.urandom(50 * 1024)
+    with open(job_dir / 'model.stl', 'wb') as f:
+        for _ in range(FILE_SIZE_MB * 1024 * 1024 // len(block) + 1):
+            f.write(block)
+        f.truncate(FILE_SIZE_MB * 1024 * 1024)
+
+    from download_service import precompress_artifact
+    precompress_artifact(job_dir / 'model.stl')
+
+    port = free_port()
+    ctx = multiprocessing.get_context('spawn')
+    server = ctx.Process(target=serve, args=(port, str(tmp_path)), daemon=True)
+    server.start()
+    base = f"http://127.0.0.1:{port}"
+    for _ in range(100):
+        try:
+            requests.get(f"{base}/legacy/job-1/model.stl", stream=True, timeout=1).close()
+            break
+        except requests.ConnectionError:
+            time.sleep(0.1)
+
+    session = requests.Session()
+
+    def fetch(url, headers=None):
+        def run():
+            received = 0
+            with session.get(url, headers=headers or {'Accept-Encoding': 'identity'}, stream=True) as r:
+                assert r.status_code == 200
+                for chunk in r.raw.stream(1024 * 1024, decode_content=False):
+                    received += len(chunk)
+            return received
+        return run
+
+    def fetch_b64():
+        received, offset = 0, 0
+        while offset is not None:
+            page = session.get(f"{base}/api/download-base64/job-1/model.stl", params={'offset': offset}).json()
+            received += len(page['data'])
+            offset = page['next_offset']
+        return received
+
+    try:
+        results = {
+            'legacy generator': measure(server.pid, fetch(f"{base}/legacy/job-1/model.stl")),
+            'send_file (sendfile)': measure(server.pid, fetch(f"{base}/api/download/job-1/model.stl")),
+            'precompressed gzip': measure(server.pid, fetch(f"{base}/api/download/job-1/model.stl",
+                                                            {'Accept-Encoding': 'gzip'})),
+            'paged base64': measure(server.pid, fetch_b64),
+        }
+        revalidate = session.get(f"{base}/api/download/job-1/model.stl",
+                                 headers={'If-None-Match': session.get(
+                                     f"{base}/api/download/job-1/model.stl", stream=True).headers['ETag']})
+    finally:
+        server.terminate()
+        server.join(timeout=10)
+
+    print(f"\n[BENCH] {DOWNLOADS} x {FILE_SIZE_MB} MB downloads via gunicorn (1 sync worker)")
+    for name, (mb_s, cpu_per_gb, wire) in results.items():
+        print(f"[BENCH] {name:22s} {mb_s:8.0f} MB/s  {cpu_per_gb:6.2f} CPU-s/GB  "
+              f"{wire / 1024 / 1024:6.1f} MB on the wire")
+
+    assert revalidate.status_code == 304
+    assert results['send_file (sendfile)'][1] < results['legacy generator'][1]
+    assert results['precompressed gzip'][2] < FILE_SIZE_MB * 1024 * 1024
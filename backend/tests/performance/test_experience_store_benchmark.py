@@ -0,0 +1,98 @@
+"""
+ORFEAS Performance Tests - Agent Experience Store
+Lookup latency for one task type holding 1k, 100k and 1M experiences:
+the old full scan with key-set Jaccard against the IVF-indexed store, plus
+recall of the index against an exact scan
+"""
+import pytest
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from experience_store import ExperienceStore, context_features
+
+
+# ============================================================================
+# Configuration
+# ============================================================================
+
+SIZES = (1_000, 100_000, 1_000_000)
+QUERIES = 200
+LEGACY_QUERIES = 5       # the full scan takes seconds at 1M
+TOP_K = 10
+CONTEXT_KEYS = [f"key_{i}" for i in range(48)]
+CONTEXT_VALUES = ['fast', 'balanced', 'best', 'stl', 'glb', 'obj', 10, 20, 50, 0.5, 1.0, True]
+
+
+def random_context(rng: random.Random) -> dict:
+    return {key: rng.choice(CONTEXT_VALUES) for key in rng.sample(CONTEXT_KEYS, rng.randint(3, 8))}
+
+
+def legacy_lookup(buffer: list, context: dict, threshold: float = 0.8) -> list:
+    """EnterpriseAgentBase.get_relevant_experience before the store"""
+    keys = set(context)
+    relevant = []
+    for experience in buffer:
+        other = set(experience['context'])
+        union = keys | other
+        if union and len(keys & other) / len(union) >= threshold:
+            relevant.append(experience)
+    return sorted(relevant, key=lambda x: x['quality_score'], reverse=True)
+
+
+def timed(fn, queries) -> float:
+    """Median seconds per call"""
+    times = []
+    for query in queries:
+        start = time.perf_counter()
+        fn(query)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+@pytest.mark.performance
+@pytest.mark.slow
+class TestExperienceLookup:
+    """Median lookup latency per store size"""
+
+    def test_lookup_latency(self) -> None:
+        rng = random.Random(0)
+        queries = [random_context(rng) for _ in range(QUERIES)]
+        print()
+        for size in SIZES:
+            store = ExperienceStore(capacity=size)
+            records = [{'task_type': 'quality_assessment', 'context': random_context(rng),
+                        'quality_score': rng.random()} for _ in range(size)]
+            start = time.perf_counter()
+            for record in records:
+                store.add(record)
+            build = time.perf_counter() - start
+
+            indexed = timed(lambda q: store.search('quality_assessment', q, k=TOP_K), queries)
+            legacy = timed(lambda q: legacy_lookup(records, q), queries[:LEGACY_QUERIES])
+
+            partition = store.partitions['quality_assessment']
+            vectors = partition.vectors[:partition.size]
+            hits = 0
+            for query in queries[:50]:
+                vector = context_features(query)
+                exact = vectors @ vector
+                kth = np.partition(-exact, TOP_K - 1)[TOP_K - 1]
+                found = {slot for slot in partition.search(vector, TOP_K, store.nprobe)[0]}
+                hits += sum(1 for slot in found if -exact[slot] <= kth + 1e-6)
+            recall = hits / (50 * TOP_K)
+
+            print(f"[BENCH] {size:>9,} experiences: indexed {indexed * 1000:7.3f} ms  "
+                  f"full scan {legacy * 1000:9.1f} ms  ({legacy / indexed:6.0f}x)  "
+                  f"recall@{TOP_K} {recall:.2f}  build {build:5.1f} s")
+            assert indexed < legacy
+            if size >= 100_000:
+                assert indexed < 0.02
+                assert recall > 0.8
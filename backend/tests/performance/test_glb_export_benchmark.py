@@ -0,0 +1,125 @@
+"""
+ORFEAS Performance Tests - Babylon Mesh Payloads
+Payload size, server encode time and client-side parse time of the
+binary GLB export versus the nested-list JSON mesh payload
+"""
+import gzip
+import json
+import pytest
+import time
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from glb_export import compute_vertex_normals, export_glb, parse_glb, planar_uvs
+
+
+# ============================================================================
+# Configuration
+# ============================================================================
+
+GRID_SIZE = 400  # 160k vertices, 318k faces
+
+
+def make_grid(n: int):
+    xs, zs = np.meshgrid(np.linspace(-1, 1, n), np.linspace(-1, 1, n))
+    ys = 0.2 * np.sin(3 * xs) * np.cos(2 * zs)
+    vertices = np.stack([xs.ravel(), ys.ravel(), zs.ravel()], axis=1)
+    idx = np.arange(n * n).reshape(n, n)
+    a, b, c, d = idx[:-1, :-1].ravel(), idx[:-1, 1:].ravel(), idx[1:, :-1].ravel(), idx[1:, 1:].ravel()
+    faces = np.concatenate([np.stack([a, c, b], 1), np.stack([b, c, d], 1)])
+    return vertices, faces
+
+
+def legacy_smooth_normals(vertices, faces):
+    normals = np.zeros_like(vertices)
+    for face in faces:
+        v0, v1, v2 = vertices[face[0]], vertices[face[1]], vertices[face[2]]
+        face_normal = np.cross(v1 - v0, v2 - v0)
+        normals[face[0]] += face_normal
+        normals[face[1]] += face_normal
+        normals[face[2]] += face_normal
+    norms = np.linalg.norm(normals, axis=1, keepdims=True)
+    norms[norms == 0] = 1
+    return normals / norms
+
+
+def json_payload(vertices, faces) -> bytes:
+    """The optimize_mesh_for_webgpu + export_for_babylon JSON path"""
+    normals = compute_vertex_normals(vertices, faces)
+    return json.dumps({'mesh': {
+        'vertices': vertices.tolist(),
+        'faces': faces.tolist(),
+        'normals': normals.tolist(),
+        'uvs': planar_uvs(vertices).tolist(),
+    }}).encode()
+
+
+def parse_json(payload: bytes) -> None:
+    mesh = json.loads(payload)['mesh']
+    np.asarray(mesh['vertices'], dtype=np.float32)
+    np.asarray(mesh['faces'], dtype=np.uint32)
+    np.asarray(mesh['normals'], dtype=np.float32)
+    np.asarray(mesh['uvs'], dtype=np.float32)
+
+
+def parse_glb_views(payload: bytes) -> None:
+    """Container parse plus typed-array views, as the browser loader does"""
+    document, binary = parse_glb(payload)
+    for view in document['bufferViews']:
+        ext = view.get('extensions', {}).get('EXT_meshopt_compression')
+        if ext is None:
+            np.frombuffer(binary, dtype=np.uint8, count=view['byteLength'], offset=view['byteOffset'])
+            continue
+        meshoptimizer = pytest.importorskip("meshoptimizer")
+        encoded = binary[ext['byteOffset']:ext['byteOffset'] + ext['byteLength']]
+        if ext['mode'] == 'ATTRIBUTES':
+            meshoptimizer.decode_vertex_buffer(ext['count'], ext['byteStride'], encoded)
+        else:
+            meshoptimizer.decode_index_sequence(ext['count'], ext['byteStride'], encoded)
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, (time.perf_counter() - start) * 1000
+
+
+@pytest.mark.performance
+@pytest.mark.slow
+class TestGlbExportPayloads:
+    """GLB vs JSON mesh delivery"""
+
+    def test_payload_encode_and_parse(self) -> None:
+        vertices, faces = make_grid(GRID_SIZE)
+        print(f"\n[BENCH] mesh: {len(vertices)} vertices, {len(faces)} faces")
+
+        payload, encode_ms = timed(json_payload, vertices, faces)
+        _, parse_ms = timed(parse_json, payload)
+        gz = len(gzip.compress(payload, 6))
+        print(f"[BENCH] json: {len(payload) / 1e6:.1f} MB (gzip {gz / 1e6:.1f} MB), "
+              f"encode {encode_ms:.0f} ms, parse {parse_ms:.0f} ms")
+        json_size = len(payload)
+
+        for label, options in (('glb float32', {}),
+                               ('glb quantized', {'quantize': True}),
+                               ('glb quantized+meshopt', {'quantize': True, 'compress': True})):
+            glb, encode_ms = timed(lambda: export_glb(vertices, faces, **options))
+            _, parse_ms = timed(parse_glb_views, glb)
+            gz = len(gzip.compress(glb, 6))
+            print(f"[BENCH] {label}: {len(glb) / 1e6:.2f} MB (gzip {gz / 1e6:.2f} MB), "
+                  f"encode {encode_ms:.0f} ms, parse {parse_ms:.1f} ms")
+            assert len(glb) < json_size / 3
+
+    def test_normals_scatter_add_vs_loop(self) -> None:
+        vertices, faces = make_grid(120)
+        legacy, loop_ms = timed(legacy_smooth_normals, vertices, faces)
+        vectorized, vector_ms = timed(compute_vertex_normals, vertices, faces)
+        np.testing.assert_allclose(vectorized, legacy, atol=1e-12)
+        print(f"\n[BENCH] normals for {len(faces)} faces: loop {loop_ms:.0f} ms, "
+              f"scatter-add {vector_ms:.1f} ms ({loop_ms / vector_ms:.0f}x)")
+        assert vector_ms < loop_ms
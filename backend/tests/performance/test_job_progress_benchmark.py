@@ -0,0 +1,191 @@
+"""
+ORFEAS Performance Tests - Job Progress Delivery
+Server requests per completed job and server CPU for the polling clients
+the frontends use (/api/job-status every 1s, and an aggressive 250ms
+poller) against long-polling (?wait=) and one Server-Sent Events stream
+per job. The server runs in its own process with the job store, progress
+tracker event stream and routes wired as in main.py
+"""
+import http.client
+import json
+import multiprocessing
+import sys
+import threading
+import time
+import uuid
+from pathlib import Path
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+flask = pytest.importorskip("flask")
+psutil = pytest.importorskip("psutil")
+
+
+# ============================================================================
+# Configuration
+# ============================================================================
+
+JOBS = 24
+JOB_SECONDS = 6.0
+# Progress writes per job, like the generate-3d flow (queued, 10%, 20%, ... done)
+UPDATES = (('processing', 10), ('processing', 20), ('processing', 50), ('processing', 80), ('completed', 100))
+CLIENTS = {
+    'poll 1s': ('poll', 1.0),
+    'poll 250ms': ('poll', 0.25),
+    'long-poll': ('long', None),
+    'sse': ('sse', None),
+}
+LONG_POLL_WAIT = 25
+
+
+def serve(conn) -> None:
+    """Server process: job store + event stream + the three job status routes"""
+    from flask import Flask, Response, jsonify, request
+    from werkzeug.serving import make_server
+    from job_store import InMemoryJobStore, is_terminal_status
+    from progress_tracker import ProgressTracker, sse_stream, store_event_id
+
+    app = Flask(__name__)
+    store = InMemoryJobStore()
+    tracker = ProgressTracker()
+    store.subscribe(lambda job_id, data, version, remote: tracker.publish_job_state(
+        job_id, {'job_id': job_id, **data}, terminal=is_terminal_status(data.get('status')), version=version),
+        with_version=True)
+    events = tracker.events
+
+    @app.route('/api/job-status/<job_id>')
+    def job_status(job_id):
+        version = max(events.version(job_id), store_event_id(store.version(job_id)))
+        job_data = store.get(job_id)
+        if not job_data:
+            return jsonify({"error": "Job not found"}), 404
+        wait = min(max(request.args.get('wait', 0.0, type=float), 0.0), 30)
+        if wait and not is_terminal_status(job_data.get('status')):
+            changes = events.wait(job_id, request.args.get('since', version, type=int), wait)
+            if changes:
+                version = changes[-1].id
+                job_data = store.get(job_id) or job_data
+        response = jsonify(job_data)
+        response.headers['X-Job-Version'] = str(version)
+        return response
+
+    @app.route('/api/job-events/<job_id>')
+    def job_events(job_id):
+        store_version = store.version(job_id)
+        job_data = store.get(job_id)
+        if not job_data:
+            return jsonify({"error": "Job not found"}), 404
+        last_event_id = request.headers.get('Last-Event-ID', '')
+        if not events.version(job_id):
+            tracker.publish_job_state(job_id, {'job_id': job_id, **job_data},
+                                      terminal=is_terminal_status(job_data.get('status')), version=store_version)
+        return Response(sse_stream(events, job_id, int(last_event_id) if last_event_id.isdigit() else 0),
+                        mimetype='text/event-stream')
+
+    @app.route('/start', methods=['POST'])
+    def start():
+        job_ids = [str(uuid.uuid4()) for _ in range(JOBS)]
+        for job_id in job_ids:
+            store.put(job_id, {'status': 'queued', 'progress': 0})
+
+        def drive():
+            step = JOB_SECONDS / len(UPDATES)
+            for status, progress in UPDATES:
+                time.sleep(step)
+                for job_id in job_ids:
+                    store.update(job_id, {'status': status, 'progress': progress})
+
+        threading.Thread(target=drive, daemon=True).start()
+        return jsonify(job_ids)
+
+    server = make_server('127.0.0.1', 0, app, threaded=True)
+    conn.send(server.server_port)
+    server.serve_forever()
+
+
+def poll_client(port: int, job_id: str, interval: float) -> int:
+    connection, requests = http.client.HTTPConnection('127.0.0.1', port), 0
+    while True:
+        connection.request('GET', f'/api/job-status/{job_id}')
+        data = json.loads(connection.getresponse().read())
+        requests += 1
+        if data['status'] == 'completed':
+            return requests
+        time.sleep(interval)
+
+
+def long_poll_client(port: int, job_id: str, _interval) -> int:
+    connection, requests, version = http.client.HTTPConnection('127.0.0.1', port, timeout=60), 0, None
+    while True:
+        since = '' if version is None else f'&since={version}'
+        connection.request('GET', f'/api/job-status/{job_id}?wait={LONG_POLL_WAIT}{since}')
+        response = connection.getresponse()
+        data = json.loads(response.read())
+        version = response.getheader('X-Job-Version')
+        requests += 1
+        if data['status'] == 'completed':
+            return requests
+
+
+def sse_client(port: int, job_id: str, _interval) -> int:
+    connection = http.client.HTTPConnection('127.0.0.1', port, timeout=60)
+    connection.request('GET', f'/api/job-events/{job_id}')
+    body = connection.getresponse().read().decode()  # server closes after the terminal event
+    assert 'event: complete' in body
+    return 1
+
+
+CLIENT_FUNCTIONS = {'poll': poll_client, 'long': long_poll_client, 'sse': sse_client}
+
+
+def run_mode(kind: str, interval) -> tuple:
+    """(requests per job, server CPU seconds per job, wall seconds)"""
+    parent, child = multiprocessing.Pipe()
+    process = multiprocessing.Process(target=serve, args=(child,), daemon=True)
+    process.start()
+    try:
+        port = parent.recv()
+        server = psutil.Process(process.pid)
+        connection = http.client.HTTPConnection('127.0.0.1', port)
+        cpu_before = sum(server.cpu_times()[:2])
+        start = time.perf_counter()
+        connection.request('POST', '/start')
+        job_ids = json.loads(connection.getresponse().read())
+
+        counts = []
+        threads = [threading.Thread(target=lambda j=job_id: counts.append(CLIENT_FUNCTIONS[kind](port, j, interval)))
+                   for job_id in job_ids]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(60)
+        wall = time.perf_counter() - start
+        cpu = sum(server.cpu_times()[:2]) - cpu_before
+        assert len(counts) == JOBS
+        return sum(counts) / JOBS, cpu / JOBS, wall
+    finally:
+        process.terminate()
+        process.join(5)
+
+
+@pytest.mark.performance
+@pytest.mark.slow
+class TestJobProgressDelivery:
+    """Requests and CPU per completed job"""
+
+    def test_requests_and_cpu_per_job(self) -> None:
+        results = {name: run_mode(*client) for name, client in CLIENTS.items()}
+
+        print()
+        for name, (requests, cpu, wall) in results.items():
+            print(f"[BENCH] {name:<11} {requests:6.1f} requests/job  {cpu * 1000:7.2f} ms server CPU/job  "
+                  f"({JOBS} jobs, {wall:.1f}s)")
+
+        assert results['sse'][0] == 1
+        assert results['long-poll'][0] <= len(UPDATES) + 1
+        assert results['long-poll'][0] < results['poll 1s'][0] < results['poll 250ms'][0]
+        assert results['sse'][1] < results['poll 1s'][1]
+        assert results['long-poll'][1] < results['poll 250ms'][1]
@@ -0,0 +1,160 @@
+"""
+ORFEAS Performance Tests - Job Store
+Multi-process status consistency and job-status lookup latency of the
+SQLite/WAL job store under concurrent writers
+"""
+import pytest
+import multiprocessing
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from job_store import SQLiteJobStore
+
+
+# ============================================================================
+# Configuration
+# ============================================================================
+
+WORKERS = 4
+JOBS_PER_WORKER = 50
+STEPS_PER_JOB = 10
+PRELOADED_JOBS = 20_000
+LOOKUPS = 5_000
+
+
+def generation_worker(path: str, worker_id: int, barrier) -> None:
+    """Simulate a gunicorn worker driving its jobs through the pipeline"""
+    store = SQLiteJobStore(path)
+    barrier.wait()
+    for n in range(JOBS_PER_WORKER):
+        job_id = f"w{worker_id}-{n}"
+        assert store.claim(job_id)
+        store.put(job_id, {'job_id': job_id, 'status': 'processing', 'progress': 0, 'worker': worker_id})
+        for step in range(1, STEPS_PER_JOB + 1):
+            store.update(job_id, {'progress': step * 100 // STEPS_PER_JOB})
+        store.transition(job_id, 'completed', from_statuses=('processing',))
+        store.release(job_id)
+    store.close()
+
+
+def claim_worker(path: str, job_ids, barrier, results) -> None:
+    """Race other workers for the same job ids"""
+    store = SQLiteJobStore(path)
+    barrier.wait()
+    won = [job_id for job_id in job_ids if store.claim(job_id)]
+    results.put(won)
+    store.close()
+
+
+def status_reader(path: str, stop, barrier, results) -> None:
+    """Poll job status like /api/job-status and record lookup latency"""
+    store = SQLiteJobStore(path)
+    latencies = []
+    regressions = 0
+    last_progress = {}
+    barrier.wait()
+    while not stop.is_set():
+        job_id = f"w{random.randrange(WORKERS)}-{random.randrange(JOBS_PER_WORKER)}"
+        start = time.perf_counter()
+        record = store.get(job_id)
+        latencies.append(time.perf_counter() - start)
+        if record is not None:
+            progress = record.get('progress', 0)
+            if progress < last_progress.get(job_id, 0):
+                regressions += 1
+            last_progress[job_id] = progress
+    results.put((latencies, regressions))
+    store.close()
+
+
+@pytest.mark.performance
+@pytest.mark.slow
+class TestJobStoreMultiProcess:
+    """Job store consistency across processes sharing one database"""
+
+    def test_status_consistency_under_concurrent_writers(self, tmp_path):
+        path = str(tmp_path / 'jobs.db')
+        SQLiteJobStore(path).close()
+        ctx = multiprocessing.get_context('spawn')
+        barrier = ctx.Barrier(WORKERS + 1)
+        stop = ctx.Event()
+        results = ctx.Queue()
+
+        writers = [ctx.Process(target=generation_worker, args=(path, i, barrier)) for i in range(WORKERS)]
+        reader = ctx.Process(target=status_reader, args=(path, stop, barrier, results))
+        for process in writers + [reader]:
+            process.start()
+        for process in writers:
+            process.join(timeout=120)
+            assert process.exitcode == 0
+        stop.set()
+        latencies, regressions = results.get(timeout=60)
+        reader.join(timeout=30)
+
+        store = SQLiteJobStore(path)
+        counts = store.count_by_status()
+        total = WORKERS * JOBS_PER_WORKER
+        p50 = statistics.median(latencies) * 1e6
+        p99 = sorted(latencies)[int(len(latencies) * 0.99)] * 1e6
+        print(f"\n[BENCH] {WORKERS} writers x {JOBS_PER_WORKER} jobs x {STEPS_PER_JOB} updates; "
+              f"reader: {len(latencies)} lookups p50={p50:.1f}us p99={p99:.1f}us")
+
+        assert counts == {'completed': total}
+        assert store.active_count() == 0
+        assert all(r['progress'] == 100 for r in store.list_by_status('completed', limit=total))
+        assert regressions == 0, "a reader observed progress going backwards"
+        store.close()
+
+    def test_claims_are_exclusive_across_processes(self, tmp_path):
+        path = str(tmp_path / 'jobs.db')
+        SQLiteJobStore(path).close()
+        job_ids = [f"contended-{n}" for n in range(200)]
+        ctx = multiprocessing.get_context('spawn')
+        barrier = ctx.Barrier(WORKERS)
+        results = ctx.Queue()
+
+        workers = [ctx.Process(target=claim_worker, args=(path, job_ids, barrier, results)) for _ in range(WORKERS)]
+        for process in workers:
+            process.start()
+        won = [results.get(timeout=120) for _ in workers]
+        for process in workers:
+            process.join(timeout=30)
+
+        claimed = [job_id for batch in won for job_id in batch]
+        assert sorted(claimed) == sorted(job_ids), "every job must be claimed exactly once"
+
+
+@pytest.mark.performance
+@pytest.mark.slow
+def test_lookup_latency_is_independent_of_store_size(tmp_path):
+    """Primary-key lookups stay flat as the table grows"""
+    store = SQLiteJobStore(str(tmp_path / 'jobs.db'))
+    conn = store._conn()
+    now = time.time()
+    with store._write(conn):
+        conn.executemany(
+            "INSERT INTO jobs (job_id, status, data, created_at, updated_at, expires_at, seq) "
+            "VALUES (?, 'completed', '{\"status\": \"completed\"}', ?, ?, ?, 0)",
+            [(f"job-{n}", now, now, now + 3600) for n in range(PRELOADED_JOBS)])
+
+    ids = [f"job-{random.randrange(PRELOADED_JOBS)}" for _ in range(LOOKUPS)]
+    start = time.perf_counter()
+    for job_id in ids:
+        assert store.get(job_id) is not None
+    per_lookup = (time.perf_counter() - start) / LOOKUPS * 1e6
+
+    start = time.perf_counter()
+    removed = store.compact(now + 7200)
+    compact_ms = (time.perf_counter() - start) * 1000
+
+    print(f"\n[BENCH] get() over {PRELOADED_JOBS} jobs: {per_lookup:.1f}us/lookup; "
+          f"compacted {removed} jobs in {compact_ms:.1f}ms")
+    assert per_lookup < 500
+    assert removed == PRELOADED_JOBS
+    store.close()
@@ -0,0 +1,172 @@
+"""
+ORFEAS Performance Tests - Retained Record Memory
+Steady-state heap of each retention store holding 100k items, with the
+records as they were (regular dataclasses, one __dict__ per instance,
+metrics history as a deque of objects) against the slotted dataclasses
+and the columnar MetricsRing. Also reports allocated blocks per record,
+i.e. what every request leaves behind in these stores
+"""
+import gc
+import sys
+import time
+import tracemalloc
+from collections import deque
+from dataclasses import MISSING, field, fields, make_dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
+
+import cache_manager
+import distributed_cache_manager
+from agent_communication import AgentMessage, MessageType
+from backend.llm_integration.tracing import PerformanceMetric
+from continuous_quality_monitor import MetricsRing, QualityMetrics
+from distributed_tracing import Span
+from progress_tracker import JobProgress, StageInfo
+
+
+# ============================================================================
+# Configuration
+# ============================================================================
+
+RETAINED = 100_000
+STAGES_PER_JOB = 5
+
+
+def legacy(cls):
+    """Same fields, defaults and __post_init__ as ``cls``, without slots"""
+    specs = []
+    for f in fields(cls):
+        if f.default is not MISSING:
+            specs.append((f.name, f.type, field(default=f.default)))
+        elif f.default_factory is not MISSING:
+            specs.append((f.name, f.type, field(default_factory=f.default_factory)))
+        else:
+            specs.append((f.name, f.type))
+    namespace = {'__post_init__': cls.__post_init__} if hasattr(cls, '__post_init__') else {}
+    return make_dataclass(f'Legacy{cls.__name__}', specs, namespace=namespace)
+
+
+def build_messages(cls):
+    return [cls(id=None, type=MessageType.TASK_REQUEST, sender_id='orchestrator', recipient_id='worker',
+                payload={'task': i}) for i in range(RETAINED)]
+
+
+def build_cache(cls):
+    now = time.time()
+    return {f'key-{i}': cls(value=i, timestamp=now, size_mb=0.01, expires_at=now + 3600) for i in range(RETAINED)}
+
+
+def build_distributed_cache(cls):
+    now = datetime.now()
+    expires = now + timedelta(hours=1)
+    return {f'key-{i}': cls(value=i, expires_at=expires, created_at=now, size_bytes=64) for i in range(RETAINED)}
+
+
+def build_spans(cls):
+    now = time.time()
+    return [cls(span_id=f'span-{i}', trace_id=f'trace-{i // 10}', parent_span_id=None,
+                operation_name='generate', service='orfeas', start_time=now, end_time=now + 0.01,
+                duration_ms=10.0) for i in range(RETAINED)]
+
+
+def build_jobs(job_cls, stage_cls):
+    now = datetime.now()
+    jobs = {}
+    for j in range(RETAINED // STAGES_PER_JOB):
+        job = job_cls(job_id=f'job-{j}', started_at=now, overall_progress=50.0)
+        for s in range(STAGES_PER_JOB):
+            job.stages[f'stage-{s}'] = stage_cls(name=f'stage-{s}', weight=0.2, estimated_duration=5.0,
+                                                 started_at=now, progress=100.0)
+        jobs[job.job_id] = job
+    return jobs
+
+
+def build_performance_metrics(cls):
+    now = datetime.now()
+    return deque((cls(name='route', component='llm_router', duration_ms=float(i % 50), timestamp=now)
+                  for i in range(RETAINED)), maxlen=RETAINED)
+
+
+def quality_rows(cls):
+    return (cls(time.time(), 0.9, 0.85, 0.99, 0.95, 0.9, 12.5 + i % 7, 0.01, 0.99, 3.2, 0.8)
+            for i in range(RETAINED))
+
+
+def build_legacy_history(cls):
+    return deque(quality_rows(cls), maxlen=RETAINED)
+
+
+def build_history(cls):
+    ring = MetricsRing(maxlen=RETAINED)
+    for metrics in quality_rows(cls):
+        ring.append(metrics)
+    return ring
+
+
+LegacyStageInfo = legacy(StageInfo)
+STORES = {
+    'AgentMessage': (lambda: build_messages(legacy(AgentMessage)), lambda: build_messages(AgentMessage)),
+    'CacheEntry': (lambda: build_cache(legacy(cache_manager.CacheEntry)),
+                   lambda: build_cache(cache_manager.CacheEntry)),
+    'CacheEntry (distributed)': (lambda: build_distributed_cache(legacy(distributed_cache_manager.CacheEntry)),
+                                 lambda: build_distributed_cache(distributed_cache_manager.CacheEntry)),
+    'Span': (lambda: build_spans(legacy(Span)), lambda: build_spans(Span)),
+    'StageInfo/JobProgress': (lambda: build_jobs(legacy(JobProgress), LegacyStageInfo),
+                              lambda: build_jobs(JobProgress, StageInfo)),
+    'PerformanceMetric': (lambda: build_performance_metrics(legacy(PerformanceMetric)),
+                          lambda: build_performance_metrics(PerformanceMetric)),
+    'QualityMetrics history': (lambda: build_legacy_history(legacy(QualityMetrics)),
+                               lambda: build_history(QualityMetrics)),
+}
+
+
+def retained(build) -> tuple:
+    """(bytes, allocated blocks) held by the store ``build`` returns"""
+    gc.collect()
+    gc.disable()
+    try:
+        tracemalloc.start()
+        blocks = sys.getallocatedblocks()
+        store = build()
+        size, _ = tracemalloc.get_traced_memory()
+        blocks = sys.getallocatedblocks() - blocks
+        tracemalloc.stop()
+    finally:
+        gc.enable()
+    del store
+    return size, blocks
+
+
+@pytest.mark.performance
+@pytest.mark.slow
+class TestRetainedRecordMemory:
+    """Heap held by 100k retained records per store"""
+
+    def test_steady_state_footprint(self) -> None:
+        results = {name: (retained(old), retained(new)) for name, (old, new) in STORES.items()}
+
+        print()
+        for name, ((old_bytes, old_blocks), (new_bytes, new_blocks)) in results.items():
+            print(f"[BENCH] {name:<25} dataclass {old_bytes / 2**20:7.1f} MiB {old_blocks / RETAINED:5.1f} blocks/item  "
+                  f"compact {new_bytes / 2**20:7.1f} MiB {new_blocks / RETAINED:5.1f} blocks/item  "
+                  f"({1 - new_bytes / old_bytes:5.1%} smaller)")
+        per_request = ('AgentMessage', 'Span', 'PerformanceMetric', 'CacheEntry')
+        old_request = sum(results[name][0][0] for name in per_request) / RETAINED
+        new_request = sum(results[name][1][0] for name in per_request) / RETAINED
+        old_blocks = sum(results[name][0][1] for name in per_request) / RETAINED
+        new_blocks = sum(results[name][1][1] for name in per_request) / RETAINED
+        print(f"[BENCH] per request (message + span + metric + cache entry)  "
+              f"dataclass {old_request:6.0f} B {old_blocks:4.1f} blocks  compact {new_request:6.0f} B {new_blocks:4.1f} blocks")
+
+        for name, ((old_bytes, _), (new_bytes, _)) in results.items():
+            assert new_bytes < old_bytes, name
+        assert new_request < old_request * 0.95
+        history_old, history_new = results['QualityMetrics history']
+        assert history_new[0] < history_old[0] / 2
+        assert history_new[1] < history_old[1] / 100
@@ -0,0 +1,156 @@
+"""
+ORFEAS Performance Tests - Model Residency
+Total memory and cold start of 1, 4 and 8 workers serving one model:
+per-worker loading (process), one model host over shared memory (host) and
+a pre-fork copy-on-write memory-mapped model (shared)
+"""
+import json
+import pytest
+import subprocess
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# Add parent directory to path for imports
+BACKEND = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(BACKEND))
+
+from model_residency import save_safetensors
+
+
+# ============================================================================
+# Configuration
+# ============================================================================
+
+LAYERS = 8
+LAYER_SIZE = 2048  # 8 x 2048 x 2048 float32 = 128 MB of weights
+WORKER_COUNTS = (1, 4, 8)
+MODES = ('process', 'host', 'shared')
+
+TOY_MODEL = r'''
+import os, numpy as np
+from model_residency import load_safetensors_mmap
+
+class ToyModel:
+    """Dense layers; inference touches every weight"""
+    def __init__(self, weights):
+        self.layers = [weights[f"layer{i}"] for i in range(len(weights))]
+
+    def infer(self, x):
+        for w in self.layers:
+            x = np.tanh(x @ w)
+        return x
+
+def load_private():
+    """Like torch.load: every process reads its own copy"""
+    return ToyModel({k: np.array(v) for k, v in load_safetensors_mmap(os.environ["TOY_WEIGHTS"]).items()})
+
+def load_mapped():
+    model = ToyModel(load_safetensors_mmap(os.environ["TOY_WEIGHTS"]))
+    model.infer(np.ones((1, model.layers[0].shape[0]), dtype=np.float32))  # fault the pages in
+    return model
+'''
+
+ORCHESTRATE = r'''
+import json, multiprocessing as mp, os, sys, time
+sys.path.insert(0, {backend!r}); sys.path.insert(0, {model_dir!r})
+os.environ["TOY_WEIGHTS"] = {weights!r}
+os.environ["MODEL_HOST_AUTHKEY"] = "bench"
+import numpy as np
+import toy_model
+from model_residency import ModelHostClient, start_model_host
+
+MODE, WORKERS, ADDRESS = {mode!r}, {workers!r}, {address!r}
+
+def memory(pid):
+    rss = pss = 0
+    with open(f"/proc/{{pid}}/smaps_rollup") as f:
+        for line in f:
+            if line.startswith("Rss:"):
+                rss = int(line.split()[1])
+            elif line.startswith("Pss:"):
+                pss = int(line.split()[1])
+    return rss, pss
+
+def worker(start, ready, done):
+    x = np.ones((1, {size}), dtype=np.float32)
+    if MODE == "process":
+        model = toy_model.load_private()
+        model.infer(x)
+    elif MODE == "shared":
+        shared_model.infer(x)
+    else:
+        client = ModelHostClient(ADDRESS)
+        client.wait_ready(timeout=300, poll_seconds=0.01)
+        client.call("infer", x)
+    ready.put((os.getpid(), time.perf_counter() - start))
+    done.wait()
+
+ctx = mp.get_context("fork")
+start = time.perf_counter()
+host = None
+if MODE == "shared":
+    shared_model = toy_model.load_mapped()  # in the master, before fork
+elif MODE == "host":
+    host = start_model_host("toy_model:load_mapped", ADDRESS,
+                            env={{"PYTHONPATH": {model_dir!r}}})
+ready, done = ctx.Queue(), ctx.Event()
+procs = [ctx.Process(target=worker, args=(start, ready, done)) for _ in range(WORKERS)]
+for p in procs:
+    p.start()
+results = [ready.get(timeout=600) for _ in procs]
+pids = [pid for pid, _ in results] + [os.getpid()] + ([host.pid] if host else [])
+totals = [memory(pid) for pid in pids]
+done.set()
+for p in procs:
+    p.join()
+if host:
+    host.terminate(); host.wait()
+print(json.dumps({{"cold_start_s": max(t for _, t in results),
+                   "rss_mb": sum(r for r, _ in totals) / 1024, "pss_mb": sum(p for _, p in totals) / 1024}}))
+'''
+
+
+@pytest.fixture(scope="module")
+def toy_model_dir(tmp_path_factory):
+    path = tmp_path_factory.mktemp("residency")
+    rng = np.random.default_rng(0)
+    scale = 1.0 / np.sqrt(LAYER_SIZE)
+    save_safetensors(path / "weights.safetensors",
+                     {f"layer{i}": (rng.standard_normal((LAYER_SIZE, LAYER_SIZE), dtype=np.float32) * scale)
+                      for i in range(LAYERS)})
+    (path / "toy_model.py").write_text(TOY_MODEL)
+    return path
+
+
+def run(model_dir: Path, mode: str, workers: int) -> dict:
+    code = ORCHESTRATE.format(backend=str(BACKEND), model_dir=str(model_dir),
+                              weights=str(model_dir / "weights.safetensors"),
+                              address=str(model_dir / f"host-{mode}-{workers}.sock"),
+                              mode=mode, workers=workers, size=LAYER_SIZE)
+    result = subprocess.run([sys.executable, '-c', code], cwd=BACKEND,
+                            capture_output=True, text=True, timeout=900)
+    assert result.returncode == 0, result.stderr[-2000:]
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+@pytest.mark.performance
+@pytest.mark.slow
+class TestModelResidency:
+    """Summed RSS/PSS of master, workers and model host; time until every worker served one inference"""
+
+    def test_memory_and_cold_start(self, toy_model_dir) -> None:
+        weights_mb = LAYERS * LAYER_SIZE * LAYER_SIZE * 4 / 2 ** 20
+        print(f"\n[BENCH] model weights: {weights_mb:.0f} MB")
+        results = {}
+        for workers in WORKER_COUNTS:
+            for mode in MODES:
+                result = results[mode, workers] = run(toy_model_dir, mode, workers)
+                print(f"[BENCH] {mode:<8} {workers} workers: PSS {result['pss_mb']:7.0f} MB  "
+                      f"RSS {result['rss_mb']:7.0f} MB  cold start {result['cold_start_s'] * 1000:7.0f} ms")
+
+        most = max(WORKER_COUNTS)
+        # One resident copy instead of one per worker
+        assert results['host', most]['pss_mb'] < results['process', most]['pss_mb'] - weights_mb * (most - 2)
+        assert results['shared', most]['pss_mb'] < results['process', most]['pss_mb'] - weights_mb * (most - 2)
@@ -0,0 +1,245 @@
+"""
+ORFEAS Performance Tests - LLM Performance Tracer
+Per-call overhead of @trace_performance and query latency with the tracer
+at full capacity (10k retained metrics): the object-per-call tracer
+(PerformanceMetric + datetime per call, list.pop(0) at capacity, eager
+f-string debug logging) against the columnar ring with streaming
+aggregates, with and without sampling. Latency percentiles over the
+retained window are what a query walking every metric object costs on
+the old store
+"""
+import logging
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
+
+from backend.llm_integration import tracing
+from backend.llm_integration.tracing import (
+    PerformanceMetric,
+    PerformanceStats,
+    PerformanceTracer,
+    trace_performance,
+)
+
+
+# ============================================================================
+# Configuration
+# ============================================================================
+
+CAPACITY = 10_000
+COMPONENTS = 8
+OPERATIONS = 12                 # per component -> 96 keys, like llm_integration's decorated helpers
+CALLS = 50_000
+QUERY_REPEATS = 200
+SAMPLE_RATE = 0.1
+
+
+class LegacyTracer:
+    """PerformanceTracer before the columnar store"""
+
+    def __init__(self, max_metrics: int = CAPACITY):
+        self.metrics = []
+        self.max_metrics = max_metrics
+        self.stats = {}
+
+    def record_metric(self, metric):
+        if len(self.metrics) >= self.max_metrics:
+            self.metrics.pop(0)
+        self.metrics.append(metric)
+        key = f"{metric.component}:{metric.name}"
+        if key not in self.stats:
+            self.stats[key] = PerformanceStats(component=metric.component, operation=metric.name)
+        stats = self.stats[key]
+        stats.count += 1
+        stats.total_duration_ms += metric.duration_ms
+        stats.min_duration_ms = min(stats.min_duration_ms, metric.duration_ms)
+        stats.max_duration_ms = max(stats.max_duration_ms, metric.duration_ms)
+        if metric.success:
+            stats.success_count += 1
+        else:
+            stats.error_count += 1
+
+    def get_stats(self, component=None, operation=None):
+        results = list(self.stats.values())
+        if component:
+            results = [s for s in results if s.component == component]
+        if operation:
+            results = [s for s in results if s.operation == operation]
+        return results
+
+    def get_slowest_operations(self, count=10):
+        return sorted(self.stats.values(), key=lambda s: s.avg_duration_ms, reverse=True)[:count]
+
+    def get_error_operations(self, min_error_rate=0.1):
+        return [s for s in self.stats.values() if s.error_rate >= min_error_rate]
+
+    def get_recent_metrics(self, count=100, component=None):
+        metrics = self.metrics[-count:]
+        if component:
+            metrics = [m for m in metrics if m.component == component]
+        return metrics
+
+    def get_latency_percentiles(self, component=None, window_seconds=None, percentiles=(50, 95, 99)):
+        cutoff = datetime.now() - timedelta(seconds=window_seconds) if window_seconds is not None else None
+        durations = sorted(m.duration_ms for m in self.metrics
+                           if (not component or m.component == component)
+                           and (cutoff is None or m.timestamp >= cutoff))
+        result = {'count': len(durations), 'error_rate': 0.0}
+        if durations:
+            for p in percentiles:
+                result[f"p{p}"] = durations[min(len(durations) - 1, int(len(durations) * p / 100))]
+        return result
+
+    def get_report(self):
+        all_stats = list(self.stats.values())
+        total_operations = sum(s.count for s in all_stats)
+        total_errors = sum(s.error_count for s in all_stats)
+        return {
+            'total_operations': total_operations,
+            'total_errors': total_errors,
+            'avg_duration_ms': sum(s.total_duration_ms for s in all_stats) / max(total_operations, 1),
+            'slowest_operations': [s.to_dict() for s in self.get_slowest_operations(5)],
+            'error_operations': [s.to_dict() for s in self.get_error_operations(0.01)],
+            'all_stats': [s.to_dict() for s in all_stats],
+        }
+
+
+def legacy_trace_performance(tracer, component, operation=None):
+    """The decorator before the columnar store (sync path)"""
+    def decorator(func):
+        op_name = operation or func.__name__
+
+        def sync_wrapper(*args, **kwargs):
+            start = time.time()
+            try:
+                result = func(*args, **kwargs)
+                duration_ms = (time.time() - start) * 1000
+                tracer.record_metric(PerformanceMetric(name=op_name, component=component, duration_ms=duration_ms,
+                                                       timestamp=datetime.now(), success=True))
+                tracing.logger.debug(f"{component}.{op_name}: {duration_ms:.2f}ms")
+                return result
+            except Exception as e:
+                duration_ms = (time.time() - start) * 1000
+                tracer.record_metric(PerformanceMetric(name=op_name, component=component, duration_ms=duration_ms,
+                                                       timestamp=datetime.now(), success=False,
+                                                       error=str(type(e).__name__)))
+                raise
+        return sync_wrapper
+    return decorator
+
+
+def helper(value):
+    return value + 1
+
+
+def fill(tracer) -> None:
+    """Full capacity across COMPONENTS x OPERATIONS keys, ~2% errors"""
+    now = datetime.now()
+    for i in range(CAPACITY):
+        tracer.record_metric(PerformanceMetric(
+            name=f'op_{i % OPERATIONS}', component=f'component_{i % COMPONENTS}',
+            duration_ms=float(i % 97) + (i % OPERATIONS), timestamp=now, success=i % 50 != 0))
+
+
+def per_call(func) -> float:
+    """Median seconds per call over 5 batches"""
+    batches = []
+    for _ in range(5):
+        start = time.perf_counter()
+        for i in range(CALLS // 5):
+            func(i)
+        batches.append((time.perf_counter() - start) / (CALLS // 5))
+    return statistics.median(batches)
+
+
+QUERIES = {
+    'get_slowest_operations': lambda t: t.get_slowest_operations(10),
+    'get_error_operations': lambda t: t.get_error_operations(0.01),
+    'get_report': lambda t: t.get_report(),
+    'get_recent_metrics(100, component)': lambda t: t.get_recent_metrics(100, component='component_3'),
+    'latency percentiles (all)': lambda t: t.get_latency_percentiles(),
+    'latency percentiles (component, 5 min)': lambda t: t.get_latency_percentiles(component='component_3',
+                                                                                  window_seconds=300),
+}
+
+
+def query_latency(tracer, query) -> float:
+    times = []
+    for _ in range(QUERY_REPEATS):
+        start = time.perf_counter()
+        query(tracer)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+@pytest.fixture(autouse=True)
+def production_log_level():
+    # pytest.ini logs DEBUG to a file; a server runs the tracer at INFO
+    level = tracing.logger.level
+    tracing.logger.setLevel(logging.INFO)
+    yield
+    tracing.logger.setLevel(level)
+
+
+@pytest.fixture
+def full_global_tracer(monkeypatch):
+    tracer = PerformanceTracer(max_metrics=CAPACITY)
+    monkeypatch.setattr(tracing, 'performance_tracer', tracer)
+    fill(tracer)
+    return tracer
+
+
+@pytest.mark.performance
+@pytest.mark.slow
+class TestPerformanceTracerCost:
+    """Decorator overhead and query latency at capacity"""
+
+    def test_decorator_overhead_per_call(self, full_global_tracer) -> None:
+        legacy = LegacyTracer()
+        fill(legacy)
+
+        bare = per_call(helper)
+        legacy_call = per_call(legacy_trace_performance(legacy, 'component_0', 'helper')(helper))
+        columnar_call = per_call(trace_performance('component_0', 'helper')(helper))
+        sampled_call = per_call(trace_performance('component_0', 'helper_sampled', sample_rate=SAMPLE_RATE)(helper))
+
+        print()
+        print(f"[BENCH] decorator overhead per call (tracer at {CAPACITY} metrics)  "
+              f"object-per-call {(legacy_call - bare) * 1e6:6.2f} us  "
+              f"columnar {(columnar_call - bare) * 1e6:6.2f} us  "
+              f"columnar sampled {SAMPLE_RATE:.0%} {(sampled_call - bare) * 1e6:6.2f} us")
+
+        assert len(full_global_tracer.metrics) == CAPACITY
+        assert columnar_call - bare < (legacy_call - bare) / 2
+        assert sampled_call - bare < (columnar_call - bare) / 2
+        sampled = full_global_tracer.get_stats(operation='helper_sampled')[0]
+        assert sampled.count == CALLS
+
+    def test_query_latency_at_capacity(self) -> None:
+        legacy, columnar = LegacyTracer(), PerformanceTracer(max_metrics=CAPACITY)
+        fill(legacy)
+        fill(columnar)
+
+        print()
+        results = {}
+        for name, query in QUERIES.items():
+            results[name] = (query_latency(legacy, query), query_latency(columnar, query))
+            print(f"[BENCH] {name:<38} object-per-call {results[name][0] * 1e6:9.1f} us  "
+                  f"columnar {results[name][1] * 1e6:9.1f} us")
+
+        assert len(columnar.metrics) == len(legacy.metrics) == CAPACITY
+        assert [s.operation for s in columnar.get_slowest_operations(10)] == \
+            [s.operation for s in legacy.get_slowest_operations(10)]
+        assert len(columnar.get_recent_metrics(CAPACITY, component='component_3')) == \
+            len(legacy.get_recent_metrics(CAPACITY, component='component_3'))
+        assert columnar.get_latency_percentiles()['count'] == CAPACITY
+        for name in ('latency percentiles (all)', 'latency percentiles (component, 5 min)'):
+            assert results[name][1] < results[name][0] / 3, name
+        assert results['get_report'][1] < results['get_report'][0] * 1.5
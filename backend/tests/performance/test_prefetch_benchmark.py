@@ -0,0 +1,83 @@
+"""
+ORFEAS Performance Tests - Speculative Prefetch
+Perceived preprocessing latency after "generate" with and without prefetch
+during the upload-to-generate pause, for the Powerful 3D preprocessing
+(resize, contrast, depth on the source image)
+"""
+import pytest
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+import numpy as np
+from PIL import Image, ImageEnhance
+
+from depth_engine import DepthEngine
+from speculative_prefetch import SpeculativePrefetcher
+
+
+# ============================================================================
+# Configuration
+# ============================================================================
+
+UPLOADS = 5
+THINK_TIME = 1.0  # seconds between upload and generate; real users take longer
+IMAGE_SIZE = (2048, 1536)
+
+
+def upload(index: int) -> Image.Image:
+    """Distinct 3 MP photo-like upload"""
+    height, width = IMAGE_SIZE[1], IMAGE_SIZE[0]
+    y, x = np.mgrid[0:height, 0:width].astype(np.float32)
+    gray = 0.5 + 0.3 * np.sin(x / (90.0 + index)) * np.cos(y / 50.0)
+    gray += np.random.default_rng(index).normal(0, 0.02, gray.shape).astype(np.float32)
+    return Image.fromarray((np.clip(gray, 0, 1) * 255).astype(np.uint8)).convert('RGB')
+
+
+def preprocess(engine: DepthEngine, image: Image.Image) -> np.ndarray:
+    """What generation does before meshing (main.py _powerful_depth_input + depth)"""
+    image = image.convert('RGB').resize((256, 256), Image.Resampling.LANCZOS)
+    image = ImageEnhance.Contrast(image).enhance(1.2)
+    return engine.estimate(np.asarray(image, dtype=np.float32) / 255.0)
+
+
+@pytest.mark.performance
+@pytest.mark.slow
+class TestPrefetchLatency:
+    """Time from generate to preprocessed input"""
+
+    def test_perceived_latency(self) -> None:
+        engine = DepthEngine()
+        prefetcher = SpeculativePrefetcher(workers=1, niceness=10)
+        prefetcher.register_stage('depth', lambda image, digest: preprocess(engine, image))
+        try:
+            inline, prefetched = [], []
+            for i in range(UPLOADS):
+                image = upload(i)
+                start = time.perf_counter()
+                preprocess(engine, image)
+                inline.append(time.perf_counter() - start)
+
+                prefetcher.schedule(f"job-{i}", f"digest-{i}", image)
+                time.sleep(THINK_TIME)
+                start = time.perf_counter()
+                depth = prefetcher.take(f"digest-{i}", 'depth')
+                if depth is None:
+                    preprocess(engine, image)
+                prefetched.append(time.perf_counter() - start)
+                prefetcher.release(f"job-{i}")
+        finally:
+            prefetcher.shutdown(wait=True)
+            engine.shutdown()
+
+        stats = prefetcher.stats()
+        print(f"\n[BENCH] preprocessing after generate, median of {UPLOADS}: "
+              f"inline {statistics.median(inline) * 1000:.1f} ms, "
+              f"prefetched {statistics.median(prefetched) * 1000:.2f} ms "
+              f"(hits {stats['hits']}/{UPLOADS}, saved {stats['saved_seconds'] * 1000:.0f} ms total)")
+        assert stats['hits'] == UPLOADS
+        assert statistics.median(prefetched) < statistics.median(inline)
@@ -0,0 +1,121 @@
+"""
+ORFEAS Performance Tests - Gallery Previews
+Bytes transferred and p95 latency for a 100-item gallery page served
+from full-resolution originals versus cached WebP thumbnails
+"""
+import pytest
+import time
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+import numpy as np
+from flask import Flask, request, send_file
+from PIL import Image
+
+from download_service import content_hash
+from preview_service import AVAILABLE_FORMATS, PreviewService, send_preview
+
+
+# ============================================================================
+# Configuration
+# ============================================================================
+
+GALLERY_ITEMS = 100
+IMAGE_SIZE = (1024, 768)
+THUMBNAIL_WIDTH = 256
+BROWSER_ACCEPT = 'image/avif,image/webp,image/apng,image/*,*/*;q=0.8'
+
+
+def photo_like(path: Path, seed: int) -> None:
+    """Smooth shapes plus sensor noise: compresses like a photo, not like noise"""
+    rng = np.random.default_rng(seed)
+    h, w = IMAGE_SIZE[1], IMAGE_SIZE[0]
+    ys, xs = np.mgrid[0:h, 0:w].astype(np.float32)
+    channels = [128 + 100 * np.sin(xs / rng.uniform(40, 200) + k) * np.cos(ys / rng.uniform(40, 200)) for k in range(3)]
+    pixels = np.stack(channels, axis=2) + rng.normal(0, 6, (h, w, 3))
+    Image.fromarray(np.clip(pixels, 0, 255).astype(np.uint8)).save(path)
+
+
+def build_app(uploads: Path, service: PreviewService) -> Flask:
+    app = Flask(__name__)
+
+    @app.route('/legacy/<filename>')
+    def legacy(filename):
+        return send_file(str(uploads / filename), mimetype='image/png', as_attachment=False, download_name=filename)
+
+    @app.route('/preview/<filename>')
+    def preview(filename):
+        path = uploads / filename
+        digest = content_hash(path)
+        derivative = service.derivative(path, request.args.get('size', type=int), request.headers.get('Accept'))
+        if derivative is None:
+            return send_preview(request, path, 'image/png', digest[:32], download_name=filename, version=digest)
+        thumb, mimetype, etag = derivative
+        return send_preview(request, thumb, mimetype, etag, vary_accept=True, version=digest)
+
+    return app
+
+
+def load_gallery(client, urls, etags=None):
+    """(total bytes, p95 ms, etags) for one page view"""
+    latencies, total, seen = [], 0, {}
+    for url in urls:
+        headers = {'Accept': BROWSER_ACCEPT}
+        if etags and url in etags:
+            headers['If-None-Match'] = etags[url]
+        start = time.perf_counter()
+        response = client.get(url, headers=headers)
+        body = response.get_data()
+        latencies.append((time.perf_counter() - start) * 1000)
+        assert response.status_code in (200, 304)
+        total += len(body)
+        seen[url] = response.headers.get('ETag')
+    return total, float(np.percentile(latencies, 95)), seen
+
+
+@pytest.mark.performance
+@pytest.mark.slow
+@pytest.mark.skipif('webp' not in AVAILABLE_FORMATS, reason="Pillow built without WebP")
+class TestGalleryPreviews:
+    """100-item gallery page"""
+
+    def test_gallery_bytes_and_latency(self, tmp_path) -> None:
+        uploads = tmp_path / 'uploads'
+        uploads.mkdir()
+        service = PreviewService(tmp_path / 'cache', workers=2)
+        names = []
+        start = time.perf_counter()
+        futures = []
+        for i in range(GALLERY_ITEMS):
+            name = f"item{i:03d}.png"
+            photo_like(uploads / name, i)
+            names.append(name)
+            with Image.open(uploads / name) as image:
+                image.load()
+                futures.append(service.schedule_thumbnails(image.copy(), content_hash(uploads / name)))
+        for future in futures:
+            future.result(timeout=600)
+        print(f"\n[BENCH] upload-time derivatives for {GALLERY_ITEMS} images "
+              f"({', '.join(service.formats)} x {len(service.sizes)} sizes): "
+              f"{time.perf_counter() - start:.1f} s incl. source creation, cache {service.cache.total_bytes / 1e6:.1f} MB")
+
+        client = build_app(uploads, service).test_client()
+        legacy_urls = [f"/legacy/{name}" for name in names]
+        thumb_urls = [f"/preview/{name}?size={THUMBNAIL_WIDTH}" for name in names]
+
+        legacy_bytes, legacy_p95, legacy_etags = load_gallery(client, legacy_urls)
+        thumb_bytes, thumb_p95, thumb_etags = load_gallery(client, thumb_urls)
+        _, revisit_p95, _ = load_gallery(client, thumb_urls, thumb_etags)
+        revisit_bytes = load_gallery(client, thumb_urls, thumb_etags)[0]
+        print(f"[BENCH] originals: {legacy_bytes / 1e6:.1f} MB, p95 {legacy_p95:.2f} ms")
+        print(f"[BENCH] thumbnails: {thumb_bytes / 1e6:.2f} MB, p95 {thumb_p95:.2f} ms "
+              f"({legacy_bytes / thumb_bytes:.0f}x fewer bytes)")
+        print(f"[BENCH] revisit (If-None-Match): {revisit_bytes} bytes, p95 {revisit_p95:.2f} ms")
+        service.shutdown()
+
+        assert thumb_bytes < legacy_bytes / 20
+        assert revisit_bytes == 0
+        assert thumb_p95 < legacy_p95
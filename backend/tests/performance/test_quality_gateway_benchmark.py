@@ -0,0 +1,134 @@
+"""
+ORFEAS Performance Tests - Quality Gateway Middleware
+Per-request hook overhead at 1k and 100k requests/minute of steady-state
+history: the old middleware (every gate evaluated per request over list
+histories rebuilt on every request) against rolling-window recording plus
+a cached verdict from the background evaluator
+"""
+import statistics
+import sys
+import time
+from dataclasses import asdict
+from pathlib import Path
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+flask = pytest.importorskip("flask")
+
+from quality_gateway_middleware import QualityGatewayMiddleware
+
+
+# ============================================================================
+# Configuration
+# ============================================================================
+
+RATES = (1_000, 100_000)        # requests per minute
+HISTORY_SECONDS = 3600          # the old middleware kept an hour of metrics
+MAX_LEGACY_HISTORY = 500_000    # cap per list (100k/min for an hour would be 6M entries)
+REQUESTS = {'legacy': 20, 'cached': 5000}
+
+
+class LegacyGateway(QualityGatewayMiddleware):
+    """The middleware before off-request-path evaluation"""
+
+    def __init__(self, app):
+        self.quality_metrics = {'response_times': [], 'requests': []}
+        super().__init__(app)
+
+    def before_request_quality_gate(self):
+        flask.g.quality_context = {'start_time': time.time(), 'gate_results': [], 'quality_score': 1.0,
+                                   'bypass_active': False, 'remediation_applied': []}
+        if self.check_bypass_conditions():
+            return
+        for gate in self.quality_gates.values():
+            if gate.enabled:
+                check = self.execute_quality_gate(gate)
+                flask.g.quality_context['gate_results'].append(check)
+                if not check.passed:
+                    self.handle_gate_failure(gate, check)
+        scores = [r.score for r in flask.g.quality_context['gate_results']]
+        flask.g.quality_context['quality_score'] = sum(scores) / len(scores)
+        flask.g.quality_context['gate_summary'] = [asdict(r) for r in flask.g.quality_context['gate_results']]
+        self.log_quality_gate_results(flask.g.quality_context)
+
+    def update_quality_metrics(self, response, processing_time):
+        timestamp = time.time()
+        self.quality_metrics['response_times'].append({'timestamp': timestamp, 'value': processing_time})
+        self.quality_metrics['requests'].append({'timestamp': timestamp, 'success': response.status_code < 400,
+                                                 'status_code': response.status_code})
+        cutoff_time = timestamp - 3600
+        for metric_type in self.quality_metrics:
+            self.quality_metrics[metric_type] = [m for m in self.quality_metrics[metric_type]
+                                                 if m['timestamp'] > cutoff_time]
+
+    def get_recent_response_stats(self, minutes=5):
+        cutoff_time = time.time() - minutes * 60
+        recent = [m['value'] for m in self.quality_metrics['response_times'] if m['timestamp'] > cutoff_time]
+        return {'mean': sum(recent) / len(recent) if recent else 15.0}
+
+    def get_recent_error_rate(self, minutes=15):
+        cutoff_time = time.time() - minutes * 60
+        recent = [m for m in self.quality_metrics['requests'] if m['timestamp'] > cutoff_time]
+        return len([r for r in recent if not r['success']]) / len(recent) if recent else 0.0
+
+
+def prefill(gateway, rate_per_minute: int, legacy: bool) -> int:
+    entries = min(rate_per_minute * HISTORY_SECONDS // 60, MAX_LEGACY_HISTORY)
+    now = time.time()
+    step = HISTORY_SECONDS / entries
+    for i in range(entries):
+        timestamp = now - HISTORY_SECONDS + i * step
+        if legacy:
+            gateway.quality_metrics['response_times'].append({'timestamp': timestamp, 'value': 0.05})
+            gateway.quality_metrics['requests'].append({'timestamp': timestamp, 'success': True,
+                                                        'status_code': 200})
+        else:
+            gateway.request_window.record(0.05, True, now=timestamp)
+    return entries
+
+
+def per_request(app, gateway, requests: int) -> float:
+    """Median seconds spent in the before/after/teardown hooks"""
+    times = []
+    for _ in range(requests):
+        with app.test_request_context('/ok'):
+            response = flask.Response('ok')
+            start = time.perf_counter()
+            gateway.before_request_quality_gate()
+            gateway.after_request_quality_validation(response)
+            gateway.teardown_request_cleanup()
+            times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+@pytest.mark.performance
+@pytest.mark.slow
+class TestQualityGatewayOverhead:
+    """Hook latency with a steady-state metric history"""
+
+    def test_per_request_overhead(self) -> None:
+        print()
+        for rate in RATES:
+            app = flask.Flask(__name__)
+            legacy = LegacyGateway(app)
+            entries = prefill(legacy, rate, legacy=True)
+            legacy_time = per_request(app, legacy, REQUESTS['legacy'])
+            del legacy
+
+            app = flask.Flask(__name__)
+            cached = QualityGatewayMiddleware(app)
+            prefill(cached, rate, legacy=False)
+            cached_time = per_request(app, cached, REQUESTS['cached'])
+            start = time.perf_counter()
+            cached.evaluate_gates()
+            evaluation = time.perf_counter() - start
+            cached.stop_evaluator()
+
+            print(f"[BENCH] {rate:>7,} req/min ({entries:>7,} history entries): "
+                  f"per-request gates {legacy_time * 1000:8.2f} ms  cached verdict {cached_time * 1e6:6.1f} us  "
+                  f"({legacy_time / cached_time:6.0f}x)  background evaluation {evaluation * 1000:.2f} ms")
+            assert cached_time < legacy_time / 10
+            assert cached_time < 0.001
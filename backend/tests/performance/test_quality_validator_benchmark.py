@@ -0,0 +1,100 @@
+"""
+ORFEAS Performance Tests - Generation Quality Validator
+Pipeline validation latency per level (fast / standard / thorough) on a
+high-poly mesh with 2048x2048 images, and accuracy of the sampled levels
+against the exhaustive thorough level
+"""
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+trimesh = pytest.importorskip("trimesh")
+pytest.importorskip("cv2")
+from PIL import Image
+
+from quality_validator import VALIDATION_LEVELS, GenerationQualityValidator, compute_mesh_topology
+
+
+# ============================================================================
+# Configuration
+# ============================================================================
+
+SUBDIVISIONS = 7                # icosphere: 327,680 faces
+IMAGE_SIDE = 2048
+RUNS = 5
+STAGES = ('bg_removal_quality', 'shape_quality', 'texture_quality', 'final_quality')
+
+
+def make_inputs(seed: int = 0):
+    rng = np.random.default_rng(seed)
+    y, x = np.mgrid[0:IMAGE_SIDE, 0:IMAGE_SIDE]
+    rgb = np.stack([(x * 255 // IMAGE_SIDE), (y * 255 // IMAGE_SIDE), ((x + y) * 128 // IMAGE_SIDE)], -1)
+    rgb = (rgb + rng.integers(0, 24, rgb.shape)).clip(0, 255).astype(np.uint8)
+    radius = np.hypot(x - IMAGE_SIDE / 2, y - IMAGE_SIDE / 2)
+    alpha = np.where(radius < IMAGE_SIDE * 0.35, 255, 0).astype(np.uint8)
+    original = Image.fromarray(rgb)
+    cutout = Image.fromarray(np.dstack([rgb, alpha]))
+    texture = Image.fromarray(rgb)
+
+    mesh = trimesh.creation.icosphere(subdivisions=SUBDIVISIONS, radius=50)
+    holed = trimesh.Trimesh(vertices=mesh.vertices,
+                            faces=mesh.faces[rng.permutation(len(mesh.faces))[:-3000]], process=False)
+    return original, cutout, texture, mesh, holed
+
+
+def run(level: str, original, cutout, texture, mesh) -> tuple:
+    """Median pipeline latency (fresh validator per run: no topology cache carry-over) and last result"""
+    times, result = [], None
+    for _ in range(RUNS):
+        validator = GenerationQualityValidator(validation_level=level)
+        candidate = mesh.copy()
+        start = time.perf_counter()
+        result = validator.validate_generation_pipeline(original, cutout, candidate, texture)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times), result
+
+
+@pytest.mark.performance
+@pytest.mark.slow
+class TestValidationLevels:
+    """Latency and accuracy per validation level"""
+
+    @pytest.mark.parametrize("mesh_kind", ["watertight", "holed"])
+    def test_latency_and_accuracy(self, mesh_kind: str) -> None:
+        original, cutout, texture, mesh, holed = make_inputs()
+        mesh = mesh if mesh_kind == 'watertight' else holed
+
+        results = {level: run(level, original, cutout, texture, mesh)
+                   for level in ('thorough', 'standard', 'fast')}
+        reference = results['thorough'][1]
+
+        print()
+        for level, (latency, result) in results.items():
+            errors = {stage: abs(result[stage]['score'] - reference[stage]['score'])
+                      for stage in STAGES if result.get(stage) and reference.get(stage)}
+            print(f"[BENCH] {mesh_kind:<10} {level:<9} {latency * 1000:8.1f} ms  "
+                  f"overall {result['overall_score']:.3f} (thorough {reference['overall_score']:.3f})  "
+                  f"max stage error {max(errors.values(), default=0.0):.3f}  "
+                  f"skipped {result['skipped_checks']}")
+
+        fast_latency, fast = results['fast']
+        assert fast_latency * 1000 <= VALIDATION_LEVELS['fast']['budget_ms'] * 1.5
+        assert fast_latency < results['thorough'][0] / 3
+        assert results['standard'][1]['shape_quality']['manifold'] == reference['shape_quality']['manifold']
+        if fast['skipped_checks']:
+            return
+        if mesh_kind == 'watertight':
+            assert abs(fast['overall_score'] - reference['overall_score']) < 0.05
+        else:
+            # thorough repairs the holes while fast defers repair: compare against the exact topology
+            exact = compute_mesh_topology(holed.vertices, holed.faces)
+            shape = fast['shape_quality']
+            assert not shape['manifold'] and shape['repair_deferred']
+            assert abs(shape['boundary_edge_ratio'] - exact.boundary_ratio) <= shape['topology_error_bound']
@@ -0,0 +1,107 @@
+"""
+ORFEAS Performance Tests - Rate Limiting
+Throughput and memory of the GCRA limiter versus the legacy per-IP
+timestamp-list limiter, for 1M distinct keys and a single hot key
+"""
+import pytest
+import threading
+import time
+import tracemalloc
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from rate_limiting import RateLimiter
+
+
+# ============================================================================
+# Configuration
+# ============================================================================
+
+DISTINCT_KEYS = 1_000_000
+MAX_KEYS = 100_000
+HOT_KEY_REQUESTS = 200_000
+
+
+class LegacyRateLimiter:
+    """The pre-refactor main.py limiter: a timestamp list per IP, never pruned"""
+
+    def __init__(self, requests_per_minute: int = 60):
+        self.requests_per_minute = requests_per_minute
+        self.requests = {}
+        self.lock = threading.Lock()
+
+    def is_rate_limited(self, client_ip: str) -> bool:
+        now = time.time()
+        minute_ago = now - 60
+        with self.lock:
+            if client_ip in self.requests:
+                self.requests[client_ip] = [ts for ts in self.requests[client_ip] if ts > minute_ago]
+            if client_ip not in self.requests:
+                self.requests[client_ip] = [now]
+                return False
+            if len(self.requests[client_ip]) >= self.requests_per_minute:
+                return True
+            self.requests[client_ip].append(now)
+            return False
+
+
+def ip(i: int) -> str:
+    return f"10.{(i >> 16) & 255}.{(i >> 8) & 255}.{i & 255}"
+
+
+def run_keys(limiter, keys) -> float:
+    check = limiter.is_rate_limited
+    start = time.perf_counter()
+    for key in keys:
+        check(key)
+    return time.perf_counter() - start
+
+
+def traced_peak_mb(fn) -> float:
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1] / 1e6
+    finally:
+        tracemalloc.stop()
+
+
+@pytest.mark.performance
+@pytest.mark.slow
+class TestRateLimiterScaling:
+    """1M rotating client keys and one hot key"""
+
+    def test_million_distinct_keys(self) -> None:
+        keys = [ip(i) for i in range(DISTINCT_KEYS)]
+
+        gcra = RateLimiter(max_keys=MAX_KEYS)
+        gcra_s = run_keys(gcra, keys)
+        legacy = LegacyRateLimiter()
+        legacy_s = run_keys(legacy, keys)
+        print(f"\n[BENCH] {DISTINCT_KEYS} keys: legacy {DISTINCT_KEYS / legacy_s / 1e3:.0f}k checks/s, "
+              f"GCRA {DISTINCT_KEYS / gcra_s / 1e3:.0f}k checks/s")
+
+        gcra_mb = traced_peak_mb(lambda: run_keys(RateLimiter(max_keys=MAX_KEYS), keys))
+        legacy_mb = traced_peak_mb(lambda: run_keys(LegacyRateLimiter(), keys))
+        print(f"[BENCH] tracked keys: legacy {len(legacy.requests)}, GCRA {len(gcra)} "
+              f"(bound {MAX_KEYS}); peak memory legacy {legacy_mb:.0f} MB, GCRA {gcra_mb:.0f} MB")
+
+        assert len(gcra) == MAX_KEYS
+        assert gcra_mb < legacy_mb / 3
+
+    @pytest.mark.parametrize("requests_per_minute", [60, 600])
+    def test_hot_key(self, requests_per_minute) -> None:
+        # The legacy list scan grows with the limit; a GCRA check does not
+        gcra = RateLimiter(requests_per_minute=requests_per_minute)
+        legacy = LegacyRateLimiter(requests_per_minute=requests_per_minute)
+        keys = ['203.0.113.7'] * HOT_KEY_REQUESTS
+        gcra_s = run_keys(gcra, keys)
+        legacy_s = run_keys(legacy, keys)
+        print(f"\n[BENCH] hot key x{HOT_KEY_REQUESTS} at {requests_per_minute}/min: "
+              f"legacy {legacy_s / HOT_KEY_REQUESTS * 1e6:.2f} us/check, "
+              f"GCRA {gcra_s / HOT_KEY_REQUESTS * 1e6:.2f} us/check")
+        if requests_per_minute >= 600:
+            assert gcra_s < legacy_s
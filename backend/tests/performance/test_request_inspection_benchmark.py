@@ -0,0 +1,109 @@
+"""
+ORFEAS Performance Tests - Request Inspection
+Per-request overhead of the compiled single-pass inspector versus the
+legacy four-detector scan (re-collected inputs, one re.search per pattern)
+"""
+import pytest
+import re
+import time
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from flask import Flask
+
+from request_inspection import DEFAULT_RULES, RequestInspector, extract_json_strings
+
+
+# ============================================================================
+# Configuration
+# ============================================================================
+
+ITERATIONS = 2000
+
+GENERATION_JSON = {
+    'job_id': '3f9b2c1e-7a4d-4e2b-9c61-0d8f5e2a7b13',
+    'prompt': 'a weathered bronze statue of a lion resting on a stone plinth',
+    'format': 'stl', 'quality': 7, 'dimensions': {'width': 100, 'height': 100, 'depth': 20},
+    'options': {'texture': True, 'lod_levels': 2, 'tags': ['statue', 'bronze', 'lion', 'museum']},
+    'material': {'name': 'bronze', 'metallic': 0.9, 'roughness': 0.35},
+}
+BATCH_JSON = {'jobs': [dict(GENERATION_JSON, job_id=f'job-{i}') for i in range(50)]}
+FORM_FIELDS = {'format': 'stl', 'quality': '7', 'target_faces': '50000', 'name': 'lion_statue_v2'}
+
+
+def _patterns(family: str):
+    return [(rule.pattern, rule.ignore_case) for rule in DEFAULT_RULES if rule.family == family]
+
+
+class LegacyInspector:
+    """The pre-refactor detectors: each re-collects inputs and runs every pattern"""
+
+    def __init__(self):
+        self.sql = [p for p, _ in _patterns('sql_injection')]
+        self.xss = [p for p, _ in _patterns('xss')]
+        self.path = [p for p, _ in _patterns('path_traversal')]
+        self.cmd = [p for p, _ in _patterns('command_injection')]
+
+    def _text_inputs(self, request, include_json):
+        data = []
+        if request.args:
+            data.extend(request.args.values())
+        if request.form:
+            data.extend(request.form.values())
+        if include_json and request.is_json:
+            json_data = request.get_json(silent=True)
+            if json_data:
+                data.extend(extract_json_strings(json_data))
+        return data
+
+    def _any(self, values, patterns, lower=True):
+        for value in values:
+            if isinstance(value, str):
+                for pattern in patterns:
+                    if re.search(pattern, value.lower() if lower else value):
+                        return True
+        return False
+
+    def inspect(self, request) -> bool:
+        return (self._any(self._text_inputs(request, True), self.sql)
+                or self._any(self._text_inputs(request, True), self.xss)
+                or self._any([request.path] + self._text_inputs(request, False), self.path)
+                or self._any(self._text_inputs(request, False), self.cmd, lower=False))
+
+
+def per_request_us(app, request_kwargs, inspect) -> float:
+    with app.test_request_context(**request_kwargs) as ctx:
+        # The body is parsed once and cached by the request; time inspection only
+        ctx.request.get_json(silent=True)
+        ctx.request.form
+        assert not inspect(ctx.request)
+        start = time.perf_counter()
+        for _ in range(ITERATIONS):
+            inspect(ctx.request)
+        return (time.perf_counter() - start) / ITERATIONS * 1e6
+
+
+@pytest.mark.performance
+@pytest.mark.slow
+class TestRequestInspectionOverhead:
+    """Inspection cost per clean request"""
+
+    @pytest.mark.parametrize("label,request_kwargs", [
+        ('query args', {'path': '/api/job-status/3f9b2c1e?include=progress&verbose=1'}),
+        ('generation json', {'path': '/api/generate-3d', 'method': 'POST', 'json': GENERATION_JSON}),
+        ('batch json', {'path': '/api/batch-generate', 'method': 'POST', 'json': BATCH_JSON}),
+        ('multipart form', {'path': '/api/stl/simplify', 'method': 'POST', 'data': FORM_FIELDS,
+                            'content_type': 'multipart/form-data'}),
+    ])
+    def test_inspection_overhead(self, label, request_kwargs) -> None:
+        app = Flask(__name__)
+        compiled = RequestInspector()
+        legacy = LegacyInspector()
+        legacy_us = per_request_us(app, request_kwargs, legacy.inspect)
+        compiled_us = per_request_us(app, request_kwargs, compiled.inspect)
+        print(f"\n[BENCH] {label}: legacy {legacy_us:.1f} us, compiled {compiled_us:.1f} us "
+              f"({legacy_us / compiled_us:.1f}x)")
+        assert compiled_us < legacy_us
@@ -0,0 +1,106 @@
+"""
+ORFEAS Performance Tests - Request Metrics Middleware Overhead
+Per-request cost of the WSGI metrics middleware versus the legacy
+labelled-child decorator updates it replaced
+"""
+import pytest
+import time
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from prometheus_client import CollectorRegistry, Counter, Histogram, Gauge
+
+from request_metrics import RequestMetricsCollector, RequestMetricsMiddleware, ROUTE_ENVIRON_KEY
+
+
+# ============================================================================
+# Configuration
+# ============================================================================
+
+ITERATIONS = 50_000
+
+
+def bare_app(environ, start_response):
+    start_response('200 OK', [('Content-Type', 'application/json')])
+    return [b'{}']
+
+
+def make_environ() -> dict:
+    return {
+        'REQUEST_METHOD': 'GET',
+        'PATH_INFO': '/api/job-status/abc',
+        ROUTE_ENVIRON_KEY: '/api/job-status/<job_id>',
+    }
+
+
+def run_wsgi(app, iterations: int) -> float:
+    """Return mean microseconds per request"""
+    environ = make_environ()
+
+    def start_response(status, headers, exc_info=None):
+        return None
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        response = app(environ, start_response)
+        for _chunk in response:
+            pass
+        close = getattr(response, 'close', None)
+        if close is not None:
+            close()
+    return (time.perf_counter() - start) * 1e6 / iterations
+
+
+def legacy_decorator_cost(iterations: int) -> float:
+    """Three labelled Prometheus updates per request, as the old decorators did"""
+    registry = CollectorRegistry()
+    in_progress = Gauge('concurrent_requests', 'x', ['endpoint'], registry=registry)
+    duration = Histogram('http_request_duration_seconds', 'x', ['method', 'endpoint'], registry=registry)
+    total = Counter('http_requests_total', 'x', ['method', 'endpoint', 'status'], registry=registry)
+
+    def legacy_app(environ, start_response):
+        endpoint = '/api/job-status'
+        in_progress.labels(endpoint=endpoint).inc()
+        started = time.time()
+        try:
+            return bare_app(environ, start_response)
+        finally:
+            duration.labels(method='GET', endpoint=endpoint).observe(time.time() - started)
+            total.labels(method='GET', endpoint=endpoint, status='200').inc()
+            in_progress.labels(endpoint=endpoint).dec()
+
+    return run_wsgi(legacy_app, iterations)
+
+
+@pytest.mark.performance
+@pytest.mark.slow
+class TestRequestMetricsOverhead:
+    """Microbenchmark of per-request metrics overhead"""
+
+    def test_per_request_overhead(self) -> None:
+        baseline_us = run_wsgi(bare_app, ITERATIONS)
+        middleware = RequestMetricsMiddleware(bare_app, RequestMetricsCollector())
+        middleware_us = run_wsgi(middleware, ITERATIONS)
+        legacy_us = legacy_decorator_cost(ITERATIONS)
+
+        print(f"\n[BENCH] bare WSGI: {baseline_us:.2f} us/request")
+        print(f"[BENCH] middleware overhead: {middleware_us - baseline_us:.2f} us/request")
+        print(f"[BENCH] legacy decorator overhead: {legacy_us - baseline_us:.2f} us/request")
+        assert middleware_us - baseline_us < legacy_us - baseline_us
+
+    def test_scrape_cost_with_many_routes(self) -> None:
+        collector = RequestMetricsCollector()
+        for i in range(200):
+            for status in ('200', '404', '500'):
+                collector.record('GET', f'/api/route-{i}', status, 0.01)
+        registry = CollectorRegistry()
+        registry.register(collector)
+
+        from prometheus_client import generate_latest
+        start = time.perf_counter()
+        generate_latest(registry)
+        scrape_ms = (time.perf_counter() - start) * 1000
+        print(f"\n[BENCH] scrape with 600 series: {scrape_ms:.2f} ms")
@@ -0,0 +1,113 @@
+"""
+ORFEAS Performance Tests - Server Startup
+Import time per optional subsystem, and cold start of eager construction
+(the old __init__: import and build everything) versus the lazy subsystem
+registry (register, answer health, warm up in the background)
+"""
+import json
+import pytest
+import subprocess
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+BACKEND = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(BACKEND))
+
+
+# ============================================================================
+# Configuration
+# ============================================================================
+
+# name -> (module, factory); the optional subsystems OrfeasUnifiedServer used
+# to import at module level and build in __init__
+SUBSYSTEMS = {
+    'ultra_performance': ('ultra_performance_integration', 'UltraPerformanceManager'),
+    'vram_manager': ('gpu_optimization_advanced', 'get_vram_manager'),
+    'agent_communication': ('agent_communication', 'get_agent_communication_system'),
+    'enterprise_agents': ('enterprise_agent_framework', 'EnterpriseAgentOrchestrator'),
+    'gpu_optimizer': ('advanced_gpu_optimizer', 'get_advanced_gpu_optimizer'),
+    'dashboard': ('performance_dashboard_realtime', 'get_dashboard'),
+    'cache_manager': ('distributed_cache_manager', 'get_distributed_cache'),
+    'predictive_optimizer': ('predictive_performance_optimizer', 'get_predictive_optimizer'),
+    'alerting_system': ('alerting_system', 'get_alerting_system'),
+    'anomaly_detector': ('ml_anomaly_detector', 'get_anomaly_detector'),
+    'tracing_system': ('distributed_tracing', 'get_tracing_system'),
+}
+WARMUP = ('ultra_performance', 'vram_manager', 'agent_communication', 'enterprise_agents')
+
+COLD_START = r'''
+import importlib, json, logging, sys, time
+logging.disable(logging.CRITICAL)
+sys.path.insert(0, {backend!r})
+SUBSYSTEMS = {subsystems!r}
+WARMUP = {warmup!r}
+start = time.perf_counter()
+if {mode!r} == 'eager':
+    for module, factory in SUBSYSTEMS.values():
+        try:
+            getattr(importlib.import_module(module), factory)()
+        except Exception:
+            pass
+    health_s = time.perf_counter() - start
+    print(json.dumps({{'health_s': health_s, 'ready_s': health_s}}))
+else:
+    from subsystems import SubsystemRegistry
+    registry = SubsystemRegistry(disabled=())
+    for name, (module, factory) in SUBSYSTEMS.items():
+        registry.register(name, lambda m=module, f=factory: getattr(importlib.import_module(m), f)(),
+                          modules=(module,), warmup=name in WARMUP)
+    registry.status()
+    health_s = time.perf_counter() - start
+    registry.warmup()
+    for name in WARMUP:
+        registry.wait(name, 120)
+    print(json.dumps({{'health_s': health_s, 'ready_s': time.perf_counter() - start,
+                       'status': registry.status()}}))
+'''
+
+
+def import_ms(module: str):
+    """Cumulative import time of ``module`` in a fresh interpreter (None if it does not import)"""
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                            cwd=BACKEND, capture_output=True, text=True, timeout=300)
+    if result.returncode != 0:
+        return None
+    lines = [line for line in result.stderr.splitlines() if line.startswith('import time:')]
+    return int(lines[-1].split('|')[1]) / 1000
+
+
+def cold_start(mode: str) -> dict:
+    code = COLD_START.format(backend=str(BACKEND), subsystems=SUBSYSTEMS, warmup=WARMUP, mode=mode)
+    result = subprocess.run([sys.executable, '-c', code], cwd=BACKEND,
+                            capture_output=True, text=True, timeout=600)
+    assert result.returncode == 0, result.stderr[-2000:]
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+@pytest.mark.performance
+@pytest.mark.slow
+class TestStartup:
+    """Import-time breakdown and cold start"""
+
+    def test_import_time_per_subsystem(self) -> None:
+        total = 0.0
+        print()
+        for name, (module, _) in SUBSYSTEMS.items():
+            ms = import_ms(module)
+            total += ms or 0.0
+            print(f"[BENCH] import {name:<22} {module:<34} "
+                  + (f"{ms:8.1f} ms" if ms is not None else "     n/a (dependency missing)"))
+        print(f"[BENCH] optional subsystems, cold imports summed: {total:.0f} ms")
+
+    def test_cold_start(self) -> None:
+        eager = cold_start('eager')
+        lazy = cold_start('lazy')
+        print(f"\n[BENCH] eager: health after {eager['health_s'] * 1000:.0f} ms")
+        print(f"[BENCH] lazy:  health after {lazy['health_s'] * 1000:.1f} ms, "
+              f"warmup subsystems ready after {lazy['ready_s'] * 1000:.0f} ms")
+        for name, entry in lazy['status'].items():
+            timing = (f"import {entry['import_ms']:7.1f} ms  init {entry['init_ms']:6.1f} ms"
+                      if 'import_ms' in entry else "not loaded")
+            print(f"[BENCH]   {name:<22} {entry['state']:<10} {timing}")
+        assert lazy['health_s'] < eager['health_s']
@@ -0,0 +1,145 @@
+"""
+ORFEAS Performance Tests - Upload Validation Pipeline
+Upload latency and peak memory of the single-pass validator versus the
+legacy read/scan/re-open/per-pixel-copy pipeline, for 1 MB to 50 MB images
+"""
+import hashlib
+import io
+import multiprocessing
+import pytest
+import resource
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+import numpy as np
+from PIL import Image
+
+
+# ============================================================================
+# Configuration
+# ============================================================================
+
+SIZES_MB = (1, 10, 48)
+LEGACY_MAX_MB = 10  # the legacy per-pixel list copy needs ~100 bytes/pixel
+
+
+class Upload:
+    """Minimal FileStorage stand-in"""
+
+    def __init__(self, data: bytes, filename: str):
+        self.stream = io.BytesIO(data)
+        self.filename = filename
+
+    def read(self, *args):
+        return self.stream.read(*args)
+
+    def seek(self, pos, whence=0):
+        return self.stream.seek(pos, whence)
+
+    def save(self, path):
+        with open(path, 'wb') as f:
+            f.write(self.stream.getbuffer())
+
+
+def noise_png(megabytes: int) -> bytes:
+    side = int((megabytes * 1024 * 1024 / 3) ** 0.5)
+    pixels = np.random.default_rng(megabytes).integers(0, 256, (side, side, 3), dtype=np.uint8)
+    buffer = io.BytesIO()
+    Image.fromarray(pixels).save(buffer, format='PNG', compress_level=1)
+    return buffer.getvalue()
+
+
+def legacy_upload(upload: Upload, target: Path) -> None:
+    """The pre-refactor pipeline: multiple scans, two opens, per-pixel copy"""
+    file_data = upload.read()
+    upload.seek(0)
+    for pattern in (b'<script', b'<?php', b'<?xml', b'<!DOCTYPE', b'javascript:', b'data:text/html', b'\x00' * 100):
+        pattern in file_data
+    file_data.count(b'\x00')
+    hashlib.sha256(file_data).hexdigest()
+    upload.seek(0)
+    image = Image.open(upload.stream)
+    image.load()
+    image.getexif()
+    sanitized = Image.new(image.mode, image.size)
+    sanitized.putdata(list(image.getdata()))
+    upload.seek(0)
+    upload.save(target)
+    with Image.open(target) as reopened:
+        reopened.size, reopened.format, reopened.mode
+
+
+def single_pass_upload(upload: Upload, target: Path) -> None:
+    from validation_enhanced import EnhancedImageValidator
+    is_valid, error, validated = EnhancedImageValidator().validate_image_upload(upload)
+    assert is_valid, error
+    target.write_bytes(validated.data)
+    validated.info
+
+
+def peak_rss_kb() -> int:
+    """High-water RSS; VmHWM is resettable, ru_maxrss is the fallback"""
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def reset_peak_rss() -> None:
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+    except OSError:
+        pass
+
+
+def measure(pipeline: str, source: str, queue) -> None:
+    """Child process: (bytes, latency_ms, peak RSS growth in MB incl. the upload buffer)"""
+    import PIL.PngImagePlugin  # noqa: F401 - keep plugin import out of the measurement
+    reset_peak_rss()
+    baseline_kb = peak_rss_kb()
+    data = Path(source).read_bytes()
+    run = legacy_upload if pipeline == 'legacy' else single_pass_upload
+    with tempfile.TemporaryDirectory() as tmp:
+        start = time.perf_counter()
+        run(Upload(data, 'upload.png'), Path(tmp) / 'upload.png')
+        elapsed_ms = (time.perf_counter() - start) * 1000
+    queue.put((len(data), elapsed_ms, (peak_rss_kb() - baseline_kb) / 1024))
+
+
+def run_isolated(pipeline: str, source: Path):
+    ctx = multiprocessing.get_context('spawn')
+    queue = ctx.Queue()
+    process = ctx.Process(target=measure, args=(pipeline, str(source), queue))
+    process.start()
+    result = queue.get(timeout=600)
+    process.join()
+    return result
+
+
+@pytest.mark.performance
+@pytest.mark.slow
+class TestUploadValidationPipeline:
+    """Latency and peak memory per upload size"""
+
+    @pytest.mark.parametrize("megabytes", SIZES_MB)
+    def test_upload_latency_and_memory(self, megabytes, tmp_path) -> None:
+        source = tmp_path / 'source.png'
+        source.write_bytes(noise_png(megabytes))
+        size, new_ms, new_mb = run_isolated('single_pass', source)
+        print(f"\n[BENCH] {size / 1e6:.1f} MB PNG single-pass: {new_ms:.0f} ms, peak +{new_mb:.0f} MB")
+        if megabytes > LEGACY_MAX_MB:
+            return
+        _, old_ms, old_mb = run_isolated('legacy', source)
+        print(f"[BENCH] {size / 1e6:.1f} MB PNG legacy: {old_ms:.0f} ms, peak +{old_mb:.0f} MB")
+        assert new_ms < old_ms
+        assert new_mb < old_mb
@@ -0,0 +1,101 @@
+"""
+ORFEAS Performance Tests - Volumetric Marching Cubes
+Runtime and peak memory of block-wise meshing versus the legacy dense
+float32 volume (per-slice loop + one marching-cubes pass), for 1024x1024
+depth maps at volume depths 64-256
+"""
+import multiprocessing
+import pytest
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+import numpy as np
+
+pytest.importorskip("skimage")
+
+
+# ============================================================================
+# Configuration
+# ============================================================================
+
+MAP_SIDE = 1024
+VOLUME_DEPTHS = (64, 128, 256)
+LEGACY_MAX_DEPTH = 128  # the dense volume needs 4 bytes per voxel
+
+
+def depth_map(side: int = MAP_SIDE) -> np.ndarray:
+    y, x = np.mgrid[0:side, 0:side].astype(np.float32)
+    depth = 0.5 + 0.3 * np.sin(x / 61.0) * np.cos(y / 47.0) + 0.1 * np.sin((x + y) / 13.0)
+    return np.clip(depth, 0, 1).astype(np.float32)
+
+
+def legacy_mesh(depth: np.ndarray, volume_depth: int):
+    from skimage import measure
+    height, width = depth.shape
+    volume = np.zeros((height, width, volume_depth), dtype=np.float32)
+    for z in range(volume_depth):
+        volume[:, :, z] = (depth > z / volume_depth).astype(float)
+    vertices, faces, _, _ = measure.marching_cubes(volume, level=0.5)
+    return vertices.astype(np.float32), faces.astype(np.int32)
+
+
+def engine_mesh(depth: np.ndarray, volume_depth: int):
+    from volumetric_engine import VolumetricEngine
+    engine = VolumetricEngine()
+    try:
+        return engine.mesh(depth, volume_depth)
+    finally:
+        engine.shutdown()
+
+
+def peak_rss_kb() -> int:
+    with open('/proc/self/status') as f:
+        for line in f:
+            if line.startswith('VmHWM:'):
+                return int(line.split()[1])
+    return 0
+
+
+def measure_run(pipeline: str, volume_depth: int, queue) -> None:
+    """Child process: (faces, seconds, peak RSS growth in MB)"""
+    import skimage.measure  # noqa: F401 - keep import cost out of the measurement
+    depth = depth_map()
+    baseline_kb = peak_rss_kb()
+    run = legacy_mesh if pipeline == 'legacy' else engine_mesh
+    start = time.perf_counter()
+    _, faces = run(depth, volume_depth)
+    elapsed = time.perf_counter() - start
+    queue.put((len(faces), elapsed, (peak_rss_kb() - baseline_kb) / 1024))
+
+
+def run_isolated(pipeline: str, volume_depth: int):
+    ctx = multiprocessing.get_context('spawn')
+    queue = ctx.Queue()
+    process = ctx.Process(target=measure_run, args=(pipeline, volume_depth, queue))
+    process.start()
+    result = queue.get(timeout=900)
+    process.join()
+    return result
+
+
+@pytest.mark.performance
+@pytest.mark.slow
+class TestVolumetricMeshing:
+    """Runtime and peak memory per volume depth"""
+
+    @pytest.mark.parametrize("volume_depth", VOLUME_DEPTHS)
+    def test_runtime_and_memory(self, volume_depth) -> None:
+        faces, seconds, peak_mb = run_isolated('blocks', volume_depth)
+        print(f"\n[BENCH] {MAP_SIDE}^2 x {volume_depth} block-wise: {seconds:.2f} s, "
+              f"peak +{peak_mb:.0f} MB, {faces} faces")
+        if volume_depth > LEGACY_MAX_DEPTH:
+            return
+        legacy_faces, legacy_seconds, legacy_mb = run_isolated('legacy', volume_depth)
+        print(f"[BENCH] {MAP_SIDE}^2 x {volume_depth} dense legacy: {legacy_seconds:.2f} s, "
+              f"peak +{legacy_mb:.0f} MB, {legacy_faces} faces")
+        assert faces == legacy_faces
+        assert peak_mb < legacy_mb
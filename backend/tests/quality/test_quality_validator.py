@@ -18,7 +18,12 @@ from typing import Any
 # Add backend to path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
-from quality_validator import GenerationQualityValidator, get_quality_validator
+from quality_validator import (
+    GenerationQualityValidator,
+    compute_mesh_topology,
+    get_quality_validator,
+    sampling_error_bound,
+)
 
 
 class TestGenerationQualityValidator:
@@ -414,6 +419,125 @@ class TestGenerationQualityValidator:
         print(f"\n[TEST] Error handling: {result.get('error', 'No error')}")
 
 
+class TestValidationLevels:
+    """Sampled levels, topology cache and concurrent stages"""
+
+    @pytest.fixture
+    def sample_image(self) -> Any:
+        return Image.new('RGB', (512, 512), color=(128, 128, 128))
+
+    @pytest.fixture
+    def textured_image(self) -> Any:
+        rng = np.random.default_rng(0)
+        return Image.fromarray(rng.integers(0, 256, (1024, 1024, 3), dtype=np.uint8))
+
+    def test_topology_matches_trimesh(self) -> None:
+        """Exact topology agrees with trimesh on closed, open and flipped meshes"""
+        closed = trimesh.creation.icosphere(subdivisions=3)
+        open_mesh = trimesh.Trimesh(vertices=closed.vertices, faces=closed.faces[:-5])
+        flipped_faces = closed.faces.copy()
+        flipped_faces[0] = flipped_faces[0][::-1]
+        flipped = trimesh.Trimesh(vertices=closed.vertices, faces=flipped_faces, process=False)
+
+        for mesh in (closed, open_mesh, flipped):
+            topology = compute_mesh_topology(mesh.vertices, mesh.faces)
+            assert topology.watertight == mesh.is_watertight
+            assert topology.winding_consistent == mesh.is_winding_consistent
+        assert compute_mesh_topology(closed.vertices, closed.faces).volume == pytest.approx(closed.volume)
+
+    def test_sampled_topology_error_is_bounded(self) -> None:
+        """Sampled boundary ratio stays within the reported bound of the exact ratio"""
+        sphere = trimesh.creation.icosphere(subdivisions=6)
+        faces = np.random.default_rng(1).permutation(sphere.faces)[:-2000]
+        exact = compute_mesh_topology(sphere.vertices, faces)
+        sampled = compute_mesh_topology(sphere.vertices, faces, edge_samples=4096)
+        assert sampled.sampled and not sampled.watertight
+        assert abs(sampled.boundary_ratio - exact.boundary_ratio) <= sampled.error_bound
+        assert sampled.error_bound == pytest.approx(sampling_error_bound(4096))
+
+    def test_topology_cached_across_stages_and_invalidated_by_repair(self, sample_image: Any) -> None:
+        validator = GenerationQualityValidator(validation_level='standard')
+        mesh = trimesh.creation.box(extents=[100, 100, 100])
+        validator.validate_generation_pipeline(sample_image, generated_mesh=mesh)
+        assert validator.stats['topology_cache_hits'] == 1  # final stage reuses the shape stage's topology
+
+        broken = trimesh.creation.box(extents=[100, 100, 100])
+        broken.update_faces(np.arange(len(broken.faces)) != 0)
+        result = validator.validate_generation_pipeline(sample_image, generated_mesh=broken)
+        assert result['auto_repairs_applied'] == ["Non-manifold geometry repair"]
+        # Repair modified a copy: its topology was recomputed, not served stale
+        assert result['shape_quality']['manifold'] and result['final_quality']['watertight']
+        assert not broken.is_watertight  # the caller's mesh is left alone
+
+    def test_levels_agree_on_scores(self, sample_image: Any, textured_image: Any) -> None:
+        mesh = trimesh.creation.icosphere(subdivisions=5)
+        results = {}
+        for level in ('fast', 'standard', 'thorough'):
+            validator = GenerationQualityValidator(validation_level=level)
+            results[level] = validator.validate_generation_pipeline(
+                sample_image, bg_removed_image=sample_image, generated_mesh=mesh,
+                texture_image=textured_image)
+            assert results[level]['validation_level'] == level
+        assert results['fast']['overall_score'] == pytest.approx(results['thorough']['overall_score'], abs=0.05)
+        assert results['standard']['shape_quality'] == results['thorough']['shape_quality']
+
+    def test_fast_level_defers_repair(self, sample_image: Any) -> None:
+        validator = GenerationQualityValidator(validation_level='fast')
+        mesh = trimesh.creation.box(extents=[100, 100, 100])
+        mesh.update_faces(np.arange(len(mesh.faces)) != 0)
+        result = validator.validate_generation_pipeline(sample_image, generated_mesh=mesh)
+        assert result['auto_repairs_applied'] == []
+        assert result['shape_quality']['repair_deferred']
+
+    def test_fast_level_respects_budget(self, sample_image: Any, monkeypatch) -> None:
+        import quality_validator
+
+        validator = GenerationQualityValidator(validation_level='fast')
+        monkeypatch.setitem(quality_validator.VALIDATION_LEVELS['fast'], 'budget_ms', 1)
+        slow_texture = validator.validate_texture_coherence
+
+        def slow(*args):
+            import time
+            time.sleep(0.2)
+            return slow_texture(*args)
+
+        monkeypatch.setattr(validator, 'validate_texture_coherence', slow)
+        result = validator.validate_generation_pipeline(
+            sample_image, generated_mesh=trimesh.creation.box(extents=[100, 100, 100]),
+            texture_image=sample_image)
+        assert 'texture_quality' in result['skipped_checks']
+        assert result['texture_quality'] is None
+        assert result['inconclusive'] and not result['passed_threshold']
+        assert validator.get_validation_stats()['budget_overruns'] == 1
+
+    def test_skipped_mesh_checks_leave_callers_mesh_alone(self, sample_image: Any, monkeypatch) -> None:
+        import time
+        import quality_validator
+
+        validator = GenerationQualityValidator(validation_level='fast')
+        monkeypatch.setitem(quality_validator.VALIDATION_LEVELS['fast'], 'budget_ms', 1)
+        final_check = validator.validate_final_mesh
+
+        def slow(*args):
+            time.sleep(0.2)
+            return final_check(*args)
+
+        monkeypatch.setattr(validator, 'validate_final_mesh', slow)
+        mesh = trimesh.creation.box(extents=[100, 100, 100])
+        mesh.faces[0] = mesh.faces[0][::-1]  # inconsistent winding: fix_normals has work to do
+        faces = mesh.faces.copy()
+        result = validator.validate_generation_pipeline(sample_image, generated_mesh=mesh)
+        assert {'shape_quality', 'final_quality'} <= set(result['skipped_checks'])
+        assert result['inconclusive'] and not result['passed_threshold']
+
+        time.sleep(0.4)  # the abandoned mesh chain has finished by now
+        np.testing.assert_array_equal(mesh.faces, faces)
+
+    def test_unknown_level(self) -> None:
+        with pytest.raises(ValueError):
+            GenerationQualityValidator(validation_level='exhaustive')
+
+
 if __name__ == '__main__':
     # Run tests with verbose output
     pytest.main([__file__, '-v', '--tb=short'])
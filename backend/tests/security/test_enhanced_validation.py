@@ -16,14 +16,20 @@ Target: Zero vulnerabilities, <100ms validation time
 import pytest
 import io
 import struct
-from PIL import Image
+import hashlib
+from PIL import Image, PngImagePlugin
 from pathlib import Path
 import sys
 
 # Add backend to path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
-from validation_enhanced import EnhancedImageValidator, get_enhanced_validator
+from validation_enhanced import (
+    EnhancedImageValidator,
+    get_enhanced_validator,
+    strip_jpeg_metadata,
+    strip_png_metadata,
+)
 
 
 class FakeFileStorage:
@@ -451,6 +457,76 @@ class TestEdgeCases:
         assert is_valid, f"BMP format rejected: {error}"
 
 
+class TestSinglePassPipeline:
+    """One read, one decode, metadata stripped from the stored bytes"""
+
+    def test_result_carries_sanitized_bytes_hash_and_info(self, validator):
+        meta = PngImagePlugin.PngInfo()
+        meta.add_text('Author', 'someone')
+        img = Image.new('RGBA', (64, 48), (10, 20, 30, 200))
+        buffer = io.BytesIO()
+        img.save(buffer, format='PNG', pnginfo=meta)
+
+        is_valid, error, result = validator.validate_image_upload(FakeFileStorage(buffer.getvalue(), 'a.png'))
+        assert is_valid, error
+        assert b'tEXt' not in result.data and len(result.data) < len(buffer.getvalue())
+        assert result.sha256 == hashlib.sha256(result.data).hexdigest()
+        assert result.info == {'size': (64, 48), 'format': 'PNG', 'mode': 'RGBA',
+                               'has_transparency': True, 'file_size': len(result.data)}
+        assert result.image.mode == 'RGB' and result.image.info == {}
+
+    def test_image_is_decoded_once(self, validator, valid_png_image, monkeypatch):
+        decoders = []
+        original_getdecoder = Image._getdecoder
+
+        def counting_getdecoder(*args, **kwargs):
+            decoders.append(args[1])
+            return original_getdecoder(*args, **kwargs)
+
+        monkeypatch.setattr(Image, '_getdecoder', counting_getdecoder)
+        monkeypatch.setattr(Image.Image, 'getdata', lambda *a: pytest.fail("per-pixel copy"))
+        is_valid, _, _ = validator.validate_image_upload(FakeFileStorage(valid_png_image, 'once.png'))
+        assert is_valid
+        assert decoders == ['zip']
+
+    def test_header_probe_rejects_before_decode(self, validator, monkeypatch):
+        img = Image.new('L', (5000, 40))
+        buffer = io.BytesIO()
+        img.save(buffer, format='PNG')
+        monkeypatch.setattr(Image.Image, 'load', lambda self: pytest.fail("decoded oversized image"))
+        is_valid, error, _ = validator.validate_image_upload(FakeFileStorage(buffer.getvalue(), 'wide.png'))
+        assert not is_valid and "too large" in error.lower()
+
+    def test_png_strip_drops_metadata_and_trailing_bytes(self, valid_png_image):
+        img = Image.open(io.BytesIO(valid_png_image))
+        meta = PngImagePlugin.PngInfo()
+        meta.add_text('Comment', 'x' * 100)
+        buffer = io.BytesIO()
+        img.save(buffer, format='PNG', pnginfo=meta, icc_profile=b'\x00' * 200)
+        stripped = strip_png_metadata(buffer.getvalue() + b'appended')
+        assert b'iCCP' not in stripped and b'tEXt' not in stripped
+        assert stripped.endswith(b'IEND\xaeB`\x82')
+        decoded = Image.open(io.BytesIO(stripped))
+        assert list(decoded.getdata()) == list(img.getdata())
+        assert strip_png_metadata(valid_png_image) is valid_png_image
+
+    def test_jpeg_strip_keeps_jfif_and_pixels(self):
+        img = Image.new('RGB', (64, 64), (200, 100, 50))
+        exif = img.getexif()
+        exif[0x010F] = "ORFEAS Camera"
+        buffer = io.BytesIO()
+        img.save(buffer, format='JPEG', exif=exif, icc_profile=b'p' * 300)
+        original = buffer.getvalue()
+        stripped = strip_jpeg_metadata(original)
+        assert b'Exif' not in stripped and b'ICC_PROFILE' not in stripped
+        assert b'JFIF' in stripped
+        assert Image.open(io.BytesIO(stripped)).tobytes() == Image.open(io.BytesIO(original)).tobytes()
+
+    def test_multi_pattern_scan_reports_first_match(self, validator, valid_png_image):
+        is_valid, error = validator._scan_malicious_content(valid_png_image + b'..javascript:alert(1)..<?php')
+        assert not is_valid and 'javascript:' in error
+
+
 # Run tests with: pytest test_enhanced_validation.py -v
 if __name__ == '__main__':
     pytest.main([__file__, '-v', '--tb=short'])
@@ -0,0 +1,257 @@
+"""
++==============================================================================
+|            ORFEAS Testing Suite - Agent Message Bus Tests                    |
+|      Wire codec, in-process and Unix socket transports, correlation          |
++==============================================================================
+"""
+import asyncio
+import pytest
+import sys
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+
+backend_path = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(backend_path))
+
+from agent_communication import (
+    MSGPACK_AVAILABLE,
+    AgentMessage,
+    AgentMessageBus,
+    AgentMessageCodec,
+    MessageHandler,
+    MessagePriority,
+    MessageType,
+)
+from agent_transport import InProcessHub, InProcessTransport, UnixSocketTransport
+
+
+def message(recipient=None, **payload):
+    return AgentMessage(id=str(uuid.uuid4()), type=MessageType.TASK_REQUEST, sender_id='',
+                        recipient_id=recipient, payload=payload or {'task': 'ping'})
+
+
+class Echo(MessageHandler):
+    """Answers every task request with its payload"""
+
+    def __init__(self):
+        self.seen = []
+
+    async def handle_message(self, msg):
+        self.seen.append(msg)
+        return AgentMessage(id=str(uuid.uuid4()), type=MessageType.TASK_RESPONSE, sender_id='',
+                            recipient_id=None, payload={'echo': msg.payload})
+
+    def can_handle(self, message_type):
+        return message_type == MessageType.TASK_REQUEST
+
+
+async def bus_pair(make_transport):
+    client, server = AgentMessageBus(transport=make_transport()), AgentMessageBus(transport=make_transport())
+    await client.initialize('client')
+    await server.initialize('server')
+    echo = Echo()
+    server.register_handler(MessageType.TASK_REQUEST, echo)
+    return client, server, echo
+
+
+@pytest.mark.unit
+class TestAgentMessageCodec:
+    """Compact binary/JSON wire format"""
+
+    @pytest.mark.parametrize('use_msgpack', [False] + ([True] if MSGPACK_AVAILABLE else []))
+    def test_round_trip(self, use_msgpack):
+        codec = AgentMessageCodec(use_msgpack=use_msgpack)
+        original = AgentMessage(id=str(uuid.uuid4()), type=MessageType.COORDINATION_REQUEST,
+                                sender_id='a', recipient_id='b', payload={'n': [1, 2.5, 'x'], 'k': {'z': None}},
+                                priority=MessagePriority.HIGH, correlation_id=str(uuid.uuid4()),
+                                timestamp=datetime(2025, 1, 2, 3, 4, 5, 678000), retry_count=1)
+        decoded = codec.decode(codec.encode(original))
+        assert decoded == original
+
+    def test_smaller_than_json_dict(self):
+        import json
+        from dataclasses import asdict
+        msg = message('b')
+        legacy = asdict(msg)
+        legacy.update(type=msg.type.value, priority=msg.priority.value,
+                      timestamp=msg.timestamp.isoformat(), expires_at=msg.expires_at.isoformat())
+        assert len(AgentMessageCodec().encode(msg)) < len(json.dumps(legacy)) * 0.7
+
+    def test_payload_datetimes_and_dataclasses_encode(self):
+        codec = AgentMessageCodec(use_msgpack=False)
+        when = datetime(2025, 6, 1)
+        msg = message(when=when, tags={'a'})
+        payload = codec.decode(codec.encode(msg)).payload
+        assert payload == {'when': when.isoformat(), 'tags': ['a']}
+
+    def test_timestamps_are_millisecond_epoch(self):
+        codec = AgentMessageCodec(use_msgpack=False)
+        msg = message()
+        msg.timestamp = datetime(2025, 1, 1, 0, 0, 0, 123456)
+        assert codec.decode(codec.encode(msg)).timestamp == datetime(2025, 1, 1, 0, 0, 0, 123000)
+
+    def test_garbage_decodes_to_none(self):
+        codec = AgentMessageCodec(use_msgpack=False)
+        assert codec.decode(b'\x7fnonsense') is None
+        assert codec.decode(b'\x02[9]') is None
+
+
+@pytest.mark.unit
+class TestInProcessTransport:
+    """Zero-serialization delivery and the correlation map"""
+
+    @pytest.mark.asyncio
+    async def test_request_response(self):
+        hub = InProcessHub()
+        client, server, echo = await bus_pair(lambda: InProcessTransport(hub))
+        try:
+            response = await client.send_request(message('server', value=7), timeout=5)
+            assert response.type == MessageType.TASK_RESPONSE
+            assert response.payload == {'echo': {'value': 7}}
+            assert client.pending_requests == {}
+        finally:
+            await client.shutdown()
+            await server.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_message_object_is_handed_over(self):
+        hub = InProcessHub()
+        client, server, echo = await bus_pair(lambda: InProcessTransport(hub))
+        try:
+            sent = message('server')
+            await client.send_request(sent, timeout=5)
+            assert echo.seen[0] is sent
+        finally:
+            await client.shutdown()
+            await server.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_broadcast_skips_sender(self):
+        hub = InProcessHub()
+        buses = [AgentMessageBus(transport=InProcessTransport(hub)) for _ in range(3)]
+        handlers = []
+        for i, bus in enumerate(buses):
+            await bus.initialize(f'agent-{i}')
+            handlers.append(Echo())
+            bus.register_handler(MessageType.TASK_REQUEST, handlers[-1])
+        try:
+            assert await buses[0].send_message(message())
+            await asyncio.sleep(0.05)
+            assert [len(h.seen) for h in handlers] == [0, 1, 1]
+        finally:
+            for bus in buses:
+                await bus.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_unknown_recipient_fails(self):
+        bus = AgentMessageBus(transport=InProcessTransport(InProcessHub()))
+        await bus.initialize('lonely')
+        try:
+            assert not await bus.send_message(message('nobody'))
+            assert bus.get_message_stats()['stats']['failed'] == 1
+        finally:
+            await bus.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_request_timeout_cleans_up(self):
+        hub = InProcessHub()
+        client = AgentMessageBus(transport=InProcessTransport(hub))
+        silent = AgentMessageBus(transport=InProcessTransport(hub))
+        await client.initialize('client')
+        await silent.initialize('silent')
+        try:
+            assert await client.send_request(message('silent'), timeout=0.05) is None
+            assert client.pending_requests == {}
+        finally:
+            await client.shutdown()
+            await silent.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_handler_can_make_requests(self):
+        """A handler awaiting its own request must not block response delivery"""
+        hub = InProcessHub()
+        a, b, c = (AgentMessageBus(transport=InProcessTransport(hub)) for _ in range(3))
+        for bus, name in ((a, 'a'), (b, 'b'), (c, 'c')):
+            await bus.initialize(name)
+        c.register_handler(MessageType.TASK_REQUEST, Echo())
+
+        class Forward(Echo):
+            async def handle_message(self, msg):
+                inner = await b.send_request(message('c', hop=1), timeout=5)
+                return AgentMessage(id=str(uuid.uuid4()), type=MessageType.TASK_RESPONSE, sender_id='',
+                                    recipient_id=None, payload=inner.payload)
+
+        b.register_handler(MessageType.TASK_REQUEST, Forward())
+        try:
+            response = await a.send_request(message('b'), timeout=5)
+            assert response.payload == {'echo': {'hop': 1}}
+        finally:
+            for bus in (a, b, c):
+                await bus.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_expired_message_dropped(self):
+        hub = InProcessHub()
+        client, server, echo = await bus_pair(lambda: InProcessTransport(hub))
+        try:
+            stale = message('server')
+            stale.expires_at = datetime.utcnow() - timedelta(seconds=1)
+            await client.send_message(stale)
+            await asyncio.sleep(0.05)
+            assert echo.seen == []
+        finally:
+            await client.shutdown()
+            await server.shutdown()
+
+
+@pytest.mark.unit
+class TestUnixSocketTransport:
+    """Framed codec messages between buses over Unix sockets"""
+
+    @pytest.mark.asyncio
+    async def test_request_response(self, tmp_path):
+        codec = AgentMessageCodec()
+        client, server, echo = await bus_pair(lambda: UnixSocketTransport(codec, str(tmp_path)))
+        try:
+            response = await client.send_request(message('server', value=[1, 2]), timeout=5)
+            assert response.payload == {'echo': {'value': [1, 2]}}
+            assert echo.seen[0].sender_id == 'client'
+            assert client.transport.get_stats()['bytes_out'] > 0
+        finally:
+            await client.shutdown()
+            await server.shutdown()
+        assert not list(tmp_path.glob('*.sock'))
+
+    @pytest.mark.asyncio
+    async def test_burst_keeps_order(self, tmp_path):
+        codec = AgentMessageCodec()
+        received = []
+
+        async def deliver(msg):
+            received.append(msg.payload['i'])
+
+        sender, receiver = UnixSocketTransport(codec, str(tmp_path)), UnixSocketTransport(codec, str(tmp_path))
+        await receiver.start('receiver', deliver)
+        await sender.start('sender', deliver)
+        try:
+            for i in range(500):
+                assert await sender.send(message('receiver', i=i))
+            for _ in range(200):
+                if len(received) == 500:
+                    break
+                await asyncio.sleep(0.01)
+            assert received == list(range(500))
+        finally:
+            await sender.stop()
+            await receiver.stop()
+
+    @pytest.mark.asyncio
+    async def test_missing_peer_fails(self, tmp_path):
+        bus = AgentMessageBus(transport=UnixSocketTransport(AgentMessageCodec(), str(tmp_path)))
+        await bus.initialize('alone')
+        try:
+            assert not await bus.send_message(message('ghost'))
+            assert await bus.send_message(message())  # broadcast to nobody is fine
+        finally:
+            await bus.shutdown()
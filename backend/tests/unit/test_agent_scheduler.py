@@ -0,0 +1,214 @@
+"""
++==============================================================================
+|            ORFEAS Testing Suite - Agent Task Scheduler Tests                 |
+|      Priority/EDF order, concurrency bounds, stealing, load shedding         |
++==============================================================================
+"""
+import asyncio
+import pytest
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+backend_path = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(backend_path))
+
+from enterprise_agent_framework import (
+    AgentCapability,
+    AgentTask,
+    AgentTaskScheduler,
+    AgentType,
+    EnterpriseAgentBase,
+    EnterpriseAgentOrchestrator,
+    TaskPriority,
+)
+
+
+class SleepAgent(EnterpriseAgentBase):
+    """Handles 'work' tasks by sleeping ``context['seconds']``; records start order"""
+
+    def __init__(self, agent_id, gate=None):
+        self.started = []
+        self.peak = self.active = 0
+        self.gate = gate
+        super().__init__(agent_id, AgentType.PERFORMANCE_OPTIMIZATION, [AgentCapability.SYSTEM_MONITORING])
+
+    def _initialize_agent(self):
+        pass
+
+    def can_handle_task(self, task):
+        return task.type == 'work'
+
+    async def execute_task(self, task):
+        self.started.append(task.id)
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            if self.gate is not None:
+                await self.gate.wait()
+            await asyncio.sleep(task.context.get('seconds', 0))
+        finally:
+            self.active -= 1
+        self.update_performance_metrics(task.context.get('seconds', 0), True, 1.0)
+        return {'success': True}
+
+
+def work(task_id, priority=TaskPriority.MEDIUM, deadline=None, seconds=0.0):
+    return AgentTask(id=task_id, type='work', description='', priority=priority, requirements={},
+                     context={'seconds': seconds}, deadline=deadline)
+
+
+def in_seconds(seconds):
+    return datetime.utcnow() + timedelta(seconds=seconds)
+
+
+@pytest.mark.unit
+class TestAgentTaskScheduler:
+    """Dispatch order and bookkeeping"""
+
+    @pytest.mark.asyncio
+    async def test_priority_then_deadline_order(self):
+        gate = asyncio.Event()
+        agent = SleepAgent('a', gate)
+        scheduler = AgentTaskScheduler(max_concurrency=1)
+        scheduler.add_agent(agent)
+        try:
+            blocker = scheduler.submit_nowait(work('blocker'), [agent])
+            await asyncio.sleep(0)
+            futures = [
+                scheduler.submit_nowait(work('low', TaskPriority.LOW), [agent]),
+                scheduler.submit_nowait(work('medium-late', deadline=in_seconds(60)), [agent]),
+                scheduler.submit_nowait(work('medium-soon', deadline=in_seconds(30)), [agent]),
+                scheduler.submit_nowait(work('high', TaskPriority.HIGH), [agent]),
+                scheduler.submit_nowait(work('critical', TaskPriority.CRITICAL), [agent]),
+            ]
+            await asyncio.sleep(0.01)
+            gate.set()
+            await asyncio.gather(blocker, *futures)
+            assert agent.started == ['blocker', 'critical', 'high', 'medium-soon', 'medium-late', 'low']
+        finally:
+            await scheduler.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_concurrency_bound(self):
+        agent = SleepAgent('a')
+        scheduler = AgentTaskScheduler(max_concurrency=3)
+        scheduler.add_agent(agent)
+        try:
+            await asyncio.gather(*(scheduler.submit(work(f't{i}', seconds=0.01), [agent]) for i in range(12)))
+            assert agent.peak == 3
+        finally:
+            await scheduler.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_expired_tasks_are_shed(self):
+        gate = asyncio.Event()
+        agent = SleepAgent('a', gate)
+        scheduler = AgentTaskScheduler(max_concurrency=1)
+        scheduler.add_agent(agent)
+        try:
+            blocker = scheduler.submit_nowait(work('blocker'), [agent])
+            await asyncio.sleep(0)
+            doomed = scheduler.submit_nowait(work('doomed', deadline=in_seconds(0.02)), [agent])
+            late = await scheduler.submit(work('already-late', deadline=in_seconds(-1)), [agent])
+            assert late['shed'] and not late['success']
+            await asyncio.sleep(0.05)
+            gate.set()
+            await blocker
+            result = await doomed
+            assert result['shed'] and 'doomed' not in agent.started
+            assert scheduler.get_scheduler_stats()['shed'] == 2
+            assert agent.performance_metrics['tasks_shed'] == 2
+            assert agent.performance_metrics['deadline_misses'] == 2
+        finally:
+            await scheduler.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_idle_agent_steals_work(self):
+        gate = asyncio.Event()
+        busy, idle = SleepAgent('busy', gate), SleepAgent('idle')
+        scheduler = AgentTaskScheduler(max_concurrency=1)
+        scheduler.add_agent(busy)
+        scheduler.add_agent(idle)
+        try:
+            # Route everything to ``busy``; ``idle`` has to steal
+            futures = [scheduler.submit_nowait(work(f't{i}'), [busy]) for i in range(4)]
+            results = await asyncio.wait_for(asyncio.gather(*futures[1:]), timeout=5)
+            assert {r['agent_id'] for r in results} == {'idle'}
+            assert scheduler.get_scheduler_stats()['stolen'] == 3
+            gate.set()
+            await futures[0]
+        finally:
+            await scheduler.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_no_stealing_when_disabled(self):
+        gate = asyncio.Event()
+        busy, idle = SleepAgent('busy', gate), SleepAgent('idle')
+        scheduler = AgentTaskScheduler(max_concurrency=1, work_stealing=False)
+        scheduler.add_agent(busy)
+        scheduler.add_agent(idle)
+        try:
+            futures = [scheduler.submit_nowait(work(f't{i}'), [busy]) for i in range(3)]
+            await asyncio.sleep(0.02)
+            assert idle.started == []
+            gate.set()
+            await asyncio.gather(*futures)
+        finally:
+            await scheduler.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_routes_to_shortest_expected_wait(self):
+        gate = asyncio.Event()
+        a, b = SleepAgent('a', gate), SleepAgent('b', gate)
+        scheduler = AgentTaskScheduler(max_concurrency=1, work_stealing=False)
+        scheduler.add_agent(a)
+        scheduler.add_agent(b)
+        try:
+            futures = [scheduler.submit_nowait(work(f't{i}'), [a, b]) for i in range(4)]
+            assert [len(q) for q in scheduler.queues.values()] == [2, 2]
+            gate.set()
+            await asyncio.gather(*futures)
+        finally:
+            await scheduler.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_queue_time_fed_back_to_metrics(self):
+        agent = SleepAgent('a')
+        scheduler = AgentTaskScheduler(max_concurrency=1)
+        scheduler.add_agent(agent)
+        try:
+            results = await asyncio.gather(*(scheduler.submit(work(f't{i}', seconds=0.01), [agent]) for i in range(3)))
+            assert results[-1]['queue_time'] > 0.015
+            metrics = agent.performance_metrics
+            assert metrics['tasks_completed'] == 3 and metrics['tasks_scheduled'] == 3
+            assert metrics['average_queue_time'] > 0
+        finally:
+            await scheduler.shutdown()
+
+
+@pytest.mark.unit
+class TestOrchestratorScheduling:
+    """EnterpriseAgentOrchestrator routes through the scheduler"""
+
+    @pytest.mark.asyncio
+    async def test_execute_task_uses_scheduler(self, tmp_path, monkeypatch):
+        monkeypatch.setenv('AGENT_EXPERIENCE_DIR', str(tmp_path))
+        orchestrator = EnterpriseAgentOrchestrator()
+        try:
+            result = await orchestrator.execute_task(AgentTask(
+                id='q1', type='quality_assessment', description='', priority=TaskPriority.HIGH,
+                requirements={'input_data': {}}, context={}))
+            assert result['agent_id'] == 'quality_agent_001'
+            assert 'queue_time' in result
+            status = await orchestrator.get_orchestrator_status()
+            assert status['scheduler']['completed'] == 1
+        finally:
+            await orchestrator.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_unknown_task_type(self):
+        orchestrator = EnterpriseAgentOrchestrator()
+        result = await orchestrator.execute_task(work('x'))
+        assert not result['success']
+        await orchestrator.shutdown()
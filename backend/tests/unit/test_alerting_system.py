@@ -0,0 +1,207 @@
+"""
++==============================================================================
+|              ORFEAS Testing Suite - Alerting System Tests                   |
+|         Rule language, metric-indexed evaluation and alert state machine    |
++==============================================================================
+"""
+import pytest
+import time
+from pathlib import Path
+import sys
+
+backend_path = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(backend_path))
+
+from alert_rules import (
+    AlertRuleSyntaxError,
+    RollingWindowStore,
+    EvaluationContext,
+    compile_rule,
+    parse_duration,
+)
+from alerting_system import Alert, AlertingSystem, AlertSeverity, AlertStatus
+
+
+def make_system() -> AlertingSystem:
+    return AlertingSystem(enable_logging=False)
+
+
+@pytest.mark.unit
+class TestRuleCompiler:
+    """Parsing and compiling rule expressions"""
+
+    def test_parse_duration_units(self) -> None:
+        assert parse_duration("500ms") == 0.5
+        assert parse_duration("30s") == 30
+        assert parse_duration("5m") == 300
+        assert parse_duration("1h") == 3600
+
+    def test_compile_collects_metrics_and_windows(self) -> None:
+        rule = compile_rule("avg(cpu_percent[5m]) > 90 and gpu_memory_percent >= 95 for 2m")
+        assert rule.metrics == frozenset({"cpu_percent", "gpu_memory_percent"})
+        assert rule.windows["cpu_percent"] == 300
+        assert rule.for_seconds == 120
+
+    @pytest.mark.parametrize("text", [
+        "",
+        "cpu_percent >",
+        "cpu_percent > high",
+        "median(cpu_percent[5m]) > 1",
+        "(cpu_percent > 1",
+        "cpu_percent > 1 for",
+    ])
+    def test_invalid_rules_raise(self, text: str) -> None:
+        with pytest.raises(AlertRuleSyntaxError):
+            compile_rule(text)
+
+    def test_and_or_precedence(self) -> None:
+        store = RollingWindowStore()
+        for metric, value in {"a": 1, "b": 0, "c": 1}.items():
+            store.append(metric, value, 100.0)
+        ctx = EvaluationContext(store, 100.0)
+        assert compile_rule("a > 0 or b > 0 and c > 5").evaluate(ctx) is True
+        assert compile_rule("(a > 0 or b > 0) and c > 5").evaluate(ctx) is False
+
+    def test_missing_metric_is_unknown(self) -> None:
+        ctx = EvaluationContext(RollingWindowStore(), 0.0)
+        assert compile_rule("missing > 1").evaluate(ctx) is None
+
+    def test_window_aggregates(self) -> None:
+        store = RollingWindowStore()
+        store.require_retention("errors", 60)
+        for t, value in enumerate([0, 10, 20, 30]):
+            store.append("errors", value, 100.0 + t * 10)
+        ctx = EvaluationContext(store, 130.0)
+        assert compile_rule("avg(errors[1m]) == 15").evaluate(ctx) is True
+        assert compile_rule("rate(errors[1m]) == 1").evaluate(ctx) is True
+        assert compile_rule("max(errors[15s]) == 30").evaluate(ctx) is True
+        assert compile_rule("count(errors[15s]) == 2").evaluate(ctx) is True
+
+
+@pytest.mark.unit
+class TestAlertEvaluation:
+    """Alert state machine driven by compiled rules"""
+
+    def test_legacy_threshold_alert_triggers_and_clears(self) -> None:
+        system = make_system()
+        system.register_alert(Alert(
+            name="CPU", metric="cpu_percent", threshold=90,
+            severity=AlertSeverity.WARNING, message="cpu", comparison=">=",
+            cooldown_seconds=0
+        ))
+        events = []
+        system.subscribe(None, events.append)
+
+        system.check_alerts({"cpu_percent": 95})
+        assert [a['name'] for a in system.get_active_alerts()] == ["CPU"]
+        assert len(events) == 1
+
+        system.check_alerts({"cpu_percent": 50})
+        assert system.get_active_alerts() == []
+        assert system.get_stats()['total_alerts_cleared'] == 1
+
+    def test_only_indexed_rules_are_evaluated(self) -> None:
+        system = make_system()
+        for i in range(50):
+            system.register_alert(Alert(
+                name=f"mem-{i}", metric="memory", threshold=1000 + i,
+                severity=AlertSeverity.INFO, message="mem"
+            ))
+        system.register_alert(Alert(
+            name="cpu", metric="cpu_percent", threshold=90,
+            severity=AlertSeverity.INFO, message="cpu"
+        ))
+        assert system.record_metrics({"cpu_percent": 10}) is None
+        assert system.evaluate() == 1
+
+    def test_for_duration_requires_persistence(self) -> None:
+        system = make_system()
+        system.register_alert(Alert.from_rule(
+            "Sustained CPU", "cpu_percent > 90 for 30s",
+            AlertSeverity.CRITICAL, "cpu sustained", cooldown_seconds=0
+        ))
+        system.record_metrics({"cpu_percent": 95}, timestamp=1000.0)
+        system.evaluate(now=1000.0)
+        alert = system.alerts[0]
+        assert alert.status == AlertStatus.PENDING
+        assert not alert.triggered
+
+        # No new samples: the pending rule is still re-checked on each pass
+        system.evaluate(now=1031.0)
+        assert alert.triggered
+        assert alert.status == AlertStatus.ACTIVE
+
+    def test_pending_resets_when_condition_drops(self) -> None:
+        system = make_system()
+        system.register_alert(Alert.from_rule(
+            "Flappy", "cpu_percent > 90 for 30s", AlertSeverity.WARNING, "flap"
+        ))
+        system.record_metrics({"cpu_percent": 95}, timestamp=0.0)
+        system.evaluate(now=0.0)
+        system.record_metrics({"cpu_percent": 10}, timestamp=10.0)
+        system.evaluate(now=10.0)
+        system.record_metrics({"cpu_percent": 95}, timestamp=20.0)
+        system.evaluate(now=40.0)
+        assert not system.alerts[0].triggered
+
+    def test_hysteresis_clear_threshold(self) -> None:
+        system = make_system()
+        system.register_alert(Alert(
+            name="GPU", metric="gpu", threshold=90, severity=AlertSeverity.WARNING,
+            message="gpu", comparison=">", clear_threshold=80, cooldown_seconds=0
+        ))
+        system.check_alerts({"gpu": 95})
+        system.check_alerts({"gpu": 85})
+        assert system.alerts[0].triggered
+        system.check_alerts({"gpu": 75})
+        assert not system.alerts[0].triggered
+
+    def test_compound_rule(self) -> None:
+        system = make_system()
+        system.register_alert(Alert.from_rule(
+            "Overload", "cpu_percent > 90 and response_time_ms > 1000",
+            AlertSeverity.CRITICAL, "overload", cooldown_seconds=0
+        ))
+        system.check_alerts({"cpu_percent": 95, "response_time_ms": 200})
+        assert not system.alerts[0].triggered
+        system.check_alerts({"response_time_ms": 2000})
+        assert system.alerts[0].triggered
+
+    def test_subscriber_may_query_system(self) -> None:
+        system = make_system()
+        system.register_alert(Alert(
+            name="CPU", metric="cpu_percent", threshold=90,
+            severity=AlertSeverity.WARNING, message="cpu"
+        ))
+        seen = []
+        system.subscribe(AlertSeverity.WARNING, lambda event: seen.append(system.get_stats()))
+        system.check_alerts({"cpu_percent": 99})
+        assert seen and seen[0]['active_alerts'] == 1
+
+    def test_deregister_removes_from_index(self) -> None:
+        system = make_system()
+        system.register_alert(Alert(
+            name="CPU", metric="cpu_percent", threshold=90,
+            severity=AlertSeverity.WARNING, message="cpu"
+        ))
+        assert system.deregister_alert("CPU") is True
+        system.record_metrics({"cpu_percent": 99})
+        assert system.evaluate() == 0
+
+    def test_scheduler_evaluates_off_request_path(self) -> None:
+        system = make_system()
+        system.register_alert(Alert(
+            name="CPU", metric="cpu_percent", threshold=90,
+            severity=AlertSeverity.WARNING, message="cpu"
+        ))
+        system.start_scheduler(interval_seconds=0.01)
+        try:
+            system.check_alerts({"cpu_percent": 99})
+            for _ in range(200):
+                if system.alerts[0].triggered:
+                    break
+                time.sleep(0.01)
+            assert system.alerts[0].triggered
+        finally:
+            system.stop_scheduler()
+        assert not system.is_scheduler_running()
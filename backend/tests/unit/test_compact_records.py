@@ -0,0 +1,107 @@
+"""
++==============================================================================
+|              ORFEAS Testing Suite - Compact Record Tests                     |
+|    Slotted hot-path dataclasses, columnar metrics history, bounded stores    |
++==============================================================================
+"""
+import sys
+import time
+from dataclasses import asdict
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+backend_path = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(backend_path))
+sys.path.insert(0, str(backend_path.parent))
+
+import cache_manager
+import distributed_cache_manager
+from agent_communication import AgentMessage, MessageType
+from backend.llm_integration.tracing import PerformanceMetric, PerformanceTracer
+from continuous_quality_monitor import MetricsRing, QualityMetrics, QUALITY_METRIC_FIELDS
+from distributed_tracing import DistributedTracingSystem, Span, Trace
+from progress_tracker import JobProgress, StageInfo
+
+
+def quality_metrics(value: float) -> QualityMetrics:
+    return QualityMetrics(*[value + i for i in range(len(QUALITY_METRIC_FIELDS))])
+
+
+@pytest.mark.unit
+class TestSlottedRecords:
+    """Per-request records carry no instance __dict__"""
+
+    @pytest.mark.parametrize('record', [
+        lambda: AgentMessage(id=None, type=MessageType.STATUS_UPDATE, sender_id='a', recipient_id=None, payload={}),
+        lambda: cache_manager.CacheEntry(value=1, timestamp=time.time()),
+        lambda: distributed_cache_manager.CacheEntry(value=1, expires_at=datetime.now(), created_at=datetime.now()),
+        lambda: Span(span_id='s', trace_id='t', parent_span_id=None, operation_name='op', service='svc'),
+        lambda: Trace(trace_id='t', root_span_id='s', start_time=time.time()),
+        lambda: StageInfo(name='shape', weight=0.7, estimated_duration=60.0),
+        lambda: JobProgress(job_id='job', started_at=datetime.now()),
+        lambda: PerformanceMetric(name='op', component='c', duration_ms=1.0, timestamp=datetime.now()),
+        lambda: quality_metrics(0.5),
+    ])
+    def test_no_instance_dict(self, record):
+        instance = record()
+        assert not hasattr(instance, '__dict__')
+        with pytest.raises(AttributeError):
+            instance.unexpected_attribute = 1
+        assert asdict(instance)
+
+    def test_post_init_and_defaults_still_apply(self):
+        message = AgentMessage(id=None, type=MessageType.STATUS_UPDATE, sender_id='a', recipient_id=None, payload={})
+        assert message.id and message.expires_at > message.timestamp
+        first, second = JobProgress('a', datetime.now()), JobProgress('b', datetime.now())
+        first.stages['shape'] = StageInfo('shape', 0.7, 60.0)
+        assert second.stages == {}
+
+
+@pytest.mark.unit
+class TestMetricsRing:
+    """Columnar history behaves like deque(maxlen=...)"""
+
+    def test_append_index_and_wrap(self):
+        ring = MetricsRing(maxlen=3)
+        assert len(ring) == 0 and list(ring) == []
+        for value in range(5):
+            ring.append(quality_metrics(float(value)))
+        assert len(ring) == 3
+        assert [m.timestamp for m in ring] == [2.0, 3.0, 4.0]
+        assert ring[-1] == quality_metrics(4.0) and ring[0] == quality_metrics(2.0)
+        with pytest.raises(IndexError):
+            ring[3]
+
+    def test_column_in_chronological_order(self):
+        ring = MetricsRing(maxlen=4)
+        for value in range(6):
+            ring.append(quality_metrics(float(value)))
+        assert ring.column('timestamp') == [2.0, 3.0, 4.0, 5.0]
+        assert ring.column('performance_score') == [4.0, 5.0, 6.0, 7.0]
+        ring.clear()
+        assert len(ring) == 0 and ring.column('timestamp') == []
+
+
+@pytest.mark.unit
+class TestBoundedStores:
+    """Retention windows are ring buffers"""
+
+    def test_performance_tracer_keeps_newest(self):
+        tracer = PerformanceTracer(max_metrics=3)
+        for value in range(5):
+            tracer.record_metric(PerformanceMetric('op', 'c', float(value), datetime.now()))
+        assert len(tracer.metrics) == 3
+        assert [m.duration_ms for m in tracer.get_recent_metrics(2)] == [3.0, 4.0]
+        assert tracer.stats['c:op'].count == 5
+
+    def test_completed_traces_keep_newest(self):
+        tracing = DistributedTracingSystem(max_traces=3)
+        trace_ids = []
+        for _ in range(5):
+            trace_ids.append(tracing.start_trace('request'))
+            tracing.end_trace()
+        assert len(tracing.completed_traces) == 3
+        assert [t['trace_id'] for t in tracing.get_completed_traces(2)] == trace_ids[-2:]
+        assert tracing.get_trace(trace_ids[0]) is None
@@ -0,0 +1,226 @@
+"""
++==============================================================================
+|            ORFEAS Testing Suite - Intelligent Context Manager Tests          |
+|     Background batched writer, context vectors, similarity, trend queries    |
++==============================================================================
+"""
+import gc
+import json
+import sqlite3
+import sys
+import threading
+import time
+from dataclasses import asdict
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+backend_path = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(backend_path))
+
+from context_manager import (
+    CONTEXT_FEATURE_DIM,
+    ContextIndex,
+    ContextWriter,
+    IntelligentContextManager,
+    ProcessingContext,
+    context_vector,
+)
+
+
+def make_context(input_type='image', complexity=0.7, quality=7, priority='balanced', load=0.6,
+                 context_hash=None):
+    return ProcessingContext(
+        input_analysis={'input_type': input_type, 'complexity_score': complexity,
+                        'processing_priority': 'normal'},
+        user_context={'type': 'anonymous'},
+        system_context={'current_load': load, 'queue_length': 2},
+        historical_context={},
+        resource_context={'cpu_usage': 40.0, 'memory_usage': 50.0, 'gpu_available': True,
+                          'gpu_memory_free': 8000},
+        quality_context={'target_quality': quality, 'quality_priority': priority},
+        timestamp='2025-01-01T00:00:00',
+        context_hash=context_hash or f'{input_type}-{complexity}-{quality}-{priority}-{load}'
+    )
+
+
+@pytest.fixture
+def manager(tmp_path, monkeypatch):
+    monkeypatch.setenv('CONTEXT_DB_PATH', str(tmp_path / 'context.db'))
+    manager = IntelligentContextManager()
+    yield manager
+    manager.close()
+
+
+def rows(path, sql='SELECT COUNT(*) FROM context_history'):
+    conn = sqlite3.connect(path)
+    try:
+        return conn.execute(sql).fetchall()
+    finally:
+        conn.close()
+
+
+@pytest.mark.unit
+class TestContextVector:
+    """Numeric features of a ProcessingContext"""
+
+    def test_shape_and_range(self):
+        vector = context_vector(make_context())
+        assert vector.shape == (CONTEXT_FEATURE_DIM,)
+        assert vector.min() >= 0.0 and vector.max() <= 1.0
+
+    def test_missing_and_bad_values(self):
+        context = ProcessingContext({'complexity_score': 'n/a'}, {}, {}, {}, {}, {}, '', 'h')
+        assert not context_vector(context).any()
+
+
+@pytest.mark.unit
+class TestContextIndex:
+    """Exact nearest-neighbour search"""
+
+    def test_ranks_by_similarity(self):
+        index = ContextIndex(capacity=8)
+        now = time.time()
+        for name, complexity in (('far', 0.0), ('near', 0.65), ('same', 0.7)):
+            index.add(context_vector(make_context(complexity=complexity)), name, now, True, 1.0, 0.9)
+        index.add(context_vector(make_context('text')), 'other-type', now, True, 1.0, 0.9)
+        hits = index.search(context_vector(make_context()), k=3, threshold=0.8)
+        assert [h['context_hash'] for h in hits] == ['same', 'near', 'far']
+        assert hits[0]['similarity'] == pytest.approx(1.0)
+
+    def test_ring_and_time_window(self):
+        index = ContextIndex(capacity=2)
+        vector = context_vector(make_context())
+        index.add(vector, 'evicted', time.time(), True, 1.0, 0.9)
+        index.add(vector, 'old', time.time() - 100, True, 1.0, 0.9)
+        index.add(vector, 'new', time.time(), True, 1.0, 0.9)
+        assert index.vector_for('evicted') is None
+        hits = index.search(vector, k=5, since=time.time() - 10)
+        assert [h['context_hash'] for h in hits] == ['new']
+
+
+@pytest.mark.unit
+class TestContextWriter:
+    """Batched background inserts"""
+
+    def test_batches_under_load(self, manager):
+        path = manager.db_path
+        gate = threading.Event()
+        committed = []
+
+        def prepare(i):
+            gate.wait()
+            return ('s', time.time(), '{}', f'h{i}', True, 1.0, 0.9, 'm', '{}', None)
+
+        writer = ContextWriter(path, prepare, on_commit=committed.extend, batch_size=50)
+        for i in range(200):
+            assert writer.submit(i)
+        gate.set()
+        assert writer.flush()
+        assert rows(path) == [(200,)]
+        assert sorted(committed) == list(range(200))
+        assert writer.stats['batches'] < 10
+        writer.close()
+        assert not writer.submit(1)
+
+    def test_full_queue_drops_instead_of_blocking(self, tmp_path):
+        gate = threading.Event()
+        writer = ContextWriter(str(tmp_path / 'unused.db'), lambda item: gate.wait(), max_queue=2)
+        results = [writer.submit(i) for i in range(10)]
+        assert results.count(False) >= 7 and writer.stats['dropped'] == results.count(False)
+        gate.set()
+        writer.close()
+
+
+@pytest.mark.unit
+class TestIntelligentContextManager:
+    """Persistence, similarity and aggregates through the manager"""
+
+    def test_persist_is_asynchronous_and_wal(self, manager):
+        context = make_context()
+        assert manager.persist_context('s1', context, {'success': True, 'processing_time': 12.0,
+                                                       'quality_score': 0.9, 'model_used': 'hunyuan3d'})
+        assert manager.flush()
+        assert rows(manager.db_path) == [(1,)]
+        assert rows(manager.db_path, 'PRAGMA journal_mode') == [('wal',)]
+        blob = rows(manager.db_path, 'SELECT context_vector FROM context_history')[0][0]
+        assert np.array_equal(np.frombuffer(blob, dtype=np.float32), context_vector(context))
+
+    def test_similar_contexts(self, manager):
+        for i in range(5):
+            manager.persist_context(f's{i}', make_context(complexity=0.7), {'success': i != 0, 'processing_time': 10.0})
+        manager.persist_context('t', make_context('text', complexity=0.4), {'success': True, 'processing_time': 2.0})
+        manager.flush()
+
+        similar = manager.find_similar_contexts(make_context(complexity=0.72))
+        assert len(similar) == 5 and all(c['processing_time'] == 10.0 for c in similar)
+        by_hash = manager.find_similar_contexts(make_context().context_hash)
+        assert len(by_hash) == 5
+
+        insights = manager.get_contextual_insights(make_context())
+        assert insights['similar_contexts_count'] == 5
+        assert insights['success_probability'] == pytest.approx(0.8)
+        assert insights['estimated_processing_time'] == pytest.approx(10.0)
+
+    def test_index_survives_restart_and_migrates_old_schema(self, tmp_path, monkeypatch):
+        path = tmp_path / 'context.db'
+        conn = sqlite3.connect(path)
+        conn.execute("""CREATE TABLE context_history (id INTEGER PRIMARY KEY AUTOINCREMENT,
+            session_id TEXT NOT NULL, timestamp REAL NOT NULL, context_data TEXT NOT NULL,
+            context_hash TEXT NOT NULL, success BOOLEAN NOT NULL, processing_time REAL,
+            quality_score REAL, model_used TEXT, resource_usage TEXT)""")
+        conn.execute("INSERT INTO context_history (session_id, timestamp, context_data, context_hash, success,"
+                     " processing_time, quality_score, model_used, resource_usage) VALUES (?,?,?,?,?,?,?,?,?)",
+                     ('old', time.time(), json.dumps(asdict(make_context(context_hash='legacy'))), 'legacy',
+                      True, 5.0, 0.8, 'm', '{}'))
+        conn.commit()
+        conn.close()
+
+        monkeypatch.setenv('CONTEXT_DB_PATH', str(path))
+        manager = IntelligentContextManager()
+        manager.persist_context('new', make_context(context_hash='fresh'), {'success': True})
+        manager.close()
+
+        reopened = IntelligentContextManager()
+        try:
+            hashes = {c['context_hash'] for c in reopened.find_similar_contexts(make_context())}
+            assert hashes == {'legacy', 'fresh'}
+        finally:
+            reopened.close()
+
+    def test_performance_trends(self, manager):
+        now = time.time()
+        conn = manager._reader()
+        for age_days, processing_time, quality, success in ((6, 20.0, 0.70, 0), (5, 20.0, 0.70, 1),
+                                                            (1, 10.0, 0.90, 1), (0.5, 10.0, 0.90, 1)):
+            conn.execute("INSERT INTO context_history (session_id, timestamp, context_data, context_hash, success,"
+                         " processing_time, quality_score, model_used) VALUES ('s', ?, '{}', 'h', ?, ?, ?, 'm')",
+                         (now - age_days * 86400, success, processing_time, quality))
+        trends = manager.analyze_performance_trends()
+        assert trends['quality_trend'] == 'improving'
+        assert trends['performance_trend'] == 'improving'
+        assert trends['error_rate_trend'] == 'decreasing'
+        assert sum(day['count'] for day in trends['daily']) == 4
+
+    def test_trends_without_data(self, manager):
+        trends = manager.analyze_performance_trends()
+        assert trends['quality_trend'] == trends['performance_trend'] == trends['error_rate_trend'] == 'stable'
+
+    def test_historical_performance_is_cached(self, manager):
+        first = manager.get_historical_performance()
+        manager.persist_context('s', make_context(), {'success': True, 'model_used': 'm', 'processing_time': 1.0})
+        manager.flush()
+        assert manager.get_historical_performance() is first
+        manager.stats_ttl = 0
+        assert 'm' in manager.get_historical_performance()['model_performance']
+
+    def test_manager_is_collectable(self, tmp_path, monkeypatch):
+        monkeypatch.setenv('CONTEXT_DB_PATH', str(tmp_path / 'context.db'))
+        manager = IntelligentContextManager()
+        manager.persist_context('s', make_context(), None)
+        writer = manager.writer
+        del manager
+        gc.collect()
+        assert writer._closed
+        assert rows(str(tmp_path / 'context.db')) == [(1,)]
@@ -0,0 +1,212 @@
+"""
++==============================================================================
+|            ORFEAS Testing Suite - Continuous Quality Monitor Tests           |
+|   Sliding-window aggregates, online trends, rate-limited remediation, loop   |
++==============================================================================
+"""
+import math
+import random
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+backend_path = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(backend_path))
+
+from continuous_quality_monitor import (
+    ContinuousQualityMonitor,
+    OnlineTrend,
+    RemediationExecutor,
+    SlidingWindow,
+)
+
+
+def legacy_slope(values):
+    n = len(values)
+    x_sum = sum(range(n))
+    xy_sum = sum(i * v for i, v in enumerate(values))
+    x_squared_sum = sum(i * i for i in range(n))
+    return (n * xy_sum - x_sum * sum(values)) / (n * x_squared_sum - x_sum * x_sum)
+
+
+@pytest.mark.unit
+class TestSlidingWindow:
+    """Running totals per horizon"""
+
+    def test_matches_brute_force(self):
+        rng = random.Random(7)
+        window = SlidingWindow((60, 300), fields=2, bucket_seconds=10)
+        events, now = [], 1_000_000.0
+        for i in range(5000):
+            now += rng.expovariate(2.0) if i % 1000 else 400
+            value = rng.random()
+            window.add(now, 1.0, value)
+            events.append((now, value))
+            if i % 250 == 0:
+                for horizon in (60, 300):
+                    oldest = int(now // 10) - horizon // 10 + 1
+                    expected = [v for t, v in events if int(t // 10) >= oldest]
+                    count, total = window.read(horizon, now=now)
+                    assert count == pytest.approx(len(expected))
+                    assert total == pytest.approx(sum(expected))
+
+    def test_expires_everything_after_long_gap(self):
+        window = SlidingWindow((60,), fields=1)
+        window.add(1000.0, 5.0)
+        assert window.read(60, now=1000.0) == [5.0]
+        assert window.read(60, now=5000.0) == [0.0]
+        window.add(5001.0, 1.0)
+        assert window.read(60, now=5001.0) == [1.0]
+
+
+@pytest.mark.unit
+class TestOnlineTrend:
+    """O(1) regression equals the full recomputation"""
+
+    def test_matches_full_regression(self):
+        trend, values = OnlineTrend(size=100), []
+        for i in range(750):
+            value = 0.7 + 0.2 * math.sin(i / 25) + (i % 7) * 0.01
+            trend.push(value)
+            values.append(value)
+            if len(values) >= 10:
+                slope = legacy_slope(values[-100:])
+                assert trend.result()['rate'] == pytest.approx(abs(slope), abs=1e-9)
+
+    def test_direction_and_short_history(self):
+        trend = OnlineTrend()
+        assert trend.result() == {'direction': 'stable', 'rate': 0.0, 'prediction': 0.8}
+        for i in range(20):
+            trend.push(0.9 - i * 0.01)
+        result = trend.result()
+        assert result['direction'] == 'declining'
+        assert result['prediction'] == pytest.approx(0.7)
+
+
+@pytest.mark.unit
+class TestRemediationExecutor:
+    """Actions run off-thread with cooldowns and a rate limit"""
+
+    def test_cooldown_dedup_and_rate_limit(self):
+        clock = [0.0]
+        ran = []
+        executor = RemediationExecutor(lambda action, issue: ran.append((action['type'], threading.current_thread().name)),
+                                       cooldown=60, per_minute=2, clock=lambda: clock[0])
+        assert executor.submit({'type': 'clear_caches'}, {}) == RemediationExecutor.QUEUED
+        assert executor.wait_idle(5)
+        assert executor.submit({'type': 'clear_caches'}, {}) == RemediationExecutor.COOLDOWN
+        assert executor.submit({'type': 'enable_fast_mode'}, {}) == RemediationExecutor.QUEUED
+        assert executor.submit({'type': 'restart_failed_services'}, {}) == RemediationExecutor.RATE_LIMITED
+        clock[0] = 61.0
+        assert executor.submit({'type': 'clear_caches'}, {}) == RemediationExecutor.QUEUED
+        assert executor.wait_idle(5)
+        executor.close()
+        assert [name for name, _ in ran] == ['clear_caches', 'enable_fast_mode', 'clear_caches']
+        assert {thread for _, thread in ran} == {'QualityRemediation'}
+
+    def test_pending_action_is_not_queued_twice(self):
+        release = threading.Event()
+        executor = RemediationExecutor(lambda action, issue: release.wait(5), cooldown=0, per_minute=100)
+        assert executor.submit({'type': 'clear_caches'}, {}) == RemediationExecutor.QUEUED
+        assert executor.submit({'type': 'clear_caches'}, {}) == RemediationExecutor.PENDING
+        release.set()
+        assert executor.wait_idle(5)
+        assert executor.submit({'type': 'clear_caches'}, {}) == RemediationExecutor.QUEUED
+        executor.close()
+
+    def test_failing_action_is_counted(self):
+        def boom(action, issue):
+            raise RuntimeError('nope')
+
+        executor = RemediationExecutor(boom, cooldown=0, per_minute=100)
+        executor.submit({'type': 'clear_caches'}, {})
+        assert executor.wait_idle(5)
+        executor.close()
+        assert executor.stats['failed'] == 1 and not executor.pending
+
+
+@pytest.mark.unit
+class TestContinuousQualityMonitor:
+    """Scores come from recorded events; remediation never runs inline"""
+
+    def test_scores_from_events(self):
+        monitor = ContinuousQualityMonitor()
+        metrics = monitor.collect_real_time_metrics()
+        assert metrics.performance_score == 0.8 and metrics.reliability_score == 0.95
+        assert metrics.throughput == 0.0
+
+        for _ in range(8):
+            monitor.record_request(20.0)
+        for _ in range(2):
+            monitor.record_request(40.0, success=False)
+        monitor.record_security_event('critical')
+        monitor.record_security_event('medium')
+        monitor.record_user_feedback(4.0)
+        monitor.record_user_feedback(3.0)
+
+        metrics = monitor.collect_real_time_metrics()
+        assert metrics.processing_time == pytest.approx(24.0)
+        assert metrics.performance_score == pytest.approx(0.8 + 0.2 * 6 / 20)
+        assert metrics.error_rate == pytest.approx(0.2)
+        assert metrics.reliability_score == pytest.approx(0.8)
+        assert metrics.security_score == pytest.approx(0.83)
+        assert metrics.user_satisfaction_score == pytest.approx(0.7)
+        assert metrics.throughput == pytest.approx(10 / 60)
+
+    def test_remediation_is_rate_limited_and_off_thread(self, monkeypatch):
+        monitor = ContinuousQualityMonitor(remediation_cooldown=3600, remediation_per_minute=100)
+        calls = []
+        monkeypatch.setattr(monitor, 'clear_system_caches',
+                            lambda: calls.append(threading.current_thread().name))
+        for _ in range(5):
+            monitor.record_request(90.0)
+
+        first = monitor.evaluate_quality()
+        assert first.performance_score < 0.6
+        monitor.remediation.wait_idle(5)
+        monitor.evaluate_quality()
+        monitor.remediation.wait_idle(5)
+        monitor.stop_monitoring()
+
+        assert calls == ['QualityRemediation']
+        assert monitor.get_monitoring_stats()['remediation']['cooldown'] > 0
+
+    def test_trends_follow_history(self):
+        monitor = ContinuousQualityMonitor()
+        now = time.time()
+        for i in range(30):
+            monitor.record_request(5.0 + i * 2, timestamp=now)
+            monitor.collect_real_time_metrics()
+        trends = monitor.analyze_quality_trends(monitor.metrics_history[-1])
+        assert trends['performance_score']['direction'] == 'declining'
+        assert trends['security_score']['direction'] == 'stable'
+
+    def test_pipeline_applies_events_and_evaluates(self):
+        monitor = ContinuousQualityMonitor(evaluation_interval=0.05)
+        monitor.start_real_time_monitoring()
+        try:
+            for _ in range(500):
+                monitor.record_request(1.0, success=True)
+            deadline = time.time() + 5
+            while time.time() < deadline and (monitor.pipeline_stats['events_processed'] < 500
+                                              or monitor.pipeline_stats['evaluations'] < 2):
+                time.sleep(0.01)
+        finally:
+            monitor.stop_monitoring()
+        stats = monitor.get_monitoring_stats()
+        assert stats['events_processed'] == 500 and stats['events_dropped'] == 0
+        assert stats['evaluations'] >= 2
+        assert monitor.get_recent_error_data(minutes=5) == {'total': 500, 'failed': 0}
+        assert not monitor.monitoring_thread.is_alive()
+
+    def test_full_queue_drops_events(self):
+        monitor = ContinuousQualityMonitor(queue_size=3)
+        monitor.monitoring_active = True  # pipeline "running" but not draining
+        for _ in range(5):
+            monitor.record_request(1.0)
+        monitor.monitoring_active = False
+        assert monitor.pipeline_stats['events_dropped'] == 2
+        assert monitor.process_pending_events() == 3
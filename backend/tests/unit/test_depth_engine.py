@@ -0,0 +1,118 @@
+"""
++==============================================================================
+|               ORFEAS Testing Suite - Depth Engine Tests                      |
+|        Pyramid cues, local-variance texture, Canny and depth memo            |
++==============================================================================
+"""
+import pytest
+import numpy as np
+from pathlib import Path
+import sys
+
+backend_path = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(backend_path))
+
+from depth_engine import (
+    DepthEngine,
+    canny,
+    local_variance,
+    resize,
+    to_gray,
+)
+
+
+def scene(height: int = 240, width: int = 320) -> np.ndarray:
+    """Bright square on a textured gradient (uint8 RGB)"""
+    rng = np.random.default_rng(0)
+    image = np.tile(np.linspace(30, 120, width, dtype=np.float32), (height, 1))
+    image += rng.normal(0, 4, (height, width))
+    image[height // 4:3 * height // 4, width // 4:3 * width // 4] = 220
+    return np.repeat(np.clip(image, 0, 255).astype(np.uint8)[:, :, None], 3, axis=2)
+
+
+@pytest.fixture
+def engine(tmp_path):
+    eng = DepthEngine(max_side=128, cache_dir=tmp_path / 'depth')
+    yield eng
+    eng.shutdown()
+
+
+@pytest.mark.unit
+class TestCues:
+    """Individual cue implementations"""
+
+    def test_to_gray_accepts_unit_floats(self):
+        image = scene()
+        np.testing.assert_allclose(to_gray(image.astype(np.float32) / 255.0), to_gray(image), atol=1e-3)
+
+    def test_local_variance_matches_brute_force(self):
+        rng = np.random.default_rng(1)
+        gray = rng.uniform(0, 255, (20, 20)).astype(np.float32)
+        variance = local_variance(gray, window=3)
+        for y, x in ((5, 5), (10, 14), (17, 3)):
+            assert variance[y, x] == pytest.approx(gray[y - 1:y + 2, x - 1:x + 2].var(), rel=1e-3)
+
+    def test_canny_finds_square_outline(self):
+        gray = np.zeros((64, 64), dtype=np.float32)
+        gray[16:48, 16:48] = 255
+        edges = canny(gray)
+        assert edges[16:48, 14:18].any(axis=1).all()  # left side traced on every row
+        assert not edges[28:36, 28:36].any()           # flat interior
+        assert not edges[:8, :8].any()                 # flat background
+
+    def test_resize_round_trip(self):
+        gray = to_gray(scene())
+        small = resize(gray, (120, 160))
+        assert small.shape == (120, 160)
+        assert abs(float(small.mean()) - float(gray.mean())) < 1.0
+        assert resize(small, (240, 320)).shape == (240, 320)
+
+
+@pytest.mark.unit
+class TestDepthEngine:
+    """Full estimator and memoization"""
+
+    def test_depth_range_and_shape(self, engine):
+        depth = engine.estimate(scene())
+        assert depth.shape == (240, 320) and depth.dtype == np.float32
+        assert depth.min() == pytest.approx(0.0) and depth.max() == pytest.approx(1.0)
+        assert np.isfinite(depth).all()
+        # The bright square stands out from the background
+        assert depth[110:130, 150:170].mean() > depth[5:25, 5:25].mean()
+
+    def test_flat_image(self, engine):
+        depth = engine.estimate(np.full((50, 50, 3), 128, dtype=np.uint8))
+        assert not depth.any()
+
+    def test_working_shape(self, engine):
+        assert engine.working_shape((1000, 2000)) == (64, 128)
+        assert engine.working_shape((50, 40)) == (50, 40)
+
+    def test_memo_hit_skips_estimation(self, engine):
+        image = scene()
+        first, hit = engine.estimate_cached(image, 'a' * 64, 'v')
+        assert not hit
+        second, hit = engine.estimate_cached(np.zeros_like(image), 'a' * 64, 'v')
+        assert hit
+        np.testing.assert_allclose(second, first, atol=1e-3)  # float16 on disk
+        assert not second.flags.writeable
+
+    def test_memo_persists_on_disk(self, engine, tmp_path):
+        image = scene()
+        engine.estimate_cached(image, 'b' * 64)
+        other = DepthEngine(max_side=128, cache_dir=tmp_path / 'depth')
+        try:
+            depth, hit = other.estimate_cached(image, 'b' * 64)
+            assert hit
+            stored = list((tmp_path / 'depth').rglob('*.npy'))
+            assert len(stored) == 1 and np.load(stored[0]).dtype == np.float16
+        finally:
+            other.shutdown()
+
+    def test_memo_key_covers_variant_and_settings(self, engine):
+        assert engine.cache_key('c' * 64, 'x') != engine.cache_key('c' * 64, 'y')
+        other = DepthEngine(max_side=256)
+        try:
+            assert other.cache_key('c' * 64) != engine.cache_key('c' * 64)
+        finally:
+            other.shutdown()
@@ -0,0 +1,221 @@
+"""
++==============================================================================
+|               ORFEAS Testing Suite - Download Service Tests                 |
+|     Range/resume, ETag revalidation, precompressed variants, paged base64   |
++==============================================================================
+"""
+import pytest
+import base64
+import gzip
+import os
+from pathlib import Path
+import sys
+
+backend_path = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(backend_path))
+
+flask = pytest.importorskip("flask")
+
+import download_service
+from download_service import (
+    content_hash,
+    precompress_artifact,
+    read_base64_page,
+    record_content_hash,
+    resolve_artifact,
+    select_variant,
+    send_artifact,
+)
+
+
+@pytest.fixture
+def outputs(tmp_path):
+    job_dir = tmp_path / 'job-1'
+    job_dir.mkdir()
+    # ASCII STL-like content compresses well
+    (job_dir / 'model.stl').write_bytes(b"facet normal 0 0 1\n outer loop\n vertex 0 0 0\n" * 2000)
+    return tmp_path
+
+
+@pytest.fixture
+def client(outputs, monkeypatch):
+    monkeypatch.delenv('DOWNLOAD_X_ACCEL_PREFIX', raising=False)
+    app = flask.Flask(__name__)
+
+    @app.route('/api/download/<job_id>/<filename>')
+    def download(job_id, filename):
+        path = resolve_artifact(outputs, job_id, filename)
+        if path is None:
+            return flask.jsonify({'error': 'File not found'}), 404
+        return send_artifact(flask.request, path, filename, 'model/stl', f"{job_id}/{filename}")
+
+    return app.test_client()
+
+
+@pytest.mark.unit
+class TestResolveArtifact:
+    """Path validation"""
+
+    def test_resolves_file_in_job_dir(self, outputs):
+        assert resolve_artifact(outputs, 'job-1', 'model.stl') == (outputs / 'job-1' / 'model.stl').resolve()
+
+    def test_rejects_traversal_and_missing(self, outputs):
+        (outputs / 'job-10').mkdir()
+        (outputs / 'job-10' / 'secret.stl').write_bytes(b'x')
+        assert resolve_artifact(outputs, 'job-1', '../job-10/secret.stl') is None
+        assert resolve_artifact(outputs, 'job-1', 'missing.stl') is None
+
+    def test_hides_sidecars(self, outputs):
+        precompress_artifact(outputs / 'job-1' / 'model.stl')
+        assert resolve_artifact(outputs, 'job-1', 'model.stl.gz') is None
+        assert resolve_artifact(outputs, 'job-1', 'model.stl.sha256') is None
+
+
+@pytest.mark.unit
+class TestContentHash:
+    """Hash caching"""
+
+    def test_hash_persisted_in_sidecar(self, outputs, monkeypatch):
+        path = outputs / 'job-1' / 'model.stl'
+        digest = content_hash(path)
+        assert (outputs / 'job-1' / 'model.stl.sha256').exists()
+
+        download_service._etag_cache.clear()
+        monkeypatch.setattr(download_service, '_hash_file', lambda p: pytest.fail("file re-hashed"))
+        assert content_hash(path) == digest
+
+    def test_hash_changes_with_content(self, outputs):
+        path = outputs / 'job-1' / 'model.stl'
+        before = content_hash(path)
+        path.write_bytes(b'different')
+        os.utime(path, ns=(path.stat().st_atime_ns, path.stat().st_mtime_ns + 1_000_000))
+        assert content_hash(path) != before
+
+    def test_recorded_hash_is_reused(self, outputs, monkeypatch):
+        path = outputs / 'job-1' / 'model.stl'
+        record_content_hash(path, 'ab' * 32)
+        download_service._etag_cache.clear()
+        monkeypatch.setattr(download_service, '_hash_file', lambda p: pytest.fail("file re-hashed"))
+        assert content_hash(path) == 'ab' * 32
+
+
+@pytest.mark.unit
+class TestPrecompression:
+    """Variant generation and negotiation"""
+
+    def test_gzip_variant_round_trips(self, outputs):
+        path = outputs / 'job-1' / 'model.stl'
+        kept = precompress_artifact(path)
+        assert 'gzip' in kept
+        assert gzip.decompress((outputs / 'job-1' / 'model.stl.gz').read_bytes()) == path.read_bytes()
+
+    def test_incompressible_files_are_skipped(self, outputs):
+        path = outputs / 'job-1' / 'noise.bin'
+        path.write_bytes(os.urandom(64 * 1024))
+        assert precompress_artifact(path) == {}
+        assert not (outputs / 'job-1' / 'noise.bin.gz').exists()
+
+    def test_select_variant(self, outputs):
+        path = outputs / 'job-1' / 'model.stl'
+        assert select_variant(path, 'gzip') == (path, None)
+        precompress_artifact(path)
+        assert select_variant(path, 'gzip, deflate')[1] == 'gzip'
+        assert select_variant(path, 'gzip;q=0') == (path, None)
+        assert select_variant(path, None) == (path, None)
+        assert select_variant(path, 'gzip', has_range=True) == (path, None)
+
+
+@pytest.mark.unit
+class TestDownloadResponses:
+    """HTTP semantics through a Flask app"""
+
+    def test_full_download_with_etag(self, client, outputs):
+        response = client.get('/api/download/job-1/model.stl')
+        assert response.status_code == 200
+        assert response.data == (outputs / 'job-1' / 'model.stl').read_bytes()
+        assert response.headers['ETag']
+        assert response.headers['Accept-Ranges'] == 'bytes'
+        assert 'attachment' in response.headers['Content-Disposition']
+        assert 'no-cache' in response.headers['Cache-Control']
+
+    def test_if_none_match_returns_304(self, client):
+        etag = client.get('/api/download/job-1/model.stl').headers['ETag']
+        response = client.get('/api/download/job-1/model.stl', headers={'If-None-Match': etag})
+        assert response.status_code == 304
+        assert response.data == b''
+
+    def test_range_resume(self, client, outputs):
+        data = (outputs / 'job-1' / 'model.stl').read_bytes()
+        response = client.get('/api/download/job-1/model.stl', headers={'Range': 'bytes=100-199'})
+        assert response.status_code == 206
+        assert response.data == data[100:200]
+        assert response.headers['Content-Range'] == f"bytes 100-199/{len(data)}"
+
+        tail = client.get('/api/download/job-1/model.stl', headers={'Range': f"bytes={len(data) - 10}-"})
+        assert tail.data == data[-10:]
+
+    def test_unsatisfiable_range(self, client, outputs):
+        size = (outputs / 'job-1' / 'model.stl').stat().st_size
+        response = client.get('/api/download/job-1/model.stl', headers={'Range': f"bytes={size + 10}-"})
+        assert response.status_code == 416
+
+    def test_if_range_with_stale_etag_sends_full_body(self, client, outputs):
+        response = client.get('/api/download/job-1/model.stl',
+                              headers={'Range': 'bytes=0-9', 'If-Range': '"stale"'})
+        assert response.status_code == 200
+        assert len(response.data) == (outputs / 'job-1' / 'model.stl').stat().st_size
+
+    def test_precompressed_variant_served_with_encoding(self, client, outputs):
+        path = outputs / 'job-1' / 'model.stl'
+        precompress_artifact(path)
+        identity_etag = client.get('/api/download/job-1/model.stl').headers['ETag']
+
+        response = client.get('/api/download/job-1/model.stl', headers={'Accept-Encoding': 'gzip'})
+        assert response.status_code == 200
+        assert response.headers['Content-Encoding'] == 'gzip'
+        assert 'Accept-Encoding' in response.headers['Vary']
+        assert response.headers['ETag'] != identity_etag
+        assert gzip.decompress(response.data) == path.read_bytes()
+
+    def test_x_accel_redirect(self, client, outputs, monkeypatch):
+        monkeypatch.setenv('DOWNLOAD_X_ACCEL_PREFIX', '/protected-outputs/')
+        precompress_artifact(outputs / 'job-1' / 'model.stl')
+
+        response = client.get('/api/download/job-1/model.stl', headers={'Accept-Encoding': 'gzip'})
+        assert response.status_code == 200
+        assert response.data == b''
+        assert response.headers['X-Accel-Redirect'] == '/protected-outputs/job-1/model.stl.gz'
+        assert response.headers['Content-Encoding'] == 'gzip'
+
+        cached = client.get('/api/download/job-1/model.stl',
+                            headers={'Accept-Encoding': 'gzip', 'If-None-Match': response.headers['ETag']})
+        assert cached.status_code == 304
+        assert 'X-Accel-Redirect' not in cached.headers
+
+
+@pytest.mark.unit
+class TestBase64Pages:
+    """Paged base64 reads"""
+
+    def test_pages_reassemble_file(self, outputs):
+        path = outputs / 'job-1' / 'model.stl'
+        data = path.read_bytes()
+        chunks, encoded, offset = [], [], 0
+        while offset is not None:
+            page = read_base64_page(path, offset=offset, page_size=10_000)
+            chunks.append(base64.b64decode(page['data']))
+            encoded.append(page['data'])
+            offset = page['next_offset']
+
+        assert page['done']
+        assert b''.join(chunks) == data
+        assert base64.b64decode(''.join(encoded)) == data, "pages must concatenate to valid base64"
+        assert page['original_size'] == len(data)
+
+    def test_page_size_rounded_to_multiple_of_three(self, outputs):
+        page = read_base64_page(outputs / 'job-1' / 'model.stl', offset=0, page_size=1000)
+        assert page['length'] == 999
+
+    def test_offset_past_end_rejected(self, outputs):
+        with pytest.raises(ValueError):
+            read_base64_page(outputs / 'job-1' / 'model.stl', offset=10**9)
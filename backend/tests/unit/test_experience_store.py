@@ -0,0 +1,209 @@
+"""
++==============================================================================
+|             ORFEAS Testing Suite - Agent Experience Store Tests              |
+|      Ring partitions, context features, IVF lookup, log replay/compaction    |
++==============================================================================
+"""
+import json
+import pytest
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+backend_path = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(backend_path))
+
+from experience_store import (
+    INDEX_MIN_SIZE,
+    ExperiencePartition,
+    ExperienceStore,
+    context_features,
+)
+
+
+def record(task_type='quality_assessment', quality=0.5, **context):
+    return {'task_type': task_type, 'context': context, 'quality_score': quality}
+
+
+@pytest.mark.unit
+class TestContextFeatures:
+    """Hashed, normalised context vectors"""
+
+    def test_unit_length_and_stable(self):
+        vector = context_features({'mode': 'fast', 'steps': 50})
+        assert np.isclose(np.linalg.norm(vector), 1.0)
+        assert np.array_equal(vector, context_features({'steps': 50, 'mode': 'fast'}))
+
+    def test_shared_keys_are_closer(self):
+        query = context_features({'mode': 'fast', 'steps': 50, 'format': 'stl'})
+        near = context_features({'mode': 'fast', 'steps': 50, 'format': 'glb'})
+        far = context_features({'user': 'x', 'region': 'eu'})
+        assert query @ near > query @ far
+
+    def test_empty_context(self):
+        assert not context_features({}).any()
+
+
+@pytest.mark.unit
+class TestExperienceStore:
+    """Partitions, lookup and persistence"""
+
+    def test_ring_keeps_newest_per_type(self):
+        store = ExperienceStore(capacity=3)
+        for i in range(5):
+            store.add(record(i=i))
+        store.add(record('mesh_quality_validation', i=99))
+        assert [r['context']['i'] for r in store.items('quality_assessment')] == [2, 3, 4]
+        assert len(store) == 4
+
+    def test_search_is_per_task_type(self):
+        store = ExperienceStore()
+        store.add(record('a', mode='fast'))
+        store.add(record('b', mode='fast'))
+        hits = store.search('a', {'mode': 'fast'}, k=5)
+        assert len(hits) == 1 and hits[0][1]['task_type'] == 'a'
+        assert store.search('missing', {'mode': 'fast'}) == []
+
+    def test_search_ranks_by_similarity(self):
+        store = ExperienceStore()
+        store.add(record(user='x', region='eu'))
+        store.add(record(mode='fast', steps=50))
+        store.add(record(mode='fast', steps=50, format='stl'))
+        hits = store.search('quality_assessment', {'mode': 'fast', 'steps': 50, 'format': 'stl'}, k=2)
+        assert [h[1]['context'] for h in hits] == [{'mode': 'fast', 'steps': 50, 'format': 'stl'},
+                                                   {'mode': 'fast', 'steps': 50}]
+        assert hits[0][0] == pytest.approx(1.0)
+
+    def test_indexed_partition_finds_exact_match(self):
+        rng = np.random.default_rng(0)
+        partition = ExperiencePartition(capacity=INDEX_MIN_SIZE * 2, dim=32)
+        vectors = rng.standard_normal((INDEX_MIN_SIZE + 100, 32)).astype(np.float32)
+        vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+        for i, vector in enumerate(vectors):
+            partition.add(vector, i, {})
+        assert partition.centroids is not None
+        for i in (0, 1234, INDEX_MIN_SIZE + 50):  # before and after training
+            slots, scores = partition.search(vectors[i], k=1, nprobe=4)
+            assert partition.items[slots[0]] == i
+
+    def test_overwritten_slots_leave_the_index(self):
+        rng = np.random.default_rng(1)
+        capacity = INDEX_MIN_SIZE
+        partition = ExperiencePartition(capacity=capacity, dim=16)
+        vectors = rng.standard_normal((capacity + 10, 16)).astype(np.float32)
+        vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+        for i, vector in enumerate(vectors):
+            partition.add(vector, i, {})
+        slots, _ = partition.search(vectors[capacity + 5], k=3, nprobe=len(partition.centroids))
+        assert partition.items[slots[0]] == capacity + 5
+        assert len(set(slots.tolist())) == len(slots)
+        slots, _ = partition.search(vectors[3], k=1, nprobe=len(partition.centroids))
+        assert partition.items[slots[0]] != 3  # overwritten by the ring
+
+    def test_replay_from_log(self, tmp_path):
+        path = tmp_path / 'agent.jsonl'
+        store = ExperienceStore(path=str(path))
+        store.add(record(mode='fast', when=datetime(2025, 1, 1).isoformat()))
+        store.add(record('b', steps=3))
+        store.close()
+
+        reopened = ExperienceStore(path=str(path), loader=lambda r: ('loaded', r['context']))
+        assert len(reopened) == 2
+        assert reopened.search('b', {'steps': 3})[0][1] == ('loaded', {'steps': 3})
+
+    def test_torn_line_is_skipped(self, tmp_path):
+        path = tmp_path / 'agent.jsonl'
+        path.write_text(json.dumps(record(mode='fast')) + '\n{"task_type": "qual')
+        store = ExperienceStore(path=str(path))
+        assert len(store) == 1 and store.get_stats()['corrupt_lines'] == 1
+
+    def test_compaction_rewrites_live_records(self, tmp_path):
+        path = tmp_path / 'agent.jsonl'
+        store = ExperienceStore(path=str(path), capacity=10, compact_ratio=2.0)
+        for i in range(1500):
+            store.add(record(i=i))
+        stats = store.get_stats()
+        assert stats['compactions'] >= 1
+        lines = path.read_text().splitlines()
+        assert len(lines) == stats['log_lines'] < 1000
+        store.close()
+        reopened = ExperienceStore(path=str(path), capacity=10)
+        assert [r['context']['i'] for r in reopened.items()] == list(range(1490, 1500))
+
+    def test_workers_sharing_a_log_keep_each_others_records(self, tmp_path):
+        path = tmp_path / 'agent.jsonl'
+        worker_a = ExperienceStore(path=str(path), capacity=10)
+        worker_b = ExperienceStore(path=str(path), capacity=10)
+        worker_a.add(record('a', worker='a'))
+        worker_b.add(record('b', worker='b'))
+        worker_a.compact()  # must not drop worker B's record it never saw
+        worker_b.add(record('b', worker='b2'))  # lands in the compacted log, not the replaced one
+        for i in range(1200):
+            worker_a.add(record('a', i=i))
+        assert worker_a.get_stats()['compactions'] >= 2
+        worker_a.close()
+        worker_b.close()
+
+        reopened = ExperienceStore(path=str(path), capacity=10)
+        assert [r['context'] for r in reopened.items('b')] == [{'worker': 'b'}, {'worker': 'b2'}]
+        assert [r['context']['i'] for r in reopened.items('a')] == list(range(1190, 1200))
+
+
+@pytest.mark.unit
+class TestAgentExperienceMemory:
+    """EnterpriseAgentBase on top of the store"""
+
+    def test_agent_persists_and_recalls(self, tmp_path, monkeypatch):
+        monkeypatch.setenv('AGENT_EXPERIENCE_DIR', str(tmp_path))
+        from enterprise_agent_framework import (
+            AgentExperience,
+            AgentTask,
+            QualityAssessmentAgent,
+            TaskPriority,
+        )
+
+        def experience(i, quality, **context):
+            return AgentExperience(task_id=f't{i}', task_type='quality_assessment', context=context,
+                                   actions_taken=[], result={'ok': True}, success=True,
+                                   execution_time=0.1, quality_score=quality, timestamp=datetime.utcnow())
+
+        agent = QualityAssessmentAgent('quality_agent_test', None, [])
+        agent.store_experience(experience(1, 0.6, mode='fast', steps=50))
+        agent.store_experience(experience(2, 0.9, mode='fast', steps=20))
+        agent.store_experience(experience(3, 0.99, user='x'))
+        agent.experience_store.close()
+
+        restarted = QualityAssessmentAgent('quality_agent_test', None, [])
+        task = AgentTask(id='q', type='quality_assessment', description='', priority=TaskPriority.HIGH,
+                         requirements={}, context={'mode': 'best', 'steps': 10})
+        relevant = restarted.get_relevant_experience(task)
+        assert [e.task_id for e in relevant] == ['t2', 't1']
+        assert isinstance(relevant[0].timestamp, datetime)
+        assert len(restarted.experience_buffer) == 3
+
+    def test_best_quality_wins_over_nearest_context(self, tmp_path, monkeypatch):
+        monkeypatch.setenv('AGENT_EXPERIENCE_DIR', str(tmp_path))
+        from enterprise_agent_framework import (
+            AgentExperience,
+            AgentTask,
+            QualityAssessmentAgent,
+            TaskPriority,
+        )
+
+        def experience(i, quality, **context):
+            return AgentExperience(task_id=f't{i}', task_type='quality_assessment', context=context,
+                                   actions_taken=[], result={'ok': True}, success=True,
+                                   execution_time=0.1, quality_score=quality, timestamp=datetime.utcnow())
+
+        agent = QualityAssessmentAgent('quality_agent_ranking', None, [])
+        for i in range(60):  # same keys and values as the task: nearest by context features
+            agent.store_experience(experience(i, 0.5, mode='fast', steps=50))
+        agent.store_experience(experience('best', 0.99, mode='thorough', steps=200))
+        task = AgentTask(id='q', type='quality_assessment', description='', priority=TaskPriority.HIGH,
+                         requirements={}, context={'mode': 'fast', 'steps': 50})
+
+        assert agent.get_relevant_experience(task, limit=3)[0].task_id == 'tbest'
+        assert 'tbest' not in [e.task_id for e in agent.get_relevant_experience(task, limit=3, approximate=True)]
+        agent.experience_store.close()
@@ -0,0 +1,271 @@
+"""
++==============================================================================
+|              ORFEAS Testing Suite - GLB Export Tests                         |
+|       GLB layout, quantization, meshopt codecs, normals and LOD chain        |
++==============================================================================
+"""
+import pytest
+import numpy as np
+from pathlib import Path
+import sys
+
+backend_path = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(backend_path))
+
+from glb_export import (
+    build_lod_chain,
+    compute_flat_normals,
+    compute_vertex_normals,
+    export_glb,
+    meshopt_encode_index_sequence,
+    meshopt_encode_vertex_buffer,
+    parse_glb,
+)
+
+
+def make_grid(n: int = 20):
+    """Wavy n x n grid: (vertices, faces)"""
+    xs, zs = np.meshgrid(np.linspace(-1, 1, n), np.linspace(-1, 1, n))
+    ys = 0.2 * np.sin(3 * xs) * np.cos(2 * zs)
+    vertices = np.stack([xs.ravel(), ys.ravel(), zs.ravel()], axis=1)
+    idx = np.arange(n * n).reshape(n, n)
+    a, b, c, d = idx[:-1, :-1].ravel(), idx[:-1, 1:].ravel(), idx[1:, :-1].ravel(), idx[1:, 1:].ravel()
+    faces = np.concatenate([np.stack([a, c, b], 1), np.stack([b, c, d], 1)])
+    return vertices, faces
+
+
+def reference_smooth_normals(vertices, faces):
+    """The per-face loop the vectorized version replaced"""
+    normals = np.zeros_like(vertices)
+    for face in faces:
+        v0, v1, v2 = vertices[face[0]], vertices[face[1]], vertices[face[2]]
+        face_normal = np.cross(v1 - v0, v2 - v0)
+        for corner in face:
+            normals[corner] += face_normal
+    norms = np.linalg.norm(normals, axis=1, keepdims=True)
+    norms[norms == 0] = 1
+    return normals / norms
+
+
+def decode_vertex_buffer(data: bytes, count: int, stride: int) -> np.ndarray:
+    """Straightforward meshopt attribute decoder (bitstream version 0)"""
+    assert data[0] == 0xA0
+    block = min(8192 // stride & ~15, 256)
+    out = np.zeros((count, stride), dtype=np.uint8)
+    last = bytearray(data[len(data) - stride:])
+    pos = 1
+    for start in range(0, count, block):
+        size = min(block, count - start)
+        groups = (size + 15) // 16
+        for k in range(stride):
+            header = data[pos:pos + (groups + 3) // 4]
+            pos += len(header)
+            deltas = []
+            for g in range(groups):
+                mode = (header[g // 4] >> (2 * (g % 4))) & 3
+                if mode == 0:
+                    deltas.extend([0] * 16)
+                elif mode == 3:
+                    deltas.extend(data[pos:pos + 16])
+                    pos += 16
+                else:
+                    bits = 2 if mode == 1 else 4
+                    per_byte = 8 // bits
+                    packed = data[pos:pos + 16 // per_byte]
+                    pos += len(packed)
+                    sentinel = (1 << bits) - 1
+                    for byte in packed:
+                        for j in range(per_byte):
+                            value = (byte >> (bits * (per_byte - 1 - j))) & sentinel
+                            if value == sentinel:
+                                value = data[pos]
+                                pos += 1
+                            deltas.append(value)
+            previous = last[k]
+            for i in range(size):
+                zz = deltas[i]
+                previous = (previous + ((zz >> 1) ^ -(zz & 1))) & 0xFF
+                out[start + i, k] = previous
+            last[k] = previous
+    return out
+
+
+def decode_index_sequence(data: bytes, count: int) -> np.ndarray:
+    """Straightforward meshopt index sequence decoder"""
+    assert data[0] == 0xD1
+    baselines, pos, out = [0, 0], 1, []
+    for _ in range(count):
+        value, shift = 0, 0
+        while True:
+            byte = data[pos]
+            pos += 1
+            value |= (byte & 0x7F) << shift
+            shift += 7
+            if byte < 0x80:
+                break
+        baseline = value & 1
+        zz = value >> 1
+        index = (baselines[baseline] + ((zz >> 1) ^ -(zz & 1))) & 0xFFFFFFFF
+        baselines[baseline] = index
+        out.append(index)
+    assert data[pos:] == b'\x00' * 4
+    return np.array(out, dtype=np.uint32)
+
+
+def read_accessor(document: dict, binary: bytes, accessor_index: int) -> np.ndarray:
+    """Read an uncompressed accessor as float/int array"""
+    accessor = document['accessors'][accessor_index]
+    view = document['bufferViews'][accessor['bufferView']]
+    dtype = {5126: '<f4', 5122: '<i2', 5120: '<i1', 5123: '<u2', 5125: '<u4'}[accessor['componentType']]
+    width = {'SCALAR': 1, 'VEC2': 2, 'VEC3': 3}[accessor['type']]
+    itemsize = np.dtype(dtype).itemsize
+    stride = view.get('byteStride', itemsize * width)
+    raw = np.frombuffer(binary, dtype=np.uint8, count=view['byteLength'], offset=view['byteOffset'])
+    rows = raw.reshape(accessor['count'], stride)
+    offset = accessor.get('byteOffset', 0)
+    return np.ascontiguousarray(rows[:, offset:offset + itemsize * width]).view(dtype).reshape(accessor['count'], width)
+
+
+@pytest.mark.unit
+class TestNormals:
+    """Vectorized normals match the legacy per-face loops"""
+
+    def test_smooth_normals_match_loop(self) -> None:
+        vertices, faces = make_grid(12)
+        np.testing.assert_allclose(compute_vertex_normals(vertices, faces),
+                                   reference_smooth_normals(vertices, faces), atol=1e-12)
+
+    def test_unreferenced_vertex_gets_zero_normal(self) -> None:
+        vertices = np.array([[0, 0, 0], [1, 0, 0], [0, 1, 0], [5, 5, 5]], dtype=float)
+        normals = compute_vertex_normals(vertices, np.array([[0, 1, 2]]))
+        np.testing.assert_allclose(normals[:3], [[0, 0, 1]] * 3)
+        np.testing.assert_allclose(normals[3], [0, 0, 0])
+
+    def test_flat_normals_are_per_corner(self) -> None:
+        vertices, faces = make_grid(5)
+        normals = compute_flat_normals(vertices, faces)
+        assert normals.shape == (3 * len(faces), 3)
+        np.testing.assert_allclose(np.linalg.norm(normals, axis=1), 1.0)
+
+
+@pytest.mark.unit
+class TestMeshoptCodecs:
+    """Encoders round-trip through a spec decoder"""
+
+    @pytest.mark.parametrize("count,stride", [(1, 16), (17, 16), (300, 32), (1000, 16), (700, 4)])
+    def test_vertex_codec_round_trip(self, count, stride) -> None:
+        rng = np.random.default_rng(count)
+        data = rng.integers(0, 256, (count, stride), dtype=np.uint8)
+        data[:, :4] = (np.arange(count)[:, None] // 5 % 256).astype(np.uint8)  # compressible columns
+        encoded = meshopt_encode_vertex_buffer(data)
+        assert np.array_equal(decode_vertex_buffer(encoded, count, stride), data)
+
+    def test_vertex_codec_compresses_smooth_data(self) -> None:
+        data = np.repeat(np.arange(4096, dtype=np.uint32)[:, None], 4, axis=1).view(np.uint8)
+        assert len(meshopt_encode_vertex_buffer(data)) < data.nbytes / 4
+
+    def test_vertex_codec_rejects_bad_stride(self) -> None:
+        with pytest.raises(ValueError):
+            meshopt_encode_vertex_buffer(np.zeros((4, 6), dtype=np.uint8))
+
+    def test_index_sequence_round_trip(self) -> None:
+        indices = np.random.default_rng(1).integers(0, 100000, 5000).astype(np.uint32)
+        assert np.array_equal(decode_index_sequence(meshopt_encode_index_sequence(indices), 5000), indices)
+
+    def test_matches_reference_decoder(self) -> None:
+        meshoptimizer = pytest.importorskip("meshoptimizer")
+        vertices, faces = make_grid(30)
+        data = np.ascontiguousarray(np.hstack([vertices, vertices[:, :1]]).astype('<f4')).view(np.uint8)
+        decoded = meshoptimizer.decode_vertex_buffer(len(data), 16, meshopt_encode_vertex_buffer(data))
+        assert decoded.tobytes() == data.tobytes()
+        indices = faces.ravel().astype(np.uint32)
+        decoded = meshoptimizer.decode_index_sequence(len(indices), 4, meshopt_encode_index_sequence(indices))
+        assert np.array_equal(np.asarray(decoded).ravel(), indices)
+
+
+@pytest.mark.unit
+class TestGlbExport:
+    """GLB container, accessors and extensions"""
+
+    def test_float_glb_layout(self) -> None:
+        vertices, faces = make_grid(10)
+        document, binary = parse_glb(export_glb(vertices, faces))
+        primitive = document['meshes'][0]['primitives'][0]
+        assert 'extensionsRequired' not in document
+        assert document['bufferViews'][0]['byteStride'] == 32
+
+        positions = read_accessor(document, binary, primitive['attributes']['POSITION'])
+        np.testing.assert_allclose(positions, vertices, atol=1e-6)
+        indices = read_accessor(document, binary, primitive['indices']).ravel()
+        assert np.array_equal(indices, faces.ravel())
+        assert document['accessors'][primitive['indices']]['componentType'] == 5123
+        normals = read_accessor(document, binary, primitive['attributes']['NORMAL'])
+        np.testing.assert_allclose(normals, compute_vertex_normals(vertices, faces), atol=1e-6)
+
+    def test_quantized_positions_dequantize_through_node(self) -> None:
+        vertices, faces = make_grid(16)
+        vertices = vertices * 40 + [3, -2, 7]
+        document, binary = parse_glb(export_glb(vertices, faces, quantize=True))
+        assert document['extensionsRequired'] == ['KHR_mesh_quantization']
+        assert document['bufferViews'][0]['byteStride'] == 16
+
+        node = document['nodes'][0]
+        accessor_index = document['meshes'][0]['primitives'][0]['attributes']['POSITION']
+        raw = read_accessor(document, binary, accessor_index).astype(np.float64)
+        restored = raw / 32767 * (np.array(node['scale']) * 32767) + node['translation']
+        assert np.abs(restored - vertices).max() < 80 / 32767
+        accessor = document['accessors'][accessor_index]
+        assert accessor['normalized'] and accessor['min'] == raw.min(axis=0).tolist()
+
+    def test_meshopt_compressed_views_decode(self) -> None:
+        vertices, faces = make_grid(24)
+        plain_document, plain_binary = parse_glb(export_glb(vertices, faces, quantize=True))
+        document, binary = parse_glb(export_glb(vertices, faces, quantize=True, compress=True))
+        assert set(document['extensionsRequired']) == {'KHR_mesh_quantization', 'EXT_meshopt_compression'}
+        assert document['buffers'][1]['extensions']['EXT_meshopt_compression']['fallback']
+        assert len(binary) < len(plain_binary)
+
+        for view, plain_view in zip(document['bufferViews'], plain_document['bufferViews']):
+            ext = view['extensions']['EXT_meshopt_compression']
+            encoded = binary[ext['byteOffset']:ext['byteOffset'] + ext['byteLength']]
+            expected = plain_binary[plain_view['byteOffset']:plain_view['byteOffset'] + plain_view['byteLength']]
+            if ext['mode'] == 'ATTRIBUTES':
+                decoded = decode_vertex_buffer(encoded, ext['count'], ext['byteStride']).tobytes()
+            else:
+                decoded = decode_index_sequence(encoded, ext['count']).astype('<u2').tobytes()
+            assert decoded == expected
+            assert view['byteLength'] == len(expected)
+
+    def test_flat_shading_splits_vertices(self) -> None:
+        vertices, faces = make_grid(6)
+        document, _ = parse_glb(export_glb(vertices, faces, smooth_normals=False))
+        position = document['meshes'][0]['primitives'][0]['attributes']['POSITION']
+        assert document['accessors'][position]['count'] == 3 * len(faces)
+
+    def test_lod_chain_uses_msft_lod(self) -> None:
+        vertices, faces = make_grid(20)
+
+        def simplifier(v, f, target):
+            return v, f[:target]
+
+        lods = build_lod_chain(vertices, faces, simplifier, ratios=(0.5, 0.25))
+        assert [len(f) for _, f in lods] == [len(faces) // 2, len(faces) // 4]
+        document, _ = parse_glb(export_glb(vertices, faces, lods=lods, quantize=True))
+        assert document['nodes'][0]['extensions']['MSFT_lod']['ids'] == [1, 2]
+        assert len(document['nodes'][0]['extras']['MSFT_screencoverage']) == 3
+        assert document['scenes'][0]['nodes'] == [0]
+        assert 'MSFT_lod' in document['extensionsUsed']
+        assert len({tuple(node['scale']) for node in document['nodes']}) == 1
+
+    def test_lod_chain_drops_failed_levels(self) -> None:
+        vertices, faces = make_grid(20)
+
+        def failing(v, f, target):
+            raise RuntimeError("no decimation backend")
+
+        assert build_lod_chain(vertices, faces, failing) == []
+        assert build_lod_chain(vertices, faces, lambda v, f, t: (v, f)) == []
+
+    def test_parse_rejects_bad_header(self) -> None:
+        with pytest.raises(ValueError):
+            parse_glb(b'x' * 32)
@@ -0,0 +1,200 @@
+"""
++==============================================================================
+|               ORFEAS Testing Suite - Job Event Stream Tests                  |
+|     Numbered events, coalescing, Last-Event-ID resume, SSE body, waits       |
++==============================================================================
+"""
+import json
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+backend_path = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(backend_path))
+
+from job_store import InMemoryJobStore, SQLiteJobStore, is_terminal_status
+from progress_tracker import JobEventStream, ProgressTracker, format_sse, sse_stream, store_event_id
+
+
+def forward_to(tracker):
+    """Versioned job store subscriber feeding ``tracker``'s event stream"""
+    def publish(job_id, data, version, remote):
+        tracker.publish_job_state(job_id, {'job_id': job_id, **data},
+                                  terminal=is_terminal_status(data.get('status')), version=version)
+    return publish
+
+
+def parse_sse(chunks):
+    """(id, event, data) for every event in the stream chunks"""
+    events = []
+    for block in ''.join(chunks).split('\n\n'):
+        fields = dict(line.split(': ', 1) for line in block.splitlines() if ': ' in line and not line.startswith(':'))
+        if 'event' in fields:
+            events.append((int(fields['id']), fields['event'], json.loads(fields['data'])))
+    return events
+
+
+@pytest.mark.unit
+class TestJobEventStream:
+    """Event log semantics"""
+
+    def test_ids_and_progress_coalescing(self):
+        stream = JobEventStream()
+        assert stream.publish('job', 'stage', {'stage': 'shape'}) == 1
+        stream.publish('job', 'progress', {'progress': 10})
+        stream.publish('job', 'progress', {'progress': 20})
+        stream.publish('job', 'progress', {'progress': 30})
+        events = stream.events_since('job', 0)
+        assert [(e.id, e.event, e.data) for e in events] == [(1, 'stage', {'stage': 'shape'}),
+                                                             (4, 'progress', {'progress': 30})]
+        assert stream.events_since('job', 1)[0].data == {'progress': 30}
+        assert stream.events_since('job', 4) == []
+        assert stream.get_stats()['coalesced'] == 2
+
+    def test_resume_past_retained_log_gets_snapshot(self):
+        stream = JobEventStream(max_events=3)
+        for stage in ('a', 'b', 'c', 'd', 'e'):
+            stream.publish('job', 'stage', {'stage': stage, stage: True})
+        snapshot, = stream.events_since('job', 1)
+        assert snapshot.event == 'snapshot' and snapshot.id == 5
+        assert snapshot.data['stage'] == 'e' and snapshot.data['a'] is True
+        assert [e.id for e in stream.events_since('job', 2)] == [3, 4, 5]
+
+    def test_wait_wakes_on_publish(self):
+        stream = JobEventStream()
+        result = []
+        waiter = threading.Thread(target=lambda: result.extend(stream.wait('job', 0, timeout=5)))
+        waiter.start()
+        time.sleep(0.05)
+        start = time.perf_counter()
+        stream.publish('job', 'progress', {'progress': 50})
+        waiter.join(5)
+        assert time.perf_counter() - start < 1
+        assert [e.data for e in result] == [{'progress': 50}]
+
+    def test_wait_times_out_and_returns_when_finished(self):
+        stream = JobEventStream()
+        start = time.perf_counter()
+        assert stream.wait('job', 0, timeout=0.05) == []
+        assert time.perf_counter() - start >= 0.04
+        stream.publish('job', 'complete', {'success': True}, terminal=True)
+        start = time.perf_counter()
+        assert stream.wait('job', 1, timeout=5) == []
+        assert time.perf_counter() - start < 1
+
+    def test_store_versions_number_events(self):
+        stream = JobEventStream()
+        assert stream.publish('job', 'progress', {'progress': 10}, version=3) == store_event_id(3)
+        assert stream.publish('job', 'stage', {'stage': 'shape'}) == store_event_id(3) + 1
+        assert stream.publish('job', 'progress', {'progress': 20}, version=4) == store_event_id(4)
+
+    def test_id_ahead_of_this_worker_waits_for_next_write(self):
+        stream = JobEventStream()
+        stream.publish('job', 'progress', {'progress': 10}, version=3)
+        ahead = store_event_id(3) + 5  # local events seen on another worker
+        assert stream.wait('job', ahead, timeout=0.05) == []
+        threading.Timer(0.05, stream.publish, args=('job', 'progress', {'progress': 20}),
+                        kwargs={'version': 4}).start()
+        assert [e.data for e in stream.wait('job', ahead, timeout=5)] == [{'progress': 20}]
+
+    def test_lru_bound_releases_waiters(self):
+        stream = JobEventStream(max_jobs=2)
+        stream.publish('a', 'progress', {})
+        stream.publish('b', 'progress', {})
+        stream.publish('c', 'progress', {})
+        assert stream.get_stats()['jobs'] == 2 and stream.version('a') == 0
+
+
+@pytest.mark.unit
+class TestSSEStream:
+    """text/event-stream body"""
+
+    def test_format(self):
+        stream = JobEventStream()
+        stream.publish('job', 'progress', {'progress': 5})
+        assert format_sse(stream.events_since('job', 0)[0]) == 'id: 1\nevent: progress\ndata: {"progress": 5}\n\n'
+
+    def test_follows_until_terminal_with_heartbeats(self):
+        stream = JobEventStream()
+        stream.publish('job', 'progress', {'progress': 10})
+
+        def producer():
+            time.sleep(0.15)
+            for progress in (20, 30, 40):
+                stream.publish('job', 'progress', {'progress': progress})
+            stream.publish('job', 'complete', {'success': True}, terminal=True)
+
+        threading.Thread(target=producer).start()
+        chunks = list(sse_stream(stream, 'job', heartbeat=0.05, coalesce=0.01))
+        assert chunks[0].startswith('retry:')
+        assert any(chunk == ': heartbeat\n\n' for chunk in chunks)
+        events = parse_sse(chunks)
+        assert events[0] == (1, 'progress', {'progress': 10})
+        assert events[-1][1] == 'complete'
+        progress = [data['progress'] for _, event, data in events if event == 'progress']
+        assert progress == sorted(progress) and progress[-1] == 40
+
+    def test_resume_from_last_event_id(self):
+        stream = JobEventStream()
+        stream.publish('job', 'stage', {'stage': 'shape'})
+        stream.publish('job', 'progress', {'progress': 60})
+        stream.publish('job', 'complete', {'success': True}, terminal=True)
+        events = parse_sse(sse_stream(stream, 'job', last_event_id=2, heartbeat=0.05, coalesce=0))
+        assert events == [(3, 'complete', {'success': True})]
+        assert parse_sse(sse_stream(stream, 'job', last_event_id=3, heartbeat=0.05, coalesce=0)) == []
+
+
+@pytest.mark.unit
+class TestProgressTrackerEvents:
+    """Tracker and job store changes feed the stream"""
+
+    def test_tracker_publishes_stage_progress_and_completion(self):
+        tracker = ProgressTracker()
+        tracker.start_job('job')
+        tracker.start_stage('job', 'shape_generation')
+        tracker.update_stage_progress('job', 'shape_generation', 50)
+        tracker.complete_job('job', True)
+        events = tracker.events.events_since('job', 0)
+        assert [e.event for e in events] == ['stage', 'progress', 'complete']
+        assert events[-1].terminal and tracker.events.is_terminal('job')
+
+    def test_job_store_changes_reach_long_poll_waiters(self):
+        tracker = ProgressTracker()
+        store = InMemoryJobStore()
+        store.subscribe(forward_to(tracker), with_version=True)
+        store.put('job', {'status': 'processing', 'progress': 0})
+        version = tracker.events.version('job')
+        assert version == store_event_id(store.version('job'))
+
+        threading.Timer(0.05, store.update, args=('job', {'progress': 50})).start()
+        changes = tracker.events.wait('job', version, timeout=5)
+        assert changes[-1].data['progress'] == 50
+
+        store.update('job', {'status': 'completed', 'progress': 100})
+        assert tracker.events.is_terminal('job')
+        assert tracker.events.wait('job', tracker.events.version('job'), timeout=5) == []
+
+    def test_workers_agree_on_event_ids(self, tmp_path):
+        path = str(tmp_path / 'jobs.db')
+        store_a, store_b = SQLiteJobStore(path), SQLiteJobStore(path)
+        tracker_a, tracker_b = ProgressTracker(), ProgressTracker()
+        store_a.subscribe(forward_to(tracker_a), with_version=True)
+        store_b.subscribe(forward_to(tracker_b), with_version=True)
+
+        store_a.put('job', {'status': 'processing', 'progress': 10})
+        tracker_a.events.publish('job', 'stage', {'stage': 'shape'})  # only worker A sees this
+        store_a.update('job', {'progress': 40})
+        store_b.poll_changes()
+        assert tracker_b.events.version('job') == tracker_a.events.version('job')
+
+        # A client long-polling worker B with an id from worker A gets the next write
+        since = tracker_a.events.version('job')
+        store_a.update('job', {'status': 'completed', 'progress': 100})
+        store_b.poll_changes()
+        changes = tracker_b.events.wait('job', since, timeout=1)
+        assert changes[-1].data['status'] == 'completed' and changes[-1].terminal
+        store_a.close()
+        store_b.close()
@@ -0,0 +1,224 @@
+"""
++==============================================================================
+|                  ORFEAS Testing Suite - Job Store Tests                     |
+|     Lookups, atomic transitions, claims, TTL compaction and change feed     |
++==============================================================================
+"""
+import pytest
+import time
+from pathlib import Path
+import sys
+
+backend_path = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(backend_path))
+
+from job_store import InMemoryJobStore, SQLiteJobStore, _backend_name, is_terminal_status
+
+
+@pytest.fixture(params=['memory', 'sqlite'])
+def store(request, tmp_path):
+    if request.param == 'memory':
+        job_store = InMemoryJobStore(ttl_seconds=60, stale_seconds=600)
+    else:
+        job_store = SQLiteJobStore(str(tmp_path / 'jobs.db'), ttl_seconds=60, stale_seconds=600)
+    yield job_store
+    job_store.close()
+
+
+@pytest.mark.unit
+class TestJobStore:
+    """Behaviour shared by all backends"""
+
+    def test_put_get_roundtrip(self, store):
+        store.put('job-1', {'status': 'processing', 'progress': 5})
+        assert store.get('job-1') == {'status': 'processing', 'progress': 5}
+        assert store.get('missing') is None
+
+    def test_get_returns_copy(self, store):
+        store.put('job-1', {'status': 'processing'})
+        store.get('job-1')['status'] = 'mutated'
+        assert store.get('job-1')['status'] == 'processing'
+
+    def test_create_only_inserts_once(self, store):
+        assert store.create('job-1', {'status': 'queued'})
+        assert not store.create('job-1', {'status': 'processing'})
+        assert store.get('job-1')['status'] == 'queued'
+
+    def test_update_merges_fields(self, store):
+        store.put('job-1', {'status': 'processing', 'progress': 0, 'prompt': 'cat'})
+        merged = store.update('job-1', {'progress': 50})
+        assert merged == {'status': 'processing', 'progress': 50, 'prompt': 'cat'}
+        assert store.update('missing', {'progress': 1}) is None
+
+    def test_transition_is_compare_and_set(self, store):
+        store.put('job-1', {'status': 'processing'})
+        assert store.transition('job-1', 'failed', from_statuses=('completed',)) is None
+        record = store.transition('job-1', 'completed', from_statuses=('processing',),
+                                  fields={'progress': 100})
+        assert record == {'status': 'completed', 'progress': 100}
+        assert store.transition('job-1', 'failed', from_statuses=('processing',)) is None
+        assert store.get('job-1')['status'] == 'completed'
+
+    def test_status_index(self, store):
+        store.put('a', {'job_id': 'a', 'status': 'processing'})
+        store.put('b', {'job_id': 'b', 'status': 'processing'})
+        store.put('c', {'job_id': 'c', 'status': 'completed'})
+        store.update('b', {'status': 'completed'})
+
+        assert store.count_by_status() == {'processing': 1, 'completed': 2}
+        assert {r['job_id'] for r in store.list_by_status('completed')} == {'b', 'c'}
+        assert store.list_by_status('failed') == []
+
+    def test_claim_is_exclusive(self, store):
+        assert store.claim('job-1')
+        assert not store.claim('job-1')
+        assert store.is_active('job-1')
+        assert store.active_count() == 1
+        assert store.get('job-1')['status'] == 'queued'
+
+        store.put('job-1', {'status': 'processing'})
+        assert store.is_active('job-1'), "writes must not clear the claim"
+
+        store.release('job-1')
+        assert not store.is_active('job-1')
+        assert store.active_count() == 0
+        assert store.claim('job-1')
+
+    def test_expired_claim_is_free(self, store):
+        assert store.claim('job-1', lease_seconds=0.05)
+        assert store.is_active('job-1') and store.active_count() == 1
+        time.sleep(0.1)
+        assert not store.is_active('job-1')
+        assert store.active_count() == 0
+        assert store.claim('job-1')
+        assert not store.claim('job-1')
+
+    def test_compact_removes_expired_jobs_with_expired_claims(self, store):
+        store.claim('crashed', lease_seconds=0.05)
+        store.put('crashed', {'status': 'processing'})
+        time.sleep(0.1)
+        assert store.compact(time.time() + 10_000) == 1
+        assert store.get('crashed') is None
+
+    def test_compact_removes_only_expired_unclaimed(self, store):
+        store.put('done', {'status': 'completed'})
+        store.put('running', {'status': 'processing'})
+        store.claim('claimed')
+        store.put('claimed', {'status': 'completed'})
+        now = time.time()
+
+        assert store.compact(now) == 0
+        assert store.compact(now + 61) == 1
+        assert store.get('done') is None
+        assert store.get('running') is not None
+        assert store.get('claimed') is not None
+
+        store.release('claimed')
+        assert store.compact(now + 10_000) == 2
+        assert store.count_by_status() == {}
+
+    def test_update_refreshes_expiry(self, store):
+        store.put('job-1', {'status': 'processing'})
+        now = time.time()
+        store.update('job-1', {'status': 'completed'})
+        assert store.compact(now + 30) == 0
+        assert store.compact(now + 90) == 1
+
+    def test_subscribers_receive_changes(self, store):
+        events = []
+        store.subscribe(lambda job_id, data: events.append((job_id, data['status'])))
+        store.put('job-1', {'status': 'processing'})
+        store.update('job-1', {'status': 'completed'})
+        store.transition('job-1', 'failed', from_statuses=('processing',))
+
+        assert events == [('job-1', 'processing'), ('job-1', 'completed')]
+
+    def test_versions_grow_with_writes(self, store):
+        changes = []
+        store.subscribe(lambda job_id, data, version, remote: changes.append((job_id, version, remote)),
+                        with_version=True)
+        assert store.version('job-1') == 0
+        store.put('job-1', {'status': 'processing'})
+        store.put('job-2', {'status': 'processing'})
+        store.update('job-1', {'progress': 50})
+        assert changes == [('job-1', 1, False), ('job-2', 2, False), ('job-1', 3, False)]
+        assert store.version('job-1') == 3
+        store.delete('job-1')
+        assert store.version('job-1') == 0
+
+    def test_failing_subscriber_does_not_break_writes(self, store):
+        def broken(job_id, data):
+            raise RuntimeError("socket closed")
+
+        store.subscribe(broken)
+        store.put('job-1', {'status': 'processing'})
+        assert store.get('job-1')['status'] == 'processing'
+
+
+@pytest.mark.unit
+class TestSQLiteJobStore:
+    """Cross-connection behaviour of the SQLite backend"""
+
+    def test_state_survives_reopen(self, tmp_path):
+        path = str(tmp_path / 'jobs.db')
+        first = SQLiteJobStore(path)
+        first.put('job-1', {'status': 'completed', 'output_file': 'model.stl'})
+        first.claim('job-2')
+        first.close()
+
+        second = SQLiteJobStore(path)
+        assert second.get('job-1') == {'status': 'completed', 'output_file': 'model.stl'}
+        assert second.is_active('job-2')
+        second.close()
+
+    def test_claims_are_shared_between_stores(self, tmp_path):
+        path = str(tmp_path / 'jobs.db')
+        worker_a, worker_b = SQLiteJobStore(path), SQLiteJobStore(path)
+        assert worker_a.claim('job-1')
+        assert not worker_b.claim('job-1')
+        worker_a.release('job-1')
+        assert worker_b.claim('job-1')
+        worker_a.close()
+        worker_b.close()
+
+    def test_change_feed_delivers_latest_remote_state(self, tmp_path):
+        path = str(tmp_path / 'jobs.db')
+        worker_a, worker_b = SQLiteJobStore(path), SQLiteJobStore(path)
+        seen_by_b = []
+        worker_b.subscribe(lambda job_id, data: seen_by_b.append((job_id, data['progress'])))
+
+        worker_a.put('job-1', {'status': 'processing', 'progress': 10})
+        worker_a.update('job-1', {'progress': 20})
+        worker_a.put('job-2', {'status': 'processing', 'progress': 0})
+        assert seen_by_b == []
+
+        # Intermediate versions are coalesced into the latest state
+        assert worker_b.poll_changes() == 2
+        assert seen_by_b == [('job-1', 20), ('job-2', 0)]
+
+        # Own writes are delivered synchronously, never again by the feed
+        worker_b.update('job-1', {'progress': 30})
+        assert seen_by_b[-1] == ('job-1', 30)
+        assert worker_b.poll_changes() == 0
+        assert worker_a.version('job-1') == worker_b.version('job-1')
+        worker_a.close()
+        worker_b.close()
+
+
+@pytest.mark.unit
+def test_backend_follows_redis_url(monkeypatch):
+    monkeypatch.delenv('JOB_STORE_BACKEND', raising=False)
+    monkeypatch.delenv('REDIS_URL', raising=False)
+    assert _backend_name() == 'sqlite'
+    monkeypatch.setenv('REDIS_URL', 'redis://cache:6379/0')
+    assert _backend_name() == 'redis'
+    monkeypatch.setenv('JOB_STORE_BACKEND', 'sqlite')
+    assert _backend_name() == 'sqlite'
+
+
+@pytest.mark.unit
+def test_terminal_statuses():
+    assert is_terminal_status('completed')
+    assert is_terminal_status('ultra_failed')
+    assert not is_terminal_status('processing')
+    assert not is_terminal_status(None)
@@ -0,0 +1,208 @@
+"""
++==============================================================================
+|              ORFEAS Testing Suite - Model Residency Tests                    |
+|     Memory-mapped safetensors, shared-memory arrays, model host round trip   |
++==============================================================================
+"""
+import os
+import pytest
+import sys
+import textwrap
+from pathlib import Path
+
+import numpy as np
+
+backend_path = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(backend_path))
+
+from model_residency import (
+    ModelHostClient,
+    ModelHostError,
+    RemoteProcessor,
+    RESIDENCY_PROCESS,
+    SHARED_MEMORY_MIN_BYTES,
+    SharedArrayRef,
+    decode_arrays,
+    encode_arrays,
+    load_safetensors_mmap,
+    release_blocks,
+    residency_mode,
+    save_safetensors,
+    start_model_host,
+)
+
+TOY_MODEL = textwrap.dedent('''
+    import os
+    import time
+    import numpy as np
+
+    class ToyModel:
+        def __init__(self):
+            self.weights = np.arange(16, dtype=np.float32)
+
+        def scale(self, array, factor=1.0):
+            return array * factor + self.weights[0]
+
+        def pair(self, array):
+            return {'sum': float(array.sum()), 'doubled': array * 2}
+
+        def pid(self):
+            return os.getpid()
+
+        def fail(self):
+            raise ValueError("boom")
+
+        def get_model_info(self):
+            return {'status': 'loaded', 'model_type': 'toy'}
+
+        def remove_background_array(self, image):
+            out = image.copy()
+            out[..., 3] = 7
+            return out
+
+    def load():
+        time.sleep(0.2)
+        return ToyModel()
+''')
+
+
+@pytest.fixture
+def model_host(tmp_path, monkeypatch):
+    (tmp_path / "toy_residency_model.py").write_text(TOY_MODEL)
+    address = str(tmp_path / "host.sock")
+    env = {'PYTHONPATH': os.pathsep.join([str(tmp_path), os.environ.get('PYTHONPATH', '')]),
+           'MODEL_HOST_AUTHKEY': 'test-key'}
+    monkeypatch.setenv('MODEL_HOST_AUTHKEY', 'test-key')
+    process = start_model_host('toy_residency_model:load', address, env=env)
+    client = ModelHostClient(address)
+    try:
+        assert client.wait_ready(timeout=30)
+        yield client, process
+    finally:
+        client.close()
+        process.terminate()
+        process.wait(timeout=10)
+
+
+@pytest.mark.unit
+class TestSafetensors:
+    """Copy-on-write memory-mapped safetensors"""
+
+    def test_round_trip(self, tmp_path):
+        tensors = {
+            'weight': np.random.default_rng(0).standard_normal((33, 17)).astype(np.float32),
+            'bias': np.arange(5, dtype=np.int64),
+            'half': np.ones((2, 3, 4), dtype=np.float16),
+        }
+        path = tmp_path / "model.safetensors"
+        save_safetensors(path, tensors)
+        loaded = load_safetensors_mmap(path)
+        assert set(loaded) == set(tensors)
+        for name, array in tensors.items():
+            assert loaded[name].dtype == array.dtype
+            np.testing.assert_array_equal(loaded[name], array)
+
+    def test_arrays_are_copy_on_write_maps(self, tmp_path):
+        path = tmp_path / "model.safetensors"
+        save_safetensors(path, {'w': np.zeros(1024, dtype=np.float32)})
+        loaded = load_safetensors_mmap(path)
+        assert not loaded['w'].flags.owndata
+
+        loaded['w'][:] = 5  # private copy, the file is untouched
+        np.testing.assert_array_equal(load_safetensors_mmap(path)['w'], 0)
+
+    def test_header_is_aligned(self, tmp_path):
+        path = tmp_path / "model.safetensors"
+        save_safetensors(path, {'a': np.ones(3, dtype=np.uint8), 'b': np.ones(3, dtype=np.float64)})
+        header_size = int.from_bytes(path.read_bytes()[:8], 'little')
+        assert (8 + header_size) % 8 == 0
+
+
+@pytest.mark.unit
+class TestSharedArrays:
+    """Arrays cross processes through shared memory, small ones inline"""
+
+    def test_large_arrays_become_refs(self):
+        large = np.ones(SHARED_MEMORY_MIN_BYTES, dtype=np.uint8)
+        small = np.ones(8, dtype=np.uint8)
+        blocks = []
+        encoded = encode_arrays({'large': large, 'items': [small, large]}, blocks)
+        try:
+            assert isinstance(encoded['large'], SharedArrayRef)
+            assert isinstance(encoded['items'][0], np.ndarray)
+            assert len(blocks) == 2
+
+            attached = []
+            decoded = decode_arrays(encoded, attached, owner=False)
+            np.testing.assert_array_equal(decoded['large'], large)
+            np.testing.assert_array_equal(decoded['items'][1], large)
+            del decoded
+            release_blocks(attached, unlink=False)
+        finally:
+            release_blocks(blocks, unlink=True)
+
+
+@pytest.mark.unit
+class TestModelHost:
+    """Worker-side client against a real model-host process"""
+
+    def test_ping_reports_host_process(self, model_host):
+        client, process = model_host
+        status = client.ping()
+        assert status['ready'] and not status['loading']
+        assert status['pid'] == process.pid
+
+    def test_call_runs_in_host(self, model_host):
+        client, process = model_host
+        assert client.call('pid') == process.pid
+
+    def test_arrays_round_trip_through_shared_memory(self, model_host):
+        client, _ = model_host
+        array = np.random.default_rng(1).standard_normal((256, 256)).astype(np.float32)
+        result = client.call('scale', array, factor=3.0)
+        np.testing.assert_allclose(result, array * 3.0)
+
+        nested = client.call('pair', array)
+        assert nested['sum'] == pytest.approx(float(array.sum()), rel=1e-4)
+        np.testing.assert_allclose(nested['doubled'], array * 2)
+
+    def test_no_shared_memory_left_behind(self, model_host):
+        client, _ = model_host
+        before = set(os.listdir('/dev/shm')) if os.path.isdir('/dev/shm') else set()
+        client.call('scale', np.ones((512, 512), dtype=np.float32))
+        after = set(os.listdir('/dev/shm')) if os.path.isdir('/dev/shm') else set()
+        assert after <= before
+
+    def test_model_errors_are_raised(self, model_host):
+        client, _ = model_host
+        with pytest.raises(ModelHostError, match="boom"):
+            client.call('fail')
+        assert client.call('pid')  # connection still usable
+
+    def test_remote_processor_api(self, model_host):
+        client, _ = model_host
+        from PIL import Image
+        processor = RemoteProcessor(client)
+        assert processor.model_loaded and processor.is_available()
+        assert processor.get_model_info()['residency'] == 'host'
+
+        image = Image.new('RGBA', (200, 200), (10, 20, 30, 255))
+        result = processor.remove_background(image)
+        assert result.size == (200, 200)
+        assert result.getpixel((0, 0)) == (10, 20, 30, 7)
+
+    def test_unreachable_host(self, tmp_path):
+        client = ModelHostClient(str(tmp_path / "missing.sock"))
+        with pytest.raises(ModelHostError):
+            client.ping()
+        assert RemoteProcessor(client).model_loaded is False
+
+
+@pytest.mark.unit
+def test_residency_mode_defaults_to_process(monkeypatch):
+    monkeypatch.delenv('MODEL_RESIDENCY', raising=False)
+    assert residency_mode() == RESIDENCY_PROCESS
+    monkeypatch.setenv('MODEL_RESIDENCY', 'bogus')
+    assert residency_mode() == RESIDENCY_PROCESS
+    monkeypatch.setenv('MODEL_RESIDENCY', 'HOST')
+    assert residency_mode() == 'host'
@@ -0,0 +1,152 @@
+"""
++==============================================================================
+|            ORFEAS Testing Suite - LLM Performance Tracer Tests               |
+|   Columnar metric ring, streaming aggregates, vectorized queries, sampling   |
++==============================================================================
+"""
+import asyncio
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+backend_path = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(backend_path.parent))
+
+from backend.llm_integration.tracing import (
+    PerformanceMetric,
+    PerformanceTracer,
+    performance_tracer,
+    trace_block,
+    trace_performance,
+)
+
+
+def stats_for(component: str):
+    return {s.operation: s for s in performance_tracer.get_stats(component=component)}
+
+
+@pytest.mark.unit
+class TestPerformanceTracerStore:
+    """Aggregates and queries over the columnar store"""
+
+    def test_aggregates_maintained_on_record(self):
+        tracer = PerformanceTracer(max_metrics=2)
+        key = tracer.key_id('router', 'select')
+        for duration, success in ((10.0, True), (30.0, False), (20.0, True)):
+            tracer.record(key, duration, success=success, error=None if success else 'TimeoutError')
+        stats, = tracer.get_stats()
+        assert (stats.count, stats.error_count, stats.success_count) == (3, 1, 2)
+        assert (stats.min_duration_ms, stats.max_duration_ms, stats.avg_duration_ms) == (10.0, 30.0, 20.0)
+        assert len(tracer.metrics) == 2  # ring keeps the newest, aggregates keep everything
+        assert tracer.stats['router:select'].count == 3
+
+    def test_slowest_and_error_queries(self):
+        tracer = PerformanceTracer()
+        for operation, duration, errors in (('fast', 1.0, 0), ('slow', 50.0, 1), ('mid', 10.0, 5)):
+            key = tracer.key_id('cache', operation)
+            for i in range(10):
+                tracer.record(key, duration, success=i >= errors)
+        tracer.key_id('cache', 'never_called')
+        assert [s.operation for s in tracer.get_slowest_operations(2)] == ['slow', 'mid']
+        assert [s.operation for s in tracer.get_error_operations(0.5)] == ['mid']
+        assert {s.operation for s in tracer.get_error_operations(0.0)} == {'fast', 'slow', 'mid'}
+        assert [s.operation for s in tracer.get_stats(operation='fast')] == ['fast']
+        report = tracer.get_report()
+        assert report['total_operations'] == 30 and report['total_errors'] == 6
+        assert len(report['all_stats']) == 3
+
+    def test_recent_metrics_rebuilt_from_columns(self):
+        tracer = PerformanceTracer(max_metrics=4)
+        for i in range(6):
+            tracer.record_metric(PerformanceMetric(
+                name='op', component='a' if i % 2 else 'b', duration_ms=float(i),
+                timestamp=datetime(2025, 1, 1, 0, 0, i), success=i != 5,
+                error='ValueError' if i == 5 else None, metadata={'i': i}))
+        recent = tracer.get_recent_metrics(3)
+        assert [m.duration_ms for m in recent] == [3.0, 4.0, 5.0]
+        assert recent[-1].error == 'ValueError' and not recent[-1].success
+        assert recent[0].timestamp == datetime(2025, 1, 1, 0, 0, 3) and recent[0].metadata == {'i': 3}
+        assert [m.duration_ms for m in tracer.get_recent_metrics(10, component='a')] == [3.0, 5.0]
+
+    def test_latency_percentiles_over_retained_window(self):
+        tracer = PerformanceTracer()
+        now = time.time()
+        for i in range(100):
+            tracer.record(tracer.key_id('llm', 'generate'), float(i + 1), success=i % 10 != 0,
+                          timestamp=now - 600 if i < 50 else now)
+        tracer.record(tracer.key_id('cache', 'get'), 1000.0)
+        everything = tracer.get_latency_percentiles(percentiles=(50, 100))
+        assert everything['count'] == 101 and everything['p100'] == 1000.0
+        llm = tracer.get_latency_percentiles(component='llm', percentiles=(50, 99))
+        assert llm['count'] == 100 and llm['error_rate'] == 0.1
+        assert llm['p50'] == pytest.approx(50.5)
+        recent = tracer.get_latency_percentiles(component='llm', operation='generate', window_seconds=60)
+        assert recent['count'] == 50 and recent['p50'] == pytest.approx(75.5)
+        assert tracer.get_latency_percentiles(component='missing') == {'count': 0, 'error_rate': 0.0}
+
+    def test_clear(self):
+        tracer = PerformanceTracer()
+        tracer.record(tracer.key_id('a', 'b'), 1.0)
+        tracer.clear()
+        assert tracer.get_stats() == [] and tracer.get_recent_metrics() == []
+        assert tracer.get_report()['total_operations'] == 0
+
+
+@pytest.mark.unit
+class TestTraceDecorators:
+    """Decorators and blocks feed the global tracer"""
+
+    def test_sync_async_and_errors(self):
+        @trace_performance('unit_tracer_decorators')
+        def add(a, b):
+            return a + b
+
+        @trace_performance('unit_tracer_decorators', operation='fetch')
+        async def fetch():
+            return 'ok'
+
+        @trace_performance('unit_tracer_decorators')
+        def fail():
+            raise KeyError('missing')
+
+        assert add(1, 2) == 3
+        assert asyncio.run(fetch()) == 'ok'
+        with pytest.raises(KeyError):
+            fail()
+        stats = stats_for('unit_tracer_decorators')
+        assert stats['add'].count == 1 and stats['fetch'].count == 1
+        assert stats['fail'].error_count == 1
+        assert performance_tracer.get_recent_metrics(1)[0].error == 'KeyError'
+
+    def test_sampling_records_weighted_subset(self):
+        calls = []
+
+        @trace_performance('unit_tracer_sampling', sample_rate=0.25)
+        def sampled(i):
+            calls.append(i)
+            return i
+
+        before = len(performance_tracer.get_recent_metrics(10_000, component='unit_tracer_sampling'))
+        assert [sampled(i) for i in range(100)] == list(range(100))
+        recorded = performance_tracer.get_recent_metrics(10_000, component='unit_tracer_sampling')
+        assert len(calls) == 100
+        assert len(recorded) - before == 25
+        assert stats_for('unit_tracer_sampling')['sampled'].count == 100
+
+    def test_invalid_sample_rate(self):
+        with pytest.raises(ValueError):
+            trace_performance('unit_tracer_sampling', sample_rate=0)
+
+    def test_trace_block_keeps_metadata(self):
+        with trace_block('unit_tracer_block', 'select', {'model': 'gpt4'}):
+            pass
+        with pytest.raises(RuntimeError):
+            with trace_block('unit_tracer_block', 'select'):
+                raise RuntimeError('boom')
+        stats = stats_for('unit_tracer_block')['select']
+        assert stats.count == 2 and stats.error_count == 1
+        recent = performance_tracer.get_recent_metrics(2, component='unit_tracer_block')
+        assert recent[0].metadata == {'model': 'gpt4'} and recent[1].error == 'RuntimeError'
@@ -0,0 +1,215 @@
+"""
++==============================================================================
+|              ORFEAS Testing Suite - Preview Service Tests                    |
+|    Thumbnails, mesh previews, content-addressed LRU cache and ETags          |
++==============================================================================
+"""
+import pytest
+import numpy as np
+from pathlib import Path
+import sys
+
+backend_path = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(backend_path))
+
+from flask import Flask, request
+from PIL import Image
+
+from download_service import content_hash
+from preview_service import (
+    AVAILABLE_FORMATS,
+    DerivativeCache,
+    PreviewService,
+    load_mesh_arrays,
+    negotiate_format,
+    render_mesh_preview,
+    send_preview,
+    snap_size,
+)
+
+pytestmark = pytest.mark.skipif('webp' not in AVAILABLE_FORMATS, reason="Pillow built without WebP")
+
+
+def write_png(path: Path, size=(800, 600), seed: int = 0) -> Path:
+    rng = np.random.default_rng(seed)
+    gradient = np.linspace(0, 255, size[0], dtype=np.uint8)[None, :, None]
+    pixels = np.broadcast_to(gradient, (size[1], size[0], 3)).copy()
+    pixels[::7] = rng.integers(0, 256, pixels[::7].shape, dtype=np.uint8)
+    Image.fromarray(pixels).save(path)
+    return path
+
+
+def cube():
+    vertices = np.array([[x, y, z] for x in (0, 1) for y in (0, 1) for z in (0, 1)], dtype=np.float64)
+    faces = np.array([
+        [0, 1, 3], [0, 3, 2], [4, 6, 7], [4, 7, 5], [0, 4, 5], [0, 5, 1],
+        [2, 3, 7], [2, 7, 6], [0, 2, 6], [0, 6, 4], [1, 5, 7], [1, 7, 3],
+    ])
+    return vertices, faces
+
+
+def write_binary_stl(path: Path, vertices, faces) -> Path:
+    triangles = vertices[faces].astype('<f4')
+    record = np.zeros(len(faces), dtype=[('normal', '<f4', 3), ('vertices', '<f4', (3, 3)), ('attr', '<u2')])
+    record['vertices'] = triangles
+    path.write_bytes(b'\0' * 80 + len(faces).to_bytes(4, 'little') + record.tobytes())
+    return path
+
+
+@pytest.fixture
+def service(tmp_path):
+    svc = PreviewService(tmp_path / 'cache', workers=1)
+    yield svc
+    svc.shutdown()
+
+
+@pytest.mark.unit
+class TestNegotiation:
+    """Size snapping and format negotiation"""
+
+    def test_snap_size(self):
+        assert snap_size(10) == 128
+        assert snap_size(200) == 256
+        assert snap_size(256) == 256
+        assert snap_size(4000) == 512
+
+    def test_negotiate_format(self):
+        assert negotiate_format('image/webp,*/*', ('avif', 'webp')) == 'webp'
+        assert negotiate_format('image/avif,image/webp', ('avif', 'webp')) == 'avif'
+        assert negotiate_format('image/png', ('avif', 'webp')) is None
+        assert negotiate_format(None, ('webp',)) is None
+
+
+@pytest.mark.unit
+class TestThumbnails:
+    """Derivative generation and content addressing"""
+
+    def test_generates_every_size_and_format(self, service, tmp_path):
+        source = write_png(tmp_path / 'a.png')
+        with Image.open(source) as image:
+            image.load()
+            written = service.schedule_thumbnails(image, content_hash(source)).result(timeout=60)
+        assert set(written) == {(size, fmt) for size in service.sizes for fmt in service.formats}
+        for (size, fmt), path in written.items():
+            with Image.open(path) as thumb:
+                assert thumb.format == fmt.upper()
+                assert thumb.width == size
+                assert thumb.height == round(600 * size / 800)
+
+    def test_identical_content_shares_derivatives(self, service, tmp_path):
+        first = write_png(tmp_path / 'first.png', seed=3)
+        second = tmp_path / 'second.png'
+        second.write_bytes(first.read_bytes())
+        path_a, _, etag_a = service.derivative(first, 256, 'image/webp')
+        path_b, _, etag_b = service.derivative(second, 256, 'image/webp')
+        assert path_a == path_b and etag_a == etag_b
+        assert len(service.cache) == 1
+
+    def test_small_images_are_not_upscaled(self, service, tmp_path):
+        source = write_png(tmp_path / 'small.png', size=(100, 50))
+        path, mimetype, _ = service.derivative(source, 512, 'image/webp')
+        assert mimetype == 'image/webp'
+        with Image.open(path) as thumb:
+            assert thumb.size == (100, 50)
+
+    def test_no_accepted_format_serves_original(self, service, tmp_path):
+        source = write_png(tmp_path / 'a.png')
+        assert service.derivative(source, 256, 'image/png') is None
+
+
+@pytest.mark.unit
+class TestDerivativeCache:
+    """LRU disk eviction"""
+
+    def test_lru_eviction_respects_budget(self, tmp_path):
+        cache = DerivativeCache(tmp_path / 'cache', max_bytes=2500)
+        paths = [cache.path_for(f"{i:064x}", 'w128', '.webp') for i in range(3)]
+        cache.put(paths[0], b'a' * 1000)
+        cache.put(paths[1], b'b' * 1000)
+        assert cache.get(paths[0]) == paths[0]  # 0 becomes most recently used
+        cache.put(paths[2], b'c' * 1000)
+        assert cache.total_bytes == 2000
+        assert paths[0].exists() and paths[2].exists()
+        assert not paths[1].exists()
+        assert cache.get(paths[1]) is None
+
+    def test_index_rebuilt_from_disk(self, tmp_path):
+        cache = DerivativeCache(tmp_path / 'cache')
+        path = cache.put(cache.path_for('ab' * 32, 'w256', '.webp'), b'x' * 10)
+        reopened = DerivativeCache(tmp_path / 'cache', max_bytes=1000)
+        assert len(reopened) == 1 and reopened.total_bytes == 10
+        assert reopened.get(path) == path
+
+    def test_rejects_non_digest_keys(self, tmp_path):
+        cache = DerivativeCache(tmp_path / 'cache')
+        with pytest.raises(ValueError):
+            cache.path_for('../../etc/passwd', 'w128', '.webp')
+
+
+@pytest.mark.unit
+class TestMeshPreviews:
+    """STL/OBJ loading and off-screen rendering"""
+
+    def test_binary_and_ascii_stl(self, tmp_path):
+        vertices, faces = cube()
+        binary_vertices, binary_faces = load_mesh_arrays(write_binary_stl(tmp_path / 'c.stl', vertices, faces))
+        assert binary_faces.shape == (12, 3)
+        np.testing.assert_allclose(binary_vertices[binary_faces], vertices[faces])
+
+        lines = ['solid c']
+        for face in faces:
+            lines += ['facet normal 0 0 0', 'outer loop']
+            lines += [f"vertex {x} {y} {z}" for x, y, z in vertices[face]]
+            lines += ['endloop', 'endfacet']
+        (tmp_path / 'a.stl').write_text('\n'.join(lines + ['endsolid c']))
+        ascii_vertices, ascii_faces = load_mesh_arrays(tmp_path / 'a.stl')
+        np.testing.assert_allclose(ascii_vertices[ascii_faces], vertices[faces])
+
+    def test_obj_polygons_are_triangulated(self, tmp_path):
+        (tmp_path / 'q.obj').write_text("v 0 0 0\nv 1 0 0\nv 1 1 0\nv 0 1 0\nf 1/1 2/2 3/3 4/4\n")
+        vertices, faces = load_mesh_arrays(tmp_path / 'q.obj')
+        assert vertices.shape == (4, 3)
+        assert faces.tolist() == [[0, 1, 2], [0, 2, 3]]
+
+    def test_render_is_shaded_and_centered(self):
+        image = render_mesh_preview(*cube(), size=64)
+        alpha = np.asarray(image)[:, :, 3]
+        assert image.size == (64, 64)
+        assert alpha[32, 32] == 255 and alpha[0, 0] == 0
+        colors = {tuple(c) for c in np.asarray(image)[alpha == 255][:, :3]}
+        assert len(colors) >= 3  # three visible cube faces, different shades
+
+    def test_mesh_derivative(self, service, tmp_path):
+        stl = write_binary_stl(tmp_path / 'model.stl', *cube())
+        path, mimetype, etag = service.derivative(stl, 256, 'image/webp')
+        assert mimetype == 'image/webp' and 'mesh' in etag
+        with Image.open(path) as preview:
+            assert preview.size == (256, 256)
+
+
+@pytest.mark.unit
+class TestSendPreview:
+    """Conditional responses and cache headers"""
+
+    def test_etag_and_pinned_versions(self, service, tmp_path):
+        source = write_png(tmp_path / 'a.png')
+        digest = content_hash(source)
+        app = Flask(__name__)
+
+        @app.route('/thumb')
+        def thumb():
+            path, mimetype, etag = service.derivative(source, 256, request.headers.get('Accept'))
+            return send_preview(request, path, mimetype, etag, vary_accept=True, version=digest)
+
+        client = app.test_client()
+        first = client.get('/thumb', headers={'Accept': 'image/webp'})
+        assert first.status_code == 200
+        assert first.headers['Content-Disposition'].startswith('inline')
+        assert 'Accept' in first.headers['Vary']
+        assert 'no-cache' in first.headers['Cache-Control']
+
+        revalidated = client.get('/thumb', headers={'Accept': 'image/webp', 'If-None-Match': first.headers['ETag']})
+        assert revalidated.status_code == 304 and revalidated.data == b''
+
+        pinned = client.get(f'/thumb?v={digest[:16]}', headers={'Accept': 'image/webp'})
+        assert 'immutable' in pinned.headers['Cache-Control']
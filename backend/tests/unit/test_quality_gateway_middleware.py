@@ -0,0 +1,122 @@
+"""
++==============================================================================
+|            ORFEAS Testing Suite - Quality Gateway Middleware Tests           |
+|      Rolling request window, background gate evaluation, cached verdicts     |
++==============================================================================
+"""
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+backend_path = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(backend_path))
+
+flask = pytest.importorskip("flask")
+
+from quality_gateway_middleware import QualityGatewayMiddleware, RollingRequestWindow
+
+
+@pytest.fixture
+def gated_app():
+    app = flask.Flask(__name__)
+    gateway = QualityGatewayMiddleware(app, evaluation_interval=0.02)
+
+    @app.route('/ok')
+    def ok():
+        return 'ok'
+
+    @app.route('/fail')
+    def fail():
+        return 'nope', 500
+
+    yield app, gateway
+    gateway.stop_evaluator()
+
+
+@pytest.mark.unit
+class TestRollingRequestWindow:
+    """Bucketed counters and histogram"""
+
+    def test_aggregates_within_window(self):
+        window = RollingRequestWindow(window_seconds=60, bucket_seconds=10)
+        now = 1_000_000.0
+        for duration in (0.02, 0.02, 0.2, 3.0):
+            window.record(duration, True, now=now)
+        window.record(0.02, False, now=now - 25)
+        stats = window.snapshot(60, now=now)
+        assert stats['count'] == 5 and stats['errors'] == 1
+        assert stats['error_rate'] == pytest.approx(0.2)
+        assert stats['mean'] == pytest.approx(3.26 / 5)
+        assert stats['p50'] == 0.025 and stats['p99'] == 5.0
+        assert window.snapshot(10, now=now)['count'] == 4
+
+    def test_old_buckets_expire_and_memory_is_bounded(self):
+        window = RollingRequestWindow(window_seconds=60, bucket_seconds=10)
+        now = 1_000_000.0
+        window.record(1.0, False, now=now - 300)
+        assert window.snapshot(60, now=now)['count'] == 0
+        for i in range(10_000):
+            window.record(0.1, True, now=now + i * 0.05)
+        assert len(window.ring) == 7
+        assert window.snapshot(60, now=now + 500)['count'] <= 10_000
+
+    def test_empty_window(self):
+        stats = RollingRequestWindow().snapshot(300)
+        assert stats['count'] == 0 and stats['mean'] is None and stats['p99'] is None
+
+
+@pytest.mark.unit
+class TestQualityGatewayMiddleware:
+    """Requests read the cached verdict; the evaluator refreshes it"""
+
+    def test_request_uses_cached_verdict(self, gated_app, monkeypatch):
+        app, gateway = gated_app
+        evaluated_on = set()
+        execute = gateway.execute_quality_gate
+
+        def recording(gate):
+            evaluated_on.add(threading.current_thread().name)
+            return execute(gate)
+
+        monkeypatch.setattr(gateway, 'execute_quality_gate', recording)
+        response = app.test_client().get('/ok')
+        assert threading.current_thread().name not in evaluated_on
+        assert response.status_code == 200
+        assert response.headers['X-Quality-Gates'] == '4'
+        assert float(response.headers['X-Quality-Score']) == pytest.approx(gateway.verdict.quality_score)
+        assert gateway.request_window.snapshot(60)['count'] == 1
+        assert gateway.quality_history[-1]['gate_results'] is gateway.verdict.gate_summary
+
+    def test_evaluator_reacts_to_errors(self, gated_app):
+        app, gateway = gated_app
+        client = app.test_client()
+        for _ in range(20):
+            client.get('/fail')
+        deadline = time.time() + 5
+        while time.time() < deadline and all(c.gate_id != 'reliability_gate' for c in gateway.verdict.failed):
+            time.sleep(0.01)
+        assert 'reliability_gate' in {c.gate_id for c in gateway.verdict.failed}
+        assert gateway.evaluations > 1
+        assert gateway.get_recent_error_rate() == 1.0
+
+    def test_adaptive_gate_degrades_service(self, gated_app):
+        app, gateway = gated_app
+        for _ in range(5):
+            gateway.request_window.record(45.0, True)
+        gateway.evaluate_gates()
+        response = app.test_client().get('/ok')
+        assert response.headers['X-Service-Degraded'] == 'high'
+
+    def test_bypass(self, gated_app):
+        app, gateway = gated_app
+        response = app.test_client().get('/ok', headers={'X-User-Role': 'admin'})
+        assert 'X-Quality-Score' not in response.headers
+        assert gateway.request_window.snapshot(60)['count'] == 1
+
+    def test_status(self, gated_app):
+        _, gateway = gated_app
+        status = gateway.get_quality_status()
+        assert status['enabled_gates'] == 4 and status['evaluations'] >= 1
@@ -0,0 +1,214 @@
+"""
++==============================================================================
+|              ORFEAS Testing Suite - Rate Limiting Tests                      |
+|      GCRA budgets, route costs, LRU bound, timer wheel and blocking          |
++==============================================================================
+"""
+import pytest
+from pathlib import Path
+import sys
+
+backend_path = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(backend_path))
+
+from flask import Flask, jsonify
+
+from rate_limiting import (
+    REASON_ABUSE,
+    REASON_BLOCKED,
+    REASON_RATE_LIMITED,
+    RateLimiter,
+    TimerWheel,
+    parse_route_costs,
+)
+from shared_state import LocalSharedState
+
+
+class FakeClock:
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.mark.unit
+class TestGCRA:
+    """Token-bucket semantics of the GCRA state"""
+
+    def test_burst_then_limited(self, clock):
+        limiter = RateLimiter(requests_per_minute=60, burst=5, clock=clock)
+        assert all(limiter.check('a').allowed for _ in range(5))
+        decision = limiter.check('a')
+        assert not decision.allowed
+        assert decision.reason == REASON_RATE_LIMITED
+        assert decision.retry_after == pytest.approx(1.0)
+
+    def test_refills_at_sustained_rate(self, clock):
+        limiter = RateLimiter(requests_per_minute=60, burst=2, clock=clock)
+        assert limiter.check('a').allowed and limiter.check('a').allowed
+        assert not limiter.check('a').allowed
+        clock.now += 1.0
+        assert limiter.check('a').allowed
+        assert not limiter.check('a').allowed
+        clock.now += 60
+        assert limiter.check('a').allowed and limiter.check('a').allowed
+
+    def test_denied_requests_do_not_spend_budget(self, clock):
+        limiter = RateLimiter(requests_per_minute=60, burst=1, clock=clock)
+        assert limiter.check('a').allowed
+        for _ in range(10):
+            assert not limiter.check('a').allowed
+        clock.now += 1.0
+        assert limiter.check('a').allowed
+
+    def test_keys_are_independent(self, clock):
+        limiter = RateLimiter(requests_per_minute=60, burst=1, clock=clock)
+        assert limiter.check('a').allowed
+        assert not limiter.check('a').allowed
+        assert limiter.check('b').allowed
+
+    def test_route_costs(self, clock):
+        limiter = RateLimiter(requests_per_minute=60, burst=10,
+                              route_costs={'cheap': 0.5}, clock=clock)
+        assert limiter.check('a', endpoint='generate_3d').allowed
+        assert not limiter.check('a', endpoint='generate_3d').allowed
+        assert sum(limiter.check('b', endpoint='cheap').allowed for _ in range(30)) == 20
+        assert limiter.cost_for('generate_3d', premium=True) == 20.0
+        assert limiter.cost_for('unknown') == 1.0
+
+    def test_parse_route_costs(self):
+        assert parse_route_costs("generate_3d=10, job_status=0.25,bad,x=y") == {
+            'generate_3d': 10.0, 'job_status': 0.25}
+
+    def test_compat_interfaces(self, clock):
+        limiter = RateLimiter(requests_per_minute=60, burst=1, clock=clock)
+        assert limiter.is_allowed('a') == (True, None)
+        allowed, message = limiter.is_allowed('a')
+        assert not allowed and 'Rate limit exceeded' in message
+        assert limiter.is_rate_limited('a')
+
+
+@pytest.mark.unit
+class TestBoundedKeys:
+    """LRU bound on tracked keys"""
+
+    def test_table_never_exceeds_max_keys(self, clock):
+        limiter = RateLimiter(max_keys=100, clock=clock)
+        for i in range(1000):
+            limiter.check(f"10.0.{i // 256}.{i % 256}")
+        assert len(limiter) == 100
+        assert limiter.stats()['evictions'] == 900
+
+    def test_recently_used_keys_survive(self, clock):
+        limiter = RateLimiter(requests_per_minute=60, burst=1, max_keys=3, clock=clock)
+        limiter.check('hot')
+        for key in ('a', 'b', 'c', 'd'):
+            assert not limiter.check('hot').allowed
+            limiter.check(key)
+        assert not limiter.check('hot').allowed
+
+
+@pytest.mark.unit
+class TestBlocking:
+    """Abuse meter and timer-wheel block expiry"""
+
+    def test_aggressive_client_blocked_then_released(self, clock):
+        limiter = RateLimiter(requests_per_minute=60, burst=5, block_multiplier=2,
+                              block_seconds=600, clock=clock)
+        reasons = [limiter.check('a').reason for _ in range(11)]
+        assert reasons[:5] == [None] * 5
+        assert reasons[5:10] == [REASON_RATE_LIMITED] * 5
+        assert reasons[10] == REASON_ABUSE
+        assert limiter.check('a').reason == REASON_BLOCKED
+        assert limiter.check('b').allowed
+
+        clock.now += 599
+        assert limiter.is_blocked('a')
+        clock.now += 2
+        assert not limiter.is_blocked('a')
+        assert limiter.check('a').allowed
+        clock.now += 600
+        limiter.check('b')
+        assert limiter.stats()['blocked_keys'] == 0
+
+    def test_manual_block_and_unblock(self, clock):
+        limiter = RateLimiter(clock=clock)
+        limiter.block('a', 30)
+        assert limiter.block_remaining('a') == pytest.approx(30)
+        limiter.unblock('a')
+        assert limiter.check('a').allowed
+
+    def test_timer_wheel(self):
+        wheel = TimerWheel(tick_seconds=1.0, slots=8)
+        wheel.schedule('soon', 3.5)
+        wheel.schedule('later', 20.0)  # more than one revolution ahead
+        assert wheel.advance(0.0) == []
+        assert wheel.advance(3.9) == []
+        assert wheel.advance(4.0) == ['soon']
+        assert wheel.advance(12.0) == []
+        assert wheel.advance(21.0) == ['later']
+        assert len(wheel) == 0
+
+    def test_timer_wheel_idle_gap(self):
+        wheel = TimerWheel(tick_seconds=1.0, slots=8)
+        wheel.advance(0.0)
+        for i in range(20):
+            wheel.schedule(f"k{i}", float(i))
+        assert sorted(wheel.advance(1000.0)) == sorted(f"k{i}" for i in range(20))
+
+
+@pytest.mark.unit
+class TestSharedState:
+    """Budgets and blocks held in a SharedState backend"""
+
+    def test_workers_share_budget(self):
+        state = LocalSharedState()
+        worker_a = RateLimiter(requests_per_minute=60, burst=4, shared_state=state)
+        worker_b = RateLimiter(requests_per_minute=60, burst=4, shared_state=state)
+        results = [worker.check('ip').allowed for worker in (worker_a, worker_b) * 3]
+        assert results.count(True) == 4
+
+    def test_blocks_visible_to_other_workers(self):
+        state = LocalSharedState()
+        worker_a = RateLimiter(shared_state=state)
+        worker_b = RateLimiter(shared_state=state)
+        worker_a.block('ip', 60)
+        assert worker_b.check('ip').reason == REASON_BLOCKED
+
+
+@pytest.mark.unit
+class TestIntegration:
+    """validation.get_rate_limiter and SecurityHardening use the same limiter"""
+
+    def test_validation_singleton(self, monkeypatch):
+        validation = pytest.importorskip("validation")
+        monkeypatch.setattr(validation, '_rate_limiter', None)
+        limiter = validation.get_rate_limiter(max_requests=5, window_seconds=10)
+        assert isinstance(limiter, RateLimiter)
+        assert [limiter.is_allowed('ip')[0] for _ in range(6)] == [True] * 5 + [False]
+        assert limiter.is_allowed('other')[0]
+
+    def test_security_hardening_hook(self, monkeypatch):
+        monkeypatch.setenv('MAX_REQUESTS_PER_MINUTE', '3')
+        from security_hardening import SecurityHardening
+        app = Flask(__name__)
+        SecurityHardening().setup_rate_limiting(app)
+
+        @app.route('/api/ping')
+        def ping():
+            return jsonify({'ok': True})
+
+        @app.route('/page')
+        def page():
+            return 'page'
+
+        client = app.test_client()
+        statuses = [client.get('/api/ping').status_code for _ in range(8)]
+        assert statuses == [200] * 3 + [429] * 4 + [403]
+        assert client.get('/page').status_code == 403
@@ -0,0 +1,153 @@
+"""
++==============================================================================
+|            ORFEAS Testing Suite - Request Inspection Tests                   |
+|     Compiled rule sets, source scoping, size caps and the Flask hook         |
++==============================================================================
+"""
+import pytest
+from pathlib import Path
+import sys
+
+backend_path = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(backend_path))
+
+from flask import Flask, jsonify
+
+from request_inspection import (
+    DEFAULT_RULES,
+    FAMILY_COMMAND,
+    FAMILY_PATH,
+    FAMILY_SQL,
+    FAMILY_XSS,
+    SOURCE_ARGS,
+    SOURCE_JSON,
+    SOURCE_PATH,
+    RequestInspector,
+    extract_json_strings,
+)
+from security_hardening import SecurityHardening
+
+
+@pytest.fixture
+def inspector():
+    return RequestInspector()
+
+
+@pytest.fixture
+def client():
+    app = Flask(__name__)
+    SecurityHardening().setup_input_validation(app)
+
+    @app.route('/api/echo', methods=['GET', 'POST'])
+    def echo():
+        return jsonify({'ok': True})
+
+    @app.route('/api/upload', methods=['POST'])
+    def upload():
+        return jsonify({'ok': True})
+
+    return app.test_client()
+
+
+@pytest.mark.unit
+class TestRuleMatching:
+    """Combined automata agree with the individual rules"""
+
+    def test_rule_ids_are_unique(self):
+        ids = [rule.rule_id for rule in DEFAULT_RULES]
+        assert len(ids) == len(set(ids))
+
+    @pytest.mark.parametrize("value,family", [
+        ("1 UNION SELECT password FROM users", FAMILY_SQL),
+        ("admin' OR '1'='1", FAMILY_SQL),
+        ("<SCRIPT>alert(1)</SCRIPT>", FAMILY_XSS),
+        ("JavaScript:alert(1)", FAMILY_XSS),
+        ("../../etc/passwd", FAMILY_PATH),
+        ("C:\\Windows\\system32", FAMILY_PATH),
+        ("foo; rm -rf /", FAMILY_COMMAND),
+        ("$(whoami)", FAMILY_COMMAND),
+    ])
+    def test_detects_family(self, inspector, value, family):
+        assert family in inspector.inspect_values([(SOURCE_ARGS, value)]).families
+
+    @pytest.mark.parametrize("value", [
+        "a cat sitting on a chair", "model_v2.stl", "quality=high", "42", "",
+    ])
+    def test_clean_values(self, inspector, value):
+        assert not inspector.inspect_values([(SOURCE_ARGS, value)])
+
+    def test_command_rules_are_case_sensitive(self, inspector):
+        assert inspector.match_value(SOURCE_ARGS, "curl http://x") == ['cmd-005']
+        assert inspector.match_value(SOURCE_ARGS, "CURL http://x") == []
+
+    def test_joined_scan_matches_per_value(self, inspector):
+        values = ["select * from t union all select 1", "<iframe src=x>", "..%2fetc",
+                  "x | cat /etc", "onload = go()", "~/secrets", "`id`", "clean"]
+        expected = set()
+        for value in values:
+            expected.update(inspector.match_value(SOURCE_ARGS, value))
+        result = inspector.inspect_values([(SOURCE_ARGS, value) for value in values])
+        assert set(result.rule_ids) == expected
+
+    def test_no_match_across_values(self, inspector):
+        # "or" + "b=c" only matches sqli-002 when the two values are concatenated
+        assert not inspector.inspect_values([(SOURCE_JSON, "this or"), (SOURCE_JSON, "b=c")])
+        assert inspector.inspect_values([(SOURCE_JSON, "this or b=c")]).families == (FAMILY_SQL,)
+
+    def test_sources_scope_rules(self, inspector):
+        # JSON bodies are not checked for path traversal or shell metacharacters
+        assert not inspector.inspect_values([(SOURCE_JSON, "a & b ~ c")])
+        # Paths are only checked for traversal
+        assert inspector.inspect_values([(SOURCE_PATH, "/api/<script>")]).families == ()
+        assert inspector.inspect_values([(SOURCE_PATH, "/files/../x")]).families == (FAMILY_PATH,)
+
+    def test_families_reported_in_order(self, inspector):
+        result = inspector.inspect_values([(SOURCE_ARGS, "<script>x</script>; DROP TABLE users")])
+        assert result.families[:2] == (FAMILY_SQL, FAMILY_XSS)
+        assert list(result.rule_ids) == sorted(result.rule_ids, key=[r.rule_id for r in DEFAULT_RULES].index)
+
+    def test_oversized_value_flagged(self):
+        inspector = RequestInspector(max_value_length=8)
+        result = inspector.inspect_values([(SOURCE_ARGS, "x" * 9)])
+        assert result.oversized and not result.rule_ids
+
+    def test_extract_json_strings_is_iterative(self):
+        data = "leaf"
+        for _ in range(5000):
+            data = {"k": [data, 1, None]}
+        assert extract_json_strings(data) == ["leaf"]
+        assert extract_json_strings({"a": "1", "b": ["2", {"c": "3"}]}) == ["1", "2", "3"]
+
+
+@pytest.mark.unit
+class TestInputValidationHook:
+    """SecurityHardening.setup_input_validation wiring"""
+
+    def test_clean_requests_pass(self, client):
+        assert client.get('/api/echo?prompt=a+red+chair').status_code == 200
+        assert client.post('/api/echo', json={'prompt': 'a red chair', 'steps': 20}).status_code == 200
+        assert client.post('/api/echo', data={'name': 'chair'}).status_code == 200
+
+    @pytest.mark.parametrize("query,message", [
+        ("q=1 union select 1", b"Invalid input detected"),
+        ("q=<script>x</script>", b"Malicious script detected"),
+        ("q=../../etc/passwd", b"Path traversal attempt detected"),
+        ("q=a;b", b"Command injection attempt detected"),
+    ])
+    def test_attacks_rejected_with_400(self, client, query, message):
+        response = client.get(f'/api/echo?{query}')
+        assert response.status_code == 400
+        assert message in response.data
+
+    def test_json_body_inspected(self, client):
+        response = client.post('/api/echo', json={'nested': [{'p': '<script>x</script>'}]})
+        assert response.status_code == 400
+
+    def test_oversized_json_rejected(self, client):
+        response = client.post('/api/echo', json={'p': 'x' * (2 * 1024 * 1024)})
+        assert response.status_code == 413
+
+    def test_binary_body_skipped(self, client):
+        response = client.post('/api/upload', data=b'\x89PNG ../; <script>',
+                               content_type='application/octet-stream')
+        assert response.status_code == 200
@@ -0,0 +1,135 @@
+"""
++==============================================================================
+|              ORFEAS Testing Suite - Request Metrics Middleware Tests        |
+|         Method/route/status capture, shard aggregation and exemplars        |
++==============================================================================
+"""
+import pytest
+import threading
+from pathlib import Path
+import sys
+
+backend_path = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(backend_path))
+
+flask = pytest.importorskip("flask")
+from prometheus_client import CollectorRegistry
+from prometheus_client.openmetrics.exposition import generate_latest as openmetrics_generate_latest
+
+from request_metrics import (
+    RequestMetricsCollector,
+    UNMATCHED_ROUTE,
+    init_request_metrics,
+    trace_id_from_environ,
+)
+
+
+@pytest.fixture
+def metered_app():
+    app = flask.Flask(__name__)
+    collector = RequestMetricsCollector(exemplar_threshold_seconds=0.0)
+
+    @app.route('/api/job-status/<job_id>', methods=['GET'])
+    def job_status(job_id):
+        if job_id == 'missing':
+            return flask.jsonify({'error': 'not found'}), 404
+        return flask.jsonify({'job_id': job_id})
+
+    @app.route('/api/upload-image', methods=['POST'])
+    def upload():
+        raise RuntimeError("boom")
+
+    init_request_metrics(app, collector=collector)
+    return app, collector
+
+
+def sample_value(registry: CollectorRegistry, name: str, labels: dict) -> float:
+    value = registry.get_sample_value(name, labels)
+    return value if value is not None else 0.0
+
+
+@pytest.mark.unit
+class TestRequestMetricsMiddleware:
+    """Middleware labelling and aggregation"""
+
+    def test_records_route_template_method_and_status(self, metered_app) -> None:
+        app, collector = metered_app
+        client = app.test_client()
+        client.get('/api/job-status/abc').close()
+        client.get('/api/job-status/def').close()
+        client.get('/api/job-status/missing').close()
+
+        registry = CollectorRegistry()
+        registry.register(collector)
+        labels = {'method': 'GET', 'endpoint': '/api/job-status/<job_id>'}
+        assert sample_value(registry, 'http_requests_total', {**labels, 'status': '200'}) == 2
+        assert sample_value(registry, 'http_requests_total', {**labels, 'status': '404'}) == 1
+        assert sample_value(registry, 'http_request_duration_seconds_count', labels) == 3
+
+    def test_handler_error_reports_500_post(self, metered_app) -> None:
+        app, collector = metered_app
+        app.testing = False
+        app.test_client().post('/api/upload-image').close()
+
+        registry = CollectorRegistry()
+        registry.register(collector)
+        assert sample_value(registry, 'http_requests_total', {
+            'method': 'POST', 'endpoint': '/api/upload-image', 'status': '500'
+        }) == 1
+
+    def test_unmatched_paths_share_one_label(self, metered_app) -> None:
+        app, collector = metered_app
+        client = app.test_client()
+        for i in range(5):
+            client.get(f'/random/{i}').close()
+
+        snapshot = collector.snapshot()
+        endpoints = {endpoint for _, endpoint, _ in snapshot.requests}
+        assert endpoints == {UNMATCHED_ROUTE}
+        assert snapshot.in_progress == 0
+
+    def test_shards_from_many_threads_are_aggregated(self) -> None:
+        collector = RequestMetricsCollector()
+
+        def worker():
+            for _ in range(100):
+                collector.record('GET', '/api/health', '200', 0.002)
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        del threads
+
+        snapshot = collector.snapshot()
+        assert snapshot.requests[('GET', '/api/health', '200')] == 800
+        assert sum(snapshot.durations[('GET', '/api/health')].bucket_counts) == 800
+
+    def test_slow_requests_carry_trace_exemplar(self, metered_app) -> None:
+        app, collector = metered_app
+        app.test_client().get(
+            '/api/job-status/abc',
+            headers={'traceparent': '00-4bf92f3577b34da6a3ce929d0e0e4736-00f067aa0ba902b7-01'}
+        ).close()
+        registry = CollectorRegistry()
+        registry.register(collector)
+        payload = openmetrics_generate_latest(registry).decode()
+        assert 'trace_id="4bf92f3577b34da6a3ce929d0e0e4736"' in payload
+
+    def test_trace_id_header_fallbacks(self) -> None:
+        assert trace_id_from_environ({'HTTP_X_TRACE_ID': 'abc'}) == 'abc'
+        assert trace_id_from_environ({'HTTP_X_REQUEST_ID': 'req'}) == 'req'
+        assert trace_id_from_environ({}) is None
+
+    def test_skip_paths_are_not_measured(self) -> None:
+        app = flask.Flask(__name__)
+        collector = RequestMetricsCollector()
+
+        @app.route('/metrics')
+        def metrics():
+            return 'ok'
+
+        init_request_metrics(app, collector=collector)
+        app.test_client().get('/metrics').close()
+        assert collector.snapshot().requests == {}
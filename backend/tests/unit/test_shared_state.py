@@ -0,0 +1,145 @@
+"""
++==============================================================================
+|                ORFEAS Testing Suite - Shared State Tests                    |
+|          Leased locks, shared token buckets and TTL key-value store         |
++==============================================================================
+"""
+import pytest
+import time
+from pathlib import Path
+import sys
+
+backend_path = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(backend_path))
+
+from shared_state import LocalSharedState, SQLiteSharedState, DistributedLock
+
+
+@pytest.fixture(params=['local', 'sqlite'])
+def state(request, tmp_path):
+    if request.param == 'local':
+        shared = LocalSharedState()
+    else:
+        shared = SQLiteSharedState(str(tmp_path / 'shared.db'))
+    yield shared
+    shared.close()
+
+
+@pytest.mark.unit
+class TestLocks:
+    """Leased lock semantics"""
+
+    def test_lock_is_exclusive_until_released(self, state):
+        token = state.acquire_lock('job:1', ttl_seconds=30)
+        assert token is not None
+        assert state.acquire_lock('job:1', ttl_seconds=30) is None
+        assert state.acquire_lock('job:2', ttl_seconds=30) is not None
+
+        assert state.release_lock('job:1', token)
+        assert state.acquire_lock('job:1', ttl_seconds=30) is not None
+
+    def test_release_requires_owner_token(self, state):
+        token = state.acquire_lock('job:1', ttl_seconds=30)
+        assert not state.release_lock('job:1', 'not-the-owner')
+        assert state.acquire_lock('job:1', ttl_seconds=30) is None
+        assert state.release_lock('job:1', token)
+
+    def test_expired_lease_can_be_taken_over(self, state):
+        stale = state.acquire_lock('job:1', ttl_seconds=0.05)
+        time.sleep(0.1)
+        fresh = state.acquire_lock('job:1', ttl_seconds=30)
+        assert fresh is not None
+        assert not state.refresh_lock('job:1', stale, ttl_seconds=30)
+        assert not state.release_lock('job:1', stale), "old holder must not release the new lease"
+        assert state.refresh_lock('job:1', fresh, ttl_seconds=30)
+
+    def test_context_manager(self, state):
+        with state.lock('job:1', ttl_seconds=30) as acquired:
+            assert acquired
+            with DistributedLock(state, 'job:1', ttl_seconds=30) as nested:
+                assert not nested
+        assert state.acquire_lock('job:1', ttl_seconds=30) is not None
+
+    def test_blocking_acquire_waits_for_expiry(self, state):
+        state.acquire_lock('job:1', ttl_seconds=0.1)
+        lock = DistributedLock(state, 'job:1', ttl_seconds=30, blocking_timeout=1.0, poll_interval=0.02)
+        assert lock.acquire()
+        lock.release()
+
+
+@pytest.mark.unit
+class TestTokenBucket:
+    """Shared token bucket"""
+
+    def test_burst_then_reject(self, state):
+        results = [state.take_tokens('rl:ip', rate_per_second=1.0, capacity=5)[0] for _ in range(7)]
+        assert results == [True] * 5 + [False] * 2
+
+    def test_retry_after_and_refill(self, state):
+        for _ in range(2):
+            state.take_tokens('rl:ip', rate_per_second=20.0, capacity=2)
+        allowed, retry_after = state.take_tokens('rl:ip', rate_per_second=20.0, capacity=2)
+        assert not allowed
+        assert 0 < retry_after <= 0.05
+        time.sleep(0.06)
+        assert state.take_tokens('rl:ip', rate_per_second=20.0, capacity=2)[0]
+
+    def test_cost_weights(self, state):
+        assert state.take_tokens('rl:ip', rate_per_second=1.0, capacity=10, cost=8)[0]
+        assert not state.take_tokens('rl:ip', rate_per_second=1.0, capacity=10, cost=5)[0]
+        assert state.take_tokens('rl:ip', rate_per_second=1.0, capacity=10, cost=1)[0]
+
+    def test_buckets_are_independent(self, state):
+        assert state.take_tokens('rl:a', rate_per_second=1.0, capacity=1)[0]
+        assert not state.take_tokens('rl:a', rate_per_second=1.0, capacity=1)[0]
+        assert state.take_tokens('rl:b', rate_per_second=1.0, capacity=1)[0]
+
+
+@pytest.mark.unit
+class TestKeyValue:
+    """TTL key-value store"""
+
+    def test_set_get_delete(self, state):
+        state.set('model:status', {'ready': True, 'workers': [1, 2]})
+        assert state.get('model:status') == {'ready': True, 'workers': [1, 2]}
+        assert state.delete('model:status')
+        assert state.get('model:status') is None
+        assert not state.delete('model:status')
+
+    def test_ttl_expiry(self, state):
+        state.set('short', 1, ttl_seconds=0.05)
+        assert state.get('short') == 1
+        time.sleep(0.1)
+        assert state.get('short') is None
+
+
+@pytest.mark.unit
+def test_sqlite_state_is_shared_between_instances(tmp_path):
+    path = str(tmp_path / 'shared.db')
+    worker_a, worker_b = SQLiteSharedState(path), SQLiteSharedState(path)
+    assert worker_a.acquire_lock('job:1', ttl_seconds=30) is not None
+    assert worker_b.acquire_lock('job:1', ttl_seconds=30) is None
+
+    assert worker_a.take_tokens('rl:ip', rate_per_second=0.001, capacity=1)[0]
+    assert not worker_b.take_tokens('rl:ip', rate_per_second=0.001, capacity=1)[0]
+
+    worker_a.set('key', 'value')
+    assert worker_b.get('key') == 'value'
+    worker_a.close()
+    worker_b.close()
+
+
+@pytest.mark.unit
+def test_sqlite_purge_drops_expired_rows(tmp_path):
+    state = SQLiteSharedState(str(tmp_path / 'shared.db'), purge_interval_seconds=0)
+    state.acquire_lock('job:1', ttl_seconds=0.01)
+    state.take_tokens('rl:ip', rate_per_second=1000.0, capacity=1)
+    state.set('key', 1, ttl_seconds=0.01)
+    time.sleep(0.05)
+    state.set('trigger', 1)
+
+    conn = state._conn()
+    assert conn.execute("SELECT COUNT(*) FROM locks").fetchone()[0] == 0
+    assert conn.execute("SELECT COUNT(*) FROM buckets").fetchone()[0] == 0
+    assert conn.execute("SELECT key FROM kv").fetchall() == [('trigger',)]
+    state.close()
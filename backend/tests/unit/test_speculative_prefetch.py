@@ -0,0 +1,176 @@
+"""
++==============================================================================
+|              ORFEAS Testing Suite - Speculative Prefetch Tests               |
+|      Digest-keyed results, wait-or-cancel on take, job cancellation          |
++==============================================================================
+"""
+import pytest
+import sys
+import threading
+import time
+from pathlib import Path
+
+backend_path = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(backend_path))
+
+from speculative_prefetch import (
+    STATE_DONE,
+    STATE_QUEUED,
+    STATE_RUNNING,
+    SpeculativePrefetcher,
+)
+
+
+@pytest.fixture
+def prefetcher():
+    p = SpeculativePrefetcher(workers=1, max_pending=2, max_entries=8, niceness=0)
+    yield p
+    p.shutdown(wait=True)
+
+
+def blocker(prefetcher):
+    """Occupy the single pool thread until the returned event is set"""
+    release, started = threading.Event(), threading.Event()
+
+    def stage(image, digest):
+        if digest == 'blocker':
+            started.set()
+            release.wait(5)
+        return None
+
+    prefetcher.register_stage('block', stage)
+    prefetcher.schedule('job-blocker', 'blocker', None)
+    assert started.wait(5)
+    return release
+
+
+def wait_until_started(prefetcher, digest):
+    """``take`` cancels a queued prefetch, so tests wait for the pool to pick it up"""
+    deadline = time.monotonic() + 5
+    while prefetcher.state(digest) == STATE_QUEUED and time.monotonic() < deadline:
+        time.sleep(0.001)
+
+
+@pytest.mark.unit
+class TestSpeculativePrefetcher:
+    """Scheduling, hand-off and cancellation"""
+
+    def test_results_keyed_by_digest(self, prefetcher):
+        calls = []
+        prefetcher.register_stage('double', lambda image, digest: calls.append(digest) or image * 2)
+        assert prefetcher.schedule('job-1', 'abc', 21)
+        wait_until_started(prefetcher, 'abc')
+        assert prefetcher.take('abc', 'double', timeout=5) == 42
+        assert calls == ['abc']
+        stats = prefetcher.stats()
+        assert stats['hits'] == 1 and stats['scheduled'] == 1
+
+    def test_same_image_prefetched_once(self, prefetcher):
+        calls = []
+        release = blocker(prefetcher)
+        prefetcher.register_stage('count', lambda image, digest: calls.append(digest) or 1)
+        prefetcher.schedule('job-1', 'abc', None)
+        prefetcher.schedule('job-2', 'abc', None)
+        release.set()
+        wait_until_started(prefetcher, 'abc')
+        assert prefetcher.take('abc', 'count', timeout=5) == 1
+        assert calls.count('abc') == 1
+        assert prefetcher.stats()['deduplicated'] == 1
+
+    def test_no_stages_nothing_scheduled(self, prefetcher):
+        assert prefetcher.schedule('job-1', 'abc', None) is False
+
+    def test_take_waits_for_running_prefetch(self, prefetcher):
+        started, release = threading.Event(), threading.Event()
+
+        def slow(image, digest):
+            started.set()
+            release.wait(5)
+            return 'ready'
+
+        prefetcher.register_stage('slow', slow)
+        prefetcher.schedule('job-1', 'abc', None)
+        assert started.wait(5)
+        assert prefetcher.state('abc') == STATE_RUNNING
+        threading.Timer(0.05, release.set).start()
+        assert prefetcher.take('abc', 'slow', timeout=5) == 'ready'
+        assert prefetcher.stats()['waited'] == 1
+
+    def test_take_cancels_queued_prefetch(self, prefetcher):
+        calls = []
+        release = blocker(prefetcher)
+        prefetcher.register_stage('work', lambda image, digest: calls.append(digest) or 1)
+        prefetcher.schedule('job-1', 'abc', None)
+        assert prefetcher.state('abc') == STATE_QUEUED
+        assert prefetcher.take('abc', 'work') is None  # caller computes inline
+        release.set()
+        prefetcher.shutdown(wait=True)
+        assert 'abc' not in calls
+        assert prefetcher.stats()['misses'] == 1
+
+    def test_unknown_digest_is_a_miss(self, prefetcher):
+        prefetcher.register_stage('work', lambda image, digest: 1)
+        assert prefetcher.take('missing', 'work') is None
+        assert prefetcher.stats()['misses'] == 1
+
+    def test_stage_returning_none_is_skipped(self, prefetcher):
+        prefetcher.register_stage('off', lambda image, digest: None)
+        prefetcher.register_stage('on', lambda image, digest: 'value')
+        prefetcher.schedule('job-1', 'abc', None)
+        wait_until_started(prefetcher, 'abc')
+        assert prefetcher.take('abc', 'on', timeout=5) == 'value'
+        assert prefetcher.take('abc', 'off', timeout=5) is None
+
+    def test_failing_stage_does_not_stop_later_stages(self, prefetcher):
+        def broken(image, digest):
+            raise RuntimeError("no rembg")
+
+        prefetcher.register_stage('broken', broken)
+        prefetcher.register_stage('depth', lambda image, digest: 'depth')
+        prefetcher.schedule('job-1', 'abc', None)
+        wait_until_started(prefetcher, 'abc')
+        assert prefetcher.take('abc', 'depth', timeout=5) == 'depth'
+
+    def test_cancel_job(self, prefetcher):
+        calls = []
+        release = blocker(prefetcher)
+        prefetcher.register_stage('work', lambda image, digest: calls.append(digest) or 1)
+        prefetcher.schedule('job-1', 'abc', None)
+        assert prefetcher.cancel('job-1')
+        assert prefetcher.state('abc') is None
+        assert not prefetcher.cancel('job-1')
+        release.set()
+        prefetcher.shutdown(wait=True)
+        assert calls == []
+        assert prefetcher.stats()['cancelled'] == 1
+
+    def test_cancel_keeps_prefetch_shared_with_other_job(self, prefetcher):
+        prefetcher.register_stage('work', lambda image, digest: 'value')
+        prefetcher.schedule('job-1', 'abc', None)
+        prefetcher.schedule('job-2', 'abc', None)
+        prefetcher.cancel('job-1')
+        wait_until_started(prefetcher, 'abc')
+        assert prefetcher.take('abc', 'work', timeout=5) == 'value'
+
+    def test_saturated_queue_drops_oldest(self, prefetcher):
+        calls = []
+        release = blocker(prefetcher)
+        prefetcher.register_stage('work', lambda image, digest: calls.append(digest) or 1)
+        for i in range(4):
+            prefetcher.schedule(f'job-{i}', f'digest-{i}', None)
+        assert prefetcher.state('digest-0') is None and prefetcher.state('digest-1') is None
+        assert prefetcher.stats()['dropped'] == 2
+        release.set()
+        wait_until_started(prefetcher, 'digest-3')
+        assert prefetcher.take('digest-3', 'work', timeout=5) == 1
+        assert prefetcher.take('digest-2', 'work', timeout=5) == 1
+        assert 'digest-0' not in calls
+
+    def test_release_drops_finished_results(self, prefetcher):
+        prefetcher.register_stage('work', lambda image, digest: 'value')
+        prefetcher.schedule('job-1', 'abc', None)
+        wait_until_started(prefetcher, 'abc')
+        assert prefetcher.take('abc', 'work', timeout=5) == 'value'
+        assert prefetcher.state('abc') == STATE_DONE
+        prefetcher.release('job-1')
+        assert prefetcher.state('abc') is None
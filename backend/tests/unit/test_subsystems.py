@@ -0,0 +1,192 @@
+"""
++==============================================================================
+|              ORFEAS Testing Suite - Subsystem Registry Tests                 |
+|        Lazy factories, dependencies, background warmup, readiness            |
++==============================================================================
+"""
+import pytest
+import sys
+import threading
+import time
+from pathlib import Path
+
+backend_path = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(backend_path))
+
+from subsystems import (
+    LazySubsystem,
+    STATE_DISABLED,
+    STATE_FAILED,
+    STATE_READY,
+    STATE_REGISTERED,
+    SubsystemRegistry,
+)
+
+
+@pytest.fixture
+def registry():
+    reg = SubsystemRegistry(disabled=())
+    yield reg
+    reg.shutdown(wait=True)
+
+
+@pytest.fixture
+def probe_module(tmp_path, monkeypatch):
+    """A module that has certainly not been imported yet"""
+    name = f"orfeas_probe_{time.monotonic_ns()}"
+    (tmp_path / f"{name}.py").write_text("VALUE = 42\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    return name
+
+
+@pytest.mark.unit
+class TestLazyLoading:
+    """Nothing is imported or built before first use"""
+
+    def test_register_does_not_import_or_build(self, registry, probe_module):
+        calls = []
+        registry.register('probe', lambda: calls.append(1) or sys.modules[probe_module].VALUE,
+                          modules=(probe_module,))
+        assert probe_module not in sys.modules
+        assert not calls
+        assert registry.state('probe') == STATE_REGISTERED
+
+        assert registry.get('probe') == 42
+        assert registry.get('probe') == 42
+        assert calls == [1]
+        assert probe_module in sys.modules
+
+    def test_disabled_subsystem_is_never_imported(self, probe_module):
+        registry = SubsystemRegistry(disabled=('probe',))
+        registry.register('probe', lambda: 1, modules=(probe_module,))
+        assert registry.get('probe') is None
+        assert registry.state('probe') == STATE_DISABLED
+        assert probe_module not in sys.modules
+
+    def test_disabled_from_environment(self, monkeypatch):
+        monkeypatch.setenv('SUBSYSTEMS_DISABLED', 'a, b')
+        assert SubsystemRegistry().disabled == frozenset({'a', 'b'})
+
+    def test_failure_yields_none(self, registry):
+        def broken():
+            raise RuntimeError("no GPU")
+
+        registry.register('gpu', broken)
+        assert registry.get('gpu') is None
+        status = registry.status()['gpu']
+        assert status['state'] == STATE_FAILED and status['error'] == "no GPU"
+
+    def test_status_never_loads(self, registry):
+        calls = []
+        registry.register('a', lambda: calls.append(1))
+        assert registry.status()['a'] == {'state': STATE_REGISTERED, 'ready': False, 'warmup': False}
+        assert not calls
+
+    def test_concurrent_first_use_builds_once(self, registry):
+        calls = []
+
+        def slow():
+            calls.append(1)
+            time.sleep(0.05)
+            return object()
+
+        registry.register('slow', slow)
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(registry.get('slow'))) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert len(calls) == 1
+        assert len({id(result) for result in results}) == 1
+
+
+@pytest.mark.unit
+class TestDependencies:
+    """Dependency ordering and failure propagation"""
+
+    def test_dependencies_build_first(self, registry):
+        order = []
+        registry.register('bus', lambda: order.append('bus') or 'bus')
+        registry.register('agents', lambda: order.append('agents') or 'agents', depends=('bus',))
+        assert registry.get('agents') == 'agents'
+        assert order == ['bus', 'agents']
+
+    def test_failed_dependency_fails_dependent(self, registry):
+        def broken():
+            raise ImportError("missing")
+
+        calls = []
+        registry.register('bus', broken)
+        registry.register('agents', lambda: calls.append(1), depends=('bus',))
+        assert registry.get('agents') is None
+        assert registry.state('agents') == STATE_FAILED
+        assert not calls
+
+    def test_unknown_dependency_rejected(self, registry):
+        with pytest.raises(ValueError):
+            registry.register('agents', lambda: 1, depends=('bus',))
+
+    def test_duplicate_rejected(self, registry):
+        registry.register('a', lambda: 1)
+        with pytest.raises(ValueError):
+            registry.register('a', lambda: 2)
+
+
+@pytest.mark.unit
+class TestWarmup:
+    """Background warmup"""
+
+    def test_independent_subsystems_load_in_parallel(self, registry):
+        def sleeper(value):
+            def build():
+                time.sleep(0.2)
+                return value
+            return build
+
+        registry.register('models', sleeper('models'), warmup=True)
+        registry.register('agents', sleeper('agents'), warmup=True)
+        registry.register('tiers', sleeper('tiers'))  # lazy only
+        start = time.perf_counter()
+        assert registry.warmup(workers=2) == ['models', 'agents']
+        assert registry.wait('models', 2) and registry.wait('agents', 2)
+        assert time.perf_counter() - start < 0.35
+        assert registry.warmup_complete()
+        assert registry.state('tiers') == STATE_REGISTERED
+
+    def test_dependent_waits_for_dependency(self, registry):
+        ready = []
+        registry.register('bus', lambda: time.sleep(0.05) or ready.append('bus') or 'bus')
+        registry.register('agents', lambda: list(ready), depends=('bus',), warmup=True)
+        assert registry.warmup(workers=2) == ['bus', 'agents']
+        assert registry.wait('agents', 2)
+        assert registry.get('agents') == ['bus']
+        assert registry.is_ready('bus')
+
+    def test_warmup_skips_loaded(self, registry):
+        registry.register('a', lambda: 1, warmup=True)
+        registry.get('a')
+        assert registry.warmup() == []
+
+
+@pytest.mark.unit
+class TestLazyAttribute:
+    """LazySubsystem descriptor"""
+
+    def test_attribute_resolves_through_registry(self, registry):
+        class Server:
+            dashboard = LazySubsystem('dashboard')
+
+            def __init__(self, subsystems):
+                self.subsystems = subsystems
+
+        registry.register('dashboard', lambda: 'dash')
+        server = Server(registry)
+        assert registry.state('dashboard') == STATE_REGISTERED
+        assert server.dashboard == 'dash'
+
+        server.dashboard = None
+        assert server.dashboard is None
+        assert registry.state('dashboard') == STATE_FAILED
+        server.dashboard = 'replacement'
+        assert registry.state('dashboard') == STATE_READY and server.dashboard == 'replacement'
@@ -0,0 +1,121 @@
+"""
++==============================================================================
+|             ORFEAS Testing Suite - Volumetric Engine Tests                   |
+|        Sparse occupancy blocks, seam welding, dense-volume equivalence       |
++==============================================================================
+"""
+import pytest
+import numpy as np
+from pathlib import Path
+import sys
+
+backend_path = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(backend_path))
+
+from volumetric_engine import (
+    VolumetricEngine,
+    occupancy,
+    surface_levels,
+    volume_levels,
+)
+
+
+def relief(height: int = 70, width: int = 90) -> np.ndarray:
+    rng = np.random.default_rng(3)
+    y, x = np.mgrid[0:height, 0:width]
+    depth = 0.5 + 0.4 * np.sin(x / 9.0) * np.cos(y / 13.0) + rng.normal(0, 0.03, (height, width))
+    return np.clip(depth, 0, 1).astype(np.float32)
+
+
+def triangles(vertices: np.ndarray, faces: np.ndarray) -> set:
+    """Orientation-preserving triangle set (rotated so the smallest corner is first)"""
+    result = set()
+    for tri in np.rint(vertices[faces] * 1000).astype(np.int64):
+        corners = [tuple(c) for c in tri]
+        start = corners.index(min(corners))
+        result.add(tuple(corners[start:] + corners[:start]))
+    return result
+
+
+@pytest.fixture
+def engine():
+    eng = VolumetricEngine(tile=32, chunk_depth=8, workers=2)
+    yield eng
+    eng.shutdown()
+
+
+@pytest.mark.unit
+class TestOccupancy:
+    """Height-field occupancy helpers"""
+
+    def test_broadcast_matches_layer_loop(self):
+        depth = relief(20, 30)
+        volume = np.zeros((20, 30, 16), dtype=np.float32)
+        for z in range(16):
+            volume[:, :, z] = (depth > z / 16).astype(float)
+        occupied = occupancy(depth, volume_levels(16))
+        assert occupied.dtype == bool
+        np.testing.assert_array_equal(occupied, volume.astype(bool))
+
+    def test_surface_levels_count_occupied_slices(self):
+        depth = relief(20, 30)
+        levels = volume_levels(16)
+        np.testing.assert_array_equal(surface_levels(depth, levels), occupancy(depth, levels).sum(axis=2))
+
+
+@pytest.mark.unit
+class TestBlocks:
+    """Block layout"""
+
+    def test_flat_regions_are_skipped(self, engine):
+        columns = np.zeros((100, 100), dtype=np.int32)
+        columns[:40, :40] = 16   # full columns
+        columns[70:, 70:] = 5    # plateau at slice 5
+        blocks = engine.blocks(columns, 16)
+        # The full and empty tiles disappear; tiles touching the plateau keep a thin band
+        assert (0, 32, 0, 32, 0, 8) not in blocks
+        assert all(z1 - z0 <= engine.chunk_depth for *_, z0, z1 in blocks)
+        assert (96, 99, 96, 99, 4, 5) in blocks
+        assert (64, 96, 64, 96, 0, 5) in blocks
+
+    def test_every_crossing_cube_is_covered_once(self, engine):
+        depth = relief()
+        levels = volume_levels(24)
+        occupied = occupancy(depth, levels)
+        cubes = np.zeros(np.array(occupied.shape) - 1, dtype=np.int32)
+        for y0, y1, x0, x1, z0, z1 in engine.blocks(surface_levels(depth, levels), 24):
+            cubes[y0:y1, x0:x1, z0:z1] += 1
+        assert cubes.max() == 1
+        # Any cube with mixed corners lies in some block
+        corners = [occupied[dy:dy + cubes.shape[0], dx:dx + cubes.shape[1], dz:dz + cubes.shape[2]]
+                   for dy in (0, 1) for dx in (0, 1) for dz in (0, 1)]
+        mixed = np.any(corners, axis=0) & ~np.all(corners, axis=0)
+        assert (cubes[mixed] == 1).all()
+
+
+@pytest.mark.unit
+class TestMesh:
+    """Block-wise meshing versus the dense reference"""
+
+    def test_matches_dense_marching_cubes(self, engine):
+        pytest.importorskip("skimage")
+        from volumetric_engine import dense_marching_cubes
+        depth = relief()
+        spacing = (0.5, 0.25, 2.0)
+        dense_vertices, dense_faces = dense_marching_cubes(depth, 24, spacing)
+        vertices, faces = engine.mesh(depth, 24, spacing)
+        assert len(vertices) == len(dense_vertices)
+        assert len(faces) == len(dense_faces)
+        assert triangles(vertices, faces) == triangles(dense_vertices, dense_faces)
+        assert vertices.dtype == np.float32 and faces.dtype == np.int32
+
+    def test_seams_are_welded(self, engine):
+        pytest.importorskip("skimage")
+        vertices, faces = engine.mesh(relief(), 24)
+        assert len(np.unique(np.rint(vertices * 8), axis=0)) == len(vertices)
+        assert faces.max() == len(vertices) - 1
+
+    def test_flat_map_has_no_surface(self, engine):
+        pytest.importorskip("skimage")
+        with pytest.raises(RuntimeError):
+            engine.mesh(np.ones((10, 10), dtype=np.float32), 16)
@@ -10,6 +10,8 @@ from typing import Dict, Literal, Optional
 from pydantic import BaseModel, Field, field_validator, ConfigDict
 import re
 
+from rate_limiting import RateLimiter  # GCRA limiter (O(1) per key, bounded key table)
+
 # UUID validation pattern
 UUID_PATTERN = re.compile(r'^[a-f0-9]{8}-[a-f0-9]{4}-[a-f0-9]{4}-[a-f0-9]{4}-[a-f0-9]{12}$')
 
@@ -132,50 +134,6 @@ class FileUploadValidator:
         return True, None
 
 
-class RateLimiter:
-    """Simple in-memory rate limiter"""
-
-    def __init__(self, max_requests: int = 60, window_seconds: int = 60):
-        """
-        Initialize rate limiter
-
-        Args:
-            max_requests: Maximum requests per window
-            window_seconds: Time window in seconds
-        """
-        from collections import defaultdict
-        from datetime import datetime, timedelta
-
-        self.max_requests = max_requests
-        self.window = timedelta(seconds=window_seconds)
-        self.requests = defaultdict(list)  # ip -> [timestamp, ...]
-
-    def is_allowed(self, identifier: str) -> tuple[bool, Optional[str]]:
-        """
-        Check if request is allowed for identifier (IP address)
-
-        Returns:
-            (is_allowed, error_message)
-        """
-        from datetime import datetime
-
-        now = datetime.now()
-
-        # Clean old requests
-        self.requests[identifier] = [
-            ts for ts in self.requests[identifier]
-            if now - ts < self.window
-        ]
-
-        # Check rate limit
-        if len(self.requests[identifier]) >= self.max_requests:
-            return False, f"Rate limit exceeded. Max {self.max_requests} requests per {self.window.seconds}s"
-
-        # Record request
-        self.requests[identifier].append(now)
-        return True, None
-
-
 class SecurityHeaders:
     """Security headers middleware"""
 
@@ -224,5 +182,8 @@ def get_rate_limiter(max_requests: int = 60, window_seconds: int = 60) -> RateLi
     """Get or create rate limiter singleton"""
     global _rate_limiter
     if _rate_limiter is None:
-        _rate_limiter = RateLimiter(max_requests, window_seconds)
+        _rate_limiter = RateLimiter(
+            requests_per_minute=max_requests * 60.0 / window_seconds,
+            burst=max_requests
+        )
     return _rate_limiter
@@ -0,0 +1,204 @@
+"""
+ORFEAS Volumetric Engine
+========================
+Marching-cubes meshing of depth maps without a dense volume.
+
+- A depth map is a height field: voxel ``(y, x, z)`` is occupied when
+  ``depth[y, x] > z / volume_depth``, so occupancy is one broadcast
+  comparison against the level vector and is stored as bool
+- The volume is cut into xy tiles and overlapping z chunks; each tile only
+  covers the z band between its lowest and highest surface level, and
+  blocks that are entirely full or empty are never materialized
+- Blocks are meshed on a thread pool and vertices on shared block faces
+  are welded, so the result matches a marching-cubes pass over the full
+  dense volume
+- Voxel memory is bounded by ``workers`` blocks instead of
+  ``height x width x volume_depth`` float32 voxels
+
+Requires scikit-image (``skimage.measure.marching_cubes``).
+
+Environment:
+    VOLUME_TILE          xy tile size in voxels (default 128)
+    VOLUME_CHUNK_DEPTH   z chunk size in voxels (default 64)
+    VOLUME_WORKERS       meshing threads (default: min(4, CPU count))
+"""
+
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+try:
+    from skimage import measure
+    SKIMAGE_AVAILABLE = True
+except ImportError:
+    measure = None
+    SKIMAGE_AVAILABLE = False
+
+DEFAULT_TILE = 128
+DEFAULT_CHUNK_DEPTH = 64
+ISO_LEVEL = 0.5
+# Binary occupancy puts every vertex on an edge midpoint; quantizing to
+# 1/8 voxel keeps keys exact while tolerating float32 offsets
+WELD_RESOLUTION = 8
+
+Block = Tuple[int, int, int, int, int, int]  # y0, y1, x0, x1, z0, z1 (inclusive voxel bounds)
+
+
+def volume_levels(volume_depth: int) -> np.ndarray:
+    """Occupancy threshold of each z slice (``z / volume_depth``)"""
+    return np.arange(volume_depth) / volume_depth
+
+
+def occupancy(depth_map: np.ndarray, levels: np.ndarray) -> np.ndarray:
+    """Boolean ``(height, width, len(levels))`` occupancy of a height field"""
+    return depth_map[:, :, None] > levels[None, None, :]
+
+
+def surface_levels(depth_map: np.ndarray, levels: np.ndarray) -> np.ndarray:
+    """Per column, the number of occupied slices (the surface sits between ``c - 1`` and ``c``)"""
+    return np.searchsorted(levels, depth_map, side='left').astype(np.int32)
+
+
+def dense_marching_cubes(depth_map: np.ndarray, volume_depth: int,
+                         spacing: Sequence[float] = (1.0, 1.0, 1.0)) -> Tuple[np.ndarray, np.ndarray]:
+    """Reference path: marching cubes over the full dense volume"""
+    volume = occupancy(depth_map, volume_levels(volume_depth))
+    vertices, faces, _, _ = measure.marching_cubes(volume.view(np.uint8), level=ISO_LEVEL, spacing=tuple(spacing))
+    return vertices.astype(np.float32), faces.astype(np.int32)
+
+
+class VolumetricEngine:
+    """
+    Block-wise marching cubes over height-field occupancy
+
+    Args:
+        tile: xy tile size in voxels
+        chunk_depth: Maximum z slices per block
+        workers: Meshing threads
+    """
+
+    def __init__(self, tile: int = DEFAULT_TILE, chunk_depth: int = DEFAULT_CHUNK_DEPTH,
+                 workers: Optional[int] = None):
+        if tile < 1 or chunk_depth < 1:
+            raise ValueError("tile and chunk_depth must be positive")
+        self.tile = tile
+        self.chunk_depth = chunk_depth
+        self.workers = workers or min(4, os.cpu_count() or 1)
+        self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="volume-mc")
+
+    def blocks(self, columns: np.ndarray, volume_depth: int) -> List[Block]:
+        """
+        Blocks that contain part of the surface
+
+        Neighbouring blocks share one voxel layer so every cube belongs to
+        exactly one block.
+
+        Args:
+            columns: ``surface_levels`` of the depth map
+            volume_depth: Number of z slices
+        """
+        height, width = columns.shape
+        blocks: List[Block] = []
+        for y0 in range(0, height - 1, self.tile):
+            y1 = min(y0 + self.tile, height - 1)
+            for x0 in range(0, width - 1, self.tile):
+                x1 = min(x0 + self.tile, width - 1)
+                tile = columns[y0:y1 + 1, x0:x1 + 1]
+                low, high = int(tile.min()), int(tile.max())
+                if low == high and low in (0, volume_depth):
+                    continue  # all empty or all full
+                z_low, z_high = max(low - 1, 0), min(high, volume_depth - 1)
+                for z0 in range(z_low, z_high, self.chunk_depth):
+                    blocks.append((y0, y1, x0, x1, z0, min(z0 + self.chunk_depth, z_high)))
+        return blocks
+
+    @staticmethod
+    def _mesh_block(depth_map: np.ndarray, levels: np.ndarray,
+                    block: Block) -> Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+        y0, y1, x0, x1, z0, z1 = block
+        occupied = occupancy(depth_map[y0:y1 + 1, x0:x1 + 1], levels[z0:z1 + 1])
+        if occupied.all() or not occupied.any():
+            return None
+        vertices, faces, _, _ = measure.marching_cubes(occupied.view(np.uint8), level=ISO_LEVEL)
+        # Vertices on any block face may be duplicated by a neighbour
+        extent = np.array(occupied.shape, dtype=np.float32) - 1
+        on_face = ((vertices == 0) | (vertices == extent)).any(axis=1)
+        vertices += np.array((y0, x0, z0), dtype=np.float32)
+        return vertices, faces.astype(np.int32), on_face
+
+    @staticmethod
+    def _weld(parts: List[Tuple[np.ndarray, np.ndarray, np.ndarray]]) -> Tuple[np.ndarray, np.ndarray]:
+        vertices = np.concatenate([part[0] for part in parts])
+        on_face = np.concatenate([part[2] for part in parts])
+        offsets = np.cumsum([0] + [len(part[0]) for part in parts[:-1]], dtype=np.int32)
+        faces = np.concatenate([part[1] + offset for part, offset in zip(parts, offsets)])
+
+        remap = np.arange(len(vertices), dtype=np.int32)
+        candidates = np.flatnonzero(on_face)
+        if len(candidates):
+            grid = np.rint(vertices[candidates] * WELD_RESOLUTION).astype(np.int64)
+            spans = grid.max(axis=0) + 1
+            keys = (grid[:, 0] * spans[1] + grid[:, 1]) * spans[2] + grid[:, 2]
+            _, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+            remap[candidates] = candidates[first][inverse.ravel()]
+
+        keep = remap == np.arange(len(vertices), dtype=np.int32)
+        compact = np.cumsum(keep, dtype=np.int32) - 1
+        return vertices[keep], compact[remap][faces]
+
+    def mesh(self, depth_map: np.ndarray, volume_depth: int,
+             spacing: Sequence[float] = (1.0, 1.0, 1.0)) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Marching-cubes surface of the height-field volume
+
+        Args:
+            depth_map: 2D depth map in [0, 1]
+            volume_depth: Number of z slices
+            spacing: Voxel size along (y, x, z)
+
+        Returns:
+            (vertices float32 (N, 3) in (y, x, z) order, faces int32 (M, 3))
+        """
+        if not SKIMAGE_AVAILABLE:
+            raise RuntimeError("scikit-image is required for volumetric meshing")
+        depth_map = np.asarray(depth_map)
+        levels = volume_levels(volume_depth)
+        blocks = self.blocks(surface_levels(depth_map, levels), volume_depth)
+        parts = [part for part in self._pool.map(lambda b: self._mesh_block(depth_map, levels, b), blocks)
+                 if part is not None]
+        if not parts:
+            raise RuntimeError("No surface found in depth map")
+        vertices, faces = self._weld(parts)
+        vertices *= np.asarray(spacing, dtype=np.float32)
+        logger.debug(f"[VOLUME] Meshed {len(parts)}/{len(blocks)} blocks: "
+                     f"{len(vertices)} vertices, {len(faces)} faces")
+        return vertices, faces
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=True)
+
+
+_volumetric_engine: Optional[VolumetricEngine] = None
+_volumetric_engine_lock = threading.Lock()
+
+
+def get_volumetric_engine() -> VolumetricEngine:
+    """Get or create the volumetric engine singleton (configured from the environment)"""
+    global _volumetric_engine
+    with _volumetric_engine_lock:
+        if _volumetric_engine is None:
+            workers = os.getenv('VOLUME_WORKERS')
+            _volumetric_engine = VolumetricEngine(
+                tile=int(os.getenv('VOLUME_TILE', str(DEFAULT_TILE))),
+                chunk_depth=int(os.getenv('VOLUME_CHUNK_DEPTH', str(DEFAULT_CHUNK_DEPTH))),
+                workers=int(workers) if workers else None
+            )
+            logger.info(f"[VOLUME] Volumetric engine ready (tile {_volumetric_engine.tile}, "
+                        f"chunk depth {_volumetric_engine.chunk_depth}, {_volumetric_engine.workers} workers)")
+        return _volumetric_engine
@@ -9,6 +9,8 @@
 
 import multiprocessing
 import os
+import sys
+from pathlib import Path
 from typing import Any
 
 # -----------------------------------------------------------------------------
@@ -24,7 +26,8 @@ backlog = 2048
 # For 8-core system: (2 * 8) + 1 = 17 workers
 # Adjusted down for GPU workloads (limit concurrent GPU operations)
 workers = min(multiprocessing.cpu_count() * 2 + 1, 8)
-worker_class = "sync"  # Use sync for long-running GPU tasks
+worker_class = os.getenv("GUNICORN_WORKER_CLASS", "sync")  # Use sync for long-running GPU tasks
+threads = int(os.getenv("GUNICORN_THREADS", "1"))  # gthread only
 worker_connections = 1000
 max_requests = 1000  # Recycle workers after 1000 requests (prevent memory leaks)
 max_requests_jitter = 50  # Add randomness to prevent all workers restarting at once
@@ -32,6 +35,44 @@ timeout = 300  # 5 minutes (long enough for 3D generation: ~82s + buffer)
 graceful_timeout = 30  # 30 seconds for graceful shutdown
 keepalive = 5  # Keep-alive connections
 
+# -----------------------------------------------------------------------------
+# Shared State
+# -----------------------------------------------------------------------------
+# Workers share job claims, job progress, rate-limit buckets and Socket.IO
+# fan-out through backend/shared_state.py and backend/job_store.py.
+# Single host: SQLite (WAL) files under data/ - keep them on a local disk.
+# Several hosts: set REDIS_URL so both stores and the Socket.IO message queue
+# use Redis (or set SHARED_STATE_BACKEND / JOB_STORE_BACKEND explicitly).
+shared_state_backend = os.getenv("SHARED_STATE_BACKEND", "redis" if os.getenv("REDIS_URL") else "sqlite")
+
+# -----------------------------------------------------------------------------
+# Job Progress Streaming
+# -----------------------------------------------------------------------------
+# /api/job-events (Server-Sent Events) holds its request for the whole job and
+# /api/job-status?wait= for up to JOB_STATUS_MAX_WAIT seconds. A sync worker
+# serves one request at a time, so with at most 8 of them a handful of
+# watching clients would block every other request. Sync workers therefore
+# get plain polling and no SSE; to use both, run threaded workers, e.g.
+#   GUNICORN_WORKER_CLASS=gthread GUNICORN_THREADS=32
+# (workers are still sized for the GPU; threads only multiply waiting clients).
+if worker_class == "sync":
+    os.environ.setdefault("JOB_STATUS_MAX_WAIT", "0")
+    os.environ.setdefault("JOB_EVENTS_STREAMING", "false")
+
+# -----------------------------------------------------------------------------
+# Model Residency
+# -----------------------------------------------------------------------------
+# One copy of the model weights per machine instead of one per worker
+# (backend/model_residency.py):
+#   process - every worker loads its own model (default)
+#   host    - a model-host process owns the weights; workers call it over a
+#             local Unix socket with arrays in shared memory (CPU or GPU)
+#   shared  - the master preloads the model and workers inherit it
+#             copy-on-write (CPU only, turns preload_app on)
+model_residency = os.getenv("MODEL_RESIDENCY", "process").lower()
+BACKEND_DIR = str(Path(__file__).resolve().parent / "backend")
+_model_host = None
+
 # -----------------------------------------------------------------------------
 # Worker Lifecycle
 # -----------------------------------------------------------------------------
@@ -43,6 +84,12 @@ def on_starting(server: Any) -> None:
     print(f"[ORFEAS] Workers: {workers}")
     print(f"[ORFEAS] Timeout: {timeout}s")
     print(f"[ORFEAS] Max requests per worker: {max_requests}")
+    print(f"[ORFEAS] Shared state backend: {shared_state_backend}")
+    print(f"[ORFEAS] Model residency: {model_residency}")
+    if model_residency == "shared":
+        sys.path.insert(0, BACKEND_DIR)
+        from hunyuan_integration import preload_shared_processor
+        preload_shared_processor()
 
 
 def on_reload(server: Any) -> None:
@@ -58,6 +105,21 @@ def when_ready(server: Any) -> None:
     """
     print("[ORFEAS] Gunicorn server ready!")
     print(f"[ORFEAS] Listening on: {bind}")
+    if model_residency == "host":
+        global _model_host
+        sys.path.insert(0, BACKEND_DIR)
+        from model_residency import ensure_model_host
+        _model_host = ensure_model_host()
+
+
+def on_exit(server: Any) -> None:
+    """
+    Called just before exiting Gunicorn.
+    """
+    if _model_host is not None and _model_host.poll() is None:
+        print(f"[ORFEAS] Stopping model host {_model_host.pid}")
+        _model_host.terminate()
+        _model_host.wait(timeout=30)
 
 
 def pre_fork(server: Any, worker: Any) -> None:
@@ -156,7 +218,9 @@ tmp_upload_dir = "/app/temp"
 # -----------------------------------------------------------------------------
 # Preload application code before worker processes are forked
 # This can save RAM but may cause issues with GPU initialization
-preload_app = False  # Set to False for GPU workloads to avoid CUDA fork issues
+# Kept off for GPU workloads to avoid CUDA fork issues; MODEL_RESIDENCY=shared
+# (CPU only) turns it on so workers inherit the preloaded model
+preload_app = model_residency == "shared"
 
 # -----------------------------------------------------------------------------
 # Worker Timeouts
@@ -204,12 +268,14 @@ print("ORFEAS AI 2D→3D Studio - Gunicorn Configuration")
 print("=" * 80)
 print(f"Workers: {workers}")
 print(f"Worker Class: {worker_class}")
+print(f"Long-Poll / SSE: {'disabled (sync workers)' if worker_class == 'sync' else 'enabled'}")
 print(f"Bind: {bind}")
 print(f"Timeout: {timeout}s")
 print(f"Graceful Timeout: {graceful_timeout}s")
 print(f"Max Requests: {max_requests}")
 print(f"Keep-Alive: {keepalive}s")
 print(f"Preload App: {preload_app}")
+print(f"Model Residency: {model_residency}")
 print(f"Log Level: {loglevel}")
 print(f"Access Log: {accesslog}")
 print(f"Error Log: {errorlog}")